@@ -14,6 +14,13 @@ logger = logging.getLogger(__name__)
 logger.info(f"🔧 Logging configured at level: {LOG_LEVEL}")
 ROUTER_DEBUG = os.getenv("ROUTER_DEBUG", "").lower() in {"1", "true", "yes", "on"}
 
+# Per-module import timing, reported at /__startup (opt in with STARTUP_IMPORT_PROFILING=1).
+# The hook is removed once the routers are mounted so later imports don't pay for it.
+from src.core import startup as startup_profile
+APP_IMPORT_STARTED = time.perf_counter()
+if os.getenv("STARTUP_IMPORT_PROFILING", "").lower() in {"1", "true", "yes", "on"}:
+    startup_profile.start_import_profiling()
+
 # Import startup module for version tracking and guarded imports
 try:
     from src.app_start import COMMIT_SHA, WARDROBE_PREPROCESSOR_AVAILABLE, WardrobePreprocessor
@@ -252,8 +259,8 @@ ROUTERS = [
     ("src.routes.debug_stats", "/api"),  # Debug stats router for Railway-proof debugging
     ("src.routes.health", "/health"),     # Health monitoring router
     ("src.routes.forgotten_gems", "/api/wardrobe-insights"),  # Forgotten gems router - mounted at /api/wardrobe-insights to avoid conflict
-    ("src.routes.gamification", "/api"),  # Gamification router for XP, levels, badges
-    ("src.routes.challenges", "/api"),   # Challenges router for gamification challenges
+    ("src.routes.gamification", "/api"),  # Gamification system - XP, levels, badges
+    ("src.routes.challenges", "/api"),   # Challenge management
     # ("src.routes.wardrobe_minimal", ""), # Router already has /api/wardrobe prefix - using simplified version
     # ("simple_outfit", ""),               # Ultra-simple outfit router
     # ("test_outfit_router", ""),          # Test outfit router at root level
@@ -305,8 +312,6 @@ ROUTERS = [
     # ("src.routes.monitoring", "/monitoring"),       # System monitoring router - FIXED PREFIX
     # ("src.routes.public_diagnostics", "/public_diagnostics"), # Public health diagnostics - FIXED PREFIX
     ("src.routes.production_monitoring", "/api/monitoring"),  # NEW: Production monitoring dashboard
-    ("src.routes.gamification", "/api"),  # Gamification system - XP, levels, badges
-    ("src.routes.challenges", "/api"),  # Challenge management
     ("src.routes.admin_migration", "/api"),  # Admin migration endpoint
     ("src.routes.gacha", "/api"),  # Gacha & Style Tokens (Variable Ratio Reinforcement)
     ("src.routes.roles", "/api"),  # Internal Status Roles (Status & Power)
@@ -316,8 +321,8 @@ ROUTERS = [
 
 def include_router_safe(module_name: str, prefix: str):
     try:
-        # Importing module
-        module = importlib.import_module(module_name)
+        # Importing module (timed)
+        module = startup_profile.import_router_module(module_name, prefix)
         # Module imported
         
         router = getattr(module, "router", None)
@@ -366,9 +371,13 @@ except Exception as e:
     print("❌ outfits.py import failed")
     traceback.print_exc()
 
+routers_started = time.perf_counter()
 for mod, prefix in ROUTERS:
     # Processing router
     include_router_safe(mod, prefix)
+startup_profile.record_phase("routers", time.perf_counter() - routers_started)
+startup_profile.record_phase("app_import", time.perf_counter() - APP_IMPORT_STARTED)
+startup_profile.stop_import_profiling()
 
 # Router loading complete
 
@@ -425,6 +434,19 @@ async def startup_event():
         print(f"❌ Firebase initialization failed: {e}")
         traceback.print_exc()
     
+    # Initialize deferred heavy services off the request path
+    warmup_services = os.getenv("STARTUP_WARMUP_SERVICES", "openai").strip()
+    if warmup_services:
+        names = None if warmup_services == "all" else [name.strip() for name in warmup_services.split(",")]
+        startup_profile.warm_up(names, background=True)
+    
+    # Keep Google's token signing keys warm so auth cache misses skip the download
+    try:
+        from src.auth.token_cache import start_public_key_refresh
+        start_public_key_refresh()
+    except Exception as e:
+        print(f"⚠️ Firebase public key refresh not started: {e}")
+    
     # Routes table removed to reduce Railway rate limiting
     
     # Startup complete
@@ -451,6 +473,18 @@ def __routes():
             })
     return {"routes": out, "total": len(out)}
 
+# Startup internals are admin-only (X-Admin-Token, see production_monitoring)
+try:
+    from src.routes.production_monitoring import require_admin_token
+except Exception:
+    def require_admin_token():
+        raise HTTPException(status_code=403, detail="Unauthorized - invalid admin token")
+
+@diag.get("/__startup", dependencies=[Depends(require_admin_token)])
+def __startup(limit: int = 50):
+    """Startup phases, per-router import time, lazy service state and slowest imports (X-Admin-Token)."""
+    return startup_profile.get_startup_report(limit)
+
 @diag.get("/__debug")
 def __debug():
     return {
@@ -258,7 +258,8 @@ async def openapi_spec():
                                     "properties": {
                                         "occasion": {"type": "string"},
                                         "style": {"type": "string"},
-                                        "weather": {"type": "string"}
+                                        "weather": {"type": "string"},
+                                        "limit": {"type": "integer", "minimum": 1, "maximum": 5}
                                     }
                                 }
                             }
@@ -777,6 +778,8 @@ async def suggest_outfits(
     logger.info(f"Suggest outfits request from user: {user_id}")
     
     payload = await request.json()
+    # All suggestions come from one generation request (count), not one request per outfit
+    count = max(1, min(int(payload.pop("limit", 1) or 1), 5))
     
     # Build headers for main backend
     headers = {"Content-Type": "application/json"}
@@ -798,6 +801,7 @@ async def suggest_outfits(
             r = await client.post(
                 f"{MAIN_BACKEND_URL}/api/outfit/generate",
                 json=payload,
+                params={"count": count},
                 headers=headers,
                 timeout=30.0
             )
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-outfit cost of batch generation.
+
+Generates K outfits for the same synthetic wardrobe (no Firestore needed)
+two ways:
+    repeated  - K separate generate_outfit() calls (the old regenerate path)
+    batch     - one generate_outfits(context, count=K) call, sharing
+                hydration, filtering, scoring and diversity loading
+
+Logging is disabled so the numbers reflect pipeline work only.
+
+Usage:
+    python backend/scripts/benchmark_batch_generation.py [--runs 10] [--wardrobe 120] [--counts 1,3,5]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_logging import build_context  # noqa: E402
+from src.services.robust_outfit_generation_service import RobustOutfitGenerationService  # noqa: E402
+
+
+async def time_repeated(service: RobustOutfitGenerationService, count: int, wardrobe_size: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        await service.generate_outfit(build_context(wardrobe_size))
+    return (time.perf_counter() - start) * 1000
+
+
+async def time_batch(service: RobustOutfitGenerationService, count: int, wardrobe_size: int) -> float:
+    start = time.perf_counter()
+    outfits = await service.generate_outfits(build_context(wardrobe_size), count=count)
+    elapsed = (time.perf_counter() - start) * 1000
+    if len(outfits) != count:
+        print(f"warning: batch of {count} returned {len(outfits)} outfits", file=sys.stderr)
+    return elapsed
+
+
+async def run(counts, runs: int, wardrobe_size: int) -> list:
+    service = RobustOutfitGenerationService()
+    await service.generate_outfit(build_context(wardrobe_size))  # warm-up
+
+    results = []
+    for count in counts:
+        for mode, timer in (("repeated", time_repeated), ("batch", time_batch)):
+            durations = [await timer(service, count, wardrobe_size) for _ in range(runs)]
+            results.append({
+                "mode": mode,
+                "count": count,
+                "total_ms": statistics.mean(durations),
+                "per_outfit_ms": statistics.mean(durations) / count,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--wardrobe", type=int, default=120, help="Synthetic wardrobe size")
+    parser.add_argument("--counts", default="1,3,5")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    counts = [int(count) for count in args.counts.split(",")]
+    results = asyncio.run(run(counts, args.runs, args.wardrobe))
+
+    print(f"{'mode':<10} {'K':>3} {'total ms':>10} {'per outfit ms':>14}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['count']:>3} {result['total_ms']:>10.1f} {result['per_outfit_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the daily suggestion precompute job over a synthetic population.
+
+Runs ``precompute_daily_suggestions`` (no Firestore needed) for N synthetic
+users spread over several timezones and cities (at 07:00 UTC only the
+European ones are in their morning window), against an in-memory
+suggestion store. Each user's outfit comes from the real generation
+pipeline on a synthetic wardrobe. Weather and per-user profile/wardrobe reads
+are simulated with fixed latencies. The run is repeated for each concurrency
+level.
+
+Usage:
+    python backend/scripts/benchmark_daily_suggestions.py [--users 200] [--concurrency 1,4,8]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmark_logging import build_context  # noqa: E402
+from src.custom_types.weather import WeatherData  # noqa: E402
+from src.jobs.daily_suggestions_job import precompute_daily_suggestions  # noqa: E402
+from src.services.robust_outfit_generation_service import RobustOutfitGenerationService  # noqa: E402
+
+TIMEZONES = ["Europe/London", "Europe/Berlin", "America/New_York", "America/Chicago", "America/Los_Angeles", "Asia/Tokyo"]
+CITIES = ["London", "Berlin", "New York", "Chicago", "Los Angeles", "Tokyo", "Boston", "Seattle"]
+
+
+class InMemorySuggestions:
+    def __init__(self):
+        self.saved = {}
+
+    def existing_user_ids(self, user_ids_by_date):
+        return {user_id for user_id, date_str in user_ids_by_date.items() if (user_id, date_str) in self.saved}
+
+    def save_suggestion(self, user_id, date_str, outfit_data, is_fallback=False, precomputed=False, overwrite=True):
+        if not overwrite and (user_id, date_str) in self.saved:
+            return None
+        self.saved[(user_id, date_str)] = outfit_data
+        return outfit_data
+
+
+def synthetic_users(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+    return [
+        (f"user-{index}", {
+            "location_data": {"timezone": rng.choice(TIMEZONES), "last_location": rng.choice(CITIES)},
+            "updatedAt": now_ms,
+        })
+        for index in range(count)
+    ]
+
+
+async def run(users: int, concurrency: int, wardrobe_size: int, weather_ms: float, io_ms: float) -> dict:
+    service = RobustOutfitGenerationService()
+    population = synthetic_users(users)
+    now = datetime.now(timezone.utc).replace(hour=7, minute=0)  # European mornings
+
+    async def fetch(location):
+        await asyncio.sleep(weather_ms / 1000)
+        return {"temperature": 60.0, "condition": "Clouds", "humidity": 60.0, "location": location}
+
+    async def generate(user_id, weather):
+        await asyncio.sleep(io_ms / 1000)  # profile, likes and wardrobe reads
+        context = build_context(wardrobe_size)
+        if weather:
+            context.weather = WeatherData(**weather)
+        outfit = await service.generate_outfit(context)
+        return {"name": outfit.name, "items": [item.id for item in outfit.items]}
+
+    return await precompute_daily_suggestions(
+        now=now, user_docs=population, concurrency=concurrency,
+        service=InMemorySuggestions(), fetch=fetch, generate=generate,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--wardrobe", type=int, default=80, help="Synthetic wardrobe size per user")
+    parser.add_argument("--weather-ms", type=float, default=150.0, help="Simulated weather API latency")
+    parser.add_argument("--io-ms", type=float, default=40.0, help="Simulated per-user Firestore reads")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    print(f"{'conc':>4} {'due':>6} {'built':>6} {'weather':>8} {'total s':>8} {'users/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for concurrency in (int(value) for value in args.concurrency.split(",")):
+        stats = asyncio.run(run(args.users, concurrency, args.wardrobe, args.weather_ms, args.io_ms))
+        seconds = stats["elapsed_ms"] / 1000
+        print(
+            f"{concurrency:>4} {stats['due']:>6} {stats['generated']:>6} {stats['weather_fetches']:>8} {seconds:>8.1f} "
+            f"{stats['generated'] / seconds:>8.1f} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
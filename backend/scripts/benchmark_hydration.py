@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark wardrobe hydration cold vs warm.
+
+Hydrates N synthetic Firestore-shaped wardrobe dicts with
+``ensure_items_safe_for_pydantic``:
+    cold  - hydration cache cleared before every run (full validation)
+    warm  - same wardrobe again, items served from the (id, updatedAt) cache
+
+Logging is disabled so the numbers reflect hydration work only.
+
+Usage:
+    python backend/scripts/benchmark_hydration.py [--items 500] [--runs 20]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.robust_hydrator import ensure_items_safe_for_pydantic, hydration_cache  # noqa: E402
+
+TYPES = ["tops", "bottoms", "shoes", "outerwear", "ClothingType.SWEATER", "jeans", "dress", "accessories", "t-shirt"]
+COLORS = ["navy", "black", "white", "beige", "olive", "burgundy", "grey"]
+
+
+def build_wardrobe(size: int) -> list:
+    return [
+        {
+            "id": f"item-{index}",
+            "name": f"{COLORS[index % len(COLORS)]} item {index}",
+            "type": TYPES[index % len(TYPES)],
+            "color": COLORS[index % len(COLORS)],
+            "season": ["spring", "fall"],
+            "style": ["casual", "classic"],
+            "occasion": ["casual", "work"],
+            "tags": ["cotton"],
+            "imageUrl": f"https://example.com/{index}.png",
+            "userId": "benchmark-user",
+            "dominantColors": [{"name": "navy", "hex": "#000080", "rgb": [0, 0, 128]}],
+            "matchingColors": [{"name": "white", "hex": "#ffffff", "rgb": [255, 255, 255]}],
+            "createdAt": 1700000000000,
+            "updatedAt": 1700000000000 + index,
+            "wearCount": index % 9,
+            "metadata": {
+                "visualAttributes": {"formalLevel": "casual", "material": "cotton", "pattern": "solid", "fit": "regular"},
+                "colorAnalysis": {"dominant": ["navy"], "matching": ["white"]},
+                "naturalDescription": "A versatile everyday piece.",
+            },
+        }
+        for index in range(size)
+    ]
+
+
+def time_runs(wardrobe: list, runs: int, cold: bool) -> list:
+    durations = []
+    for _ in range(runs):
+        if cold:
+            hydration_cache.clear()
+        start = time.perf_counter()
+        hydrated = ensure_items_safe_for_pydantic(wardrobe)
+        durations.append((time.perf_counter() - start) * 1000)
+        assert len(hydrated) == len(wardrobe)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    wardrobe = build_wardrobe(args.items)
+    cold = time_runs(wardrobe, args.runs, cold=True)
+    time_runs(wardrobe, 1, cold=False)  # prime
+    warm = time_runs(wardrobe, args.runs, cold=False)
+
+    print(f"{'mode':<6} {'items':>6} {'mean ms':>9} {'p50 ms':>9}")
+    for mode, durations in (("cold", cold), ("warm", warm)):
+        print(f"{mode:<6} {args.items:>6} {statistics.mean(durations):>9.2f} {statistics.median(durations):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark outfit generation latency under different logging modes.
+
+Runs the robust generation pipeline against a synthetic wardrobe (no
+Firestore needed) with:
+    info      - plain synchronous JSON logging at INFO (the old setup)
+    governed  - LogGovernor + background writer thread at INFO
+    warning   - plain synchronous logging at WARNING, for reference
+
+Log output goes to /dev/null unless --sink is given, so the numbers include
+formatting and write costs but not terminal rendering.
+
+Usage:
+    python backend/scripts/benchmark_logging.py [--runs 50] [--wardrobe 120] [--modes info,governed]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.core.logging import get_log_stats, setup_logging, shutdown_logging, start_request_log_stats  # noqa: E402
+from src.custom_types.profile import UserProfile  # noqa: E402
+from src.custom_types.wardrobe import ClothingItem  # noqa: E402
+from src.custom_types.weather import WeatherData  # noqa: E402
+from src.services.robust_outfit_generation_service import (  # noqa: E402
+    GenerationContext,
+    RobustOutfitGenerationService,
+)
+
+ITEM_TYPES = ["shirt", "pants", "shoes", "jacket", "sweater", "t-shirt", "jeans", "sneakers", "blazer", "belt"]
+COLORS = ["navy", "black", "white", "gray", "beige"]
+
+
+class CountingFilter(logging.Filter):
+    """Counts records reaching the output handler in ungoverned modes."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def filter(self, record):
+        self.count += 1
+        return True
+
+
+def build_context(wardrobe_size: int) -> GenerationContext:
+    wardrobe = [
+        ClothingItem(
+            id=f"item-{index}",
+            name=f"{COLORS[index % len(COLORS)]} {ITEM_TYPES[index % len(ITEM_TYPES)]} {index}",
+            type=ITEM_TYPES[index % len(ITEM_TYPES)],
+            color=COLORS[index % len(COLORS)],
+            season=["all"],
+            style=["casual"],
+            occasion=["casual"],
+            userId="benchmark-user",
+        )
+        for index in range(wardrobe_size)
+    ]
+    return GenerationContext(
+        user_id="benchmark-user",
+        occasion="Casual",
+        style="Casual",
+        mood="Calm",
+        weather=WeatherData(temperature=65, condition="Clear", humidity=50),
+        wardrobe=wardrobe,
+        user_profile=UserProfile(
+            id="benchmark-user", name="Benchmark", email="benchmark@example.com",
+            gender="female", bodyType="average", createdAt=0, updatedAt=0,
+        ),
+    )
+
+
+async def run_mode(mode: str, runs: int, wardrobe_size: int, sink) -> dict:
+    real_stdout = sys.stdout
+    sys.stdout = sink
+    try:
+        setup_logging("WARNING" if mode == "warning" else "INFO", governed=(mode == "governed"))
+    finally:
+        sys.stdout = real_stdout
+
+    counter = CountingFilter()
+    if mode != "governed":
+        for handler in logging.getLogger().handlers:
+            handler.addFilter(counter)
+
+    service = RobustOutfitGenerationService()
+    await service.generate_outfit(build_context(wardrobe_size))  # warm-up
+
+    durations = []
+    records = []
+    for _ in range(runs):
+        context = build_context(wardrobe_size)
+        stats = start_request_log_stats()
+        before = counter.count
+        start = time.perf_counter()
+        await service.generate_outfit(context)
+        durations.append((time.perf_counter() - start) * 1000)
+        records.append(stats.count if mode == "governed" else counter.count - before)
+
+    governor = get_log_stats()
+    shutdown_logging()
+    durations.sort()
+    return {
+        "mode": mode,
+        "mean_ms": statistics.mean(durations),
+        "p50_ms": durations[len(durations) // 2],
+        "p95_ms": durations[min(int(len(durations) * 0.95), len(durations) - 1)],
+        "records_per_run": statistics.mean(records),
+        "dropped": governor.get("rate_limited", 0) + governor.get("sampled_out", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--wardrobe", type=int, default=120, help="Synthetic wardrobe size")
+    parser.add_argument("--modes", default="info,governed,warning")
+    parser.add_argument("--sink", default=os.devnull, help="Where log output is written")
+    args = parser.parse_args()
+
+    with open(args.sink, "w") as sink:
+        results = [asyncio.run(run_mode(mode.strip(), args.runs, args.wardrobe, sink)) for mode in args.modes.split(",")]
+
+    print(f"{'mode':<10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'records/run':>12} {'dropped':>8}")
+    for result in results:
+        print(
+            f"{result['mode']:<10} {result['mean_ms']:>9.2f} {result['p50_ms']:>9.2f} "
+            f"{result['p95_ms']:>9.2f} {result['records_per_run']:>12.1f} {result['dropped']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
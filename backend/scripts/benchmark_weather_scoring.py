@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the weather analyzer over a synthetic wardrobe.
+
+Scores N items with metadata (no Firestore needed) four ways:
+    per-item  - the old per-item analyzer (tests/reference_weather_scoring.py)
+    cold      - weather feature caches cleared before every run
+    warm      - features and matrix cached, a new weather bucket every run
+    bucket    - same weather again, scores served from the bucket cache
+
+Logging is disabled so the numbers reflect scoring work only.
+
+Usage:
+    python backend/scripts/benchmark_weather_scoring.py [--items 300] [--runs 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from reference_weather_scoring import reference_analyze_weather_scores  # noqa: E402
+from src.custom_types.wardrobe import ClothingItem  # noqa: E402
+from src.services.robust_outfit_generation_service import RobustOutfitGenerationService  # noqa: E402
+from src.services.scoring.weather_analyzer import weather_feature_cache, weather_matrix_cache  # noqa: E402
+
+TYPES = ["shirt", "pants", "shorts", "jacket", "sweater", "boots", "sandals", "dress", "coat", "sneakers"]
+NAMES = ["wool", "linen", "cotton", "fleece", "waterproof", "light", "heavy", "long sleeve", "tank", "oxford"]
+WARMTH = ["heavy", "light", "medium", "breathable", "insulated"]
+
+
+def build_wardrobe(size: int) -> list:
+    return [
+        ClothingItem(
+            id=f"item-{index}",
+            name=f"{NAMES[index % len(NAMES)]} {TYPES[index % len(TYPES)]} {index}",
+            type=TYPES[index % len(TYPES)],
+            color="navy",
+            season=[["winter"], ["summer"], ["spring", "fall"], ["all"]][index % 4],
+            userId="benchmark-user",
+            updatedAt=1700000000000 + index,
+            metadata={"visualAttributes": {
+                "warmthFactor": WARMTH[index % len(WARMTH)],
+                "fabricWeight": ["light", "medium", "heavy"][index % 3],
+                "sleeveLength": ["short", "long"][index % 2],
+                "length": ["long", "shorts"][index % 2],
+                "temperatureCompatibility": {"minTemp": "40°F", "maxTemp": ">85", "optimalMin": 55, "optimalMax": 75},
+            }},
+        )
+        for index in range(size)
+    ]
+
+
+def time_runs(service, wardrobe: list, runs: int, mode: str) -> list:
+    durations = []
+    for run in range(runs):
+        temperature = 60.0 + run * 0.1 if mode == "warm" else 60.0
+        context = SimpleNamespace(weather=SimpleNamespace(temperature=temperature, condition="Rain"), occasion="casual")
+        item_scores = {item.id: {"item": item} for item in wardrobe}
+        if mode == "cold":
+            weather_feature_cache.clear()
+            weather_matrix_cache.clear()
+        start = time.perf_counter()
+        if mode == "per-item":
+            asyncio.run(reference_analyze_weather_scores(service, context, item_scores))
+        else:
+            asyncio.run(service._analyze_weather_scores(context, item_scores))
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    service = RobustOutfitGenerationService()
+    wardrobe = build_wardrobe(args.items)
+
+    print(f"{'mode':<9} {'items':>6} {'mean ms':>9} {'p50 ms':>9}")
+    for mode in ("per-item", "cold", "warm", "bucket"):
+        durations = time_runs(service, wardrobe, args.runs, mode)
+        print(f"{mode:<9} {args.items:>6} {statistics.mean(durations):>9.2f} {statistics.median(durations):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
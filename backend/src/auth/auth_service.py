@@ -1,12 +1,56 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from functools import lru_cache
 from typing import Optional
 # Firebase imports moved inside function to prevent import-time crashes
 # from firebase_admin import auth
 from ..custom_types.profile import UserProfile
+from .token_cache import TokenVerificationError, verify_firebase_token
 
 security = HTTPBearer()
 
+
+def _profile_from_claims(decoded_token: dict) -> UserProfile:
+    """Build the request's UserProfile from verified token claims."""
+    profile = _validated_profile(
+        decoded_token['uid'],
+        decoded_token.get('name', 'User'),
+        decoded_token.get('email', ''),
+    )
+    # Deep copy: callers get their own nested dicts without re-running validation
+    return profile.model_copy(deep=True)
+
+
+@lru_cache(maxsize=4096)
+def _validated_profile(user_id: str, name: str, email: str) -> UserProfile:
+    return UserProfile(
+        id=user_id,
+        name=name,
+        email=email,
+        preferences={
+            "style": ["Casual", "Business Casual"],
+            "colors": ["Black", "White", "Blue"],
+            "occasions": ["Casual", "Business"]
+        },
+        measurements={
+            "height": 175,
+            "weight": 70,
+            "bodyType": "average"
+        },
+        stylePreferences=[],
+        bodyType="average",
+        createdAt=1234567890,
+        updatedAt=1234567890
+    )
+
+
+def _token_error_to_http(error: TokenVerificationError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token validation failed" if error.clock_skew else "Invalid token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> UserProfile:
     """
     Authenticate user using Firebase JWT token.
@@ -69,91 +113,15 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             )
             return user
         
-        # Verify Firebase JWT token
+        # Verify Firebase JWT token (cached until the token expires)
         try:
-            import time
             verify_start = time.time()
-            logger.info(f"⏱️ AUTH: Starting token verification... ({time.time() - auth_start:.2f}s)")
-            # Try with default settings first
-            decoded_token = auth.verify_id_token(credentials.credentials)
-            logger.info(f"⏱️ AUTH: Token verified successfully ({time.time() - verify_start:.2f}s, total: {time.time() - auth_start:.2f}s)")
-            user_id = decoded_token['uid']
-            email = (decoded_token.get('email', '') if decoded_token else '')
-            name = (decoded_token.get('name', 'User') if decoded_token else 'User')
-            
-            # Create user profile from token data
-            user = UserProfile(
-                id=user_id,
-                name=name,
-                email=email,
-                preferences={
-                    "style": ["Casual", "Business Casual"],
-                    "colors": ["Black", "White", "Blue"],
-                    "occasions": ["Casual", "Business"]
-                },
-                measurements={
-                    "height": 175,
-                    "weight": 70,
-                    "bodyType": "average"
-                },
-                stylePreferences=[],
-                bodyType="average",
-                createdAt=1234567890,
-                updatedAt=1234567890
-            )
-            # print(f"🔍 DEBUG: User profile created successfully for: {user_id}")
-            return user
-            
-        except Exception as e:
-            # print(f"🔍 DEBUG: Firebase token verification failed: {e}")
-            # If it's a clock issue, try with more lenient settings
-            if "Token used too early" in str(e) or "clock" in str(e).lower():
-                # print(f"🔍 DEBUG: Clock skew detected, trying with lenient settings: {e}")
-                try:
-                    # Try with a more lenient clock skew tolerance
-                    decoded_token = auth.verify_id_token(credentials.credentials, check_revoked=False)
-                    user_id = decoded_token['uid']
-                    email = (decoded_token.get('email', '') if decoded_token else '')
-                    name = (decoded_token.get('name', 'User') if decoded_token else 'User')
-                    # print(f"🔍 DEBUG: Token verified with lenient settings for user: {user_id}")
-                    
-                    # Create user profile from token data
-                    user = UserProfile(
-                        id=user_id,
-                        name=name,
-                        email=email,
-                        preferences={
-                            "style": ["Casual", "Business Casual"],
-                            "colors": ["Black", "White", "Blue"],
-                            "occasions": ["Casual", "Business"]
-                        },
-                        measurements={
-                            "height": 175,
-                            "weight": 70,
-                            "bodyType": "average"
-                        },
-                        stylePreferences=[],
-                        bodyType="average",
-                        createdAt=1234567890,
-                        updatedAt=1234567890
-                    )
-                    # print(f"🔍 DEBUG: User profile created successfully for: {user_id}")
-                    return user
-                    
-                except Exception as e2:
-                    # print(f"🔍 DEBUG: Still failed with lenient settings: {e2}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token validation failed",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-            else:
-                # print(f"🔍 DEBUG: Non-clock related token error: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+            decoded_token = verify_firebase_token(credentials.credentials)
+            logger.info(f"⏱️ AUTH: Token verified ({time.time() - verify_start:.3f}s, total: {time.time() - auth_start:.3f}s)")
+        except TokenVerificationError as e:
+            raise _token_error_to_http(e)
+        
+        return _profile_from_claims(decoded_token)
             
     except HTTPException as http_exc:
         # Log HTTP exceptions before re-raising
@@ -215,77 +183,13 @@ async def get_current_user_optional(credentials: HTTPAuthorizationCredentials =
             )
             return user
         
-        # Try to authenticate real user
-        # print("🔍 DEBUG: Attempting to authenticate real user in get_current_user_optional")
+        # Try to authenticate real user (cached until the token expires)
         try:
-            # Try with default settings first
-            decoded_token = auth.verify_id_token(credentials.credentials)
-            user_id = decoded_token['uid']
-            email = (decoded_token.get('email', '') if decoded_token else '')
-            name = (decoded_token.get('name', 'User') if decoded_token else 'User')
-            # print(f"🔍 DEBUG: Real user authenticated successfully: {user_id}")
-            
-            # Create user profile from token data
-            user = UserProfile(
-                id=user_id,
-                name=name,
-                email=email,
-                preferences={
-                    "style": ["Casual", "Business Casual"],
-                    "colors": ["Black", "White", "Blue"],
-                    "occasions": ["Casual", "Business"]
-                },
-                measurements={
-                    "height": 175,
-                    "weight": 70,
-                    "bodyType": "average"
-                },
-                stylePreferences=[],
-                bodyType="average",
-                createdAt=1234567890,
-                updatedAt=1234567890
-            )
-            return user
-            
-        except Exception as e:
-            # print(f"🔍 DEBUG: Real user authentication failed in get_current_user_optional: {e}")
-            # If it's a clock issue, try with more lenient settings
-            if "Token used too early" in str(e) or "clock" in str(e).lower():
-                # print(f"🔍 DEBUG: Clock skew detected, trying with lenient settings: {e}")
-                try:
-                    decoded_token = auth.verify_id_token(credentials.credentials, check_revoked=False)
-                    user_id = decoded_token['uid']
-                    email = (decoded_token.get('email', '') if decoded_token else '')
-                    name = (decoded_token.get('name', 'User') if decoded_token else 'User')
-                    # print(f"🔍 DEBUG: Real user authenticated with lenient settings: {user_id}")
-                    
-                    user = UserProfile(
-                        id=user_id,
-                        name=name,
-                        email=email,
-                        preferences={
-                            "style": ["Casual", "Business Casual"],
-                            "colors": ["Black", "White", "Blue"],
-                            "occasions": ["Casual", "Business"]
-                        },
-                        measurements={
-                            "height": 175,
-                            "weight": 70,
-                            "bodyType": "average"
-                        },
-                        stylePreferences=[],
-                        bodyType="average",
-                        createdAt=1234567890,
-                        updatedAt=1234567890
-                    )
-                    return user
-                    
-                except Exception as e2:
-                    # print(f"🔍 DEBUG: Still failed with lenient settings: {e2}")
-                    return None
-            else:
-                # print(f"🔍 DEBUG: Non-clock related token error: {e}")
-                return None
+            decoded_token = verify_firebase_token(credentials.credentials)
+        except TokenVerificationError:
+            return None
+        
+        return _profile_from_claims(decoded_token)
                 
     except Exception as e:
         # print(f"🔍 DEBUG: Error in get_current_user_optional: {e}")
@@ -308,47 +212,16 @@ async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depend
         # print(f"🔍 DEBUG: Token received: {credentials.credentials[:20]}...")
         # print(f"🔍 DEBUG: Full token: {credentials.credentials}")
         
-        # Verify Firebase JWT token
+        # Verify Firebase JWT token (cached until the token expires)
         try:
-            # print("🔍 DEBUG: Attempting Firebase token verification for user ID...")
-            # Import Firebase inside function to prevent import-time crashes
-            try:
-                from firebase_admin import auth
-            except ImportError as e:
-                # print(f"⚠️ Firebase import failed: {e}")
-                raise HTTPException(status_code=500, detail="Authentication service unavailable")
-            
-            decoded_token = auth.verify_id_token(credentials.credentials)
-            user_id = decoded_token['uid']
-            # print(f"🔍 DEBUG: Token verified successfully for user ID: {user_id}")
-            return user_id
-            
-        except Exception as e:
-            # print(f"🔍 DEBUG: Firebase token verification failed: {e}")
-            # print(f"🔍 DEBUG: Token verification error type: {type(e).__name__}")
-            # print(f"🔍 DEBUG: Token verification error details: {str(e)}")
-            # If it's a clock issue, try with more lenient settings
-            if "Token used too early" in str(e) or "clock" in str(e).lower():
-                # print(f"🔍 DEBUG: Clock skew detected, trying with lenient settings: {e}")
-                try:
-                    decoded_token = auth.verify_id_token(credentials.credentials, check_revoked=False)
-                    user_id = decoded_token['uid']
-                    # print(f"🔍 DEBUG: Token verified with lenient settings for user ID: {user_id}")
-                    return user_id
-                except Exception as e2:
-                    # print(f"🔍 DEBUG: Still failed with lenient settings: {e2}")
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token validation failed",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
-            else:
-                # print(f"🔍 DEBUG: Non-clock related token error: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+            decoded_token = verify_firebase_token(credentials.credentials)
+        except ImportError as e:
+            # print(f"⚠️ Firebase import failed: {e}")
+            raise HTTPException(status_code=500, detail="Authentication service unavailable")
+        except TokenVerificationError as e:
+            raise _token_error_to_http(e)
+        
+        return decoded_token['uid']
             
     except HTTPException:
         raise
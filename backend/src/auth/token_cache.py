@@ -0,0 +1,208 @@
+"""
+Verified Firebase ID token cache.
+
+Firebase ID tokens are valid for up to an hour and every authenticated request
+presents the same token, so the decoded claims are cached (keyed by a SHA-256
+of the token, never the token itself) until the token's ``exp``. Callers get their own copy of the claims, so
+mutating them cannot leak into later requests. Google's public signing keys
+are fetched and refreshed in the background so a certificate outage shows up
+in the stats before it shows up as failed sign-ins.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from ..core.cache import BoundedStore, register_bounded_store
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on cached tokens (roughly one per active signed-in device)
+MAX_CACHED_TOKENS = 10000
+
+# Never trust cached claims longer than this, even if ``exp`` is further out
+MAX_TOKEN_CACHE_SECONDS = 60 * 60
+
+# How often the background task re-fetches Google's public signing keys
+PUBLIC_KEY_REFRESH_SECONDS = 30 * 60
+
+# Google's published X.509 certificates for Firebase ID token signatures
+FIREBASE_ID_TOKEN_CERT_URL = "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+
+_verified_tokens = register_bounded_store(BoundedStore(
+    "verified_tokens",
+    max_entries=MAX_CACHED_TOKENS,
+    ttl=MAX_TOKEN_CACHE_SECONDS,
+    refresh_on_access=False,
+))
+
+_latency_lock = threading.Lock()
+_verification_stats = {
+    "verifications": 0,
+    "failures": 0,
+    "clock_skew_retries": 0,
+    "total_ms": 0.0,
+    "max_ms": 0.0,
+}
+_recent_latencies_ms = deque(maxlen=500)
+
+_refresh_thread: Optional[threading.Thread] = None
+_refresh_stop = threading.Event()
+_public_keys: Dict[str, Any] = {"key_ids": [], "fetched_at": None}
+
+
+class TokenVerificationError(Exception):
+    """Raised when Firebase rejects an ID token."""
+
+    def __init__(self, message: str, clock_skew: bool = False):
+        super().__init__(message)
+        self.clock_skew = clock_skew
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _is_clock_skew_error(error: Exception) -> bool:
+    return "Token used too early" in str(error) or "clock" in str(error).lower()
+
+
+def _record_latency(elapsed_ms: float, failed: bool = False) -> None:
+    with _latency_lock:
+        _verification_stats["verifications"] += 1
+        _verification_stats["total_ms"] += elapsed_ms
+        _verification_stats["max_ms"] = max(_verification_stats["max_ms"], elapsed_ms)
+        if failed:
+            _verification_stats["failures"] += 1
+        _recent_latencies_ms.append(elapsed_ms)
+
+
+def _verify_with_firebase(token: str) -> Dict[str, Any]:
+    """Verify a token with Firebase Admin, retrying once on clock-skew errors."""
+    from firebase_admin import auth
+
+    verify_start = time.time()
+    try:
+        try:
+            decoded_token = auth.verify_id_token(token)
+        except Exception as e:
+            if not _is_clock_skew_error(e):
+                raise TokenVerificationError(str(e)) from e
+            with _latency_lock:
+                _verification_stats["clock_skew_retries"] += 1
+            try:
+                decoded_token = auth.verify_id_token(token, check_revoked=False)
+            except Exception as e2:
+                raise TokenVerificationError(str(e2), clock_skew=True) from e2
+    except TokenVerificationError:
+        _record_latency((time.time() - verify_start) * 1000, failed=True)
+        raise
+
+    _record_latency((time.time() - verify_start) * 1000)
+    return decoded_token
+
+
+def verify_firebase_token(token: str) -> Dict[str, Any]:
+    """
+    Return the decoded claims for a Firebase ID token, verifying it only on a
+    cache miss.
+
+    Raises:
+        TokenVerificationError: if Firebase rejects the token
+        ImportError: if firebase_admin is unavailable
+    """
+    key = _token_key(token)
+    cached_claims = _verified_tokens.get(key)
+    if cached_claims is not None:
+        return dict(cached_claims)
+
+    decoded_token = _verify_with_firebase(token)
+
+    expires_at = decoded_token.get("exp") if isinstance(decoded_token, dict) else None
+    ttl = MAX_TOKEN_CACHE_SECONDS
+    if isinstance(expires_at, (int, float)):
+        ttl = min(ttl, expires_at - time.time())
+    if ttl > 0:
+        _verified_tokens.set(key, dict(decoded_token), ttl=ttl)
+    return decoded_token
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token from the cache (e.g. after sign-out or revocation)."""
+    _verified_tokens.pop(_token_key(token))
+
+
+def prefetch_public_keys() -> bool:
+    """Fetch Google's current ID token signing certificates and record their key ids."""
+    try:
+        import google.auth.transport.requests
+
+        request = google.auth.transport.requests.Request()
+        response = request(url=FIREBASE_ID_TOKEN_CERT_URL, method="GET")
+        if response.status != 200:
+            raise ValueError(f"HTTP {response.status}")
+        certificates = json.loads(response.data)
+        _public_keys.update(key_ids=sorted(certificates), fetched_at=time.time())
+        logger.debug(f"🔑 Firebase public keys prefetched ({len(certificates)} keys)")
+        return True
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to prefetch Firebase public keys: {e}")
+        return False
+
+
+def _refresh_public_keys_loop(interval_seconds: float) -> None:
+    while not _refresh_stop.is_set():
+        prefetch_public_keys()
+        _refresh_stop.wait(interval_seconds)
+
+
+def start_public_key_refresh(interval_seconds: float = PUBLIC_KEY_REFRESH_SECONDS) -> None:
+    """Start the background public key refresh (idempotent)."""
+    global _refresh_thread
+    if _refresh_thread is not None and _refresh_thread.is_alive():
+        return
+    _refresh_stop.clear()
+    _refresh_thread = threading.Thread(
+        target=_refresh_public_keys_loop,
+        args=(interval_seconds,),
+        name="firebase-public-key-refresh",
+        daemon=True,
+    )
+    _refresh_thread.start()
+
+
+def stop_public_key_refresh() -> None:
+    _refresh_stop.set()
+
+
+def get_token_cache_stats() -> Dict[str, Any]:
+    """Cache hit rate and Firebase verification latency metrics."""
+    cache_stats = _verified_tokens.get_stats()
+    with _latency_lock:
+        stats = dict(_verification_stats)
+        latencies = sorted(_recent_latencies_ms)
+
+    def percentile(p: float) -> Optional[float]:
+        if not latencies:
+            return None
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))], 2)
+
+    verifications = stats["verifications"]
+    return {
+        "cache": cache_stats,
+        "hit_rate": cache_stats["hit_rate"],
+        "verifications": verifications,
+        "failures": stats["failures"],
+        "clock_skew_retries": stats["clock_skew_retries"],
+        "avg_verification_ms": round(stats["total_ms"] / verifications, 2) if verifications else None,
+        "max_verification_ms": round(stats["max_ms"], 2),
+        "p50_verification_ms": percentile(50),
+        "p95_verification_ms": percentile(95),
+        "background_refresh_running": _refresh_thread is not None and _refresh_thread.is_alive(),
+        "public_key_ids": list(_public_keys["key_ids"]),
+        "public_keys_fetched_at": _public_keys["fetched_at"],
+    }
@@ -64,6 +64,10 @@ try:
         logger.error(f"❌ FIREBASE INIT: Firestore connection test failed: {test_error}")
         raise
     
+    # Count per-request reads/writes (see core/firestore_accounting.py)
+    from ..core.firestore_accounting import wrap_client
+    db = wrap_client(db)
+    
     firebase_initialized = True
     logger.info(f"✅ FIREBASE INIT: Firebase initialization complete - firebase_initialized={firebase_initialized}")
     
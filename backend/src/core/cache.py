@@ -5,12 +5,15 @@ Provides in-memory and Redis-based caching for performance optimization.
 
 import json
 import hashlib
+import heapq
+import sys
 import time
-from typing import Any, Optional, Dict, List, Union
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Dict, List, Union
 from datetime import datetime, timedelta
 from functools import wraps
 import asyncio
-from threading import Lock
+from threading import Lock, RLock
 
 from .logging import get_logger
 
@@ -226,6 +229,214 @@ class CacheManager:
 # Global cache manager instance
 cache_manager = CacheManager()
 
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate deep size in bytes of plain Python data (dicts, lists, sets, scalars)."""
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, _depth + 1) for v in value)
+    elif hasattr(value, "__dict__") and not isinstance(value, type):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+_MISSING = object()
+
+
+class BoundedStore:
+    """
+    Dict-like per-key state store with LRU and TTL eviction.
+
+    Long-lived per-user/per-session state (diversity history, generation
+    sessions) lives here instead of unbounded module dicts. Expiry uses a
+    min-heap of deadlines, so purging costs O(log n) per expired key rather
+    than a scan of the whole store. Keys evicted for capacity can be spilled
+    to a shared tier via ``spill`` (e.g. Firestore) so other instances, or
+    this one later, can reload them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        ttl: Optional[float] = None,
+        default_factory: Optional[Callable[[], Any]] = None,
+        refresh_on_access: bool = True,
+        spill: Optional[Callable[[str, Any], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.default_factory = default_factory
+        self.refresh_on_access = refresh_on_access
+        self.spill = spill
+        self.clock = clock
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._deadlines: Dict[Any, float] = {}
+        self._heap: List[tuple] = []
+        self._lock = RLock()
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "expirations": 0, "evictions": 0, "spills": 0}
+
+    # -- internal helpers -------------------------------------------------
+
+    def _schedule(self, key: Any, now: float, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        if ttl is None:
+            return
+        deadline = now + ttl
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, id(key), key))
+        # Refreshed keys leave stale heap entries behind; compact occasionally
+        if len(self._heap) > 2 * len(self._data) + 64:
+            self._heap = [(d, i, k) for d, i, k in self._heap if self._deadlines.get(k) == d]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: Any) -> Any:
+        self._deadlines.pop(key, None)
+        return self._data.pop(key)
+
+    def _purge_expired(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                self._remove(key)
+                self.stats["expirations"] += 1
+
+    def _evict_overflow(self) -> None:
+        while len(self._data) > self.max_entries:
+            key, value = self._data.popitem(last=False)
+            self._deadlines.pop(key, None)
+            self.stats["evictions"] += 1
+            if self.spill:
+                try:
+                    self.spill(key, value)
+                    self.stats["spills"] += 1
+                except Exception as e:
+                    logger.warning(f"Failed to spill {self.name} entry: {e}")
+
+    # -- mapping API --------------------------------------------------------
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            now = self.clock()
+            self._purge_expired(now)
+            if key not in self._data:
+                self.stats["misses"] += 1
+                return default
+            self.stats["hits"] += 1
+            self._data.move_to_end(key)
+            if self.refresh_on_access:
+                self._schedule(key, now)
+            return self._data[key]
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if self.default_factory is None:
+                raise KeyError(key)
+            value = self.default_factory()
+            self[key] = value
+            return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.set(key, value)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the store default for this key."""
+        with self._lock:
+            now = self.clock()
+            self._purge_expired(now)
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._schedule(key, now, ttl)
+            self.stats["sets"] += 1
+            self._evict_overflow()
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            self._purge_expired(self.clock())
+            return key in self._data
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._purge_expired(self.clock())
+            return len(self._data)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> List[Any]:
+        with self._lock:
+            self._purge_expired(self.clock())
+            return list(self._data.keys())
+
+    def items(self) -> List[tuple]:
+        with self._lock:
+            self._purge_expired(self.clock())
+            return list(self._data.items())
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                return self._remove(key)
+            return default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._deadlines.clear()
+            self._heap.clear()
+
+    def expires_at(self, key: Any) -> Optional[float]:
+        """Deadline (epoch seconds) of a key, or None without a TTL."""
+        with self._lock:
+            return self._deadlines.get(key)
+
+    def cleanup_expired(self) -> None:
+        with self._lock:
+            self._purge_expired(self.clock())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts, eviction counters and approximate memory footprint."""
+        with self._lock:
+            self._purge_expired(self.clock())
+            total_requests = self.stats["hits"] + self.stats["misses"]
+            return {
+                "size": len(self._data),
+                "max_size": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "memory_bytes": sum(estimate_size(k) + estimate_size(v) for k, v in self._data.items()),
+                "hit_rate": round(self.stats["hits"] / total_requests * 100, 2) if total_requests else 0,
+                **self.stats,
+            }
+
+
+# Named bounded stores, reported by the monitoring routes
+bounded_stores: Dict[str, BoundedStore] = {}
+
+
+def register_bounded_store(store: BoundedStore) -> BoundedStore:
+    """Register a bounded store so its memory usage shows up in monitoring."""
+    bounded_stores[store.name] = store
+    return store
+
+
+def get_bounded_store_stats() -> Dict[str, Dict[str, Any]]:
+    """Statistics (including approximate memory) for every registered bounded store."""
+    return {name: store.get_stats() for name, store in list(bounded_stores.items())}
+
 def cached(cache_name: str, ttl: Optional[int] = None, key_prefix: str = ""):
     """
     Decorator for caching function results.
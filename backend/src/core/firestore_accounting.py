@@ -0,0 +1,442 @@
+"""
+Per-request Firestore usage accounting.
+
+``AccountedClient`` wraps the Firestore client and counts documents read and
+written, queries issued and time spent in Firestore calls into the
+``FirestoreUsage`` held by ``firestore_usage_var``. The request middleware sets
+a fresh usage per request; calls made outside a request are not counted.
+
+References, queries, batches, transactions and snapshots handed out by the
+wrapper are wrapped too, and are unwrapped again whenever they are passed
+back into the real client, so callers use it exactly like the plain client.
+
+Counting follows Firestore billing: every document returned by a query or
+``get`` is one read, an aggregation ``count()`` is one read, and each
+set/update/create/delete, including those in batches and transactions, is
+one write.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+QUERY_CHAIN_METHODS = frozenset({
+    'where', 'order_by', 'limit', 'limit_to_last', 'offset', 'select',
+    'start_at', 'start_after', 'end_at', 'end_before',
+})
+WRITE_METHODS = frozenset({'set', 'update', 'create', 'delete'})
+
+
+class FirestoreBudgetExceeded(AssertionError):
+    """A request or block read or wrote more documents than its budget allows."""
+
+
+class FirestoreUsage:
+    """Firestore operations attributed to one request."""
+
+    __slots__ = ('reads', 'writes', 'queries', 'duration_ms', 'collections')
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.queries = 0
+        self.duration_ms = 0.0
+        # collection -> [reads, writes]
+        self.collections: Dict[str, list] = {}
+
+    def record(self, collection: Optional[str], reads: int = 0, writes: int = 0, queries: int = 0, duration_ms: float = 0.0) -> None:
+        self.reads += reads
+        self.writes += writes
+        self.queries += queries
+        self.duration_ms += duration_ms
+        counts = self.collections.setdefault(collection or 'unknown', [0, 0])
+        counts[0] += reads
+        counts[1] += writes
+
+    def check(self, max_reads: Optional[int] = None, max_writes: Optional[int] = None, label: str = 'block') -> None:
+        """Raise ``FirestoreBudgetExceeded`` if the usage is over either limit."""
+        if max_reads is not None and self.reads > max_reads:
+            raise FirestoreBudgetExceeded(f"{label} read {self.reads} Firestore documents (budget {max_reads}): {self.collections}")
+        if max_writes is not None and self.writes > max_writes:
+            raise FirestoreBudgetExceeded(f"{label} wrote {self.writes} Firestore documents (budget {max_writes}): {self.collections}")
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            'X-Firestore-Reads': str(self.reads),
+            'X-Firestore-Writes': str(self.writes),
+            'X-Firestore-Queries': str(self.queries),
+            'X-Firestore-Time-Ms': f"{self.duration_ms:.1f}",
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'reads': self.reads,
+            'writes': self.writes,
+            'queries': self.queries,
+            'duration_ms': round(self.duration_ms, 2),
+            'collections': {name: {'reads': counts[0], 'writes': counts[1]} for name, counts in self.collections.items()},
+        }
+
+
+firestore_usage_var: ContextVar[Optional[FirestoreUsage]] = ContextVar("firestore_usage", default=None)
+
+
+def _record(collection: Optional[str], started: float, reads: int = 0, writes: int = 0, queries: int = 0) -> None:
+    usage = firestore_usage_var.get()
+    if usage is not None:
+        usage.record(collection, reads, writes, queries, (time.perf_counter() - started) * 1000)
+
+
+@contextmanager
+def firestore_usage(max_reads: Optional[int] = None, max_writes: Optional[int] = None, label: str = 'block') -> Iterator[FirestoreUsage]:
+    """
+    Count Firestore usage inside a ``with`` block.
+
+    Raises ``FirestoreBudgetExceeded`` on exit when a limit is exceeded, so
+    tests can pin how many documents a code path may touch.
+    """
+    usage = FirestoreUsage()
+    token = firestore_usage_var.set(usage)
+    try:
+        yield usage
+    finally:
+        firestore_usage_var.reset(token)
+    usage.check(max_reads, max_writes, label)
+
+
+# ---------------------------------------------------------------------------
+# Client wrapper
+# ---------------------------------------------------------------------------
+
+def _unwrap(value):
+    return value._wrapped if isinstance(value, _Accounted) else value
+
+
+def _unwrap_args(args, kwargs):
+    return (
+        [_unwrap(arg) for arg in args],
+        {key: _unwrap(value) for key, value in kwargs.items()},
+    )
+
+
+class _Accounted:
+    """Delegating proxy; subclasses override the calls that cost reads/writes."""
+
+    __slots__ = ('_wrapped', '_collection')
+
+    def __init__(self, wrapped, collection: Optional[str] = None):
+        self._wrapped = wrapped
+        self._collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self._wrapped, name)
+
+    def __eq__(self, other):
+        return self._wrapped == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._wrapped)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._wrapped!r})"
+
+
+class AccountedSnapshot(_Accounted):
+    __slots__ = ()
+
+    @property
+    def reference(self):
+        return AccountedDocument(self._wrapped.reference, self._collection)
+
+
+def _accounted_stream(iterator, collection: Optional[str]):
+    """Yield wrapped snapshots, counting one query plus one read per document."""
+    reads = 0
+    elapsed = 0.0
+    try:
+        while True:
+            step = time.perf_counter()
+            try:
+                snapshot = next(iterator)
+            except StopIteration:
+                elapsed += time.perf_counter() - step
+                return
+            elapsed += time.perf_counter() - step
+            reads += 1
+            yield AccountedSnapshot(snapshot, collection)
+    finally:
+        usage = firestore_usage_var.get()
+        if usage is not None:
+            usage.record(collection, reads=reads, queries=1, duration_ms=elapsed * 1000)
+
+
+class AccountedAggregation(_Accounted):
+    __slots__ = ()
+
+    def get(self, *args, **kwargs):
+        started = time.perf_counter()
+        args, kwargs = _unwrap_args(args, kwargs)
+        result = self._wrapped.get(*args, **kwargs)
+        _record(self._collection, started, reads=1, queries=1)
+        return result
+
+
+class AccountedQuery(_Accounted):
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._wrapped, name)
+        if name not in QUERY_CHAIN_METHODS:
+            return attribute
+
+        def chained(*args, **kwargs):
+            args, kwargs = _unwrap_args(args, kwargs)
+            return AccountedQuery(attribute(*args, **kwargs), self._collection)
+        return chained
+
+    def stream(self, *args, **kwargs):
+        args, kwargs = _unwrap_args(args, kwargs)
+        return _accounted_stream(iter(self._wrapped.stream(*args, **kwargs)), self._collection)
+
+    def get(self, *args, **kwargs):
+        started = time.perf_counter()
+        args, kwargs = _unwrap_args(args, kwargs)
+        snapshots = list(self._wrapped.get(*args, **kwargs))
+        _record(self._collection, started, reads=len(snapshots), queries=1)
+        return [AccountedSnapshot(snapshot, self._collection) for snapshot in snapshots]
+
+    def count(self, *args, **kwargs):
+        return AccountedAggregation(self._wrapped.count(*args, **kwargs), self._collection)
+
+
+class AccountedCollection(AccountedQuery):
+    __slots__ = ()
+
+    def document(self, *args, **kwargs):
+        return AccountedDocument(self._wrapped.document(*args, **kwargs), self._collection)
+
+    def add(self, *args, **kwargs):
+        started = time.perf_counter()
+        update_time, reference = self._wrapped.add(*args, **kwargs)
+        _record(self._collection, started, writes=1)
+        return update_time, AccountedDocument(reference, self._collection)
+
+    def list_documents(self, *args, **kwargs):
+        started = time.perf_counter()
+        references = list(self._wrapped.list_documents(*args, **kwargs))
+        _record(self._collection, started, reads=len(references), queries=1)
+        return [AccountedDocument(reference, self._collection) for reference in references]
+
+
+class AccountedDocument(_Accounted):
+    __slots__ = ()
+
+    def get(self, *args, **kwargs):
+        started = time.perf_counter()
+        args, kwargs = _unwrap_args(args, kwargs)
+        snapshot = self._wrapped.get(*args, **kwargs)
+        _record(self._collection, started, reads=1)
+        return AccountedSnapshot(snapshot, self._collection)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._wrapped, name)
+        if name not in WRITE_METHODS:
+            return attribute
+
+        def write(*args, **kwargs):
+            started = time.perf_counter()
+            args, kwargs = _unwrap_args(args, kwargs)
+            result = attribute(*args, **kwargs)
+            _record(self._collection, started, writes=1)
+            return result
+        return write
+
+    def collection(self, collection_id: str):
+        return AccountedCollection(self._wrapped.collection(collection_id), collection_id)
+
+    @property
+    def parent(self):
+        return AccountedCollection(self._wrapped.parent, self._collection)
+
+
+class AccountedBatch(_Accounted):
+    """Counts staged writes when the batch commits."""
+
+    __slots__ = ('_pending',)
+
+    def __init__(self, wrapped):
+        super().__init__(wrapped)
+        self._pending: Dict[Optional[str], int] = {}
+
+    def __getattr__(self, name):
+        attribute = getattr(self._wrapped, name)
+        if name not in WRITE_METHODS:
+            return attribute
+
+        def stage(reference, *args, **kwargs):
+            collection = reference._collection if isinstance(reference, _Accounted) else None
+            args, kwargs = _unwrap_args(args, kwargs)
+            result = attribute(_unwrap(reference), *args, **kwargs)
+            self._pending[collection] = self._pending.get(collection, 0) + 1
+            return result
+        return stage
+
+    def commit(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._wrapped.commit(*args, **kwargs)
+        usage = firestore_usage_var.get()
+        if usage is not None:
+            duration_ms = (time.perf_counter() - started) * 1000
+            for collection, writes in self._pending.items():
+                usage.record(collection, writes=writes, duration_ms=duration_ms)
+                duration_ms = 0.0
+        self._pending = {}
+        return result
+
+
+class AccountedTransaction(AccountedBatch):
+    """
+    Counts transactional reads as they happen and writes when staged.
+
+    ``firestore.transactional`` drives the begin/commit/rollback internals,
+    which are delegated to the real transaction unchanged.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        attribute = getattr(self._wrapped, name)
+        if name not in WRITE_METHODS:
+            return attribute
+
+        def stage(reference, *args, **kwargs):
+            collection = reference._collection if isinstance(reference, _Accounted) else None
+            args, kwargs = _unwrap_args(args, kwargs)
+            started = time.perf_counter()
+            result = attribute(_unwrap(reference), *args, **kwargs)
+            _record(collection, started, writes=1)
+            return result
+        return stage
+
+    def get(self, ref_or_query, *args, **kwargs):
+        collection = ref_or_query._collection if isinstance(ref_or_query, _Accounted) else None
+        args, kwargs = _unwrap_args(args, kwargs)
+        # Both document and query reads come back as a snapshot generator
+        return _accounted_stream(iter(self._wrapped.get(_unwrap(ref_or_query), *args, **kwargs)), collection)
+
+    def get_all(self, references, *args, **kwargs):
+        args, kwargs = _unwrap_args(args, kwargs)
+        return _accounted_stream(iter(self._wrapped.get_all([_unwrap(ref) for ref in references], *args, **kwargs)), None)
+
+    def commit(self, *args, **kwargs):
+        return self._wrapped.commit(*args, **kwargs)
+
+
+class AccountedClient(_Accounted):
+    """Firestore client whose operations are counted into ``firestore_usage_var``."""
+
+    __slots__ = ()
+
+    def collection(self, *path: str):
+        return AccountedCollection(self._wrapped.collection(*path), path[-1] if len(path) % 2 else path[0])
+
+    def collection_group(self, collection_id: str):
+        return AccountedQuery(self._wrapped.collection_group(collection_id), collection_id)
+
+    def document(self, *path: str):
+        reference = self._wrapped.document(*path)
+        return AccountedDocument(reference, reference.parent.id)
+
+    def batch(self):
+        return AccountedBatch(self._wrapped.batch())
+
+    def transaction(self, *args, **kwargs):
+        return AccountedTransaction(self._wrapped.transaction(*args, **kwargs))
+
+    def get_all(self, references, *args, **kwargs):
+        args, kwargs = _unwrap_args(args, kwargs)
+        return _accounted_stream(iter(self._wrapped.get_all([_unwrap(ref) for ref in references], *args, **kwargs)), None)
+
+
+def wrap_client(client):
+    """Wrap ``client`` unless accounting is disabled with FIRESTORE_ACCOUNTING=off."""
+    if client is None or os.getenv("FIRESTORE_ACCOUNTING", "on").lower() in ("0", "off", "false", "no"):
+        return client
+    return AccountedClient(client)
+
+
+# ---------------------------------------------------------------------------
+# Per-route aggregation and budgets
+# ---------------------------------------------------------------------------
+
+def _parse_budgets(value: Optional[str]) -> Dict[str, int]:
+    """Parse ``"POST /api/outfits/generate=150,GET /api/wardrobe/=50"`` (method, route template)."""
+    budgets = {}
+    for entry in (value or "").split(","):
+        route, _, reads = entry.rpartition("=")
+        try:
+            budgets[route.strip()] = int(reads)
+        except ValueError:
+            continue
+    return budgets
+
+
+class FirestoreRouteStats:
+    """Per-route Firestore totals and read-budget checks."""
+
+    def __init__(self, read_budgets: Optional[Dict[str, int]] = None, raise_on_budget: bool = False):
+        self.read_budgets = read_budgets if read_budgets is not None else _parse_budgets(os.getenv("FIRESTORE_READ_BUDGETS"))
+        self.raise_on_budget = raise_on_budget or os.getenv("FIRESTORE_BUDGET_MODE", "warn").lower() == "raise"
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def record(self, route: str, usage: FirestoreUsage) -> None:
+        """Add a finished request; raises ``FirestoreBudgetExceeded`` in raise mode."""
+        budget = self.read_budgets.get(route)
+        over_budget = budget is not None and usage.reads > budget
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                stats = self._routes[route] = {
+                    'requests': 0, 'reads': 0, 'writes': 0, 'queries': 0,
+                    'duration_ms': 0.0, 'max_reads': 0, 'over_budget': 0,
+                }
+            stats['requests'] += 1
+            stats['reads'] += usage.reads
+            stats['writes'] += usage.writes
+            stats['queries'] += usage.queries
+            stats['duration_ms'] += usage.duration_ms
+            stats['max_reads'] = max(stats['max_reads'], usage.reads)
+            stats['over_budget'] += over_budget
+
+        if over_budget:
+            logger.warning("🔥 Firestore read budget exceeded for %s: %s reads (budget %s) %s",
+                           route, usage.reads, budget, usage.collections)
+            if self.raise_on_budget:
+                usage.check(max_reads=budget, label=route)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            routes = {route: dict(stats) for route, stats in self._routes.items()}
+        for route, stats in routes.items():
+            requests = stats['requests'] or 1
+            stats['avg_reads'] = round(stats['reads'] / requests, 2)
+            stats['avg_writes'] = round(stats['writes'] / requests, 2)
+            stats['avg_duration_ms'] = round(stats['duration_ms'] / requests, 2)
+            stats['duration_ms'] = round(stats['duration_ms'], 2)
+            stats['read_budget'] = self.read_budgets.get(route)
+        return dict(sorted(routes.items(), key=lambda entry: entry[1]['reads'], reverse=True))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+# Global instance
+firestore_route_stats = FirestoreRouteStats()
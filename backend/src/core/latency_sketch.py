@@ -0,0 +1,127 @@
+"""
+Latency sketches for in-process monitoring.
+
+``LatencyHistogram`` is a log-bucketed histogram (relative error ~1%) with
+O(1) record and merge by adding bucket counts. ``WindowedLatencySketch``
+keeps one histogram per minute in a fixed ring, so percentiles over any
+window up to the ring length are a merge of at most that many histograms
+and memory stays bounded regardless of traffic.
+"""
+
+import math
+import time
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Bucket i covers (GAMMA**(i-1), GAMMA**i]; estimates are within RELATIVE_ACCURACY
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Durations at or below this (ms) share a single bucket
+MIN_TRACKED_MS = 0.01
+
+
+class LatencyHistogram:
+    """Sparse log-bucketed histogram of durations in milliseconds."""
+
+    __slots__ = ('counts', 'zero_count', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value_ms: float) -> None:
+        value_ms = max(float(value_ms), 0.0)
+        if value_ms <= MIN_TRACKED_MS:
+            self.zero_count += 1
+        else:
+            index = math.ceil(math.log(value_ms) / LOG_GAMMA)
+            self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value_ms
+        self.min = min(self.min, value_ms)
+        self.max = max(self.max, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add ``other``'s samples into this histogram."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantiles(self, percentiles: Iterable[float]) -> List[Optional[float]]:
+        """
+        Durations at each percentile (0-100), one pass over the buckets.
+
+        Uses the same rank as sorting all samples and taking
+        ``durations[int(n * p / 100)]``.
+        """
+        percentiles = list(percentiles)
+        if self.count == 0:
+            return [None] * len(percentiles)
+
+        ranks = sorted((min(int(self.count * p / 100), self.count - 1), position) for position, p in enumerate(percentiles))
+        results: List[Optional[float]] = [None] * len(percentiles)
+        buckets: List[Tuple[float, int]] = [(self.min, self.zero_count)] if self.zero_count else []
+        buckets += [(2 * GAMMA ** index / (GAMMA + 1), self.counts[index]) for index in sorted(self.counts)]
+
+        seen = 0
+        next_rank = 0
+        for estimate, count in buckets:
+            seen += count
+            while next_rank < len(ranks) and ranks[next_rank][0] < seen:
+                results[ranks[next_rank][1]] = min(max(estimate, self.min), self.max)
+                next_rank += 1
+            if next_rank == len(ranks):
+                break
+        return results
+
+    def quantile(self, percentile: float) -> Optional[float]:
+        return self.quantiles([percentile])[0]
+
+
+class WindowedLatencySketch:
+    """Ring of per-minute ``LatencyHistogram``s covering ``window_minutes``."""
+
+    def __init__(self, window_minutes: int = 1440, bucket_seconds: int = 60, clock: Callable[[], float] = time.time):
+        self.window_minutes = window_minutes
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._slots: List[Optional[Tuple[int, LatencyHistogram]]] = [None] * window_minutes
+        self._lock = Lock()
+
+    def _bucket(self, now: Optional[float]) -> int:
+        return int((self.clock() if now is None else now) // self.bucket_seconds)
+
+    def record(self, value_ms: float, now: Optional[float] = None) -> None:
+        bucket = self._bucket(now)
+        position = bucket % self.window_minutes
+        with self._lock:
+            slot = self._slots[position]
+            if slot is None or slot[0] != bucket:
+                slot = (bucket, LatencyHistogram())
+                self._slots[position] = slot
+            slot[1].record(value_ms)
+
+    def merged(self, minutes: int, now: Optional[float] = None) -> LatencyHistogram:
+        """Merge the buckets of the last ``minutes`` (including the current one)."""
+        current = self._bucket(now)
+        merged = LatencyHistogram()
+        with self._lock:
+            for bucket in range(current - min(minutes, self.window_minutes) + 1, current + 1):
+                slot = self._slots[bucket % self.window_minutes]
+                if slot is not None and slot[0] == bucket:
+                    merged.merge(slot[1])
+        return merged
+
+    def quantiles(self, percentiles: Iterable[float], minutes: int, now: Optional[float] = None) -> List[Optional[float]]:
+        return self.merged(minutes, now).quantiles(percentiles)
@@ -1,14 +1,27 @@
 """
 Structured logging configuration for the Easy Outfit App backend.
 Provides JSON-formatted logging with error tracking and performance monitoring.
+
+By default records go through ``LogGovernor`` (per-logger sampling and
+token-bucket rate limits, see ``LogGovernor.from_env``) and are formatted and
+written by a ``QueueListener`` thread, so a request only pays for creating the
+``LogRecord``. Use lazy ``logger.info("... %s", value)`` formatting on hot
+paths: a record the governor drops is then never formatted at all.
 """
 
+import atexit
 import logging
 import json
+import os
+import queue
 import sys
+import threading
+import time
 import traceback
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Any, List, Optional
 from contextvars import ContextVar
 import uuid
 from fastapi import Request, Response
@@ -18,8 +31,249 @@ from starlette.types import ASGIApp
 # Context variable to store request ID
 request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
 
+
+class RequestLogStats:
+    """Log volume attributed to one request."""
+
+    __slots__ = ('count', 'bytes', 'suppressed')
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.suppressed = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"count": self.count, "bytes": self.bytes, "suppressed": self.suppressed}
+
+
+# Per-request log accounting, set by the request middleware
+request_log_stats_var: ContextVar[Optional[RequestLogStats]] = ContextVar("request_log_stats", default=None)
+
+
+class TokenBucket:
+    """Allows ``rate`` events per second with bursts of up to ``capacity``."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate: float, capacity: float, now: float = 0.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class _LoggerBudget:
+    __slots__ = ('bucket', 'sample_rate', 'sample_credit', 'emitted', 'dropped', 'pending_suppressed')
+
+    def __init__(self, bucket: TokenBucket, sample_rate: float):
+        self.bucket = bucket
+        self.sample_rate = sample_rate
+        self.sample_credit = 0.0
+        self.emitted = 0
+        self.dropped = 0
+        self.pending_suppressed = 0
+
+
+def _parse_logger_table(value: Optional[str]) -> Dict[str, float]:
+    """Parse ``"logger.name=1.5,other=2"`` into ``{"logger.name": 1.5, "other": 2.0}``."""
+    table = {}
+    for entry in (value or "").split(","):
+        name, _, number = entry.partition("=")
+        try:
+            table[name.strip()] = float(number)
+        except ValueError:
+            continue
+    return table
+
+
+class LogGovernor(logging.Filter):
+    """
+    Caps log volume per logger before records are formatted.
+
+    Records below WARNING are first sampled (``sample_rates``, keeping every
+    1/rate-th record deterministically), then every record below
+    ``exempt_level`` must take a token from its logger's bucket and from the
+    process-wide bucket. Overrides match the longest dotted logger prefix.
+    The next record a logger emits after drops carries ``suppressed=<n>``.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 50.0,
+        burst: float = 200.0,
+        global_rate_per_second: float = 400.0,
+        global_burst: float = 1000.0,
+        rate_overrides: Optional[Dict[str, float]] = None,
+        sample_rates: Optional[Dict[str, float]] = None,
+        exempt_level: int = logging.ERROR,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.rate_overrides = rate_overrides or {}
+        self.sample_rates = sample_rates or {}
+        self.exempt_level = exempt_level
+        self.clock = clock
+        self._global = TokenBucket(global_rate_per_second, global_burst, clock())
+        self._budgets: Dict[str, _LoggerBudget] = {}
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.rate_limited = 0
+        self.sampled_out = 0
+        self.requests: deque = deque(maxlen=1000)
+
+    @classmethod
+    def from_env(cls) -> "LogGovernor":
+        """
+        Build a governor from the environment.
+
+        LOG_RATE_LIMIT / LOG_RATE_BURST: per-logger records/sec and burst (50 / 200)
+        LOG_GLOBAL_RATE_LIMIT / LOG_GLOBAL_BURST: process-wide cap (400 / 1000),
+            kept under Railway's 500 logs/sec limit
+        LOG_RATE_LIMITS: per-logger overrides, e.g. "src.services.outfit_service=10"
+        LOG_SAMPLE_RATES: fraction of INFO/DEBUG records kept, e.g. "src.routes.outfits=0.1"
+        """
+        return cls(
+            rate_per_second=float(os.getenv("LOG_RATE_LIMIT", "50")),
+            burst=float(os.getenv("LOG_RATE_BURST", "200")),
+            global_rate_per_second=float(os.getenv("LOG_GLOBAL_RATE_LIMIT", "400")),
+            global_burst=float(os.getenv("LOG_GLOBAL_BURST", "1000")),
+            rate_overrides=_parse_logger_table(os.getenv("LOG_RATE_LIMITS")),
+            sample_rates=_parse_logger_table(os.getenv("LOG_SAMPLE_RATES")),
+        )
+
+    @staticmethod
+    def _lookup(name: str, table: Dict[str, float]) -> Optional[float]:
+        while True:
+            if name in table:
+                return table[name]
+            if "." not in name:
+                return None
+            name = name.rsplit(".", 1)[0]
+
+    def _budget(self, name: str, now: float) -> _LoggerBudget:
+        budget = self._budgets.get(name)
+        if budget is None:
+            rate = self._lookup(name, self.rate_overrides)
+            rate = self.rate_per_second if rate is None else rate
+            sample_rate = self._lookup(name, self.sample_rates)
+            budget = _LoggerBudget(
+                TokenBucket(rate, max(self.burst, rate), now),
+                1.0 if sample_rate is None else min(max(sample_rate, 0.0), 1.0),
+            )
+            self._budgets[name] = budget
+        return budget
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = request_log_stats_var.get()
+        with self._lock:
+            now = self.clock()
+            budget = self._budget(record.name, now)
+            allowed = True
+            if record.levelno < self.exempt_level:
+                if record.levelno < logging.WARNING and budget.sample_rate < 1.0:
+                    budget.sample_credit += budget.sample_rate
+                    if budget.sample_credit >= 1.0:
+                        budget.sample_credit -= 1.0
+                    else:
+                        allowed = False
+                        self.sampled_out += 1
+                if allowed and not (budget.bucket.take(now) and self._global.take(now)):
+                    allowed = False
+                    self.rate_limited += 1
+
+            if not allowed:
+                budget.dropped += 1
+                budget.pending_suppressed += 1
+                if stats is not None:
+                    stats.suppressed += 1
+                return False
+
+            budget.emitted += 1
+            self.emitted += 1
+            if budget.pending_suppressed:
+                record.suppressed = budget.pending_suppressed
+                budget.pending_suppressed = 0
+        if stats is not None:
+            stats.count += 1
+            record.log_stats = stats
+        return True
+
+    def record_request(self, path: str, stats: RequestLogStats) -> None:
+        # Bytes are added by the listener thread as records are written, so
+        # keep the live object rather than a snapshot
+        self.requests.append((path, stats))
+
+    def get_stats(self, top: int = 10) -> Dict[str, Any]:
+        with self._lock:
+            loggers = sorted(self._budgets.items(), key=lambda entry: entry[1].emitted + entry[1].dropped, reverse=True)
+            top_loggers = {
+                name: {"emitted": budget.emitted, "dropped": budget.dropped, "sample_rate": budget.sample_rate}
+                for name, budget in loggers[:top]
+            }
+            totals = {"emitted": self.emitted, "rate_limited": self.rate_limited, "sampled_out": self.sampled_out}
+        requests = list(self.requests)
+        counts = sorted(stats.count for _, stats in requests)
+        by_path: Dict[str, List[int]] = {}
+        for path, stats in requests:
+            by_path.setdefault(path, []).append(stats.count)
+        noisiest = sorted(by_path.items(), key=lambda entry: sum(entry[1]) / len(entry[1]), reverse=True)[:top]
+        return {
+            **totals,
+            "loggers": top_loggers,
+            "requests": {
+                "sampled": len(requests),
+                "avg_records": sum(counts) / len(counts) if counts else 0.0,
+                "p95_records": counts[min(int(len(counts) * 0.95), len(counts) - 1)] if counts else 0,
+                "max_records": counts[-1] if counts else 0,
+                "avg_bytes": sum(stats.bytes for _, stats in requests) / len(requests) if requests else 0.0,
+                "suppressed": sum(stats.suppressed for _, stats in requests),
+                "noisiest_paths": {path: sum(values) / len(values) for path, values in noisiest},
+            },
+        }
+
+
+class AsyncLogHandler(QueueHandler):
+    """
+    Hands records to a ``QueueListener`` without formatting them.
+
+    The standard ``QueueHandler.prepare`` formats on the calling thread; here
+    only request-scoped context is captured and formatting happens on the
+    listener thread. A full queue drops the record instead of blocking.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
+
+    def __init__(self, count_bytes: bool = False):
+        super().__init__()
+        # Only the stdout formatter attributes bytes to the request
+        self.count_bytes = count_bytes
     
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
@@ -32,11 +286,15 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno
         }
         
-        # Add request ID if available
-        request_id = request_id_var.get()
+        # Add request ID if available (captured on the logging thread when queued)
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
         if request_id:
             log_entry["request_id"] = request_id
         
+        suppressed = getattr(record, "suppressed", None)
+        if suppressed:
+            log_entry["suppressed"] = suppressed
+        
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = {
@@ -49,7 +307,11 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_fields"):
             log_entry.update(record.extra_fields)
         
-        return json.dumps(log_entry)
+        output = json.dumps(log_entry)
+        stats = getattr(record, "log_stats", None)
+        if self.count_bytes and stats is not None:
+            stats.bytes += len(output) + 1
+        return output
 
 class ErrorLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware to automatically log errors and create analytics events."""
@@ -157,34 +419,98 @@ class ErrorLoggingMiddleware(BaseHTTPMiddleware):
             # Re-raise the exception
             raise
 
-def setup_logging(level: str = "INFO") -> None:
-    """Set up structured logging configuration."""
+# Active governor and listener (None when running ungoverned)
+log_governor: Optional[LogGovernor] = None
+log_queue_handler: Optional[AsyncLogHandler] = None
+_log_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, governed: Optional[bool] = None) -> None:
+    """
+    Set up structured logging configuration.
+    
+    Args:
+        level: Root level, defaults to the LOG_LEVEL environment variable or INFO
+        governed: Route records through ``LogGovernor`` and a background writer
+            thread; defaults to on unless LOG_GOVERNOR is "off"
+    """
+    global log_governor, log_queue_handler, _log_listener
     
-    # Create JSON formatter
-    formatter = JSONFormatter()
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if governed is None:
+        governed = os.getenv("LOG_GOVERNOR", "on").lower() not in ("0", "off", "false", "no")
     
     # Configure root logger
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, level.upper()))
+    root_logger.setLevel(getattr(logging, level, logging.INFO))
     
-    # Remove existing handlers
+    # Remove existing handlers, draining a previous listener first
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
     # Create console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(JSONFormatter(count_bytes=True))
+    handlers = [console_handler]
     
     # Create file handler for errors
     try:
         file_handler = logging.FileHandler("logs/backend.log")
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(JSONFormatter())
         file_handler.setLevel(logging.ERROR)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
     except Exception:
         # Ignore file handler errors (e.g., logs directory doesn't exist)
         pass
+    
+    if not governed:
+        log_governor = None
+        for handler in handlers:
+            root_logger.addHandler(handler)
+        return
+    
+    log_governor = LogGovernor.from_env()
+    log_queue_handler = AsyncLogHandler(queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", "10000"))))
+    log_queue_handler.addFilter(log_governor)
+    root_logger.addHandler(log_queue_handler)
+    _log_listener = QueueListener(log_queue_handler.queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+def shutdown_logging() -> None:
+    """Stop the background writer after flushing queued records."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def start_request_log_stats() -> RequestLogStats:
+    """Start attributing log records in the current context to a new request."""
+    stats = RequestLogStats()
+    request_log_stats_var.set(stats)
+    return stats
+
+
+def record_request_log_stats(path: str, stats: RequestLogStats) -> None:
+    if log_governor is not None:
+        log_governor.record_request(path, stats)
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """Governor counters, per-request log volume and writer queue state."""
+    if log_governor is None:
+        return {"governed": False}
+    return {
+        "governed": True,
+        **log_governor.get_stats(),
+        "queue_depth": log_queue_handler.queue.qsize() if log_queue_handler else 0,
+        "queue_dropped": log_queue_handler.dropped if log_queue_handler else 0,
+    }
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger with the specified name."""
@@ -3,6 +3,7 @@ Production middleware for Easy Outfit App.
 Provides request logging, performance monitoring, and error tracking.
 """
 
+import os
 import time
 import uuid
 from typing import Callable
@@ -10,8 +11,12 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.types import ASGIApp
 
-from .logging import get_logger, RequestLogger, ErrorTracker, ErrorLoggingMiddleware
+from .logging import (
+    get_logger, RequestLogger, ErrorTracker, ErrorLoggingMiddleware,
+    request_id_var, start_request_log_stats, record_request_log_stats,
+)
 from .cache import cache_manager
+from .firestore_accounting import FirestoreUsage, firestore_route_stats, firestore_usage_var
 
 # Break circular import by making monitoring imports optional
 try:
@@ -44,6 +49,8 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Generate request ID
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
+        request_id_var.set(request_id)
+        log_stats = start_request_log_stats()
         
         # Add user ID if available (from auth middleware)
         user_id = getattr(request.state, 'user_id', None)
@@ -85,6 +92,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             
             # Add request ID to response headers
             response.headers["X-Request-ID"] = request_id
+            record_request_log_stats(request.url.path, log_stats)
             
             return response
             
@@ -115,6 +123,41 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             # Re-raise the exception
             raise
 
+class FirestoreAccountingMiddleware(BaseHTTPMiddleware):
+    """
+    Attributes Firestore reads/writes/queries to each request.
+    
+    Totals are aggregated per route template for the monitoring endpoints.
+    With FIRESTORE_DEBUG_HEADERS=1 they are also returned as X-Firestore-*
+    response headers.
+    """
+    
+    def __init__(self, app: ASGIApp, debug_headers: bool = None):
+        super().__init__(app)
+        if debug_headers is None:
+            debug_headers = os.getenv("FIRESTORE_DEBUG_HEADERS", "").lower() in ("1", "true", "on", "yes")
+        self.debug_headers = debug_headers
+    
+    @staticmethod
+    def route_template(request: Request) -> str:
+        path = request.url.path
+        for name, value in (request.scope.get("path_params") or {}).items():
+            path = path.replace(f"/{value}", f"/{{{name}}}", 1)
+        return path
+    
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        usage = FirestoreUsage()
+        token = firestore_usage_var.set(usage)
+        try:
+            response = await call_next(request)
+        finally:
+            firestore_usage_var.reset(token)
+        
+        firestore_route_stats.record(f"{request.method} {self.route_template(request)}", usage)
+        if self.debug_headers:
+            response.headers.update(usage.headers())
+        return response
+
 class PerformanceMiddleware(BaseHTTPMiddleware):
     """Middleware for performance monitoring."""
     
@@ -309,11 +352,19 @@ class HealthCheckMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 def setup_middleware(app: ASGIApp) -> None:
-    """Setup only LoggingMiddleware for debugging."""
+    """Setup request logging and Firestore accounting middleware, plus rate limiting when RATE_LIMIT_ENABLED is set."""
     # print("DEBUG: setup_middleware called - adding LoggingMiddleware")
     
+    # Per-user sliding-window rate limits (opt-in); added first so the logging middleware sees 429s
+    from ..middleware.rate_limiter import create_rate_limit_middleware, rate_limiter, rate_limiting_enabled
+    if rate_limiting_enabled():
+        app.add_middleware(BaseHTTPMiddleware, dispatch=create_rate_limit_middleware(rate_limiter))
+        # Routers are mounted after setup_middleware; resolve endpoint classes once they all are
+        app.add_event_handler("startup", lambda: rate_limiter.register_routes(app))
+    
     # RE-ENABLING LOGGING MIDDLEWARE NOW THAT STARTUP IS STABLE
     app.add_middleware(LoggingMiddleware)
+    app.add_middleware(FirestoreAccountingMiddleware)
     
     # app.add_middleware(CacheMiddleware, cache_ttl=300)
     # app.add_middleware(RateLimitMiddleware, requests_per_minute=60)
@@ -0,0 +1,254 @@
+"""
+Startup profiling and deferred service initialization for Easy Outfit App.
+
+- Import-time profiling: a meta path hook records self/cumulative import time
+  per module (like ``python -X importtime``) so cold-start cost can be read
+  from an admin endpoint on a deployed instance.
+- Startup phases: named timings for router imports/mounts.
+- Lazy services: heavy singletons (CLIP models, analyzers, clients) are built
+  on first use instead of at import, with optional background warm-up after
+  the server starts accepting requests.
+"""
+
+import importlib
+import logging
+import sys
+import threading
+import time
+from importlib.abc import Loader, MetaPathFinder
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_PROCESS_START = time.time()
+
+
+# ---------------- IMPORT PROFILING ----------------
+
+class _TimedLoader(Loader):
+    """Wraps a module loader and times ``exec_module``."""
+
+    def __init__(self, loader: Loader, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # The module should only ever see its real loader
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(MetaPathFinder):
+    """Records per-module import time (self and cumulative, in milliseconds)."""
+
+    def __init__(self):
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._stack = threading.local()
+        self._lock = threading.Lock()
+        self._resolving = threading.local()
+
+    def find_spec(self, fullname, path=None, target=None):
+        # Delegate to the remaining finders, then wrap the loader we get back
+        if getattr(self._resolving, "active", False):
+            return None
+        self._resolving.active = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                        spec.loader = _TimedLoader(spec.loader, self)
+                    return spec
+            return None
+        finally:
+            self._resolving.active = False
+
+    def _frames(self) -> List[list]:
+        if not hasattr(self._stack, "frames"):
+            self._stack.frames = []
+        return self._stack.frames
+
+    def _enter(self, name: str) -> None:
+        # [name, start, time spent in nested imports]
+        self._frames().append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name: str) -> None:
+        frames = self._frames()
+        if not frames:
+            return
+        _, started, nested = frames.pop()
+        cumulative = time.perf_counter() - started
+        if frames:
+            frames[-1][2] += cumulative
+        with self._lock:
+            self.timings[name] = {
+                "self_ms": round((cumulative - nested) * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+
+    def report(self, limit: int = 50, sort_by: str = "cumulative_ms") -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [{"module": name, **timing} for name, timing in self.timings.items()]
+        rows.sort(key=lambda row: row.get(sort_by, 0), reverse=True)
+        return rows[:limit]
+
+
+_import_profiler: Optional[ImportProfiler] = None
+
+
+def start_import_profiling() -> ImportProfiler:
+    """Install the import profiler at the front of ``sys.meta_path`` (idempotent)."""
+    global _import_profiler
+    if _import_profiler is None:
+        _import_profiler = ImportProfiler()
+        sys.meta_path.insert(0, _import_profiler)
+    return _import_profiler
+
+
+def stop_import_profiling() -> None:
+    """Remove the profiler hook; recorded timings are kept for reporting."""
+    if _import_profiler is not None and _import_profiler in sys.meta_path:
+        sys.meta_path.remove(_import_profiler)
+
+
+# ---------------- STARTUP PHASES ----------------
+
+_phases: Dict[str, float] = {}
+_mounted_routers: Dict[tuple, float] = {}
+
+
+def record_phase(name: str, elapsed_seconds: float) -> None:
+    """Record a named startup phase duration."""
+    _phases[name] = round(elapsed_seconds * 1000, 3)
+
+
+def import_router_module(module_name: str, prefix: str):
+    """Import a router module and record its import time under (module, prefix)."""
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _mounted_routers[(module_name, prefix)] = round((time.perf_counter() - started) * 1000, 3)
+    return module
+
+
+# ---------------- LAZY SERVICES ----------------
+
+class LazyService:
+    """
+    Proxy that builds a heavy service on first attribute access.
+
+    Module-level singletons such as ``style_analyzer = StyleAnalysisService()``
+    become ``style_analyzer = lazy_service("style_analyzer", StyleAnalysisService)``
+    and callers keep using ``style_analyzer.method(...)`` unchanged.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_init_ms", None)
+        object.__setattr__(self, "_error", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def get(self) -> Any:
+        """Return the service, constructing it on the first call."""
+        instance = self._instance
+        if instance is not None:
+            return instance
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                try:
+                    instance = self._factory()
+                except Exception as e:
+                    object.__setattr__(self, "_error", f"{type(e).__name__}: {e}")
+                    raise
+                object.__setattr__(self, "_init_ms", round((time.perf_counter() - started) * 1000, 3))
+                object.__setattr__(self, "_error", None)
+                object.__setattr__(self, "_instance", instance)
+                logger.info(f"Lazy service '{self._name}' initialized in {self._init_ms}ms")
+            return self._instance
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def status(self) -> Dict[str, Any]:
+        return {"initialized": self.is_initialized, "init_ms": self._init_ms, "error": self._error}
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.is_initialized else "deferred"
+        return f"<LazyService {self._name} ({state})>"
+
+
+_lazy_services: Dict[str, LazyService] = {}
+
+
+def lazy_service(name: str, factory: Callable[[], Any]) -> LazyService:
+    """Create (or return the existing) named lazy service."""
+    if name not in _lazy_services:
+        _lazy_services[name] = LazyService(name, factory)
+    return _lazy_services[name]
+
+
+def lazy_import(name: str, module_name: str) -> LazyService:
+    """Defer importing a heavy module until it is first used (or warmed up)."""
+    return lazy_service(name, lambda: importlib.import_module(module_name))
+
+
+def warm_up(names: Optional[Iterable[str]] = None, background: bool = True) -> Optional[threading.Thread]:
+    """
+    Initialize lazy services ahead of first use.
+
+    Args:
+        names: Services to warm (default: all registered)
+        background: Run in a daemon thread so startup is not blocked
+    """
+    targets = [_lazy_services[name] for name in (names or list(_lazy_services)) if name in _lazy_services]
+
+    def _run():
+        for service in targets:
+            if service.is_initialized:
+                continue
+            try:
+                service.get()
+            except Exception as e:
+                logger.warning(f"Warm-up of '{service._name}' failed: {e}")
+
+    if not background:
+        _run()
+        return None
+    thread = threading.Thread(target=_run, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def get_startup_report(limit: int = 50) -> Dict[str, Any]:
+    """Startup phases, router import times, lazy service state and slowest imports."""
+    return {
+        "process_uptime_seconds": round(time.time() - _PROCESS_START, 3),
+        "phases_ms": dict(_phases),
+        "routers_ms": {f"{module}@{prefix or '/'}": ms for (module, prefix), ms in _mounted_routers.items()},
+        "lazy_services": {name: service.status() for name, service in _lazy_services.items()},
+        "import_profiling_enabled": _import_profiler is not None,
+        "slowest_imports": _import_profiler.report(limit) if _import_profiler else [],
+    }
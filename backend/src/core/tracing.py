@@ -0,0 +1,397 @@
+"""
+Span tracing for the outfit generation pipeline.
+
+A request opens a root span with ``tracer.trace(...)``; pipeline stages open
+nested spans with ``tracer.span(...)`` (or ``start_span``/``end`` where a stage
+is not a single block). Spans only record when the current request was
+sampled, otherwise every call returns a shared no-op span, so instrumented
+code costs one context variable lookup per stage.
+
+Finished traces go into an in-memory ring buffer (served by the monitoring
+routes) and, when ``TRACE_EXPORT_URL`` is set, are posted as OTLP/JSON to a
+local collector (e.g. ``http://localhost:4318/v1/traces``) from a background
+thread.
+
+Environment:
+    TRACING_ENABLED     "false" turns tracing off entirely (default on)
+    TRACE_SAMPLE_RATE   Fraction of requests traced (default 0.1)
+    TRACE_BUFFER_SIZE   Recent traces kept in memory (default 200)
+    TRACE_EXPORT_URL    OTLP/HTTP JSON endpoint (default: no export)
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "easy-outfit-backend"
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class _NoopSpan:
+    """Stand-in for unsampled requests; every method does nothing."""
+
+    __slots__ = ()
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        pass
+
+    def end(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed pipeline stage with attributes, events and child spans."""
+
+    __slots__ = ('trace', 'name', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'events', 'status', 'error', '_token')
+    recording = True
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.status = STATUS_OK
+        self.error: Optional[str] = None
+        self._token = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.status = STATUS_ERROR
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.end()
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        self.events.append({'name': name, 'time_ns': time.time_ns(), 'attributes': attributes})
+
+    def end(self, **attributes: Any) -> None:
+        if self.end_ns is not None:
+            return
+        self.attributes.update(attributes)
+        self.end_ns = time.time_ns()
+        if self._token is not None:
+            try:
+                _current_span.reset(self._token)
+            except ValueError:
+                # Ended from another context (e.g. a different task); fall back to the parent
+                _current_span.set(self.trace.spans_by_id.get(self.parent_id))
+            self._token = None
+        if self.parent_id is None:
+            self.trace.finish()
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'events': self.events,
+            'status': 'error' if self.status == STATUS_ERROR else 'ok',
+            'error': self.error,
+        }
+
+
+class Trace:
+    """All spans of one sampled request."""
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self.spans_by_id: Dict[str, Span] = {}
+        self.finished = False
+
+    def add_span(self, span: Span) -> Span:
+        self.spans.append(span)
+        self.spans_by_id[span.span_id] = span
+        return span
+
+    def finish(self) -> None:
+        if self.finished:
+            return
+        self.finished = True
+        end_ns = self.spans[0].end_ns
+        for span in self.spans:
+            if span.end_ns is None:
+                # A stage left early (exception or early return)
+                span.end_ns = end_ns
+                span.attributes['unfinished'] = True
+        self.tracer._record(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        root = self.spans[0]
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'start_ns': root.start_ns,
+            'duration_ms': root.duration_ms,
+            'status': 'error' if any(span.status == STATUS_ERROR for span in self.spans) else 'ok',
+            'attributes': root.attributes,
+            'spans': [span.to_dict() for span in self.spans],
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("tracing_current_span", default=None)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def to_otlp(traces: List[Trace]) -> Dict[str, Any]:
+    """Encode finished traces as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    spans = []
+    for trace in traces:
+        for span in trace.spans:
+            otlp_span = {
+                'traceId': trace.trace_id,
+                'spanId': span.span_id,
+                'name': span.name,
+                'kind': 1,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns),
+                'attributes': _otlp_attributes(span.attributes),
+                'events': [
+                    {'timeUnixNano': str(event['time_ns']), 'name': event['name'], 'attributes': _otlp_attributes(event['attributes'])}
+                    for event in span.events
+                ],
+                'status': {'code': span.status, **({'message': span.error} if span.error else {})},
+            }
+            if span.parent_id:
+                otlp_span['parentSpanId'] = span.parent_id
+            spans.append(otlp_span)
+    return {
+        'resourceSpans': [{
+            'resource': {'attributes': _otlp_attributes({'service.name': SERVICE_NAME})},
+            'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}],
+        }]
+    }
+
+
+class OTLPJsonExporter:
+    """Posts traces to an OTLP/HTTP JSON endpoint from a daemon thread; drops when backed up."""
+
+    def __init__(self, url: str, max_queue: int = 100, timeout: float = 2.0):
+        self.url = url
+        self.timeout = timeout
+        self.queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.exported = 0
+        self.failed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, trace: Trace) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < 20:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                body = json.dumps(to_otlp(batch)).encode()
+                request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+                self.exported += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.debug(f"Trace export to {self.url} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {'url': self.url, 'exported': self.exported, 'failed': self.failed,
+                'dropped': self.dropped, 'queued': self.queue.qsize()}
+
+
+class Tracer:
+    """Creates sampled traces and keeps the most recent ones in memory."""
+
+    def __init__(self, enabled: bool = True, sample_rate: float = 0.1, buffer_size: int = 200,
+                 exporter: Optional[OTLPJsonExporter] = None):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self.recent: deque = deque(maxlen=buffer_size)
+        self.started = 0
+        self.sampled = 0
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        export_url = os.getenv("TRACE_EXPORT_URL")
+        try:
+            sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "0.1"))
+            buffer_size = int(os.getenv("TRACE_BUFFER_SIZE", "200"))
+        except ValueError:
+            sample_rate, buffer_size = 0.1, 200
+        return cls(
+            enabled=os.getenv("TRACING_ENABLED", "true").lower() != "false",
+            sample_rate=sample_rate,
+            buffer_size=buffer_size,
+            exporter=OTLPJsonExporter(export_url) if export_url else None,
+        )
+
+    def start_trace(self, name: str, force: bool = False, **attributes: Any):
+        """
+        Open a root span (or a child span if a trace is already active).
+
+        Returns ``NOOP_SPAN`` when tracing is off or the request is not sampled.
+        """
+        parent = _current_span.get()
+        if parent is not None:
+            return self.start_span(name, **attributes)
+        if not self.enabled:
+            return NOOP_SPAN
+        self.started += 1
+        if not force and random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        self.sampled += 1
+
+        from .logging import request_id_var
+        request_id = request_id_var.get()
+        if request_id:
+            attributes.setdefault('request_id', request_id)
+
+        trace = Trace(self, name)
+        span = trace.add_span(Span(trace, name, None, attributes))
+        span._token = _current_span.set(span)
+        return span
+
+    def trace(self, name: str, force: bool = False, **attributes: Any):
+        """``with tracer.trace(...)`` form of ``start_trace``."""
+        return self.start_trace(name, force=force, **attributes)
+
+    def start_span(self, name: str, **attributes: Any):
+        """Open a child of the current span; call ``end()`` (or use ``with``) to close it."""
+        parent = _current_span.get()
+        if parent is None or parent.trace.finished:
+            return NOOP_SPAN
+        span = parent.trace.add_span(Span(parent.trace, name, parent.span_id, attributes))
+        span._token = _current_span.set(span)
+        return span
+
+    def span(self, name: str, **attributes: Any):
+        return self.start_span(name, **attributes)
+
+    def current_span(self):
+        return _current_span.get() or NOOP_SPAN
+
+    def add_event(self, name: str, **attributes: Any) -> None:
+        span = _current_span.get()
+        if span is not None:
+            span.add_event(name, **attributes)
+
+    async def traced_call(self, name: str, awaitable, **attributes: Any):
+        """Await ``awaitable`` inside a span (for stages run as concurrent tasks)."""
+        with self.span(name, **attributes):
+            return await awaitable
+
+    def traced(self, name: str):
+        """Decorator: run an async function inside ``trace(name)``."""
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.trace(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _record(self, trace: Trace) -> None:
+        self.recent.append(trace)
+        if self.exporter is not None:
+            self.exporter.submit(trace)
+
+    def get_recent_traces(self, limit: int = 50, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        traces = [trace for trace in reversed(self.recent) if name is None or trace.name == name]
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    def get_trace(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        for trace in self.recent:
+            if trace.trace_id == trace_id:
+                return trace.to_dict()
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'requests_seen': self.started,
+            'requests_sampled': self.sampled,
+            'buffered_traces': len(self.recent),
+            'buffer_size': self.recent.maxlen,
+            'exporter': self.exporter.stats() if self.exporter else None,
+        }
+
+
+# Global instance
+tracer = Tracer.from_env()
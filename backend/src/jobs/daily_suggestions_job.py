@@ -0,0 +1,299 @@
+"""
+Precompute daily outfit suggestions during each user's local morning.
+
+Every run reads only the users whose ``suggestion_due_utc_hour`` bucket is
+near the current UTC hour, picks the active ones whose local time is inside
+the morning window and who have no suggestion for their local date yet, then generates
+their suggestions in batches with bounded concurrency. Weather is fetched
+once per location per run and shared by every user at that location. The
+results land at ``daily_outfit_suggestions/{user_id}_{date}``, so
+``/today-suggestion`` becomes a single document read.
+
+Runs are idempotent (users with a suggestion are skipped, and suggestions are
+only created, never replaced), so the scheduler simply runs the job every
+``RUN_INTERVAL_MINUTES``. The bucket field is written with the user's location;
+``--backfill-due-hours`` sets it once for users that predate it.
+
+Usage (from backend/):
+    python -m src.jobs.daily_suggestions_job               # scheduler
+    python -m src.jobs.daily_suggestions_job --once        # single run
+    python -m src.jobs.daily_suggestions_job --once --dry-run
+    python -m src.jobs.daily_suggestions_job --backfill-due-hours
+
+``scripts/benchmark_daily_suggestions.py`` runs the same pipeline over a
+synthetic user population.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..services.addiction_service import user_timezone
+from ..services.daily_suggestion_service import (
+    DUE_HOUR_FIELD,
+    MORNING_WINDOW_HOURS,
+    daily_suggestion_service,
+    suggestion_date,
+    suggestion_due_utc_hour,
+)
+
+logger = logging.getLogger(__name__)
+
+# Extra bucket hours on each side: half-hour offsets and DST changes since the field was written
+DUE_HOUR_SLACK = 1
+
+# Users who logged an outfit or updated their profile this recently
+ACTIVE_WITHIN_DAYS = 14
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_CONCURRENCY = 8
+RUN_INTERVAL_MINUTES = 30
+
+USER_FIELDS = ['location_data', 'activity', 'updatedAt']
+BACKFILL_BATCH_SIZE = 400
+
+WeatherFetcher = Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+OutfitGenerator = Callable[[str, Optional[Dict[str, Any]]], Awaitable[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class DueUser:
+    user_id: str
+    date: str
+    location_data: Dict[str, Any]
+
+
+def local_now(location_data: Optional[Dict[str, Any]], now: datetime) -> datetime:
+    return now.astimezone(user_timezone({'location_data': location_data}) or timezone.utc)
+
+
+def in_morning_window(location_data: Optional[Dict[str, Any]], now: datetime) -> bool:
+    start, end = MORNING_WINDOW_HOURS
+    return start <= local_now(location_data, now).hour < end
+
+
+def is_active(user_data: Dict[str, Any], now: datetime, within_days: int = ACTIVE_WITHIN_DAYS) -> bool:
+    last_log_date = (user_data.get('activity') or {}).get('last_log_date')
+    if last_log_date:
+        try:
+            if (now.date() - date.fromisoformat(last_log_date)).days <= within_days:
+                return True
+        except ValueError:
+            pass
+    updated_at = user_data.get('updatedAt')
+    if isinstance(updated_at, (int, float)) and not isinstance(updated_at, bool):
+        return now - datetime.fromtimestamp(updated_at / 1000, tz=timezone.utc) <= timedelta(days=within_days)
+    return False
+
+
+def due_hour_buckets(now: datetime) -> List[int]:
+    """``suggestion_due_utc_hour`` values of users who may be inside their morning window at ``now``."""
+    start, end = MORNING_WINDOW_HOURS
+    # A window starting at HH:30 is still open during hour HH + (end - start)
+    return sorted({(now.hour - offset) % 24 for offset in range(-DUE_HOUR_SLACK, end - start + 1 + DUE_HOUR_SLACK)})
+
+
+def due_users(user_docs: Iterable[Tuple[str, Dict[str, Any]]], now: datetime) -> Iterator[DueUser]:
+    """Active users currently in their local-morning window."""
+    for user_id, user_data in user_docs:
+        location_data = user_data.get('location_data') or {}
+        if in_morning_window(location_data, now) and is_active(user_data, now):
+            yield DueUser(user_id, suggestion_date(location_data, now), location_data)
+
+
+def weather_location(location_data: Dict[str, Any]) -> Optional[str]:
+    """Location string for the weather API: coordinates when known, else the last searched location."""
+    coordinates = location_data.get('coordinates') or {}
+    if coordinates.get('lat') is not None and coordinates.get('lon') is not None:
+        return f"{round(coordinates['lat'], 2)},{round(coordinates['lon'], 2)}"
+    return location_data.get('last_location') or location_data.get('city_name')
+
+
+async def fetch_weather(location: str) -> Optional[Dict[str, Any]]:
+    from ..routes.weather import WeatherRequest, get_weather
+
+    weather = await get_weather(WeatherRequest(location=location), current_user=None)
+    return None if weather.fallback else weather.model_dump()
+
+
+class WeatherPrefetcher:
+    """Fetches weather once per location per run; concurrent users share the fetch."""
+
+    def __init__(self, fetch: WeatherFetcher = fetch_weather):
+        self._fetch = fetch
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.fetches = 0
+
+    async def _fetch_safely(self, location: str) -> Optional[Dict[str, Any]]:
+        self.fetches += 1
+        try:
+            return await self._fetch(location)
+        except Exception as e:
+            logger.warning(f"⚠️ Weather prefetch failed for {location}: {e}")
+            return None
+
+    async def get(self, location_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        location = weather_location(location_data)
+        if not location:
+            return None
+        task = self._pending.get(location)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_safely(location))
+            self._pending[location] = task
+        return await task
+
+
+def iter_user_docs(now: datetime) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Users in the due-hour buckets around ``now``; ``due_users`` applies the exact window."""
+    from ..config.firebase import db
+
+    query = db.collection('users').where(DUE_HOUR_FIELD, 'in', due_hour_buckets(now)).select(USER_FIELDS)
+    for doc in query.stream():
+        yield doc.id, doc.to_dict() or {}
+
+
+def backfill_due_hours(now: Optional[datetime] = None) -> int:
+    """One-off scan that sets ``suggestion_due_utc_hour`` on users written before it existed."""
+    from ..config.firebase import db
+
+    now = now or datetime.now(timezone.utc)
+    batch, pending, updated = db.batch(), 0, 0
+    for doc in db.collection('users').select(['location_data', DUE_HOUR_FIELD]).stream():
+        user_data = doc.to_dict() or {}
+        due_hour = suggestion_due_utc_hour(user_data.get('location_data'), now)
+        if user_data.get(DUE_HOUR_FIELD) == due_hour:
+            continue
+        batch.update(doc.reference, {DUE_HOUR_FIELD: due_hour})
+        pending += 1
+        if pending >= BACKFILL_BATCH_SIZE:
+            batch.commit()
+            batch, updated, pending = db.batch(), updated + pending, 0
+    if pending:
+        batch.commit()
+    updated += pending
+    logger.info(f"✅ Set {DUE_HOUR_FIELD} on {updated} users")
+    return updated
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def precompute_daily_suggestions(
+    now: Optional[datetime] = None,
+    user_docs: Optional[Iterable[Tuple[str, Dict[str, Any]]]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    dry_run: bool = False,
+    service=daily_suggestion_service,
+    fetch: WeatherFetcher = fetch_weather,
+    generate: Optional[OutfitGenerator] = None,
+) -> Dict[str, Any]:
+    """Generate and store suggestions for every due user; ``dry_run`` generates without writing."""
+    now = now or datetime.now(timezone.utc)
+    generate = generate or service.generate_outfit
+    weather = WeatherPrefetcher(fetch)
+    semaphore = asyncio.Semaphore(concurrency)
+    durations: List[float] = []
+    stats = {'due': 0, 'existing': 0, 'generated': 0, 'failed': 0}
+
+    async def precompute(user: DueUser) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                outfit = await generate(user.user_id, await weather.get(user.location_data))
+                # Create-only: a suggestion the endpoint wrote meanwhile (maybe already worn) wins
+                if not dry_run and service.save_suggestion(
+                    user.user_id, user.date, outfit, precomputed=True, overwrite=False
+                ) is None:
+                    stats['existing'] += 1
+                else:
+                    stats['generated'] += 1
+            except Exception as e:
+                stats['failed'] += 1
+                logger.error(f"❌ Daily suggestion failed for user {user.user_id}: {e}")
+            durations.append((time.perf_counter() - start) * 1000)
+
+    run_start = time.perf_counter()
+    batch: List[DueUser] = []
+
+    async def flush() -> None:
+        existing = service.existing_user_ids({user.user_id: user.date for user in batch})
+        stats['existing'] += len(existing)
+        await asyncio.gather(*(precompute(user) for user in batch if user.user_id not in existing))
+        batch.clear()
+
+    for user in due_users(user_docs if user_docs is not None else iter_user_docs(now), now):
+        stats['due'] += 1
+        batch.append(user)
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    stats.update(
+        weather_fetches=weather.fetches,
+        elapsed_ms=round((time.perf_counter() - run_start) * 1000, 1),
+        p50_ms=round(_percentile(durations, 0.5), 1),
+        p95_ms=round(_percentile(durations, 0.95), 1),
+        dry_run=dry_run,
+    )
+    logger.info(
+        f"✅ Daily suggestions: {stats['generated']} generated, {stats['existing']} already present, "
+        f"{stats['failed']} failed of {stats['due']} due users in {stats['elapsed_ms']}ms "
+        f"({stats['weather_fetches']} weather fetches)"
+    )
+    return stats
+
+
+def run_daily_suggestions_job(**kwargs) -> Dict[str, Any]:
+    """Wrapper function to run the async job."""
+    try:
+        return asyncio.run(precompute_daily_suggestions(**kwargs))
+    except Exception as e:
+        logger.error(f"❌ Error in daily suggestions job: {str(e)}")
+        return {}
+
+
+def run_scheduler() -> None:
+    """Run the job every ``RUN_INTERVAL_MINUTES``, starting immediately."""
+    import schedule
+
+    schedule.every(RUN_INTERVAL_MINUTES).minutes.do(run_daily_suggestions_job)
+    logger.info(f"📅 Daily suggestions scheduled every {RUN_INTERVAL_MINUTES} minutes")
+    run_daily_suggestions_job()
+
+    while True:
+        try:
+            schedule.run_pending()
+            time.sleep(60)
+        except KeyboardInterrupt:
+            logger.info("🛑 Scheduler stopped by user")
+            break
+        except Exception as e:
+            logger.error(f"❌ Scheduler error: {str(e)}")
+            time.sleep(60)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Precompute daily outfit suggestions")
+    parser.add_argument("--once", action="store_true", help="Run a single pass instead of the scheduler")
+    parser.add_argument("--dry-run", action="store_true", help="Generate without writing suggestions")
+    parser.add_argument("--backfill-due-hours", action="store_true", help=f"Set {DUE_HOUR_FIELD} on existing users")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+    if args.backfill_due_hours:
+        print(backfill_due_hours())
+    elif args.once or args.dry_run:
+        print(run_daily_suggestions_job(batch_size=args.batch_size, concurrency=args.concurrency, dry_run=args.dry_run))
+    else:
+        run_scheduler()
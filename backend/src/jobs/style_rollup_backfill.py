@@ -0,0 +1,51 @@
+"""
+Backfill monthly style rollups for existing users.
+
+Usage (from backend/):
+    python -m src.jobs.style_rollup_backfill                 # every user
+    python -m src.jobs.style_rollup_backfill --user UID ...  # specific users
+
+Users who are not backfilled here get a background rebuild queued the
+first time they open a style analytics page.
+"""
+
+import argparse
+import logging
+from typing import Iterable, List, Optional
+
+from ..config.firebase import db
+from ..services.style_rollup_service import style_rollup_service
+
+logger = logging.getLogger(__name__)
+
+
+def iter_user_ids() -> Iterable[str]:
+    for doc in db.collection('users').select([]).stream():
+        yield doc.id
+
+
+def backfill_style_rollups(user_ids: Optional[List[str]] = None) -> dict:
+    """Rebuild rollups for ``user_ids`` (default: all users)."""
+    processed = 0
+    failed = 0
+    months = 0
+    for user_id in user_ids or iter_user_ids():
+        try:
+            months += len(style_rollup_service.backfill_user(user_id))
+            processed += 1
+        except Exception as e:
+            failed += 1
+            logger.error(f"❌ Style rollup backfill failed for user {user_id}: {e}")
+        if processed and processed % 100 == 0:
+            logger.info(f"📊 Backfilled style rollups for {processed} users")
+
+    logger.info(f"✅ Style rollup backfill complete: {processed} users, {months} months, {failed} failures")
+    return {"users": processed, "months": months, "failed": failed}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill monthly style rollups")
+    parser.add_argument("--user", dest="user_ids", action="append", help="User id to backfill (repeatable)")
+    args = parser.parse_args()
+    backfill_style_rollups(args.user_ids)
@@ -4,41 +4,155 @@ Rate Limiting Middleware for FastAPI
 
 This module provides comprehensive rate limiting to prevent abuse:
 - Per-user rate limiting based on Firebase UID
-- Different limits for different endpoints
-- IP-based fallback for unauthenticated requests
-- Configurable limits and time windows
-- Redis backend for distributed rate limiting
+- Different limits for different endpoint classes, resolved once per route
+- IP-based fallback for unauthenticated requests (proxy-appended address only)
+- Sliding-window counters: constant memory per identity, idle keys evicted
+- Redis backend (atomic Lua script) for distributed rate limiting across replicas
 """
 
+import os
 import time
 import hashlib
-from typing import Dict, Optional, Callable, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Callable, Any, Pattern, Tuple
 from datetime import datetime, timedelta
 import logging
 from fastapi import Request, HTTPException, status
 from fastapi.responses import JSONResponse
-import firebase_admin
-from firebase_admin import auth as firebase_auth
+from starlette.concurrency import run_in_threadpool
+
+from ..core.cache import BoundedStore, register_bounded_store
 
 logger = logging.getLogger(__name__)
 
+# Sliding-window counter, evaluated atomically inside Redis.
+# KEYS[1] = counter for the current window, KEYS[2] = counter for the previous window
+# ARGV[1] = limit, ARGV[2] = window seconds, ARGV[3] = fraction of the current window elapsed
+# Returns {allowed (0/1), current window count, previous window count}
+SLIDING_WINDOW_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed_fraction = tonumber(ARGV[3])
+if previous * (1 - elapsed_fraction) + current >= limit then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], window * 2)
+end
+return {1, current, previous}
+"""
+
+
+# Endpoint class of a route template by its path segments, first match wins;
+# anything else is "default". Resolved once per route by register_routes().
+ROUTE_CLASS_RULES: Tuple[Tuple[str, Callable[[List[str]], bool]], ...] = (
+    ("auth", lambda segments: segments[:1] == ["auth"] or segments[:2] == ["api", "auth"]),
+    ("upload", lambda segments: any("upload" in s or s.startswith("analyze") for s in segments)),
+    ("outfit_generation", lambda segments: any(s.startswith("generate") for s in segments)),
+    ("analytics", lambda segments: any("analytics" in s for s in segments)),
+    ("feedback", lambda segments: any("feedback" in s for s in segments)),
+)
+
+# Never counted: liveness probes
+RATE_LIMIT_EXEMPT_PREFIXES: Tuple[str, ...] = ("/health", "/api/health", "/__health")
+
+# Bearer tokens Firebase rejected are not re-verified for this long
+REJECTED_TOKEN_TTL_SECONDS = 30
+
+# Proxies in front of the app that append to X-Forwarded-For. The client IP is
+# the entry this many hops from the right; anything further left is client-supplied.
+TRUSTED_PROXY_HOPS = int(os.getenv("RATE_LIMIT_TRUSTED_PROXY_HOPS", "1"))
+
+
 class RateLimitExceeded(Exception):
     """Exception raised when rate limit is exceeded."""
     pass
 
+
+def _window_position(now: float, window: int) -> Tuple[int, float]:
+    """Index of the fixed window containing ``now`` and the fraction of it elapsed."""
+    window_index = int(now // window)
+    return window_index, (now - window_index * window) / window
+
+
+def _sliding_window_result(allowed: bool, current: int, previous: int, elapsed_fraction: float,
+                           limit: int, window_index: int, window: int) -> Dict[str, Any]:
+    estimated = previous * (1 - elapsed_fraction) + current
+    return {
+        "allowed": allowed,
+        "remaining": max(0, int(limit - estimated)),
+        "reset_time": (window_index + 1) * window,
+        "limit": limit
+    }
+
+
+class MemoryRateLimitBackend:
+    """
+    In-process sliding-window counters.
+
+    Each key holds only (window index, current count, previous count); keys idle
+    for two windows expire and the store is LRU-bounded.
+    """
+
+    def __init__(self, max_keys: int = 100000, window: int = 60):
+        self.counters = register_bounded_store(BoundedStore(
+            "rate_limit_counters",
+            max_entries=max_keys,
+            ttl=window * 2,
+        ))
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> Dict[str, Any]:
+        window_index, elapsed_fraction = _window_position(now, window)
+        counter_window, current, previous = self.counters.get(key) or (window_index, 0, 0)
+
+        # Roll the counter forward to the window containing ``now``
+        if counter_window == window_index - 1:
+            previous, current = current, 0
+        elif counter_window != window_index:
+            previous, current = 0, 0
+
+        allowed = previous * (1 - elapsed_fraction) + current < limit
+        if allowed:
+            current += 1
+        self.counters[key] = (window_index, current, previous)
+        return _sliding_window_result(allowed, current, previous, elapsed_fraction, limit, window_index, window)
+
+
+class RedisRateLimitBackend:
+    """Sliding-window counters in Redis, checked and incremented by one Lua script."""
+
+    def __init__(self, redis_client, key_prefix: str = "rate_limit"):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.script = redis_client.register_script(SLIDING_WINDOW_LUA)
+
+    def hit(self, key: str, limit: int, window: int, now: float) -> Dict[str, Any]:
+        window_index, elapsed_fraction = _window_position(now, window)
+        allowed, current, previous = self.script(
+            keys=[
+                f"{self.key_prefix}:{key}:{window_index}",
+                f"{self.key_prefix}:{key}:{window_index - 1}",
+            ],
+            args=[limit, window, elapsed_fraction],
+        )
+        return _sliding_window_result(bool(allowed), int(current), int(previous),
+                                      elapsed_fraction, limit, window_index, window)
+
+
 class RateLimiter:
     """Rate limiting implementation with configurable limits."""
-    
-    def __init__(self, redis_client=None):
+
+    def __init__(self, redis_client=None, max_tracked_keys: int = 100000):
         """
         Initialize rate limiter.
-        
+
         Args:
             redis_client: Optional Redis client for distributed rate limiting
+            max_tracked_keys: Bound on identities tracked by the in-memory backend
         """
-        self.redis_client = redis_client
-        self.memory_store = {}  # Fallback for local rate limiting
-        
         # Default rate limits (requests per minute)
         self.default_limits = {
             "default": 60,  # 60 requests per minute
@@ -48,295 +162,263 @@ class RateLimiter:
             "analytics": 100,  # 100 analytics events per minute
             "feedback": 50,    # 50 feedback submissions per minute
         }
-        
+
         # Time window for rate limiting (in seconds)
         self.time_window = 60
-        
+
         # Admin users get higher limits
         self.admin_multiplier = 5
-    
+
+        self.redis_client = redis_client
+        self.memory_backend = MemoryRateLimitBackend(max_tracked_keys, self.time_window)  # Fallback for local rate limiting
+        self.redis_backend = RedisRateLimitBackend(redis_client) if redis_client else None
+
+        # Filled by register_routes(): exact paths and parameterized route patterns
+        self.static_route_classes: Dict[str, str] = {}
+        self.pattern_route_classes: List[Tuple[Pattern, str]] = []
+        self.path_classes = register_bounded_store(BoundedStore("rate_limit_path_classes", max_entries=4096))
+        self.rejected_tokens = register_bounded_store(BoundedStore(
+            "rate_limit_rejected_tokens",
+            max_entries=max_tracked_keys,
+            ttl=REJECTED_TOKEN_TTL_SECONDS,
+            refresh_on_access=False,
+        ))
+
+    def _decode_token(self, request: Request) -> Optional[Dict[str, Any]]:
+        """Verified Firebase claims for the request's bearer token (cached per request and token)."""
+        state = getattr(request, "state", None)
+        if state is not None and hasattr(state, "rate_limit_claims"):
+            return state.rate_limit_claims
+
+        claims = None
+        auth_header = request.headers.get("Authorization") if request.headers else None
+        if auth_header and auth_header.startswith("Bearer "):
+            token_key = hashlib.sha256(auth_header[7:].encode("utf-8")).hexdigest()
+            if token_key not in self.rejected_tokens:
+                try:
+                    from ..auth.token_cache import verify_firebase_token
+                    claims = verify_firebase_token(auth_header[7:])
+                except Exception as e:
+                    self.rejected_tokens[token_key] = True
+                    logger.debug(f"Could not extract user ID from token: {e}")
+
+        if state is not None:
+            state.rate_limit_claims = claims
+        return claims
+
     def get_user_identifier(self, request: Request) -> str:
         """
         Get unique identifier for rate limiting.
         Prioritizes Firebase UID, falls back to IP address.
         """
-        try:
-            # Try to get Firebase UID from Authorization header
-            auth_header = request.headers.get("Authorization") if headers else None)
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                try:
-                    # Try with default settings first
-                    decoded_token = firebase_auth.verify_id_token(token)
-                    user_id = (decoded_token.get("uid") if decoded_token else None)
-                    if user_id:
-                        return f"user:{user_id}"
-                except Exception as e:
-                    # If it's a clock issue, try with more lenient settings
-                    if "Token used too early" in str(e) or "clock" in str(e).lower():
-                        logger.debug(f"Clock skew detected in rate limiter, trying with lenient settings: {e}")
-                        try:
-                            decoded_token = firebase_auth.verify_id_token(token, check_revoked=False)
-                            user_id = (decoded_token.get("uid") if decoded_token else None)
-                            if user_id:
-                                return f"user:{user_id}"
-                        except Exception as e2:
-                            logger.debug(f"Still failed with lenient settings: {e2}")
-                    else:
-                        logger.debug(f"Could not extract user ID from token: {e}")
-        except Exception as e:
-            logger.debug(f"Could not extract user ID from token: {e}")
-        
+        claims = self._decode_token(request)
+        user_id = claims.get("uid") if claims else None
+        if user_id:
+            return f"user:{user_id}"
+
         # Fallback to IP address
         client_ip = self._get_client_ip(request)
         return f"ip:{client_ip}"
-    
+
     def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        # Check for forwarded headers (common with proxies)
-        forwarded_for = request.headers.get("X-Forwarded-For") if headers else None)
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP") if headers else None)
-        if real_ip:
-            return real_ip
-        
+        """
+        Extract client IP address from request.
+
+        Only X-Forwarded-For entries appended by our own proxies are trusted;
+        the leftmost entries are whatever the client sent.
+        """
+        forwarded_for = request.headers.get("X-Forwarded-For") if request.headers else None
+        if forwarded_for and TRUSTED_PROXY_HOPS > 0:
+            hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+            if hops:
+                return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+
         # Fallback to direct connection
         return request.client.host if request.client else "unknown"
-    
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def classify_endpoint(path: str) -> str:
+        """Map a route template (or raw path) to its rate limit class."""
+        segments = [segment for segment in path.split("/") if segment]
+        for endpoint_class, matches in ROUTE_CLASS_RULES:
+            if matches(segments):
+                return endpoint_class
+        return "default"
+
+    def register_routes(self, app) -> None:
+        """Resolve the endpoint class of every mounted route once, at startup."""
+        self.static_route_classes.clear()
+        self.pattern_route_classes.clear()
+        self.path_classes.clear()
+        for route in getattr(app, "routes", []):
+            path = getattr(route, "path", None)
+            if not path:
+                continue
+            endpoint_class = self.classify_endpoint(path)
+            if "{" in path:
+                self.pattern_route_classes.append((route.path_regex, endpoint_class))
+            else:
+                self.static_route_classes.setdefault(path, endpoint_class)
+        logger.info(
+            f"Rate limit classes resolved for {len(self.static_route_classes) + len(self.pattern_route_classes)} routes"
+        )
+
+    def get_endpoint_class(self, request_or_path) -> str:
+        """Endpoint class for a request or a raw path, from the routes resolved at startup.
+
+        The middleware runs before routing, so a parameterized path is matched
+        against the registered route patterns once and the result memoized.
+        """
+        path = request_or_path if isinstance(request_or_path, str) else request_or_path.url.path
+        endpoint_class = self.static_route_classes.get(path)
+        if endpoint_class is not None:
+            return endpoint_class
+        endpoint_class = self.path_classes.get(path)
+        if endpoint_class is None:
+            endpoint_class = self._match_route_class(path)
+            self.path_classes[path] = endpoint_class
+        return endpoint_class
+
+    def _match_route_class(self, path: str) -> str:
+        if not self.static_route_classes and not self.pattern_route_classes:
+            # Routes not registered (e.g. dependency-only use): classify the path itself
+            return self.classify_endpoint(path)
+        for path_regex, endpoint_class in self.pattern_route_classes:
+            if path_regex.match(path):
+                return endpoint_class
+        return "default"
+
+    @staticmethod
+    def is_exempt(path: str) -> bool:
+        return path.startswith(RATE_LIMIT_EXEMPT_PREFIXES)
+
     def get_limit_for_endpoint(self, path: str) -> int:
         """Get rate limit for specific endpoint."""
-        # Map endpoints to rate limit categories
-        if path.startswith("/auth"):
-            return self.default_limits["auth"]
-        elif path.startswith("/upload") or "upload" in path:
-            return self.default_limits["upload"]
-        elif path.startswith("/outfit") or "outfit" in path:
-            return self.default_limits["outfit_generation"]
-        elif path.startswith("/analytics") or "analytics" in path:
-            return self.default_limits["analytics"]
-        elif path.startswith("/feedback") or "feedback" in path:
-            return self.default_limits["feedback"]
-        else:
-            return self.default_limits["default"]
-    
+        return self.default_limits[self.get_endpoint_class(path)]
+
     def is_admin_user(self, request: Request) -> bool:
         """Check if user has admin privileges."""
-        try:
-            auth_header = request.headers.get("Authorization") if headers else None)
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                try:
-                    # Try with default settings first
-                    decoded_token = firebase_auth.verify_id_token(token)
-                    return (decoded_token.get("admin", False) if decoded_token else False)
-                except Exception as e:
-                    # If it's a clock issue, try with more lenient settings
-                    if "Token used too early" in str(e) or "clock" in str(e).lower():
-                        logger.debug(f"Clock skew detected in admin check, trying with lenient settings: {e}")
-                        try:
-                            decoded_token = firebase_auth.verify_id_token(token, check_revoked=False)
-                            return (decoded_token.get("admin", False) if decoded_token else False)
-                        except Exception as e2:
-                            logger.debug(f"Still failed with lenient settings: {e2}")
-                    else:
-                        logger.debug(f"Could not verify admin status: {e}")
-        except Exception:
-            pass
-        return False
-    
-    def check_rate_limit(self, identifier: str, limit: int, is_admin: bool = False) -> Dict[str, Any]:
+        claims = self._decode_token(request)
+        return bool(claims.get("admin", False)) if claims else False
+
+    def check_rate_limit(self, identifier: str, limit: int, is_admin: bool = False,
+                         endpoint_class: str = "default") -> Dict[str, Any]:
         """
         Check if request is within rate limit.
-        
+
         Returns:
             Dict with rate limit status and remaining requests
         """
         # Apply admin multiplier if user is admin
         if is_admin:
             limit = limit * self.admin_multiplier
-        
+
+        key = f"{identifier}:{endpoint_class}"
         current_time = time.time()
-        window_start = current_time - self.time_window
-        
-        if self.redis_client:
-            return self._check_redis_rate_limit(identifier, limit, window_start)
+
+        if self.redis_backend:
+            try:
+                return self.redis_backend.hit(key, limit, self.time_window, current_time)
+            except Exception as e:
+                logger.error(f"Redis rate limiting failed: {e}")
+                # Fallback to memory-based rate limiting
+        return self.memory_backend.hit(key, limit, self.time_window, current_time)
+
+    def check_request(self, request: Request, endpoint_limit: Optional[int] = None) -> Dict[str, Any]:
+        """Resolve identity, endpoint class and limit for a request, then count it."""
+        identifier = self.get_user_identifier(request)
+        endpoint_class = self.get_endpoint_class(request)
+        limit = endpoint_limit or self.default_limits[endpoint_class]
+        is_admin = self.is_admin_user(request)
+        return self.check_rate_limit(identifier, limit, is_admin, endpoint_class)
+
+
+def _reset_time_for(rate_limit_result: Dict[str, Any]) -> datetime:
+    """Convert a rate limit reset timestamp to a datetime, defaulting to one minute out."""
+    try:
+        # Handle both seconds and milliseconds timestamps
+        reset_timestamp = rate_limit_result["reset_time"]
+        if reset_timestamp > 1e12:  # Likely milliseconds
+            timestamp_seconds = reset_timestamp / 1000.0
         else:
-            return self._check_memory_rate_limit(identifier, limit, window_start)
-    
-    def _check_redis_rate_limit(self, identifier: str, limit: int, window_start: float) -> Dict[str, Any]:
-        """Check rate limit using Redis backend."""
-        try:
-            # Get current count from Redis
-            key = f"rate_limit:{identifier}"
-            current_count = self.redis_client.zcount(key, window_start, "+inf")
-            
-            if current_count >= limit:
-                # Rate limit exceeded
-                return {
-                    "allowed": False,
-                    "remaining": 0,
-                    "reset_time": window_start + self.time_window,
-                    "limit": limit
-                }
-            
-            # Add current request to Redis
-            self.redis_client.zadd(key, {str(time.time()): time.time()})
-            self.redis_client.expire(key, self.time_window)
-            
-            return {
-                "allowed": True,
-                "remaining": limit - current_count - 1,
-                "reset_time": window_start + self.time_window,
-                "limit": limit
-            }
-            
-        except Exception as e:
-            logger.error(f"Redis rate limiting failed: {e}")
-            # Fallback to memory-based rate limiting
-            return self._check_memory_rate_limit(identifier, limit, window_start)
-    
-    def _check_memory_rate_limit(self, identifier: str, limit: int, window_start: float) -> Dict[str, Any]:
-        """Check rate limit using in-memory storage."""
-        current_time = time.time()
-        
-        if identifier not in self.memory_store:
-            self.memory_store[identifier] = []
-        
-        # Clean old entries
-        self.memory_store[identifier] = [
-            timestamp for timestamp in self.memory_store[identifier]
-            if timestamp > window_start
-        ]
-        
-        current_count = len(self.memory_store[identifier])
-        
-        if current_count >= limit:
-            # Rate limit exceeded
-            return {
-                "allowed": False,
-                "remaining": 0,
-                "reset_time": window_start + self.time_window,
-                "limit": limit
-            }
-        
-        # Add current request
-        self.memory_store[identifier].append(current_time)
-        
-        return {
-            "allowed": True,
-            "remaining": limit - current_count - 1,
-            "reset_time": window_start + self.time_window,
-            "limit": limit
-        }
+            timestamp_seconds = reset_timestamp
+
+        if 946684800 <= timestamp_seconds <= 4102444800:
+            return datetime.fromtimestamp(timestamp_seconds)
+    except (ValueError, OverflowError, OSError):
+        pass
+    return datetime.utcnow() + timedelta(seconds=60)  # Default 1 minute
 
 def create_rate_limit_middleware(rate_limiter: RateLimiter):
     """
     Create FastAPI middleware for rate limiting.
-    
+
     Args:
         rate_limiter: RateLimiter instance
-        
+
     Returns:
         FastAPI middleware function
     """
     async def rate_limit_middleware(request: Request, call_next):
         """Rate limiting middleware function."""
+        if request.method == "OPTIONS" or rate_limiter.is_exempt(request.url.path):
+            return await call_next(request)
+
         try:
-            # Get user identifier
-            identifier = rate_limiter.get_user_identifier(request)
-            
-            # Get rate limit for endpoint
-            limit = rate_limiter.get_limit_for_endpoint(request.url.path)
-            
-            # Check if user is admin
-            is_admin = rate_limiter.is_admin_user(request)
-            
-            # Check rate limit
-            rate_limit_result = rate_limiter.check_rate_limit(identifier, limit, is_admin)
-            
-            if not rate_limit_result["allowed"]:
-                # Rate limit exceeded
-                try:
-                    # Handle both seconds and milliseconds timestamps
-                    reset_timestamp = rate_limit_result["reset_time"]
-                    if reset_timestamp > 1e12:  # Likely milliseconds
-                        timestamp_seconds = reset_timestamp / 1000.0
-                    else:
-                        timestamp_seconds = reset_timestamp
-                    
-                    if 946684800 <= timestamp_seconds <= 4102444800:
-                        reset_time = datetime.fromtimestamp(timestamp_seconds)
-                    else:
-                        reset_time = datetime.utcnow() + timedelta(seconds=60)  # Default 1 minute
-                except (ValueError, OverflowError, OSError):
-                    reset_time = datetime.utcnow() + timedelta(seconds=60)  # Default 1 minute
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "message": "Too many requests. Please try again later.",
-                        "reset_time": reset_time.isoformat(),
-                        "limit": rate_limit_result["limit"]
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(rate_limit_result["limit"]),
-                        "X-RateLimit-Remaining": str(rate_limit_result["remaining"]),
-                        "X-RateLimit-Reset": str(int(rate_limit_result["reset_time"]))
-                    }
-                )
-            
-            # Add rate limit headers to response
-            response = await call_next(request)
-            
-            response.headers["X-RateLimit-Limit"] = str(rate_limit_result["limit"])
-            response.headers["X-RateLimit-Remaining"] = str(rate_limit_result["remaining"])
-            response.headers["X-RateLimit-Reset"] = str(int(rate_limit_result["reset_time"]))
-            
-            return response
-            
+            # Token verification and Redis calls block; keep them off the event loop
+            rate_limit_result = await run_in_threadpool(rate_limiter.check_request, request)
         except Exception as e:
             logger.error(f"Rate limiting middleware error: {e}")
             # Continue without rate limiting if there's an error
             return await call_next(request)
-    
+
+        if not rate_limit_result["allowed"]:
+            # Rate limit exceeded
+            reset_time = _reset_time_for(rate_limit_result)
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={
+                    "error": "Rate limit exceeded",
+                    "message": "Too many requests. Please try again later.",
+                    "reset_time": reset_time.isoformat(),
+                    "limit": rate_limit_result["limit"]
+                },
+                headers={
+                    "X-RateLimit-Limit": str(rate_limit_result["limit"]),
+                    "X-RateLimit-Remaining": str(rate_limit_result["remaining"]),
+                    "X-RateLimit-Reset": str(int(rate_limit_result["reset_time"]))
+                }
+            )
+
+        # Add rate limit headers to response
+        response = await call_next(request)
+
+        response.headers["X-RateLimit-Limit"] = str(rate_limit_result["limit"])
+        response.headers["X-RateLimit-Remaining"] = str(rate_limit_result["remaining"])
+        response.headers["X-RateLimit-Reset"] = str(int(rate_limit_result["reset_time"]))
+
+        return response
+
     return rate_limit_middleware
 
 def create_rate_limit_dependency(rate_limiter: RateLimiter, endpoint_limit: Optional[int] = None):
     """
     Create a dependency for rate limiting specific endpoints.
-    
+
     Args:
         rate_limiter: RateLimiter instance
         endpoint_limit: Optional custom limit for this endpoint
-        
+
     Returns:
         FastAPI dependency function
     """
     async def rate_limit_dependency(request: Request):
         """Rate limiting dependency function."""
-        identifier = rate_limiter.get_user_identifier(request)
-        limit = endpoint_limit or rate_limiter.get_limit_for_endpoint(request.url.path)
-        is_admin = rate_limiter.is_admin_user(request)
-        
-        rate_limit_result = rate_limiter.check_rate_limit(identifier, limit, is_admin)
-        
+        rate_limit_result = await run_in_threadpool(rate_limiter.check_request, request, endpoint_limit)
+
         if not rate_limit_result["allowed"]:
-            try:
-                # Handle both seconds and milliseconds timestamps
-                reset_timestamp = rate_limit_result["reset_time"]
-                if reset_timestamp > 1e12:  # Likely milliseconds
-                    timestamp_seconds = reset_timestamp / 1000.0
-                else:
-                    timestamp_seconds = reset_timestamp
-                
-                if 946684800 <= timestamp_seconds <= 4102444800:
-                    reset_time = datetime.fromtimestamp(timestamp_seconds)
-                else:
-                    reset_time = datetime.utcnow() + timedelta(seconds=60)  # Default 1 minute
-            except (ValueError, OverflowError, OSError):
-                reset_time = datetime.utcnow() + timedelta(seconds=60)  # Default 1 minute
+            reset_time = _reset_time_for(rate_limit_result)
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail={
@@ -346,15 +428,29 @@ def create_rate_limit_dependency(rate_limiter: RateLimiter, endpoint_limit: Opti
                     "limit": rate_limit_result["limit"]
                 }
             )
-        
+
         return rate_limit_result
-    
+
     return rate_limit_dependency
 
-# Example usage:
-# from fastapi import FastAPI
-# from .middleware.rate_limiter import RateLimiter, create_rate_limit_middleware
-# 
-# app = FastAPI()
-# rate_limiter = RateLimiter()
-# app.middleware("http")(create_rate_limit_middleware(rate_limiter)) 
\ No newline at end of file
+
+def _redis_client_from_env():
+    """Redis client for ``REDIS_URL`` (shared limits across replicas), else None for in-memory counters."""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    try:
+        import redis
+        return redis.from_url(redis_url)
+    except Exception as e:
+        logger.warning(f"Redis rate limiting unavailable, using in-memory counters: {e}")
+        return None
+
+
+def rate_limiting_enabled() -> bool:
+    """Whether setup_middleware mounts the limiter app-wide (``RATE_LIMIT_ENABLED``, off by default)."""
+    return os.getenv("RATE_LIMIT_ENABLED", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Global instance, mounted by src.core.middleware.setup_middleware when enabled
+rate_limiter = RateLimiter(_redis_client_from_env())
@@ -104,22 +104,8 @@ async def get_donation_manifest(
                 "manifest": []
             }
         
-        # Get worn items
-        from google.cloud.firestore_v1 import FieldFilter
-        outfit_history_query = db.collection('outfit_history').where(filter=FieldFilter('user_id', '==', user_id))
-        worn_item_ids = set()
-        
-        for doc in outfit_history_query.stream():
-            entry = doc.to_dict()
-            items = entry.get('items', [])
-            for item in items:
-                if isinstance(item, dict):
-                    worn_item_ids.add(item.get('id'))
-                elif isinstance(item, str):
-                    worn_item_ids.add(item)
-        
         # Generate manifest
-        manifest = await addiction_service.generate_donation_manifest(user_id, list(worn_item_ids))
+        manifest = await addiction_service.generate_donation_manifest(user_id)
         
         logger.info(f"✅ Generated donation manifest for user {user_id}: {len(manifest)} items")
         
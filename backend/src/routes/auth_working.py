@@ -323,18 +323,9 @@ async def recalculate_tve_for_user(user_id: str) -> None:
             merge=True,
         )
 
-        wardrobe_ref = db.collection("wardrobe").where("userId", "==", user_id)
-        items = list(wardrobe_ref.stream())
-
-        recalculated_count = 0
-        for doc in items:
-            try:
-                success = await tve_service.initialize_item_tve_fields(user_id, doc.id)
-                if success:
-                    recalculated_count += 1
-            except Exception:
-                # Keep going; one bad item shouldn't kill the batch
-                continue
+        # One wardrobe scan with batched item writes; also rebuilds the TVE aggregates
+        audit = await tve_service.audit_wardrobe_tve(user_id)
+        recalculated_count = audit.get("items_updated", 0)
 
         user_ref.set(
             {
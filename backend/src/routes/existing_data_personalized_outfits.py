@@ -844,6 +844,9 @@ async def generate_personalized_outfit_from_existing_data(
             db.collection('outfits').document(outfit_response['id']).set(outfit_for_firestore)
             logger.warning(f"✅ DIVERSITY: Saved outfit {outfit_response['id']} to Firestore for diversity tracking")
             
+            from ..services.style_rollup_service import style_rollup_service
+            style_rollup_service.record_outfit(user_id, outfit_response['id'], outfit_for_firestore)
+            
         except Exception as save_error:
             # Don't fail the request if save fails, just log it
             logger.error(f"⚠️ Failed to save outfit to Firestore: {save_error}")
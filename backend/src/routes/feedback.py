@@ -165,6 +165,9 @@ async def submit_outfit_feedback(
         feedback_ref.set(feedback_data)
         logger.info(f"Successfully saved feedback to outfit_feedback collection with ID: {feedback_ref.id}")
         
+        from ..services.user_counter_service import user_counter_service
+        user_counter_service.increment(user_id, 'feedbackCount', 1)
+        
         # Update outfit with feedback summary
         logger.info("Updating outfit with feedback summary...")
         outfit_ref.update({
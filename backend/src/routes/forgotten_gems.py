@@ -75,18 +75,13 @@ async def get_forgotten_gems(
                 message="Firebase unavailable"
             )
 
-        try:
-            logger.info("Forgotten Gems: Getting wardrobe items directly from Firestore")
-            query = db.collection('wardrobe').where('userId', '==', current_user.id)
-            docs = query.stream()
-
-            wardrobe = []
-            for doc in docs:
-                item_data = doc.to_dict()
-                item_data['id'] = doc.id
-                wardrobe.append(item_data)
+        from ..services.wardrobe_analytics_engine import last_worn_millis, wardrobe_analytics_engine
 
-            logger.info(f"Forgotten Gems: Found {len(wardrobe)} wardrobe items")
+        try:
+            table, gems = wardrobe_analytics_engine.forgotten_gems(
+                current_user.id, days_threshold, min_rediscovery_potential
+            )
+            logger.info(f"Forgotten Gems: Found {len(table)} wardrobe items")
         except Exception as e:
             logger.error(f"Forgotten Gems: Error fetching wardrobe items: {e}")
             return ForgottenGemsResponse(
@@ -100,138 +95,29 @@ async def get_forgotten_gems(
                 },
                 message="Failed to fetch wardrobe; returning empty insights"
             )
-        
-        # Implement basic scoring to return real forgotten items
-        now = datetime.now()
-
-        def compute_days_since_worn(item_dict: Dict[str, Any]) -> int:
-            ts = (item_dict.get('lastWorn') if item_dict else None)
-            if ts is None:
-                return 999 if item_dict.get('wearCount', 0) == 0 else 365
-            try:
-                # Handle different timestamp formats
-                if hasattr(ts, 'timestamp'):
-                    # Firestore DatetimeWithNanoseconds object
-                    seconds = ts.timestamp()
-                elif isinstance(ts, (int, float)):
-                    # Already a timestamp
-                    seconds = ts / 1000.0 if ts > 1e12 else ts
-                else:
-                    # Try to convert to datetime first
-                    if hasattr(ts, 'timestamp'):
-                        seconds = ts.timestamp()
-                    else:
-                        seconds = float(ts)
-                
-                if 946684800 <= seconds <= 4102444800:
-                    last = datetime.fromtimestamp(seconds)
-                    return max(0, (now - last).days)
-                return 365
-            except Exception as e:
-                # print(f"🔍 DEBUG: Error processing lastWorn timestamp: {e}, type: {type(ts)}")
-                return 365
 
+        # Scoring runs vectorized in the analytics engine; only the winners become models
         scored: List[ForgottenItem] = []
-        total_unworn = 0
-        potential_savings = 0.0
-
-        for it in wardrobe:
-            days_since_worn = compute_days_since_worn(it)
-            if days_since_worn < days_threshold:
-                continue
-            total_unworn += 1
-            wear_count = int((it.get('wearCount', 0) if it else 0) or 0)
-            is_fav = bool((it.get('isFavorite', False) if it else False))
-
-            # Basic rediscovery potential: 
-            # more days since worn -> higher, fewer wears -> higher, favorite -> small boost
-            score = 40.0
-            score += min(days_since_worn / 7.0, 40.0)       # up to +40 for very old items
-            score -= min(wear_count * 5.0, 25.0)            # up to -25 for commonly worn
-            if is_fav:
-                score += 5.0                                 # small nudge for favorites
-            score = max(0.0, min(100.0, score))
-
-            if score < min_rediscovery_potential:
-                continue
-
-            # Convert lastWorn to timestamp if it's a datetime object
-            last_worn_ts = it.get('lastWorn')
-            if last_worn_ts is not None:
-                try:
-                    if hasattr(last_worn_ts, 'timestamp'):
-                        # Firestore DatetimeWithNanoseconds object
-                        last_worn_ts = int(last_worn_ts.timestamp() * 1000)  # Convert to milliseconds
-                    elif not isinstance(last_worn_ts, int):
-                        # Try to convert to int
-                        last_worn_ts = int(last_worn_ts)
-                except Exception as e:
-                    # print(f"🔍 DEBUG: Error converting lastWorn to timestamp: {e}")
-                    last_worn_ts = None
-
-            fi = ForgottenItem(
-                id=(it.get('id', '') if it else ''),
-                name=((it.get('name', f"{it.get('type', 'Item') if it else 'Item'}") if it else 'Item').title()),
-                type=(it.get('type', 'unknown') if it else 'unknown'),
-                imageUrl=(it.get('imageUrl', '/placeholder.svg') if it else '/placeholder.svg'),
-                color=(it.get('color', 'unknown') if it else 'unknown'),
-                style=((it.get('style', []) if it else []) if it else []) if isinstance(((it.get('style', []) if it else []) if it else []), list) else [],
-                lastWorn=last_worn_ts,
+        for index, days_since_worn, score in gems["items"]:
+            it = table.items[index]
+            style = it.get('style', [])
+            scored.append(ForgottenItem(
+                id=table.ids[index],
+                name=str(it.get('name') or it.get('type') or 'Item').title(),
+                type=it.get('type', 'unknown'),
+                imageUrl=it.get('imageUrl', '/placeholder.svg'),
+                color=it.get('color', 'unknown'),
+                style=style if isinstance(style, list) else [],
+                lastWorn=last_worn_millis(it.get('lastWorn')),
                 daysSinceWorn=days_since_worn,
-                usageCount=wear_count,
-                favoriteScore=5.0 if is_fav else 0.0,
+                usageCount=int(table.wear_count[index]),
+                favoriteScore=5.0 if table.favorite[index] else 0.0,
                 suggestedOutfits=[],
                 declutterReason=None,
                 rediscoveryPotential=score,
-            )
-            scored.append(fi)
-            potential_savings += 10.0
-
-        # If none met the min threshold, take top candidates by daysSinceWorn anyway
-        if not scored:
-            fallback_candidates: List[ForgottenItem] = []
-            for it in wardrobe:
-                dsw = compute_days_since_worn(it)
-                if dsw < days_threshold:
-                    continue
-                wc = int((it.get('wearCount', 0) if it else 0) or 0)
-                fav = bool((it.get('isFavorite', False) if it else False))
-                basic_score = 30.0 + min(dsw / 10.0, 30.0) - min(wc * 3.0, 15.0) + (5.0 if fav else 0.0)
-                # Convert lastWorn to timestamp if it's a datetime object
-                last_worn_ts = it.get('lastWorn')
-                if last_worn_ts is not None:
-                    try:
-                        if hasattr(last_worn_ts, 'timestamp'):
-                            # Firestore DatetimeWithNanoseconds object
-                            last_worn_ts = int(last_worn_ts.timestamp() * 1000)  # Convert to milliseconds
-                        elif not isinstance(last_worn_ts, int):
-                            # Try to convert to int
-                            last_worn_ts = int(last_worn_ts)
-                    except Exception as e:
-                        # print(f"🔍 DEBUG: Error converting lastWorn to timestamp in fallback: {e}")
-                        last_worn_ts = None
-
-                fi = ForgottenItem(
-                    id=(it.get('id', '') if it else ''),
-                    name=((it.get('name', f"{it.get('type', 'Item') if it else 'Item'}") if it else 'Item').title()),
-                    type=(it.get('type', 'unknown') if it else 'unknown'),
-                    imageUrl=(it.get('imageUrl', '/placeholder.svg') if it else '/placeholder.svg'),
-                    color=(it.get('color', 'unknown') if it else 'unknown'),
-                    style=((it.get('style', []) if it else []) if it else []) if isinstance(((it.get('style', []) if it else []) if it else []), list) else [],
-                    lastWorn=last_worn_ts,
-                    daysSinceWorn=dsw,
-                    usageCount=wc,
-                    favoriteScore=5.0 if fav else 0.0,
-                    suggestedOutfits=[],
-                    declutterReason=None,
-                    rediscoveryPotential=max(0.0, min(100.0, basic_score)),
-                )
-                fallback_candidates.append(fi)
-            fallback_candidates.sort(key=lambda x: x.daysSinceWorn, reverse=True)
-            scored = fallback_candidates[:10]
-
-        scored.sort(key=lambda x: x.rediscoveryPotential, reverse=True)
-        scored = scored[:10]
+            ))
+        total_unworn = gems["total_unworn"]
+        potential_savings = gems["potential_savings"]
 
         return ForgottenGemsResponse(
             success=True,
@@ -376,17 +376,9 @@ async def initialize_tve_for_user(
     Initialize TVE fields for all user's wardrobe items
     """
     try:
-        from ..config.firebase import db
-        
-        # Get all user's items
-        wardrobe_ref = db.collection('wardrobe').where('userId', '==', current_user.id)
-        items = list(wardrobe_ref.stream())
-        
-        count = 0
-        for doc in items:
-            success = await tve_service.initialize_item_tve_fields(current_user.id, doc.id)
-            if success:
-                count += 1
+        # Full recompute: refreshes every item's TVE fields and the category aggregates
+        audit = await tve_service.audit_wardrobe_tve(current_user.id)
+        count = audit.get("items_updated", 0)
         
         return {
             "success": True,
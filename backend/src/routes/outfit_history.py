@@ -323,6 +323,7 @@ async def mark_outfit_as_worn(
         if item_ids:
             batch = db.batch()
             wardrobe_ref = db.collection('wardrobe')
+            worn_items = []
             
             for item_id in item_ids:
                 item_ref = wardrobe_ref.document(item_id)
@@ -338,6 +339,13 @@ async def mark_outfit_as_worn(
                         'lastWorn': current_timestamp,
                         'updatedAt': current_timestamp
                     })
+                    worn_items.append((item_data or {}, current_wear_count))
+            
+            # Keep the CPW aggregates and wardrobe version in the same batch as the wear counts
+            from ..services.tve_service import tve_service
+            from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+            tve_service.on_items_worn(current_user.id, worn_items, batch=batch)
+            wardrobe_analytics_engine.touch_wardrobe(current_user.id, batch=batch)
             
             # Commit the batch update
             batch.commit()
@@ -393,6 +401,11 @@ async def mark_outfit_as_worn(
             _, doc_ref = db.collection('outfit_history').add(entry_data)
             doc_id = doc_ref.id
             logger.info(f"✅ Created outfit history entry with ID: {doc_id}")
+            
+            from ..services.style_rollup_service import style_rollup_service
+            from ..services.user_counter_service import user_counter_service
+            style_rollup_service.record_outfit(current_user.id, doc_id, entry_data)
+            user_counter_service.increment(current_user.id, 'outfitsLoggedCount', 1)
             logger.info(f"🔍 DEBUG: Document reference: {doc_ref}")
             logger.info(f"🔍 DEBUG: Document ID: {doc_id}")
             
@@ -425,46 +438,54 @@ async def mark_outfit_as_worn(
             # Get current timestamp for the log
             log_timestamp_ms = int(datetime.now().timestamp() * 1000)
             
-            # Process gamification (tokens, XP, streak) - AWAITED for immediate consistency
-            gamification_result = await addiction_service.process_outfit_log(
-                user_id=current_user.id,
-                log_timestamp=log_timestamp_ms
-            )
-            
-            logger.info(f"✅ Gamification processed: {gamification_result}")
-            
-            # 2. Auto-start annual challenge if not already active
-            try:
-                annual_start_result = await challenge_service.auto_start_annual_challenge(current_user.id)
-                if annual_start_result.get('success') and not annual_start_result.get('already_exists'):
-                    logger.info(f"✅ Auto-started annual challenge for user {current_user.id}")
-            except Exception as annual_error:
-                logger.warning(f"⚠️ Could not auto-start annual challenge: {annual_error}")
-            
-            # 3. Check for challenge progress
-            completed_challenges = await challenge_service.check_challenge_progress(
-                user_id=current_user.id,
-                outfit_data={"items": item_ids, "date": date_timestamp}
-            )
-            if completed_challenges:
-                logger.info(f"🎉 Completed challenges: {completed_challenges}")
-            
-            # 4. Check for 30-wears milestones on each worn item
-            for item_id in item_ids:
-                item_ref = db.collection('wardrobe').document(item_id)
-                item_doc = item_ref.get()
-                if item_doc.exists:
-                    item_data = item_doc.to_dict()
-                    new_wear_count = item_data.get('wearCount', 0)
+            # XP, tokens and badges from the log, challenges and milestones commit together
+            from ..services.gamification_service import gamification_service
+            async with gamification_service.xp_ledger(current_user.id) as xp_ledger:
+                # Process gamification (tokens, XP, streak) - AWAITED for immediate consistency
+                gamification_result = await addiction_service.process_outfit_log(
+                    user_id=current_user.id,
+                    log_timestamp=log_timestamp_ms
+                )
+                
+                logger.info(f"✅ Gamification processed: {gamification_result}")
+                
+                # 2. Auto-start annual challenge if not already active
+                try:
+                    annual_start_result = await challenge_service.auto_start_annual_challenge(current_user.id)
+                    if annual_start_result.get('success') and not annual_start_result.get('already_exists'):
+                        logger.info(f"✅ Auto-started annual challenge for user {current_user.id}")
+                except Exception as annual_error:
+                    logger.warning(f"⚠️ Could not auto-start annual challenge: {annual_error}")
+                
+                # 3. Check for challenge progress
+                completed_challenges = await challenge_service.check_challenge_progress(
+                    user_id=current_user.id,
+                    outfit_data={"items": item_ids, "date": date_timestamp}
+                )
+                if completed_challenges:
+                    logger.info(f"🎉 Completed challenges: {completed_challenges}")
+                
+                # 4. Check for 30-wears milestones on each worn item
+                for item_id in item_ids:
+                    item_ref = db.collection('wardrobe').document(item_id)
+                    item_doc = item_ref.get()
+                    if item_doc.exists:
+                        item_data = item_doc.to_dict()
+                        new_wear_count = item_data.get('wearCount', 0)
                     
-                    milestone_result = await challenge_service.check_30_wears_milestones(
-                        user_id=current_user.id,
-                        item_id=item_id,
-                        new_wear_count=new_wear_count
-                    )
-                    if milestone_result:
-                        milestone_results.append(milestone_result)
-                        logger.info(f"🏆 Milestone reached for item {item_id}: {milestone_result}")
+                        milestone_result = await challenge_service.check_30_wears_milestones(
+                            user_id=current_user.id,
+                            item_id=item_id,
+                            new_wear_count=new_wear_count
+                        )
+                        if milestone_result:
+                            milestone_results.append(milestone_result)
+                            logger.info(f"🏆 Milestone reached for item {item_id}: {milestone_result}")
+                
+            # Report the committed (not projected) level outcome
+            if xp_ledger.result and 'error' not in xp_ledger.result and isinstance(gamification_result, dict):
+                gamification_result['level_up'] = xp_ledger.result.get('level_up', False)
+                gamification_result['new_level'] = xp_ledger.result.get('level', gamification_result.get('new_level', 1))
             
             # 4. Increment TVE for each worn item (Event-Triggered Hybrid Approach)
             total_tve_increment = 0
@@ -728,8 +749,12 @@ async def delete_outfit_history_entry(
         if entry_data.get('user_id') != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this entry")
         
-        # Delete the document
-        doc_ref.delete()
+        # Delete the document and take it out of its month's style rollup
+        from ..services.style_rollup_service import style_rollup_service
+        style_rollup_service.delete_outfit(doc_ref, entry_data, current_user.id, entry_id)
+        
+        from ..services.user_counter_service import user_counter_service
+        user_counter_service.increment(current_user.id, 'outfitsLoggedCount', -1)
         
         # Log analytics event
         from ..models.analytics_event import AnalyticsEvent
@@ -858,7 +883,8 @@ async def get_todays_outfit_suggestion(
 ):
     """
     Get or generate today's outfit suggestion for the current user.
-    This generates a new outfit suggestion once per day and caches it.
+    Suggestions are normally precomputed each local morning by the daily
+    suggestions job; a new one is only generated here on a miss.
     """
 #     print("⚡ HIT: today-suggestion from outfit_history.py")
     try:
@@ -867,11 +893,13 @@ async def get_todays_outfit_suggestion(
             
         logger.info(f"Getting today's outfit suggestion for user {current_user.id}")
         
-        # Get today's date as a string for caching
-        from datetime import datetime, timezone
-        today_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        from ..services.daily_suggestion_service import daily_suggestion_service, has_mock_items, suggestion_date
+        
+        # Suggestions are keyed by the user's local date
+        today_str = suggestion_date(current_user.location_data)
         
         # Check if firebase is available
+        db = get_db()
         if not db:
             logger.warning("Firebase not available, returning fallback suggestion")
             return {
@@ -881,44 +909,28 @@ async def get_todays_outfit_suggestion(
                 "message": "Service temporarily unavailable"
             }
         
-        # Look for existing suggestion for today
-        suggestions_ref = db.collection('daily_outfit_suggestions')
-        query = suggestions_ref.where(filter=FieldFilter('user_id', '==', current_user.id)).where(filter=FieldFilter('date', '==', today_str))
-        existing_docs = list(query.stream())
-        
-        if existing_docs:
-            # Return existing suggestion
-            doc = existing_docs[0]
-            suggestion_data = doc.to_dict()
-            outfit_data = (suggestion_data.get('outfit_data', {}) if suggestion_data else {})
-            items = (outfit_data.get('items', []) if outfit_data else [])
+        # Usually precomputed by the daily suggestions job: one document read
+        suggestion_data = daily_suggestion_service.get_suggestion(current_user.id, today_str)
+        
+        if suggestion_data:
+            outfit_data = suggestion_data.get('outfit_data', {}) or {}
             
             # Check if the cached suggestion contains mock items (old fallback items)
-            has_mock_items = any(
-                (item.get('id', '') if item else '').startswith('fallback-') or 
-                (item.get('name', '') if item else '').endswith(' Top') or 
-                (item.get('name', '') if item else '').endswith(' Pants') or 
-                (item.get('name', '') if item else '').endswith(' Shoes')
-                for item in items
-            )
-            
-            if has_mock_items:
+            if has_mock_items(outfit_data):
                 logger.info(f"Found cached suggestion with mock items, regenerating for {today_str}")
-                # Delete the old suggestion with mock items
-                doc.reference.delete()
-                # Continue to generate a new suggestion below
+                # Continue to generate a new suggestion below; it replaces this one
             else:
                 logger.info(f"Found existing suggestion for {today_str}")
                 return {
                     "success": True,
                     "suggestion": {
-                        "id": doc.id,
+                        "id": suggestion_data['id'],
                         "outfitData": outfit_data,
-                        "generatedAt": (suggestion_data.get('generated_at') if suggestion_data else None),
-                        "date": (suggestion_data.get('date') if suggestion_data else None)
+                        "generatedAt": suggestion_data.get('generated_at'),
+                        "date": suggestion_data.get('date')
                     },
-                    "isWorn": (suggestion_data.get('is_worn', False) if suggestion_data else False),
-                    "wornAt": (suggestion_data.get('worn_at') if suggestion_data else None),
+                    "isWorn": suggestion_data.get('is_worn', False),
+                    "wornAt": suggestion_data.get('worn_at'),
                     "message": "Today's outfit suggestion"
                 }
         
@@ -926,84 +938,11 @@ async def get_todays_outfit_suggestion(
         logger.info(f"Generating new outfit suggestion for {today_str}")
         
         try:
-            # Import outfit generation logic
-            from ..routes.outfits import generate_outfit_logic, OutfitRequest, get_user_profile_cached
-            
-            # Fetch user profile for personalization
-            user_profile = await get_user_profile_cached(current_user.id)
-            
-            # Fetch weather data if available
-            weather_data = None
-            try:
-                # Try to get weather from user's location if stored
-                # This is optional - outfit generation will work without it
-                pass  # Weather fetching can be added later if needed
-            except Exception as weather_error:
-                logger.warning(f"Could not fetch weather data: {weather_error}")
-            
-            # Fetch user's liked outfits for personalization
-            liked_outfits = []
-            try:
-                liked_docs = db.collection('outfit_likes').where('userId', '==', current_user.id).limit(10).stream()
-                liked_outfits = [{'id': doc.id, **doc.to_dict()} for doc in liked_docs]
-            except Exception as e:
-                logger.warning(f"Could not fetch liked outfits: {e}")
-            
-            # Get user preferences
-            preferences = {}
-            try:
-                pref_doc = db.collection('user_preferences').document(current_user.id).get()
-                if pref_doc.exists:
-                    preferences = pref_doc.to_dict()
-            except Exception as e:
-                logger.warning(f"Could not fetch preferences: {e}")
-            
-            # Create a comprehensive request for daily wear with all context
-            daily_request = OutfitRequest(
-                occasion="casual",
-                style="comfortable", 
-                mood="confident",
-                description="Daily outfit suggestion",
-                weather=weather_data,
-                user_profile=user_profile,
-                likedOutfits=liked_outfits,
-                trendingStyles=[],  # Can be populated if trending data is available
-                preferences=preferences
-            )
+            generated_outfit = await daily_suggestion_service.generate_outfit(current_user.id)
+            logger.info(f"Successfully generated outfit: {(generated_outfit.get('name', 'Unknown') if generated_outfit else 'Unknown')}")
             
-            logger.info(f"About to generate outfit with request: style={daily_request.style}, occasion={daily_request.occasion}, items_count={len(daily_request.wardrobe) if daily_request.wardrobe else 0}")
-            
-            # Generate outfit using existing logic with timeout
-            import asyncio
-            try:
-                generated_outfit = await asyncio.wait_for(
-                    generate_outfit_logic(daily_request, current_user.id),
-                    timeout=30.0  # 30 second timeout
-                )
-                logger.info(f"Successfully generated outfit: {(generated_outfit.get('name', 'Unknown') if generated_outfit else 'Unknown')}")
-            except asyncio.TimeoutError:
-                logger.error("Outfit generation timed out after 30 seconds")
-                raise Exception("Outfit generation timed out")
-            except Exception as gen_error:
-                logger.error(f"Outfit generation failed: {gen_error}")
-                raise gen_error
-            
-            # Save suggestion to cache
-            current_timestamp = int(datetime.utcnow().timestamp() * 1000)
-            suggestion_doc = {
-                'user_id': current_user.id,
-                'date': today_str,
-                'outfit_data': generated_outfit,
-                'generated_at': current_timestamp,
-                'is_worn': False,
-                'worn_at': None,
-                'created_at': current_timestamp,
-                'updated_at': current_timestamp
-            }
-            
-            # Save to Firestore
-            doc_ref = db.collection('daily_outfit_suggestions').add(suggestion_doc)
-            suggestion_id = doc_ref[1].id
+            saved = daily_suggestion_service.save_suggestion(current_user.id, today_str, generated_outfit)
+            suggestion_id = saved['id']
             
             logger.info(f"Generated and saved new outfit suggestion {suggestion_id}")
             
@@ -1012,7 +951,7 @@ async def get_todays_outfit_suggestion(
                 "suggestion": {
                     "id": suggestion_id,
                     "outfitData": generated_outfit,
-                    "generatedAt": current_timestamp,
+                    "generatedAt": saved['generated_at'],
                     "date": today_str
                 },
                 "isWorn": False,
@@ -1079,21 +1018,9 @@ async def get_todays_outfit_suggestion(
             
             # Save fallback suggestion to cache
             try:
-                current_timestamp = int(datetime.utcnow().timestamp() * 1000)
-                fallback_doc = {
-                    'user_id': current_user.id,
-                    'date': today_str,
-                    'outfit_data': fallback_outfit,
-                    'generated_at': current_timestamp,
-                    'is_worn': False,
-                    'worn_at': None,
-                    'created_at': current_timestamp,
-                    'updated_at': current_timestamp,
-                    'is_fallback': True  # Mark as fallback
-                }
-                
-                doc_ref = db.collection('daily_outfit_suggestions').add(fallback_doc)
-                suggestion_id = doc_ref[1].id
+                saved = daily_suggestion_service.save_suggestion(current_user.id, today_str, fallback_outfit, is_fallback=True)
+                suggestion_id = saved['id']
+                current_timestamp = saved['generated_at']
                 
                 logger.info(f"Created fallback outfit suggestion {suggestion_id}")
                 
@@ -1134,26 +1061,21 @@ async def clear_todays_suggestion_cache(
         
         logger.info(f"Clearing today's outfit suggestion cache for user {current_user.id}")
         
+        from ..services.daily_suggestion_service import daily_suggestion_service, suggestion_date
+        
         # Get today's date
-        from datetime import datetime, timezone
-        today_str = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        today_str = suggestion_date(current_user.location_data)
         
         # Check if firebase is available
+        db = get_db()
         if not db:
             return {
                 "success": False,
                 "message": "Firebase not available"
             }
         
-        # Delete all suggestions for today
-        suggestions_ref = db.collection('daily_outfit_suggestions')
-        query = suggestions_ref.where(filter=FieldFilter('user_id', '==', current_user.id)).where(filter=FieldFilter('date', '==', today_str))
-        existing_docs = list(query.stream())
-        
-        deleted_count = 0
-        for doc in existing_docs:
-            doc.reference.delete()
-            deleted_count += 1
+        # Delete today's suggestion
+        deleted_count = daily_suggestion_service.delete_suggestion(current_user.id, today_str)
         
         logger.info(f"Deleted {deleted_count} cached suggestions for user {current_user.id}")
         
@@ -1187,6 +1109,7 @@ async def mark_today_suggestion_as_worn(
         logger.info(f"Marking today's suggestion {suggestion_id} as worn for user {current_user.id}")
         
         # Check if firebase is available
+        db = get_db()
         if not db:
             raise HTTPException(status_code=503, detail="Service temporarily unavailable")
         
@@ -1227,6 +1150,7 @@ async def mark_today_suggestion_as_worn(
             try:
                 batch = db.batch()
                 wardrobe_ref = db.collection('wardrobe')
+                worn_items = []
                 
                 for item in outfit_items:
                     if isinstance(item, dict) and 'id' in item:
@@ -1244,6 +1168,12 @@ async def mark_today_suggestion_as_worn(
                                 'lastWorn': current_timestamp,
                                 'updatedAt': current_timestamp
                             })
+                            worn_items.append((item_data or {}, current_wear_count))
+                
+                from ..services.tve_service import tve_service
+                from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+                tve_service.on_items_worn(current_user.id, worn_items, batch=batch)
+                wardrobe_analytics_engine.touch_wardrobe(current_user.id, batch=batch)
                 
                 # Commit the batch update
                 batch.commit()
@@ -1310,7 +1240,12 @@ async def mark_today_suggestion_as_worn(
         }
         
         # Save to outfit history
-        db.collection('outfit_history').add(history_entry)
+        _, history_ref = db.collection('outfit_history').add(history_entry)
+        
+        from ..services.style_rollup_service import style_rollup_service
+        from ..services.user_counter_service import user_counter_service
+        style_rollup_service.record_outfit(current_user.id, history_ref.id, history_entry)
+        user_counter_service.increment(current_user.id, 'outfitsLoggedCount', 1)
         
         # Update user_stats for dashboard counter
         try:
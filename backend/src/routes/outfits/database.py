@@ -279,7 +279,9 @@ async def save_outfit(user_id: str, outfit_id: str, outfit_record: Dict[str, Any
         
         try:
             # CRITICAL FIX: Wrap Firestore operation in try/catch to catch silent failures
-            doc_ref.set(outfit_record)
+            # The outfit and its month's style rollup are written in one transaction
+            from ...services.style_rollup_service import style_rollup_service
+            style_rollup_service.save_outfit(doc_ref, outfit_record, user_id, outfit_id)
         except Exception as firestore_error:
             logger.error(f"💾 Firestore set() FAILED with exception: {firestore_error}")
             raise firestore_error
@@ -389,7 +391,7 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
     """Get user outfits from Firestore with pagination."""
     # Temporary: Increase limit to show more outfits
     limit = min(limit, 200)
-    logger.info(f"🔍 DEBUG: Fetching outfits for user {user_id} (limit={limit}, offset={offset})")
+    logger.info("🔍 DEBUG: Fetching outfits for user %s (limit=%s, offset=%s)", user_id, limit, offset)
     
     try:
         # Import Firebase inside function to prevent import-time crashes
@@ -397,14 +399,14 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
             from ...config.firebase import db, firebase_initialized
             FIREBASE_AVAILABLE = True
         except ImportError as e:
-            logger.warning(f"⚠️ Firebase import failed: {e}")
+            logger.warning("⚠️ Firebase import failed: %s", e)
             return []
         
         if not FIREBASE_AVAILABLE or not firebase_initialized:
             logger.warning("⚠️ Firebase not available, returning empty outfits")
             return []
             
-        logger.info(f"📚 DEBUG: About to query Firestore collection('outfits') with user_id == '{user_id}'")
+        logger.info("📚 DEBUG: About to query Firestore collection('outfits') with user_id == '%s'", user_id)
         
         # FIXED: Query main outfits collection with user_id field (snake_case)
         # This matches the Pydantic model and outfit creation code
@@ -417,7 +419,7 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
             outfits_ref = outfits_ref.order_by("createdAt", direction=firestore.Query.DESCENDING)
             logger.info("✅ DEBUG: Using Firestore server-side ordering by createdAt DESC")
         except Exception as e:
-            logger.warning(f"⚠️ DEBUG: Firestore ordering failed ({e}), will use client-side sorting")
+            logger.warning("⚠️ DEBUG: Firestore ordering failed (%s), will use client-side sorting", e)
             use_firestore_ordering = False
         
         # Apply pagination based on whether ordering worked
@@ -430,15 +432,15 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
         else:
             outfits_ref = outfits_ref.limit(min(fetch_limit, 250))
         
-        logger.info(f"🔍 DEBUG: Firestore query: limit={limit}, offset={offset}")
+        logger.info("🔍 DEBUG: Firestore query: limit=%s, offset=%s", limit, offset)
         
         # Execute query with error handling to prevent timeout
         try:
-            logger.info(f"🔍 DEBUG: Executing Firestore query with .stream()...")
+            logger.info("🔍 DEBUG: Executing Firestore query with .stream()...")
             docs = outfits_ref.stream()
-            logger.info(f"🔍 DEBUG: Firestore query executed successfully, processing results...")
+            logger.info("🔍 DEBUG: Firestore query executed successfully, processing results...")
         except Exception as e:
-            logger.error(f"🔥 Firestore query failed: {e}", exc_info=True)
+            logger.error("🔥 Firestore query failed: %s", e, exc_info=True)
             return []  # Return empty list instead of crashing
         
         # First pass: collect outfit data
@@ -462,27 +464,27 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
                     try:
                         doc.reference.update({"created_at_ms": created_at_ms})
                     except Exception as update_error:
-                        logger.debug(f"🔁 DEBUG: Skipped created_at_ms backfill for {doc.id}: {update_error}")
+                        logger.debug("🔁 DEBUG: Skipped created_at_ms backfill for %s: %s", doc.id, update_error)
                 
                 # Normalize timestamp immediately to prevent later errors
                 outfit_data['createdAt'] = normalize_created_at(raw_created_at)
                 
                 outfits.append(outfit_data)
-                logger.info(f"🔍 DEBUG: Found outfit: {outfit_data.get('name', 'unnamed')} (ID: {doc.id}, Created: {outfit_data.get('createdAt', 'Unknown')})")
-                logger.info(f"🔍 DEBUG: Outfit {doc.id} wearCount: {outfit_data.get('wearCount', 'NOT_FOUND')}, lastWorn: {outfit_data.get('lastWorn', 'NOT_FOUND')}")
-                logger.info(f"🔍 DEBUG: Outfit {doc.id} all fields: {list(outfit_data.keys())}")
+                logger.debug("🔍 DEBUG: Found outfit: %s (ID: %s, Created: %s)", outfit_data.get('name', 'unnamed'), doc.id, outfit_data.get('createdAt', 'Unknown'))
+                logger.debug("🔍 DEBUG: Outfit %s wearCount: %s, lastWorn: %s", doc.id, outfit_data.get('wearCount', 'NOT_FOUND'), outfit_data.get('lastWorn', 'NOT_FOUND'))
+                logger.debug("🔍 DEBUG: Outfit %s all fields: %s", doc.id, list(outfit_data.keys()))
             except Exception as e:
-                logger.error(f"🔥 Failed to process outfit {doc.id}: {e}", exc_info=True)
+                logger.error("🔥 Failed to process outfit %s: %s", doc.id, e, exc_info=True)
                 # Skip this outfit instead of crashing the whole request
                 continue
         
         if outfits:
-            logger.info(f"🔍 DEBUG: First outfit in results: {outfits[0].get('name')} - {outfits[0].get('createdAt')}")
-            logger.info(f"🔍 DEBUG: Last outfit in results: {outfits[-1].get('name')} - {outfits[-1].get('createdAt')}")
+            logger.info("🔍 DEBUG: First outfit in results: %s - %s", outfits[0].get('name'), outfits[0].get('createdAt'))
+            logger.info("🔍 DEBUG: Last outfit in results: %s - %s", outfits[-1].get('name'), outfits[-1].get('createdAt'))
         
         # Optimization: Fetch user's wardrobe once for all outfits (only if reasonable size)
         if len(outfits) <= 100:  # Only cache for reasonable dataset sizes
-            logger.info(f"🔍 DEBUG: Fetching wardrobe cache for batch item resolution...")
+            logger.info("🔍 DEBUG: Fetching wardrobe cache for batch item resolution...")
             try:
                 wardrobe_docs = db.collection('wardrobe').where('userId', '==', user_id).stream()
                 wardrobe_cache = {}
@@ -490,12 +492,12 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
                     item_data = doc.to_dict()
                     item_data['id'] = doc.id
                     wardrobe_cache[doc.id] = item_data
-                logger.info(f"✅ DEBUG: Cached {len(wardrobe_cache)} wardrobe items")
+                logger.info("✅ DEBUG: Cached %s wardrobe items", len(wardrobe_cache))
             except Exception as e:
-                logger.warning(f"⚠️ Could not cache wardrobe: {e}, will fetch items individually")
+                logger.warning("⚠️ Could not cache wardrobe: %s, will fetch items individually", e)
                 wardrobe_cache = None
         else:
-            logger.info(f"⚠️ DEBUG: Skipping wardrobe cache for {len(outfits)} outfits (too many for performance)")
+            logger.info("⚠️ DEBUG: Skipping wardrobe cache for %s outfits (too many for performance)", len(outfits))
             wardrobe_cache = None
         
         # Always apply client-side sorting to ensure consistency across mixed timestamp types
@@ -505,7 +507,7 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
         start_idx = offset
         end_idx = offset + limit
         outfits = outfits[start_idx:end_idx]
-        logger.info(f"✅ DEBUG: Client-side sorted and paginated to {len(outfits)} outfits (offset={offset}, limit={limit})")
+        logger.info("✅ DEBUG: Client-side sorted and paginated to %s outfits (offset=%s, limit=%s)", len(outfits), offset, limit)
         
         # Final pass: resolve items using cache (reduced logging)
         for outfit_data in outfits:
@@ -513,22 +515,22 @@ async def get_user_outfits(user_id: str, limit: int = 50, offset: int = 0) -> Li
                 try:
                     outfit_data['items'] = await resolve_item_ids_to_objects(outfit_data['items'], user_id, wardrobe_cache)
                 except Exception as e:
-                    logger.error(f"🔥 Failed to resolve items for outfit {outfit_data.get('id')}: {e}")
+                    logger.error("🔥 Failed to resolve items for outfit %s: %s", outfit_data.get('id'), e)
                     outfit_data['items'] = []  # Set empty items instead of crashing
         
         if outfits:
-            logger.info(f"🔍 DEBUG: First outfit: {outfits[0].get('name')} - {outfits[0].get('createdAt')}")
-            logger.info(f"🔍 DEBUG: Last outfit: {outfits[-1].get('name')} - {outfits[-1].get('createdAt')}")
+            logger.info("🔍 DEBUG: First outfit: %s - %s", outfits[0].get('name'), outfits[0].get('createdAt'))
+            logger.info("🔍 DEBUG: Last outfit: %s - %s", outfits[-1].get('name'), outfits[-1].get('createdAt'))
         
-        logger.info(f"✅ DEBUG: Successfully retrieved {len(outfits)} outfits from Firestore for user {user_id}")
+        logger.info("✅ DEBUG: Successfully retrieved %s outfits from Firestore for user %s", len(outfits), user_id)
         return outfits
         
     except Exception as e:
-        logger.error(f"❌ ERROR: Failed to fetch outfits from Firestore: {e}", exc_info=True)
-        logger.error(f"❌ ERROR: Exception type: {type(e)}")
-        logger.error(f"❌ ERROR: Exception details: {str(e)}")
+        logger.error("❌ ERROR: Failed to fetch outfits from Firestore: %s", e, exc_info=True)
+        logger.error("❌ ERROR: Exception type: %s", type(e))
+        logger.error("❌ ERROR: Exception details: %s", str(e))
         import traceback
-        logger.error(f"❌ ERROR: Full traceback: {traceback.format_exc()}")
+        logger.error("❌ ERROR: Full traceback: %s", traceback.format_exc())
         # Return empty list instead of raising exception to prevent timeout
         return []
 
@@ -1200,8 +1200,9 @@ async def delete_outfit(
         if outfit_data.get('user_id') != current_user_id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this outfit")
         
-        # Delete the outfit
-        outfit_ref.delete()
+        # Delete the outfit and take it out of its month's style rollup
+        from src.services.style_rollup_service import style_rollup_service
+        style_rollup_service.delete_outfit(outfit_ref, outfit_data, current_user_id, outfit_data.get("id") or outfit_id)
         logger.info(f"✅ Deleted outfit {outfit_id} for user {current_user_id}")
         
         return {
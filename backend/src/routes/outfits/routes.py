@@ -11,7 +11,7 @@ from typing import List, Optional, Dict, Any
 from uuid import uuid4
 from collections import defaultdict
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel, ConfigDict
@@ -21,6 +21,7 @@ from ...auth.auth_service import get_current_user, get_current_user_id
 from ...custom_types.profile import UserProfile
 from ...custom_types.outfit import OutfitGeneratedOutfit
 from ...core.cache import cache_manager
+from ...core.tracing import tracer
 
 # Import from local modules
 from .database import (
@@ -34,7 +35,7 @@ from .helpers import (
 )
 from .validation import (
     validate_outfit_completeness, safe_get_metadata,
-    log_generation_strategy
+    log_generation_strategy, filter_valid_alternatives
 )
 from .scoring import calculate_outfit_score
 
@@ -152,6 +153,7 @@ class OutfitResponse(BaseModel):
     user_id: Optional[str] = None
     generated_at: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    alternatives: Optional[List[Dict[str, Any]]] = None  # Extra outfits when count > 1
 
 
 def safe_get(item, key, default=None):
@@ -532,11 +534,13 @@ async def mark_outfit_as_worn(
         logger.info(f"📊 COUNTER 1: Updating outfit wear count for {outfit_id}")
         logger.info(f"    Before: wearCount={current_wear_count}")
 
-        outfit_ref.update({
+        # The worn outfit joins its style rollup month in the same transaction if it is not counted yet
+        from ...services.style_rollup_service import style_rollup_service
+        style_rollup_service.mark_worn(outfit_ref, {
             'wearCount': current_wear_count + 1,
             'lastWorn': current_time,
             'updatedAt': current_time
-        })
+        }, outfit_data, current_user.id, outfit_id)
 
         logger.info(f"✅ COUNTER 1 UPDATED: Outfit {outfit_id} wearCount {current_wear_count} → {current_wear_count + 1}")
         logger.info(f"    lastWorn set to: {current_time.isoformat()}")
@@ -567,22 +571,48 @@ async def mark_outfit_as_worn(
             logger.warning(f"⚠️ Failed to award XP: {xp_error}")
             # Don't fail the request if XP award fails
         
-        # ✅ Increment TVE for each item in outfit
+        # COUNTER 2: item wear counts, with the CPW aggregates and wardrobe version in the same batch
+        worn_items = []
+        worn_item_ids = []
         try:
             from ...services.tve_service import tve_service
-            items = outfit_data.get('items', [])
-            for item in items:
+            from ...services.wardrobe_analytics_engine import wardrobe_analytics_engine
+            batch = db.batch()
+            for item in outfit_data.get('items', []):
                 item_id = item.get('id') if isinstance(item, dict) else str(item)
-                if item_id:
-                    # Get item data to find value_per_wear
-                    item_ref = db.collection('wardrobe').document(item_id)
-                    item_doc = item_ref.get()
-                    if item_doc.exists:
-                        item_data = item_doc.to_dict()
-                        value_per_wear = item_data.get('value_per_wear', 0.0)
-                        if value_per_wear > 0:
-                            await tve_service.increment_item_tve(item_id, value_per_wear)
-            logger.info(f"✅ Updated TVE for {len(items)} items")
+                if not item_id:
+                    continue
+                item_ref = db.collection('wardrobe').document(item_id)
+                item_doc = item_ref.get()
+                if not item_doc.exists:
+                    continue
+                item_data = item_doc.to_dict() or {}
+                if item_data.get('userId') != current_user.id:
+                    continue
+                item_wear_count = item_data.get('wearCount', 0) or 0
+                batch.update(item_ref, {
+                    'wearCount': item_wear_count + 1,
+                    'lastWorn': current_time,
+                    'updatedAt': current_time
+                })
+                worn_items.append((item_data, item_wear_count))
+                worn_item_ids.append(item_id)
+            if worn_items:
+                tve_service.on_items_worn(current_user.id, worn_items, batch=batch)
+                wardrobe_analytics_engine.touch_wardrobe(current_user.id, batch=batch)
+                batch.commit()
+            logger.info(f"✅ COUNTER 2 UPDATED: wear counts for {len(worn_items)} items")
+        except Exception as item_error:
+            worn_items, worn_item_ids = [], []
+            logger.warning(f"⚠️ Failed to update item wear counts: {item_error}")
+        
+        # ✅ Increment TVE for each item in outfit
+        try:
+            for item_id, (item_data, _) in zip(worn_item_ids, worn_items):
+                value_per_wear = item_data.get('value_per_wear', 0.0)
+                if value_per_wear > 0:
+                    await tve_service.increment_item_tve(item_id, value_per_wear)
+            logger.info(f"✅ Updated TVE for {len(worn_items)} items")
         except Exception as tve_error:
             logger.warning(f"⚠️ Failed to update TVE: {tve_error}")
             # Don't fail the request if TVE update fails
@@ -686,6 +716,9 @@ async def create_custom_outfit(
         db.collection('outfits').document(outfit_id).set(outfit_data)
         logger.info(f"✅ Custom outfit saved: {outfit_id}")
         
+        from ...services.style_rollup_service import style_rollup_service
+        style_rollup_service.record_outfit(current_user_id, outfit_id, outfit_data)
+        
         return {
             "success": True,
             "outfit_id": outfit_id,
@@ -796,13 +829,21 @@ async def rate_outfit(
 
 
 @router.post("/generate")
+@tracer.traced("outfit.generate")
 async def generate_outfit(
     req: OutfitRequest,
+    count: int = Query(1, ge=1, le=5, description="Number of distinct outfits to compose from one scoring pass"),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """
     Generate an outfit using robust decision logic with comprehensive validation,
     fallback strategies, body type optimization, and style profile integration.
+    
+    With count > 1 the response also carries ``alternatives``: further outfits
+    composed from the same filtering and scoring pass (only the primary outfit
+    is saved). Alternatives go through the same hard-requirement and validation
+    checks as the primary outfit and are dropped if they fail. Batches bypass
+    the outfit cache.
     """
     # 🔥 COMPREHENSIVE ERROR TRACING FOR NoneType .get() DEBUGGING
     # DEBUG: Log request details at endpoint start
@@ -821,6 +862,7 @@ async def generate_outfit(
             raise HTTPException(status_code=401, detail="Authentication required")
         
         logger.info(f"🎯 Starting robust outfit generation for user: {current_user_id}")
+        tracer.current_span().set_attributes(user_id=current_user_id, occasion=req.occasion, style=req.style, mood=req.mood)
         logger.info(f"📋 Request details: {req.occasion}, {req.style}, {req.mood}")
         
         # Define hard requirements per occasion
@@ -1103,7 +1145,7 @@ async def generate_outfit(
         # CACHE CHECK
         outfit = None
         cache_hit = False
-        if not (req.bypass_cache if req else False):
+        if count == 1 and not (req.bypass_cache if req else False):
             try:
                 current_wardrobe = req.wardrobe if req and req.wardrobe else []
                 if not current_wardrobe:
@@ -1156,7 +1198,8 @@ async def generate_outfit(
                     
                     # Run generation logic
                     generate_outfit_logic = get_generate_outfit_logic()
-                    outfit = await generate_outfit_logic(req, current_user_id)
+                    with tracer.span("generation_attempt", attempt=generation_attempts):
+                        outfit = await generate_outfit_logic(req, current_user_id, count=count)
                     
                     if outfit and outfit.get('items'):
                         occasion_lower = (req.occasion if req else "unknown").lower()
@@ -1237,7 +1280,10 @@ async def generate_outfit(
                                         temperature=getattr(req.weather, 'temperature', 70.0) if hasattr(req.weather, 'temperature') else 70.0
                                     )
                                     
-                                    validation_result = await validation_pipeline.validate_outfit(outfit, validation_context)
+                                    with tracer.span("validation", attempt=generation_attempts) as validation_span:
+                                        # Any failure triggers a retry, so stop at the first critical one
+                                        validation_result = await validation_pipeline.validate_outfit(outfit, validation_context, stop_on_critical=True)
+                                        validation_span.set_attribute("valid", validation_result.valid)
                                     
                                     if not validation_result.valid:
                                         failed_rules = validation_result.errors or []
@@ -1262,7 +1308,7 @@ async def generate_outfit(
                             logger.info(f"✅ Generation successful on attempt {generation_attempts}")
                         
                         # Store in cache
-                        if not cache_hit and not (req.bypass_cache if req else False):
+                        if count == 1 and not cache_hit and not (req.bypass_cache if req else False):
                             try:
                                 current_wardrobe = req.wardrobe if req and req.wardrobe else []
                                 if not current_wardrobe:
@@ -1313,6 +1359,34 @@ async def generate_outfit(
             else:
                 raise HTTPException(status_code=500, detail="Outfit generation failed: Unable to generate valid outfit")
         
+        # Alternatives are returned to the client but not saved with the primary outfit
+        alternatives = outfit.pop('alternatives', None)
+        if alternatives:
+            validate_alternative = None
+            if validation_available:
+                alternative_context = ValidationContext(
+                    occasion=req.occasion,
+                    style=req.style or "casual",
+                    mood=req.mood or "neutral",
+                    weather=req.weather.__dict__ if hasattr(req.weather, '__dict__') else (req.weather if req else None),
+                    user_profile={"id": current_user_id},
+                    temperature=getattr(req.weather, 'temperature', 70.0) if hasattr(req.weather, 'temperature') else 70.0
+                )
+                
+                async def validate_alternative(candidate):
+                    return await validation_pipeline.validate_outfit(candidate, alternative_context, stop_on_critical=True)
+            
+            with tracer.span("validate_alternatives", count=len(alternatives)):
+                occasion_key = (req.occasion if req else "unknown")
+                alternatives = await filter_valid_alternatives(
+                    alternatives,
+                    occasion_key,
+                    occasion_requirements.get(occasion_key.lower()),
+                    deduplicate_items_with_limits,
+                    retry_with_relaxed_rules,
+                    validate=validate_alternative,
+                )
+        
         # Wrap with metadata
         outfit_id = str(uuid4())
         outfit_record = {
@@ -1337,7 +1411,8 @@ async def generate_outfit(
         final_strategy = safe_get_metadata(clean_outfit_record, 'generation_strategy', 'unknown')
         logger.info(f"🔍 DEBUG FINAL SAVE: strategy = {final_strategy}")
         
-        save_result = await save_outfit(current_user_id, outfit_id, clean_outfit_record)
+        with tracer.span("save", outfit_id=outfit_id):
+            save_result = await save_outfit(current_user_id, outfit_id, clean_outfit_record)
         logger.info(f"💾 Save operation result: {save_result}")
         
         # Track usage
@@ -1447,7 +1522,7 @@ async def generate_outfit(
         
         # Return response
         logger.info(f"✅ Successfully generated outfit {outfit_id}")
-        return OutfitResponse(**outfit_record)
+        return OutfitResponse(**outfit_record, alternatives=alternatives)
     
     except HTTPException:
         # Track HTTP exceptions (likely auth or validation failures)
@@ -6,12 +6,218 @@ FULLY SYNCHRONIZED with frontend style list (35 styles total)
 import logging
 from typing import Dict, List, Any, Optional
 
+from ...utils.keyword_rules import KeywordRules, contains_keyword
+
 logger = logging.getLogger(__name__)
 
 # Global exclusion debug list for tracking exclusions
 exclusion_debug = []
 
 
+# Define style-appropriate keywords for different styles - MATCHES FRONTEND EXACTLY
+STYLE_FILTERS = {
+    # Academic & Intellectual (3 styles)
+    'dark academia': {
+        'include_keywords': ['dark', 'academia', 'academic', 'scholarly', 'vintage', 'tweed', 'plaid', 'corduroy', 'oxford', 'loafer', 'blazer', 'cardigan', 'turtleneck', 'cable knit', 'brown', 'burgundy', 'forest green', 'navy', 'beige', 'cream'],
+        'exclude_keywords': ['neon', 'bright', 'athletic', 'sport', 'gym'],
+        'preferred_types': ['blazer', 'cardigan', 'button-up', 'turtleneck', 'sweater', 'oxford shoes', 'loafers', 'trousers', 'pleated skirt', 'tweed jacket']
+    },
+    'light academia': {
+        'include_keywords': ['light', 'academia', 'academic', 'scholarly', 'cream', 'beige', 'white', 'linen', 'oxford', 'loafer', 'blazer', 'cardigan', 'button-up', 'light colors', 'neutral', 'soft'],
+        'exclude_keywords': ['neon', 'bright', 'athletic', 'sport', 'gym', 'dark colors'],
+        'preferred_types': ['blazer', 'cardigan', 'button-up', 'linen shirt', 'sweater', 'oxford shoes', 'loafers', 'trousers', 'pleated skirt', 'light jacket']
+    },
+    'old money': {
+        'include_keywords': ['old money', 'wealthy', 'luxury', 'classic', 'timeless', 'polo', 'cable knit', 'cashmere', 'tailored', 'golf', 'tennis', 'yacht', 'preppy', 'refined', 'elegant'],
+        'exclude_keywords': ['trendy', 'fast fashion', 'athletic wear', 'gym'],
+        'preferred_types': ['polo shirt', 'cable knit sweater', 'blazer', 'chinos', 'loafers', 'boat shoes', 'cashmere', 'tailored trousers']
+    },
+    
+    # Trendy & Modern (4 styles)
+    'y2k': {
+        'include_keywords': ['y2k', '2000s', 'nostalgic', 'butterfly', 'low-rise', 'crop', 'mini', 'platform', 'chunky', 'metallic', 'velour', 'juicy', 'baby tee', 'rhinestone', 'pink'],
+        'exclude_keywords': ['formal', 'business', 'traditional'],
+        'preferred_types': ['crop top', 'low-rise jeans', 'mini skirt', 'platform shoes', 'baby tee', 'cargo pants', 'velour tracksuit']
+    },
+    'coastal grandmother': {
+        'include_keywords': ['coastal', 'grandmother', 'linen', 'relaxed', 'effortless', 'neutral', 'beige', 'white', 'blue', 'oversized', 'breezy', 'casual', 'elegant', 'timeless'],
+        'exclude_keywords': ['tight', 'formal', 'athletic', 'gym'],
+        'preferred_types': ['linen shirt', 'wide-leg pants', 'oversized sweater', 'sandals', 'straw hat', 'loose dress']
+    },
+    'clean girl': {
+        'include_keywords': ['clean girl', 'minimal', 'simple', 'fresh', 'neutral', 'slicked back', 'natural', 'effortless', 'polished', 'understated', 'basic', 'classic'],
+        'exclude_keywords': ['busy', 'loud', 'flashy', 'maximalist'],
+        'preferred_types': ['white tee', 'neutral sweater', 'straight jeans', 'sneakers', 'simple jewelry', 'basic pieces']
+    },
+    'cottagecore': {
+        'include_keywords': ['cottagecore', 'cottage', 'pastoral', 'rustic', 'vintage', 'floral', 'lace', 'embroidered', 'prairie', 'gingham', 'pinafore', 'apron', 'smock', 'straw hat', 'wicker'],
+        'exclude_keywords': ['modern', 'sleek', 'athletic', 'corporate'],
+        'preferred_types': ['floral dress', 'pinafore', 'prairie dress', 'cardigan', 'blouse', 'midi skirt', 'apron', 'mary janes', 'clogs']
+    },
+    
+    # Artistic & Creative (4 styles)
+    'avant-garde': {
+        'include_keywords': ['avant-garde', 'experimental', 'unconventional', 'artistic', 'architectural', 'sculptural', 'asymmetric', 'deconstructed', 'conceptual', 'innovative'],
+        'exclude_keywords': ['basic', 'conventional', 'traditional', 'simple'],
+        'preferred_types': ['sculptural pieces', 'asymmetric', 'deconstructed', 'architectural']
+    },
+    'artsy': {
+        'include_keywords': ['artsy', 'artistic', 'creative', 'unique', 'asymmetric', 'statement', 'bold', 'colorful', 'patterned', 'mixed', 'layered', 'eclectic'],
+        'exclude_keywords': ['basic', 'plain', 'corporate'],
+        'preferred_types': ['statement piece', 'unique jacket', 'wide-leg pants', 'oversized', 'patterned', 'asymmetric']
+    },
+    'maximalist': {
+        'include_keywords': ['maximalist', 'bold', 'colorful', 'patterns', 'mixed prints', 'layered', 'accessories', 'statement', 'more is more', 'eclectic', 'vibrant'],
+        'exclude_keywords': ['minimal', 'simple', 'plain', 'understated'],
+        'preferred_types': ['bold prints', 'statement jewelry', 'layered pieces', 'colorful', 'patterned']
+    },
+    'colorblock': {
+        'include_keywords': ['colorblock', 'color blocking', 'bold colors', 'contrasting', 'geometric', 'blocks', 'primary colors', 'vibrant', 'modern'],
+        'exclude_keywords': ['muted', 'neutral', 'monochrome', 'black and white'],
+        'preferred_types': ['colorblock dress', 'contrasting pieces', 'bold colors', 'geometric patterns']
+    },
+    
+    # Professional & Classic (4 styles)
+    'business casual': {
+        'include_keywords': ['business casual', 'professional', 'work', 'office', 'smart', 'polished', 'blazer', 'trousers', 'button-up', 'loafers'],
+        'exclude_keywords': ['casual', 'athletic', 'sport', 'gym', 'too casual'],
+        'preferred_types': ['blazer', 'dress pants', 'button-up', 'blouse', 'loafers', 'dress shoes', 'pencil skirt']
+    },
+    'classic': {
+        'include_keywords': ['classic', 'timeless', 'traditional', 'elegant', 'sophisticated', 'refined', 'tailored', 'button', 'collared', 'oxford', 'loafer', 'chino', 'trouser'],
+        'exclude_keywords': ['extremely casual', 'gym', 'workout', 'athletic wear'],
+        'preferred_types': ['button-up', 'button-down', 'blazer', 'dress shirt', 'trousers', 'chinos', 'dress pants', 'oxford shoes', 'loafers', 'dress shoes']
+    },
+    'preppy': {
+        'include_keywords': ['preppy', 'collegiate', 'classic', 'nautical', 'stripe', 'polo', 'button', 'khaki', 'blazer', 'sweater'],
+        'exclude_keywords': ['grunge', 'edgy', 'distressed', 'athletic wear'],
+        'preferred_types': ['polo shirt', 'button-down', 'blazer', 'sweater', 'cardigan', 'chinos', 'boat shoes', 'oxford shoes']
+    },
+    'urban professional': {
+        'include_keywords': ['urban professional', 'modern professional', 'city', 'sleek', 'contemporary', 'polished', 'minimalist', 'tailored', 'sophisticated'],
+        'exclude_keywords': ['casual', 'sloppy', 'athletic', 'gym'],
+        'preferred_types': ['tailored blazer', 'modern dress', 'sleek pants', 'professional shoes', 'contemporary pieces']
+    },
+    
+    # Urban & Street (4 styles)
+    'streetwear': {
+        'include_keywords': ['streetwear', 'urban', 'casual', 'trendy', 'oversized', 'graphic', 'sneaker', 'hoodie', 'jogger', 'bomber'],
+        'exclude_keywords': ['formal', 'business', 'dressy', 'corporate'],
+        'preferred_types': ['hoodie', 't-shirt', 'jeans', 'joggers', 'sneakers', 'bomber jacket']
+    },
+    'techwear': {
+        'include_keywords': ['techwear', 'technical', 'functional', 'utility', 'tactical', 'waterproof', 'breathable', 'cargo', 'straps', 'black', 'futuristic'],
+        'exclude_keywords': ['formal', 'dressy', 'delicate', 'vintage'],
+        'preferred_types': ['technical jacket', 'cargo pants', 'utility vest', 'tactical boots', 'functional gear']
+    },
+    'grunge': {
+        'include_keywords': ['grunge', 'flannel', 'plaid shirt', 'ripped', 'distressed', 'band tee', 'combat boots', 'oversized', 'layered', 'dark', 'worn', 'vintage tee'],
+        'exclude_keywords': ['polished', 'refined', 'formal', 'preppy', 'corporate'],
+        'preferred_types': ['flannel shirt', 'ripped jeans', 'band t-shirt', 'combat boots', 'oversized sweater', 'beanie']
+    },
+    'hipster': {
+        'include_keywords': ['hipster', 'indie', 'vintage', 'retro', 'quirky', 'artisanal', 'beard', 'glasses', 'thrift', 'unique', 'alternative'],
+        'exclude_keywords': ['mainstream', 'corporate', 'formal'],
+        'preferred_types': ['vintage tee', 'flannel', 'skinny jeans', 'boots', 'beanie', 'vintage jacket']
+    },
+    
+    # Feminine & Romantic (4 styles)
+    'romantic': {
+        'include_keywords': ['romantic', 'feminine', 'flowy', 'delicate', 'soft', 'lace', 'ruffle', 'floral', 'dress', 'skirt', 'pastel'],
+        'exclude_keywords': ['harsh', 'masculine', 'athletic', 'gym', 'cargo'],
+        'preferred_types': ['dress', 'skirt', 'blouse', 'heels', 'flats', 'cardigan']
+    },
+    'boho': {
+        'include_keywords': ['boho', 'bohemian', 'flowy', 'free', 'ethnic', 'vintage', 'embroidered', 'fringe', 'maxi', 'loose', 'layered', 'natural'],
+        'exclude_keywords': ['structured', 'formal', 'business', 'corporate'],
+        'preferred_types': ['maxi dress', 'maxi skirt', 'loose top', 'sandals', 'boots', 'fringe']
+    },
+    'french girl': {
+        'include_keywords': ['french girl', 'parisian', 'effortless', 'chic', 'simple', 'classic', 'striped', 'beret', 'trench', 'ballet flats', 'timeless'],
+        'exclude_keywords': ['flashy', 'loud', 'overly trendy'],
+        'preferred_types': ['striped shirt', 'trench coat', 'ballet flats', 'beret', 'simple dress', 'blazer']
+    },
+    'pinup': {
+        'include_keywords': ['pinup', 'vintage', 'retro', '50s', 'polka dot', 'high waist', 'swing dress', 'rockabilly', 'pin curl', 'red lips', 'cat eye'],
+        'exclude_keywords': ['modern', 'minimalist', 'athletic'],
+        'preferred_types': ['swing dress', 'high-waisted', 'polka dot', 'vintage dress', 'retro shoes']
+    },
+    
+    # Modern & Minimal (3 styles)
+    'minimalist': {
+        'include_keywords': ['minimalist', 'simple', 'clean', 'modern', 'sleek', 'neutral', 'monochrome', 'basic', 'plain', 'solid'],
+        'exclude_keywords': ['busy', 'patterned', 'embellished', 'ornate', 'loud'],
+        'preferred_types': ['basic tee', 'plain shirt', 'simple pants', 'solid color']
+    },
+    'modern': {
+        'include_keywords': ['modern', 'contemporary', 'current', 'sleek', 'clean lines', 'minimalist', 'updated', 'fresh'],
+        'exclude_keywords': ['vintage', 'outdated', 'retro', 'old-fashioned'],
+        'preferred_types': ['contemporary pieces', 'modern cut', 'sleek design', 'updated classics']
+    },
+    'scandinavian': {
+        'include_keywords': ['scandinavian', 'nordic', 'minimal', 'neutral', 'cozy', 'hygge', 'simple', 'functional', 'natural', 'muted colors'],
+        'exclude_keywords': ['flashy', 'loud', 'maximalist', 'busy'],
+        'preferred_types': ['neutral sweater', 'simple dress', 'minimal jewelry', 'cozy pieces']
+    },
+    
+    # Alternative & Edgy (4 styles)
+    'gothic': {
+        'include_keywords': ['gothic', 'goth', 'dark', 'black', 'lace', 'velvet', 'corset', 'platform boots', 'choker', 'dark makeup'],
+        'exclude_keywords': ['bright', 'pastel', 'preppy', 'corporate'],
+        'preferred_types': ['black clothing', 'lace', 'velvet', 'platform boots', 'dark accessories', 'corset']
+    },
+    'punk': {
+        'include_keywords': ['punk', 'studded', 'leather', 'spikes', 'chains', 'safety pins', 'plaid', 'tartan', 'combat boots', 'band', 'graphic', 'torn', 'ripped'],
+        'exclude_keywords': ['preppy', 'formal', 'business', 'soft', 'delicate'],
+        'preferred_types': ['leather jacket', 'band tee', 'ripped jeans', 'combat boots', 'studded belt', 'plaid pants']
+    },
+    'cyberpunk': {
+        'include_keywords': ['cyberpunk', 'futuristic', 'neon', 'tech', 'metallic', 'holographic', 'led', 'cyber', 'dystopian', 'techwear'],
+        'exclude_keywords': ['vintage', 'classic', 'traditional', 'natural'],
+        'preferred_types': ['neon accents', 'metallic', 'tech accessories', 'futuristic pieces', 'holographic']
+    },
+    'edgy': {
+        'include_keywords': ['edgy', 'bold', 'leather', 'studded', 'distressed', 'ripped', 'dark', 'black', 'rock', 'denim', 'boot'],
+        'exclude_keywords': ['pastel', 'delicate', 'preppy', 'corporate'],
+        'preferred_types': ['leather jacket', 'denim', 'boots', 'dark pants', 'black clothing']
+    },
+    
+    # Seasonal & Lifestyle (5 styles)
+    'coastal chic': {
+        'include_keywords': ['coastal', 'beach', 'nautical', 'breezy', 'linen', 'white', 'blue', 'striped', 'relaxed', 'resort', 'summer'],
+        'exclude_keywords': ['heavy', 'formal', 'athletic', 'gym'],
+        'preferred_types': ['linen shirt', 'white dress', 'sandals', 'striped top', 'beach hat', 'lightweight']
+    },
+    'athleisure': {
+        'include_keywords': ['athletic', 'sport', 'gym', 'track', 'jogger', 'sweat', 'hoodie', 'sneaker', 'running', 'workout', 'yoga', 'legging', 'active', 'performance'],
+        'exclude_keywords': ['dress', 'formal', 'suit', 'blazer', 'business', 'oxford', 'heel', 'dress shirt', 'tie', 'formal pants'],
+        'preferred_types': ['t-shirt', 'tank', 'hoodie', 'sweatshirt', 'joggers', 'leggings', 'sweatpants', 'sneakers', 'athletic shoes', 'track jacket']
+    },
+    'casual cool': {
+        'include_keywords': ['casual', 'cool', 'relaxed', 'effortless', 'comfortable', 'everyday', 'laid-back', 'easy'],
+        'exclude_keywords': ['formal', 'business', 'dressy', 'stuffy'],
+        'preferred_types': ['jeans', 't-shirt', 'sneakers', 'casual jacket', 'comfortable pieces']
+    },
+    'loungewear': {
+        'include_keywords': ['lounge', 'comfortable', 'cozy', 'soft', 'relaxed', 'home', 'pajama', 'sweatpant', 'oversized', 'comfy'],
+        'exclude_keywords': ['formal', 'business', 'structured', 'tight'],
+        'preferred_types': ['sweatpants', 'oversized hoodie', 'soft tee', 'cozy cardigan', 'slippers', 'joggers']
+    },
+    'workout': {
+        'include_keywords': ['workout', 'gym', 'athletic', 'sport', 'fitness', 'training', 'exercise', 'performance', 'activewear', 'sports bra'],
+        'exclude_keywords': ['formal', 'dressy', 'casual', 'street'],
+        'preferred_types': ['sports bra', 'leggings', 'tank top', 'athletic shorts', 'training shoes', 'performance wear']
+    }
+}
+
+# One matcher for every style's include/exclude keywords
+STYLE_FILTER_RULES = KeywordRules({
+    (style, kind): criteria[f'{kind}_keywords']
+    for style, criteria in STYLE_FILTERS.items()
+    for kind in ('include', 'exclude')
+})
+
+
 def filter_items_by_style(items: List[Dict[str, Any]], style: str) -> List[Dict[str, Any]]:
     """Filter wardrobe items to only include those appropriate for the given style."""
     if not items or not style:
@@ -19,205 +225,9 @@ def filter_items_by_style(items: List[Dict[str, Any]], style: str) -> List[Dict[
     
     style_lower = style.lower()
     
-    # Define style-appropriate keywords for different styles - MATCHES FRONTEND EXACTLY
-    style_filters = {
-        # Academic & Intellectual (3 styles)
-        'dark academia': {
-            'include_keywords': ['dark', 'academia', 'academic', 'scholarly', 'vintage', 'tweed', 'plaid', 'corduroy', 'oxford', 'loafer', 'blazer', 'cardigan', 'turtleneck', 'cable knit', 'brown', 'burgundy', 'forest green', 'navy', 'beige', 'cream'],
-            'exclude_keywords': ['neon', 'bright', 'athletic', 'sport', 'gym'],
-            'preferred_types': ['blazer', 'cardigan', 'button-up', 'turtleneck', 'sweater', 'oxford shoes', 'loafers', 'trousers', 'pleated skirt', 'tweed jacket']
-        },
-        'light academia': {
-            'include_keywords': ['light', 'academia', 'academic', 'scholarly', 'cream', 'beige', 'white', 'linen', 'oxford', 'loafer', 'blazer', 'cardigan', 'button-up', 'light colors', 'neutral', 'soft'],
-            'exclude_keywords': ['neon', 'bright', 'athletic', 'sport', 'gym', 'dark colors'],
-            'preferred_types': ['blazer', 'cardigan', 'button-up', 'linen shirt', 'sweater', 'oxford shoes', 'loafers', 'trousers', 'pleated skirt', 'light jacket']
-        },
-        'old money': {
-            'include_keywords': ['old money', 'wealthy', 'luxury', 'classic', 'timeless', 'polo', 'cable knit', 'cashmere', 'tailored', 'golf', 'tennis', 'yacht', 'preppy', 'refined', 'elegant'],
-            'exclude_keywords': ['trendy', 'fast fashion', 'athletic wear', 'gym'],
-            'preferred_types': ['polo shirt', 'cable knit sweater', 'blazer', 'chinos', 'loafers', 'boat shoes', 'cashmere', 'tailored trousers']
-        },
-        
-        # Trendy & Modern (4 styles)
-        'y2k': {
-            'include_keywords': ['y2k', '2000s', 'nostalgic', 'butterfly', 'low-rise', 'crop', 'mini', 'platform', 'chunky', 'metallic', 'velour', 'juicy', 'baby tee', 'rhinestone', 'pink'],
-            'exclude_keywords': ['formal', 'business', 'traditional'],
-            'preferred_types': ['crop top', 'low-rise jeans', 'mini skirt', 'platform shoes', 'baby tee', 'cargo pants', 'velour tracksuit']
-        },
-        'coastal grandmother': {
-            'include_keywords': ['coastal', 'grandmother', 'linen', 'relaxed', 'effortless', 'neutral', 'beige', 'white', 'blue', 'oversized', 'breezy', 'casual', 'elegant', 'timeless'],
-            'exclude_keywords': ['tight', 'formal', 'athletic', 'gym'],
-            'preferred_types': ['linen shirt', 'wide-leg pants', 'oversized sweater', 'sandals', 'straw hat', 'loose dress']
-        },
-        'clean girl': {
-            'include_keywords': ['clean girl', 'minimal', 'simple', 'fresh', 'neutral', 'slicked back', 'natural', 'effortless', 'polished', 'understated', 'basic', 'classic'],
-            'exclude_keywords': ['busy', 'loud', 'flashy', 'maximalist'],
-            'preferred_types': ['white tee', 'neutral sweater', 'straight jeans', 'sneakers', 'simple jewelry', 'basic pieces']
-        },
-        'cottagecore': {
-            'include_keywords': ['cottagecore', 'cottage', 'pastoral', 'rustic', 'vintage', 'floral', 'lace', 'embroidered', 'prairie', 'gingham', 'pinafore', 'apron', 'smock', 'straw hat', 'wicker'],
-            'exclude_keywords': ['modern', 'sleek', 'athletic', 'corporate'],
-            'preferred_types': ['floral dress', 'pinafore', 'prairie dress', 'cardigan', 'blouse', 'midi skirt', 'apron', 'mary janes', 'clogs']
-        },
-        
-        # Artistic & Creative (4 styles)
-        'avant-garde': {
-            'include_keywords': ['avant-garde', 'experimental', 'unconventional', 'artistic', 'architectural', 'sculptural', 'asymmetric', 'deconstructed', 'conceptual', 'innovative'],
-            'exclude_keywords': ['basic', 'conventional', 'traditional', 'simple'],
-            'preferred_types': ['sculptural pieces', 'asymmetric', 'deconstructed', 'architectural']
-        },
-        'artsy': {
-            'include_keywords': ['artsy', 'artistic', 'creative', 'unique', 'asymmetric', 'statement', 'bold', 'colorful', 'patterned', 'mixed', 'layered', 'eclectic'],
-            'exclude_keywords': ['basic', 'plain', 'corporate'],
-            'preferred_types': ['statement piece', 'unique jacket', 'wide-leg pants', 'oversized', 'patterned', 'asymmetric']
-        },
-        'maximalist': {
-            'include_keywords': ['maximalist', 'bold', 'colorful', 'patterns', 'mixed prints', 'layered', 'accessories', 'statement', 'more is more', 'eclectic', 'vibrant'],
-            'exclude_keywords': ['minimal', 'simple', 'plain', 'understated'],
-            'preferred_types': ['bold prints', 'statement jewelry', 'layered pieces', 'colorful', 'patterned']
-        },
-        'colorblock': {
-            'include_keywords': ['colorblock', 'color blocking', 'bold colors', 'contrasting', 'geometric', 'blocks', 'primary colors', 'vibrant', 'modern'],
-            'exclude_keywords': ['muted', 'neutral', 'monochrome', 'black and white'],
-            'preferred_types': ['colorblock dress', 'contrasting pieces', 'bold colors', 'geometric patterns']
-        },
-        
-        # Professional & Classic (4 styles)
-        'business casual': {
-            'include_keywords': ['business casual', 'professional', 'work', 'office', 'smart', 'polished', 'blazer', 'trousers', 'button-up', 'loafers'],
-            'exclude_keywords': ['casual', 'athletic', 'sport', 'gym', 'too casual'],
-            'preferred_types': ['blazer', 'dress pants', 'button-up', 'blouse', 'loafers', 'dress shoes', 'pencil skirt']
-        },
-        'classic': {
-            'include_keywords': ['classic', 'timeless', 'traditional', 'elegant', 'sophisticated', 'refined', 'tailored', 'button', 'collared', 'oxford', 'loafer', 'chino', 'trouser'],
-            'exclude_keywords': ['extremely casual', 'gym', 'workout', 'athletic wear'],
-            'preferred_types': ['button-up', 'button-down', 'blazer', 'dress shirt', 'trousers', 'chinos', 'dress pants', 'oxford shoes', 'loafers', 'dress shoes']
-        },
-        'preppy': {
-            'include_keywords': ['preppy', 'collegiate', 'classic', 'nautical', 'stripe', 'polo', 'button', 'khaki', 'blazer', 'sweater'],
-            'exclude_keywords': ['grunge', 'edgy', 'distressed', 'athletic wear'],
-            'preferred_types': ['polo shirt', 'button-down', 'blazer', 'sweater', 'cardigan', 'chinos', 'boat shoes', 'oxford shoes']
-        },
-        'urban professional': {
-            'include_keywords': ['urban professional', 'modern professional', 'city', 'sleek', 'contemporary', 'polished', 'minimalist', 'tailored', 'sophisticated'],
-            'exclude_keywords': ['casual', 'sloppy', 'athletic', 'gym'],
-            'preferred_types': ['tailored blazer', 'modern dress', 'sleek pants', 'professional shoes', 'contemporary pieces']
-        },
-        
-        # Urban & Street (4 styles)
-        'streetwear': {
-            'include_keywords': ['streetwear', 'urban', 'casual', 'trendy', 'oversized', 'graphic', 'sneaker', 'hoodie', 'jogger', 'bomber'],
-            'exclude_keywords': ['formal', 'business', 'dressy', 'corporate'],
-            'preferred_types': ['hoodie', 't-shirt', 'jeans', 'joggers', 'sneakers', 'bomber jacket']
-        },
-        'techwear': {
-            'include_keywords': ['techwear', 'technical', 'functional', 'utility', 'tactical', 'waterproof', 'breathable', 'cargo', 'straps', 'black', 'futuristic'],
-            'exclude_keywords': ['formal', 'dressy', 'delicate', 'vintage'],
-            'preferred_types': ['technical jacket', 'cargo pants', 'utility vest', 'tactical boots', 'functional gear']
-        },
-        'grunge': {
-            'include_keywords': ['grunge', 'flannel', 'plaid shirt', 'ripped', 'distressed', 'band tee', 'combat boots', 'oversized', 'layered', 'dark', 'worn', 'vintage tee'],
-            'exclude_keywords': ['polished', 'refined', 'formal', 'preppy', 'corporate'],
-            'preferred_types': ['flannel shirt', 'ripped jeans', 'band t-shirt', 'combat boots', 'oversized sweater', 'beanie']
-        },
-        'hipster': {
-            'include_keywords': ['hipster', 'indie', 'vintage', 'retro', 'quirky', 'artisanal', 'beard', 'glasses', 'thrift', 'unique', 'alternative'],
-            'exclude_keywords': ['mainstream', 'corporate', 'formal'],
-            'preferred_types': ['vintage tee', 'flannel', 'skinny jeans', 'boots', 'beanie', 'vintage jacket']
-        },
-        
-        # Feminine & Romantic (4 styles)
-        'romantic': {
-            'include_keywords': ['romantic', 'feminine', 'flowy', 'delicate', 'soft', 'lace', 'ruffle', 'floral', 'dress', 'skirt', 'pastel'],
-            'exclude_keywords': ['harsh', 'masculine', 'athletic', 'gym', 'cargo'],
-            'preferred_types': ['dress', 'skirt', 'blouse', 'heels', 'flats', 'cardigan']
-        },
-        'boho': {
-            'include_keywords': ['boho', 'bohemian', 'flowy', 'free', 'ethnic', 'vintage', 'embroidered', 'fringe', 'maxi', 'loose', 'layered', 'natural'],
-            'exclude_keywords': ['structured', 'formal', 'business', 'corporate'],
-            'preferred_types': ['maxi dress', 'maxi skirt', 'loose top', 'sandals', 'boots', 'fringe']
-        },
-        'french girl': {
-            'include_keywords': ['french girl', 'parisian', 'effortless', 'chic', 'simple', 'classic', 'striped', 'beret', 'trench', 'ballet flats', 'timeless'],
-            'exclude_keywords': ['flashy', 'loud', 'overly trendy'],
-            'preferred_types': ['striped shirt', 'trench coat', 'ballet flats', 'beret', 'simple dress', 'blazer']
-        },
-        'pinup': {
-            'include_keywords': ['pinup', 'vintage', 'retro', '50s', 'polka dot', 'high waist', 'swing dress', 'rockabilly', 'pin curl', 'red lips', 'cat eye'],
-            'exclude_keywords': ['modern', 'minimalist', 'athletic'],
-            'preferred_types': ['swing dress', 'high-waisted', 'polka dot', 'vintage dress', 'retro shoes']
-        },
-        
-        # Modern & Minimal (3 styles)
-        'minimalist': {
-            'include_keywords': ['minimalist', 'simple', 'clean', 'modern', 'sleek', 'neutral', 'monochrome', 'basic', 'plain', 'solid'],
-            'exclude_keywords': ['busy', 'patterned', 'embellished', 'ornate', 'loud'],
-            'preferred_types': ['basic tee', 'plain shirt', 'simple pants', 'solid color']
-        },
-        'modern': {
-            'include_keywords': ['modern', 'contemporary', 'current', 'sleek', 'clean lines', 'minimalist', 'updated', 'fresh'],
-            'exclude_keywords': ['vintage', 'outdated', 'retro', 'old-fashioned'],
-            'preferred_types': ['contemporary pieces', 'modern cut', 'sleek design', 'updated classics']
-        },
-        'scandinavian': {
-            'include_keywords': ['scandinavian', 'nordic', 'minimal', 'neutral', 'cozy', 'hygge', 'simple', 'functional', 'natural', 'muted colors'],
-            'exclude_keywords': ['flashy', 'loud', 'maximalist', 'busy'],
-            'preferred_types': ['neutral sweater', 'simple dress', 'minimal jewelry', 'cozy pieces']
-        },
-        
-        # Alternative & Edgy (4 styles)
-        'gothic': {
-            'include_keywords': ['gothic', 'goth', 'dark', 'black', 'lace', 'velvet', 'corset', 'platform boots', 'choker', 'dark makeup'],
-            'exclude_keywords': ['bright', 'pastel', 'preppy', 'corporate'],
-            'preferred_types': ['black clothing', 'lace', 'velvet', 'platform boots', 'dark accessories', 'corset']
-        },
-        'punk': {
-            'include_keywords': ['punk', 'studded', 'leather', 'spikes', 'chains', 'safety pins', 'plaid', 'tartan', 'combat boots', 'band', 'graphic', 'torn', 'ripped'],
-            'exclude_keywords': ['preppy', 'formal', 'business', 'soft', 'delicate'],
-            'preferred_types': ['leather jacket', 'band tee', 'ripped jeans', 'combat boots', 'studded belt', 'plaid pants']
-        },
-        'cyberpunk': {
-            'include_keywords': ['cyberpunk', 'futuristic', 'neon', 'tech', 'metallic', 'holographic', 'led', 'cyber', 'dystopian', 'techwear'],
-            'exclude_keywords': ['vintage', 'classic', 'traditional', 'natural'],
-            'preferred_types': ['neon accents', 'metallic', 'tech accessories', 'futuristic pieces', 'holographic']
-        },
-        'edgy': {
-            'include_keywords': ['edgy', 'bold', 'leather', 'studded', 'distressed', 'ripped', 'dark', 'black', 'rock', 'denim', 'boot'],
-            'exclude_keywords': ['pastel', 'delicate', 'preppy', 'corporate'],
-            'preferred_types': ['leather jacket', 'denim', 'boots', 'dark pants', 'black clothing']
-        },
-        
-        # Seasonal & Lifestyle (5 styles)
-        'coastal chic': {
-            'include_keywords': ['coastal', 'beach', 'nautical', 'breezy', 'linen', 'white', 'blue', 'striped', 'relaxed', 'resort', 'summer'],
-            'exclude_keywords': ['heavy', 'formal', 'athletic', 'gym'],
-            'preferred_types': ['linen shirt', 'white dress', 'sandals', 'striped top', 'beach hat', 'lightweight']
-        },
-        'athleisure': {
-            'include_keywords': ['athletic', 'sport', 'gym', 'track', 'jogger', 'sweat', 'hoodie', 'sneaker', 'running', 'workout', 'yoga', 'legging', 'active', 'performance'],
-            'exclude_keywords': ['dress', 'formal', 'suit', 'blazer', 'business', 'oxford', 'heel', 'dress shirt', 'tie', 'formal pants'],
-            'preferred_types': ['t-shirt', 'tank', 'hoodie', 'sweatshirt', 'joggers', 'leggings', 'sweatpants', 'sneakers', 'athletic shoes', 'track jacket']
-        },
-        'casual cool': {
-            'include_keywords': ['casual', 'cool', 'relaxed', 'effortless', 'comfortable', 'everyday', 'laid-back', 'easy'],
-            'exclude_keywords': ['formal', 'business', 'dressy', 'stuffy'],
-            'preferred_types': ['jeans', 't-shirt', 'sneakers', 'casual jacket', 'comfortable pieces']
-        },
-        'loungewear': {
-            'include_keywords': ['lounge', 'comfortable', 'cozy', 'soft', 'relaxed', 'home', 'pajama', 'sweatpant', 'oversized', 'comfy'],
-            'exclude_keywords': ['formal', 'business', 'structured', 'tight'],
-            'preferred_types': ['sweatpants', 'oversized hoodie', 'soft tee', 'cozy cardigan', 'slippers', 'joggers']
-        },
-        'workout': {
-            'include_keywords': ['workout', 'gym', 'athletic', 'sport', 'fitness', 'training', 'exercise', 'performance', 'activewear', 'sports bra'],
-            'exclude_keywords': ['formal', 'dressy', 'casual', 'street'],
-            'preferred_types': ['sports bra', 'leggings', 'tank top', 'athletic shorts', 'training shoes', 'performance wear']
-        }
-    }
-    
     # Get filter criteria for this style
     # If style not found, use permissive default that accepts most items
-    if style_lower not in style_filters:
+    if style_lower not in STYLE_FILTERS:
         logger.info(f"⚠️ Unknown style '{style}' in filter, using permissive default")
         # For unknown styles, be FULLY permissive - don't exclude anything
         # Let the scoring system handle appropriateness instead
@@ -227,7 +237,7 @@ def filter_items_by_style(items: List[Dict[str, Any]], style: str) -> List[Dict[
             'preferred_types': []  # No type restrictions
         }
     else:
-        filter_criteria = style_filters[style_lower]
+        filter_criteria = STYLE_FILTERS[style_lower]
     
     filtered_items = []
     for item in items:
@@ -248,8 +258,9 @@ def filter_items_by_style(items: List[Dict[str, Any]], style: str) -> List[Dict[
         # Combine all text fields for keyword matching
         all_text = f"{item_name} {item_type} {item_description}"
         
-        # Check if item should be excluded
-        should_exclude = any(exclude_word in all_text for exclude_word in filter_criteria['exclude_keywords'])
+        # Check if item should be excluded (one scan covers every style's rules)
+        matched_rules = STYLE_FILTER_RULES.match(all_text)
+        should_exclude = (style_lower, 'exclude') in matched_rules
         if should_exclude:
             item_name_for_log = item_name if isinstance(item, dict) else getattr(item, 'name', 'unnamed')
             logger.info(f"🚫 Excluding {item_name_for_log} from {style} style (contains excluded keywords)")
@@ -258,7 +269,7 @@ def filter_items_by_style(items: List[Dict[str, Any]], style: str) -> List[Dict[
         # Check if item should be included (preferred types or include keywords)
         has_include_match = (
             item_type in filter_criteria['preferred_types'] or
-            any(include_word in all_text for include_word in filter_criteria['include_keywords'])
+            (style_lower, 'include') in matched_rules
         )
         
         # Be permissive: include items unless they have explicit exclusions or fail to match for restrictive styles
@@ -396,8 +407,8 @@ def calculate_colorblock_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Bold/primary colors that work well in colorblock
-        bold_colors = ['red', 'blue', 'yellow', 'green', 'orange', 'purple', 'pink', 'cyan', 'magenta']
-        bold_count = sum(1 for name in color_names if any(bold in name for bold in bold_colors))
+        bold_colors = ('red', 'blue', 'yellow', 'green', 'orange', 'purple', 'pink', 'cyan', 'magenta')
+        bold_count = sum(1 for name in color_names if contains_keyword(name, bold_colors))
         
         if bold_count >= 2:
             score += 25  # Multiple bold colors
@@ -408,8 +419,8 @@ def calculate_colorblock_metadata_score(item: Dict[str, Any]) -> int:
     
     # 3. CHECK FOR MUTED/NEUTRAL (inappropriate for colorblock)
     item_color = item.get('color', '').lower()
-    muted_keywords = ['beige', 'neutral', 'muted', 'gray', 'grey', 'taupe', 'khaki', 'ecru']
-    if any(word in item_color for word in muted_keywords):
+    muted_keywords = ('beige', 'neutral', 'muted', 'gray', 'grey', 'taupe', 'khaki', 'ecru')
+    if contains_keyword(item_color, muted_keywords):
         score -= 15
         logger.debug(f"   ❌ COLORBLOCK: {item.get('name')} has muted/neutral color (-15)")
     
@@ -422,7 +433,7 @@ def calculate_colorblock_metadata_score(item: Dict[str, Any]) -> int:
         elif isinstance(single_color, str):
             color_name = single_color.lower()
         
-        if any(word in color_name for word in ['black', 'white', 'grey', 'gray']):
+        if contains_keyword(color_name, ('black', 'white', 'grey', 'gray')):
             score -= 10
             logger.debug(f"   ❌ COLORBLOCK: {item.get('name')} is monochrome {color_name} (-10)")
     
@@ -469,16 +480,16 @@ def calculate_minimalist_metadata_score(item: Dict[str, Any]) -> int:
             elif isinstance(c, str):
                 color_names.append(c.lower())
         
-        neutral_colors = ['white', 'black', 'gray', 'grey', 'beige', 'cream', 'ivory', 'navy', 'taupe']
-        neutral_count = sum(1 for name in color_names if any(neutral in name for neutral in neutral_colors))
+        neutral_colors = ('white', 'black', 'gray', 'grey', 'beige', 'cream', 'ivory', 'navy', 'taupe')
+        neutral_count = sum(1 for name in color_names if contains_keyword(name, neutral_colors))
         
         if neutral_count == len(color_names):
             score += 20  # All neutral - perfect for minimalist
             logger.debug(f"   ✅ MINIMALIST: {item.get('name')} has all neutral colors (+20)")
         
         # Penalty for loud colors
-        loud_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric']
-        if any(loud in ' '.join(color_names) for loud in loud_colors):
+        loud_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric')
+        if contains_keyword(' '.join(color_names), loud_colors):
             score -= 20
             logger.debug(f"   ❌ MINIMALIST: {item.get('name')} has loud colors (-20)")
     
@@ -525,16 +536,16 @@ def calculate_maximalist_metadata_score(item: Dict[str, Any]) -> int:
             elif isinstance(c, str):
                 color_names.append(c.lower())
         
-        bold_colors = ['red', 'blue', 'yellow', 'green', 'orange', 'purple', 'pink', 'magenta', 'cyan', 'bright']
-        bold_count = sum(1 for name in color_names if any(bold in name for bold in bold_colors))
+        bold_colors = ('red', 'blue', 'yellow', 'green', 'orange', 'purple', 'pink', 'magenta', 'cyan', 'bright')
+        bold_count = sum(1 for name in color_names if contains_keyword(name, bold_colors))
         
         if bold_count >= 2:
             score += 20  # Bold colors - perfect for maximalist
             logger.debug(f"   ✅ MAXIMALIST: {item.get('name')} has {bold_count} bold colors (+20)")
         
         # Check for all neutral (boring for maximalist)
-        neutral_colors = ['white', 'black', 'gray', 'grey', 'beige', 'cream', 'taupe']
-        if all(any(neutral in name for neutral in neutral_colors) for name in color_names):
+        neutral_colors = ('white', 'black', 'gray', 'grey', 'beige', 'cream', 'taupe')
+        if all(contains_keyword(name, neutral_colors) for name in color_names):
             score -= 25  # All neutral - too boring
             logger.debug(f"   ❌ MAXIMALIST: {item.get('name')} is all neutral (-25)")
     
@@ -567,22 +578,22 @@ def calculate_gothic_metadata_score(item: Dict[str, Any]) -> int:
             logger.debug(f"   ✅ GOTHIC: {item.get('name')} has black (+30)")
         
         # Check for dark colors (burgundy, dark purple, dark red)
-        dark_colors = ['burgundy', 'wine', 'dark red', 'maroon', 'purple', 'dark purple', 'navy']
-        dark_count = sum(1 for name in color_names if any(dark in name for dark in dark_colors))
+        dark_colors = ('burgundy', 'wine', 'dark red', 'maroon', 'purple', 'dark purple', 'navy')
+        dark_count = sum(1 for name in color_names if contains_keyword(name, dark_colors))
         if dark_count > 0:
             score += 15  # Dark colors complement gothic
             logger.debug(f"   ✅ GOTHIC: {item.get('name')} has dark colors (+15)")
         
         # Penalty for bright/pastel colors
-        bright_colors = ['pastel', 'pink', 'baby blue', 'mint', 'peach', 'yellow', 'bright', 'neon', 'lime']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('pastel', 'pink', 'baby blue', 'mint', 'peach', 'yellow', 'bright', 'neon', 'lime')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 30  # Very inappropriate
             logger.debug(f"   ❌ GOTHIC: {item.get('name')} has bright/pastel colors (-30)")
     
     # 2. CHECK MATERIAL (lace, velvet, leather)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['lace', 'velvet', 'leather', 'silk']):
+        if contains_keyword(material, ('lace', 'velvet', 'leather', 'silk')):
             score += 20  # Gothic materials
             logger.debug(f"   ✅ GOTHIC: {item.get('name')} has gothic material {material} (+20)")
     
@@ -632,21 +643,21 @@ def calculate_monochrome_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Check if all colors are black/white/gray
-        bw_colors = ['black', 'white', 'gray', 'grey', 'charcoal', 'ivory', 'cream']
-        if all(any(bw in name for bw in bw_colors) for name in color_names):
+        bw_colors = ('black', 'white', 'gray', 'grey', 'charcoal', 'ivory', 'cream')
+        if all(contains_keyword(name, bw_colors) for name in color_names):
             score += 25  # Classic monochrome palette
             logger.debug(f"   ✅ MONOCHROME: {item.get('name')} is black/white/gray monochrome (+25)")
         
         # Check if all colors are from same family (all blues, all reds, etc.)
         color_families = [
-            ['blue', 'navy', 'azure', 'cobalt', 'indigo'],
-            ['red', 'burgundy', 'wine', 'maroon', 'crimson'],
-            ['green', 'olive', 'forest', 'emerald', 'sage'],
-            ['brown', 'tan', 'beige', 'camel', 'chocolate']
+            ('blue', 'navy', 'azure', 'cobalt', 'indigo'),
+            ('red', 'burgundy', 'wine', 'maroon', 'crimson'),
+            ('green', 'olive', 'forest', 'emerald', 'sage'),
+            ('brown', 'tan', 'beige', 'camel', 'chocolate')
         ]
         
         for family in color_families:
-            if all(any(f in name for f in family) for name in color_names):
+            if all(contains_keyword(name, family) for name in color_names):
                 score += 20  # Single color family
                 logger.debug(f"   ✅ MONOCHROME: {item.get('name')} is single color family (+20)")
                 break
@@ -682,16 +693,16 @@ def calculate_dark_academia_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Dark academia colors
-        dark_academia_colors = ['brown', 'burgundy', 'wine', 'maroon', 'forest green', 'navy', 'beige', 'tan', 'olive', 'dark green']
-        dark_count = sum(1 for name in color_names if any(dark in name for dark in dark_academia_colors))
+        dark_academia_colors = ('brown', 'burgundy', 'wine', 'maroon', 'forest green', 'navy', 'beige', 'tan', 'olive', 'dark green')
+        dark_count = sum(1 for name in color_names if contains_keyword(name, dark_academia_colors))
         
         if dark_count >= 1:
             score += 25  # Has dark academia colors
             logger.debug(f"   ✅ DARK ACADEMIA: {item.get('name')} has {dark_count} dark academia colors (+25)")
         
         # Penalty for neon/bright colors
-        bright_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric', 'yellow']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric', 'yellow')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 30
             logger.debug(f"   ❌ DARK ACADEMIA: {item.get('name')} has bright colors (-30)")
     
@@ -708,7 +719,7 @@ def calculate_dark_academia_metadata_score(item: Dict[str, Any]) -> int:
     # 3. CHECK MATERIAL (wool, tweed, corduroy)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['tweed', 'wool', 'corduroy', 'cable knit']):
+        if contains_keyword(material, ('tweed', 'wool', 'corduroy', 'cable knit')):
             score += 20  # Academic materials
             logger.debug(f"   ✅ DARK ACADEMIA: {item.get('name')} has academic material {material} (+20)")
     
@@ -733,23 +744,23 @@ def calculate_light_academia_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Light academia colors
-        light_colors = ['cream', 'beige', 'white', 'ivory', 'light blue', 'pastel', 'pale', 'soft', 'blush', 'champagne']
-        light_count = sum(1 for name in color_names if any(light in name for light in light_colors))
+        light_colors = ('cream', 'beige', 'white', 'ivory', 'light blue', 'pastel', 'pale', 'soft', 'blush', 'champagne')
+        light_count = sum(1 for name in color_names if contains_keyword(name, light_colors))
         
         if light_count >= 1:
             score += 25  # Has light academia colors
             logger.debug(f"   ✅ LIGHT ACADEMIA: {item.get('name')} has {light_count} light academia colors (+25)")
         
         # Penalty for dark colors
-        dark_colors = ['black', 'dark', 'charcoal', 'navy']
-        dark_count = sum(1 for name in color_names if any(dark in name for dark in dark_colors))
+        dark_colors = ('black', 'dark', 'charcoal', 'navy')
+        dark_count = sum(1 for name in color_names if contains_keyword(name, dark_colors))
         if dark_count >= 2:
             score -= 25
             logger.debug(f"   ❌ LIGHT ACADEMIA: {item.get('name')} has too many dark colors (-25)")
         
         # Penalty for neon/bright colors
-        bright_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 20
             logger.debug(f"   ❌ LIGHT ACADEMIA: {item.get('name')} has neon colors (-20)")
     
@@ -759,7 +770,7 @@ def calculate_light_academia_metadata_score(item: Dict[str, Any]) -> int:
         if 'linen' in material:
             score += 25  # Linen is quintessential light academia
             logger.debug(f"   ✅ LIGHT ACADEMIA: {item.get('name')} has linen material (+25)")
-        elif any(m in material for m in ['cotton', 'silk', 'chiffon']):
+        elif contains_keyword(material, ('cotton', 'silk', 'chiffon')):
             score += 10  # Light, airy materials
             logger.debug(f"   ✅ LIGHT ACADEMIA: {item.get('name')} has light material {material} (+10)")
     
@@ -801,8 +812,8 @@ def calculate_preppy_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Preppy colors
-        preppy_colors = ['navy', 'white', 'khaki', 'pink', 'light blue', 'green', 'yellow', 'red']
-        preppy_count = sum(1 for name in color_names if any(prep in name for prep in preppy_colors))
+        preppy_colors = ('navy', 'white', 'khaki', 'pink', 'light blue', 'green', 'yellow', 'red')
+        preppy_count = sum(1 for name in color_names if contains_keyword(name, preppy_colors))
         
         if preppy_count >= 2:
             score += 20  # Multiple preppy colors
@@ -812,7 +823,7 @@ def calculate_preppy_metadata_score(item: Dict[str, Any]) -> int:
             logger.debug(f"   ✅ PREPPY: {item.get('name')} has 1 preppy color (+10)")
         
         # Penalty for grunge/edgy colors
-        if any(word in ' '.join(color_names) for word in ['black', 'dark', 'charcoal']):
+        if contains_keyword(' '.join(color_names), ('black', 'dark', 'charcoal')):
             score -= 15
             logger.debug(f"   ⚠️ PREPPY: {item.get('name')} has dark colors (-15)")
     
@@ -853,8 +864,8 @@ def calculate_cottagecore_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Cottagecore colors
-        cottage_colors = ['pastel', 'pink', 'lavender', 'sage', 'mint', 'peach', 'cream', 'white', 'light blue', 'yellow', 'green']
-        cottage_count = sum(1 for name in color_names if any(cottage in name for cottage in cottage_colors))
+        cottage_colors = ('pastel', 'pink', 'lavender', 'sage', 'mint', 'peach', 'cream', 'white', 'light blue', 'yellow', 'green')
+        cottage_count = sum(1 for name in color_names if contains_keyword(name, cottage_colors))
         
         if cottage_count >= 1:
             score += 20  # Has cottagecore colors
@@ -863,7 +874,7 @@ def calculate_cottagecore_metadata_score(item: Dict[str, Any]) -> int:
     # 3. CHECK MATERIAL (natural fibers)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['cotton', 'linen', 'lace']):
+        if contains_keyword(material, ('cotton', 'linen', 'lace')):
             score += 15  # Natural, cottage materials
             logger.debug(f"   ✅ COTTAGECORE: {item.get('name')} has natural material {material} (+15)")
     
@@ -893,7 +904,7 @@ def calculate_romantic_metadata_score(item: Dict[str, Any]) -> int:
     # 2. CHECK MATERIAL (soft, delicate materials)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['lace', 'silk', 'chiffon', 'satin', 'velvet']):
+        if contains_keyword(material, ('lace', 'silk', 'chiffon', 'satin', 'velvet')):
             score += 25  # Romantic materials
             logger.debug(f"   ✅ ROMANTIC: {item.get('name')} has romantic material {material} (+25)")
     
@@ -908,8 +919,8 @@ def calculate_romantic_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Romantic colors
-        romantic_colors = ['pink', 'blush', 'pastel', 'lavender', 'cream', 'ivory', 'peach', 'rose', 'soft']
-        romantic_count = sum(1 for name in color_names if any(rom in name for rom in romantic_colors))
+        romantic_colors = ('pink', 'blush', 'pastel', 'lavender', 'cream', 'ivory', 'peach', 'rose', 'soft')
+        romantic_count = sum(1 for name in color_names if contains_keyword(name, romantic_colors))
         
         if romantic_count >= 1:
             score += 20  # Has romantic colors
@@ -935,7 +946,7 @@ def calculate_grunge_metadata_score(item: Dict[str, Any]) -> int:
     # 2. CHECK TEXTURE (distressed, worn, ripped)
     texture = item.get('metadata', {}).get('visualAttributes', {}).get('textureStyle', '').lower()
     if texture:
-        if any(t in texture for t in ['distressed', 'ripped', 'worn', 'faded', 'vintage']):
+        if contains_keyword(texture, ('distressed', 'ripped', 'worn', 'faded', 'vintage')):
             score += 25  # Distressed texture is grunge
             logger.debug(f"   ✅ GRUNGE: {item.get('name')} has distressed texture (+25)")
     
@@ -957,15 +968,15 @@ def calculate_grunge_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Grunge colors (dark, muted)
-        grunge_colors = ['black', 'dark', 'gray', 'charcoal', 'brown', 'olive', 'burgundy']
-        grunge_count = sum(1 for name in color_names if any(grunge in name for grunge in grunge_colors))
+        grunge_colors = ('black', 'dark', 'gray', 'charcoal', 'brown', 'olive', 'burgundy')
+        grunge_count = sum(1 for name in color_names if contains_keyword(name, grunge_colors))
         
         if grunge_count >= 1:
             score += 15  # Has grunge colors
             logger.debug(f"   ✅ GRUNGE: {item.get('name')} has grunge colors (+15)")
         
         # Penalty for bright/preppy colors
-        if any(word in ' '.join(color_names) for word in ['bright', 'neon', 'pastel', 'pink']):
+        if contains_keyword(' '.join(color_names), ('bright', 'neon', 'pastel', 'pink')):
             score -= 20
             logger.debug(f"   ❌ GRUNGE: {item.get('name')} has non-grunge colors (-20)")
     
@@ -1010,8 +1021,8 @@ def calculate_boho_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Boho colors (earth tones)
-        boho_colors = ['brown', 'tan', 'beige', 'olive', 'rust', 'terracotta', 'sage', 'mustard', 'burgundy', 'cream']
-        boho_count = sum(1 for name in color_names if any(boho in name for boho in boho_colors))
+        boho_colors = ('brown', 'tan', 'beige', 'olive', 'rust', 'terracotta', 'sage', 'mustard', 'burgundy', 'cream')
+        boho_count = sum(1 for name in color_names if contains_keyword(name, boho_colors))
         
         if boho_count >= 1:
             score += 20  # Has boho colors
@@ -1020,7 +1031,7 @@ def calculate_boho_metadata_score(item: Dict[str, Any]) -> int:
     # 4. CHECK MATERIAL (natural fibers)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['cotton', 'linen', 'hemp', 'natural']):
+        if contains_keyword(material, ('cotton', 'linen', 'hemp', 'natural')):
             score += 15  # Natural materials are boho
             logger.debug(f"   ✅ BOHO: {item.get('name')} has natural material {material} (+15)")
     
@@ -1061,16 +1072,16 @@ def calculate_business_casual_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Business casual colors
-        professional_colors = ['navy', 'gray', 'grey', 'black', 'white', 'blue', 'khaki', 'beige', 'burgundy']
-        professional_count = sum(1 for name in color_names if any(prof in name for prof in professional_colors))
+        professional_colors = ('navy', 'gray', 'grey', 'black', 'white', 'blue', 'khaki', 'beige', 'burgundy')
+        professional_count = sum(1 for name in color_names if contains_keyword(name, professional_colors))
         
         if professional_count >= 1:
             score += 15  # Has professional colors
             logger.debug(f"   ✅ BUSINESS CASUAL: {item.get('name')} has professional colors (+15)")
         
         # Penalty for too casual/loud colors
-        casual_colors = ['neon', 'bright', 'hot pink', 'lime', 'fluorescent']
-        if any(casual in ' '.join(color_names) for casual in casual_colors):
+        casual_colors = ('neon', 'bright', 'hot pink', 'lime', 'fluorescent')
+        if contains_keyword(' '.join(color_names), casual_colors):
             score -= 25
             logger.debug(f"   ❌ BUSINESS CASUAL: {item.get('name')} has loud colors (-25)")
     
@@ -1102,26 +1113,26 @@ def calculate_scandinavian_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Scandinavian colors (neutral, muted)
-        scandi_colors = ['white', 'cream', 'beige', 'gray', 'grey', 'black', 'navy', 'muted', 'soft', 'pale']
-        scandi_count = sum(1 for name in color_names if any(scandi in name for scandi in scandi_colors))
+        scandi_colors = ('white', 'cream', 'beige', 'gray', 'grey', 'black', 'navy', 'muted', 'soft', 'pale')
+        scandi_count = sum(1 for name in color_names if contains_keyword(name, scandi_colors))
         
         if scandi_count >= 1:
             score += 25  # Has Scandinavian colors
             logger.debug(f"   ✅ SCANDINAVIAN: {item.get('name')} has Nordic colors (+25)")
         
         # Penalty for loud/bright colors
-        bright_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric', 'vibrant']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime', 'electric', 'vibrant')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 30
             logger.debug(f"   ❌ SCANDINAVIAN: {item.get('name')} has bright colors (-30)")
     
     # 2. CHECK MATERIAL (wool, knit are quintessential Scandinavian)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['wool', 'knit', 'cable knit', 'merino', 'cashmere']):
+        if contains_keyword(material, ('wool', 'knit', 'cable knit', 'merino', 'cashmere')):
             score += 30  # Scandinavian materials
             logger.debug(f"   ✅ SCANDINAVIAN: {item.get('name')} has Nordic material {material} (+30)")
-        elif any(m in material for m in ['cotton', 'linen']):
+        elif contains_keyword(material, ('cotton', 'linen')):
             score += 10  # Natural materials acceptable
             logger.debug(f"   ✅ SCANDINAVIAN: {item.get('name')} has natural material (+10)")
     
@@ -1149,12 +1160,12 @@ def calculate_old_money_metadata_score(item: Dict[str, Any]) -> int:
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
         # Premium materials
-        if any(m in material for m in ['cashmere', 'silk', 'merino', 'wool', 'linen', 'leather']):
+        if contains_keyword(material, ('cashmere', 'silk', 'merino', 'wool', 'linen', 'leather')):
             score += 35  # Luxury materials
             logger.debug(f"   ✅ OLD MONEY: {item.get('name')} has quality material {material} (+35)")
         
         # Avoid cheap materials
-        if any(m in material for m in ['polyester', 'acrylic', 'synthetic']):
+        if contains_keyword(material, ('polyester', 'acrylic', 'synthetic')):
             score -= 20  # Cheap materials
             logger.debug(f"   ❌ OLD MONEY: {item.get('name')} has cheap material (-20)")
     
@@ -1169,16 +1180,16 @@ def calculate_old_money_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Old money colors (classic, timeless)
-        classic_colors = ['navy', 'camel', 'cream', 'white', 'gray', 'grey', 'burgundy', 'forest green', 'khaki', 'tan']
-        classic_count = sum(1 for name in color_names if any(classic in name for classic in classic_colors))
+        classic_colors = ('navy', 'camel', 'cream', 'white', 'gray', 'grey', 'burgundy', 'forest green', 'khaki', 'tan')
+        classic_count = sum(1 for name in color_names if contains_keyword(name, classic_colors))
         
         if classic_count >= 1:
             score += 25  # Has classic colors
             logger.debug(f"   ✅ OLD MONEY: {item.get('name')} has classic colors (+25)")
         
         # Penalty for trendy/loud colors
-        trendy_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime']
-        if any(trendy in ' '.join(color_names) for trendy in trendy_colors):
+        trendy_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime')
+        if contains_keyword(' '.join(color_names), trendy_colors):
             score -= 30  # Too flashy
             logger.debug(f"   ❌ OLD MONEY: {item.get('name')} has flashy colors (-30)")
     
@@ -1230,16 +1241,16 @@ def calculate_clean_girl_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Clean girl colors
-        clean_colors = ['white', 'cream', 'beige', 'nude', 'soft', 'pastel', 'light', 'neutral']
-        clean_count = sum(1 for name in color_names if any(clean in name for clean in clean_colors))
+        clean_colors = ('white', 'cream', 'beige', 'nude', 'soft', 'pastel', 'light', 'neutral')
+        clean_count = sum(1 for name in color_names if contains_keyword(name, clean_colors))
         
         if clean_count >= 1:
             score += 25  # Has clean girl colors
             logger.debug(f"   ✅ CLEAN GIRL: {item.get('name')} has clean colors (+25)")
         
         # Penalty for bold/dark colors
-        bold_colors = ['neon', 'bright', 'dark', 'bold', 'gothic']
-        if any(bold in ' '.join(color_names) for bold in bold_colors):
+        bold_colors = ('neon', 'bright', 'dark', 'bold', 'gothic')
+        if contains_keyword(' '.join(color_names), bold_colors):
             score -= 20
             logger.debug(f"   ❌ CLEAN GIRL: {item.get('name')} has bold colors (-20)")
     
@@ -1276,10 +1287,10 @@ def calculate_punk_metadata_score(item: Dict[str, Any]) -> int:
     # 2. CHECK TEXTURE (studded, distressed, ripped)
     texture = item.get('metadata', {}).get('visualAttributes', {}).get('textureStyle', '').lower()
     if texture:
-        if any(t in texture for t in ['studded', 'spiked', 'chains']):
+        if contains_keyword(texture, ('studded', 'spiked', 'chains')):
             score += 35  # Studded is very punk
             logger.debug(f"   ✅ PUNK: {item.get('name')} has punk texture {texture} (+35)")
-        elif any(t in texture for t in ['distressed', 'ripped', 'torn', 'worn']):
+        elif contains_keyword(texture, ('distressed', 'ripped', 'torn', 'worn')):
             score += 25  # Distressed is punk
             logger.debug(f"   ✅ PUNK: {item.get('name')} has distressed texture (+25)")
     
@@ -1298,8 +1309,8 @@ def calculate_punk_metadata_score(item: Dict[str, Any]) -> int:
             logger.debug(f"   ✅ PUNK: {item.get('name')} has black color (+20)")
         
         # Penalty for soft/pastel colors
-        soft_colors = ['pastel', 'soft', 'blush', 'baby', 'light pink']
-        if any(soft in ' '.join(color_names) for soft in soft_colors):
+        soft_colors = ('pastel', 'soft', 'blush', 'baby', 'light pink')
+        if contains_keyword(' '.join(color_names), soft_colors):
             score -= 25
             logger.debug(f"   ❌ PUNK: {item.get('name')} has soft colors (-25)")
     
@@ -1326,7 +1337,7 @@ def calculate_edgy_metadata_score(item: Dict[str, Any]) -> int:
     # 2. CHECK TEXTURE (distressed, worn)
     texture = item.get('metadata', {}).get('visualAttributes', {}).get('textureStyle', '').lower()
     if texture:
-        if any(t in texture for t in ['distressed', 'ripped', 'torn', 'worn']):
+        if contains_keyword(texture, ('distressed', 'ripped', 'torn', 'worn')):
             score += 25  # Distressed is edgy
             logger.debug(f"   ✅ EDGY: {item.get('name')} has distressed texture (+25)")
     
@@ -1341,16 +1352,16 @@ def calculate_edgy_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Edgy colors
-        edgy_colors = ['black', 'dark', 'charcoal', 'burgundy', 'deep red']
-        edgy_count = sum(1 for name in color_names if any(edgy in name for edgy in edgy_colors))
+        edgy_colors = ('black', 'dark', 'charcoal', 'burgundy', 'deep red')
+        edgy_count = sum(1 for name in color_names if contains_keyword(name, edgy_colors))
         
         if edgy_count >= 1:
             score += 20  # Has edgy colors
             logger.debug(f"   ✅ EDGY: {item.get('name')} has dark/edgy colors (+20)")
         
         # Penalty for soft/pastel colors
-        soft_colors = ['pastel', 'soft', 'blush', 'baby', 'light pink', 'peach']
-        if any(soft in ' '.join(color_names) for soft in soft_colors):
+        soft_colors = ('pastel', 'soft', 'blush', 'baby', 'light pink', 'peach')
+        if contains_keyword(' '.join(color_names), soft_colors):
             score -= 25
             logger.debug(f"   ❌ EDGY: {item.get('name')} has soft colors (-25)")
     
@@ -1385,16 +1396,16 @@ def calculate_french_girl_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # French girl colors
-        french_colors = ['navy', 'white', 'black', 'red', 'beige', 'cream']
-        french_count = sum(1 for name in color_names if any(french in name for french in french_colors))
+        french_colors = ('navy', 'white', 'black', 'red', 'beige', 'cream')
+        french_count = sum(1 for name in color_names if contains_keyword(name, french_colors))
         
         if french_count >= 1:
             score += 20  # Has French colors
             logger.debug(f"   ✅ FRENCH GIRL: {item.get('name')} has French palette colors (+20)")
         
         # Penalty for loud colors
-        loud_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime']
-        if any(loud in ' '.join(color_names) for loud in loud_colors):
+        loud_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime')
+        if contains_keyword(' '.join(color_names), loud_colors):
             score -= 20
             logger.debug(f"   ❌ FRENCH GIRL: {item.get('name')} has loud colors (-20)")
     
@@ -1446,8 +1457,8 @@ def calculate_urban_professional_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Urban professional colors
-        professional_colors = ['black', 'navy', 'gray', 'grey', 'white', 'charcoal']
-        professional_count = sum(1 for name in color_names if any(prof in name for prof in professional_colors))
+        professional_colors = ('black', 'navy', 'gray', 'grey', 'white', 'charcoal')
+        professional_count = sum(1 for name in color_names if contains_keyword(name, professional_colors))
         
         if professional_count >= 1:
             score += 20  # Has professional colors
@@ -1466,10 +1477,10 @@ def calculate_techwear_metadata_score(item: Dict[str, Any]) -> int:
     # 1. CHECK MATERIAL (technical fabrics)
     material = item.get('metadata', {}).get('visualAttributes', {}).get('material', '').lower()
     if material:
-        if any(m in material for m in ['technical', 'synthetic', 'waterproof', 'nylon', 'polyester', 'gore-tex']):
+        if contains_keyword(material, ('technical', 'synthetic', 'waterproof', 'nylon', 'polyester', 'gore-tex')):
             score += 35  # Technical materials are essential
             logger.debug(f"   ✅ TECHWEAR: {item.get('name')} has technical material {material} (+35)")
-        elif any(m in material for m in ['cotton', 'linen', 'silk']):
+        elif contains_keyword(material, ('cotton', 'linen', 'silk')):
             score -= 20  # Too natural for techwear
             logger.debug(f"   ❌ TECHWEAR: {item.get('name')} has natural material (-20)")
     
@@ -1489,13 +1500,13 @@ def calculate_techwear_metadata_score(item: Dict[str, Any]) -> int:
             logger.debug(f"   ✅ TECHWEAR: {item.get('name')} has black color (+30)")
         
         # Gray/charcoal also work
-        if any(word in ' '.join(color_names) for word in ['gray', 'grey', 'charcoal']):
+        if contains_keyword(' '.join(color_names), ('gray', 'grey', 'charcoal')):
             score += 15  # Dark neutrals
             logger.debug(f"   ✅ TECHWEAR: {item.get('name')} has dark neutral (+15)")
         
         # Penalty for bright colors (except neon accents)
-        bright_colors = ['pastel', 'soft', 'light', 'baby blue', 'pink']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('pastel', 'soft', 'light', 'baby blue', 'pink')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 25
             logger.debug(f"   ❌ TECHWEAR: {item.get('name')} has soft colors (-25)")
     
@@ -1515,7 +1526,7 @@ def calculate_coastal_grandmother_metadata_score(item: Dict[str, Any]) -> int:
         if 'linen' in material:
             score += 35  # Linen is quintessential coastal grandmother
             logger.debug(f"   ✅ COASTAL GRANDMOTHER: {item.get('name')} has linen material (+35)")
-        elif any(m in material for m in ['cotton', 'silk']):
+        elif contains_keyword(material, ('cotton', 'silk')):
             score += 10  # Light natural materials
             logger.debug(f"   ✅ COASTAL GRANDMOTHER: {item.get('name')} has natural material (+10)")
     
@@ -1530,16 +1541,16 @@ def calculate_coastal_grandmother_metadata_score(item: Dict[str, Any]) -> int:
                 color_names.append(c.lower())
         
         # Coastal grandmother colors
-        coastal_colors = ['beige', 'white', 'cream', 'blue', 'navy', 'sand', 'neutral', 'ivory']
-        coastal_count = sum(1 for name in color_names if any(coastal in name for coastal in coastal_colors))
+        coastal_colors = ('beige', 'white', 'cream', 'blue', 'navy', 'sand', 'neutral', 'ivory')
+        coastal_count = sum(1 for name in color_names if contains_keyword(name, coastal_colors))
         
         if coastal_count >= 1:
             score += 25  # Has coastal colors
             logger.debug(f"   ✅ COASTAL GRANDMOTHER: {item.get('name')} has coastal colors (+25)")
         
         # Penalty for bright/neon colors
-        bright_colors = ['neon', 'bright', 'fluorescent', 'hot pink', 'lime']
-        if any(bright in ' '.join(color_names) for bright in bright_colors):
+        bright_colors = ('neon', 'bright', 'fluorescent', 'hot pink', 'lime')
+        if contains_keyword(' '.join(color_names), bright_colors):
             score -= 20
             logger.debug(f"   ❌ COASTAL GRANDMOTHER: {item.get('name')} has bright colors (-20)")
     
@@ -1556,6 +1567,258 @@ def calculate_coastal_grandmother_metadata_score(item: Dict[str, Any]) -> int:
     return score
 
 
+# Define style-specific scoring - MATCHES FRONTEND EXACTLY (35 styles)
+STYLE_SCORING = {
+    # Academic & Intellectual (3 styles)
+    'dark academia': {
+        'highly_appropriate': ['dark', 'academia', 'academic', 'scholarly', 'vintage', 'tweed', 'plaid', 'corduroy', 'blazer', 'cardigan', 'turtleneck', 'oxford', 'loafer'],
+        'appropriate': ['button-up', 'sweater', 'trousers', 'brown', 'burgundy', 'forest green', 'navy', 'beige', 'pleated', 'cable knit', 'wool'],
+        'inappropriate': ['neon', 'bright colors', 'overly casual', 'graphic tee'],
+        'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants', 'tank top']
+    },
+    'light academia': {
+        'highly_appropriate': ['light', 'academia', 'academic', 'scholarly', 'cream', 'beige', 'white', 'linen', 'blazer', 'cardigan', 'oxford', 'loafer'],
+        'appropriate': ['button-up', 'sweater', 'trousers', 'light colors', 'neutral', 'soft', 'pleated', 'airy'],
+        'inappropriate': ['dark colors', 'neon', 'bright', 'overly casual'],
+        'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants']
+    },
+    'old money': {
+        'highly_appropriate': ['old money', 'wealthy', 'luxury', 'classic', 'timeless', 'polo', 'cable knit', 'cashmere', 'tailored', 'refined', 'elegant'],
+        'appropriate': ['golf', 'tennis', 'yacht', 'preppy', 'blazer', 'loafers', 'chinos', 'quality'],
+        'inappropriate': ['trendy', 'fast fashion', 'loud', 'flashy'],
+        'highly_inappropriate': ['athletic wear', 'gym', 'workout', 'cheap', 'disposable']
+    },
+    
+    # Trendy & Modern (4 styles)
+    'y2k': {
+        'highly_appropriate': ['y2k', '2000s', 'nostalgic', 'butterfly', 'low-rise', 'crop', 'mini', 'platform', 'chunky', 'metallic', 'velour', 'rhinestone'],
+        'appropriate': ['baby tee', 'cargo', 'denim', 'pink', 'juicy', 'tracksuit', 'sparkle'],
+        'inappropriate': ['formal', 'business', 'traditional', 'conservative'],
+        'highly_inappropriate': ['suit', 'blazer', 'professional', 'corporate']
+    },
+    'coastal grandmother': {
+        'highly_appropriate': ['coastal', 'grandmother', 'linen', 'relaxed', 'effortless', 'neutral', 'beige', 'white', 'blue', 'oversized', 'breezy'],
+        'appropriate': ['casual', 'elegant', 'timeless', 'comfortable', 'natural'],
+        'inappropriate': ['tight', 'formal', 'structured'],
+        'highly_inappropriate': ['athletic', 'gym', 'workout', 'flashy']
+    },
+    'clean girl': {
+        'highly_appropriate': ['clean girl', 'minimal', 'simple', 'fresh', 'neutral', 'natural', 'effortless', 'polished', 'understated', 'basic'],
+        'appropriate': ['white', 'beige', 'classic', 'sleek', 'modern'],
+        'inappropriate': ['busy', 'loud', 'flashy', 'maximalist', 'bold'],
+        'highly_inappropriate': ['gothic', 'punk', 'grunge', 'distressed']
+    },
+    'cottagecore': {
+        'highly_appropriate': ['cottagecore', 'cottage', 'pastoral', 'rustic', 'vintage', 'floral', 'lace', 'embroidered', 'prairie', 'gingham', 'pinafore'],
+        'appropriate': ['dress', 'skirt', 'cardigan', 'blouse', 'apron', 'smock', 'straw', 'wicker', 'mary janes', 'clogs'],
+        'inappropriate': ['modern', 'sleek', 'minimalist'],
+        'highly_inappropriate': ['athletic', 'corporate', 'business', 'suit', 'tech']
+    },
+    
+    # Artistic & Creative (4 styles)
+    'avant-garde': {
+        'highly_appropriate': ['avant-garde', 'experimental', 'unconventional', 'artistic', 'architectural', 'sculptural', 'asymmetric', 'deconstructed', 'conceptual'],
+        'appropriate': ['innovative', 'unique', 'bold', 'creative', 'statement'],
+        'inappropriate': ['basic', 'conventional', 'traditional'],
+        'highly_inappropriate': ['boring', 'plain', 'conservative', 'mainstream']
+    },
+    'artsy': {
+        'highly_appropriate': ['artsy', 'artistic', 'creative', 'unique', 'asymmetric', 'avant-garde', 'statement', 'bold', 'eclectic'],
+        'appropriate': ['colorful', 'patterned', 'mixed', 'layered', 'oversized', 'wide-leg', 'unusual'],
+        'inappropriate': ['basic', 'plain', 'simple', 'conservative'],
+        'highly_inappropriate': ['corporate', 'business casual', 'traditional suit']
+    },
+    'maximalist': {
+        'highly_appropriate': ['maximalist', 'bold', 'colorful', 'patterns', 'mixed prints', 'layered', 'statement', 'more is more', 'eclectic', 'vibrant'],
+        'appropriate': ['accessories', 'jewelry', 'embellished', 'decorative'],
+        'inappropriate': ['minimal', 'simple', 'plain'],
+        'highly_inappropriate': ['understated', 'boring', 'monochrome', 'basic']
+    },
+    'colorblock': {
+        'highly_appropriate': ['colorblock', 'color blocking', 'bold colors', 'contrasting', 'geometric', 'blocks', 'primary colors', 'vibrant'],
+        'appropriate': ['modern', 'graphic', 'striking'],
+        'inappropriate': ['muted', 'neutral', 'monochrome'],
+        'highly_inappropriate': ['black and white only', 'beige', 'boring']
+    },
+    
+    # Professional & Classic (4 styles)
+    'business casual': {
+        'highly_appropriate': ['business casual', 'professional', 'work', 'office', 'smart', 'polished', 'blazer', 'trousers', 'button-up'],
+        'appropriate': ['loafers', 'dress shoes', 'blouse', 'collared', 'structured'],
+        'inappropriate': ['casual', 'athletic', 'distressed'],
+        'highly_inappropriate': ['gym', 'workout', 'hoodie', 'sweatshirt', 'joggers', 'sneakers', 't-shirt']
+    },
+    'classic': {
+        'highly_appropriate': ['classic', 'timeless', 'traditional', 'elegant', 'sophisticated', 'refined', 'tailored', 'well-fitted'],
+        'appropriate': ['button-up', 'button-down', 'collared', 'blazer', 'trousers', 'chinos', 'oxford', 'loafers', 'simple', 'clean', 'structured', 'neutral'],
+        'inappropriate': ['distressed', 'ripped', 'overly casual', 'worn', 'graphic tee'],
+        'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants', 'hoodie', 'overly trendy']
+    },
+    'preppy': {
+        'highly_appropriate': ['preppy', 'collegiate', 'classic', 'nautical', 'striped', 'polo', 'button-down', 'khaki'],
+        'appropriate': ['blazer', 'sweater', 'cardigan', 'chinos', 'boat shoes', 'oxford', 'clean', 'crisp'],
+        'inappropriate': ['grunge', 'edgy', 'distressed'],
+        'highly_inappropriate': ['athletic', 'sport', 'gym', 'goth', 'punk', 'overly casual']
+    },
+    'urban professional': {
+        'highly_appropriate': ['urban professional', 'modern professional', 'city', 'sleek', 'contemporary', 'polished', 'minimalist', 'tailored', 'sophisticated'],
+        'appropriate': ['structured', 'quality', 'well-fitted', 'modern'],
+        'inappropriate': ['casual', 'sloppy', 'outdated'],
+        'highly_inappropriate': ['athletic', 'gym', 'workout', 'loungewear']
+    },
+    
+    # Urban & Street (4 styles)
+    'streetwear': {
+        'highly_appropriate': ['streetwear', 'urban', 'casual', 'trendy', 'oversized', 'graphic', 'sneakers', 'hoodie'],
+        'appropriate': ['t-shirt', 'jeans', 'joggers', 'bomber', 'track', 'athletic', 'logo'],
+        'inappropriate': ['formal', 'business', 'dressy', 'traditional'],
+        'highly_inappropriate': ['suit', 'blazer', 'dress pants', 'dress shoes', 'heels', 'corporate']
+    },
+    'techwear': {
+        'highly_appropriate': ['techwear', 'technical', 'functional', 'utility', 'tactical', 'waterproof', 'breathable', 'cargo', 'futuristic'],
+        'appropriate': ['black', 'straps', 'zippers', 'performance', 'modern'],
+        'inappropriate': ['formal', 'dressy', 'delicate'],
+        'highly_inappropriate': ['vintage', 'retro', 'romantic', 'flowy']
+    },
+    'grunge': {
+        'highly_appropriate': ['grunge', 'flannel', 'plaid shirt', 'ripped', 'distressed', 'band tee', 'combat boots', 'oversized', 'layered', 'worn'],
+        'appropriate': ['dark', 'vintage tee', 'denim', 'casual', 'beanie', 'converse'],
+        'inappropriate': ['polished', 'refined', 'preppy', 'neat'],
+        'highly_inappropriate': ['formal', 'corporate', 'business', 'elegant', 'sophisticated']
+    },
+    'hipster': {
+        'highly_appropriate': ['hipster', 'indie', 'vintage', 'retro', 'quirky', 'artisanal', 'unique', 'alternative', 'thrift'],
+        'appropriate': ['flannel', 'skinny jeans', 'boots', 'beanie', 'glasses', 'beard'],
+        'inappropriate': ['mainstream', 'corporate', 'basic'],
+        'highly_inappropriate': ['formal', 'business', 'conventional']
+    },
+    
+    # Feminine & Romantic (4 styles)
+    'romantic': {
+        'highly_appropriate': ['romantic', 'feminine', 'flowy', 'delicate', 'soft', 'lace', 'ruffles', 'floral'],
+        'appropriate': ['dress', 'skirt', 'blouse', 'pastel', 'chiffon', 'silk', 'satin', 'elegant'],
+        'inappropriate': ['harsh', 'structured', 'masculine'],
+        'highly_inappropriate': ['athletic', 'sport', 'gym', 'cargo', 'combat', 'utilitarian']
+    },
+    'boho': {
+        'highly_appropriate': ['boho', 'bohemian', 'flowy', 'free', 'ethnic', 'vintage', 'embroidered', 'fringe', 'maxi', 'loose', 'layered'],
+        'appropriate': ['natural', 'earthy', 'sandals', 'boots', 'casual'],
+        'inappropriate': ['structured', 'formal', 'business'],
+        'highly_inappropriate': ['athletic', 'sport', 'corporate', 'suit', 'blazer']
+    },
+    'french girl': {
+        'highly_appropriate': ['french girl', 'parisian', 'effortless', 'chic', 'simple', 'classic', 'striped', 'beret', 'trench', 'ballet flats'],
+        'appropriate': ['timeless', 'elegant', 'minimal', 'quality'],
+        'inappropriate': ['flashy', 'loud', 'overly trendy', 'maximalist'],
+        'highly_inappropriate': ['athletic', 'gym', 'workout', 'tacky']
+    },
+    'pinup': {
+        'highly_appropriate': ['pinup', 'vintage', 'retro', '50s', 'polka dot', 'high waist', 'swing dress', 'rockabilly'],
+        'appropriate': ['red lips', 'cat eye', 'pin curl', 'vintage style', 'feminine'],
+        'inappropriate': ['modern', 'minimalist', 'athletic'],
+        'highly_inappropriate': ['grunge', 'punk', 'goth', 'techwear']
+    },
+    
+    # Modern & Minimal (3 styles)
+    'minimalist': {
+        'highly_appropriate': ['minimalist', 'simple', 'clean', 'modern', 'sleek', 'neutral', 'monochrome', 'streamlined'],
+        'appropriate': ['solid', 'plain', 'basic', 'understated', 'refined', 'tailored'],
+        'inappropriate': ['busy', 'patterned', 'embellished', 'ornate'],
+        'highly_inappropriate': ['loud', 'graphic', 'overly decorative', 'bohemian', 'maximalist']
+    },
+    'modern': {
+        'highly_appropriate': ['modern', 'contemporary', 'current', 'sleek', 'clean lines', 'minimalist', 'updated', 'fresh'],
+        'appropriate': ['stylish', 'trendy', 'fashionable', 'sophisticated'],
+        'inappropriate': ['vintage', 'outdated', 'retro'],
+        'highly_inappropriate': ['old-fashioned', 'dated', 'archaic']
+    },
+    'scandinavian': {
+        'highly_appropriate': ['scandinavian', 'nordic', 'minimal', 'neutral', 'cozy', 'hygge', 'simple', 'functional', 'natural'],
+        'appropriate': ['muted colors', 'wool', 'knitwear', 'clean'],
+        'inappropriate': ['flashy', 'loud', 'maximalist', 'busy'],
+        'highly_inappropriate': ['neon', 'bright colors', 'excessive decoration']
+    },
+    
+    # Alternative & Edgy (4 styles)
+    'gothic': {
+        'highly_appropriate': ['gothic', 'goth', 'dark', 'black', 'lace', 'velvet', 'corset', 'platform boots', 'choker'],
+        'appropriate': ['dark makeup', 'silver', 'dramatic', 'Victorian'],
+        'inappropriate': ['bright', 'pastel', 'preppy'],
+        'highly_inappropriate': ['corporate', 'business', 'clean girl', 'coastal']
+    },
+    'punk': {
+        'highly_appropriate': ['punk', 'studded', 'leather', 'spikes', 'chains', 'safety pins', 'plaid', 'tartan', 'combat boots', 'band', 'ripped'],
+        'appropriate': ['graphic', 'torn', 'black', 'dark', 'diy', 'patches'],
+        'inappropriate': ['preppy', 'soft', 'pastel', 'delicate'],
+        'highly_inappropriate': ['formal', 'business', 'corporate', 'conservative', 'traditional']
+    },
+    'cyberpunk': {
+        'highly_appropriate': ['cyberpunk', 'futuristic', 'neon', 'tech', 'metallic', 'holographic', 'led', 'cyber', 'dystopian'],
+        'appropriate': ['techwear', 'black', 'electric', 'urban'],
+        'inappropriate': ['vintage', 'classic', 'traditional'],
+        'highly_inappropriate': ['natural', 'organic', 'cottagecore', 'boho']
+    },
+    'edgy': {
+        'highly_appropriate': ['edgy', 'bold', 'leather', 'studded', 'distressed', 'ripped', 'dark', 'black', 'rock'],
+        'appropriate': ['denim', 'boots', 'chain', 'zipper', 'asymmetric', 'moto'],
+        'inappropriate': ['pastel', 'soft', 'delicate', 'preppy'],
+        'highly_inappropriate': ['romantic', 'frilly', 'lace', 'overly feminine', 'corporate']
+    },
+    
+    # Seasonal & Lifestyle (5 styles)
+    'coastal chic': {
+        'highly_appropriate': ['coastal', 'beach', 'nautical', 'breezy', 'linen', 'white', 'blue', 'striped', 'relaxed', 'resort'],
+        'appropriate': ['summer', 'sandals', 'lightweight', 'fresh'],
+        'inappropriate': ['heavy', 'formal', 'structured'],
+        'highly_inappropriate': ['athletic', 'gym', 'workout', 'gothic']
+    },
+    'athleisure': {
+        'highly_appropriate': ['athletic', 'sport', 'performance', 'moisture-wicking', 'breathable', 'activewear', 'gym', 'workout', 'running', 'yoga'],
+        'appropriate': ['comfortable', 'stretchy', 'casual', 'relaxed', 'cotton', 'polyester'],
+        'inappropriate': ['formal', 'business', 'dressy', 'structured'],
+        'highly_inappropriate': ['suit', 'blazer', 'dress pants', 'dress shirt', 'tie', 'oxford', 'formal pants', 'dress shoes', 'heels']
+    },
+    'casual cool': {
+        'highly_appropriate': ['casual', 'cool', 'relaxed', 'effortless', 'comfortable', 'everyday', 'laid-back', 'easy'],
+        'appropriate': ['jeans', 't-shirt', 'sneakers', 'simple', 'accessible'],
+        'inappropriate': ['formal', 'business', 'dressy'],
+        'highly_inappropriate': ['suit', 'tie', 'dress pants', 'very formal']
+    },
+    'loungewear': {
+        'highly_appropriate': ['lounge', 'comfortable', 'cozy', 'soft', 'relaxed', 'home', 'pajama', 'sweatpant', 'oversized', 'comfy'],
+        'appropriate': ['fleece', 'cotton', 'jersey', 'easy', 'casual'],
+        'inappropriate': ['formal', 'business', 'structured', 'tight'],
+        'highly_inappropriate': ['suit', 'blazer', 'heels', 'dress shoes', 'formal wear']
+    },
+    'workout': {
+        'highly_appropriate': ['workout', 'gym', 'athletic', 'sport', 'fitness', 'training', 'exercise', 'performance', 'activewear', 'sports bra'],
+        'appropriate': ['leggings', 'shorts', 'tank', 'moisture-wicking', 'breathable'],
+        'inappropriate': ['formal', 'dressy', 'casual street wear'],
+        'highly_inappropriate': ['suit', 'dress', 'heels', 'business attire']
+    }
+}
+
+# Points per matched keyword at each appropriateness level
+STYLE_SCORING_POINTS = {
+    'highly_appropriate': 30,
+    'appropriate': 15,
+    'inappropriate': -25,
+    'highly_inappropriate': -50,
+}
+
+STYLE_SCORING_RULES = KeywordRules({
+    (style, level): keywords
+    for style, levels in STYLE_SCORING.items()
+    for level, keywords in levels.items()
+})
+
+# Fallback scoring for styles missing from STYLE_SCORING
+DEFAULT_STYLE_RULES = KeywordRules({
+    'versatile': ['versatile', 'classic', 'comfortable', 'casual', 'simple', 'clean', 'neutral'],
+    'extreme_negative': ['gym', 'workout', 'athletic', 'sweatpants', 'extremely casual'],
+})
+
+
 def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occasion: str = None, mood: str = None) -> int:
     """Calculate style appropriateness score with heavy penalties for mismatches."""
     
@@ -1603,83 +1866,83 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
             
             # Text-based bonuses (additive with metadata) - style specific
             if style_lower == 'colorblock':
-                if any(word in item_text for word in ['colorblock', 'color blocking', 'bold colors', 'geometric']):
+                if contains_keyword(item_text, ('colorblock', 'color blocking', 'bold colors', 'geometric')):
                     text_score += 20
-                if any(word in item_text for word in ['monochrome', 'boring', 'plain', 'dull']):
+                if contains_keyword(item_text, ('monochrome', 'boring', 'plain', 'dull')):
                     text_score -= 15
             elif style_lower == 'minimalist':
-                if any(word in item_text for word in ['minimalist', 'minimal', 'clean', 'simple']):
+                if contains_keyword(item_text, ('minimalist', 'minimal', 'clean', 'simple')):
                     text_score += 15
-                if any(word in item_text for word in ['maximalist', 'busy', 'ornate']):
+                if contains_keyword(item_text, ('maximalist', 'busy', 'ornate')):
                     text_score -= 15
             elif style_lower == 'maximalist':
-                if any(word in item_text for word in ['maximalist', 'bold', 'statement', 'eclectic']):
+                if contains_keyword(item_text, ('maximalist', 'bold', 'statement', 'eclectic')):
                     text_score += 15
-                if any(word in item_text for word in ['minimalist', 'plain', 'simple']):
+                if contains_keyword(item_text, ('minimalist', 'plain', 'simple')):
                     text_score -= 15
             elif style_lower == 'gothic':
-                if any(word in item_text for word in ['gothic', 'goth', 'dark', 'victorian']):
+                if contains_keyword(item_text, ('gothic', 'goth', 'dark', 'victorian')):
                     text_score += 15
-                if any(word in item_text for word in ['preppy', 'bright', 'cheerful']):
+                if contains_keyword(item_text, ('preppy', 'bright', 'cheerful')):
                     text_score -= 15
             elif style_lower == 'monochrome':
-                if any(word in item_text for word in ['monochrome', 'black and white', 'single color']):
+                if contains_keyword(item_text, ('monochrome', 'black and white', 'single color')):
                     text_score += 15
-                if any(word in item_text for word in ['colorful', 'multicolor', 'rainbow']):
+                if contains_keyword(item_text, ('colorful', 'multicolor', 'rainbow')):
                     text_score -= 15
             # Phase 2 styles
             elif style_lower == 'dark academia':
-                if any(word in item_text for word in ['dark academia', 'academic', 'scholarly', 'tweed']):
+                if contains_keyword(item_text, ('dark academia', 'academic', 'scholarly', 'tweed')):
                     text_score += 15
             elif style_lower == 'light academia':
-                if any(word in item_text for word in ['light academia', 'academic', 'linen', 'airy']):
+                if contains_keyword(item_text, ('light academia', 'academic', 'linen', 'airy')):
                     text_score += 15
             elif style_lower == 'preppy':
-                if any(word in item_text for word in ['preppy', 'collegiate', 'polo', 'nautical']):
+                if contains_keyword(item_text, ('preppy', 'collegiate', 'polo', 'nautical')):
                     text_score += 15
             elif style_lower == 'cottagecore':
-                if any(word in item_text for word in ['cottagecore', 'cottage', 'pastoral', 'prairie']):
+                if contains_keyword(item_text, ('cottagecore', 'cottage', 'pastoral', 'prairie')):
                     text_score += 15
             elif style_lower == 'romantic':
-                if any(word in item_text for word in ['romantic', 'feminine', 'delicate', 'flowy']):
+                if contains_keyword(item_text, ('romantic', 'feminine', 'delicate', 'flowy')):
                     text_score += 15
             elif style_lower == 'grunge':
-                if any(word in item_text for word in ['grunge', 'flannel', 'distressed', 'ripped']):
+                if contains_keyword(item_text, ('grunge', 'flannel', 'distressed', 'ripped')):
                     text_score += 15
             elif style_lower == 'boho':
-                if any(word in item_text for word in ['boho', 'bohemian', 'ethnic', 'flowy']):
+                if contains_keyword(item_text, ('boho', 'bohemian', 'ethnic', 'flowy')):
                     text_score += 15
             # Phase 3 styles
             elif style_lower == 'business casual':
-                if any(word in item_text for word in ['business casual', 'professional', 'office', 'work']):
+                if contains_keyword(item_text, ('business casual', 'professional', 'office', 'work')):
                     text_score += 15
             elif style_lower == 'scandinavian':
-                if any(word in item_text for word in ['scandinavian', 'nordic', 'hygge', 'minimal']):
+                if contains_keyword(item_text, ('scandinavian', 'nordic', 'hygge', 'minimal')):
                     text_score += 15
             elif style_lower == 'old money':
-                if any(word in item_text for word in ['old money', 'luxury', 'classic', 'timeless']):
+                if contains_keyword(item_text, ('old money', 'luxury', 'classic', 'timeless')):
                     text_score += 15
             # Phase 4 styles
             elif style_lower == 'clean girl':
-                if any(word in item_text for word in ['clean girl', 'minimal', 'fresh', 'natural']):
+                if contains_keyword(item_text, ('clean girl', 'minimal', 'fresh', 'natural')):
                     text_score += 15
             elif style_lower == 'punk':
-                if any(word in item_text for word in ['punk', 'studded', 'leather', 'chains']):
+                if contains_keyword(item_text, ('punk', 'studded', 'leather', 'chains')):
                     text_score += 15
             elif style_lower == 'edgy':
-                if any(word in item_text for word in ['edgy', 'bold', 'leather', 'rock']):
+                if contains_keyword(item_text, ('edgy', 'bold', 'leather', 'rock')):
                     text_score += 15
             elif style_lower == 'french girl':
-                if any(word in item_text for word in ['french girl', 'parisian', 'chic', 'effortless']):
+                if contains_keyword(item_text, ('french girl', 'parisian', 'chic', 'effortless')):
                     text_score += 15
             elif style_lower == 'urban professional':
-                if any(word in item_text for word in ['urban professional', 'modern professional', 'city']):
+                if contains_keyword(item_text, ('urban professional', 'modern professional', 'city')):
                     text_score += 15
             elif style_lower == 'techwear':
-                if any(word in item_text for word in ['techwear', 'technical', 'functional', 'utility']):
+                if contains_keyword(item_text, ('techwear', 'technical', 'functional', 'utility')):
                     text_score += 15
             elif style_lower == 'coastal grandmother':
-                if any(word in item_text for word in ['coastal grandmother', 'linen', 'breezy']):
+                if contains_keyword(item_text, ('coastal grandmother', 'linen', 'breezy')):
                     text_score += 15
             
             total = metadata_score + text_score
@@ -1694,280 +1957,29 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
     
     item_text = f"{item_name} {item_type} {item_description} {item_material}"
     
-    # Define style-specific scoring - MATCHES FRONTEND EXACTLY (35 styles)
-    style_scoring = {
-        # Academic & Intellectual (3 styles)
-        'dark academia': {
-            'highly_appropriate': ['dark', 'academia', 'academic', 'scholarly', 'vintage', 'tweed', 'plaid', 'corduroy', 'blazer', 'cardigan', 'turtleneck', 'oxford', 'loafer'],
-            'appropriate': ['button-up', 'sweater', 'trousers', 'brown', 'burgundy', 'forest green', 'navy', 'beige', 'pleated', 'cable knit', 'wool'],
-            'inappropriate': ['neon', 'bright colors', 'overly casual', 'graphic tee'],
-            'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants', 'tank top']
-        },
-        'light academia': {
-            'highly_appropriate': ['light', 'academia', 'academic', 'scholarly', 'cream', 'beige', 'white', 'linen', 'blazer', 'cardigan', 'oxford', 'loafer'],
-            'appropriate': ['button-up', 'sweater', 'trousers', 'light colors', 'neutral', 'soft', 'pleated', 'airy'],
-            'inappropriate': ['dark colors', 'neon', 'bright', 'overly casual'],
-            'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants']
-        },
-        'old money': {
-            'highly_appropriate': ['old money', 'wealthy', 'luxury', 'classic', 'timeless', 'polo', 'cable knit', 'cashmere', 'tailored', 'refined', 'elegant'],
-            'appropriate': ['golf', 'tennis', 'yacht', 'preppy', 'blazer', 'loafers', 'chinos', 'quality'],
-            'inappropriate': ['trendy', 'fast fashion', 'loud', 'flashy'],
-            'highly_inappropriate': ['athletic wear', 'gym', 'workout', 'cheap', 'disposable']
-        },
-        
-        # Trendy & Modern (4 styles)
-        'y2k': {
-            'highly_appropriate': ['y2k', '2000s', 'nostalgic', 'butterfly', 'low-rise', 'crop', 'mini', 'platform', 'chunky', 'metallic', 'velour', 'rhinestone'],
-            'appropriate': ['baby tee', 'cargo', 'denim', 'pink', 'juicy', 'tracksuit', 'sparkle'],
-            'inappropriate': ['formal', 'business', 'traditional', 'conservative'],
-            'highly_inappropriate': ['suit', 'blazer', 'professional', 'corporate']
-        },
-        'coastal grandmother': {
-            'highly_appropriate': ['coastal', 'grandmother', 'linen', 'relaxed', 'effortless', 'neutral', 'beige', 'white', 'blue', 'oversized', 'breezy'],
-            'appropriate': ['casual', 'elegant', 'timeless', 'comfortable', 'natural'],
-            'inappropriate': ['tight', 'formal', 'structured'],
-            'highly_inappropriate': ['athletic', 'gym', 'workout', 'flashy']
-        },
-        'clean girl': {
-            'highly_appropriate': ['clean girl', 'minimal', 'simple', 'fresh', 'neutral', 'natural', 'effortless', 'polished', 'understated', 'basic'],
-            'appropriate': ['white', 'beige', 'classic', 'sleek', 'modern'],
-            'inappropriate': ['busy', 'loud', 'flashy', 'maximalist', 'bold'],
-            'highly_inappropriate': ['gothic', 'punk', 'grunge', 'distressed']
-        },
-        'cottagecore': {
-            'highly_appropriate': ['cottagecore', 'cottage', 'pastoral', 'rustic', 'vintage', 'floral', 'lace', 'embroidered', 'prairie', 'gingham', 'pinafore'],
-            'appropriate': ['dress', 'skirt', 'cardigan', 'blouse', 'apron', 'smock', 'straw', 'wicker', 'mary janes', 'clogs'],
-            'inappropriate': ['modern', 'sleek', 'minimalist'],
-            'highly_inappropriate': ['athletic', 'corporate', 'business', 'suit', 'tech']
-        },
-        
-        # Artistic & Creative (4 styles)
-        'avant-garde': {
-            'highly_appropriate': ['avant-garde', 'experimental', 'unconventional', 'artistic', 'architectural', 'sculptural', 'asymmetric', 'deconstructed', 'conceptual'],
-            'appropriate': ['innovative', 'unique', 'bold', 'creative', 'statement'],
-            'inappropriate': ['basic', 'conventional', 'traditional'],
-            'highly_inappropriate': ['boring', 'plain', 'conservative', 'mainstream']
-        },
-        'artsy': {
-            'highly_appropriate': ['artsy', 'artistic', 'creative', 'unique', 'asymmetric', 'avant-garde', 'statement', 'bold', 'eclectic'],
-            'appropriate': ['colorful', 'patterned', 'mixed', 'layered', 'oversized', 'wide-leg', 'unusual'],
-            'inappropriate': ['basic', 'plain', 'simple', 'conservative'],
-            'highly_inappropriate': ['corporate', 'business casual', 'traditional suit']
-        },
-        'maximalist': {
-            'highly_appropriate': ['maximalist', 'bold', 'colorful', 'patterns', 'mixed prints', 'layered', 'statement', 'more is more', 'eclectic', 'vibrant'],
-            'appropriate': ['accessories', 'jewelry', 'embellished', 'decorative'],
-            'inappropriate': ['minimal', 'simple', 'plain'],
-            'highly_inappropriate': ['understated', 'boring', 'monochrome', 'basic']
-        },
-        'colorblock': {
-            'highly_appropriate': ['colorblock', 'color blocking', 'bold colors', 'contrasting', 'geometric', 'blocks', 'primary colors', 'vibrant'],
-            'appropriate': ['modern', 'graphic', 'striking'],
-            'inappropriate': ['muted', 'neutral', 'monochrome'],
-            'highly_inappropriate': ['black and white only', 'beige', 'boring']
-        },
-        
-        # Professional & Classic (4 styles)
-        'business casual': {
-            'highly_appropriate': ['business casual', 'professional', 'work', 'office', 'smart', 'polished', 'blazer', 'trousers', 'button-up'],
-            'appropriate': ['loafers', 'dress shoes', 'blouse', 'collared', 'structured'],
-            'inappropriate': ['casual', 'athletic', 'distressed'],
-            'highly_inappropriate': ['gym', 'workout', 'hoodie', 'sweatshirt', 'joggers', 'sneakers', 't-shirt']
-        },
-        'classic': {
-            'highly_appropriate': ['classic', 'timeless', 'traditional', 'elegant', 'sophisticated', 'refined', 'tailored', 'well-fitted'],
-            'appropriate': ['button-up', 'button-down', 'collared', 'blazer', 'trousers', 'chinos', 'oxford', 'loafers', 'simple', 'clean', 'structured', 'neutral'],
-            'inappropriate': ['distressed', 'ripped', 'overly casual', 'worn', 'graphic tee'],
-            'highly_inappropriate': ['athletic', 'sport', 'gym', 'workout', 'joggers', 'sweatpants', 'hoodie', 'overly trendy']
-        },
-        'preppy': {
-            'highly_appropriate': ['preppy', 'collegiate', 'classic', 'nautical', 'striped', 'polo', 'button-down', 'khaki'],
-            'appropriate': ['blazer', 'sweater', 'cardigan', 'chinos', 'boat shoes', 'oxford', 'clean', 'crisp'],
-            'inappropriate': ['grunge', 'edgy', 'distressed'],
-            'highly_inappropriate': ['athletic', 'sport', 'gym', 'goth', 'punk', 'overly casual']
-        },
-        'urban professional': {
-            'highly_appropriate': ['urban professional', 'modern professional', 'city', 'sleek', 'contemporary', 'polished', 'minimalist', 'tailored', 'sophisticated'],
-            'appropriate': ['structured', 'quality', 'well-fitted', 'modern'],
-            'inappropriate': ['casual', 'sloppy', 'outdated'],
-            'highly_inappropriate': ['athletic', 'gym', 'workout', 'loungewear']
-        },
-        
-        # Urban & Street (4 styles)
-        'streetwear': {
-            'highly_appropriate': ['streetwear', 'urban', 'casual', 'trendy', 'oversized', 'graphic', 'sneakers', 'hoodie'],
-            'appropriate': ['t-shirt', 'jeans', 'joggers', 'bomber', 'track', 'athletic', 'logo'],
-            'inappropriate': ['formal', 'business', 'dressy', 'traditional'],
-            'highly_inappropriate': ['suit', 'blazer', 'dress pants', 'dress shoes', 'heels', 'corporate']
-        },
-        'techwear': {
-            'highly_appropriate': ['techwear', 'technical', 'functional', 'utility', 'tactical', 'waterproof', 'breathable', 'cargo', 'futuristic'],
-            'appropriate': ['black', 'straps', 'zippers', 'performance', 'modern'],
-            'inappropriate': ['formal', 'dressy', 'delicate'],
-            'highly_inappropriate': ['vintage', 'retro', 'romantic', 'flowy']
-        },
-        'grunge': {
-            'highly_appropriate': ['grunge', 'flannel', 'plaid shirt', 'ripped', 'distressed', 'band tee', 'combat boots', 'oversized', 'layered', 'worn'],
-            'appropriate': ['dark', 'vintage tee', 'denim', 'casual', 'beanie', 'converse'],
-            'inappropriate': ['polished', 'refined', 'preppy', 'neat'],
-            'highly_inappropriate': ['formal', 'corporate', 'business', 'elegant', 'sophisticated']
-        },
-        'hipster': {
-            'highly_appropriate': ['hipster', 'indie', 'vintage', 'retro', 'quirky', 'artisanal', 'unique', 'alternative', 'thrift'],
-            'appropriate': ['flannel', 'skinny jeans', 'boots', 'beanie', 'glasses', 'beard'],
-            'inappropriate': ['mainstream', 'corporate', 'basic'],
-            'highly_inappropriate': ['formal', 'business', 'conventional']
-        },
-        
-        # Feminine & Romantic (4 styles)
-        'romantic': {
-            'highly_appropriate': ['romantic', 'feminine', 'flowy', 'delicate', 'soft', 'lace', 'ruffles', 'floral'],
-            'appropriate': ['dress', 'skirt', 'blouse', 'pastel', 'chiffon', 'silk', 'satin', 'elegant'],
-            'inappropriate': ['harsh', 'structured', 'masculine'],
-            'highly_inappropriate': ['athletic', 'sport', 'gym', 'cargo', 'combat', 'utilitarian']
-        },
-        'boho': {
-            'highly_appropriate': ['boho', 'bohemian', 'flowy', 'free', 'ethnic', 'vintage', 'embroidered', 'fringe', 'maxi', 'loose', 'layered'],
-            'appropriate': ['natural', 'earthy', 'sandals', 'boots', 'casual'],
-            'inappropriate': ['structured', 'formal', 'business'],
-            'highly_inappropriate': ['athletic', 'sport', 'corporate', 'suit', 'blazer']
-        },
-        'french girl': {
-            'highly_appropriate': ['french girl', 'parisian', 'effortless', 'chic', 'simple', 'classic', 'striped', 'beret', 'trench', 'ballet flats'],
-            'appropriate': ['timeless', 'elegant', 'minimal', 'quality'],
-            'inappropriate': ['flashy', 'loud', 'overly trendy', 'maximalist'],
-            'highly_inappropriate': ['athletic', 'gym', 'workout', 'tacky']
-        },
-        'pinup': {
-            'highly_appropriate': ['pinup', 'vintage', 'retro', '50s', 'polka dot', 'high waist', 'swing dress', 'rockabilly'],
-            'appropriate': ['red lips', 'cat eye', 'pin curl', 'vintage style', 'feminine'],
-            'inappropriate': ['modern', 'minimalist', 'athletic'],
-            'highly_inappropriate': ['grunge', 'punk', 'goth', 'techwear']
-        },
-        
-        # Modern & Minimal (3 styles)
-        'minimalist': {
-            'highly_appropriate': ['minimalist', 'simple', 'clean', 'modern', 'sleek', 'neutral', 'monochrome', 'streamlined'],
-            'appropriate': ['solid', 'plain', 'basic', 'understated', 'refined', 'tailored'],
-            'inappropriate': ['busy', 'patterned', 'embellished', 'ornate'],
-            'highly_inappropriate': ['loud', 'graphic', 'overly decorative', 'bohemian', 'maximalist']
-        },
-        'modern': {
-            'highly_appropriate': ['modern', 'contemporary', 'current', 'sleek', 'clean lines', 'minimalist', 'updated', 'fresh'],
-            'appropriate': ['stylish', 'trendy', 'fashionable', 'sophisticated'],
-            'inappropriate': ['vintage', 'outdated', 'retro'],
-            'highly_inappropriate': ['old-fashioned', 'dated', 'archaic']
-        },
-        'scandinavian': {
-            'highly_appropriate': ['scandinavian', 'nordic', 'minimal', 'neutral', 'cozy', 'hygge', 'simple', 'functional', 'natural'],
-            'appropriate': ['muted colors', 'wool', 'knitwear', 'clean'],
-            'inappropriate': ['flashy', 'loud', 'maximalist', 'busy'],
-            'highly_inappropriate': ['neon', 'bright colors', 'excessive decoration']
-        },
-        
-        # Alternative & Edgy (4 styles)
-        'gothic': {
-            'highly_appropriate': ['gothic', 'goth', 'dark', 'black', 'lace', 'velvet', 'corset', 'platform boots', 'choker'],
-            'appropriate': ['dark makeup', 'silver', 'dramatic', 'Victorian'],
-            'inappropriate': ['bright', 'pastel', 'preppy'],
-            'highly_inappropriate': ['corporate', 'business', 'clean girl', 'coastal']
-        },
-        'punk': {
-            'highly_appropriate': ['punk', 'studded', 'leather', 'spikes', 'chains', 'safety pins', 'plaid', 'tartan', 'combat boots', 'band', 'ripped'],
-            'appropriate': ['graphic', 'torn', 'black', 'dark', 'diy', 'patches'],
-            'inappropriate': ['preppy', 'soft', 'pastel', 'delicate'],
-            'highly_inappropriate': ['formal', 'business', 'corporate', 'conservative', 'traditional']
-        },
-        'cyberpunk': {
-            'highly_appropriate': ['cyberpunk', 'futuristic', 'neon', 'tech', 'metallic', 'holographic', 'led', 'cyber', 'dystopian'],
-            'appropriate': ['techwear', 'black', 'electric', 'urban'],
-            'inappropriate': ['vintage', 'classic', 'traditional'],
-            'highly_inappropriate': ['natural', 'organic', 'cottagecore', 'boho']
-        },
-        'edgy': {
-            'highly_appropriate': ['edgy', 'bold', 'leather', 'studded', 'distressed', 'ripped', 'dark', 'black', 'rock'],
-            'appropriate': ['denim', 'boots', 'chain', 'zipper', 'asymmetric', 'moto'],
-            'inappropriate': ['pastel', 'soft', 'delicate', 'preppy'],
-            'highly_inappropriate': ['romantic', 'frilly', 'lace', 'overly feminine', 'corporate']
-        },
-        
-        # Seasonal & Lifestyle (5 styles)
-        'coastal chic': {
-            'highly_appropriate': ['coastal', 'beach', 'nautical', 'breezy', 'linen', 'white', 'blue', 'striped', 'relaxed', 'resort'],
-            'appropriate': ['summer', 'sandals', 'lightweight', 'fresh'],
-            'inappropriate': ['heavy', 'formal', 'structured'],
-            'highly_inappropriate': ['athletic', 'gym', 'workout', 'gothic']
-        },
-        'athleisure': {
-            'highly_appropriate': ['athletic', 'sport', 'performance', 'moisture-wicking', 'breathable', 'activewear', 'gym', 'workout', 'running', 'yoga'],
-            'appropriate': ['comfortable', 'stretchy', 'casual', 'relaxed', 'cotton', 'polyester'],
-            'inappropriate': ['formal', 'business', 'dressy', 'structured'],
-            'highly_inappropriate': ['suit', 'blazer', 'dress pants', 'dress shirt', 'tie', 'oxford', 'formal pants', 'dress shoes', 'heels']
-        },
-        'casual cool': {
-            'highly_appropriate': ['casual', 'cool', 'relaxed', 'effortless', 'comfortable', 'everyday', 'laid-back', 'easy'],
-            'appropriate': ['jeans', 't-shirt', 'sneakers', 'simple', 'accessible'],
-            'inappropriate': ['formal', 'business', 'dressy'],
-            'highly_inappropriate': ['suit', 'tie', 'dress pants', 'very formal']
-        },
-        'loungewear': {
-            'highly_appropriate': ['lounge', 'comfortable', 'cozy', 'soft', 'relaxed', 'home', 'pajama', 'sweatpant', 'oversized', 'comfy'],
-            'appropriate': ['fleece', 'cotton', 'jersey', 'easy', 'casual'],
-            'inappropriate': ['formal', 'business', 'structured', 'tight'],
-            'highly_inappropriate': ['suit', 'blazer', 'heels', 'dress shoes', 'formal wear']
-        },
-        'workout': {
-            'highly_appropriate': ['workout', 'gym', 'athletic', 'sport', 'fitness', 'training', 'exercise', 'performance', 'activewear', 'sports bra'],
-            'appropriate': ['leggings', 'shorts', 'tank', 'moisture-wicking', 'breathable'],
-            'inappropriate': ['formal', 'dressy', 'casual street wear'],
-            'highly_inappropriate': ['suit', 'dress', 'heels', 'business attire']
-        }
-    }
-    
     # If style not in our scoring dict, use permissive default scoring
-    if style.lower() not in style_scoring:
+    if style.lower() not in STYLE_SCORING:
         logger.info(f"⚠️ Unknown style '{style}', using permissive default scoring")
         # Return moderate positive score for unknown styles to be inclusive
         # Give bonus points for common versatile attributes
         default_score = 10  # Base score for unknown styles
         
         # Add points for versatile attributes that work with most styles
-        versatile_keywords = ['versatile', 'classic', 'comfortable', 'casual', 'simple', 'clean', 'neutral']
-        for keyword in versatile_keywords:
-            if keyword in item_text:
-                default_score += 5
+        default_score += 5 * DEFAULT_STYLE_RULES.count(item_text, 'versatile')
         
         # Subtract points only for extremely inappropriate items (athletic gear for formal occasions)
-        extreme_negatives = ['gym', 'workout', 'athletic', 'sweatpants', 'extremely casual']
-        for negative in extreme_negatives:
-            if negative in item_text and style.lower() in ['formal', 'business', 'elegant']:
-                default_score -= 10
+        if style.lower() in ['formal', 'business', 'elegant']:
+            default_score -= 10 * DEFAULT_STYLE_RULES.count(item_text, 'extreme_negative')
         
         return max(default_score, 5)  # Ensure at least a small positive score
     
-    scoring = style_scoring[style.lower()]
-    total_score = 0
-    
-    # Check for highly appropriate indicators (+30 points)
-    for indicator in (scoring.get('highly_appropriate', []) if scoring else []):
-        if indicator in item_text:
-            total_score += 30
-            
-    # Check for appropriate indicators (+15 points)
-    for indicator in (scoring.get('appropriate', []) if scoring else []):
-        if indicator in item_text:
-            total_score += 15
-            
-    # Check for inappropriate indicators (-25 points)
-    for indicator in (scoring.get('inappropriate', []) if scoring else []):
-        if indicator in item_text:
-            total_score -= 25
-            
-    # Check for highly inappropriate indicators (-50 points)
-    for indicator in (scoring.get('highly_inappropriate', []) if scoring else []):
-        if indicator in item_text:
-            total_score -= 50
+    # One scan of the item text scores every appropriateness level
+    style_key = style.lower()
+    matched_levels = STYLE_SCORING_RULES.match(item_text)
+    total_score = sum(
+        points * matched_levels.get((style_key, level), 0)
+        for level, points in STYLE_SCORING_POINTS.items()
+    )
     
     # If no matches found, give a small positive score to be inclusive
     if total_score == 0:
@@ -1980,8 +1992,8 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # GYM/WORKOUT occasions REQUIRE athletic wear, override style penalties
         if occasion_lower in ['gym', 'workout', 'exercise', 'fitness', 'training', 'yoga', 'running']:
-            athletic_keywords = ['athletic', 'sport', 'gym', 'workout', 'performance', 'moisture-wicking', 'breathable', 'activewear', 'running', 'yoga', 'training']
-            is_athletic_item = any(keyword in item_text for keyword in athletic_keywords)
+            athletic_keywords = ('athletic', 'sport', 'gym', 'workout', 'performance', 'moisture-wicking', 'breathable', 'activewear', 'running', 'yoga', 'training')
+            is_athletic_item = contains_keyword(item_text, athletic_keywords)
             
             if is_athletic_item:
                 # Athletic items get BONUS points for gym occasions, even if style doesn't match
@@ -1991,8 +2003,8 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # FORMAL occasions REQUIRE formal wear
         elif occasion_lower in ['wedding', 'gala', 'black tie', 'formal event', 'cocktail']:
-            formal_keywords = ['formal', 'dress', 'suit', 'blazer', 'elegant', 'gown', 'tuxedo', 'cocktail dress']
-            is_formal_item = any(keyword in item_text for keyword in formal_keywords)
+            formal_keywords = ('formal', 'dress', 'suit', 'blazer', 'elegant', 'gown', 'tuxedo', 'cocktail dress')
+            is_formal_item = contains_keyword(item_text, formal_keywords)
             
             if is_formal_item:
                 logger.info(f"👔 Occasion override: Formal item gets bonus for {occasion_lower} occasion")
@@ -2001,8 +2013,8 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # BEACH/SWIM occasions
         elif occasion_lower in ['beach', 'pool', 'swim', 'swimming', 'poolside']:
-            beach_keywords = ['swimsuit', 'bikini', 'swim', 'beach', 'shorts', 'sandals', 'flip-flops', 'cover-up']
-            is_beach_item = any(keyword in item_text for keyword in beach_keywords)
+            beach_keywords = ('swimsuit', 'bikini', 'swim', 'beach', 'shorts', 'sandals', 'flip-flops', 'cover-up')
+            is_beach_item = contains_keyword(item_text, beach_keywords)
             
             if is_beach_item:
                 logger.info(f"🏖️ Occasion override: Beach item gets bonus for {occasion_lower} occasion")
@@ -2016,24 +2028,24 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         # ROMANTIC MOOD: Prefer soft, elegant, refined pieces (gender-neutral)
         if mood_lower == 'romantic':
             # Universal romantic keywords that work for both genders
-            romantic_keywords = [
+            romantic_keywords = (
                 'romantic', 'soft', 'delicate', 'flowy', 'elegant', 'refined', 'sophisticated',
                 'silk', 'chiffon', 'satin', 'cashmere', 'velvet',  # Elegant materials
                 'pastel', 'cream', 'rose', 'lavender', 'soft blue', 'soft pink',  # Soft colors
                 'floral', 'lace', 'embroidery',  # Delicate details
                 'tailored', 'fitted', 'draped'  # Refined fits
-            ]
-            has_romantic = any(keyword in item_text for keyword in romantic_keywords)
+            )
+            has_romantic = contains_keyword(item_text, romantic_keywords)
             
             # Gender-specific romantic items (boost if item matches user's typical items)
             # Note: These are checked but don't penalize if missing (works for both genders)
-            feminine_romantic = ['dress', 'skirt', 'blouse']
-            masculine_romantic = ['button-up', 'dress shirt', 'blazer', 'suit']
-            has_feminine_romantic = any(keyword in item_text for keyword in feminine_romantic)
-            has_masculine_romantic = any(keyword in item_text for keyword in masculine_romantic)
+            feminine_romantic = ('dress', 'skirt', 'blouse')
+            masculine_romantic = ('button-up', 'dress shirt', 'blazer', 'suit')
+            has_feminine_romantic = contains_keyword(item_text, feminine_romantic)
+            has_masculine_romantic = contains_keyword(item_text, masculine_romantic)
             
-            harsh_keywords = ['harsh', 'rigid', 'athletic', 'sport', 'cargo', 'utility', 'tactical', 'military']
-            has_harsh = any(keyword in item_text for keyword in harsh_keywords)
+            harsh_keywords = ('harsh', 'rigid', 'athletic', 'sport', 'cargo', 'utility', 'tactical', 'military')
+            has_harsh = contains_keyword(item_text, harsh_keywords)
             
             if has_romantic:
                 logger.info(f"💕 Romantic mood: Boosting romantic item")
@@ -2048,11 +2060,11 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # PLAYFUL MOOD: Prefer bright colors, fun patterns, casual, energetic pieces
         elif mood_lower == 'playful':
-            playful_keywords = ['playful', 'fun', 'bright', 'colorful', 'graphic', 'pattern', 'print', 'casual', 'relaxed', 'quirky', 'unique', 'statement', 'bold color', 'vibrant']
-            has_playful = any(keyword in item_text for keyword in playful_keywords)
+            playful_keywords = ('playful', 'fun', 'bright', 'colorful', 'graphic', 'pattern', 'print', 'casual', 'relaxed', 'quirky', 'unique', 'statement', 'bold color', 'vibrant')
+            has_playful = contains_keyword(item_text, playful_keywords)
             
-            serious_keywords = ['formal', 'business', 'conservative', 'muted', 'plain', 'boring']
-            has_serious = any(keyword in item_text for keyword in serious_keywords)
+            serious_keywords = ('formal', 'business', 'conservative', 'muted', 'plain', 'boring')
+            has_serious = contains_keyword(item_text, serious_keywords)
             
             if has_playful:
                 logger.info(f"🎨 Playful mood: Boosting fun item")
@@ -2063,11 +2075,11 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # SERENE MOOD: Prefer muted tones, comfortable, simple, calming pieces
         elif mood_lower == 'serene':
-            serene_keywords = ['serene', 'calm', 'peaceful', 'comfortable', 'soft', 'muted', 'neutral', 'beige', 'cream', 'white', 'gray', 'simple', 'minimal', 'relaxed', 'cozy', 'natural']
-            has_serene = any(keyword in item_text for keyword in serene_keywords)
+            serene_keywords = ('serene', 'calm', 'peaceful', 'comfortable', 'soft', 'muted', 'neutral', 'beige', 'cream', 'white', 'gray', 'simple', 'minimal', 'relaxed', 'cozy', 'natural')
+            has_serene = contains_keyword(item_text, serene_keywords)
             
-            chaotic_keywords = ['loud', 'busy', 'flashy', 'neon', 'bright', 'bold pattern', 'maximalist']
-            has_chaotic = any(keyword in item_text for keyword in chaotic_keywords)
+            chaotic_keywords = ('loud', 'busy', 'flashy', 'neon', 'bright', 'bold pattern', 'maximalist')
+            has_chaotic = contains_keyword(item_text, chaotic_keywords)
             
             if has_serene:
                 logger.info(f"🧘 Serene mood: Boosting calming item")
@@ -2078,11 +2090,11 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # DYNAMIC MOOD: Prefer bold colors, statement pieces, energetic, attention-grabbing looks
         elif mood_lower == 'dynamic':
-            dynamic_keywords = ['dynamic', 'bold', 'statement', 'striking', 'vibrant', 'energetic', 'dramatic', 'eye-catching', 'standout', 'colorful', 'bright', 'strong', 'powerful']
-            has_dynamic = any(keyword in item_text for keyword in dynamic_keywords)
+            dynamic_keywords = ('dynamic', 'bold', 'statement', 'striking', 'vibrant', 'energetic', 'dramatic', 'eye-catching', 'standout', 'colorful', 'bright', 'strong', 'powerful')
+            has_dynamic = contains_keyword(item_text, dynamic_keywords)
             
-            boring_keywords = ['plain', 'boring', 'basic', 'muted', 'understated', 'subtle']
-            has_boring = any(keyword in item_text for keyword in boring_keywords)
+            boring_keywords = ('plain', 'boring', 'basic', 'muted', 'understated', 'subtle')
+            has_boring = contains_keyword(item_text, boring_keywords)
             
             if has_dynamic:
                 logger.info(f"⚡ Dynamic mood: Boosting bold item")
@@ -2094,11 +2106,11 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         # BOLD MOOD: Prefer daring, unconventional, fashion-forward pieces (already handled in exclusions)
         # Additional scoring for bold items
         elif mood_lower == 'bold':
-            bold_keywords = ['bold', 'daring', 'unconventional', 'edgy', 'statement', 'dramatic', 'unique', 'avant-garde', 'fashion-forward', 'striking']
-            has_bold = any(keyword in item_text for keyword in bold_keywords)
+            bold_keywords = ('bold', 'daring', 'unconventional', 'edgy', 'statement', 'dramatic', 'unique', 'avant-garde', 'fashion-forward', 'striking')
+            has_bold = contains_keyword(item_text, bold_keywords)
             
-            safe_keywords = ['safe', 'basic', 'conventional', 'traditional', 'conservative']
-            has_safe = any(keyword in item_text for keyword in safe_keywords)
+            safe_keywords = ('safe', 'basic', 'conventional', 'traditional', 'conservative')
+            has_safe = contains_keyword(item_text, safe_keywords)
             
             if has_bold:
                 logger.info(f"🔥 Bold mood: Boosting daring item")
@@ -2109,11 +2121,11 @@ def calculate_style_appropriateness_score(style: str, item: Dict[str, Any], occa
         
         # SUBTLE MOOD: Prefer understated, neutral, minimal, refined pieces
         elif mood_lower == 'subtle':
-            subtle_keywords = ['subtle', 'understated', 'minimal', 'simple', 'refined', 'elegant', 'neutral', 'muted', 'soft', 'quiet', 'timeless', 'classic', 'clean']
-            has_subtle = any(keyword in item_text for keyword in subtle_keywords)
+            subtle_keywords = ('subtle', 'understated', 'minimal', 'simple', 'refined', 'elegant', 'neutral', 'muted', 'soft', 'quiet', 'timeless', 'classic', 'clean')
+            has_subtle = contains_keyword(item_text, subtle_keywords)
             
-            loud_keywords = ['loud', 'flashy', 'bold', 'bright', 'neon', 'statement', 'attention-grabbing', 'maximalist']
-            has_loud = any(keyword in item_text for keyword in loud_keywords)
+            loud_keywords = ('loud', 'flashy', 'bold', 'bright', 'neon', 'statement', 'attention-grabbing', 'maximalist')
+            has_loud = contains_keyword(item_text, loud_keywords)
             
             if has_subtle:
                 logger.info(f"🤫 Subtle mood: Boosting understated item")
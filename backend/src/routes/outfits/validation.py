@@ -116,6 +116,62 @@ def _is_semantically_appropriate(outfit_items, required_item, occasion):
     return False
 
 
+async def filter_valid_alternatives(alternatives, occasion, requirements, deduplicate, relax, validate=None, min_items=3):
+    """
+    Put batch alternatives through the checks the primary outfit gets and drop the ones that fail.
+
+    ``deduplicate(items, occasion)`` and ``relax(items, occasion, requirements)`` are the
+    category-limit and relaxed-rule steps of the generate route; ``validate(outfit)`` runs the
+    validation pipeline and returns a result with ``valid``. An alternative is kept only if it
+    meets the occasion's hard requirements (after one relaxed retry), has at least ``min_items``
+    items and passes the pipeline.
+    """
+    kept = []
+    for index, alternative in enumerate(alternatives or []):
+        original_items = list(alternative.get('items') or []) if alternative else []
+        items = deduplicate(original_items, occasion)
+
+        validation_passed = True
+        if requirements:
+            if validate_outfit_completeness(items, requirements, occasion):
+                validation_passed = False
+                items = deduplicate(relax(original_items, occasion, requirements), occasion)
+                missing_required = validate_outfit_completeness(items, requirements, occasion)
+                if missing_required:
+                    logger.info(f"🗑️ Dropped alternative {index + 1}: missing {missing_required}")
+                    continue
+
+        if len(items) < min_items:
+            logger.info(f"🗑️ Dropped alternative {index + 1}: only {len(items)} items")
+            continue
+
+        candidate = {**alternative, 'items': items}
+        if validate is not None:
+            try:
+                result = await validate(candidate)
+            except Exception as validation_error:
+                logger.warning(f"⚠️ Validation pipeline failed for alternative {index + 1}: {validation_error}, keeping it")
+            else:
+                if not result.valid:
+                    logger.info(f"🗑️ Dropped alternative {index + 1}: {result.errors}")
+                    continue
+
+        candidate['metadata'] = {
+            **(candidate.get('metadata') or {}),
+            'validation_applied': True,
+            'hard_requirements_enforced': True,
+            'category_limits_enforced': True,
+            'validation_passed': validation_passed,
+            'retry_with_relaxed_rules': not validation_passed,
+            'unique_items_count': len(items),
+        }
+        kept.append(candidate)
+
+    if alternatives and len(kept) < len(alternatives):
+        logger.info(f"📦 Kept {len(kept)}/{len(alternatives)} alternatives after validation")
+    return kept
+
+
 def safe_get_metadata(obj: Dict[str, Any], key: str, default=None):
     """Safely get a value from metadata, handling None metadata."""
     if obj is None:
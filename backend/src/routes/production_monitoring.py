@@ -4,12 +4,19 @@ Provides real-time monitoring data for production launch.
 """
 
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, status
 from fastapi.responses import JSONResponse
 
 from ..auth.auth_service import get_current_user_id
+from ..auth.token_cache import get_token_cache_stats
+from ..core.cache import get_bounded_store_stats
+from ..core.firestore_accounting import firestore_route_stats
+from ..core.logging import get_log_stats
+from ..core.tracing import tracer
+from ..services.filters.hard_filter_rules import hard_filter_rule_hits
 from ..services.production_monitoring_service import (
     monitoring_service,
     OperationType,
@@ -20,6 +27,14 @@ from ..services.production_monitoring_service import (
 router = APIRouter(tags=["monitoring"])
 logger = logging.getLogger(__name__)
 
+# Same admin token as the migration routes; admin-only endpoints are closed when unset
+ADMIN_TOKEN = os.getenv("ADMIN_MIGRATION_TOKEN")
+
+
+def require_admin_token(x_admin_token: str = Header(None)) -> None:
+    if not ADMIN_TOKEN or x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Unauthorized - invalid admin token")
+
 
 @router.get("/health")
 async def monitoring_health_check():
@@ -81,9 +96,7 @@ async def get_operation_stats(
         if operation:
             # Single operation stats
             success_rate = monitoring_service.get_success_rate(operation)
-            p50 = monitoring_service.get_performance_percentile(operation, 50, time_window_minutes)
-            p95 = monitoring_service.get_performance_percentile(operation, 95, time_window_minutes)
-            p99 = monitoring_service.get_performance_percentile(operation, 99, time_window_minutes)
+            p50, p95, p99 = monitoring_service.get_performance_percentiles(operation, [50, 95, 99], time_window_minutes)
             
             stats = monitoring_service.metrics['success_rates'][operation]
             
@@ -143,7 +156,7 @@ async def get_recent_errors(
         Recent errors with stack traces and context
     """
     try:
-        errors = monitoring_service.metrics['errors']
+        errors = list(monitoring_service.metrics['errors'])
         
         # Filter by operation if specified
         if operation:
@@ -271,6 +284,166 @@ async def get_api_call_stats():
         )
 
 
+@router.get("/stats/memory")
+async def get_memory_stats():
+    """
+    Get memory accounting for bounded in-process state stores.
+    
+    Returns:
+        Per-store entry counts, evictions/expirations and approximate bytes,
+        plus the process resident set size when available
+    """
+    try:
+        stores = get_bounded_store_stats()
+        
+        process_rss_bytes = None
+        try:
+            import psutil
+            process_rss_bytes = psutil.Process().memory_info().rss
+        except Exception:
+            pass
+        
+        return {
+            "stores": stores,
+            "total_store_bytes": sum(store['memory_bytes'] for store in stores.values()),
+            "process_rss_bytes": process_rss_bytes,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error getting memory stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get memory stats: {str(e)}"
+        )
+
+
+@router.get("/stats/auth")
+async def get_auth_stats():
+    """
+    Get Firebase ID token verification statistics.
+    
+    Returns:
+        Verified-token cache hit rate and verification latency
+    """
+    try:
+        return {
+            **get_token_cache_stats(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error getting auth stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get auth stats: {str(e)}"
+        )
+
+
+@router.get("/stats/firestore")
+async def get_firestore_stats():
+    """
+    Get Firestore usage per route.
+    
+    Returns:
+        Request count, total/average/max document reads, writes, queries and
+        Firestore time per route, with read-budget violations
+    """
+    try:
+        return {
+            "routes": firestore_route_stats.get_stats(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error getting Firestore stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get Firestore stats: {str(e)}"
+        )
+
+
+@router.get("/stats/hard-filters")
+async def get_hard_filter_stats():
+    """
+    Get hard-filter rule hit counts.
+    
+    Returns:
+        Number of items decided by each rule, grouped by filter, including
+        the "default" fallthrough of each filter
+    """
+    try:
+        return {
+            "filters": hard_filter_rule_hits.get_stats(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error getting hard-filter stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get hard-filter stats: {str(e)}"
+        )
+
+
+@router.get("/stats/logging")
+async def get_logging_stats():
+    """
+    Get log volume governor statistics.
+    
+    Returns:
+        Emitted/rate-limited/sampled record counts, the noisiest loggers,
+        per-request log count and bytes, and background writer queue depth
+    """
+    try:
+        return {
+            **get_log_stats(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    
+    except Exception as e:
+        logger.error(f"Error getting logging stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get logging stats: {str(e)}"
+        )
+
+
+@router.get("/traces", dependencies=[Depends(require_admin_token)])
+async def get_recent_traces(
+    limit: int = Query(20, ge=1, le=200),
+    name: Optional[str] = Query(None)
+):
+    """
+    Get recently sampled request traces (newest first).
+    Requires admin token in X-Admin-Token header.
+    
+    Query params:
+        limit: Maximum number of traces to return
+        name: Root span name filter (e.g. "outfit.generate")
+    
+    Returns:
+        Traces with nested spans, durations and attributes, plus sampler stats
+    """
+    return {
+        "traces": tracer.get_recent_traces(limit, name),
+        "stats": tracer.get_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+@router.get("/traces/{trace_id}", dependencies=[Depends(require_admin_token)])
+async def get_trace(trace_id: str):
+    """
+    Get one buffered trace by ID.
+    Requires admin token in X-Admin-Token header.
+    """
+    trace = tracer.get_trace(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trace not found (it may have been evicted)")
+    return trace
+
+
 @router.post("/track/user-journey")
 async def track_user_journey_manual(
     step: UserJourneyStep,
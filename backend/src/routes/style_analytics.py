@@ -11,6 +11,12 @@ import logging
 
 from ..auth.auth_service import get_current_user_id
 from ..config.firebase import db
+from ..services.style_rollup_service import (
+    STYLE_CATEGORIES,
+    merge_rollups,
+    style_rollup_service,
+    top_items,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["style-analytics"])
@@ -47,226 +53,40 @@ async def get_style_report(
             target_year = now.year
             target_month = now.month
         
-        # Calculate month start/end timestamps
         month_start = datetime(target_year, target_month, 1, tzinfo=timezone.utc)
-        if target_month == 12:
-            month_end = datetime(target_year + 1, 1, 1, tzinfo=timezone.utc)
-        else:
-            month_end = datetime(target_year, target_month + 1, 1, tzinfo=timezone.utc)
-        
-        month_start_ts = int(month_start.timestamp())
-        month_end_ts = int(month_end.timestamp())
         
         logger.info(f"Generating style report for user {user_id}, month {target_year}-{target_month:02d}")
         
-        # Calculate previous month for trend comparison
+        # Previous month for trend comparison
         if target_month == 1:
-            prev_month_start = datetime(target_year - 1, 12, 1, tzinfo=timezone.utc)
-            prev_month_end = datetime(target_year, 1, 1, tzinfo=timezone.utc)
+            prev_key = f"{target_year - 1}-12"
         else:
-            prev_month_start = datetime(target_year, target_month - 1, 1, tzinfo=timezone.utc)
-            prev_month_end = datetime(target_year, target_month, 1, tzinfo=timezone.utc)
-        
-        prev_month_start_ts = int(prev_month_start.timestamp())
-        # Use month_start_ts as the end for previous month (it's the same as prev_month_end_ts)
-        
-        # OPTIMIZATION: Fetch all outfits once covering both current and previous month, then filter in memory
-        # Time range: from previous month start to current month end
-        earliest_timestamp = prev_month_start_ts
-        
-        all_outfits = []
-        seen_ids = set()
-        
-        # Helper function to parse timestamp
-        def parse_timestamp(data, field_names):
-            for field in field_names:
-                value = data.get(field)
-                if value is None:
-                    continue
-                if isinstance(value, int):
-                    return value
-                elif isinstance(value, str):
-                    try:
-                        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        return int(dt.timestamp())
-                    except:
-                        continue
-            return None
-        
-        # 1. outfit_history - with time range check
-        outfits_ref = db.collection('outfit_history').where('user_id', '==', user_id)
-        count = 0
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp(
-                outfit_data,
-                ['createdAt', 'created_at', 'date_worn', 'dateWorn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-                    count += 1
-            if count > 5000:
-                break
+            prev_key = f"{target_year}-{target_month - 1:02d}"
+        current_key = f"{target_year}-{target_month:02d}"
         
-        # 2. outfits collection (user_id) - limit query
-        outfits_ref = db.collection('outfits').where('user_id', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp(
-                outfit_data,
-                ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
+        # Both months come from the materialized rollups (two small documents)
+        rollups = style_rollup_service.get_months(user_id, [current_key, prev_key])
+        current_rollup = rollups.get(current_key)
+        prev_rollup = rollups.get(prev_key)
+        total_outfits = current_rollup.get('totalOutfits', 0) if current_rollup else 0
         
-        # 3. outfits collection (userId) - limit query
-        outfits_ref = db.collection('outfits').where('userId', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp(
-                outfit_data,
-                ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-        
-        # 4. user subcollection - limit query
-        try:
-            user_outfits_ref = db.collection('users').document(user_id).collection('outfits').limit(2000)
-            for doc in user_outfits_ref.stream():
-                outfit_data = doc.to_dict()
-                timestamp = parse_timestamp(
-                    outfit_data,
-                    ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-                )
-                if timestamp and timestamp >= earliest_timestamp:
-                    outfit_id = outfit_data.get('id') or doc.id
-                    if outfit_id not in seen_ids:
-                        all_outfits.append(outfit_data)
-                        seen_ids.add(outfit_id)
-        except Exception as e:
-            logger.warning(f"Could not check user subcollection: {e}")
-        
-        # 5. daily_outfit_suggestions - limit query
-        try:
-            suggestions_ref = db.collection('daily_outfit_suggestions').where('user_id', '==', user_id).limit(1000)
-            for doc in suggestions_ref.stream():
-                suggestion_data = doc.to_dict()
-                timestamp = parse_timestamp(
-                    suggestion_data,
-                    ['createdAt', 'created_at', 'date', 'suggestion_date']
-                )
-                if timestamp and timestamp >= earliest_timestamp:
-                    if 'outfit' in suggestion_data:
-                        outfit_data = suggestion_data.get('outfit', {})
-                        outfit_id = outfit_data.get('id') or doc.id
-                        if outfit_id not in seen_ids:
-                            outfit_data['id'] = outfit_id
-                            outfit_data['user_id'] = user_id
-                            all_outfits.append(outfit_data)
-                            seen_ids.add(outfit_id)
-        except Exception as e:
-            logger.warning(f"Could not check daily suggestions: {e}")
-        
-        logger.info(f"Fetched {len(all_outfits)} outfits in time range, now filtering by month")
-        
-        # Filter outfits for current month
-        outfits = []
-        for outfit_data in all_outfits:
-            timestamp = parse_timestamp(
-                outfit_data,
-                ['createdAt', 'created_at', 'date_worn', 'dateWorn', 'lastWorn', 'last_worn', 'date', 'suggestion_date']
-            )
-            if timestamp and month_start_ts <= timestamp < month_end_ts:
-                outfits.append(outfit_data)
-        
-        # Filter outfits for previous month
-        prev_outfits = []
-        for outfit_data in all_outfits:
-            timestamp = parse_timestamp(
-                outfit_data,
-                ['createdAt', 'created_at', 'date_worn', 'dateWorn', 'lastWorn', 'last_worn', 'date', 'suggestion_date']
-            )
-            if timestamp and prev_month_start_ts <= timestamp < month_start_ts:
-                prev_outfits.append(outfit_data)
-        
-        logger.info(f"Total unique outfits found for the month: {len(outfits)}, previous month: {len(prev_outfits)}")
+        logger.info(f"Total outfits for the month: {total_outfits}, previous month: {prev_rollup.get('totalOutfits', 0) if prev_rollup else 0}")
         
         # If still no outfits, analyze wardrobe and profile data
-        use_wardrobe_fallback = len(outfits) == 0
+        use_wardrobe_fallback = total_outfits == 0
         
-        # Analyze style breakdown
-        style_counter = Counter()
-        color_counter = Counter()
+        # Style breakdown, colors and items from the rollup
+        style_counter = Counter((current_rollup or {}).get('styleBreakdown', {}))
+        color_counter = Counter((current_rollup or {}).get('colors', {}))
         item_wear_count = defaultdict(int)
         item_details = {}
-        
-        for outfit in outfits:
-            # Count style/occasion
-            occasion = outfit.get('occasion', 'casual').lower()
-            style = outfit.get('style', 'casual').lower()
-            
-            # Map to standard categories
-            if occasion in ['business', 'business casual', 'work', 'professional']:
-                style_counter['business'] += 1
-            elif occasion in ['formal', 'black tie', 'wedding']:
-                style_counter['formal'] += 1
-            elif occasion in ['athletic', 'sport', 'gym', 'workout']:
-                style_counter['athletic'] += 1
-            else:
-                style_counter['casual'] += 1
-            
-            # Count colors from items
-            items = outfit.get('items', [])
-            for item in items:
-                if isinstance(item, dict):
-                    color = item.get('color', '').strip()
-                    if color:
-                        color_counter[color] += 1
-                    
-                    item_id = item.get('id') or item.get('itemId')
-                    item_name = item.get('name', 'Unknown')
-                    if item_id:
-                        item_wear_count[item_id] += 1
-                        if item_id not in item_details:
-                            item_details[item_id] = {
-                                'id': item_id,
-                                'name': item_name,
-                                'imageUrl': item.get('imageUrl') or item.get('image_url')
-                            }
-        
-        # Get top items
-        top_items = sorted(
-            [
-                {
-                    **item_details[item_id],
-                    'wearCount': count
-                }
-                for item_id, count in item_wear_count.items()
-            ],
-            key=lambda x: x['wearCount'],
-            reverse=True
-        )[:5]
-        
-        # Get top colors
-        total_color_uses = sum(color_counter.values())
-        top_colors = [
-            {
-                'color': color,
-                'count': count,
-                'percentage': round((count / total_color_uses) * 100, 1) if total_color_uses > 0 else 0
+        for item in top_items(current_rollup, limit=5):
+            item_wear_count[item['id']] = item['wearCount']
+            item_details[item['id']] = {
+                'id': item['id'],
+                'name': item.get('name', 'Unknown'),
+                'imageUrl': item.get('imageUrl')
             }
-            for color, count in color_counter.most_common(5)
-        ]
         
         # Calculate trends (compare with previous month)
         trends = {
@@ -275,31 +95,8 @@ async def get_style_report(
             'stable': []
         }
         
-        # Get previous month data for comparison
-        if target_month == 1:
-            prev_month_start = datetime(target_year - 1, 12, 1, tzinfo=timezone.utc)
-            prev_month_end = datetime(target_year, 1, 1, tzinfo=timezone.utc)
-        else:
-            prev_month_start = datetime(target_year, target_month - 1, 1, tzinfo=timezone.utc)
-            prev_month_end = datetime(target_year, target_month, 1, tzinfo=timezone.utc)
-        
-        prev_month_start_ts = int(prev_month_start.timestamp())
-        
-        # Previous month outfits are already filtered above from all_outfits
-        prev_style_counter = Counter()
-        for outfit in prev_outfits:
-            occasion = outfit.get('occasion', 'casual').lower()
-            if occasion in ['business', 'business casual', 'work', 'professional']:
-                prev_style_counter['business'] += 1
-            elif occasion in ['formal', 'black tie', 'wedding']:
-                prev_style_counter['formal'] += 1
-            elif occasion in ['athletic', 'sport', 'gym', 'workout']:
-                prev_style_counter['athletic'] += 1
-            else:
-                prev_style_counter['casual'] += 1
-        
-            # Compare trends
-        for style in ['casual', 'business', 'formal', 'athletic']:
+        prev_style_counter = Counter((prev_rollup or {}).get('styleBreakdown', {}))
+        for style in STYLE_CATEGORIES:
             current = style_counter[style]
             previous = prev_style_counter[style]
             
@@ -382,13 +179,37 @@ async def get_style_report(
             except Exception as e:
                 logger.warning(f"Could not fetch user profile: {e}")
         
+        # Get top items
+        top_worn_items = sorted(
+            [
+                {
+                    **item_details[item_id],
+                    'wearCount': count
+                }
+                for item_id, count in item_wear_count.items()
+            ],
+            key=lambda x: x['wearCount'],
+            reverse=True
+        )[:5]
+        
+        # Get top colors
+        total_color_uses = sum(color_counter.values())
+        top_colors = [
+            {
+                'color': color,
+                'count': count,
+                'percentage': round((count / total_color_uses) * 100, 1) if total_color_uses > 0 else 0
+            }
+            for color, count in color_counter.most_common(5)
+        ]
+        
         # Build response
         month_name = month_start.strftime('%B')
         
         return {
             'month': month_name,
             'year': target_year,
-            'totalOutfits': len(outfits),
+            'totalOutfits': total_outfits,
             'styleBreakdown': {
                 'casual': style_counter['casual'],
                 'business': style_counter['business'],
@@ -396,7 +217,7 @@ async def get_style_report(
                 'athletic': style_counter['athletic']
             },
             'colorPalette': top_colors,
-            'topItems': top_items,
+            'topItems': top_worn_items,
             'trends': trends
         }
         
@@ -419,133 +240,30 @@ async def get_style_trends(
         now = datetime.now(timezone.utc)
         trend_data = []
         
-        # Helper function to parse timestamp
-        def parse_timestamp_trends(data, field_names):
-            for field in field_names:
-                value = data.get(field)
-                if value is None:
-                    continue
-                if isinstance(value, int):
-                    return value
-                elif isinstance(value, str):
-                    try:
-                        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        return int(dt.timestamp())
-                    except:
-                        continue
-            return None
-        
-        # OPTIMIZATION: Only fetch outfits from the last N months (where N = months parameter + 1 for safety)
-        # Calculate the earliest date we need
-        earliest_date = now - timedelta(days=30 * (months + 1))
-        earliest_timestamp = int(earliest_date.timestamp())
-        
-        logger.info(f"Fetching outfits for user {user_id} from last {months} months (since {earliest_date.date()})")
-        all_outfits = []
-        seen_ids = set()
-        
-        # Helper to check if outfit is in our time range
-        def is_in_time_range(outfit_data, field_names):
-            timestamp = parse_timestamp_trends(outfit_data, field_names)
-            return timestamp and timestamp >= earliest_timestamp
-        
-        # 1. outfit_history - only fetch recent ones
-        outfits_ref = db.collection('outfit_history').where('user_id', '==', user_id)
-        count = 0
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            # Quick check: if createdAt/date_worn exists and is too old, skip
-            if is_in_time_range(outfit_data, ['createdAt', 'created_at', 'date_worn', 'dateWorn']):
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-                    count += 1
-            # Limit to prevent infinite loops - if we've checked 5000 and found enough, stop
-            if count > 5000:
-                break
-        
-        # 2. outfits collection (user_id) - limit query
-        outfits_ref = db.collection('outfits').where('user_id', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            if is_in_time_range(outfit_data, ['createdAt', 'created_at', 'lastWorn', 'last_worn']):
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-        
-        # 3. outfits collection (userId) - limit query
-        outfits_ref = db.collection('outfits').where('userId', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            if is_in_time_range(outfit_data, ['createdAt', 'created_at', 'lastWorn', 'last_worn']):
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-        
-        # 4. user subcollection - limit query
-        try:
-            user_outfits_ref = db.collection('users').document(user_id).collection('outfits').limit(2000)
-            for doc in user_outfits_ref.stream():
-                outfit_data = doc.to_dict()
-                if is_in_time_range(outfit_data, ['createdAt', 'created_at', 'lastWorn', 'last_worn']):
-                    outfit_id = outfit_data.get('id') or doc.id
-                    if outfit_id not in seen_ids:
-                        all_outfits.append(outfit_data)
-                        seen_ids.add(outfit_id)
-        except Exception as e:
-            logger.warning(f"Could not fetch user subcollection: {e}")
+        # Month keys oldest -> newest, read from the materialized rollups
+        month_dates = []
+        for i in range(months - 1, -1, -1):
+            target_date = now - timedelta(days=30 * i)
+            month_dates.append((f"{target_date.year}-{target_date.month:02d}", target_date))
+        rollups = style_rollup_service.get_months(user_id, [key for key, _ in month_dates])
         
-        logger.info(f"Fetched {len(all_outfits)} outfits in time range, now filtering by month")
+        logger.info(f"Loaded {sum(1 for r in rollups.values() if r)} of {months} monthly style rollups for user {user_id}")
         
-        # Get wardrobe data once (for fallback) - limit to reasonable amount
-        wardrobe_ref = db.collection('wardrobe').where('userId', '==', user_id).limit(1000)
+        # Wardrobe is only needed as a fallback for months without outfits
         wardrobe_items = []
-        for doc in wardrobe_ref.stream():
-            wardrobe_items.append(doc.to_dict())
+        if any(not (rollups.get(key) or {}).get('totalOutfits') for key, _ in month_dates):
+            wardrobe_ref = db.collection('wardrobe').where('userId', '==', user_id).limit(1000)
+            for doc in wardrobe_ref.stream():
+                wardrobe_items.append(doc.to_dict())
         
-        # Now process each month using the pre-fetched data
-        for i in range(months - 1, -1, -1):
-            target_date = now - timedelta(days=30 * i)
-            month_key = f"{target_date.year}-{target_date.month:02d}"
-            
-            # Get report for this month
+        for month_key, target_date in month_dates:
             month_start = datetime(target_date.year, target_date.month, 1, tzinfo=timezone.utc)
-            if target_date.month == 12:
-                month_end = datetime(target_date.year + 1, 1, 1, tzinfo=timezone.utc)
-            else:
-                month_end = datetime(target_date.year, target_date.month + 1, 1, tzinfo=timezone.utc)
-            
-            month_start_ts = int(month_start.timestamp())
-            month_end_ts = int(month_end.timestamp())
-            
-            # Filter outfits for this month from pre-fetched data
-            outfits = []
-            for outfit_data in all_outfits:
-                timestamp = parse_timestamp_trends(
-                    outfit_data,
-                    ['createdAt', 'created_at', 'date_worn', 'dateWorn', 'lastWorn', 'last_worn']
-                )
-                if timestamp and month_start_ts <= timestamp < month_end_ts:
-                    outfits.append(outfit_data)
-            
-            # Count styles
-            style_counter = Counter()
-            for outfit in outfits:
-                occasion = outfit.get('occasion', 'casual').lower()
-                if occasion in ['business', 'business casual', 'work', 'professional']:
-                    style_counter['business'] += 1
-                elif occasion in ['formal', 'black tie', 'wedding']:
-                    style_counter['formal'] += 1
-                elif occasion in ['athletic', 'sport', 'gym', 'workout']:
-                    style_counter['athletic'] += 1
-                else:
-                    style_counter['casual'] += 1
+            rollup = rollups.get(month_key) or {}
+            outfit_count = rollup.get('totalOutfits', 0)
+            style_counter = Counter(rollup.get('styleBreakdown', {}))
             
             # If no outfits, use wardrobe data for this month (from pre-fetched data)
-            if len(outfits) == 0:
+            if outfit_count == 0:
                 wardrobe_count = len(wardrobe_items)
                 for item in wardrobe_items:
                     # Infer style from wardrobe
@@ -564,7 +282,7 @@ async def get_style_trends(
                 # Estimate outfits based on wardrobe size (assume 1 outfit per 3 items)
                 estimated_outfits = max(1, wardrobe_count // 3)
             else:
-                estimated_outfits = len(outfits)
+                estimated_outfits = outfit_count
             
             trend_data.append({
                 'period': month_start.strftime('%b'),
@@ -600,96 +318,6 @@ async def get_seasonal_comparison(
         now = datetime.now(timezone.utc)
         target_year = year or now.year
         
-        # Calculate time range we need (from earliest season to latest)
-        earliest_season_start = datetime(target_year, 3, 1, tzinfo=timezone.utc)  # Spring
-        earliest_timestamp = int(earliest_season_start.timestamp())
-        
-        logger.info(f"Fetching outfits for seasonal comparison, year {target_year}")
-        
-        # OPTIMIZATION: Fetch all outfits once, then filter by season in memory
-        all_outfits = []
-        seen_ids = set()
-        
-        def parse_timestamp_seasonal(data, field_names):
-            for field in field_names:
-                value = data.get(field)
-                if value is None:
-                    continue
-                if isinstance(value, int):
-                    return value
-                elif isinstance(value, str):
-                    try:
-                        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        return int(dt.timestamp())
-                    except:
-                        continue
-            return None
-        
-        # 1. outfit_history - with time range check
-        outfits_ref = db.collection('outfit_history').where('user_id', '==', user_id)
-        count = 0
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp_seasonal(
-                outfit_data,
-                ['createdAt', 'created_at', 'date_worn', 'dateWorn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-                    count += 1
-            if count > 5000:
-                break
-        
-        # 2. outfits collection (user_id) - limit query
-        outfits_ref = db.collection('outfits').where('user_id', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp_seasonal(
-                outfit_data,
-                ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-        
-        # 3. outfits collection (userId) - limit query
-        outfits_ref = db.collection('outfits').where('userId', '==', user_id).limit(2000)
-        for doc in outfits_ref.stream():
-            outfit_data = doc.to_dict()
-            timestamp = parse_timestamp_seasonal(
-                outfit_data,
-                ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-            )
-            if timestamp and timestamp >= earliest_timestamp:
-                outfit_id = outfit_data.get('id') or doc.id
-                if outfit_id not in seen_ids:
-                    all_outfits.append(outfit_data)
-                    seen_ids.add(outfit_id)
-        
-        # 4. user subcollection - limit query
-        try:
-            user_outfits_ref = db.collection('users').document(user_id).collection('outfits').limit(2000)
-            for doc in user_outfits_ref.stream():
-                outfit_data = doc.to_dict()
-                timestamp = parse_timestamp_seasonal(
-                    outfit_data,
-                    ['createdAt', 'created_at', 'lastWorn', 'last_worn']
-                )
-                if timestamp and timestamp >= earliest_timestamp:
-                    outfit_id = outfit_data.get('id') or doc.id
-                    if outfit_id not in seen_ids:
-                        all_outfits.append(outfit_data)
-                        seen_ids.add(outfit_id)
-        except Exception as e:
-            logger.warning(f"Could not fetch user subcollection: {e}")
-        
-        logger.info(f"Fetched {len(all_outfits)} outfits for seasonal comparison")
-        
         # Define seasons
         current_month = now.month
         seasons = {
@@ -702,47 +330,31 @@ async def get_seasonal_comparison(
         if current_month == 12 and target_year == now.year:
             seasons['Winter'] = (datetime(target_year, 12, 1, tzinfo=timezone.utc), datetime(target_year + 1, 3, 1, tzinfo=timezone.utc))
         
+        # Every month the seasons cover (Mar of target year through Feb of the next)
+        season_months = {}
+        for season_name, (start_date, end_date) in seasons.items():
+            keys = []
+            cursor = start_date
+            while cursor < end_date:
+                keys.append(f"{cursor.year}-{cursor.month:02d}")
+                cursor = datetime(cursor.year + (cursor.month == 12), cursor.month % 12 + 1, 1, tzinfo=timezone.utc)
+            season_months[season_name] = keys
+        
+        logger.info(f"Loading monthly style rollups for seasonal comparison, year {target_year}")
+        rollups = style_rollup_service.get_months(
+            user_id, [key for keys in season_months.values() for key in keys]
+        )
+        
         seasonal_data = []
         
-        # Now process each season using pre-fetched data
         for season_name, (start_date, end_date) in seasons.items():
-            start_ts = int(start_date.timestamp())
-            end_ts = int(end_date.timestamp())
-            
-            outfits = []
-            color_counter = Counter()
-            
-            # Filter outfits for this season from pre-fetched data
-            for outfit_data in all_outfits:
-                timestamp = parse_timestamp_seasonal(
-                    outfit_data,
-                    ['createdAt', 'created_at', 'date_worn', 'dateWorn', 'lastWorn', 'last_worn']
-                )
-                if timestamp and start_ts <= timestamp < end_ts:
-                    outfits.append(outfit_data)
-                    # Count colors
-                    for item in outfit_data.get('items', []):
-                        if isinstance(item, dict):
-                            color = item.get('color', '').strip()
-                            if color:
-                                color_counter[color] += 1
-            
-            # Count styles
-            style_counter = Counter()
-            for outfit in outfits:
-                occasion = outfit.get('occasion', 'casual').lower()
-                if occasion in ['business', 'business casual', 'work', 'professional']:
-                    style_counter['business'] += 1
-                elif occasion in ['formal', 'black tie', 'wedding']:
-                    style_counter['formal'] += 1
-                elif occasion in ['athletic', 'sport', 'gym', 'workout']:
-                    style_counter['athletic'] += 1
-                else:
-                    style_counter['casual'] += 1
+            season = merge_rollups(rollups.get(key) for key in season_months[season_name])
+            style_counter = Counter(season['styleBreakdown'])
+            color_counter = Counter(season['colors'])
             
             # Calculate average outfits per week
             weeks = (end_date - start_date).days / 7
-            avg_outfits = len(outfits) / weeks if weeks > 0 else 0
+            avg_outfits = season['totalOutfits'] / weeks if weeks > 0 else 0
             
             seasonal_data.append({
                 'season': season_name,
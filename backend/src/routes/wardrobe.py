@@ -159,76 +159,9 @@ async def get_top_worn_items(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        # Query all wardrobe items for the user, ordered by wear count
-        query = db.collection('wardrobe').where('userId', '==', current_user.id)
-        docs = query.stream()
-        
-        items = []
-        for doc in docs:
-            item_data = doc.to_dict()
-            item_data['id'] = doc.id
-            items.append(item_data)
-        
-        # Sort by wear count (descending) and take top items
-        items.sort(key=lambda x: safe_get(x, 'wearCount', 0), reverse=True)
-        top_items = items[:limit]
-        
-        # Calculate statistics
-        total_items = len(items)
-        total_wear_count = sum(safe_get(item, 'wearCount', 0) for item in items)
-        avg_wear_count = total_wear_count / total_items if total_items > 0 else 0
-        
-        # Get items with no wear (unworn items)
-        unworn_items = [item for item in items if safe_get(item, 'wearCount', 0) == 0]
-        
-        # Get items worn this week (last 7 days)
-        from datetime import datetime, timedelta, timezone
-        week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_items = []
-        for item in items:
-            last_worn = safe_get(item, 'lastWorn')
-            if last_worn:
-                try:
-                    if isinstance(last_worn, datetime):
-                        item_date = last_worn
-                    elif isinstance(last_worn, str):
-                        item_date = datetime.fromisoformat(last_worn.replace('Z', '+00:00'))
-                    elif isinstance(last_worn, (int, float)):
-                        item_date = datetime.fromtimestamp(last_worn, tz=timezone.utc)
-                    else:
-                        continue
-                    
-                    # Ensure both dates are timezone-aware
-                    if item_date.tzinfo is None:
-                        item_date = item_date.replace(tzinfo=timezone.utc)
-                    if week_ago.tzinfo is None:
-                        week_ago = week_ago.replace(tzinfo=timezone.utc)
-                    
-                    if item_date > week_ago:
-                        recent_items.append(item)
-                except (ValueError, TypeError):
-                    continue
-        
-        stats = {
-            "total_items": total_items,
-            "total_wear_count": total_wear_count,
-            "avg_wear_count": round(avg_wear_count, 2),
-            "unworn_items_count": len(unworn_items),
-            "recently_worn_count": len(recent_items),
-            "top_worn_items": [
-                {
-                    "id": item['id'],
-                    "name": safe_get(item, 'name', 'Unknown'),
-                    "type": safe_get(item, 'type', 'Unknown'),
-                    "color": safe_get(item, 'color', 'Unknown'),
-                    "wear_count": safe_get(item, 'wearCount', 0),
-                    "last_worn": safe_get(item, 'lastWorn'),
-                    "is_favorite": safe_get(item, 'isFavorite', False),
-                    "image_url": safe_get(item, 'imageUrl') or safe_get(item, 'image_url') or safe_get(item, 'image')
-                }
-                for item in top_items
-            ]
-        }
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        stats = wardrobe_analytics_engine.top_worn(current_user.id, limit)
+        top_items = stats["top_worn_items"]
         
         logger.info(f"Retrieved top worn items for user {current_user.id}: {len(top_items)} items")
         
@@ -253,72 +186,8 @@ async def get_most_worn_by_category(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        # Query all wardrobe items for the user
-        query = db.collection('wardrobe').where('userId', '==', current_user.id)
-        docs = query.stream()
-        
-        items = []
-        for doc in docs:
-            item_data = doc.to_dict()
-            item_data['id'] = doc.id
-            items.append(item_data)
-        
-        # Group items by category
-        categories = {}
-        for item in items:
-            item_type = (item.get('type', 'Unknown') if item else 'Unknown').lower()
-            
-            # Map item types to categories
-            if any(word in item_type for word in ['shirt', 'blouse', 'sweater', 'jacket', 'coat', 'hoodie', 'tank', 'tee']):
-                category = 'tops'
-            elif any(word in item_type for word in ['pants', 'jeans', 'shorts', 'skirt', 'leggings', 'trousers']):
-                category = 'bottoms'
-            elif any(word in item_type for word in ['shoes', 'boots', 'sneakers', 'heels', 'flats', 'sandals']):
-                category = 'shoes'
-            elif any(word in item_type for word in ['dress', 'jumpsuit', 'romper']):
-                category = 'dresses'
-            elif any(word in item_type for word in ['accessory', 'jewelry', 'bag', 'scarf', 'hat', 'belt']):
-                category = 'accessories'
-            else:
-                category = 'other'
-            
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(item)
-        
-        # Get top worn item for each category
-        most_worn_by_category = {}
-        for category, category_items in categories.items():
-            if category_items:
-                # Sort by wear count and get the most worn
-                category_items.sort(key=lambda x: (x.get('wearCount', 0) if x else 0), reverse=True)
-                most_worn = category_items[0]
-                
-                most_worn_by_category[category] = {
-                    "item": {
-                        "id": most_worn['id'],
-                        "name": (most_worn.get('name', 'Unknown') if most_worn else 'Unknown'),
-                        "type": (most_worn.get('type', 'Unknown') if most_worn else 'Unknown'),
-                        "color": (most_worn.get('color', 'Unknown') if most_worn else 'Unknown'),
-                        "wear_count": (most_worn.get('wearCount', 0) if most_worn else 0),
-                        "last_worn": (most_worn.get('lastWorn') if most_worn else None),
-                        "image_url": (((most_worn.get('imageUrl') if most_worn else None) if most_worn else None) if most_worn else None) or most_worn.get('image_url') or most_worn.get('image')
-                    },
-                    "total_items": len(category_items),
-                    "total_wear_count": sum((item.get('wearCount', 0) if item else 0) for item in category_items),
-                    "avg_wear_count": sum((item.get('wearCount', 0) if item else 0) for item in category_items) / len(category_items) if category_items else 0
-                }
-        
-        # Calculate overall statistics
-        total_items = len(items)
-        total_wear_count = sum((item.get('wearCount', 0) if item else 0) for item in items)
-        
-        stats = {
-            "total_items": total_items,
-            "total_wear_count": total_wear_count,
-            "avg_wear_count": round(total_wear_count / total_items, 2) if total_items > 0 else 0,
-            "categories": most_worn_by_category
-        }
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        stats = wardrobe_analytics_engine.most_worn_by_category(current_user.id)
         
         logger.info(f"Retrieved most worn by category for user {current_user.id}")
         
@@ -343,91 +212,13 @@ async def get_trending_styles(
         if not current_user:
             raise HTTPException(status_code=401, detail="Authentication required")
         
-        # Query user's wardrobe items
-        query = db.collection('wardrobe').where('userId', '==', current_user.id)
-        docs = query.stream()
-        
-        items = [doc.to_dict() for doc in docs]
-        
-        # Analyze style patterns
-        style_counts = {}
-        color_counts = {}
-        type_counts = {}
-        
-        for item in items:
-            # Count styles
-            styles = (item.get('style', []) if item else [])
-            if isinstance(styles, list):
-                for style in styles:
-                    style_counts[style] = (style_counts.get(style, 0) if style_counts else 0) + 1
-            elif isinstance(styles, str):
-                style_counts[styles] = (style_counts.get(styles, 0) if style_counts else 0) + 1
-            
-            # Count colors
-            color = (item.get('color', 'unknown') if item else 'unknown')
-            color_counts[color] = (color_counts.get(color, 0) if color_counts else 0) + 1
-            
-            # Count types
-            item_type = (item.get('type', 'unknown') if item else 'unknown')
-            type_counts[item_type] = (type_counts.get(item_type, 0) if type_counts else 0) + 1
-        
-        # Get top styles, colors, and types
-        top_styles = sorted(style_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_colors = sorted(color_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_types = sorted(type_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Calculate trending score based on wear count and recency
-        trending_items = []
-        for item in items:
-            if item.get('wearCount', 0) > 0:
-                score = item.get('wearCount', 0)
-                if item.get('lastWorn'):
-                    # Add bonus for recent wear
-                    try:
-                        last_worn = (item.get('lastWorn', 0) if item else 0)
-                        if isinstance(last_worn, (int, float)):
-                            # Already a timestamp
-                            days_since_worn = (int(time.time()) - last_worn) / (24 * 60 * 60)
-                        else:
-                            # Convert datetime to timestamp
-                            from datetime import datetime, timezone
-                            if hasattr(last_worn, 'timestamp'):
-                                days_since_worn = (int(time.time()) - int(last_worn.timestamp())) / (24 * 60 * 60)
-                            else:
-                                # Skip if we can't convert
-                                continue
-                        
-                        if days_since_worn < 7:
-                            score += 2
-                        elif days_since_worn < 30:
-                            score += 1
-                    except (ValueError, TypeError, AttributeError):
-                        # Skip if we can't process the date
-                        pass
-                trending_items.append({
-                    'id': (item.get('id') if item else None),
-                    'name': (item.get('name') if item else None),
-                    'type': (item.get('type') if item else None),
-                    'color': (item.get('color', 'unknown') if item else 'unknown'),
-                    'style': (item.get('style', []) if item else []),
-                    'trending_score': score,
-                    'wear_count': (item.get('wearCount', 0) if item else 0)
-                })
-        
-        # Sort by trending score
-        trending_items.sort(key=lambda x: x['trending_score'], reverse=True)
-        top_trending = trending_items[:10]
-        
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
         result = {
-            "top_styles": [{"style": style, "count": count} for style, count in top_styles],
-            "top_colors": [{"color": color, "count": count} for color, count in top_colors],
-            "top_types": [{"type": type_name, "count": count} for type_name, count in top_types],
-            "trending_items": top_trending,
-            "total_items_analyzed": len(items),
+            **wardrobe_analytics_engine.trending_styles(current_user.id),
             "user_id": current_user.id
         }
         
-        logger.info(f"Retrieved trending styles for user {current_user.id}: {len(items)} items analyzed")
+        logger.info(f"Retrieved trending styles for user {current_user.id}: {result['total_items_analyzed']} items analyzed")
         
         return {
             "success": True,
@@ -441,6 +232,32 @@ async def get_trending_styles(
         logger.error(f"Error getting trending styles: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving trending styles: {str(e)}")
 
+@router.get("/formality-tiers")
+async def get_formality_tiers(
+    current_user: UserProfile = Depends(get_current_user)
+) -> Dict[str, Any]:
+    """Get how many wardrobe items fall in each formality tier used by outfit generation."""
+    try:
+        if not current_user:
+            raise HTTPException(status_code=401, detail="Authentication required")
+        
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        stats = wardrobe_analytics_engine.formality_tiers(current_user.id)
+        
+        logger.info(f"Retrieved formality tiers for user {current_user.id}")
+        
+        return {
+            "success": True,
+            "data": stats,
+            "message": "Formality tiers retrieved successfully"
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting formality tiers: {e}")
+        raise HTTPException(status_code=500, detail=f"Error retrieving formality tiers: {str(e)}")
+
 @router.post("/add")
 async def add_wardrobe_item(
     item_data: Dict[str, Any],
@@ -580,19 +397,21 @@ async def add_wardrobe_item(
         from ..utils.semantic_normalization import normalize_item_metadata
         normalized_item = normalize_item_metadata(wardrobe_item)
         
-        # Save to Firestore
+        # Save to Firestore, with the TVE aggregates in the same batch
+        from ..services.tve_service import tve_service
         doc_ref = db.collection('wardrobe').document(item_id)
-        doc_ref.set(normalized_item)
-        
-        # Atomically increment wardrobe item count in user profile
-        try:
-            user_ref = db.collection('users').document(current_user.id)
-            user_ref.update({
-                'wardrobeItemCount': firestore.Increment(1)
-            })
+        batch = db.batch()
+        batch.set(doc_ref, normalized_item)
+        tve_service.on_item_added(current_user.id, normalized_item, batch=batch)
+        batch.commit()
+        
+        # Transactionally increment wardrobe item count in user profile
+        from ..services.user_counter_service import user_counter_service
+        if user_counter_service.increment(current_user.id, 'wardrobeItemCount', 1) is not None:
             logger.info(f"✅ Incremented wardrobeItemCount for user {current_user.id}")
-        except Exception as count_error:
-            logger.warning(f"⚠️ Failed to increment wardrobeItemCount: {count_error}")
+        
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        wardrobe_analytics_engine.touch_wardrobe(current_user.id)
         
         # Track usage (async, don't fail if it errors)
         try:
@@ -1048,6 +867,11 @@ async def update_wardrobe_item(
         # Update in Firestore
         doc_ref.update(update_data)
         
+        from ..services.tve_service import tve_service
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        tve_service.on_item_updated(current_user.id, item, {**item, **update_data})
+        wardrobe_analytics_engine.touch_wardrobe(current_user.id)
+        
         # Log analytics event
         if ANALYTICS_AVAILABLE:
             # Special handling for favorite toggles - use specific interaction type for ML system
@@ -1129,15 +953,15 @@ async def delete_wardrobe_item(
         # Delete from Firestore
         doc_ref.delete()
         
-        # Atomically decrement wardrobe item count in user profile
-        try:
-            user_ref = db.collection('users').document(current_user.id)
-            user_ref.update({
-                'wardrobeItemCount': firestore.Increment(-1)
-            })
+        # Transactionally decrement wardrobe item count in user profile
+        from ..services.user_counter_service import user_counter_service
+        if user_counter_service.increment(current_user.id, 'wardrobeItemCount', -1) is not None:
             logger.info(f"✅ Decremented wardrobeItemCount for user {current_user.id}")
-        except Exception as count_error:
-            logger.warning(f"⚠️ Failed to decrement wardrobeItemCount: {count_error}")
+        
+        from ..services.tve_service import tve_service
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        tve_service.on_item_removed(current_user.id, item)
+        wardrobe_analytics_engine.touch_wardrobe(current_user.id)
         
         logger.info(f"Wardrobe item deleted: {item_id}")
         
@@ -1254,7 +1078,13 @@ async def increment_wardrobe_item_wear_count(
             'updatedAt': current_timestamp
         }
         
-        doc_ref.update(update_data)
+        from ..services.tve_service import tve_service
+        from ..services.wardrobe_analytics_engine import wardrobe_analytics_engine
+        batch = db.batch()
+        batch.update(doc_ref, update_data)
+        tve_service.on_items_worn(current_user.id, [(item, current_wear_count)], batch=batch)
+        wardrobe_analytics_engine.touch_wardrobe(current_user.id, batch=batch)
+        batch.commit()
         
         # Log analytics event
         if ANALYTICS_AVAILABLE:
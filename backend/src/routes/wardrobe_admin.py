@@ -30,18 +30,9 @@ async def initialize_my_wardrobe_count(
         user_id = current_user.id
         logger.info(f"🔧 Initializing wardrobeItemCount for user: {user_id}")
         
-        # Count their wardrobe items
-        wardrobe_ref = db.collection('wardrobe').where('userId', '==', user_id)
-        items = list(wardrobe_ref.stream())
-        item_count = len(items)
-        
-        logger.info(f"📦 Found {item_count} items for user {user_id}")
-        
-        # Update the user profile with the count
-        user_ref = db.collection('users').document(user_id)
-        user_ref.update({
-            'wardrobeItemCount': item_count
-        })
+        # Count their wardrobe items server-side and store the count
+        from ..services.user_counter_service import user_counter_service
+        item_count = user_counter_service.recount(user_id, 'wardrobeItemCount')
         
         logger.info(f"✅ Set wardrobeItemCount to {item_count} for user {user_id}")
         
@@ -5,8 +5,8 @@ Streaks, Style Tokens (Gacha), and Role Decay
 
 import logging
 import random
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta, time, timezone as tz
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import date, datetime, timedelta, time, timezone as tz
 from zoneinfo import ZoneInfo
 from google.cloud.firestore_v1 import FieldFilter
 from ..config.firebase import db
@@ -17,6 +17,180 @@ from ..custom_types.gamification import (
 
 logger = logging.getLogger(__name__)
 
+# Compact per-user activity state kept on the user doc (``users/{uid}.activity``)
+# so first-log-of-day, streak and decay checks never scan outfit_history.
+# ``daily_counts`` is a ring buffer of outfit logs per local day: slot
+# ``day % ACTIVITY_WINDOW_DAYS`` holds the count for ordinal ``day``, and
+# ``day`` is the newest day the buffer has been advanced to.
+ACTIVITY_FIELD = 'activity'
+ACTIVITY_VERSION = 1
+ACTIVITY_WINDOW_DAYS = 30
+
+
+def user_timezone(user_data: Optional[Dict[str, Any]]) -> Optional[ZoneInfo]:
+    """IANA timezone from a user document's location data, or None (UTC)."""
+    timezone_str = ((user_data or {}).get('location_data') or {}).get('timezone')
+    if not timezone_str:
+        return None
+    try:
+        return ZoneInfo(timezone_str)
+    except Exception as e:
+        logger.warning(f"Invalid timezone {timezone_str}: {e}")
+        return None
+
+
+def local_date(timestamp_ms: int, user_tz: Optional[ZoneInfo] = None) -> date:
+    """Calendar date of a UTC millisecond timestamp in the user's timezone."""
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=tz.utc).astimezone(user_tz or tz.utc).date()
+
+
+def empty_activity() -> Dict[str, Any]:
+    return {
+        'version': ACTIVITY_VERSION,
+        'last_log_date': None,
+        'day': None,
+        'daily_counts': [0] * ACTIVITY_WINDOW_DAYS,
+    }
+
+
+def advance_activity(activity: Dict[str, Any], day: int) -> Dict[str, Any]:
+    """
+    Return a copy of ``activity`` whose ring buffer ends at ``day``.
+
+    Slots for the days skipped since the last advance are zeroed. A ``day``
+    before the current head leaves the buffer as is.
+    """
+    counts = list(activity.get('daily_counts') or [])
+    if len(counts) != ACTIVITY_WINDOW_DAYS:
+        counts = [0] * ACTIVITY_WINDOW_DAYS
+    head = activity.get('day')
+    if head is None or day - head >= ACTIVITY_WINDOW_DAYS:
+        counts = [0] * ACTIVITY_WINDOW_DAYS
+        head = day
+    elif day > head:
+        for skipped in range(head + 1, day + 1):
+            counts[skipped % ACTIVITY_WINDOW_DAYS] = 0
+        head = day
+    return {**activity, 'day': head, 'daily_counts': counts}
+
+
+def activity_count(activity: Optional[Dict[str, Any]], today: int, days: int) -> int:
+    """Outfit logs over the ``days`` local days ending at ``today``."""
+    if not activity or activity.get('day') is None:
+        return 0
+    state = advance_activity(activity, today)
+    end = min(today, state['day'])
+    start = max(end - min(days, ACTIVITY_WINDOW_DAYS) + 1, state['day'] - ACTIVITY_WINDOW_DAYS + 1)
+    counts = state['daily_counts']
+    return sum(counts[day % ACTIVITY_WINDOW_DAYS] for day in range(start, end + 1))
+
+
+def record_activity(activity: Dict[str, Any], log_date: date) -> Dict[str, Any]:
+    """Return ``activity`` with one more log on ``log_date``."""
+    day = log_date.toordinal()
+    state = advance_activity(activity, day)
+    if day > state['day'] - ACTIVITY_WINDOW_DAYS:
+        state['daily_counts'][day % ACTIVITY_WINDOW_DAYS] += 1
+    last_log_date = state.get('last_log_date')
+    if not last_log_date or log_date.isoformat() > last_log_date:
+        state['last_log_date'] = log_date.isoformat()
+    state['version'] = ACTIVITY_VERSION
+    return state
+
+
+def next_streak(streak_data: Optional[Dict[str, Any]], log_date: date, log_timestamp: int) -> Tuple[Dict[str, Any], bool]:
+    """
+    Apply a log on ``log_date`` to the user's ``streak`` map (strict local midnight rule).
+
+    Returns:
+        (updated streak map, whether a running streak was broken)
+    """
+    streak_data = streak_data or {}
+    last_log_date_str = streak_data.get('last_log_date')
+    current_streak_count = streak_data.get('current_streak', 0)
+    longest_streak = streak_data.get('longest_streak', 0)
+    is_broken = False
+
+    if last_log_date_str:
+        try:
+            last_log_date = datetime.strptime(last_log_date_str, '%Y-%m-%d').date()
+            time_difference_days = (log_date - last_log_date).days
+
+            if time_difference_days == 1:
+                # Perfect continuation
+                current_streak_count += 1
+            elif time_difference_days > 1:
+                # Streak broken - reset to 1
+                current_streak_count = 1
+                is_broken = True
+            elif time_difference_days == 0:
+                # Same day - streak count is preserved
+                pass
+            else:
+                # Time traveler or parsing error, start new
+                current_streak_count = 1
+        except Exception as e:
+            logger.warning(f"Error parsing last_log_date {last_log_date_str}: {e}")
+            current_streak_count = 1
+    else:
+        # First ever log - start streak at 1
+        current_streak_count = 1
+
+    longest_streak = max(longest_streak, current_streak_count)
+
+    # Calculate streak multiplier (1.0 + 0.1 per day, max 3.0x)
+    streak_multiplier = min(1.0 + (current_streak_count * 0.1), 3.0)
+
+    return {
+        'current_streak': current_streak_count,
+        'longest_streak': longest_streak,
+        'last_log_date': log_date.isoformat(),
+        'streak_multiplier': streak_multiplier,
+        'updated_at': log_timestamp
+    }, is_broken
+
+
+def apply_outfit_log(user_data: Dict[str, Any], log_timestamp: int, activity: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Compute the user doc update for one outfit log.
+
+    Args:
+        user_data: The user document as read inside the log transaction
+        log_timestamp: The log time (ms)
+        activity: Seeded activity state for users who do not have one yet
+
+    Returns:
+        (fields to update on the user doc, log result)
+    """
+    log_date = local_date(log_timestamp, user_timezone(user_data))
+    previous = user_data.get(ACTIVITY_FIELD) or activity or empty_activity()
+    is_first_log = previous.get('last_log_date') != log_date.isoformat()
+
+    new_activity = record_activity(previous, log_date)
+    streak_data, was_broken = next_streak(user_data.get('streak'), log_date, log_timestamp)
+
+    update = {ACTIVITY_FIELD: new_activity, 'streak': streak_data}
+    pending_xp_bonus = user_data.get('pending_xp_bonus', 0) or 0
+    if pending_xp_bonus > 0:
+        update.update({
+            'pending_xp_bonus': 0,
+            'pending_xp_bonus_source': None,
+            'pending_xp_bonus_earned_at': None
+        })
+
+    today = new_activity['day']
+    return update, {
+        "is_first_log_today": is_first_log,
+        "current_streak": streak_data['current_streak'],
+        "longest_streak": streak_data['longest_streak'],
+        "multiplier": streak_data['streak_multiplier'],
+        "was_broken": was_broken,
+        "last_log_date": streak_data['last_log_date'],
+        "pending_xp_bonus": pending_xp_bonus,
+        "outfits_last_7_days": activity_count(new_activity, today, 7),
+        "outfits_last_30_days": activity_count(new_activity, today, 30),
+    }
+
 
 class AddictionService:
     """Manages the 'Dark Pattern' mechanics: Streaks, Variable Rewards, and Role Decay"""
@@ -117,148 +291,119 @@ class AddictionService:
             if not user_doc.exists:
                 return None
             
-            user_data = user_doc.to_dict()
-            location_data = user_data.get('location_data', {})
-            timezone_str = location_data.get('timezone')
-            
-            if timezone_str:
-                try:
-                    return ZoneInfo(timezone_str)
-                except Exception as e:
-                    logger.warning(f"Invalid timezone {timezone_str} for user {user_id}: {e}")
-                    return None
-            return None
+            return user_timezone(user_doc.to_dict())
             
         except Exception as e:
             logger.error(f"Error getting user timezone: {e}")
             return None
     
+    def seed_activity(self, user_id: str, user_data: Dict[str, Any], today: date) -> Dict[str, Any]:
+        """
+        Build the activity state for a user who has none yet.
+        
+        Past days come from one bounded outfit_history query over the ring
+        buffer window. Today is taken from the streak map, since the log being
+        processed is already in outfit_history when this runs.
+        """
+        from .style_rollup_service import parse_outfit_timestamp
+        
+        user_tz = user_timezone(user_data)
+        activity = empty_activity()
+        activity['day'] = today.toordinal()
+        window_start = datetime.combine(today - timedelta(days=ACTIVITY_WINDOW_DAYS - 1), time.min, tzinfo=user_tz or tz.utc)
+        today_start = datetime.combine(today, time.min, tzinfo=user_tz or tz.utc)
+        
+        try:
+            query = self.db.collection('outfit_history') \
+                .where(filter=FieldFilter('user_id', '==', user_id)) \
+                .where(filter=FieldFilter('created_at', '>=', int(window_start.timestamp() * 1000))) \
+                .where(filter=FieldFilter('created_at', '<', int(today_start.timestamp() * 1000)))
+            for doc in query.stream():
+                timestamp = parse_outfit_timestamp(doc.to_dict() or {}, ['created_at'])
+                if timestamp is None:
+                    continue
+                log_date = local_date(timestamp * 1000, user_tz)
+                activity['daily_counts'][log_date.toordinal() % ACTIVITY_WINDOW_DAYS] += 1
+                if not activity['last_log_date'] or log_date.isoformat() > activity['last_log_date']:
+                    activity['last_log_date'] = log_date.isoformat()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not seed activity counts for user {user_id}: {e}")
+        
+        if (user_data.get('streak') or {}).get('last_log_date') == today.isoformat():
+            activity['daily_counts'][today.toordinal() % ACTIVITY_WINDOW_DAYS] = 1
+            activity['last_log_date'] = today.isoformat()
+        
+        logger.info(f"🌱 Seeded activity state for user {user_id}: {sum(activity['daily_counts'])} logs in the last {ACTIVITY_WINDOW_DAYS} days")
+        return activity
+    
+    def get_user_activity(self, user_id: str, user_data: Dict[str, Any], now_ms: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Return the user's activity state and today's local day ordinal.
+        
+        Users without a state are seeded (and the state stored) once.
+        """
+        if now_ms is None:
+            now_ms = int(datetime.now(tz.utc).timestamp() * 1000)
+        today = local_date(now_ms, user_timezone(user_data))
+        activity = user_data.get(ACTIVITY_FIELD)
+        if not activity:
+            activity = self.seed_activity(user_id, user_data, today)
+            try:
+                self.db.collection('users').document(user_id).update({ACTIVITY_FIELD: activity})
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to store activity state for user {user_id}: {e}")
+        return activity, today.toordinal()
+    
     async def is_first_outfit_today(self, user_id: str, log_timestamp: int) -> bool:
         """
-        Check if this is the first outfit log in user's local day.
+        Check if no outfit has been logged yet in the user's local day.
         Uses strict midnight rule with user's stored IANA timezone.
         
         Args:
             user_id (str): The ID of the user.
-            log_timestamp (int): The timestamp (ms) of the *current* log being processed.
+            log_timestamp (int): The timestamp (ms) of the log being checked.
             
         Returns:
-            bool: True if no previous logs exist for the user's local calendar day.
+            bool: True if the activity state has no log for the user's local calendar day.
         """
         try:
-            # Set default to UTC if no timezone is found
-            user_tz = self.get_user_timezone(user_id) or tz.utc
-            
-            # 1. Convert the current UTC timestamp into the user's local datetime
-            utc_dt = datetime.fromtimestamp(log_timestamp / 1000, tz=tz.utc)
-            local_dt = utc_dt.astimezone(user_tz)
-            
-            # 2. Find the precise moment of local midnight for that day
-            # datetime.combine sets the time to 00:00:00 in the correct timezone
-            local_midnight = datetime.combine(local_dt.date(), time.min, tzinfo=user_tz)
-            
-            # 3. Convert local midnight back to a UTC timestamp (in milliseconds)
-            # This gives us the exact UTC time that represents the start of the user's day
-            utc_midnight_timestamp_ms = int(local_midnight.timestamp() * 1000)
-
-            # 4. Query Firestore efficiently
-            # We look for ANY log by this user, created AFTER their local midnight (in UTC).
-            outfit_history_ref = self.db.collection('outfit_history')
-            query = outfit_history_ref.where(filter=FieldFilter('user_id', '==', user_id)) \
-                                     .where(filter=FieldFilter('created_at', '>=', utc_midnight_timestamp_ms)) \
-                                     .order_by('created_at') \
-                                     .limit(1)
-            
-            # If the query returns a log, it's NOT the first log today.
-            logs = list(query.stream())
-            return len(logs) == 0
+            user_doc = self.db.collection('users').document(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+            activity, today = self.get_user_activity(user_id, user_data, log_timestamp)
+            return activity.get('last_log_date') != date.fromordinal(today).isoformat()
             
         except Exception as e:
             logger.error(f"FATAL ERROR in timezone logic for user {user_id}: {e}", exc_info=True)
             # Fallback: assume it's first if logic fails to prevent token loss
             return True
     
-    async def check_and_update_streak(self, user_id: str, log_timestamp: int, is_first_log_today: bool) -> Dict[str, Any]:
+    def record_outfit_log(self, user_id: str, log_timestamp: int) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
         """
-        Updates the user's streak status based on the strict midnight rule (local time).
-        Returns updated streak status and multiplier.
+        Apply an outfit log to the user's activity state, streak and pending
+        XP bonus in one transaction.
+        
+        Returns:
+            (user document as read, log result from ``apply_outfit_log``),
+            or None if the user does not exist
         """
-        try:
-            user_tz = self.get_user_timezone(user_id) or tz.utc
-            current_log_dt = datetime.fromtimestamp(log_timestamp / 1000, tz=tz.utc).astimezone(user_tz)
-            current_date_str = current_log_dt.strftime('%Y-%m-%d')
-            
-            # Firestore is synchronous - no await needed
-            user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
-            
-            if not user_doc.exists:
-                logger.error(f"User {user_id} not found for streak update")
-                return {"current_streak": 0, "multiplier": 1.0, "was_broken": False}
-            
-            user_data = user_doc.to_dict()
-            streak_data = user_data.get('streak', {})
-            
-            last_log_date_str = streak_data.get('last_log_date')
-            current_streak_count = streak_data.get('current_streak', 0)
-            longest_streak = streak_data.get('longest_streak', 0)
-            is_broken = False
-            
-            if last_log_date_str:
-                try:
-                    last_log_date = datetime.strptime(last_log_date_str, '%Y-%m-%d').date()
-                    current_date = current_log_dt.date()
-                    time_difference_days = (current_date - last_log_date).days
-                    
-                    if time_difference_days == 1:
-                        # Perfect continuation
-                        current_streak_count += 1
-                        if current_streak_count > longest_streak:
-                            longest_streak = current_streak_count
-                    elif time_difference_days > 1:
-                        # Streak broken - reset to 1
-                        current_streak_count = 1
-                        is_broken = True
-                    elif time_difference_days == 0:
-                        # Same day - streak count is preserved
-                        pass
-                    else:
-                        # Time traveler or parsing error, start new
-                        current_streak_count = 1
-                except Exception as e:
-                    logger.warning(f"Error parsing last_log_date {last_log_date_str}: {e}")
-                    current_streak_count = 1
-            else:
-                # First ever log - start streak at 1
-                current_streak_count = 1
-            
-            # Calculate streak multiplier (1.0 + 0.1 per day, max 3.0x)
-            streak_multiplier = min(1.0 + (current_streak_count * 0.1), 3.0)
-            
-            # Update Firestore (synchronous - no await)
-            updated_streak_data = {
-                'current_streak': current_streak_count,
-                'longest_streak': longest_streak,
-                'last_log_date': current_date_str,
-                'streak_multiplier': streak_multiplier,
-                'updated_at': log_timestamp
-            }
-            
-            user_ref.update({'streak': updated_streak_data})
-            
-            logger.info(f"✅ Updated streak for user {user_id}: {current_streak_count} days (multiplier: {streak_multiplier}x)")
-            
-            return {
-                "current_streak": current_streak_count,
-                "longest_streak": longest_streak,
-                "multiplier": streak_multiplier,
-                "was_broken": is_broken,
-                "last_log_date": current_date_str
-            }
-            
-        except Exception as e:
-            logger.error(f"Error updating streak for user {user_id}: {e}", exc_info=True)
-            return {"current_streak": 0, "multiplier": 1.0, "was_broken": True}
+        from firebase_admin import firestore
+        
+        user_ref = self.db.collection('users').document(user_id)
+        
+        @firestore.transactional
+        def _apply(transaction):
+            snapshot = user_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            user_data = snapshot.to_dict() or {}
+            seeded = None
+            if not user_data.get(ACTIVITY_FIELD):
+                seeded = self.seed_activity(user_id, user_data, local_date(log_timestamp, user_timezone(user_data)))
+            update, result = apply_outfit_log(user_data, log_timestamp, seeded)
+            transaction.update(user_ref, update)
+            return user_data, result
+        
+        return _apply(self.db.transaction())
     
     async def process_outfit_log(
         self, 
@@ -270,17 +415,14 @@ class AddictionService:
         Returns the metrics awarded.
         """
         try:
-            # 1. Check if first log today
-            is_first_log = await self.is_first_outfit_today(user_id, log_timestamp)
-            
-            # 2. Get user role and token multiplier from local config
-            user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
-            
-            if not user_doc.exists:
+            # 1. Update activity, streak and pending bonus in one transaction
+            logged = self.record_outfit_log(user_id, log_timestamp)
+            if logged is None:
                 return {"error": "User not found", "tokens_awarded": 0, "xp_awarded": 0}
+            user_data, streak_data = logged
+            is_first_log = streak_data['is_first_log_today']
             
-            user_data = user_doc.to_dict()
+            # 2. Get user role and token multiplier from local config
             role_data = user_data.get('role', {})
             current_role_str = role_data.get('current_role', 'starter')
             
@@ -295,48 +437,39 @@ class AddictionService:
             base_tokens = 50 if is_first_log else 5
             base_xp = 10
             
-            # 4. Update streak and get multiplier
-            streak_data = await self.check_and_update_streak(
-                user_id=user_id,
-                log_timestamp=log_timestamp,
-                is_first_log_today=is_first_log
-            )
+            # 4. Streak multiplier from the updated streak
             xp_multiplier = streak_data.get('multiplier', 1.0)
             
-            # 5. Check for pending XP bonus from gacha pull
-            pending_xp_bonus = user_data.get('pending_xp_bonus', 0)
+            # 5. Apply pending XP bonus from gacha pull (cleared in the log transaction)
+            pending_xp_bonus = streak_data.get('pending_xp_bonus', 0)
             if pending_xp_bonus > 0:
-                # Apply bonus and clear it
                 awarded_xp = int((base_xp + pending_xp_bonus) * xp_multiplier)
-                user_ref.update({
-                    'pending_xp_bonus': 0,
-                    'pending_xp_bonus_source': None,
-                    'pending_xp_bonus_earned_at': None
-                })
                 logger.info(f"✅ Applied pending XP bonus of {pending_xp_bonus} to outfit log")
             else:
                 # Calculate final XP (XP is multiplied by streak)
                 awarded_xp = int(base_xp * xp_multiplier)
             
-            # 6. Award tokens (pass base amount - award_style_tokens applies role multiplier)
-            tokens_result = await self.award_style_tokens(
-                user_id=user_id,
-                action_type="outfit_logged",
-                amount=base_tokens  # Method will apply role multiplier internally
-            )
-            
-            # 7. Award XP (use gamification service)
+            # 6-7. Award tokens and XP in one ledger commit
             from .gamification_service import gamification_service
-            xp_result = await gamification_service.award_xp(
-                user_id=user_id,
-                amount=awarded_xp,  # Already multiplied by streak
-                reason="outfit_logged",
-                metadata={
-                    "log_timestamp": log_timestamp,
-                    "is_first_log_today": is_first_log,
-                    "streak_multiplier": xp_multiplier
-                }
-            )
+            async with gamification_service.xp_ledger(user_id) as ledger:
+                # The ledger reuses the user document read by the log transaction
+                ledger.prime(user_data)
+                # Pass base amount - award_style_tokens applies role multiplier
+                tokens_result = await self.award_style_tokens(
+                    user_id=user_id,
+                    action_type="outfit_logged",
+                    amount=base_tokens
+                )
+                xp_result = await gamification_service.award_xp(
+                    user_id=user_id,
+                    amount=awarded_xp,  # Already multiplied by streak
+                    reason="outfit_logged",
+                    metadata={
+                        "log_timestamp": log_timestamp,
+                        "is_first_log_today": is_first_log,
+                        "streak_multiplier": xp_multiplier
+                    }
+                )
             
             # 8. Return metrics
             return {
@@ -347,6 +480,7 @@ class AddictionService:
                 "is_first_log_today": is_first_log,
                 "current_streak": streak_data.get('current_streak', 0),
                 "streak_multiplier": xp_multiplier,
+                "outfits_last_7_days": streak_data.get('outfits_last_7_days', 0),
                 "role_multiplier": token_multiplier,
                 "level_up": xp_result.get('level_up', False),
                 "new_level": xp_result.get('level', 1)
@@ -370,14 +504,20 @@ class AddictionService:
             if amount is None:
                 amount = self.TOKEN_EARN_RATES.get(action_type, 0)
             
-            # Get user role to apply multiplier
-            user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
+            from .gamification_service import active_ledger, gamification_service
             
-            if not user_doc.exists:
+            # Tokens are committed through the XP ledger (Increment, no lost updates)
+            ledger = active_ledger(user_id)
+            if ledger is not None:
+                user_data = ledger.user_data
+            else:
+                user_doc = self.db.collection('users').document(user_id).get()
+                user_data = user_doc.to_dict() if user_doc.exists else None
+            
+            if user_data is None:
                 return {"error": "User not found"}
             
-            user_data = user_doc.to_dict()
+            # Get user role to apply multiplier
             role_data = user_data.get('role', {})
             current_role_str = role_data.get('current_role', 'starter')
             
@@ -391,20 +531,12 @@ class AddictionService:
             # Apply multiplier
             final_amount = int(amount * token_multiplier)
             
-            # Get current token balance
-            tokens_data = user_data.get('style_tokens', {})
-            current_balance = tokens_data.get('balance', 0)
-            total_earned = tokens_data.get('total_earned', 0)
-            
             # Update tokens
-            updated_tokens_data = {
-                'balance': current_balance + final_amount,
-                'total_earned': total_earned + final_amount,
-                'total_spent': tokens_data.get('total_spent', 0),
-                'last_earned_at': datetime.now().isoformat()
-            }
-            
-            user_ref.update({'style_tokens': updated_tokens_data})
+            async with gamification_service.xp_ledger(user_id) as ledger:
+                ledger.add_tokens(final_amount)
+                new_balance = (user_data.get('style_tokens') or {}).get('balance', 0) + ledger.tokens
+            if ledger.result and 'token_balance' in ledger.result:
+                new_balance = ledger.result['token_balance']
             
             logger.info(f"🪙 Awarded {final_amount} tokens ({amount} base × {token_multiplier}x role multiplier) to user {user_id}")
             
@@ -412,7 +544,7 @@ class AddictionService:
                 "tokens_awarded": final_amount,
                 "base_amount": amount,
                 "multiplier": token_multiplier,
-                "new_balance": updated_tokens_data['balance']
+                "new_balance": new_balance
             }
             
         except Exception as e:
@@ -647,7 +779,7 @@ class AddictionService:
             
             # Get user stats
             # Count total outfits logged
-            outfit_count = await self.get_user_outfit_count(user_id)
+            outfit_count = await self.get_user_outfit_count(user_id, user_data)
             
             # Get streak
             streak_data = user_data.get('streak', {})
@@ -704,15 +836,9 @@ class AddictionService:
             outfits_per_week = maintenance_req['outfits_per_week']
             grace_period_days = maintenance_req['grace_period_days']
             
-            # Check outfits logged in last 7 days
-            seven_days_ago = datetime.now() - timedelta(days=7)
-            seven_days_ago_ts = int(seven_days_ago.timestamp() * 1000)
-            
-            from google.cloud.firestore_v1 import FieldFilter
-            outfit_history_ref = self.db.collection('outfit_history')
-            query = outfit_history_ref.where(filter=FieldFilter('user_id', '==', user_id)).where(filter=FieldFilter('date_worn', '>=', seven_days_ago_ts))
-            recent_outfits = list(query.stream())
-            outfits_count = len(recent_outfits)
+            # Check outfits logged in last 7 days (from the activity ring buffer)
+            activity, today = self.get_user_activity(user_id, user_data)
+            outfits_count = activity_count(activity, today, 7)
             
             if outfits_count < outfits_per_week:
                 # Check if in grace period
@@ -767,7 +893,7 @@ class AddictionService:
             # Check if user is in recovery mode (easier path back to Master)
             recovery_data = role_data.get('recovery', {})
             if recovery_data.get('in_recovery'):
-                recovery_result = await self.check_role_recovery(user_id, recovery_data, outfits_count)
+                recovery_result = await self.check_role_recovery(user_id, recovery_data, outfits_count, activity)
                 if recovery_result.get('recovered'):
                     return {
                         "demoted": False,
@@ -795,10 +921,19 @@ class AddictionService:
             logger.error(f"Error checking Master decay for user {user_id}: {e}", exc_info=True)
             return None
     
-    async def check_role_recovery(self, user_id: str, recovery_data: Dict[str, Any], outfits_this_week: int) -> Dict[str, Any]:
+    async def check_role_recovery(
+        self,
+        user_id: str,
+        recovery_data: Dict[str, Any],
+        outfits_this_week: int,
+        activity: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Check if user in recovery mode has completed requirements to regain Master status.
         Recovery requires: 2 weeks of 5 outfits each (10 total, easier than normal maintenance).
+        
+        With ``activity``, weekly outfit counts are read from the ring buffer
+        instead of being counted one check at a time.
         """
         try:
             recovery_started_at_str = recovery_data.get('recovery_started_at')
@@ -822,16 +957,24 @@ class AddictionService:
             else:
                 recovery_week_start = week_start
             
+            week_start_day = week_start.date().toordinal()
+            today = current_date.date().toordinal()
+            
             # Check if new week started
-            if week_start > recovery_week_start:
+            if week_start > recovery_week_start.replace(tzinfo=None):
                 # Previous week ended - check if goal was met
-                prev_week_outfits = recovery_data.get('recovery_outfits_this_week', 0)
+                if activity is not None:
+                    prev_week_outfits = activity_count(activity, week_start_day - 1, 7)
+                else:
+                    prev_week_outfits = recovery_data.get('recovery_outfits_this_week', 0)
                 if prev_week_outfits >= 5:
                     # Week goal met - increment weeks completed
                     weeks_completed = recovery_data.get('recovery_weeks_completed', 0) + 1
                     recovery_data['recovery_weeks_completed'] = weeks_completed
                     recovery_data['recovery_week_start'] = week_start.isoformat()
                     recovery_data['recovery_outfits_this_week'] = 1  # Current outfit counts for new week
+                    if activity is not None:
+                        recovery_data['recovery_outfits_this_week'] = activity_count(activity, today, today - week_start_day + 1)
                     
                     # Check if recovery complete (2 weeks done)
                     if weeks_completed >= 2:
@@ -859,6 +1002,11 @@ class AddictionService:
                     recovery_data['recovery_weeks_completed'] = 0
                     recovery_data['recovery_week_start'] = week_start.isoformat()
                     recovery_data['recovery_outfits_this_week'] = 1
+                    if activity is not None:
+                        recovery_data['recovery_outfits_this_week'] = activity_count(activity, today, today - week_start_day + 1)
+            elif activity is not None:
+                # Same week - read this week's count
+                recovery_data['recovery_outfits_this_week'] = activity_count(activity, today, today - week_start_day + 1)
             else:
                 # Same week - increment outfit count
                 recovery_data['recovery_outfits_this_week'] = recovery_data.get('recovery_outfits_this_week', 0) + 1
@@ -879,14 +1027,11 @@ class AddictionService:
             logger.error(f"Error checking role recovery for user {user_id}: {e}", exc_info=True)
             return {"recovered": False, "error": str(e)}
     
-    async def get_user_outfit_count(self, user_id: str) -> int:
+    async def get_user_outfit_count(self, user_id: str, user_data: Optional[Dict[str, Any]] = None) -> int:
         """Get total number of outfits logged by user"""
         try:
-            from google.cloud.firestore_v1 import FieldFilter
-            outfit_history_ref = self.db.collection('outfit_history')
-            query = outfit_history_ref.where(filter=FieldFilter('user_id', '==', user_id))
-            outfits = list(query.stream())
-            return len(outfits)
+            from .user_counter_service import user_counter_service
+            return user_counter_service.get_count(user_id, 'outfitsLoggedCount', user_data)
         except Exception as e:
             logger.error(f"Error getting outfit count for user {user_id}: {e}")
             return 0
@@ -930,24 +1075,12 @@ class AddictionService:
             # 1. Access Control - Check subscription plan
             plan = user_data.get('subscription_plan', 'FREE')
             
-            # 2. Get wardrobe size
-            from google.cloud.firestore_v1 import FieldFilter
-            wardrobe_query = self.db.collection('wardrobe').where(filter=FieldFilter('user_id', '==', user_id))
-            wardrobe_docs = list(wardrobe_query.stream())
-            total_items = len(wardrobe_docs)
-            
-            # 3. Get worn items this season
-            outfit_history_query = self.db.collection('outfit_history').where(filter=FieldFilter('user_id', '==', user_id))
-            worn_item_ids = set()
-            
-            for doc in outfit_history_query.stream():
-                entry = doc.to_dict()
-                items = entry.get('items', [])
-                for item in items:
-                    if isinstance(item, dict):
-                        worn_item_ids.add(item.get('id'))
-                    elif isinstance(item, str):
-                        worn_item_ids.add(item)
+            # 2-3. Wardrobe size and worn items from the cached wardrobe table
+            # (wear counts are maintained on every log, so no history scan)
+            from .wardrobe_analytics_engine import wardrobe_analytics_engine
+            table = wardrobe_analytics_engine.get_table(user_id)
+            total_items = len(table)
+            worn_item_ids = {table.ids[index] for index in table.wear_count.nonzero()[0]}
             
             # 4. Calculate WUR (Wardrobe Utilization Rate)
             wur = (len(worn_item_ids) / total_items * 100) if total_items > 0 else 0
@@ -1005,7 +1138,7 @@ class AddictionService:
                 base_response["wur"] = round(wur, 1)
                 base_response["estimated_waste"] = round(estimated_waste, 2)
                 base_response["lock_message"] = None
-                base_response["donation_manifest"] = await self.generate_donation_manifest(user_id, list(worn_item_ids))
+                base_response["donation_manifest"] = await self.generate_donation_manifest(user_id, list(worn_item_ids), table)
             
             return base_response
             
@@ -1013,23 +1146,32 @@ class AddictionService:
             logger.error(f"Error getting audit state for user {user_id}: {e}", exc_info=True)
             return {"error": str(e)}
     
-    async def generate_donation_manifest(self, user_id: str, worn_item_ids: List[str]) -> List[Dict[str, Any]]:
+    async def generate_donation_manifest(
+        self,
+        user_id: str,
+        worn_item_ids: Optional[List[str]] = None,
+        table=None
+    ) -> List[Dict[str, Any]]:
         """
         Generate a list of items recommended for donation.
         Only called if user has PREMIUM subscription.
+        
+        Args:
+            worn_item_ids: Items to exclude; defaults to items with a wear count
+            table: The user's ``WardrobeTable`` if the caller already has it
         """
         try:
-            from google.cloud.firestore_v1 import FieldFilter
-            
-            # Get all wardrobe items
-            wardrobe_query = self.db.collection('wardrobe').where(filter=FieldFilter('user_id', '==', user_id))
-            wardrobe_docs = list(wardrobe_query.stream())
+            if table is None:
+                from .wardrobe_analytics_engine import wardrobe_analytics_engine
+                table = wardrobe_analytics_engine.get_table(user_id)
+            if worn_item_ids is None:
+                worn_item_ids = [table.ids[index] for index in table.wear_count.nonzero()[0]]
+            worn_item_ids = set(worn_item_ids)
             
             donation_candidates = []
             
-            for doc in wardrobe_docs.stream():
-                item_data = doc.to_dict()
-                item_id = doc.id
+            for item_data in table.items:
+                item_id = item_data.get('id')
                 
                 # Add to donation list if never worn
                 if item_id not in worn_item_ids:
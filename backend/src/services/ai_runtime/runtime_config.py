@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import os
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from ...core.startup import lazy_import
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 load_dotenv()
 
+# The OpenAI SDK takes over a second to import; load it on first client build
+# (or during background warm-up) instead of at app import.
+openai_sdk = lazy_import("openai", "openai")
+
 
 def _read_positive_float_env(name: str, default: float) -> float:
     raw = (os.getenv(name) or "").strip()
@@ -62,4 +71,4 @@ def build_openai_client(*, api_key: str | None = None, timeout_seconds: float |
     resolved_api_key = (api_key or "").strip() or get_openai_api_key()
     if not resolved_api_key:
         raise RuntimeError("OPENAI_API_KEY not configured")
-    return OpenAI(api_key=resolved_api_key, timeout=timeout_seconds or get_openai_timeout_seconds())
+    return openai_sdk.OpenAI(api_key=resolved_api_key, timeout=timeout_seconds or get_openai_timeout_seconds())
@@ -283,49 +283,50 @@ class ChallengeService:
             # Delete from active
             active_ref.delete()
             
-            # Award XP
+            # Award XP, tokens and badge in one ledger commit
             from .gamification_service import gamification_service
             from .addiction_service import AddictionService
             
-            xp_reward = challenge_def.rewards.get('xp', 0)
-            if xp_reward > 0:
-                await gamification_service.award_xp(
-                    user_id=user_id,
-                    amount=xp_reward,
-                    reason=f"Completed challenge: {challenge_def.title}",
-                    metadata={"challenge_id": challenge_id}
-                )
-            
-            # Award tokens (matching XP amount, with role multiplier applied)
-            token_reward = challenge_def.rewards.get('tokens', xp_reward)  # Default to XP amount if not specified
-            if token_reward > 0:
-                addiction_service = AddictionService()
-                token_result = await addiction_service.award_style_tokens(
+            async with gamification_service.xp_ledger(user_id):
+                xp_reward = challenge_def.rewards.get('xp', 0)
+                if xp_reward > 0:
+                    await gamification_service.award_xp(
+                        user_id=user_id,
+                        amount=xp_reward,
+                        reason=f"Completed challenge: {challenge_def.title}",
+                        metadata={"challenge_id": challenge_id}
+                    )
+                
+                # Award tokens (matching XP amount, with role multiplier applied)
+                token_reward = challenge_def.rewards.get('tokens', xp_reward)  # Default to XP amount if not specified
+                if token_reward > 0:
+                    addiction_service = AddictionService()
+                    token_result = await addiction_service.award_style_tokens(
+                        user_id=user_id,
+                        action_type="challenge_completed",
+                        amount=token_reward  # Role multiplier will be applied internally
+                    )
+                    logger.info(f"✅ Awarded {token_result.get('tokens_awarded', 0)} tokens for challenge completion")
+                
+                # Award badge if specified
+                badge_id = challenge_def.rewards.get('badge')
+                badge_unlocked = None
+                if badge_id:
+                    result = await gamification_service.unlock_badge(user_id, badge_id)
+                    if result.get('success'):
+                        badge_unlocked = result.get('badge_info')
+                
+                # Log completion event
+                await gamification_service.log_gamification_event(
                     user_id=user_id,
-                    action_type="challenge_completed",
-                    amount=token_reward  # Role multiplier will be applied internally
+                    event_type="challenge_completed",
+                    xp_amount=xp_reward,
+                    metadata={
+                        "challenge_id": challenge_id,
+                        "challenge_type": challenge_def.type.value if hasattr(challenge_def.type, 'value') else str(challenge_def.type),
+                        "badge_unlocked": badge_id if badge_unlocked else None
+                    }
                 )
-                logger.info(f"✅ Awarded {token_result.get('tokens_awarded', 0)} tokens for challenge completion")
-            
-            # Award badge if specified
-            badge_id = challenge_def.rewards.get('badge')
-            badge_unlocked = None
-            if badge_id:
-                result = await gamification_service.unlock_badge(user_id, badge_id)
-                if result.get('success'):
-                    badge_unlocked = result.get('badge_info')
-            
-            # Log completion event
-            await gamification_service.log_gamification_event(
-                user_id=user_id,
-                event_type="challenge_completed",
-                xp_amount=xp_reward,
-                metadata={
-                    "challenge_id": challenge_id,
-                    "challenge_type": challenge_def.type.value if hasattr(challenge_def.type, 'value') else str(challenge_def.type),
-                    "badge_unlocked": badge_id if badge_unlocked else None
-                }
-            )
             
             logger.info(f"🎉 User {user_id} completed challenge {challenge_id}! Awarded {xp_reward} XP")
             
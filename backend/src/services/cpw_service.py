@@ -7,6 +7,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from ..config.firebase import db
+from .tve_service import tve_service, item_category
 
 logger = logging.getLogger(__name__)
 
@@ -104,12 +105,16 @@ class CPWService:
         Returns:
             Estimated cost in dollars
         """
-        # Normalize item type
-        item_type_lower = item_type.lower().replace(" ", "_")
-        
         # Map item type to spending category
-        spending_key = CATEGORY_TO_SPENDING_KEY.get(item_type_lower, "tops")
-        
+        spending_key = CATEGORY_TO_SPENDING_KEY.get(item_type.lower().replace(" ", "_"), "tops")
+        return self.estimate_category_cost(spending_key, spending_ranges)
+    
+    def estimate_category_cost(
+        self,
+        spending_key: str,
+        spending_ranges: Dict[str, str]
+    ) -> float:
+        """Estimated cost shared by every item in a spending category."""
         # Get user's spending range for that category
         spending_range = spending_ranges.get(spending_key, "unknown")
         
@@ -245,41 +250,42 @@ class CPWService:
         """
         Calculate average CPW across all items in user's wardrobe
         
+        Every item in a category shares one estimated cost, so the sum of
+        cost / wears is cost × sum(1 / wears) per category; both factors come
+        from the user's TVE category aggregates (one document read).
+        
         Returns:
             Average CPW or None if no items
         """
         try:
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            items = list(wardrobe_ref.stream())
-            
-            if not items:
-                return None
-            
-            total_cpw = 0
-            count = 0
-            
-            for doc in items:
-                item_data = doc.to_dict()
-                cpw = item_data.get('cpw')
-                
-                # If CPW not calculated, calculate it now
-                if cpw is None:
-                    cpw = await self.calculate_item_cpw(user_id, doc.id)
-                
-                if cpw is not None:
-                    total_cpw += cpw
-                    count += 1
-            
-            if count == 0:
-                return None
-            
-            avg_cpw = total_cpw / count
-            return round(avg_cpw, 2)
+            user_doc = self.db.collection('users').document(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+            categories = tve_service.get_tve_aggregates(user_id, user_data)
+            return self.average_cpw_from_aggregates(categories, user_data.get('spending_ranges', {}))
             
         except Exception as e:
             logger.error(f"Error calculating average CPW for user {user_id}: {e}", exc_info=True)
             return None
     
+    def average_cpw_from_aggregates(
+        self,
+        categories: Dict[str, Dict[str, float]],
+        spending_ranges: Dict[str, str]
+    ) -> Optional[float]:
+        """Average CPW from per-category {count, inv_wears} aggregates."""
+        total_cpw = 0.0
+        count = 0
+        for category, aggregate in categories.items():
+            category_count = int(aggregate.get('count', 0) or 0)
+            if category_count <= 0:
+                continue
+            count += category_count
+            total_cpw += self.estimate_category_cost(category, spending_ranges) * float(aggregate.get('inv_wears', 0) or 0)
+        
+        if count == 0:
+            return None
+        return round(total_cpw / count, 2)
+    
     async def calculate_cpw_trend(
         self,
         user_id: str,
@@ -371,18 +377,43 @@ class CPWService:
         """
         Batch recalculate CPW for all items in user's wardrobe
         
+        This is the daily full scan, so it also audits (and repairs) the
+        user's TVE category aggregates against the same item documents.
+        
         Returns:
-            Number of items updated
+            Number of items recalculated
         """
         try:
+            user_doc = self.db.collection('users').document(user_id).get()
+            if not user_doc.exists:
+                logger.error(f"User {user_id} not found")
+                return 0
+            spending_ranges = (user_doc.to_dict() or {}).get('spending_ranges', {})
+            
             wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
             items = list(wardrobe_ref.stream())
             
             count = 0
+            batch = self.db.batch()
+            pending_writes = 0
             for doc in items:
-                cpw = await self.calculate_item_cpw(user_id, doc.id)
-                if cpw is not None:
-                    count += 1
+                item_data = doc.to_dict() or {}
+                estimated_cost = self.estimate_category_cost(item_category(item_data), spending_ranges)
+                cpw = self.calculate_cpw(estimated_cost, item_data.get('wearCount', 0) or 0)
+                count += 1
+                
+                # Only write items whose CPW actually moved
+                if item_data.get('cpw') != cpw:
+                    batch.update(doc.reference, {'cpw': cpw})
+                    pending_writes += 1
+                    if pending_writes >= 400:
+                        batch.commit()
+                        batch = self.db.batch()
+                        pending_writes = 0
+            if pending_writes:
+                batch.commit()
+            
+            tve_service.check_tve_consistency(user_id, repair=True, items=[doc.to_dict() or {} for doc in items])
             
             logger.info(f"✅ Recalculated CPW for {count} items for user {user_id}")
             return count
@@ -0,0 +1,178 @@
+"""
+Daily Suggestion Service
+Generates and stores each user's daily outfit suggestion.
+
+Suggestions live at ``daily_outfit_suggestions/{user_id}_{YYYY-MM-DD}`` keyed
+by the user's local date, so ``/today-suggestion`` is a single document read.
+The documents are written ahead of time by ``src.jobs.daily_suggestions_job``
+during each user's local morning; the endpoint only generates on a miss.
+Each user doc carries ``suggestion_due_utc_hour``, the UTC hour their local
+morning starts, so the job only reads the users due in the current hour.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, time, timezone
+from typing import Any, Dict, Optional
+
+from ..config.firebase import db
+from .addiction_service import user_timezone
+
+logger = logging.getLogger(__name__)
+
+SUGGESTIONS_COLLECTION = 'daily_outfit_suggestions'
+
+# Generation budget for one suggestion
+GENERATION_TIMEOUT_SECONDS = 30.0
+
+# Local hours [start, end) in which suggestions are precomputed
+MORNING_WINDOW_HOURS = (5, 9)
+
+# User field holding the UTC hour at which the user's morning window starts
+DUE_HOUR_FIELD = 'suggestion_due_utc_hour'
+
+
+def suggestion_doc_id(user_id: str, date_str: str) -> str:
+    return f"{user_id}_{date_str}"
+
+
+def suggestion_date(location_data: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> str:
+    """The user's local calendar date (UTC when no timezone is known)."""
+    now = now or datetime.now(timezone.utc)
+    return now.astimezone(user_timezone({'location_data': location_data}) or timezone.utc).strftime('%Y-%m-%d')
+
+
+def suggestion_due_utc_hour(location_data: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> int:
+    """UTC hour in which the user's local morning window starts (UTC users: the window start itself)."""
+    now = now or datetime.now(timezone.utc)
+    tz = user_timezone({'location_data': location_data}) or timezone.utc
+    local_start = datetime.combine(now.astimezone(tz).date(), time(MORNING_WINDOW_HOURS[0]), tzinfo=tz)
+    return local_start.astimezone(timezone.utc).hour
+
+
+def has_mock_items(outfit_data: Optional[Dict[str, Any]]) -> bool:
+    """True for suggestions built from the old placeholder fallback items."""
+    for item in (outfit_data or {}).get('items', []) or []:
+        if not item:
+            continue
+        item_id = item.get('id', '') or ''
+        name = item.get('name', '') or ''
+        if item_id.startswith('fallback-') or name.endswith((' Top', ' Pants', ' Shoes')):
+            return True
+    return False
+
+
+class DailySuggestionService:
+    def __init__(self, firestore_client=None):
+        self._db = firestore_client
+
+    @property
+    def db(self):
+        return self._db if self._db is not None else db
+
+    def _ref(self, user_id: str, date_str: str):
+        return self.db.collection(SUGGESTIONS_COLLECTION).document(suggestion_doc_id(user_id, date_str))
+
+    def get_suggestion(self, user_id: str, date_str: str) -> Optional[Dict[str, Any]]:
+        """Stored suggestion for ``date_str`` (with its ``id``), or None."""
+        doc = self._ref(user_id, date_str).get()
+        if not doc.exists:
+            return None
+        return {'id': doc.id, **(doc.to_dict() or {})}
+
+    def existing_user_ids(self, user_ids_by_date: Dict[str, str]) -> set:
+        """Users (of ``user_id -> date``) that already have a suggestion, in one batched read."""
+        if not user_ids_by_date:
+            return set()
+        refs = [self._ref(user_id, date_str) for user_id, date_str in user_ids_by_date.items()]
+        return {doc.to_dict().get('user_id') for doc in self.db.get_all(refs) if doc.exists}
+
+    def save_suggestion(
+        self,
+        user_id: str,
+        date_str: str,
+        outfit_data: Dict[str, Any],
+        is_fallback: bool = False,
+        precomputed: bool = False,
+        overwrite: bool = True,
+    ) -> Optional[Dict[str, Any]]:
+        """Write the suggestion for ``date_str`` and return it with its ``id``.
+
+        With ``overwrite=False`` an existing suggestion is left untouched (so a
+        late write cannot reset ``is_worn``) and None is returned.
+        """
+        current_timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
+        suggestion_doc = {
+            'user_id': user_id,
+            'date': date_str,
+            'outfit_data': outfit_data,
+            'generated_at': current_timestamp,
+            'is_worn': False,
+            'worn_at': None,
+            'created_at': current_timestamp,
+            'updated_at': current_timestamp,
+            'precomputed': precomputed,
+        }
+        if is_fallback:
+            suggestion_doc['is_fallback'] = True
+        ref = self._ref(user_id, date_str)
+        if overwrite:
+            ref.set(suggestion_doc)
+        else:
+            from google.api_core.exceptions import AlreadyExists
+
+            try:
+                ref.create(suggestion_doc)
+            except AlreadyExists:
+                return None
+        return {'id': ref.id, **suggestion_doc}
+
+    def delete_suggestion(self, user_id: str, date_str: str) -> int:
+        ref = self._ref(user_id, date_str)
+        if not ref.get().exists:
+            return 0
+        ref.delete()
+        return 1
+
+    async def generate_outfit(self, user_id: str, weather: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generate the daily outfit with the user's profile, likes and preferences."""
+        from ..routes.outfits.database import get_user_profile_cached
+        from ..routes.outfits.models import OutfitRequest
+        from .outfits.generation_service import OutfitGenerationService
+
+        user_profile = await get_user_profile_cached(user_id)
+
+        liked_outfits = []
+        try:
+            liked_docs = self.db.collection('outfit_likes').where('userId', '==', user_id).limit(10).stream()
+            liked_outfits = [{'id': doc.id, **doc.to_dict()} for doc in liked_docs]
+        except Exception as e:
+            logger.warning(f"Could not fetch liked outfits: {e}")
+
+        preferences = {}
+        try:
+            pref_doc = self.db.collection('user_preferences').document(user_id).get()
+            if pref_doc.exists:
+                preferences = pref_doc.to_dict()
+        except Exception as e:
+            logger.warning(f"Could not fetch preferences: {e}")
+
+        daily_request = OutfitRequest(
+            occasion="casual",
+            style="comfortable",
+            mood="confident",
+            description="Daily outfit suggestion",
+            weather=weather,
+            user_profile=user_profile,
+            likedOutfits=liked_outfits,
+            trendingStyles=[],
+            preferences=preferences,
+        )
+        return await asyncio.wait_for(
+            OutfitGenerationService().generate_outfit_logic(daily_request, user_id),
+            timeout=GENERATION_TIMEOUT_SECONDS,
+        )
+
+
+# Global instance
+daily_suggestion_service = DailySuggestionService()
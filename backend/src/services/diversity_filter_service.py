@@ -7,10 +7,11 @@ import time
 import hashlib
 import json
 from typing import Dict, List, Any, Optional, Tuple, Set
-from collections import defaultdict, Counter
-from dataclasses import dataclass
+from collections import defaultdict, Counter, deque
+from dataclasses import dataclass, field
 import logging
 from ..custom_types.wardrobe import ClothingItem
+from ..core.cache import BoundedStore, register_bounded_store
 
 logger = logging.getLogger(__name__)
 
@@ -42,14 +43,208 @@ class DiversityMetrics:
     diversity_score: float
     recent_repetitions: int
 
+# Per-user state is reloaded from Firestore on demand, so idle users can be dropped
+MAX_TRACKED_USERS = 2000
+USER_STATE_IDLE_TTL_SECONDS = 6 * 60 * 60
+MAX_TRACKED_ITEMS = 50000
+
+# (type, color, styles) - the attributes ``_calculate_item_similarity`` compares
+ItemSignature = Tuple[str, str, frozenset]
+
+
+def _get_field(obj, field_name, default=None):
+    """Read a field from either a dict or an object (ClothingItem or lightweight item)"""
+    if isinstance(obj, dict):
+        return obj.get(field_name, default)
+    return getattr(obj, field_name, default)
+
+
+def _item_signature(item) -> ItemSignature:
+    """Normalize the attributes used for item-to-outfit similarity"""
+    item_styles = _get_field(item, 'style', [])
+    styles = frozenset(item_styles if isinstance(item_styles, list) else [item_styles] if item_styles else [])
+    return (str(_get_field(item, 'type', '')), str(_get_field(item, 'color', '')), styles)
+
+
+def _signature_similarity(signature: ItemSignature, outfit_signatures: Tuple[ItemSignature, ...]) -> float:
+    """Best weighted type/color/style match between one item and an outfit's items"""
+    if not outfit_signatures:
+        return 0.0
+
+    item_type, item_color, item_styles = signature
+    best = 0.0
+    for outfit_type, outfit_color, outfit_styles in outfit_signatures:
+        type_sim = 1.0 if item_type == outfit_type else 0.0
+        color_sim = 1.0 if item_color == outfit_color else 0.0
+        style_union = len(item_styles | outfit_styles)
+        style_sim = len(item_styles & outfit_styles) / style_union if style_union > 0 else 0.0
+        similarity = type_sim * 0.4 + color_sim * 0.3 + style_sim * 0.3
+        if similarity > best:
+            best = similarity
+    return best
+
+
+@dataclass
+class IndexedOutfit:
+    """Pre-extracted view of one history outfit used by the history index"""
+    item_ids: frozenset
+    signatures: Tuple[ItemSignature, ...]
+    created_at: Any
+
+
+@dataclass
+class ComboHistoryIndex:
+    """
+    Usage and similarity aggregates for one comparison set of recent outfits
+    (a single occasion/style combination, or all recent outfits as the fallback).
+    """
+    outfits: deque = field(default_factory=deque)
+    usage_counts: Counter = field(default_factory=Counter)
+    item_outfits: Dict[str, List[IndexedOutfit]] = field(default_factory=lambda: defaultdict(list))
+    last_used: Dict[str, Any] = field(default_factory=dict)
+    type_counts: Counter = field(default_factory=Counter)
+    color_counts: Counter = field(default_factory=Counter)
+    style_counts: Counter = field(default_factory=Counter)
+    # signature -> sum of _signature_similarity over ``outfits``, filled lazily
+    similarity_totals: Dict[ItemSignature, float] = field(default_factory=dict)
+
+    def add(self, outfit: IndexedOutfit) -> None:
+        self.outfits.append(outfit)
+        for item_id in outfit.item_ids:
+            self.usage_counts[item_id] += 1
+            self.item_outfits[item_id].append(outfit)
+            self.last_used[item_id] = outfit.created_at
+        for item_type, item_color, item_styles in outfit.signatures:
+            self.type_counts[item_type] += 1
+            self.color_counts[item_color] += 1
+            self.style_counts.update(item_styles)
+        for signature in self.similarity_totals:
+            self.similarity_totals[signature] += _signature_similarity(signature, outfit.signatures)
+
+    def evict_oldest(self) -> None:
+        outfit = self.outfits.popleft()
+        for item_id in outfit.item_ids:
+            self.usage_counts[item_id] -= 1
+            remaining = self.item_outfits[item_id]
+            remaining.remove(outfit)
+            if not remaining:
+                del self.usage_counts[item_id]
+                del self.item_outfits[item_id]
+                self.last_used.pop(item_id, None)
+        for item_type, item_color, item_styles in outfit.signatures:
+            self.type_counts.subtract([item_type])
+            self.color_counts.subtract([item_color])
+            self.style_counts.subtract(item_styles)
+        self.type_counts += Counter()
+        self.color_counts += Counter()
+        self.style_counts += Counter()
+        for signature in self.similarity_totals:
+            self.similarity_totals[signature] -= _signature_similarity(signature, outfit.signatures)
+
+    def could_match(self, signature: ItemSignature) -> bool:
+        """False when no recent item shares the type, color or any style (similarity is 0)"""
+        item_type, item_color, item_styles = signature
+        return (
+            item_type in self.type_counts
+            or item_color in self.color_counts
+            or any(style in self.style_counts for style in item_styles)
+        )
+
+    def average_similarity(self, item_id: Optional[str], signature: ItemSignature) -> float:
+        """
+        Mean per-outfit similarity of an item: 1.0 for outfits containing the item,
+        best attribute match otherwise.
+        """
+        total = self.similarity_totals.get(signature)
+        if total is None:
+            if self.could_match(signature):
+                total = sum(_signature_similarity(signature, outfit.signatures) for outfit in self.outfits)
+            else:
+                total = 0.0
+            self.similarity_totals[signature] = total
+
+        containing = self.item_outfits.get(item_id, ()) if item_id else ()
+        if containing:
+            total = total - sum(_signature_similarity(signature, outfit.signatures) for outfit in containing)
+            total += len(containing)
+        return total / len(self.outfits)
+
+
+@dataclass
+class UserHistoryIndex:
+    """Per-user index over the recent outfit window, kept in step with ``outfit_history``"""
+    history: List[Dict[str, Any]]
+    indexed_count: int = 0
+    all_outfits: ComboHistoryIndex = field(default_factory=ComboHistoryIndex)
+    combos: Dict[Tuple[str, str], ComboHistoryIndex] = field(default_factory=dict)
+    # Per history position: (combo key, indexed outfit or None when it had no items)
+    entries: deque = field(default_factory=deque)
+
+    @staticmethod
+    def combo_key(occasion: Optional[str], style: Optional[str]) -> Tuple[str, str]:
+        return ((occasion or '').lower(), (style or '').lower())
+
+    def append(self, outfit: Dict[str, Any]) -> None:
+        self.indexed_count += 1
+        if not outfit:
+            self.entries.append((None, None))
+            return
+
+        key = self.combo_key(outfit.get('occasion', ''), outfit.get('style', ''))
+        combo = self.combos.get(key)
+        if combo is None:
+            combo = self.combos[key] = ComboHistoryIndex()
+
+        indexed = None
+        if 'items' in outfit:
+            items = outfit['items'] or []
+            indexed = IndexedOutfit(
+                item_ids=frozenset(item_id for item_id in (_get_field(item, 'id') for item in items) if item_id),
+                signatures=tuple(_item_signature(item) for item in items),
+                created_at=outfit.get('createdAt', 0),
+            )
+            combo.add(indexed)
+            self.all_outfits.add(indexed)
+        self.entries.append((key, indexed))
+
+    def evict_oldest(self) -> None:
+        key, indexed = self.entries.popleft()
+        if key is None:
+            return
+        combo = self.combos[key]
+        if indexed is not None:
+            combo.evict_oldest()
+            self.all_outfits.evict_oldest()
+        if not any(entry_key == key for entry_key, _ in self.entries):
+            del self.combos[key]
+
+    def comparison_index(self, occasion: str, style: str) -> ComboHistoryIndex:
+        """Same-combination outfits, or every recent outfit when the combination is new"""
+        return self.combos.get(self.combo_key(occasion, style), self.all_outfits)
+
+
 class DiversityFilterService:
     """Service for ensuring outfit diversity and preventing repetitive recommendations"""
     
     def __init__(self):
-        self.outfit_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
-        self.item_usage_count: Dict[str, int] = defaultdict(int)
+        # Bounded LRU+TTL stores so per-user state does not grow for the process lifetime
+        self.outfit_history: BoundedStore = BoundedStore(
+            "diversity_outfit_history", max_entries=MAX_TRACKED_USERS,
+            ttl=USER_STATE_IDLE_TTL_SECONDS, default_factory=list
+        )
+        self.item_usage_count: BoundedStore = BoundedStore(
+            "diversity_item_usage", max_entries=MAX_TRACKED_ITEMS,
+            ttl=USER_STATE_IDLE_TTL_SECONDS, default_factory=int
+        )
         self.outfit_similarities: List[OutfitSimilarity] = []
-        self.rotation_schedule: Dict[str, List[str]] = defaultdict(list)
+        self.rotation_schedule: BoundedStore = BoundedStore(
+            "diversity_rotation_schedule", max_entries=MAX_TRACKED_USERS,
+            ttl=USER_STATE_IDLE_TTL_SECONDS, default_factory=list
+        )
+        self.history_index: BoundedStore = BoundedStore(
+            "diversity_history_index", max_entries=MAX_TRACKED_USERS,
+            ttl=USER_STATE_IDLE_TTL_SECONDS
+        )
         
         # Configuration
         self.similarity_threshold = 0.7  # Outfits with >70% similarity are considered too similar
@@ -347,30 +542,21 @@ class DiversityFilterService:
         
         # Load outfit history from Firestore if needed
         if not self.outfit_history[user_id] or len(self.outfit_history[user_id]) < 5:
-            logger.info(f"🔄 Loading outfit history from Firestore for diversity boost (user {user_id})")
+            logger.info("🔄 Loading outfit history from Firestore for diversity boost (user %s)", user_id)
             firestore_history = self._load_outfit_history_from_firestore(user_id)
             if firestore_history:
                 self.outfit_history[user_id] = firestore_history
         
         boosted_items = []
-        user_history = self.outfit_history[user_id]
-        recent_outfits = user_history[-self.max_recent_outfits:]
+        history_index = self.get_history_index(user_id)
+        comparison = history_index.comparison_index(occasion, style)
         
-        # CRITICAL FIX: Filter to same occasion/style combination FIRST
-        # This prevents the same outfit for the same combination
-        same_combo_outfits = []
-        for outfit in recent_outfits:
-            if outfit:
-                occasion_match = outfit.get('occasion', '').lower() == occasion.lower()
-                style_match = outfit.get('style', '').lower() == style.lower()
-                
-                if occasion_match and style_match:
-                    same_combo_outfits.append(outfit)
-        
-        logger.info(f"🎭 DIVERSITY BOOST: Checking {len(same_combo_outfits)} outfits with same combination (occasion={occasion}, style={style})")
-        
-        # Use same-combination outfits for similarity check, or all if none found
-        comparison_outfits = same_combo_outfits if same_combo_outfits else recent_outfits
+        # CRITICAL FIX: Compare against the same occasion/style combination only,
+        # falling back to every recent outfit when this combination is new
+        if comparison is history_index.all_outfits:
+            logger.info("🎭 DIVERSITY BOOST: No outfits with same combination (occasion=%s, style=%s), using all %s recent outfits", occasion, style, len(comparison.outfits))
+        else:
+            logger.info("🎭 DIVERSITY BOOST: Checking %s outfits with same combination (occasion=%s, style=%s)", len(comparison.outfits), occasion, style)
         
         occasion_lower = (occasion or "").lower()
         style_lower = (style or "").lower()
@@ -378,88 +564,60 @@ class DiversityFilterService:
 
         is_monochrome_combo = style_lower == 'monochrome'
 
+        never_used_boost = 0.8
+        lightly_used_boost = 0.3
+        moderate_penalty = -0.2
+        overuse_penalty = -1.5
+
+        if is_loungewear_combo:
+            # Loungewear wardrobes often have limited cozy layers.
+            # Use gentler rewards/penalties so we don't strip every lounge piece.
+            never_used_boost = 0.5
+            lightly_used_boost = 0.2
+            moderate_penalty = -0.1
+            overuse_penalty = -0.75
+
+        if is_monochrome_combo:
+            never_used_boost = 0.6
+            lightly_used_boost = 0.2
+            moderate_penalty = -0.1
+            overuse_penalty = -0.5
+
+        rotation_items = set(self.rotation_schedule[user_id])
+
         for item in items:
             base_score = 1.0
             diversity_boost = 0.0
             
             # Boost items that haven't been used recently in THIS COMBINATION
             # Count usage in same-combination outfits, not globally
-            same_combo_usage = 0
             item_id = getattr(item, 'id', None)
+            same_combo_usage = comparison.usage_counts.get(item_id, 0) if item_id else 0
             
-            for outfit in comparison_outfits:
-                if outfit and 'items' in outfit:
-                    # Handle both dict and object items in history
-                    for oi in outfit['items']:
-                        oi_id = oi.get('id') if isinstance(oi, dict) else getattr(oi, 'id', None)
-                        if oi_id and oi_id == item_id:
-                            same_combo_usage += 1
-                            break  # Count each outfit only once
-            
-            never_used_boost = 0.8
-            lightly_used_boost = 0.3
-            moderate_penalty = -0.2
-            overuse_penalty = -1.5
-
-            if is_loungewear_combo:
-                # Loungewear wardrobes often have limited cozy layers.
-                # Use gentler rewards/penalties so we don't strip every lounge piece.
-                never_used_boost = 0.5
-                lightly_used_boost = 0.2
-                moderate_penalty = -0.1
-                overuse_penalty = -0.75
-
-            if is_monochrome_combo:
-                never_used_boost = 0.6
-                lightly_used_boost = 0.2
-                moderate_penalty = -0.1
-                overuse_penalty = -0.5
             if same_combo_usage == 0:
                 diversity_boost += never_used_boost
-                logger.debug(f"  🆕 {item.name[:30]}: Not used in {occasion}/{style} → {never_used_boost:+.2f}")
+                logger.debug("  🆕 %s: Not used in %s/%s → %+.2f", item.name[:30], occasion, style, never_used_boost)
             elif same_combo_usage == 1:
                 diversity_boost += lightly_used_boost
-                logger.debug(f"  🌱 {item.name[:30]}: Used 1x in {occasion}/{style} → {lightly_used_boost:+.2f}")
+                logger.debug("  🌱 %s: Used 1x in %s/%s → %+.2f", item.name[:30], occasion, style, lightly_used_boost)
             elif same_combo_usage == 2:
                 diversity_boost += moderate_penalty
-                logger.debug(f"  ➖ {item.name[:30]}: Used 2x in {occasion}/{style} → {moderate_penalty:+.2f}")
+                logger.debug("  ➖ %s: Used 2x in %s/%s → %+.2f", item.name[:30], occasion, style, moderate_penalty)
             elif same_combo_usage >= 3:
                 diversity_boost += overuse_penalty
-                logger.warning(f"  🔁 {item.name[:30]}: Overused {same_combo_usage}x in {occasion}/{style} → {overuse_penalty:+.2f}")
+                logger.warning("  🔁 %s: Overused %sx in %s/%s → %+.2f", item.name[:30], same_combo_usage, occasion, style, overuse_penalty)
             
             # Boost items that are different from recent SAME-COMBO outfits
-            if comparison_outfits:
-                item_similarities = []
-                item_id = getattr(item, 'id', None)
-                
-                for recent_outfit in comparison_outfits:
-                    if 'items' in recent_outfit:
-                        recent_items = recent_outfit['items']
-                        # Check if this item was in recent outfits (handle both dict and object)
-                        found_exact_match = False
-                        for ri in recent_items:
-                            ri_id = ri.get('id') if isinstance(ri, dict) else getattr(ri, 'id', None)
-                            if ri_id and ri_id == item_id:
-                                found_exact_match = True
-                                break
-                        
-                        if found_exact_match:
-                            item_similarities.append(1.0)  # Exact match
-                        else:
-                            # Calculate similarity with this item
-                            item_similarity = self._calculate_item_similarity(item, recent_items)
-                            item_similarities.append(item_similarity)
+            if comparison.outfits:
+                avg_similarity = comparison.average_similarity(item_id, _item_signature(item))
+                diversity_boost += (1.0 - avg_similarity) * 0.2  # Boost dissimilar items
                 
-                if item_similarities:
-                    avg_similarity = sum(item_similarities) / len(item_similarities)
-                    diversity_boost += (1.0 - avg_similarity) * 0.2  # Boost dissimilar items
-                    
-                    # Log high similarity items for debugging
-                    if avg_similarity > 0.7:
-                        logger.debug(f"  ⚠️  {item.name[:30]}: High similarity ({avg_similarity:.2f}) to recent {occasion}/{style} outfits")
+                # Log high similarity items for debugging
+                if avg_similarity > 0.7:
+                    logger.debug("  ⚠️  %s: High similarity (%.2f) to recent %s/%s outfits", item.name[:30], avg_similarity, occasion, style)
             
             # Boost items that fit rotation schedule
-            if item.id in self.rotation_schedule[user_id]:
+            if item.id in rotation_items:
                 diversity_boost += 0.2
             
             # Apply diversity boost
@@ -468,6 +626,31 @@ class DiversityFilterService:
         
         return boosted_items
     
+    def get_history_index(self, user_id: str) -> UserHistoryIndex:
+        """
+        Return the usage/similarity index for the user's recent outfit window.
+        
+        The index is updated incrementally by ``record_outfit_generation`` and
+        rebuilt only when ``outfit_history[user_id]`` was replaced or changed
+        outside this service (e.g. after a Firestore reload).
+        """
+        user_history = self.outfit_history[user_id]
+        history_index = self.history_index.get(user_id)
+        if (
+            history_index is not None
+            and history_index.history is user_history
+            and history_index.indexed_count == len(user_history)
+        ):
+            return history_index
+        
+        history_index = UserHistoryIndex(history=user_history)
+        for outfit in user_history[-self.max_recent_outfits:]:
+            history_index.append(outfit)
+        # Only the recent window is indexed; count the older entries as seen
+        history_index.indexed_count = len(user_history)
+        self.history_index[user_id] = history_index
+        return history_index
+    
     def _calculate_item_similarity(self, item, outfit_items) -> float:
         """
         Calculate similarity between an item and items in an outfit
@@ -477,40 +660,10 @@ class DiversityFilterService:
         if not outfit_items:
             return 0.0
         
-        # Helper to get field
-        def get_field(obj, field, default=None):
-            if isinstance(obj, dict):
-                return obj.get(field, default)
-            else:
-                return getattr(obj, field, default)
-        
-        similarities = []
-        item_type = str(get_field(item, 'type', ''))
-        item_color = str(get_field(item, 'color', ''))
-        item_styles = get_field(item, 'style', [])
-        item_styles_set = set(item_styles if isinstance(item_styles, list) else [item_styles] if item_styles else [])
-        
-        for outfit_item in outfit_items:
-            # Type similarity
-            outfit_type = str(get_field(outfit_item, 'type', ''))
-            type_sim = 1.0 if item_type == outfit_type else 0.0
-            
-            # Color similarity
-            outfit_color = str(get_field(outfit_item, 'color', ''))
-            color_sim = 1.0 if item_color == outfit_color else 0.0
-            
-            # Style similarity
-            outfit_styles = get_field(outfit_item, 'style', [])
-            outfit_styles_set = set(outfit_styles if isinstance(outfit_styles, list) else [outfit_styles] if outfit_styles else [])
-            style_intersection = len(item_styles_set & outfit_styles_set)
-            style_union = len(item_styles_set | outfit_styles_set)
-            style_sim = style_intersection / style_union if style_union > 0 else 0.0
-            
-            # Weighted similarity
-            item_similarity = (type_sim * 0.4 + color_sim * 0.3 + style_sim * 0.3)
-            similarities.append(item_similarity)
-        
-        return max(similarities) if similarities else 0.0
+        return _signature_similarity(
+            _item_signature(item),
+            tuple(_item_signature(outfit_item) for outfit_item in outfit_items)
+        )
     
     def record_outfit_generation(self, user_id: str, outfit: Dict[str, Any], 
                                items: List[ClothingItem]) -> None:
@@ -527,15 +680,21 @@ class DiversityFilterService:
             'confidence': outfit.get('confidence', 0.0) if outfit else 0.0
         }
         
-        self.outfit_history[user_id].append(outfit_record)
+        history_index = self.get_history_index(user_id)
+        user_history = self.outfit_history[user_id]
+        user_history.append(outfit_record)
+        history_index.append(outfit_record)
         
         # Update item usage counts
         for item in items:
             self.item_usage_count[item.id] += 1
         
-        # Keep only recent outfits
-        if len(self.outfit_history[user_id]) > self.max_recent_outfits:
-            self.outfit_history[user_id] = self.outfit_history[user_id][-self.max_recent_outfits:]
+        # Keep only recent outfits (in place so the history index stays attached)
+        while len(history_index.entries) > self.max_recent_outfits:
+            history_index.evict_oldest()
+        if len(user_history) > self.max_recent_outfits:
+            del user_history[:-self.max_recent_outfits]
+        history_index.indexed_count = len(user_history)
         
         # Update rotation schedule
         self._update_rotation_schedule(user_id, items)
@@ -555,7 +714,7 @@ class DiversityFilterService:
         
         # Keep only last 20 items in rotation
         if len(current_schedule) > 20:
-            self.rotation_schedule[user_id] = current_schedule[-20:]
+            del current_schedule[:-20]
     
     def get_diversity_metrics(self, user_id: str) -> DiversityMetrics:
         """Get diversity metrics for a user"""
@@ -648,6 +807,7 @@ class DiversityFilterService:
         """Reset diversity tracking for a user"""
         self.outfit_history[user_id] = []
         self.rotation_schedule[user_id] = []
+        self.history_index.pop(user_id, None)
         
         # Reset item usage counts for this user's items
         user_items = set()
@@ -720,3 +880,10 @@ class DiversityFilterService:
 
 # Global instance
 diversity_filter = DiversityFilterService()
+for _store in (
+    diversity_filter.outfit_history,
+    diversity_filter.item_usage_count,
+    diversity_filter.rotation_schedule,
+    diversity_filter.history_index,
+):
+    register_bounded_store(_store)
@@ -15,6 +15,13 @@ Architecture:
 - Tier 4 (Relaxed): Clean jeans, sneakers
 - Tier 5 (Athletic): Gym wear, athletic shoes
 
+Each item's tier membership and blocked status is computed once per item
+version (name, type, formality metadata) into an ``ItemTierProfile``; a
+``TierIndex`` buckets a wardrobe by tier, so each fallback step is a set
+selection and ``TierIndex.stats()`` gives per-user tier counts to analytics.
+Given a user's wardrobe version, the index is built once per version and
+reused by later requests.
+
 Usage:
     tier_system = FormalityTierSystem()
     if tier_system.should_apply_tier_filter(occasion):
@@ -23,11 +30,16 @@ Usage:
         )
 """
 
+import copy
 import logging
 from enum import Enum
-from typing import List, Set, Dict, Optional, Tuple, Any
+from functools import lru_cache
+from typing import List, Set, Dict, FrozenSet, NamedTuple, Optional, Tuple, Any
 from dataclasses import dataclass
 
+from ...core.cache import BoundedStore, register_bounded_store
+from ...utils.keyword_rules import KeywordRules
+
 logger = logging.getLogger(__name__)
 
 
@@ -156,6 +168,177 @@ TIER_BLOCKED_KEYWORDS = [
     'cargo shorts', 'athletic shorts', 'running shorts'
 ]
 
+TIER_KEYWORDS = {
+    FormalityTier.TIER_1_STRICT_FORMAL: TIER_1_KEYWORDS,
+    FormalityTier.TIER_2_SMART_CASUAL: TIER_2_KEYWORDS,
+    FormalityTier.TIER_3_CREATIVE_CASUAL: TIER_3_KEYWORDS,
+}
+
+# Each tier keyword as its set of words; multi-word keywords match when every
+# word appears anywhere in the item name/type (order-independent)
+TIER_KEYWORD_WORDS = {
+    tier: tuple(
+        frozenset(keyword.lower().split())
+        for category_keywords in keywords.values()
+        for keyword in category_keywords
+    )
+    for tier, keywords in TIER_KEYWORDS.items()
+}
+
+# One matcher for blocked phrases and every tier word, so each item is scanned once
+TIER_KEYWORD_RULES = KeywordRules({
+    'blocked': TIER_BLOCKED_KEYWORDS,
+    'tier_words': sorted({word for words in TIER_KEYWORD_WORDS.values() for keyword in words for word in keyword}),
+})
+
+# visualAttributes.formalLevel values that place an item in a tier when no keyword matches
+TIER_FORMAL_LEVELS = {
+    FormalityTier.TIER_1_STRICT_FORMAL: frozenset({'formal', 'business', 'professional', 'dress'}),
+    FormalityTier.TIER_2_SMART_CASUAL: frozenset({'smart casual', 'business casual', 'semi-formal'}),
+    FormalityTier.TIER_3_CREATIVE_CASUAL: frozenset({'casual', 'smart casual', 'creative'}),
+}
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# PRECOMPUTED TIER MEMBERSHIP
+# ═══════════════════════════════════════════════════════════════════════
+
+class ItemTierProfile(NamedTuple):
+    """Tier membership of one item; ``blocked_by`` is the blocking keyword, if any."""
+    item_id: str
+    name: str
+    blocked_by: Optional[str]
+    tiers: FrozenSet[FormalityTier]
+    occasions: Tuple[str, ...]
+
+    @property
+    def blocked(self) -> bool:
+        return self.blocked_by is not None
+
+
+@lru_cache(maxsize=8192)
+def classify_tiers(item_name: str, item_type: str, formal_level: str) -> Tuple[Optional[str], FrozenSet[FormalityTier]]:
+    """(blocking keyword, tiers matched) for an item version; one keyword scan."""
+    found_words = TIER_KEYWORD_RULES.keywords(f"{item_name} {item_type}")
+    blocked_by = next((keyword for keyword in TIER_BLOCKED_KEYWORDS if keyword in found_words), None)
+    if blocked_by:
+        return blocked_by, frozenset()
+
+    # Multi-word keywords match when all their words are present in any order:
+    #   - "pencil dress" → "Dress pencil Mustard Yellow" ✅
+    #   - "oxford shoes" → "Shoes oxford brown" ✅
+    # Metadata formality only counts when no keyword matched
+    return None, frozenset(
+        tier for tier, keyword_words in TIER_KEYWORD_WORDS.items()
+        if any(words <= found_words for words in keyword_words) or formal_level in TIER_FORMAL_LEVELS[tier]
+    )
+
+
+def _formal_level(item: Any) -> str:
+    metadata = item.get('metadata') if isinstance(item, dict) else getattr(item, 'metadata', None)
+    if metadata and isinstance(metadata, dict):
+        visual_attrs = metadata.get('visualAttributes', {})
+        if isinstance(visual_attrs, dict):
+            return (visual_attrs.get('formalLevel') or '').lower()
+    return ''
+
+
+def tier_profile(item: Any, safe_get_item_attr_func: callable) -> ItemTierProfile:
+    item_name = (safe_get_item_attr_func(item, 'name', '') or '').lower()
+    item_type = str(safe_get_item_attr_func(item, 'type', '')).lower()
+    item_occasions = safe_get_item_attr_func(item, 'occasion', []) or []
+    if isinstance(item_occasions, str):
+        item_occasions = [item_occasions]
+    blocked_by, tiers = classify_tiers(item_name, item_type, _formal_level(item))
+    return ItemTierProfile(
+        item_id=safe_get_item_attr_func(item, 'id', ''),
+        name=item_name,
+        blocked_by=blocked_by,
+        tiers=tiers,
+        occasions=tuple(occ.lower() for occ in item_occasions if isinstance(occ, str)),
+    )
+
+
+class TierIndex:
+    """A wardrobe bucketed by formality tier (wardrobe order kept within buckets)."""
+
+    def __init__(self, wardrobe: List[Any], safe_get_item_attr_func: callable):
+        self.wardrobe = wardrobe
+        self.profiles = [tier_profile(item, safe_get_item_attr_func) for item in wardrobe]
+        self.buckets: Dict[FormalityTier, List[int]] = {tier: [] for tier in TIER_KEYWORDS}
+        self.blocked_count = 0
+        for index, profile in enumerate(self.profiles):
+            if profile.blocked:
+                self.blocked_count += 1
+                continue
+            for tier in profile.tiers:
+                self.buckets[tier].append(index)
+
+    def occasion_mask(self, occasion: Optional[str], occasion_fallbacks: Optional[Dict[str, List[str]]]) -> Optional[List[bool]]:
+        """Per item: tagged with ``occasion`` or one of its fallbacks (None when not checked)."""
+        if not occasion or not occasion_fallbacks:
+            return None
+        occasion_lower = occasion.lower()
+        accepted = {occasion_lower}
+        if occasion_lower in occasion_fallbacks:
+            accepted.update(fallback.lower() for fallback in occasion_fallbacks[occasion_lower])
+        return [not accepted.isdisjoint(profile.occasions) for profile in self.profiles]
+
+    def select(self, tier: FormalityTier, occasion_mask: Optional[List[bool]] = None) -> List[Any]:
+        """Items in ``tier``; tiers without keyword rules keep the whole wardrobe."""
+        bucket = self.buckets.get(tier)
+        if bucket is None:
+            return self.wardrobe
+        if occasion_mask is not None:
+            bucket = [index for index in bucket if occasion_mask[index]]
+        return [self.wardrobe[index] for index in bucket]
+
+    def stats(self) -> Dict[str, Any]:
+        unclassified = sum(1 for profile in self.profiles if not profile.blocked and not profile.tiers)
+        return {
+            'total_items': len(self.profiles),
+            'blocked': self.blocked_count,
+            'unclassified': unclassified,
+            'tiers': {tier.value: len(bucket) for tier, bucket in self.buckets.items()},
+        }
+
+    def rebind(self, wardrobe: List[Any]) -> 'TierIndex':
+        """This index over ``wardrobe``, which must hold the same items in the same order."""
+        tier_index = copy.copy(self)
+        tier_index.wardrobe = wardrobe
+        return tier_index
+
+
+# Per user: (wardrobe version, item ids, TierIndex); the version moves on every wardrobe write
+TIER_INDEX_TTL_SECONDS = 600
+TIER_INDEXES = register_bounded_store(BoundedStore(
+    "formality_tier_indexes",
+    max_entries=2048,
+    ttl=TIER_INDEX_TTL_SECONDS,
+    refresh_on_access=False,
+))
+
+
+def tier_index_for(
+    wardrobe: List[Any],
+    safe_get_item_attr_func: callable,
+    user_id: Optional[str] = None,
+    wardrobe_version: Any = None,
+) -> TierIndex:
+    """TierIndex for ``wardrobe``, reused while the user's wardrobe version and item ids match."""
+    if not user_id or wardrobe_version is None:
+        return TierIndex(wardrobe, safe_get_item_attr_func)
+
+    item_ids = tuple(safe_get_item_attr_func(item, 'id', '') for item in wardrobe)
+    cached = TIER_INDEXES.get(user_id)
+    if cached is not None and cached[0] == wardrobe_version and cached[1] == item_ids:
+        return cached[2].rebind(wardrobe)
+
+    tier_index = TierIndex(wardrobe, safe_get_item_attr_func)
+    # Don't hold on to the caller's item objects
+    TIER_INDEXES.set(user_id, (wardrobe_version, item_ids, tier_index.rebind([])))
+    return tier_index
+
 
 # ═══════════════════════════════════════════════════════════════════════
 # OCCASION CONFIGURATIONS
@@ -513,11 +696,7 @@ class FormalityTierSystem:
     
     def __init__(self):
         self.configs = OCCASION_TIER_CONFIGS
-        self.tier_keywords = {
-            FormalityTier.TIER_1_STRICT_FORMAL: TIER_1_KEYWORDS,
-            FormalityTier.TIER_2_SMART_CASUAL: TIER_2_KEYWORDS,
-            FormalityTier.TIER_3_CREATIVE_CASUAL: TIER_3_KEYWORDS,
-        }
+        self.tier_keywords = TIER_KEYWORDS
         self.blocked_keywords = TIER_BLOCKED_KEYWORDS
     
     def should_apply_tier_filter(self, occasion: str) -> bool:
@@ -544,7 +723,9 @@ class FormalityTierSystem:
         style: str,
         recently_used_item_ids: Set[str],
         safe_get_item_attr_func: callable,
-        occasion_fallbacks: Optional[Dict[str, List[str]]] = None
+        occasion_fallbacks: Optional[Dict[str, List[str]]] = None,
+        user_id: Optional[str] = None,
+        wardrobe_version: Any = None
     ) -> Tuple[List[Any], FormalityTier]:
         """
         Apply progressive tier filtering with fallback.
@@ -556,6 +737,8 @@ class FormalityTierSystem:
             recently_used_item_ids: Set of recently worn item IDs
             safe_get_item_attr_func: Function to safely get item attributes
             occasion_fallbacks: Optional dict of occasion fallbacks for semantic matching
+            user_id: Owner of the wardrobe; with wardrobe_version, reuses the user's tier index
+            wardrobe_version: The user's wardrobeVersion when the wardrobe was read
         
         Returns:
             (filtered_wardrobe, tier_used)
@@ -568,17 +751,16 @@ class FormalityTierSystem:
         target_tier = self.get_target_tier(occasion, style)
         logger.info(f"🎯 TIER SYSTEM: {occasion.upper()} + {style} → Target tier: {target_tier.value}")
         
+        # Tier membership and occasion compatibility are computed once;
+        # each fallback step below only selects a precomputed bucket
+        tier_index = tier_index_for(wardrobe, safe_get_item_attr_func, user_id, wardrobe_version)
+        occasion_mask = tier_index.occasion_mask(occasion, occasion_fallbacks)
+        
         # Try each allowed tier in order
         for tier in config.allowed_tiers:
             logger.info(f"📊 Trying TIER: {tier.value}")
             
-            filtered_items = self._filter_by_tier(
-                wardrobe, 
-                tier, 
-                safe_get_item_attr_func,
-                occasion=occasion,
-                occasion_fallbacks=occasion_fallbacks
-            )
+            filtered_items = tier_index.select(tier, occasion_mask)
             fresh_items = [
                 item for item in filtered_items
                 if safe_get_item_attr_func(item, 'id', '') not in recently_used_item_ids
@@ -609,8 +791,10 @@ class FormalityTierSystem:
         occasion_fallbacks: Optional[Dict[str, List[str]]] = None
     ) -> List[Any]:
         """
-        Filter wardrobe items by formality tier with intelligent keyword matching
-        and occasion compatibility checking.
+        Filter wardrobe items by formality tier and occasion compatibility.
+        
+        Items tagged with the occasion or one of its fallbacks (e.g. "business"
+        or "formal" for "interview") pass the occasion check.
         
         Args:
             wardrobe: List of wardrobe items
@@ -622,109 +806,15 @@ class FormalityTierSystem:
         Returns:
             List of items matching the tier and occasion
         """
-        keywords = self.tier_keywords.get(tier, {})
-        if not keywords:
-            # No keywords for this tier, return all
-            logger.debug("No keyword rules for tier %s; returning the full wardrobe", tier.value)
-            return wardrobe
-        
-        filtered = []
-        blocked_count = 0
-        for item in wardrobe:
-            item_name = safe_get_item_attr_func(item, 'name', '').lower()
-            item_type = str(safe_get_item_attr_func(item, 'type', '')).lower()
-            
-            # First, check if item is blocked (too casual)
-            is_blocked = any(blocked in item_name or blocked in item_type for blocked in self.blocked_keywords)
-
-            if is_blocked:
-                # Find which keyword blocked it
-                blocking_keyword = next((kw for kw in self.blocked_keywords if kw in item_name or kw in item_type), None)
-                logger.debug("Blocked '%s' from %s (keyword: %s)", item_name, tier.value, blocking_keyword)
-                blocked_count += 1
-                continue
-            
-            # Check if item matches tier keywords with INTELLIGENT MATCHING
-            matches_tier = False
-            for category, category_keywords in keywords.items():
-                for keyword in category_keywords:
-                    # Split keyword into words for flexible matching
-                    keyword_words = keyword.split()
-                    
-                    if len(keyword_words) > 1:
-                        # Multi-word keyword (e.g., "pencil dress", "dress shirt", "oxford shoes")
-                        # Check if ALL words from keyword appear in item name/type (order-independent)
-                        # This matches:
-                        #   - "pencil dress" → "Dress pencil Mustard Yellow" ✅
-                        #   - "dress shirt" → "Shirt dress blue" ✅
-                        #   - "oxford shoes" → "Shoes oxford brown" ✅
-                        if all(word in item_name or word in item_type for word in keyword_words):
-                            matches_tier = True
-                            break
-                    else:
-                        # Single-word keyword: use simple substring match
-                        if keyword in item_name or keyword in item_type:
-                            matches_tier = True
-                            break
-                
-                if matches_tier:
-                    break
-            
-            # Also check metadata for formality level
-            if not matches_tier:  # Only check metadata if keyword match failed
-                if hasattr(item, 'metadata') and item.metadata and isinstance(item.metadata, dict):
-                    visual_attrs = item.metadata.get('visualAttributes', {})
-                    if isinstance(visual_attrs, dict):
-                        formal_level = (visual_attrs.get('formalLevel') or '').lower()
-                        
-                        if tier == FormalityTier.TIER_1_STRICT_FORMAL:
-                            if formal_level in ['formal', 'business', 'professional', 'dress']:
-                                matches_tier = True
-                        elif tier == FormalityTier.TIER_2_SMART_CASUAL:
-                            if formal_level in ['smart casual', 'business casual', 'semi-formal']:
-                                matches_tier = True
-                        elif tier == FormalityTier.TIER_3_CREATIVE_CASUAL:
-                            if formal_level in ['casual', 'smart casual', 'creative']:
-                                matches_tier = True
-            
-            # CRITICAL: Check occasion compatibility (with fallbacks)
-            # This ensures items tagged with "business" or "formal" can be used for "interview"
-            if matches_tier and occasion and occasion_fallbacks:
-                item_occasions = safe_get_item_attr_func(item, 'occasion', [])
-                if isinstance(item_occasions, str):
-                    item_occasions = [item_occasions]
-                
-                item_occasions_lower = [occ.lower() for occ in item_occasions]
-                occasion_lower = occasion.lower()
-                
-                # Check if item matches target occasion OR fallback occasions
-                occasion_match = False
-                
-                # Direct match
-                if occasion_lower in item_occasions_lower:
-                    occasion_match = True
-                # Fallback match
-                elif occasion_lower in occasion_fallbacks:
-                    fallback_occasions = [fb.lower() for fb in occasion_fallbacks[occasion_lower]]
-                    if any(fallback in item_occasions_lower for fallback in fallback_occasions):
-                        occasion_match = True
-                
-                # If occasion checking is enabled but item doesn't match, skip it
-                if not occasion_match:
-                    logger.debug(f"   ❌ {item_name}: tier match but occasion mismatch (has {item_occasions_lower}, need {occasion_lower} or {occasion_fallbacks.get(occasion_lower, [])})")
-                    continue
-                else:
-                    logger.debug(f"   ✅ {item_name}: tier + occasion match")
-            
-            if matches_tier:
-                logger.debug("Accepted '%s' for tier %s", item_name, tier.value)
-                filtered.append(item)
-            else:
-                logger.debug("Rejected '%s' from tier %s", item_name, tier.value)
-
-        logger.info(f"📊 TIER FILTER RESULT: {len(filtered)}/{len(wardrobe)} items passed, {blocked_count} blocked")
+        tier_index = TierIndex(wardrobe, safe_get_item_attr_func)
+        filtered = tier_index.select(tier, tier_index.occasion_mask(occasion, occasion_fallbacks))
+        logger.info("📊 TIER FILTER RESULT: %s/%s items passed, %s blocked", len(filtered), len(wardrobe), tier_index.blocked_count)
         return filtered
     
+    def tier_stats(self, wardrobe: List[Any], safe_get_item_attr_func: callable) -> Dict[str, Any]:
+        """Item counts per tier, blocked and unclassified for a wardrobe."""
+        return TierIndex(wardrobe, safe_get_item_attr_func).stats()
+    
     def get_tier_description(self, tier: FormalityTier) -> str:
         """Get human-readable description of tier"""
         descriptions = {
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Declarative Hard-Filter Rules
+=============================
+
+Occasion and style hard constraints are written as ordered rule tables and
+compiled once into predicate closures that run over precomputed
+``ItemFeatures`` (lowercased name, type, occasion tags and visual metadata).
+
+Rule format:
+    Rule(rule_id, when, allow)
+        First rule whose condition matches decides the item.
+    RuleGroup(rule_id, when, rules, otherwise)
+        When the condition matches, the nested rules are evaluated; if none of
+        them fires, ``otherwise`` decides (``None`` falls through to the rules
+        after the group).
+
+Conditions are built from small combinators (``name_has``, ``type_in``,
+``meta_in``, ``occasion_in``, ``all_of``, ``not_`` ...). Substring checks keep
+the original ``keyword in text`` semantics but run as one compiled regex per
+keyword list.
+
+Every decision is counted per rule id in ``hard_filter_rule_hits`` so rule
+effectiveness can be read from ``/api/monitoring/stats/hard-filters``.
+"""
+
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+ALLOW = True
+BLOCK = False
+
+
+class ItemFeatures(NamedTuple):
+    """Lowercased item fields the hard filters look at."""
+    name: str
+    type: str
+    occasions: Tuple[str, ...]
+    waistband: str
+    material: str
+    formal_level: str
+    neckline: str
+
+
+def _visual_attr(visual_attrs: Dict[str, Any], key: str) -> str:
+    return (visual_attrs.get(key) or '').lower()
+
+
+def extract_features(item: Any, item_name: str) -> ItemFeatures:
+    """Compute the features once per item; mirrors the attribute access of the original filters."""
+    raw_type = getattr(item, 'type', '')
+    item_type = raw_type.value.lower() if hasattr(raw_type, 'value') else str(raw_type).lower()
+
+    item_occasions = getattr(item, 'occasion', [])
+    occasions = tuple(occ.lower() for occ in item_occasions) if item_occasions else ()
+
+    visual_attrs = {}
+    metadata = getattr(item, 'metadata', None)
+    if metadata and isinstance(metadata, dict):
+        candidate = metadata.get('visualAttributes', {})
+        if isinstance(candidate, dict):
+            visual_attrs = candidate
+
+    return ItemFeatures(
+        name=item_name.lower(),
+        type=item_type,
+        occasions=occasions,
+        waistband=_visual_attr(visual_attrs, 'waistbandType'),
+        material=_visual_attr(visual_attrs, 'material'),
+        formal_level=_visual_attr(visual_attrs, 'formalLevel'),
+        neckline=_visual_attr(visual_attrs, 'neckline'),
+    )
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# CONDITIONS
+# ═══════════════════════════════════════════════════════════════════════
+
+Condition = Callable[[ItemFeatures, str], bool]
+
+
+def _substring_search(words: Sequence[str]) -> Callable[[str], bool]:
+    pattern = re.compile('|'.join(re.escape(word) for word in sorted(set(words), key=len, reverse=True)))
+    search = pattern.search
+    return lambda text: search(text) is not None
+
+
+def name_has(*words: str) -> Condition:
+    """Any of ``words`` is a substring of the item name."""
+    search = _substring_search(words)
+    return lambda features, occasion: search(features.name)
+
+
+def type_has(*words: str) -> Condition:
+    search = _substring_search(words)
+    return lambda features, occasion: search(features.type)
+
+
+def name_or_type_has(*words: str) -> Condition:
+    """Any of ``words`` is a substring of the name or of the type (checked separately)."""
+    search = _substring_search(words)
+    return lambda features, occasion: search(features.name) or search(features.type)
+
+
+def type_in(*values: str) -> Condition:
+    allowed = frozenset(values)
+    return lambda features, occasion: features.type in allowed
+
+
+def meta_in(field: str, *values: str) -> Condition:
+    """Visual metadata ``field`` (waistband, material, formal_level, neckline) equals one of ``values``."""
+    allowed = frozenset(values)
+    index = ItemFeatures._fields.index(field)
+    return lambda features, occasion: features[index] in allowed
+
+
+def meta_has(field: str, *words: str) -> Condition:
+    search = _substring_search(words)
+    index = ItemFeatures._fields.index(field)
+    return lambda features, occasion: search(features[index])
+
+
+def occasion_tag_in(*values: str) -> Condition:
+    """Any of the item's occasion tags is one of ``values``."""
+    allowed = frozenset(values)
+    return lambda features, occasion: not allowed.isdisjoint(features.occasions)
+
+
+def occasion_in(*values: str) -> Condition:
+    """The requested occasion is one of ``values``."""
+    allowed = frozenset(values)
+    return lambda features, occasion: occasion in allowed
+
+
+def all_of(*conditions: Condition) -> Condition:
+    return lambda features, occasion: all(condition(features, occasion) for condition in conditions)
+
+
+def any_of(*conditions: Condition) -> Condition:
+    return lambda features, occasion: any(condition(features, occasion) for condition in conditions)
+
+
+def not_(condition: Condition) -> Condition:
+    return lambda features, occasion: not condition(features, occasion)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# RULES
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass(frozen=True)
+class Rule:
+    rule_id: str
+    when: Condition
+    allow: bool
+
+
+@dataclass(frozen=True)
+class RuleGroup:
+    rule_id: str
+    when: Condition
+    rules: Sequence[Union[Rule, 'RuleGroup']]
+    otherwise: Optional[bool] = None
+
+
+Decision = Tuple[bool, str]
+_Evaluator = Callable[[ItemFeatures, str], Optional[Decision]]
+
+
+class RuleHitCounter:
+    """Thread-safe per-rule decision counts."""
+
+    def __init__(self):
+        self._hits: Counter = Counter()
+        self._lock = Lock()
+
+    def record(self, filter_name: str, rule_id: str) -> None:
+        with self._lock:
+            self._hits[(filter_name, rule_id)] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            hits = dict(self._hits)
+        stats: Dict[str, Dict[str, int]] = {}
+        for (filter_name, rule_id), count in sorted(hits.items()):
+            stats.setdefault(filter_name, {})[rule_id] = count
+        return stats
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits.clear()
+
+
+def _compile_rules(rules: Sequence[Union[Rule, RuleGroup]], prefix: str = '') -> _Evaluator:
+    evaluators = []
+    for rule in rules:
+        rule_id = f"{prefix}{rule.rule_id}"
+        if isinstance(rule, Rule):
+            def evaluate(features, occasion, when=rule.when, decision=(rule.allow, rule_id)):
+                return decision if when(features, occasion) else None
+        else:
+            nested = _compile_rules(rule.rules, prefix=f"{rule_id}.")
+            otherwise = None if rule.otherwise is None else (rule.otherwise, f"{rule_id}.otherwise")
+
+            def evaluate(features, occasion, when=rule.when, nested=nested, otherwise=otherwise):
+                if not when(features, occasion):
+                    return None
+                decision = nested(features, occasion)
+                return decision if decision is not None else otherwise
+        evaluators.append(evaluate)
+
+    def evaluate_all(features: ItemFeatures, occasion: str) -> Optional[Decision]:
+        for evaluate in evaluators:
+            decision = evaluate(features, occasion)
+            if decision is not None:
+                return decision
+        return None
+
+    return evaluate_all
+
+
+class CompiledFilter:
+    """A rule table compiled into one closure, with per-rule hit counting."""
+
+    def __init__(self, name: str, rules: Sequence[Union[Rule, RuleGroup]], default: bool = ALLOW,
+                 hits: Optional[RuleHitCounter] = None):
+        self.name = name
+        self._evaluate = _compile_rules(rules)
+        self._default = (default, 'default')
+        self._hits = hits if hits is not None else hard_filter_rule_hits
+
+    def decide(self, features: ItemFeatures, occasion: str = '') -> Decision:
+        """Return ``(allowed, rule_id)`` for the first rule that fires."""
+        decision = self._evaluate(features, occasion) or self._default
+        self._hits.record(self.name, decision[1])
+        if decision[0]:
+            logger.debug("✅ %s: ALLOWED %s (%s)", self.name.upper(), features.name[:40], decision[1])
+        else:
+            logger.info("🚫 %s: BLOCKED %s (%s)", self.name.upper(), features.name[:40], decision[1])
+        return decision
+
+    def __call__(self, features: ItemFeatures, occasion: str = '') -> bool:
+        return self.decide(features, occasion)[0]
+
+
+# Global instance
+hard_filter_rule_hits = RuleHitCounter()
@@ -3,9 +3,12 @@ Gamification Service - Handles XP, levels, badges, and gamification events
 """
 
 import logging
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from ..config.firebase import db
+from .user_counter_service import user_counter_service
 from ..custom_types.gamification import (
     BadgeType,
     LevelTier,
@@ -21,6 +24,240 @@ from ..custom_types.gamification import (
 logger = logging.getLogger(__name__)
 
 
+def _badge_info(badge_id: str):
+    try:
+        return BADGE_DEFINITIONS.get(BadgeType(badge_id))
+    except ValueError:
+        return None
+
+
+class XPLedger:
+    """
+    Accumulates XP, style token, badge and event awards for one user during a
+    request and commits them together.
+
+    User document changes go out in a single transaction (``Increment`` for
+    XP and token balances, ``ArrayUnion`` for badges) and analytics events in
+    one batch, so concurrent awards can no longer overwrite each other.
+    """
+    
+    def __init__(self, service: "GamificationService", user_id: str):
+        self.service = service
+        self.user_id = user_id
+        self.xp_awards: List[Dict[str, Any]] = []
+        self.tokens = 0
+        self.badges: List[str] = []
+        self.events: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self._user_data: Optional[Dict[str, Any]] = None
+        self._loaded = False
+    
+    @property
+    def user_data(self) -> Optional[Dict[str, Any]]:
+        """User document as of the first award in this ledger (None if missing)."""
+        if not self._loaded:
+            user_doc = self.service.db.collection('users').document(self.user_id).get()
+            self._user_data = (user_doc.to_dict() or {}) if user_doc.exists else None
+            self._loaded = True
+        return self._user_data
+    
+    def prime(self, user_data: Optional[Dict[str, Any]]) -> None:
+        """Reuse a user document the caller already read in this request."""
+        if not self._loaded:
+            self._user_data = dict(user_data) if user_data is not None else None
+            self._loaded = True
+    
+    @property
+    def pending_xp(self) -> int:
+        return sum(award['amount'] for award in self.xp_awards)
+    
+    def award_xp(self, amount: int, reason: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue an XP award and return the projected result."""
+        if self.user_data is None:
+            return {"error": "User not found"}
+        current_xp = self.user_data.get('xp', 0) + self.pending_xp
+        self.queue_xp(amount, reason, metadata)
+        new_xp = current_xp + amount
+        current_level = self.service.calculate_level(current_xp)
+        new_level = self.service.calculate_level(new_xp)
+        result = {
+            "xp_awarded": amount,
+            "new_xp": new_xp,
+            "level": new_level,
+            "level_up": new_level > current_level,
+            "reason": reason
+        }
+        if result["level_up"]:
+            result["tier"] = self.service.get_level_tier(new_level).value
+        return result
+    
+    def queue_xp(self, amount: int, reason: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Queue an XP award without projecting it (no user read until commit)."""
+        self.xp_awards.append({"amount": amount, "reason": reason, "metadata": metadata or {}})
+    
+    def add_tokens(self, amount: int) -> None:
+        self.tokens += amount
+    
+    def unlock_badge(self, badge_id: str) -> bool:
+        """Queue a badge; False if the user already has it."""
+        if self.user_data is None:
+            return False
+        if badge_id in (self.user_data.get('badges') or []) or badge_id in self.badges:
+            return False
+        self.queue_badge(badge_id)
+        return True
+    
+    def queue_badge(self, badge_id: str) -> None:
+        """Queue a badge without checking the user's badges (the commit skips owned ones)."""
+        if badge_id not in self.badges:
+            self.badges.append(badge_id)
+    
+    def log_event(self, event_type: str, xp_amount: Optional[int] = None, metadata: Optional[Dict[str, Any]] = None) -> None:
+        event_data = {
+            "user_id": self.user_id,
+            "event_type": event_type,
+            "timestamp": datetime.now().isoformat(),
+            "metadata": metadata or {}
+        }
+        if xp_amount is not None:
+            event_data["xp_amount"] = xp_amount
+        self.events.append(event_data)
+    
+    @property
+    def is_empty(self) -> bool:
+        return not (self.xp_awards or self.tokens or self.badges or self.events)
+    
+    def commit(self) -> Dict[str, Any]:
+        """Apply all queued awards (one transaction) and events (one batch)."""
+        if self.is_empty:
+            self.result = {"xp_awarded": 0, "tokens_awarded": 0, "badges_unlocked": [], "level_up": False}
+            return self.result
+        
+        from firebase_admin import firestore
+        
+        user_ref = self.service.db.collection('users').document(self.user_id)
+        total_xp = self.pending_xp
+        
+        @firestore.transactional
+        def _apply(transaction):
+            snapshot = user_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                return None
+            user_data = snapshot.to_dict() or {}
+            old_xp = user_data.get('xp', 0)
+            new_xp = old_xp + total_xp
+            existing_badges = user_data.get('badges') or []
+            new_badges = [badge_id for badge_id in self.badges if badge_id not in existing_badges]
+            
+            update_data = {'updatedAt': int(datetime.now().timestamp() * 1000)}
+            if total_xp:
+                update_data['xp'] = firestore.Increment(total_xp)
+                update_data['level'] = self.service.calculate_level(new_xp)
+            if new_badges:
+                update_data['badges'] = firestore.ArrayUnion(new_badges)
+            if self.tokens:
+                update_data['style_tokens.balance'] = firestore.Increment(self.tokens)
+                update_data['style_tokens.total_earned'] = firestore.Increment(self.tokens)
+                update_data['style_tokens.last_earned_at'] = datetime.now().isoformat()
+            transaction.update(user_ref, update_data)
+            
+            return {
+                "old_xp": old_xp,
+                "new_xp": new_xp,
+                "new_badges": new_badges,
+                "token_balance": (user_data.get('style_tokens') or {}).get('balance', 0) + self.tokens,
+            }
+        
+        applied = _apply(self.service.db.transaction())
+        if applied is None:
+            logger.error(f"User {self.user_id} not found")
+            self.result = {"error": "User not found", "xp_awarded": 0, "tokens_awarded": 0, "badges_unlocked": [], "level_up": False}
+            return self.result
+        
+        old_level = self.service.calculate_level(applied["old_xp"])
+        new_level = self.service.calculate_level(applied["new_xp"])
+        level_up = new_level > old_level
+        
+        # XP events carry the running totals the per-award writes used to log
+        events = []
+        running_xp = applied["old_xp"]
+        for award in self.xp_awards:
+            running_xp += award["amount"]
+            events.append({
+                "user_id": self.user_id,
+                "event_type": "xp_earned",
+                "timestamp": datetime.now().isoformat(),
+                "xp_amount": award["amount"],
+                "metadata": {
+                    "reason": award["reason"],
+                    "new_xp": running_xp,
+                    "new_level": self.service.calculate_level(running_xp),
+                    **award["metadata"]
+                }
+            })
+        if level_up:
+            events.append({
+                "user_id": self.user_id,
+                "event_type": "level_up",
+                "timestamp": datetime.now().isoformat(),
+                "metadata": {
+                    "old_level": old_level,
+                    "new_level": new_level,
+                    "tier": self.service.get_level_tier(new_level).value
+                }
+            })
+            logger.info(f"🎉 User {self.user_id} leveled up! {old_level} → {new_level}")
+        for badge_id in applied["new_badges"]:
+            badge_info = _badge_info(badge_id)
+            events.append({
+                "user_id": self.user_id,
+                "event_type": "badge_unlocked",
+                "timestamp": datetime.now().isoformat(),
+                "metadata": {
+                    "badge_id": badge_id,
+                    "badge_name": badge_info.name if badge_info else badge_id,
+                    "rarity": badge_info.rarity if badge_info else "common"
+                }
+            })
+            logger.info(f"🏆 Badge {badge_id} unlocked for user {self.user_id}")
+        events.extend(self.events)
+        
+        try:
+            events_ref = self.service.db.collection('analytics_events')
+            for start in range(0, len(events), 400):
+                batch = self.service.db.batch()
+                for event_data in events[start:start + 400]:
+                    batch.set(events_ref.document(), event_data)
+                batch.commit()
+        except Exception as e:
+            logger.error(f"Error logging gamification events: {e}", exc_info=True)
+        
+        self.result = {
+            "xp_awarded": total_xp,
+            "new_xp": applied["new_xp"],
+            "level": new_level,
+            "old_level": old_level,
+            "level_up": level_up,
+            "tokens_awarded": self.tokens,
+            "token_balance": applied["token_balance"],
+            "badges_unlocked": applied["new_badges"],
+            "events_logged": len(events)
+        }
+        if level_up:
+            self.result["tier"] = self.service.get_level_tier(new_level).value
+        logger.info(f"✅ Committed XP ledger for user {self.user_id}: {total_xp} XP, {self.tokens} tokens, {len(applied['new_badges'])} badges, {len(events)} events")
+        return self.result
+
+
+_active_ledger: ContextVar[Optional[XPLedger]] = ContextVar("gamification_xp_ledger", default=None)
+
+
+def active_ledger(user_id: str) -> Optional[XPLedger]:
+    """The ledger collecting awards for ``user_id`` in the current request, if any."""
+    ledger = _active_ledger.get()
+    return ledger if ledger is not None and ledger.user_id == user_id else None
+
+
 class GamificationService:
     """Service for managing gamification features"""
     
@@ -61,6 +298,36 @@ class GamificationService:
             progress_percentage=round(progress_percentage, 1)
         )
     
+    @asynccontextmanager
+    async def xp_ledger(self, user_id: str):
+        """
+        Collect every award made for ``user_id`` inside the block and commit
+        them together on exit. Nested use joins the outer ledger.
+        
+        Usage:
+            async with gamification_service.xp_ledger(user_id) as ledger:
+                await gamification_service.award_xp(user_id, 10, "outfit_logged")
+                await gamification_service.unlock_badge(user_id, badge_id)
+            ledger.result  # combined XP / level-up / badge outcome
+        """
+        existing = active_ledger(user_id)
+        if existing is not None:
+            yield existing
+            return
+        
+        ledger = XPLedger(self, user_id)
+        token = _active_ledger.set(ledger)
+        try:
+            yield ledger
+        finally:
+            # Awards made before an error in the block are still kept
+            _active_ledger.reset(token)
+            try:
+                ledger.commit()
+            except Exception as e:
+                logger.error(f"Error committing XP ledger for user {user_id}: {e}", exc_info=True)
+                ledger.result = {"error": str(e), "xp_awarded": 0, "tokens_awarded": 0, "badges_unlocked": [], "level_up": False}
+    
     async def award_xp(
         self,
         user_id: str,
@@ -71,71 +338,34 @@ class GamificationService:
         """
         Award XP to a user and check for level up
         
+        Inside ``xp_ledger`` the award is queued and the projected result is
+        returned; otherwise it is committed immediately.
+        
         Returns:
             Dict containing new_xp, level, level_up (bool), and optional new_badge
         """
         try:
-            user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
-            
-            if not user_doc.exists:
-                logger.error(f"User {user_id} not found")
-                return {"error": "User not found"}
-            
-            user_data = user_doc.to_dict()
-            current_xp = user_data.get('xp', 0)
-            current_level = self.calculate_level(current_xp)
+            ledger = active_ledger(user_id)
+            if ledger is not None:
+                return ledger.award_xp(amount, reason, metadata)
             
-            # Add XP
-            new_xp = current_xp + amount
-            new_level = self.calculate_level(new_xp)
-            
-            level_up = new_level > current_level
-            
-            # Update user document
-            update_data = {
-                'xp': new_xp,
-                'level': new_level,
-                'updatedAt': int(datetime.now().timestamp() * 1000)
-            }
-            user_ref.update(update_data)
-            
-            # Log XP event to analytics
-            await self.log_gamification_event(
-                user_id=user_id,
-                event_type="xp_earned",
-                xp_amount=amount,
-                metadata={
-                    "reason": reason,
-                    "new_xp": new_xp,
-                    "new_level": new_level,
-                    **(metadata or {})
-                }
-            )
+            # Standalone: the commit transaction is the only user read
+            async with self.xp_ledger(user_id) as ledger:
+                ledger.queue_xp(amount, reason, metadata)
+            if "error" in ledger.result:
+                return {"error": ledger.result["error"]}
             
             result = {
                 "xp_awarded": amount,
-                "new_xp": new_xp,
-                "level": new_level,
-                "level_up": level_up,
+                "new_xp": ledger.result["new_xp"],
+                "level": ledger.result["level"],
+                "level_up": ledger.result["level_up"],
                 "reason": reason
             }
+            if result["level_up"]:
+                result["tier"] = ledger.result["tier"]
             
-            # If level up, log that event too
-            if level_up:
-                await self.log_gamification_event(
-                    user_id=user_id,
-                    event_type="level_up",
-                    metadata={
-                        "old_level": current_level,
-                        "new_level": new_level,
-                        "tier": self.get_level_tier(new_level).value
-                    }
-                )
-                result["tier"] = self.get_level_tier(new_level).value
-                logger.info(f"🎉 User {user_id} leveled up! {current_level} → {new_level}")
-            
-            logger.info(f"✅ Awarded {amount} XP to user {user_id} for '{reason}'. New XP: {new_xp}")
+            logger.info(f"✅ Awarded {amount} XP to user {user_id} for '{reason}'. New XP: {result['new_xp']}")
             return result
             
         except Exception as e:
@@ -154,41 +384,25 @@ class GamificationService:
             Dict with success status and badge info
         """
         try:
-            user_ref = self.db.collection('users').document(user_id)
-            user_doc = user_ref.get()
-            
-            if not user_doc.exists:
-                logger.error(f"User {user_id} not found")
-                return {"success": False, "error": "User not found"}
-            
-            user_data = user_doc.to_dict()
-            current_badges = user_data.get('badges', [])
-            
-            # Check if badge already unlocked
-            if badge_id in current_badges:
+            ledger = active_ledger(user_id)
+            if ledger is None:
+                # Standalone: the commit transaction reads the user and decides
+                async with self.xp_ledger(user_id) as ledger:
+                    ledger.queue_badge(badge_id)
+                if "error" in ledger.result:
+                    return {"success": False, "error": ledger.result["error"]}
+                unlocked = badge_id in ledger.result['badges_unlocked']
+            else:
+                if ledger.user_data is None:
+                    logger.error(f"User {user_id} not found")
+                    return {"success": False, "error": "User not found"}
+                unlocked = ledger.unlock_badge(badge_id)
+            
+            if not unlocked:
                 logger.info(f"Badge {badge_id} already unlocked for user {user_id}")
                 return {"success": False, "already_unlocked": True}
             
-            # Add badge
-            current_badges.append(badge_id)
-            user_ref.update({
-                'badges': current_badges,
-                'updatedAt': int(datetime.now().timestamp() * 1000)
-            })
-            
-            # Log badge unlock event
-            badge_info = BADGE_DEFINITIONS.get(BadgeType(badge_id))
-            await self.log_gamification_event(
-                user_id=user_id,
-                event_type="badge_unlocked",
-                metadata={
-                    "badge_id": badge_id,
-                    "badge_name": badge_info.name if badge_info else badge_id,
-                    "rarity": badge_info.rarity if badge_info else "common"
-                }
-            )
-            
-            logger.info(f"🏆 Badge {badge_id} unlocked for user {user_id}")
+            badge_info = _badge_info(badge_id)
             return {
                 "success": True,
                 "badge_id": badge_id,
@@ -262,6 +476,11 @@ class GamificationService:
         - ai_fit_score_updated
         """
         try:
+            ledger = active_ledger(user_id)
+            if ledger is not None:
+                ledger.log_event(event_type, xp_amount, metadata)
+                return True
+            
             event_data = {
                 "user_id": user_id,
                 "event_type": event_type,
@@ -301,9 +520,8 @@ class GamificationService:
             user_data = user_doc.to_dict()
             current_badges = user_data.get('badges', [])
             
-            # Get wardrobe count for starter badges
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            wardrobe_count = len(list(wardrobe_ref.stream()))
+            # Get wardrobe count for starter badges (counter on the user doc)
+            wardrobe_count = user_counter_service.get_count(user_id, 'wardrobeItemCount', user_data)
             
             # Check starter closet badge (10 items)
             if wardrobe_count >= 10 and BadgeType.STARTER_CLOSET.value not in current_badges:
@@ -318,8 +536,7 @@ class GamificationService:
                     newly_unlocked.append(BadgeType.CLOSET_CATALOGER.value)
             
             # Check feedback badges
-            feedback_ref = self.db.collection('outfit_feedback').where('user_id', '==', user_id)
-            feedback_count = len(list(feedback_ref.stream()))
+            feedback_count = user_counter_service.get_count(user_id, 'feedbackCount', user_data)
             
             if feedback_count >= 25 and BadgeType.STYLE_CONTRIBUTOR.value not in current_badges:
                 result = await self.unlock_badge(user_id, BadgeType.STYLE_CONTRIBUTOR.value)
@@ -343,5 +560,5 @@ gamification_service = GamificationService()
 
 
 # Export
-__all__ = ['GamificationService', 'gamification_service']
+__all__ = ['GamificationService', 'XPLedger', 'active_ledger', 'gamification_service']
 
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Beam-Search Outfit Composer
+===========================
+
+Composes outfits slot by slot (top, bottom, shoes, layers, accessories) with a
+bounded beam search instead of filling categories greedily from one sorted
+list.
+
+- ``CandidateIndex`` buckets scored candidates by category once;
+  ``CategoryCache`` lets the fallbacks after the search reuse the same
+  categories instead of re-deriving them.
+- ``BeamOutfitComposer`` expands the best ``beam_width`` partial outfits per
+  slot. Each expansion adds the candidate's score plus its pairwise
+  compatibility with the items already chosen (incremental, cached per
+  pair), and hard constraints (slot rules and pairwise forbidden
+  combinations, also cached per pair) prune the expansion before it is
+  scored.
+- Partial outfits are deduplicated by item set, so the final beam holds the
+  top-N distinct outfits from a single search. ``CompositionPool`` keeps the
+  runner-ups for batch requests and re-ranks them as per-item score
+  adjustments (e.g. session penalties) change between outfits.
+
+Usage:
+    index = CandidateIndex(scored, category_of=CategoryCache(service._get_item_category))
+    composer = BeamOutfitComposer(
+        slots=[SlotSpec('tops', ('tops',)), SlotSpec('bottoms', ('bottoms',)),
+               SlotSpec('shoes', ('shoes',)), SlotSpec('layer', ('outerwear',), required=False)],
+        pair_score=formality_pair_score,
+        is_forbidden=lambda new, existing: service._is_forbidden_combination(new, [existing]),
+    )
+    outfits = composer.compose(index, top_n=5)
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Score charged for a required slot nothing could fill; keeps the partial
+# outfit in the beam so the caller's safety nets can complete it.
+MISSING_SLOT_PENALTY = 10.0
+
+
+@dataclass(frozen=True)
+class Candidate:
+    item_id: str
+    item: Any
+    category: str
+    score: float
+
+
+@dataclass(frozen=True)
+class SlotSpec:
+    """One outfit slot.
+
+    ``accepts(candidate, chosen_items)`` is the slot's hard constraint; it
+    sees the items already in the partial outfit.
+    """
+    name: str
+    categories: Tuple[str, ...]
+    required: bool = True
+    accepts: Optional[Callable[[Candidate, List[Any]], bool]] = None
+
+
+class ComposedOutfit(NamedTuple):
+    candidates: Tuple[Candidate, ...]
+    score: float
+    slots: Tuple[Tuple[str, str], ...]  # (slot name, item id)
+    missing: Tuple[str, ...]
+
+    @property
+    def items(self) -> List[Any]:
+        return [candidate.item for candidate in self.candidates]
+
+    @property
+    def item_ids(self) -> List[str]:
+        return [candidate.item_id for candidate in self.candidates]
+
+
+def _item_key(item: Any) -> Any:
+    item_id = item.get('id') if isinstance(item, dict) else getattr(item, 'id', None)
+    return item_id if item_id else id(item)
+
+
+class CategoryCache:
+    """Item -> category, computed once per item."""
+
+    def __init__(self, category_of: Callable[[Any], str]):
+        self._category_of = category_of
+        self._categories: Dict[Any, str] = {}
+
+    def __call__(self, item: Any) -> str:
+        key = _item_key(item)
+        category = self._categories.get(key)
+        if category is None:
+            category = self._category_of(item)
+            self._categories[key] = category
+        return category
+
+
+class CandidateIndex:
+    """Scored candidates bucketed by category, best first."""
+
+    def __init__(self, scored: Iterable[Tuple[str, Any, float]], category_of: Callable[[Any], str]):
+        self.by_category: Dict[str, List[Candidate]] = {}
+        self.candidates: Dict[str, Candidate] = {}
+        for item_id, item, score in scored:
+            if item_id in self.candidates:
+                continue
+            candidate = Candidate(item_id, item, category_of(item), score)
+            self.candidates[item_id] = candidate
+            self.by_category.setdefault(candidate.category, []).append(candidate)
+        for bucket in self.by_category.values():
+            bucket.sort(key=lambda candidate: candidate.score, reverse=True)
+
+    def get(self, category: str) -> List[Candidate]:
+        return self.by_category.get(category, [])
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
+class _BeamState(NamedTuple):
+    score: float
+    chosen: Tuple[Candidate, ...]
+    ids: frozenset
+    slots: Tuple[Tuple[str, str], ...]
+    missing: Tuple[str, ...]
+
+
+class BeamOutfitComposer:
+    """Bounded beam search over outfit slots."""
+
+    def __init__(
+        self,
+        slots: Sequence[SlotSpec],
+        beam_width: int = 8,
+        candidates_per_slot: int = 10,
+        max_items: Optional[int] = None,  # caps optional slots only
+        pair_score: Optional[Callable[[Candidate, Candidate], float]] = None,
+        is_forbidden: Optional[Callable[[Any, Any], bool]] = None,
+    ):
+        self.slots = list(slots)
+        self.beam_width = beam_width
+        self.candidates_per_slot = candidates_per_slot
+        self.max_items = max_items
+        self._pair_score = pair_score
+        self._is_forbidden = is_forbidden
+        self._pair_cache: Dict[Tuple[str, str], float] = {}
+        self._forbidden_cache: Dict[Tuple[str, str], bool] = {}
+        self.stats = {'expanded': 0, 'pruned': 0}
+
+    def _pair(self, a: Candidate, b: Candidate) -> float:
+        if self._pair_score is None:
+            return 0.0
+        key = (a.item_id, b.item_id) if a.item_id <= b.item_id else (b.item_id, a.item_id)
+        value = self._pair_cache.get(key)
+        if value is None:
+            value = self._pair_score(a, b)
+            self._pair_cache[key] = value
+        return value
+
+    def _forbidden(self, new: Candidate, chosen: Tuple[Candidate, ...]) -> bool:
+        if self._is_forbidden is None:
+            return False
+        for existing in chosen:
+            key = (new.item_id, existing.item_id)
+            forbidden = self._forbidden_cache.get(key)
+            if forbidden is None:
+                forbidden = bool(self._is_forbidden(new.item, existing.item))
+                self._forbidden_cache[key] = forbidden
+            if forbidden:
+                return True
+        return False
+
+    def _slot_candidates(self, index: CandidateIndex, slot: SlotSpec) -> List[Candidate]:
+        pool = [candidate for category in slot.categories for candidate in index.get(category)]
+        if len(slot.categories) > 1:
+            pool.sort(key=lambda candidate: candidate.score, reverse=True)
+        return pool
+
+    def _expand(self, state: _BeamState, slot: SlotSpec, pool: List[Candidate]) -> List[_BeamState]:
+        chosen_items = [candidate.item for candidate in state.chosen]
+        full = not slot.required and self.max_items is not None and len(state.chosen) >= self.max_items
+        expansions = []
+        if not full:
+            for candidate in pool:
+                if len(expansions) >= self.candidates_per_slot:
+                    break
+                if candidate.item_id in state.ids:
+                    continue
+                if slot.accepts is not None and not slot.accepts(candidate, chosen_items):
+                    self.stats['pruned'] += 1
+                    continue
+                if self._forbidden(candidate, state.chosen):
+                    self.stats['pruned'] += 1
+                    continue
+                self.stats['expanded'] += 1
+                delta = candidate.score + sum(self._pair(existing, candidate) for existing in state.chosen)
+                expansions.append(_BeamState(
+                    state.score + delta,
+                    state.chosen + (candidate,),
+                    state.ids | {candidate.item_id},
+                    state.slots + ((slot.name, candidate.item_id),),
+                    state.missing,
+                ))
+        if not slot.required:
+            expansions.append(state)
+        elif not expansions:
+            expansions.append(state._replace(score=state.score - MISSING_SLOT_PENALTY, missing=state.missing + (slot.name,)))
+        return expansions
+
+    def compose(self, index: CandidateIndex, pinned: Sequence[Candidate] = (), top_n: int = 1) -> List[ComposedOutfit]:
+        """Return up to ``top_n`` distinct outfits, best first.
+
+        ``pinned`` candidates (e.g. a base item) are in every outfit and fill
+        the first slot that takes their category.
+        """
+        width = max(self.beam_width, top_n)
+        pinned_slots = {}
+        for candidate in pinned:
+            for slot in self.slots:
+                if slot.name not in pinned_slots and candidate.category in slot.categories:
+                    pinned_slots[slot.name] = candidate
+                    break
+
+        initial = _BeamState(0.0, (), frozenset(), (), ())
+        for candidate in pinned:
+            delta = candidate.score + sum(self._pair(existing, candidate) for existing in initial.chosen)
+            slot_name = next((name for name, pin in pinned_slots.items() if pin is candidate), 'pinned')
+            initial = _BeamState(
+                initial.score + delta,
+                initial.chosen + (candidate,),
+                initial.ids | {candidate.item_id},
+                initial.slots + ((slot_name, candidate.item_id),),
+                (),
+            )
+
+        beam = [initial]
+        for slot in self.slots:
+            if slot.name in pinned_slots:
+                continue
+            pool = self._slot_candidates(index, slot)
+            next_beam: Dict[frozenset, _BeamState] = {}
+            for state in beam:
+                for expanded in self._expand(state, slot, pool):
+                    current = next_beam.get(expanded.ids)
+                    if current is None or expanded.score > current.score:
+                        next_beam[expanded.ids] = expanded
+            beam = sorted(next_beam.values(), key=lambda state: state.score, reverse=True)[:width]
+
+        logger.debug(
+            "🔎 BEAM COMPOSER: %s slots, %s candidates, expanded=%s pruned=%s, %s outfits in final beam",
+            len(self.slots), len(index), self.stats['expanded'], self.stats['pruned'], len(beam),
+        )
+        return [
+            ComposedOutfit(state.chosen, state.score, state.slots, state.missing)
+            for state in beam[:top_n]
+        ]
+
+
+class CompositionPool:
+    """Runner-up outfits from one search, handed out best-first under current score adjustments.
+
+    Each outfit remembers the summed ``adjustment_of`` of its items when it
+    was added; ``take_best`` re-scores by the change since then.
+    """
+
+    def __init__(self, size: int = 1):
+        self.size = size
+        self._entries: List[Tuple[ComposedOutfit, float]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, outfits: Iterable[ComposedOutfit], adjustment_of: Callable[[str], float]) -> None:
+        for outfit in outfits:
+            self._entries.append((outfit, sum(adjustment_of(item_id) for item_id in outfit.item_ids)))
+
+    def take_best(
+        self,
+        adjustment_of: Callable[[str], float],
+        is_available: Optional[Callable[[str], bool]] = None,
+    ) -> Optional[ComposedOutfit]:
+        """Pop the best outfit under current adjustments; outfits with an unavailable item are dropped."""
+        if is_available is not None:
+            self._entries = [
+                entry for entry in self._entries
+                if all(is_available(item_id) for item_id in entry[0].item_ids)
+            ]
+        if not self._entries:
+            return None
+
+        def rescored(entry: Tuple[ComposedOutfit, float]) -> float:
+            outfit, baseline = entry
+            return outfit.score + sum(adjustment_of(item_id) for item_id in outfit.item_ids) - baseline
+
+        best = max(self._entries, key=rescored)
+        self._entries.remove(best)
+        return best[0]
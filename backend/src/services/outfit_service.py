@@ -408,7 +408,8 @@ class OutfitService:
             db = firestore.client()
             
             current_time = datetime.now()
-            updated_count = 0
+            batch = db.batch()
+            worn_items = []
             
             for item in outfit_items:
                 item_id = (item.get('id') if item else None)
@@ -435,20 +436,28 @@ class OutfitService:
                     current_wear_count = (wardrobe_data.get('wearCount', 0) if wardrobe_data else 0)
                     new_wear_count = current_wear_count + 1
                     
-                    wardrobe_ref.update({
+                    batch.update(wardrobe_ref, {
                         'wearCount': new_wear_count,
                         'lastWorn': current_time,
                         'updatedAt': current_time
                     })
-                    
-                    updated_count += 1
-                    logger.info(f"✅ Updated wear counter for item {item_id}: {current_wear_count} → {new_wear_count}")
+                    worn_items.append((wardrobe_data, current_wear_count))
+                    logger.info(f"✅ Queued wear counter for item {item_id}: {current_wear_count} → {new_wear_count}")
                     
                 except Exception as e:
-                    logger.error(f"❌ Failed to update wear counter for item {item_id}: {e}")
+                    logger.error(f"❌ Failed to read wardrobe item {item_id}: {e}")
                     # Continue with other items even if one fails
                     continue
             
+            updated_count = len(worn_items)
+            if worn_items:
+                # Keep the CPW aggregates and wardrobe version in the same batch as the wear counts
+                from .tve_service import tve_service
+                from .wardrobe_analytics_engine import wardrobe_analytics_engine
+                tve_service.on_items_worn(user_id, worn_items, batch=batch)
+                wardrobe_analytics_engine.touch_wardrobe(user_id, batch=batch)
+                batch.commit()
+            
             logger.info(f"✅ Successfully updated wear counters for {updated_count}/{len(outfit_items)} wardrobe items")
             
         except Exception as e:
@@ -14,8 +14,11 @@ This system provides:
 - Comprehensive logging for rule tuning
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import time
@@ -38,6 +41,31 @@ class ValidationResult:
     severity: ValidationSeverity = ValidationSeverity.MEDIUM
     suggestions: List[str] = None
     confidence: float = 1.0
+    timings_ms: Dict[str, float] = None  # Per-validator duration (pipeline result only)
+
+@dataclass
+class ValidatorRun:
+    """One validator's outcome within a pipeline run"""
+    name: str
+    result: Optional[ValidationResult]
+    error: Optional[Exception]
+    duration_ms: float
+    cached: bool = False
+
+# Validator results memoized for the current request (each request runs in its own task)
+validation_memo_var: ContextVar[Optional[Dict[Tuple, ValidatorRun]]] = ContextVar('validation_memo', default=None)
+MAX_MEMO_ENTRIES = 256
+
+def _outfit_fingerprint(outfit: Dict[str, Any], context: 'ValidationContext') -> Optional[Tuple]:
+    """Key identifying an outfit + context for memoization, or None if items lack ids"""
+    item_ids = []
+    for item in (outfit.get('items', []) if outfit else []):
+        item_id = item.get('id') if isinstance(item, dict) else getattr(item, 'id', None)
+        if not item_id:
+            return None
+        item_ids.append(str(item_id))
+    condition = context.weather.get('condition') if isinstance(context.weather, dict) else None
+    return (tuple(item_ids), context.occasion, context.style, context.mood, context.temperature, condition, context.season)
 
 @dataclass
 class ValidationContext:
@@ -72,115 +100,110 @@ class OutfitValidationPipeline:
             "total_validations": 0,
             "failed_validations": 0,
             "common_failures": {},
-            "severity_counts": {severity.value: 0 for severity in ValidationSeverity}
+            "severity_counts": {severity.value: 0 for severity in ValidationSeverity},
+            "validator_timings": {}
         }
         
         # Analytics integration
         self.analytics_enabled = True
     
-    async def validate_outfit(self, outfit: Dict[str, Any], context: ValidationContext) -> ValidationResult:
+    async def validate_outfit(
+        self,
+        outfit: Dict[str, Any],
+        context: ValidationContext,
+        stop_on_critical: bool = False
+    ) -> ValidationResult:
         """
-        Main validation method that runs all validators in sequence
+        Main validation method. Validators run concurrently, each at most once
+        per outfit within a request; the same results feed analytics logging.
+        With ``stop_on_critical`` validators that have not started yet are
+        skipped once one fails with CRITICAL severity.
         """
         start_time = time.time()
         self.validation_stats["total_validations"] += 1
         
-        logger.info(f"🔍 Starting outfit validation pipeline for {context.occasion} occasion")
-        logger.info(f"📋 Outfit items: {len((outfit.get('items', []) if outfit else []))}")
+        logger.info("🔍 Starting outfit validation pipeline for %s occasion", context.occasion)
+        logger.info("📋 Outfit items: %d", len((outfit.get('items', []) if outfit else [])))
+        
+        memo = validation_memo_var.get()
+        if memo is None:
+            memo = {}
+            validation_memo_var.set(memo)
+        elif len(memo) >= MAX_MEMO_ENTRIES:
+            memo.clear()
+        fingerprint = _outfit_fingerprint(outfit, context)
+        stop = asyncio.Event()
+        
+        runs = await asyncio.gather(*(
+            self._run_validator(validator, outfit, context, memo, fingerprint, stop if stop_on_critical else None)
+            for validator in self.validators
+        ))
         
         all_errors = []
         all_warnings = []
         all_suggestions = []
         max_severity = ValidationSeverity.LOW
         min_confidence = 1.0
-        
-        # Run all validators
-        for validator in self.validators:
-            try:
-                result = await validator.validate(outfit, context)
-                
-                if not result.valid:
-                    all_errors.extend(result.errors)
-                    self.validation_stats["failed_validations"] += 1
-                    
-                    # Track common failures for tuning
-                    for error in result.errors:
-                        if error in self.validation_stats["common_failures"]:
-                            self.validation_stats["common_failures"][error] += 1
-                        else:
-                            self.validation_stats["common_failures"][error] = 1
-                
-                if result.warnings:
-                    all_warnings.extend(result.warnings)
-                
-                if result.suggestions:
-                    all_suggestions.extend(result.suggestions)
-                
-                # Track severity
-                if result.severity.value > max_severity.value:
-                    max_severity = result.severity
-                
-                # Track confidence
-                if result.confidence < min_confidence:
-                    min_confidence = result.confidence
-                
-                # Update severity counts
-                self.validation_stats["severity_counts"][result.severity.value] += 1
+        timings_ms = {}
+        
+        for run in runs:
+            if run is None:
+                continue
+            timings_ms[run.name] = run.duration_ms
+            if run.error is not None:
+                logger.error(f"❌ Validator {run.name} failed: {run.error}")
+                all_errors.append(f"Validation error in {run.name}: {str(run.error)}")
+                continue
+            
+            result = run.result
+            if not result.valid:
+                all_errors.extend(result.errors)
+                self.validation_stats["failed_validations"] += 1
                 
-                logger.info(f"✅ {validator.__class__.__name__}: {'PASS' if result.valid else 'FAIL'}")
-                if result.errors:
-                    logger.info(f"   Errors: {result.errors}")
-                if result.warnings:
-                    logger.info(f"   Warnings: {result.warnings}")
-                    
-            except Exception as e:
-                logger.error(f"❌ Validator {validator.__class__.__name__} failed: {e}")
-                all_errors.append(f"Validation error in {validator.__class__.__name__}: {str(e)}")
+                # Track common failures for tuning
+                for error in result.errors:
+                    if error in self.validation_stats["common_failures"]:
+                        self.validation_stats["common_failures"][error] += 1
+                    else:
+                        self.validation_stats["common_failures"][error] = 1
+            
+            if result.warnings:
+                all_warnings.extend(result.warnings)
+            
+            if result.suggestions:
+                all_suggestions.extend(result.suggestions)
+            
+            # Track severity
+            if result.severity.value > max_severity.value:
+                max_severity = result.severity
+            
+            # Track confidence
+            if result.confidence < min_confidence:
+                min_confidence = result.confidence
+            
+            # Update severity counts
+            self.validation_stats["severity_counts"][result.severity.value] += 1
+            
+            logger.info("✅ %s: %s%s", run.name, 'PASS' if result.valid else 'FAIL', ' (cached)' if run.cached else '')
+            if result.errors:
+                logger.info("   Errors: %s", result.errors)
+            if result.warnings:
+                logger.info("   Warnings: %s", result.warnings)
+        
+        skipped = [validator.__class__.__name__ for validator, run in zip(self.validators, runs) if run is None]
+        if skipped:
+            logger.info("⏭️ Skipped after critical failure: %s", skipped)
         
         # Calculate overall result
         is_valid = len(all_errors) == 0
         duration = time.time() - start_time
         
-        logger.info(f"🔍 Validation completed in {duration:.2f}s - {'PASS' if is_valid else 'FAIL'}")
-        logger.info(f"📊 Errors: {len(all_errors)}, Warnings: {len(all_warnings)}")
+        logger.info("🔍 Validation completed in %.2fs - %s", duration, 'PASS' if is_valid else 'FAIL')
+        logger.info("📊 Errors: %d, Warnings: %d", len(all_errors), len(all_warnings))
         
         # Log validation failures to analytics (if enabled and validation failed)
         if self.analytics_enabled and not is_valid:
-            try:
-                from .validation_analytics_service import validation_analytics
-                
-                # Log each validator failure separately
-                for validator in self.validators:
-                    try:
-                        result = await validator.validate(outfit, context)
-                        if not result.valid:
-                            await validation_analytics.log_validation_failure(
-                                validator_name=validator.__class__.__name__,
-                                severity=result.severity.value,
-                                error_message="; ".join(result.errors) if result.errors else "",
-                                warning_message="; ".join(result.warnings) if result.warnings else "",
-                                suggestion_message="; ".join(result.suggestions) if result.suggestions else "",
-                                context={
-                                    "occasion": context.occasion,
-                                    "style": context.style,
-                                    "mood": context.mood,
-                                    "temperature": context.temperature,
-                                    "weather": context.weather
-                                },
-                                outfit_items=(outfit.get("items", []) if outfit else []),
-                                user_id=(context.user_profile.get("id", "unknown") if context.user_profile else "unknown"),
-                                validation_duration=duration,
-                                outfit_id=(outfit.get("id", f"outfit_{int(time.time())}") if outfit else f"outfit_{int(time.time())}"),
-                                generation_request_id=f"req_{int(time.time())}",
-                                retry_attempt=0
-                            )
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to log validation failure for {validator.__class__.__name__}: {e}")
-                        
-            except ImportError:
-                logger.warning("⚠️ Analytics service not available for validation logging")
-            except Exception as e:
-                logger.warning(f"⚠️ Failed to log validation failures: {e}")
+            await self._log_failures_to_analytics(runs, outfit, context, duration)
         
         return ValidationResult(
             valid=is_valid,
@@ -188,9 +211,89 @@ class OutfitValidationPipeline:
             warnings=all_warnings,
             severity=max_severity,
             suggestions=all_suggestions,
-            confidence=min_confidence
+            confidence=min_confidence,
+            timings_ms=timings_ms
         )
     
+    async def _run_validator(
+        self,
+        validator: 'BaseValidator',
+        outfit: Dict[str, Any],
+        context: ValidationContext,
+        memo: Dict[Tuple, ValidatorRun],
+        fingerprint: Optional[Tuple],
+        stop: Optional[asyncio.Event]
+    ) -> Optional[ValidatorRun]:
+        """Run (or reuse) one validator, recording its duration"""
+        name = validator.__class__.__name__
+        if stop is not None and stop.is_set():
+            return None
+        
+        key = (validator, fingerprint) if fingerprint is not None else None
+        cached = memo.get(key) if key is not None else None
+        if cached is not None:
+            run = ValidatorRun(cached.name, cached.result, cached.error, 0.0, cached=True)
+        else:
+            started = time.perf_counter()
+            try:
+                run = ValidatorRun(name, await validator.validate(outfit, context), None, 0.0)
+            except Exception as e:
+                run = ValidatorRun(name, None, e, 0.0)
+            run.duration_ms = (time.perf_counter() - started) * 1000
+            if key is not None:
+                memo[key] = run
+            timing = self.validation_stats["validator_timings"].setdefault(name, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            timing["calls"] += 1
+            timing["total_ms"] += run.duration_ms
+            timing["max_ms"] = max(timing["max_ms"], run.duration_ms)
+        
+        if (stop is not None and run.result is not None and not run.result.valid
+                and run.result.severity == ValidationSeverity.CRITICAL):
+            stop.set()
+        return run
+    
+    async def _log_failures_to_analytics(
+        self,
+        runs: List[Optional[ValidatorRun]],
+        outfit: Dict[str, Any],
+        context: ValidationContext,
+        duration: float
+    ) -> None:
+        """Log each failed validator's (already computed) result to analytics"""
+        try:
+            from .validation_analytics_service import validation_analytics
+        except ImportError:
+            logger.warning("⚠️ Analytics service not available for validation logging")
+            return
+        
+        for run in runs:
+            if run is None or run.result is None or run.result.valid:
+                continue
+            result = run.result
+            try:
+                await validation_analytics.log_validation_failure(
+                    validator_name=run.name,
+                    severity=result.severity.value,
+                    error_message="; ".join(result.errors) if result.errors else "",
+                    warning_message="; ".join(result.warnings) if result.warnings else "",
+                    suggestion_message="; ".join(result.suggestions) if result.suggestions else "",
+                    context={
+                        "occasion": context.occasion,
+                        "style": context.style,
+                        "mood": context.mood,
+                        "temperature": context.temperature,
+                        "weather": context.weather
+                    },
+                    outfit_items=(outfit.get("items", []) if outfit else []),
+                    user_id=(context.user_profile.get("id", "unknown") if context.user_profile else "unknown"),
+                    validation_duration=duration,
+                    outfit_id=(outfit.get("id", f"outfit_{int(time.time())}") if outfit else f"outfit_{int(time.time())}"),
+                    generation_request_id=f"req_{int(time.time())}",
+                    retry_attempt=0
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to log validation failure for {run.name}: {e}")
+    
     def get_validation_stats(self) -> Dict[str, Any]:
         """Get validation statistics for tuning"""
         return self.validation_stats.copy()
@@ -202,6 +305,56 @@ class BaseValidator:
         """Override this method in subclasses"""
         raise NotImplementedError
 
+HEAVY_ITEM_TERMS = {
+    'coats': ['parka', 'down', 'puffer', 'wool coat', 'heavy coat', 'winter coat', 'overcoat'],
+    'materials': ['wool', 'fleece', 'down', 'heavy cotton', 'thick'],
+    'types': ['coat', 'parka', 'overcoat']
+}
+
+LIGHTWEIGHT_ITEM_TERMS = {
+    'jackets': ['blazer', 'sport coat', 'light jacket', 'cardigan', 'sweater'],
+    'materials': ['cotton', 'linen', 'light wool', 'breathable'],
+    'types': ['blazer', 'cardigan', 'sweater']
+}
+
+MODERATE_ITEM_TERMS = {
+    'jackets': ['jacket', 'sweater', 'hoodie', 'cardigan'],
+    'materials': ['cotton', 'light wool', 'acrylic'],
+    'types': ['jacket', 'sweater', 'hoodie']
+}
+
+BORDERLINE_HEAVY_TERMS = ['sweater', 'cardigan', 'jacket', 'blazer']
+WARM_INDICATORS = ['sweater', 'cardigan', 'jacket', 'coat', 'hoodie', 'wool', 'fleece']
+WINTER_INDICATORS = ['parka', 'down', 'puffer', 'winter coat', 'heavy coat', 'overcoat', 'wool coat']
+RAIN_INAPPROPRIATE_MATERIALS = ['suede', 'leather', 'canvas', 'cotton']
+
+class ItemWeightProfile(NamedTuple):
+    """Weather weight classes of an item, from its lowercased name and material"""
+    heavy: bool
+    heavy_coat: bool
+    borderline_heavy: bool
+    lightweight: bool
+    moderate: bool
+    warm: bool
+    heavy_winter: bool
+    rain_inappropriate: bool
+
+@lru_cache(maxsize=4096)
+def item_weight_profile(name: str, material: str) -> ItemWeightProfile:
+    def mentions(terms) -> bool:
+        return any(term in name or term in material for term in terms)
+
+    return ItemWeightProfile(
+        heavy=any(mentions(terms) for terms in HEAVY_ITEM_TERMS.values()),
+        heavy_coat=mentions(HEAVY_ITEM_TERMS['coats']),
+        borderline_heavy=any(term in name for term in BORDERLINE_HEAVY_TERMS) and any(term in material for term in ['wool', 'fleece']),
+        lightweight=any(mentions(terms) for terms in LIGHTWEIGHT_ITEM_TERMS.values()),
+        moderate=any(mentions(terms) for terms in MODERATE_ITEM_TERMS.values()),
+        warm=mentions(WARM_INDICATORS),
+        heavy_winter=mentions(WINTER_INDICATORS),
+        rain_inappropriate=any(term in material for term in RAIN_INAPPROPRIATE_MATERIALS),
+    )
+
 class WeatherValidator(BaseValidator):
     """Validates outfit appropriateness for weather conditions"""
     
@@ -218,23 +371,9 @@ class WeatherValidator(BaseValidator):
         }
         
         # Item weight classifications
-        self.heavy_items = {
-            'coats': ['parka', 'down', 'puffer', 'wool coat', 'heavy coat', 'winter coat', 'overcoat'],
-            'materials': ['wool', 'fleece', 'down', 'heavy cotton', 'thick'],
-            'types': ['coat', 'parka', 'overcoat']
-        }
-        
-        self.lightweight_items = {
-            'jackets': ['blazer', 'sport coat', 'light jacket', 'cardigan', 'sweater'],
-            'materials': ['cotton', 'linen', 'light wool', 'breathable'],
-            'types': ['blazer', 'cardigan', 'sweater']
-        }
-        
-        self.moderate_items = {
-            'jackets': ['jacket', 'sweater', 'hoodie', 'cardigan'],
-            'materials': ['cotton', 'light wool', 'acrylic'],
-            'types': ['jacket', 'sweater', 'hoodie']
-        }
+        self.heavy_items = HEAVY_ITEM_TERMS
+        self.lightweight_items = LIGHTWEIGHT_ITEM_TERMS
+        self.moderate_items = MODERATE_ITEM_TERMS
     
     async def validate(self, outfit: Dict[str, Any], context: ValidationContext) -> ValidationResult:
         errors = []
@@ -353,78 +492,41 @@ class WeatherValidator(BaseValidator):
             'suggestions': suggestions
         }
     
+    def _weight_profile(self, item: Dict[str, Any]) -> ItemWeightProfile:
+        """Weight classes of an item, classified once per (name, material)"""
+        return item_weight_profile(item.get('name', '').lower(), item.get('material', '').lower())
+    
     def _is_heavy_item(self, item: Dict[str, Any]) -> bool:
         """Check if item is heavy (not suitable for hot weather)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        # Check against heavy item classifications
-        for category, terms in self.heavy_items.items():
-            if any(term in name or term in material for term in terms):
-                return True
-        
-        return False
+        return self._weight_profile(item).heavy
     
     def _is_heavy_coat(self, item: Dict[str, Any]) -> bool:
         """Check if item is specifically a heavy coat"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        return any(term in name or term in material for term in self.heavy_items['coats'])
+        return self._weight_profile(item).heavy_coat
     
     def _is_borderline_heavy(self, item: Dict[str, Any]) -> bool:
         """Check if item is borderline heavy (warn but don't error)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        borderline_terms = ['sweater', 'cardigan', 'jacket', 'blazer']
-        return any(term in name for term in borderline_terms) and any(heavy_term in material for heavy_term in ['wool', 'fleece'])
+        return self._weight_profile(item).borderline_heavy
     
     def _is_lightweight_item(self, item: Dict[str, Any]) -> bool:
         """Check if item is lightweight (suitable for warm weather)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        for category, terms in self.lightweight_items.items():
-            if any(term in name or term in material for term in terms):
-                return True
-        
-        return False
+        return self._weight_profile(item).lightweight
     
     def _is_moderate_item(self, item: Dict[str, Any]) -> bool:
         """Check if item is moderate weight (suitable for moderate weather)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        for category, terms in self.moderate_items.items():
-            if any(term in name or term in material for term in terms):
-                return True
-        
-        return False
+        return self._weight_profile(item).moderate
     
     def _is_warm_item(self, item: Dict[str, Any]) -> bool:
         """Check if item provides warmth (suitable for cool weather)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        warm_indicators = ['sweater', 'cardigan', 'jacket', 'coat', 'hoodie', 'wool', 'fleece']
-        return any(indicator in name or indicator in material for indicator in warm_indicators)
+        return self._weight_profile(item).warm
     
     def _is_heavy_winter_item(self, item: Dict[str, Any]) -> bool:
         """Check if item is heavy winter clothing (suitable for very cold weather)"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        winter_indicators = ['parka', 'down', 'puffer', 'winter coat', 'heavy coat', 'overcoat', 'wool coat']
-        return any(indicator in name or indicator in material for indicator in winter_indicators)
+        return self._weight_profile(item).heavy_winter
     
     def _is_inappropriate_for_rain(self, item: Dict[str, Any]) -> bool:
         """Check if item is inappropriate for rainy weather"""
-        name = item.get('name', '').lower()
-        material = item.get('material', '').lower()
-        
-        rain_inappropriate = ['suede', 'leather', 'canvas', 'cotton']
-        return any(material_type in material for material_type in rain_inappropriate)
+        return self._weight_profile(item).rain_inappropriate
 
 class OccasionValidator(BaseValidator):
     """Validates outfit appropriateness for the occasion"""
@@ -22,10 +22,13 @@ class OutfitGenerationService:
     def __init__(self):
         self.logger = logger
     
-    async def generate_outfit_logic(self, req: OutfitRequest, user_id: str) -> Dict[str, Any]:
+    async def generate_outfit_logic(self, req: OutfitRequest, user_id: str, count: int = 1) -> Dict[str, Any]:
         """
         Main outfit generation logic using user's wardrobe and AI recommendations.
         This is the core function extracted from the original outfits.py file.
+        
+        With ``count`` > 1 the extra outfits from the same scoring pass are
+        returned under ``alternatives``.
         """
         print(f"🔎 MAIN LOGIC ENTRY: Starting generation for user {user_id}")
         print(f"🔎 MAIN LOGIC ENTRY: Request - style: {req.style}, mood: {req.mood}, occasion: {req.occasion}")
@@ -217,7 +220,8 @@ class OutfitGenerationService:
                 print(f"🔍 DEBUG WARDROBE ITEMS: No wardrobe items or wardrobe is None")
             
             # Call robust service
-            robust_outfit = await robust_service.generate_outfit(context)
+            robust_outfits = await robust_service.generate_outfits(context, count=count)
+            robust_outfit = robust_outfits[0]
             logger.error(f"🚨 FORCE REDEPLOY v12.0: generate_outfit completed successfully")
             
         except Exception as e:
@@ -330,6 +334,14 @@ class OutfitGenerationService:
             # Log generation strategy
             log_generation_strategy(outfit, user_id)
             
+            if count > 1:
+                outfit['alternatives'] = [
+                    self._alternative_outfit(alternative, req, user_id, wardrobe_items)
+                    for alternative in robust_outfits[1:]
+                    if alternative.items
+                ]
+                logger.info(f"📦 Added {len(outfit['alternatives'])} alternative outfits from the same scoring pass")
+            
             logger.info(f"✨ Generated outfit: {outfit.get('name', 'Unknown')}")
             
         except Exception as conversion_error:
@@ -337,3 +349,27 @@ class OutfitGenerationService:
             raise
         
         return outfit
+    
+    def _alternative_outfit(self, robust_outfit, req: OutfitRequest, user_id: str, wardrobe_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert an extra outfit of a batch into the response format (without outfit analysis)."""
+        alternative = {
+            'id': str(uuid4()),
+            'name': f"{req.style} {req.occasion} outfit",
+            'style': req.style,
+            'mood': req.mood,
+            'occasion': req.occasion,
+            'items': robust_outfit.items,
+            'confidence_score': robust_outfit.confidence,
+            'reasoning': f"Generated using robust service for {req.occasion} {req.style} style",
+            'createdAt': datetime.now(),
+            'user_id': user_id,
+            'generated_at': datetime.now().isoformat(),
+            'metadata': {
+                'generation_strategy': 'robust_service',
+                'generation_time': time.time(),
+                'batch_index': (robust_outfit.metadata or {}).get('batch_index'),
+            }
+        }
+        if req.baseItemId:
+            alternative = ensure_base_item_included(alternative, req.baseItemId, wardrobe_items)
+        return clean_for_firestore(alternative)
@@ -14,6 +14,7 @@ from typing import Dict, Any, List, Optional
 from datetime import datetime
 from ..config.firebase import db
 from ..core.validation_rules import validation_rules
+from ..core.tracing import tracer
 
 class PipelineTracingService:
     """Service for managing comprehensive pipeline traces during outfit generation."""
@@ -41,6 +42,7 @@ class PipelineTracingService:
             "session_id": self.session_id
         }
         self.current_trace.append(trace_entry)
+        tracer.add_event(step, method=method, duration=duration, errors=len(errors or []))
     
     def add_validation_error(self, error_type: str, item_id: Optional[str] = None, 
                            reason: str = "", details: Optional[Dict[str, Any]] = None) -> None:
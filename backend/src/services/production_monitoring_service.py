@@ -15,13 +15,25 @@ import time
 import logging
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, List
-from collections import defaultdict
+from collections import defaultdict, deque
 from enum import Enum
 import traceback
 import os
 
+from ..core.latency_sketch import WindowedLatencySketch
+
 logger = logging.getLogger(__name__)
 
+# Latency sketches cover the longest dashboard window (24 hours)
+LATENCY_WINDOW_MINUTES = 1440
+
+# Recent errors kept in memory for the dashboard
+MAX_RECENT_ERRORS = 1000
+
+# Latency alerts look at p95 over this window, at most once per cooldown
+LATENCY_ALERT_WINDOW_MINUTES = 5
+LATENCY_ALERT_COOLDOWN_SECONDS = 300
+
 
 class OperationType(str, Enum):
     """Types of operations to monitor."""
@@ -72,8 +84,9 @@ class ProductionMonitoringService:
         
         # In-memory metrics (for fast aggregation)
         self.metrics = {
-            'errors': [],
-            'performance': [],
+            'errors': deque(maxlen=MAX_RECENT_ERRORS),
+            # operation -> per-minute latency histograms
+            'performance': defaultdict(lambda: WindowedLatencySketch(LATENCY_WINDOW_MINUTES)),
             'success_rates': defaultdict(lambda: {'success': 0, 'failure': 0}),
             'user_journeys': defaultdict(dict),
             'service_layers': defaultdict(int),
@@ -89,6 +102,8 @@ class ProductionMonitoringService:
             'success_rate_minimum': 90,  # 90% minimum success rate
         }
         
+        self._last_latency_alert: Dict[str, float] = {}
+        
         # Firebase (lazy load)
         self._db = None
         self._firebase_available = None
@@ -173,8 +188,8 @@ class ProductionMonitoringService:
             # Check if we need to alert
             await self._check_alert_thresholds(operation, error_data)
         
-        # Add to performance log
-        self.metrics['performance'].append(perf_data)
+        # Add to the operation's latency sketch
+        self.metrics['performance'][operation].record(duration_ms)
         
         # Persist to Firebase (async, non-blocking)
         if self.db and self.environment == "production":
@@ -183,8 +198,12 @@ class ProductionMonitoringService:
             except Exception as e:
                 logger.warning(f"Failed to persist metrics to Firebase: {e}")
         
+        threshold_ms = self._latency_threshold(operation)
+        if duration_ms > threshold_ms:
+            await self._check_latency_threshold(operation, threshold_ms)
+        
         # Log important events
-        if status == "failure" or duration_ms > self.thresholds.get(f'{operation}_time_ms', float('inf')):
+        if status == "failure" or duration_ms > threshold_ms:
             logger.warning(
                 f"🚨 {operation} - {status} - {duration_ms:.0f}ms - User: {user_id}",
                 extra={
@@ -348,6 +367,27 @@ class ProductionMonitoringService:
             return 100.0
         return (stats['success'] / total) * 100
     
+    def get_performance_percentiles(
+        self,
+        operation: OperationType,
+        percentiles: List[float],
+        time_window_minutes: int = 60
+    ) -> List[Optional[float]]:
+        """
+        Get several performance percentiles for an operation from one merged sketch.
+        
+        Args:
+            operation: Operation type
+            percentiles: Percentiles to calculate (e.g., [50, 95, 99])
+            time_window_minutes: Time window to consider (at most 24 hours)
+            
+        Returns:
+            Durations in ms (None when nothing was recorded in the window)
+        """
+        if operation not in self.metrics['performance']:
+            return [None] * len(percentiles)
+        return self.metrics['performance'][operation].quantiles(percentiles, time_window_minutes)
+    
     def get_performance_percentile(
         self,
         operation: OperationType,
@@ -365,22 +405,7 @@ class ProductionMonitoringService:
         Returns:
             Duration in ms at the specified percentile
         """
-        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=time_window_minutes)
-        
-        # Filter to operation and time window
-        relevant_metrics = [
-            m for m in self.metrics['performance']
-            if m['operation'] == operation and
-            datetime.fromisoformat(m['timestamp']) > cutoff_time
-        ]
-        
-        if not relevant_metrics:
-            return None
-        
-        # Calculate percentile
-        durations = sorted([m['duration_ms'] for m in relevant_metrics])
-        index = int(len(durations) * (percentile / 100))
-        return durations[index] if index < len(durations) else durations[-1]
+        return self.get_performance_percentiles(operation, [percentile], time_window_minutes)[0]
     
     def get_cache_hit_rate(self) -> float:
         """Calculate cache hit rate."""
@@ -453,14 +478,10 @@ class ProductionMonitoringService:
         }
         
         # Performance percentiles
-        performance = {
-            op: {
-                'p50': self.get_performance_percentile(op, 50, time_window_minutes),
-                'p95': self.get_performance_percentile(op, 95, time_window_minutes),
-                'p99': self.get_performance_percentile(op, 99, time_window_minutes),
-            }
-            for op in OperationType
-        }
+        performance = {}
+        for op in OperationType:
+            p50, p95, p99 = self.get_performance_percentiles(op, [50, 95, 99], time_window_minutes)
+            performance[op] = {'p50': p50, 'p95': p95, 'p99': p99}
         
         return {
             'time_window_minutes': time_window_minutes,
@@ -501,6 +522,33 @@ class ProductionMonitoringService:
                     data=error_data
                 )
     
+    def _latency_threshold(self, operation: OperationType) -> float:
+        name = getattr(operation, 'value', operation)
+        return self.thresholds.get(f'{name}_time_ms', float('inf'))
+    
+    async def _check_latency_threshold(self, operation: OperationType, threshold_ms: float) -> None:
+        """Alert when an operation's recent p95 exceeds its latency threshold."""
+        now = time.time()
+        if now - self._last_latency_alert.get(operation, 0) < LATENCY_ALERT_COOLDOWN_SECONDS:
+            return
+        
+        p95 = self.get_performance_percentile(operation, 95, LATENCY_ALERT_WINDOW_MINUTES)
+        if p95 is None or p95 <= threshold_ms:
+            return
+        
+        self._last_latency_alert[operation] = now
+        logger.critical(
+            f"🚨🚨 CRITICAL: {operation} p95 latency is {p95:.0f}ms over the last {LATENCY_ALERT_WINDOW_MINUTES} minutes",
+            extra={'extra_fields': {'operation': operation, 'p95_ms': p95, 'threshold_ms': threshold_ms}}
+        )
+        if self.environment == "production":
+            await self._send_alert(
+                title=f"High Latency Alert: {operation}",
+                message=f"p95 latency: {p95:.0f}ms (threshold: {threshold_ms:.0f}ms)",
+                severity="warning",
+                data={'operation': operation, 'p95_ms': p95, 'window_minutes': LATENCY_ALERT_WINDOW_MINUTES}
+            )
+    
     async def _send_alert(
         self,
         title: str,
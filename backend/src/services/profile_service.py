@@ -6,6 +6,7 @@ import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
 from ..config.firebase import db
+from .daily_suggestion_service import DUE_HOUR_FIELD, suggestion_due_utc_hour
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,8 @@ async def update_user_location_data(user_id: str, location_data: Dict[str, Any])
             },
             'updatedAt': int(datetime.now().timestamp() * 1000)
         }
+        # Keeps the user in the right bucket for the daily suggestions job (and tracks DST changes)
+        update_data[DUE_HOUR_FIELD] = suggestion_due_utc_hour(update_data['location_data'])
         
         # Update user document (Firestore is synchronous)
         user_ref.update(update_data)
@@ -2,7 +2,7 @@
 from copy import deepcopy
 from datetime import datetime
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from pydantic import BaseModel, Field, ValidationError
 
 # Import the main ClothingItem model to ensure consistency
@@ -57,6 +57,40 @@ except ImportError:
         formalityLevel: str | None = None
         fit: str | None = None
 
+try:
+    from ..core.cache import BoundedStore, register_bounded_store
+except ImportError:
+    from core.cache import BoundedStore, register_bounded_store
+
+# -------------------------------
+# Hydration cache
+# -------------------------------
+# Validated ClothingItems keyed by (item id, updatedAt), so an unchanged
+# wardrobe is not re-validated on every generation. Every wardrobe writer
+# bumps updatedAt; the TTL bounds staleness from any that do not.
+HYDRATION_CACHE_TTL_SECONDS = 10 * 60
+HYDRATION_CACHE_SIZE = 20000
+
+hydration_cache = register_bounded_store(BoundedStore(
+    "hydrated_wardrobe_items",
+    max_entries=HYDRATION_CACHE_SIZE,
+    ttl=HYDRATION_CACHE_TTL_SECONDS,
+    refresh_on_access=False,
+))
+
+
+def hydration_cache_key(raw_item: Dict[str, Any]) -> Optional[Tuple[Any, Any]]:
+    """(id, updatedAt) for items that carry both; others are always hydrated."""
+    item_id = raw_item.get('id')
+    updated_at = raw_item.get('updatedAt')
+    if not item_id or updated_at in (None, ""):
+        return None
+    try:
+        hash(updated_at)
+    except TypeError:
+        return None
+    return (item_id, updated_at)
+
 # -------------------------------
 # Synthetic placeholder values
 # -------------------------------
@@ -178,15 +212,28 @@ def hydrate_wardrobe_items(items: List[Dict[str, Any]]) -> List[ClothingItem]:
     Safety-net hydrator for wardrobe items.
     Always patches core survival fields.
     Returns a new list of ClothingItem instances (immutable copies).
+    
+    Items already validated at the same (id, updatedAt) come from
+    ``hydration_cache`` as shallow copies; their nested metadata dicts are
+    shared and must be treated as read-only.
     """
     logger.error(f"🚨 FORCE REDEPLOY v10.0: HYDRATE_ENTRY: Processing {len(items)} items")
     patched_items = []
+    cache_hits = 0
 
     for raw_item in items:
         # Skip None items
         if raw_item is None:
             logger.warning(f"⚠️ Skipping None item in wardrobe")
             continue
+        
+        cache_key = hydration_cache_key(raw_item) if isinstance(raw_item, dict) else None
+        if cache_key is not None:
+            cached_item = hydration_cache.get(cache_key)
+            if cached_item is not None:
+                patched_items.append(cached_item.model_copy())
+                cache_hits += 1
+                continue
             
         item_copy = deepcopy(raw_item)
         
@@ -217,11 +264,15 @@ def hydrate_wardrobe_items(items: List[Dict[str, Any]]) -> List[ClothingItem]:
         # Convert to Pydantic model
         try:
             clothing_item = ClothingItem(**item_copy)
-            patched_items.append(clothing_item)
         except ValidationError as e:
             logger.error(f"❌ Failed to create ClothingItem: {e}")
             continue
+        if cache_key is not None:
+            hydration_cache.set(cache_key, clothing_item)
+            clothing_item = clothing_item.model_copy()
+        patched_items.append(clothing_item)
 
+    logger.debug("💧 HYDRATION: %s/%s items served from cache", cache_hits, len(items))
     return patched_items
 
 # -------------------------------
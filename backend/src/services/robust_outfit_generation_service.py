@@ -23,12 +23,14 @@ from enum import Enum
 # Robust import strategy to handle different execution contexts
 from ..config.feature_flags import is_semantic_match_enabled, is_debug_output_enabled, is_force_traditional_enabled
 from ..utils.semantic_normalization import normalize_item_metadata
-from ..utils.semantic_compatibility import style_matches, mood_matches, occasion_matches
+from ..utils.semantic_compatibility import style_matches, mood_matches, occasion_matches, semantic_wardrobe_matches
 from ..utils.semantic_telemetry import record_semantic_filtering_metrics
 from ..utils.enhanced_debug_output import format_final_debug_response
 from ..utils.base_item_debugger import BaseItemTracker
+from ..core.tracing import tracer
 from .outfit_strategy_selector import get_strategy_selector, OutfitStrategy
 from .outfit_strategy_implementation import StrategyImplementation
+from .outfit_composer import BeamOutfitComposer, Candidate, CandidateIndex, CategoryCache, CompositionPool, SlotSpec
 from .filters import FormalityTierSystem, OccasionFilters
 
 # Extracted modules for better maintainability
@@ -414,7 +416,13 @@ class RobustOutfitGenerationService:
             return item.get(attr, default)
         else:
             return default
-    
+
+    def _wardrobe_version(self, context) -> Any:
+        """The wardrobeVersion on the already-loaded user doc (None when unknown)."""
+        from .wardrobe_analytics_engine import WARDROBE_VERSION_FIELD
+
+        return self.safe_get_item_attr(context.user_profile, WARDROBE_VERSION_FIELD)
+
     def _get_item_formality_level(self, item) -> Optional[int]:
         """Get item's formality level (0=casual, 1=smart casual, 2=business casual, 3=formal, 4=black tie)"""
         # Check metadata first
@@ -978,7 +986,19 @@ class RobustOutfitGenerationService:
     
     async def generate_outfit(self, context: GenerationContext) -> OutfitGeneratedOutfit:
         """Generate an outfit with multi-layered scoring system"""
-        logger.info(f"🎨 Starting robust outfit generation for user {context.user_id}")
+        outfits = await self.generate_outfits(context, count=1)
+        return outfits[0]
+    
+    async def generate_outfits(self, context: GenerationContext, count: int = 1) -> List[OutfitGeneratedOutfit]:
+        """
+        Generate up to ``count`` diverse outfits from one filtering and scoring pass.
+        
+        Hydration, filtering, the analyzers and diversity loading run once; each
+        extra outfit only re-runs cohesive composition, with the items already
+        used in the batch penalized through the session tracker.
+        """
+        count = max(1, int(count or 1))
+        logger.info(f"🎨 Starting robust outfit generation for user {context.user_id} (count={count})")
         logger.info(f"📋 Context: {context.occasion}, {context.style}, {context.mood}")
         logger.info(f"📦 Wardrobe size: {len(context.wardrobe)} items")
         
@@ -1007,26 +1027,34 @@ class RobustOutfitGenerationService:
         # ═══════════════════════════════════════════════════════════════════════
         # 🔥 COMPREHENSIVE ERROR TRACING FOR NoneType .get() DEBUGGING
         # ═══════════════════════════════════════════════════════════════════════
-        try:
-            return await self._generate_outfit_internal(context, session_id)
-        except Exception as e:
-            import traceback
-            error_details = {
-                "error_type": str(type(e).__name__),
-                "error_message": str(e),
-                "full_traceback": traceback.format_exc(),
-                "context_info": {
-                    "context_type": str(type(context)),
-                    "context_wardrobe_length": len(context.wardrobe) if hasattr(context, 'wardrobe') and context.wardrobe else 0,
-                    "context_occasion": getattr(context, 'occasion', 'NO_OCCASION'),
-                    "context_style": getattr(context, 'style', 'NO_STYLE'),
-                    "context_user_id": getattr(context, 'user_id', 'NO_USER_ID')
+        with tracer.trace(
+            "robust_generation",
+            occasion=context.occasion,
+            style=context.style,
+            mood=context.mood,
+            wardrobe_size=len(context.wardrobe),
+            count=count,
+        ):
+            try:
+                return await self._generate_outfit_internal(context, session_id, count=count)
+            except Exception as e:
+                import traceback
+                error_details = {
+                    "error_type": str(type(e).__name__),
+                    "error_message": str(e),
+                    "full_traceback": traceback.format_exc(),
+                    "context_info": {
+                        "context_type": str(type(context)),
+                        "context_wardrobe_length": len(context.wardrobe) if hasattr(context, 'wardrobe') and context.wardrobe else 0,
+                        "context_occasion": getattr(context, 'occasion', 'NO_OCCASION'),
+                        "context_style": getattr(context, 'style', 'NO_STYLE'),
+                        "context_user_id": getattr(context, 'user_id', 'NO_USER_ID')
+                    }
                 }
-            }
-            logger.error("🔥 ROBUST SERVICE CRASH - NoneType .get() error detected", extra=error_details, exc_info=True)
-            raise
+                logger.error("🔥 ROBUST SERVICE CRASH - NoneType .get() error detected", extra=error_details, exc_info=True)
+                raise
     
-    async def _generate_outfit_internal(self, context: GenerationContext, session_id: str) -> OutfitGeneratedOutfit:
+    async def _generate_outfit_internal(self, context: GenerationContext, session_id: str, count: int = 1) -> List[OutfitGeneratedOutfit]:
         """Internal outfit generation logic with full error handling and session tracking"""
         
         logger.info("Starting robust generation pipeline for occasion '%s'", context.occasion)
@@ -1046,27 +1074,30 @@ class RobustOutfitGenerationService:
         base_item_tracker.checkpoint("01_initial_wardrobe", context.wardrobe, f"Starting with {len(context.wardrobe)} items")
         
         # Hydrate wardrobe items
-        logger.debug(f"🔄 Hydrating {len(context.wardrobe)} wardrobe items")
+        logger.debug("🔄 Hydrating %s wardrobe items", len(context.wardrobe))
+        hydration_span = tracer.start_span("hydration", items=len(context.wardrobe))
         try:
             if isinstance(context.wardrobe, list) and len(context.wardrobe) > 0 and isinstance(context.wardrobe[0], dict):
                 safe_wardrobe = ensure_items_safe_for_pydantic(context.wardrobe)
-                logger.debug(f"✅ Hydrated {len(safe_wardrobe)} items successfully")
+                logger.debug("✅ Hydrated %s items successfully", len(safe_wardrobe))
                 if context:
                     context.wardrobe = safe_wardrobe
                 base_item_tracker.checkpoint("02_after_hydration", context.wardrobe, "After hydration")
             else:
-                logger.debug(f"✅ Items already ClothingItem objects")
+                logger.debug("✅ Items already ClothingItem objects")
         except Exception as hydrator_error:
-            logger.error(f"❌ Hydration failed: {hydrator_error}")
+            logger.error("❌ Hydration failed: %s", hydrator_error)
+            hydration_span.set_attribute("error", str(hydrator_error))
             # print(f"🚨 HYDRATION ERROR: {hydrator_error}")
             import traceback
             # print(f"🚨 HYDRATION TRACEBACK: {traceback.format_exc()}")
+        hydration_span.end()
         
         # DEBUG: Check context types after hydration
-        logger.debug(f"🔍 DEBUG: After hydration - user_profile type: {type(context.user_profile)}")
-        logger.debug(f"🔍 DEBUG: After hydration - weather type: {type(context.weather)}")
+        logger.debug("🔍 DEBUG: After hydration - user_profile type: %s", type(context.user_profile))
+        logger.debug("🔍 DEBUG: After hydration - weather type: %s", type(context.weather))
         if isinstance(context.user_profile, list):
-            logger.error(f"🚨 ERROR: user_profile is a list: {context.user_profile}")
+            logger.error("🚨 ERROR: user_profile is a list: %s", context.user_profile)
             debug_info = {
                 "pipeline_stage": "early_return_user_profile_list",
                 "context_wardrobe_count": len(context.wardrobe),
@@ -1080,9 +1111,9 @@ class RobustOutfitGenerationService:
                     } for item in (context.wardrobe if context else [])[:3]
                 ]
             }
-            return OutfitGeneratedOutfit(items=[], confidence=0.1, metadata={"generation_strategy": "multi_layered", "error": "user_profile_is_list", "debug_info": debug_info})
+            return [OutfitGeneratedOutfit(items=[], confidence=0.1, metadata={"generation_strategy": "multi_layered", "error": "user_profile_is_list", "debug_info": debug_info})]
         if isinstance(context.weather, list):
-            logger.error(f"🚨 ERROR: weather is a list: {context.weather}")
+            logger.error("🚨 ERROR: weather is a list: %s", context.weather)
             debug_info = {
                 "pipeline_stage": "early_return_weather_list",
                 "context_wardrobe_count": len(context.wardrobe),
@@ -1096,7 +1127,7 @@ class RobustOutfitGenerationService:
                     } for item in (context.wardrobe if context else [])[:3]
                 ]
             }
-            return OutfitGeneratedOutfit(items=[], confidence=0.1, metadata={"generation_strategy": "multi_layered", "error": "weather_is_list", "debug_info": debug_info})
+            return [OutfitGeneratedOutfit(items=[], confidence=0.1, metadata={"generation_strategy": "multi_layered", "error": "weather_is_list", "debug_info": debug_info})]
         
         # Smart weather defaults - dynamic based on context
         temp = 70.0  # Default temperature
@@ -1120,9 +1151,9 @@ class RobustOutfitGenerationService:
                 temp = 70.0  # Neutral default
                 condition = 'clear'
             
-            logger.warning(f"⚠️ Missing weather data, using SMART DEFAULT: {temp}°F, {condition} (occasion: {context.occasion})")
+            logger.warning("⚠️ Missing weather data, using SMART DEFAULT: %s°F, %s (occasion: %s)", temp, condition, context.occasion)
             # Log for learning system
-            logger.info(f"📊 DEFAULT_APPLIED: weather_default_occasion_{context.occasion.lower()}_temp_{temp}")
+            logger.info("📊 DEFAULT_APPLIED: weather_default_occasion_%s_temp_%s", context.occasion.lower(), temp)
             
             # Create a mock weather object for consistency
             class MockWeather:
@@ -1132,13 +1163,13 @@ class RobustOutfitGenerationService:
             
             if context:
                 context.weather = MockWeather(temp, condition)
-            logger.info(f"🔧 Created mock weather object: {context.weather.temperature}°F, {context.weather.condition}")
+            logger.info("🔧 Created mock weather object: %s°F, %s", context.weather.temperature, context.weather.condition)
         
-        logger.info(f"🌤️ Weather: {temp}°F, {condition}")
+        logger.info("🌤️ Weather: %s°F, %s", temp, condition)
         
         # Smart user profile defaults - context-aware
         if not context.user_profile:
-            logger.warning(f"⚠️ Missing user profile, using SMART DEFAULTS")
+            logger.warning("⚠️ Missing user profile, using SMART DEFAULTS")
             # Smart defaults based on occasion/style
             if (context.occasion if context else "unknown").lower() in ['business', 'formal']:
                 context.user_profile = {
@@ -1177,21 +1208,21 @@ class RobustOutfitGenerationService:
                     'stylePreferences': {}
                 }
             
-            logger.info(f"🎯 SMART PROFILE DEFAULT: {context.user_profile['bodyType']} body type for {context.occasion} occasion")
+            logger.info("🎯 SMART PROFILE DEFAULT: %s body type for %s occasion", context.user_profile['bodyType'], context.occasion)
             # Log for learning system
-            logger.info(f"📊 DEFAULT_APPLIED: profile_default_occasion_{context.occasion.lower()}_body_{context.user_profile['bodyType'].lower()}")
+            logger.info("📊 DEFAULT_APPLIED: profile_default_occasion_%s_body_%s", context.occasion.lower(), context.user_profile['bodyType'].lower())
         
         # Log wardrobe breakdown
         item_types = [self.safe_get_item_type(item) for item in (context.wardrobe if context else [])]
         type_counts = {item_type: item_types.count(item_type) for item_type in set(item_types)}
-        logger.info(f"📊 Wardrobe breakdown: {type_counts}")
+        logger.info("📊 Wardrobe breakdown: %s", type_counts)
         
         # ═══════════════════════════════════════════════════════════
         # MULTI-LAYERED SCORING SYSTEM
         # Each analyzer scores items, then cohesive composition uses all scores
         # ═══════════════════════════════════════════════════════════
         
-        logger.info(f"🔬 PHASE 1: Filtering & Multi-Layered Analysis & Scoring")
+        logger.info("🔬 PHASE 1: Filtering & Multi-Layered Analysis & Scoring")
         logger.debug("Checking tier filter for occasion '%s'", context.occasion)
         
         # ═══════════════════════════════════════════════════════════
@@ -1205,6 +1236,7 @@ class RobustOutfitGenerationService:
         # BEFORE the occasion filter, so we don't lose formal items
         # This allows style-aware fallback (Tier 1 → Tier 2 → Tier 3)
         progressive_filter_applied = False
+        tier_span = tracer.start_span("tier_filter", items_before=len(context.wardrobe))
 
         logger.debug(
             "Tier filter check: occasion=%s should_apply=%s",
@@ -1227,7 +1259,9 @@ class RobustOutfitGenerationService:
                     style=context.style,
                     recently_used_item_ids=recently_used_item_ids,
                     safe_get_item_attr_func=self.safe_get_item_attr,
-                    occasion_fallbacks=OCCASION_FALLBACKS  # NEW: Pass fallbacks for semantic matching
+                    occasion_fallbacks=OCCASION_FALLBACKS,  # NEW: Pass fallbacks for semantic matching
+                    user_id=context.user_id,
+                    wardrobe_version=self._wardrobe_version(context)
                 )
                 context.wardrobe = filtered_wardrobe
                 progressive_filter_applied = True
@@ -1249,11 +1283,16 @@ class RobustOutfitGenerationService:
                     len(context.wardrobe),
                 )
             except Exception as e:
-                logger.error(f"❌ PROGRESSIVE TIER FILTER ERROR: {e}")
+                logger.error("❌ PROGRESSIVE TIER FILTER ERROR: %s", e)
                 import traceback
-                logger.error(f"❌ TRACEBACK: {traceback.format_exc()}")
+                logger.error("❌ TRACEBACK: %s", traceback.format_exc())
         else:
             logger.debug("Progressive tier filter skipped for occasion '%s'", context.occasion)
+        tier_span.end(
+            applied=progressive_filter_applied,
+            tier=(getattr(context, 'tier_filter_results', None) or {}).get('tier_used'),
+            items_after=len(context.wardrobe),
+        )
         
         # Store flag in context so hard filter can skip if progressive filter was used
         context.progressive_filter_applied = progressive_filter_applied
@@ -1262,16 +1301,17 @@ class RobustOutfitGenerationService:
         # STEP 1: OCCASION-FIRST FILTERING (Skipped for tier-based occasions)
         # ═══════════════════════════════════════════════════════════
         
-        logger.info(f"🎯 STEP 1: Occasion-First Filtering")
+        logger.info("🎯 STEP 1: Occasion-First Filtering")
+        occasion_span = tracer.start_span("occasion_filter", items_before=len(context.wardrobe), skipped=progressive_filter_applied)
         
         # CRITICAL: Skip occasion filter if tier filter was applied (it already did the filtering)
         if progressive_filter_applied:
-            logger.info(f"✅ STEP 1 SKIPPED: Tier filter already applied, using {len(context.wardrobe)} items")
+            logger.info("✅ STEP 1 SKIPPED: Tier filter already applied, using %s items", len(context.wardrobe))
             occasion_candidates = context.wardrobe
         elif context.base_item_id:
-            logger.info(f"🎯 BASE ITEM MODE: Skipping strict occasion filter, will use OR logic in STEP 2")
+            logger.info("🎯 BASE ITEM MODE: Skipping strict occasion filter, will use OR logic in STEP 2")
             occasion_candidates = context.wardrobe  # Use entire wardrobe
-            logger.info(f"✅ STEP 1 SKIPPED: Using all {len(occasion_candidates)} items (base item mode)")
+            logger.info("✅ STEP 1 SKIPPED: Using all %s items (base item mode)", len(occasion_candidates))
         else:
             # Normal mode: strict occasion filtering
             occasion_candidates = self._get_occasion_appropriate_candidates(
@@ -1280,7 +1320,9 @@ class RobustOutfitGenerationService:
                 min_items=3,  # Require at least 3 items before fallbacks
                 base_item_id=None
             )
-            logger.info(f"✅ STEP 1 COMPLETE: {len(occasion_candidates)} occasion-appropriate items (from {len(context.wardrobe)} total)")
+            logger.info("✅ STEP 1 COMPLETE: %s occasion-appropriate items (from %s total)", len(occasion_candidates), len(context.wardrobe))
+        
+        occasion_span.end(items_after=len(occasion_candidates))
         
         # Track base item after occasion filtering
         base_item_tracker.checkpoint("03_after_occasion_filter", occasion_candidates, f"After occasion filter: {context.occasion}")
@@ -1290,36 +1332,38 @@ class RobustOutfitGenerationService:
         # Save original wardrobe before filtering (for last-resort shoe search)
         context.wardrobe_original = context.wardrobe.copy()
         context.wardrobe = occasion_candidates
-        logger.info(f"📦 Wardrobe updated: {original_wardrobe_size} → {len(context.wardrobe)} items (occasion-filtered)")
+        logger.info("📦 Wardrobe updated: %s → %s items (occasion-filtered)", original_wardrobe_size, len(context.wardrobe))
         
         # ═══════════════════════════════════════════════════════════
         # STEP 2: ADDITIONAL FILTERING (style, mood, weather)
         # ═══════════════════════════════════════════════════════════
         
-        logger.info(f"🔍 FILTERING STEP 2: Starting item filtering for {context.occasion} occasion")
-        suitable_items = await self._filter_suitable_items(context)
-        logger.info(f"✅ FILTERING STEP 2: {len(suitable_items)} suitable items passed from {len(context.wardrobe)} occasion-filtered items")
+        logger.info("🔍 FILTERING STEP 2: Starting item filtering for %s occasion", context.occasion)
+        with tracer.span("style_mood_weather_filter", items_before=len(context.wardrobe)) as filter_span:
+            suitable_items = await self._filter_suitable_items(context)
+            filter_span.set_attribute("items_after", len(suitable_items))
+        logger.info("✅ FILTERING STEP 2: %s suitable items passed from %s occasion-filtered items", len(suitable_items), len(context.wardrobe))
         
         # Track base item after style/mood/weather filtering
         base_item_tracker.checkpoint("04_after_style_mood_weather_filter", suitable_items, f"After style/mood/weather filter")
         
         if len(suitable_items) == 0:
-            logger.error(f"🚨 CRITICAL: No suitable items found after filtering!")
-            logger.error(f"🔍 DEBUG: Occasion: {context.occasion}, Style: {context.style}, Mood: {context.mood}")
+            logger.error("🚨 CRITICAL: No suitable items found after filtering!")
+            logger.error("🔍 DEBUG: Occasion: %s, Style: %s, Mood: %s", context.occasion, context.style, context.mood)
             raise Exception(f"No suitable items found for {context.occasion} occasion")
         
         # ═══════════════════════════════════════════════════════════
         # STEP 2: MULTI-LAYERED SCORING ON FILTERED ITEMS
         # ═══════════════════════════════════════════════════════════
         
-        logger.info(f"🔬 SCORING: Starting multi-layered scoring on {len(suitable_items)} filtered items")
+        logger.info("🔬 SCORING: Starting multi-layered scoring on %s filtered items", len(suitable_items))
         
         # Create scoring dictionary for each suitable item
         item_scores = {}
-        logger.debug(f"🔍 DEBUG SCORING: Starting to create scores for {len(suitable_items)} suitable items")
+        logger.debug("🔍 DEBUG SCORING: Starting to create scores for %s suitable items", len(suitable_items))
         for i, item in enumerate(suitable_items):
             item_id = safe_item_access(item, 'id', f"item_{len(item_scores)}")
-            logger.debug(f"🔍 DEBUG SCORING: Creating score for item {i+1}: {item_id} - {getattr(item, 'name', 'Unknown')}")
+            logger.debug("🔍 DEBUG SCORING: Creating score for item %s: %s - %s", i+1, item_id, getattr(item, 'name', 'Unknown'))
             item_scores[item_id] = {
                 'item': item,
                 'body_type_score': 0.0,
@@ -1329,27 +1373,29 @@ class RobustOutfitGenerationService:
                 'composite_score': 0.0
             }
         
-        logger.debug(f"🔍 DEBUG SCORING: Created {len(item_scores)} item scores")
+        logger.debug("🔍 DEBUG SCORING: Created %s item scores", len(item_scores))
         
         # Track base item in item_scores
         base_item_tracker.checkpoint_with_scores("05_after_score_initialization", item_scores, f"Item scores initialized")
         
-        logger.debug(f"🔍 DEBUG: Initialized {len(item_scores)} items for scoring")
+        logger.debug("🔍 DEBUG: Initialized %s items for scoring", len(item_scores))
         
         # Run all analyzers in parallel on filtered items
-        logger.info(f"🚀 Running 5 analyzers in parallel on {len(suitable_items)} filtered items... (body type + style profile + weather + user feedback + metadata compatibility)")
+        logger.info("🚀 Running 5 analyzers in parallel on %s filtered items... (body type + style profile + weather + user feedback + metadata compatibility)", len(suitable_items))
         
+        analyzers_span = tracer.start_span("analyzers", items=len(item_scores))
         analyzer_tasks = [
             # MULTI-LAYERED SCORING: 5 Analyzers
-            asyncio.create_task(self._analyze_body_type_scores(context, item_scores)),
-            asyncio.create_task(self._analyze_style_profile_scores(context, item_scores)),
-            asyncio.create_task(self._analyze_weather_scores(context, item_scores)),
-            asyncio.create_task(self._analyze_user_feedback_scores(context, item_scores)),
-            asyncio.create_task(self.metadata_analyzer.analyze_compatibility_scores(context, item_scores))  # NEW: Unified Metadata Compatibility
+            asyncio.create_task(tracer.traced_call("analyzer.body_type", self._analyze_body_type_scores(context, item_scores))),
+            asyncio.create_task(tracer.traced_call("analyzer.style_profile", self._analyze_style_profile_scores(context, item_scores))),
+            asyncio.create_task(tracer.traced_call("analyzer.weather", self._analyze_weather_scores(context, item_scores))),
+            asyncio.create_task(tracer.traced_call("analyzer.user_feedback", self._analyze_user_feedback_scores(context, item_scores))),
+            asyncio.create_task(tracer.traced_call("analyzer.metadata_compatibility", self.metadata_analyzer.analyze_compatibility_scores(context, item_scores)))  # NEW: Unified Metadata Compatibility
         ]
         
         # Wait for all analyzers to complete
         await asyncio.gather(*analyzer_tasks)
+        analyzers_span.end()
         
         # DEBUG: Check analyzer outputs for first 3 items
         for i, (item_id, scores) in enumerate(list(item_scores.items())[:3]):
@@ -1357,14 +1403,15 @@ class RobustOutfitGenerationService:
             breakdown = scores.get('_compatibility_breakdown', {})
             # Only log first 3 items to avoid spam
             if i < 3:
-                logger.info(f"🔍 ITEM {i+1} SCORES: {self.safe_get_item_name(scores['item'])}: body={scores['body_type_score']:.2f}, style={scores['style_profile_score']:.2f}, weather={scores['weather_score']:.2f}, feedback={scores['user_feedback_score']:.2f}, compat={compat_score:.2f}")
+                logger.info("🔍 ITEM %s SCORES: %s: body=%.2f, style=%.2f, weather=%.2f, feedback=%.2f, compat=%.2f", i+1, self.safe_get_item_name(scores['item']), scores['body_type_score'], scores['style_profile_score'], scores['weather_score'], scores['user_feedback_score'], compat_score)
             else:
-                logger.debug(f"🔍 ITEM {i+1} SCORES: {self.safe_get_item_name(scores['item'])}: body={scores['body_type_score']:.2f}, style={scores['style_profile_score']:.2f}, weather={scores['weather_score']:.2f}, feedback={scores['user_feedback_score']:.2f}, compat={compat_score:.2f}")
+                logger.debug("🔍 ITEM %s SCORES: %s: body=%.2f, style=%.2f, weather=%.2f, feedback=%.2f, compat=%.2f", i+1, self.safe_get_item_name(scores['item']), scores['body_type_score'], scores['style_profile_score'], scores['weather_score'], scores['user_feedback_score'], compat_score)
             if breakdown:
-                logger.debug(f"   Compatibility breakdown: layer={breakdown.get('layer', 0):.2f}, pattern={breakdown.get('pattern', 0):.2f}, fit={breakdown.get('fit', 0):.2f}, formality={breakdown.get('formality', 0):.2f}, color={breakdown.get('color', 0):.2f}, brand={breakdown.get('brand', 0):.2f}")
+                logger.debug("   Compatibility breakdown: layer=%.2f, pattern=%.2f, fit=%.2f, formality=%.2f, color=%.2f, brand=%.2f", breakdown.get('layer', 0), breakdown.get('pattern', 0), breakdown.get('fit', 0), breakdown.get('formality', 0), breakdown.get('color', 0), breakdown.get('brand', 0))
         
         # Calculate composite scores
-        logger.info(f"🧮 Calculating composite scores with 5-dimensional analysis...")
+        logger.info("🧮 Calculating composite scores with 5-dimensional analysis...")
+        scoring_span = tracer.start_span("composite_scoring", items=len(item_scores))
         # Calculate composite scores with dynamic weights based on weather
         temp = safe_get(context.weather, 'temperature', 70.0)
         
@@ -1388,13 +1435,13 @@ class RobustOutfitGenerationService:
             body_weight = 0.20
             user_feedback_weight = 0.20
         
-        logger.info(f"🎯 DYNAMIC WEIGHTS (5D): Weather={weather_weight}, Compatibility={compatibility_weight}, Style={style_weight}, Body={body_weight}, UserFeedback={user_feedback_weight} (temp={temp}°F)")
+        logger.info("🎯 DYNAMIC WEIGHTS (5D): Weather=%s, Compatibility=%s, Style=%s, Body=%s, UserFeedback=%s (temp=%s°F)", weather_weight, compatibility_weight, style_weight, body_weight, user_feedback_weight, temp)
         
         # ═══════════════════════════════════════════════════════════════════════
         # APPLY DIVERSITY BOOST (6TH DIMENSION)
         # ═══════════════════════════════════════════════════════════════════════
         
-        logger.info(f"🎭 Applying diversity boost to prevent outfit repetition...")
+        logger.info("🎭 Applying diversity boost to prevent outfit repetition...")
         
         # Get all items for diversity boost calculation
         all_items = [scores['item'] for scores in item_scores.values()]
@@ -1411,10 +1458,10 @@ class RobustOutfitGenerationService:
             
             # Create diversity score lookup
             diversity_scores = {item.id: boost_score for item, boost_score in boosted_items}
-            logger.info(f"✅ Diversity boost applied to {len(diversity_scores)} items")
+            logger.info("✅ Diversity boost applied to %s items", len(diversity_scores))
             
         except Exception as e:
-            logger.warning(f"⚠️ Failed to apply diversity boost: {e}")
+            logger.warning("⚠️ Failed to apply diversity boost: %s", e)
             diversity_scores = {}
         
         # ═══════════════════════════════════════════════════════════════════════
@@ -1439,7 +1486,7 @@ class RobustOutfitGenerationService:
             body_weight = 0.15
             user_feedback_weight = 0.12
         
-        logger.info(f"🎯 DYNAMIC WEIGHTS (6D): Weather={weather_weight}, Compatibility={compatibility_weight}, Style={style_weight}, Body={body_weight}, UserFeedback={user_feedback_weight}, Diversity={diversity_weight}")
+        logger.info("🎯 DYNAMIC WEIGHTS (6D): Weather=%s, Compatibility=%s, Style=%s, Body=%s, UserFeedback=%s, Diversity=%s", weather_weight, compatibility_weight, style_weight, body_weight, user_feedback_weight, diversity_weight)
         
         for item_id, scores in item_scores.items():
             # Multi-layered scoring with 6 dimensions and dynamic weights
@@ -1477,12 +1524,12 @@ class RobustOutfitGenerationService:
         # Track base item after composite scoring
         base_item_tracker.checkpoint_with_scores("06_after_composite_scoring", item_scores, f"After composite score calculation")
         
-        logger.info(f"🏆 Top 3 scored items (with diversity + session penalties):")
+        logger.info("🏆 Top 3 scored items (with diversity + session penalties):")
         for i, (item_id, scores) in enumerate(sorted_items[:3]):
             diversity_score = scores.get('diversity_score', 1.0)
             session_penalty = scores.get('session_penalty', 0.0)
             penalty_indicator = " 🔴" if session_penalty < 0 else ""
-            logger.info(f"  {i+1}. {self.safe_get_item_name(scores['item'])}: {scores['composite_score']:.2f} (div: {diversity_score:.2f}, session: {session_penalty:+.2f}){penalty_indicator}")
+            logger.info("  %s. %s: %.2f (div: %.2f, session: %+.2f)%s", i+1, self.safe_get_item_name(scores['item']), scores['composite_score'], diversity_score, session_penalty, penalty_indicator)
         
         # ═══════════════════════════════════════════════════════════
         # ADAPTIVE WEIGHT ADJUSTMENT (Favorites Mode)
@@ -1499,11 +1546,11 @@ class RobustOutfitGenerationService:
                 # If 30%+ of wardrobe is favorited, enable favorites mode
                 if len(context.wardrobe) > 0 and (favorited_count / len(context.wardrobe)) >= 0.3:
                     favorites_mode = True
-                    logger.info(f"⭐ FAVORITES MODE ACTIVATED: {favorited_count}/{len(context.wardrobe)} items favorited ({favorited_count/len(context.wardrobe)*100:.0f}%)")
+                    logger.info("⭐ FAVORITES MODE ACTIVATED: %s/%s items favorited (%.0f%%)", favorited_count, len(context.wardrobe), favorited_count/len(context.wardrobe)*100)
                 else:
-                    logger.info(f"📊 Favorites check: {favorited_count}/{len(context.wardrobe)} favorited ({favorited_count/len(context.wardrobe)*100:.0f}% - need 30% for favorites mode)")
+                    logger.info("📊 Favorites check: %s/%s favorited (%.0f%% - need 30%% for favorites mode)", favorited_count, len(context.wardrobe), favorited_count/len(context.wardrobe)*100)
             except Exception as e:
-                logger.warning(f"⚠️ Could not check favorites mode: {e}")
+                logger.warning("⚠️ Could not check favorites mode: %s", e)
         
         # Adjust weights if in favorites mode
         if favorites_mode:
@@ -1525,8 +1572,8 @@ class RobustOutfitGenerationService:
                 if (context.style or "").lower() == 'monochrome':
                     diversity_weight = min(diversity_weight, 0.18)
             
-            logger.info(f"⭐ FAVORITES MODE WEIGHTS: UserFeedback={user_feedback_weight} (+100%), Diversity={diversity_weight} (kept at ~20% to ensure variety)")
-            logger.info(f"🎯 ADJUSTED WEIGHTS (6D): Weather={weather_weight}, Compat={compatibility_weight}, Style={style_weight}, Body={body_weight}, Feedback={user_feedback_weight}, Diversity={diversity_weight}")
+            logger.info("⭐ FAVORITES MODE WEIGHTS: UserFeedback=%s (+100%%), Diversity=%s (kept at ~20%% to ensure variety)", user_feedback_weight, diversity_weight)
+            logger.info("🎯 ADJUSTED WEIGHTS (6D): Weather=%s, Compat=%s, Style=%s, Body=%s, Feedback=%s, Diversity=%s", weather_weight, compatibility_weight, style_weight, body_weight, user_feedback_weight, diversity_weight)
             
             # Re-calculate composite scores with new weights
             for item_id, scores in item_scores.items():
@@ -1549,11 +1596,13 @@ class RobustOutfitGenerationService:
                 scores['composite_score'] = final_score
                 scores['base_score'] = base_score
         
+        scoring_span.end(favorites_mode=favorites_mode)
+        
         # ═══════════════════════════════════════════════════════════
         # PHASE 2: Cohesive Composition with Multi-Layered Scores
         # ═══════════════════════════════════════════════════════════
         
-        logger.info(f"🎨 PHASE 2: Cohesive Composition with Scored Items")
+        logger.info("🎨 PHASE 2: Cohesive Composition with Scored Items")
         
         # ═══════════════════════════════════════════════════════════════════════
         # PROGRESSIVE FALLBACK FILTERING
@@ -1561,15 +1610,15 @@ class RobustOutfitGenerationService:
         
         # Check if we have any scored items
         if not item_scores:
-            logger.error(f"🚨 CRITICAL: No items scored - all items filtered out!")
-            logger.error(f"🔍 DEBUG: Wardrobe size: {len(context.wardrobe)}")
-            logger.error(f"🔍 DEBUG: Suitable items: N/A (filtering failed)")
-            logger.error(f"🔍 DEBUG: Occasion: {context.occasion}, Style: {context.style}")
+            logger.error("🚨 CRITICAL: No items scored - all items filtered out!")
+            logger.error("🔍 DEBUG: Wardrobe size: %s", len(context.wardrobe))
+            logger.error("🔍 DEBUG: Suitable items: N/A (filtering failed)")
+            logger.error("🔍 DEBUG: Occasion: %s, Style: %s", context.occasion, context.style)
             
             # EXTREME WEATHER SAFETY CHECK
             temp = safe_get(context.weather, 'temperature', 70.0)
             if temp > 80:  # Extreme heat
-                logger.warning(f"🔥 EXTREME HEAT: {temp}°F - emergency relaxation of weather penalties")
+                logger.warning("🔥 EXTREME HEAT: %s°F - emergency relaxation of weather penalties", temp)
                 # Emergency: create minimal scores for any available items
                 for item in (context.wardrobe if context else []):
                     item_id = safe_item_access(item, 'id', f"emergency_{len(item_scores)}")
@@ -1580,11 +1629,11 @@ class RobustOutfitGenerationService:
                         'weather_score': 0.3,  # Minimum score for extreme heat
                         'composite_score': 0.43  # Weighted average
                     }
-                logger.info(f"🚨 EMERGENCY: Created {len(item_scores)} emergency scores for extreme heat")
+                logger.info("🚨 EMERGENCY: Created %s emergency scores for extreme heat", len(item_scores))
             
             # Emergency fallback: use any available items
             if (context.wardrobe if context else []):
-                logger.warning(f"🚨 EMERGENCY: Using any available items as fallback")
+                logger.warning("🚨 EMERGENCY: Using any available items as fallback")
                 for item in (context.wardrobe if context else []):
                     item_id = safe_item_access(item, 'id', f"emergency_{len(item_scores)}")
                     item_scores[item_id] = {
@@ -1593,24 +1642,27 @@ class RobustOutfitGenerationService:
                         'weather_score': 0.5,
                         'composite_score': 0.5
                     }
-                logger.info(f"🚨 EMERGENCY: Created {len(item_scores)} emergency scores")
+                logger.info("🚨 EMERGENCY: Created %s emergency scores", len(item_scores))
             else:
                 raise Exception(f"No items available for scoring - wardrobe or filtering issue")
         
         # Check if items have reasonable scores
         total_items = len(item_scores)
         items_with_scores = len([s for s in item_scores.values() if safe_get(s, 'composite_score', 0) > 0.1])
-        logger.info(f"🔍 SCORE CHECK: {total_items} total items, {items_with_scores} with scores > 0.1")
+        logger.info("🔍 SCORE CHECK: %s total items, %s with scores > 0.1", total_items, items_with_scores)
         
         if items_with_scores == 0:
-            logger.warning(f"⚠️ WARNING: All items have very low scores, may need progressive filtering")
+            logger.warning("⚠️ WARNING: All items have very low scores, may need progressive filtering")
             # Don't return here, let cohesive composition try first
         
         # Track base item before cohesive composition
         base_item_tracker.checkpoint_with_scores("07_before_cohesive_composition", item_scores, f"Before cohesive composition")
         
-        # Pass scored items to cohesive composition
-        outfit = await self._cohesive_composition_with_scores(context, item_scores, session_id)
+        # Pass scored items to cohesive composition; batch requests keep the search's runner-ups
+        composition_pool = CompositionPool(count) if count > 1 else None
+        with tracer.span("cohesive_composition", candidates=len(item_scores)) as composition_span:
+            outfit = await self._cohesive_composition_with_scores(context, item_scores, session_id, composition_pool)
+            composition_span.set_attribute("outfit_items", len(outfit.items) if outfit and outfit.items else 0)
         
         # Track base item in final outfit
         if outfit and outfit.items:
@@ -1621,7 +1673,7 @@ class RobustOutfitGenerationService:
         
         # Check if cohesive composition failed to generate items
         if not outfit.items or len(outfit.items) == 0:
-            logger.error(f"❌ COHESIVE COMPOSITION FAILED: No items generated - this should not happen")
+            logger.error("❌ COHESIVE COMPOSITION FAILED: No items generated - this should not happen")
             
             # Collect detailed debug information for the error
             debug_info = {
@@ -1658,41 +1710,85 @@ class RobustOutfitGenerationService:
             
             raise Exception(f"🔥 COHESIVE COMPOSITION FAILED: Cohesive composition failed to generate items - system needs fixing. DEBUG: {debug_info}")
         
-        logger.info(f"✅ ROBUST GENERATION SUCCESS: Generated outfit with {len(outfit.items)} items")
-        logger.info(f"📦 Final outfit items: {[getattr(item, 'name', 'Unknown') for item in outfit.items]}")
+        logger.info("✅ ROBUST GENERATION SUCCESS: Generated outfit with %s items", len(outfit.items))
+        logger.info("📦 Final outfit items: %s", [getattr(item, 'name', 'Unknown') for item in outfit.items])
         
         # Log conflict statistics for data quality monitoring
         conflict_stats = self.get_conflict_statistics()
         if conflict_stats['total_checked'] > 0:
-            logger.info(f"📊 DATA QUALITY: Checked {conflict_stats['total_checked']} items, "
-                       f"conflict_rate={conflict_stats['conflict_rate']*100:.1f}%, "
-                       f"major={conflict_stats['major_conflicts']}, "
-                       f"minor={conflict_stats['minor_conflicts']}")
+            logger.info("📊 DATA QUALITY: Checked %s items, conflict_rate=%.1f%%, major=%s, minor=%s",
+                        conflict_stats['total_checked'], conflict_stats['conflict_rate'] * 100,
+                        conflict_stats['major_conflicts'], conflict_stats['minor_conflicts'])
             if conflict_stats['conflicts_by_field']:
-                logger.info(f"📊 CONFLICTS BY FIELD: {conflict_stats['conflicts_by_field']}")
-        
-        # Initialize flat lay metadata but wait for explicit user consent
-        if self.enable_flat_lay_generation and outfit.items:
-            if not hasattr(outfit, 'metadata') or outfit.metadata is None:
-                outfit.metadata = {}
-            for key in ['flat_lay_status', 'flatLayStatus']:
-                outfit.metadata[key] = 'awaiting_consent'
-            for key in ['flat_lay_url', 'flatLayUrl', 'flat_lay_error', 'flatLayError']:
-                outfit.metadata.pop(key, None)
-            for key in ['flat_lay_requested', 'flatLayRequested']:
-                outfit.metadata[key] = False
-            # Only set attributes that exist in the model
-            for attr in ['flat_lay_status', 'flatLayStatus']:
-                if hasattr(outfit, attr):
-                    setattr(outfit, attr, 'awaiting_consent')
-            for attr in ['flat_lay_url', 'flatLayUrl', 'flat_lay_error', 'flatLayError']:
-                if hasattr(outfit, attr):
-                    setattr(outfit, attr, None)
-            # flat_lay_requested is only in metadata, not as an attribute
-            outfit.metadata['flat_lay_worker'] = 'premium_v1'
-            logger.info("🎨 Flat lay generation awaiting user request (status=awaiting_consent)")
+                logger.info("📊 CONFLICTS BY FIELD: %s", conflict_stats['conflicts_by_field'])
+        
+        outfits = [outfit]
+        if count > 1:
+            outfits.extend(await self._compose_batch_outfits(context, item_scores, session_id, count - 1, composition_pool))
+            for batch_index, batch_outfit in enumerate(outfits):
+                if batch_outfit.metadata is None:
+                    batch_outfit.metadata = {}
+                batch_outfit.metadata['batch_index'] = batch_index
+                batch_outfit.metadata['batch_size'] = len(outfits)
+            logger.info("📦 BATCH: Composed %s/%s outfits from one scoring pass", len(outfits), count)
+        
+        for outfit in outfits:
+            # Initialize flat lay metadata but wait for explicit user consent
+            if self.enable_flat_lay_generation and outfit.items:
+                if not hasattr(outfit, 'metadata') or outfit.metadata is None:
+                    outfit.metadata = {}
+                for key in ['flat_lay_status', 'flatLayStatus']:
+                    outfit.metadata[key] = 'awaiting_consent'
+                for key in ['flat_lay_url', 'flatLayUrl', 'flat_lay_error', 'flatLayError']:
+                    outfit.metadata.pop(key, None)
+                for key in ['flat_lay_requested', 'flatLayRequested']:
+                    outfit.metadata[key] = False
+                # Only set attributes that exist in the model
+                for attr in ['flat_lay_status', 'flatLayStatus']:
+                    if hasattr(outfit, attr):
+                        setattr(outfit, attr, 'awaiting_consent')
+                for attr in ['flat_lay_url', 'flatLayUrl', 'flat_lay_error', 'flatLayError']:
+                    if hasattr(outfit, attr):
+                        setattr(outfit, attr, None)
+                # flat_lay_requested is only in metadata, not as an attribute
+                outfit.metadata['flat_lay_worker'] = 'premium_v1'
+                logger.info("🎨 Flat lay generation awaiting user request (status=awaiting_consent)")
+        
+        return outfits
+    
+    async def _compose_batch_outfits(
+        self,
+        context: GenerationContext,
+        item_scores: dict,
+        session_id: str,
+        extra: int,
+        composition_pool: Optional[CompositionPool] = None,
+    ) -> List[OutfitGeneratedOutfit]:
+        """
+        Compose further outfits from items that are already scored.
         
-        return outfit
+        Composition marks its items as seen in the session, so refreshing the
+        session penalty before each round steers the next outfit toward
+        different pieces. Runner-ups from the first beam search (in
+        ``composition_pool``) are re-ranked with those penalties and used
+        before searching again.
+        """
+        outfits = []
+        for batch_index in range(1, extra + 1):
+            for item_id, scores in item_scores.items():
+                session_penalty = session_tracker.get_diversity_penalty(session_id, item_id)
+                previous_penalty = scores.get('session_penalty', 0.0)
+                if session_penalty != previous_penalty:
+                    scores['composite_score'] = scores.get('composite_score', 0.0) + session_penalty - previous_penalty
+                    scores['session_penalty'] = session_penalty
+            
+            with tracer.span("cohesive_composition", candidates=len(item_scores), batch_index=batch_index):
+                outfit = await self._cohesive_composition_with_scores(context, item_scores, session_id, composition_pool)
+            if not outfit.items:
+                logger.warning("⚠️ BATCH: Composition %s produced no items, stopping batch", batch_index)
+                break
+            outfits.append(outfit)
+        return outfits
     
     async def _emergency_fallback_with_progressive_filtering(self, context: GenerationContext) -> OutfitGeneratedOutfit:
         """Emergency fallback with progressive filter relaxation"""
@@ -2881,15 +2977,25 @@ class RobustOutfitGenerationService:
             )
             is_monochrome_request = style_lower == 'monochrome'
         
+        # Normalize item metadata up front so semantic matching runs over the whole wardrobe at once
+        wardrobe_items = list(context.wardrobe) if context else []
+        normalized_items = [normalize_item_metadata(raw_item) for raw_item in wardrobe_items]
+        if semantic_filtering:
+            semantic_occ, semantic_style, semantic_mood = semantic_wardrobe_matches(
+                context.occasion if context else None,
+                context.style if context else None,
+                context.mood if context else None,
+                normalized_items,
+            )
+        
         # Apply filtering logic matching the JavaScript implementation
-        for raw_item in (context.wardrobe if context else []):
+        for index, raw_item in enumerate(wardrobe_items):
             # Skip base item since it's already added to valid_items
             if base_item_obj and getattr(raw_item, 'id', None) == context.base_item_id:
                 logger.info(f"⏭️ FILTER: Skipping base item (already pre-approved)")
                 continue
             
-            # Normalize item metadata
-            item = normalize_item_metadata(raw_item)
+            item = normalized_items[index]
             reasons = []
             ok_occ = False
             ok_style = False
@@ -3018,9 +3124,10 @@ class RobustOutfitGenerationService:
             
             if semantic_filtering:
                 # Use semantic filtering with compatibility helpers
-                ok_occ = occasion_matches(context.occasion if context else None, safe_item_access(item, 'occasion', []))
-                ok_style = style_matches(context.style if context else None, safe_item_access(item, 'style', []))
-                ok_mood = mood_matches(context.mood if context else None, safe_item_access(item, 'mood', []))
+                # Precomputed bitset matches (same semantics as occasion/style/mood_matches)
+                ok_occ = bool(semantic_occ[index])
+                ok_style = bool(semantic_style[index])
+                ok_mood = bool(semantic_mood[index])
             else:
                 # Enhanced: Use normalized metadata for consistent filtering
                 context_occasion = (context.occasion or "").lower() if context else ""
@@ -3654,7 +3761,9 @@ class RobustOutfitGenerationService:
             occasion=context.occasion,
             style=context.style,
             recently_used_item_ids=recently_used_item_ids,
-            safe_get_item_attr_func=self.safe_get_item_attr
+            safe_get_item_attr_func=self.safe_get_item_attr,
+            user_id=context.user_id,
+            wardrobe_version=self._wardrobe_version(context)
         )
         
         logger.info(f"✅ TIER FILTER: Applied {tier_used.value} for {context.occasion}")
@@ -5939,243 +6048,35 @@ class RobustOutfitGenerationService:
             # SPECIAL CASE: Gym/Athletic occasions ignore weather (gyms are climate-controlled!)
             is_gym = (context.occasion if context else "unknown").lower() in ['gym', 'athletic', 'workout']
             
-            for item_id, scores in item_scores.items():
-                item = scores['item']
-                base_score = 0.5  # Default neutral score
-                
-                # GYM OVERRIDE: Skip weather scoring for gym (climate-controlled environment)
-                if is_gym:
-                    base_score = 0.8  # Higher base score - weather doesn't matter for gym
+            if is_gym:
+                for item_id in item_scores:
                     item_scores[item_id]['weather_score'] = 0.8
-                    continue  # Skip all weather checks for gym items
-                
-                # Season match
-                item_seasons = getattr(item, 'season', [])
-                if isinstance(item_seasons, str):
-                    item_seasons = [item_seasons]
-                
-                item_seasons_lower = [s.lower() for s in item_seasons]
-                if season in item_seasons_lower:
-                    base_score += 0.3
-                
-                # Temperature compatibility
-                if hasattr(item, 'temperatureCompatibility'):
-                    temp_compat = self.safe_get_item_attr(item, "temperatureCompatibility")
-                    if temp_compat and hasattr(temp_compat, 'minTemp') and hasattr(temp_compat, 'maxTemp'):
-                        # CRITICAL FIX: Parse temperature strings (handle '32°F', '>85', etc.)
-                        try:
-                            import re
-                            def parse_temp_value(val):
-                                if isinstance(val, (int, float)):
-                                    return float(val)
-                                if isinstance(val, str):
-                                    clean_val = re.sub(r'[><]=?|°[FC]|[FC]', '', val).strip()
-                                    return float(clean_val) if clean_val else None
-                                return None
-                            
-                            min_t = parse_temp_value(temp_compat.minTemp)
-                            max_t = parse_temp_value(temp_compat.maxTemp)
-                            if min_t is not None and max_t is not None and min_t <= temp <= max_t:
-                                base_score += 0.2
-                        except (ValueError, TypeError) as e:
-                            logger.debug(f"⚠️ Could not parse temperatureCompatibility: {e}")
-                
-                # Material appropriateness for weather
-                item_name = self.safe_get_item_name(item) if item else "Unknown"
-                item_name_lower = item_name.lower()
-                item_type_lower = str(self.safe_get_item_type(item)).lower()
-                
-                # METADATA CHECK: WARMTH FACTOR - Direct temperature matching
-                warmth_factor = None
-                fabric_weight = None
-                sleeve_length = None
-                length = None
-                temp_compat = None
-                
-                if hasattr(item, 'metadata') and item.metadata and isinstance(item.metadata, dict):
-                    visual_attrs = item.metadata.get('visualAttributes', {})
-                    if isinstance(visual_attrs, dict):
-                        warmth_factor = (visual_attrs.get('warmthFactor') or '').lower()
-                        fabric_weight = (visual_attrs.get('fabricWeight') or '').lower()
-                        sleeve_length = (visual_attrs.get('sleeveLength') or '').lower()
-                        length = (visual_attrs.get('length') or '').lower()
-                        temp_compat = visual_attrs.get('temperatureCompatibility')
-                
-                # TEMPERATURE COMPATIBILITY - PRECISE matching (highest priority)
-                if temp_compat and isinstance(temp_compat, dict):
-                    min_temp = temp_compat.get('minTemp')
-                    max_temp = temp_compat.get('maxTemp')
-                    optimal_min = temp_compat.get('optimalMin')
-                    optimal_max = temp_compat.get('optimalMax')
-                    
-                    # CRITICAL FIX: Convert string temperatures to float
-                    # Handle formats like '32°F', '>85', '<32°F', etc.
-                    def parse_temp(value):
-                        if value is None:
-                            return None
-                        if isinstance(value, (int, float)):
-                            return float(value)
-                        if isinstance(value, str):
-                            # Strip comparison operators (>, <, >=, <=) and units (°F, °C, F, C)
-                            import re
-                            clean_value = re.sub(r'[><]=?|°[FC]|[FC]', '', value).strip()
-                            return float(clean_value) if clean_value else None
-                        return None
-                    
-                    try:
-                        min_temp = parse_temp(min_temp)
-                        max_temp = parse_temp(max_temp)
-                        optimal_min = parse_temp(optimal_min)
-                        optimal_max = parse_temp(optimal_max)
-                    except (ValueError, TypeError) as e:
-                        logger.debug(f"⚠️ TEMP COMPAT: Could not parse temp values: {e}")
-                        min_temp = max_temp = optimal_min = optimal_max = None
-                    
-                    if min_temp is not None and max_temp is not None:
-                        if min_temp <= temp <= max_temp:
-                            # Within acceptable range
-                            if optimal_min is not None and optimal_max is not None:
-                                if optimal_min <= temp <= optimal_max:
-                                    base_score += 0.5  # Perfect temperature match!
-                                    logger.debug(f"  ✅✅✅ TEMP COMPAT: Perfect temp match {temp}°F in optimal range [{optimal_min}-{optimal_max}] (+0.5)")
-                                else:
-                                    base_score += 0.3  # Acceptable but not optimal
-                                    logger.debug(f"  ✅ TEMP COMPAT: Acceptable temp {temp}°F in range [{min_temp}-{max_temp}] (+0.3)")
-                            else:
-                                base_score += 0.35  # Good match
-                                logger.debug(f"  ✅ TEMP COMPAT: Good temp match {temp}°F in range [{min_temp}-{max_temp}] (+0.35)")
-                        else:
-                            # Outside acceptable range
-                            if temp < min_temp:
-                                base_score -= 0.4  # Too cold for this item
-                                logger.debug(f"  🚫 TEMP COMPAT: Too cold {temp}°F < {min_temp}°F min ({-0.4})")
-                            else:  # temp > max_temp
-                                base_score -= 0.4  # Too hot for this item
-                                logger.debug(f"  🚫 TEMP COMPAT: Too hot {temp}°F > {max_temp}°F max ({-0.4})")
-                
-                # WARMTH FACTOR SCORING - Match warmth to temperature
-                if warmth_factor:
-                    if temp < 40:  # Very cold
-                        if warmth_factor in ['heavy', 'insulated', 'warm']:
-                            base_score += 0.4
-                            logger.debug(f"  ✅✅ WARMTH FACTOR: Heavy warmth perfect for very cold (+0.4)")
-                        elif warmth_factor in ['light', 'minimal']:
-                            base_score -= 0.3
-                            logger.debug(f"  ⚠️ WARMTH FACTOR: Light warmth too cold ({-0.3})")
-                    elif temp < 60:  # Cool
-                        if warmth_factor in ['medium', 'moderate']:
-                            base_score += 0.3
-                            logger.debug(f"  ✅ WARMTH FACTOR: Medium warmth good for cool weather (+0.3)")
-                    elif temp > 75:  # Hot
-                        if warmth_factor in ['light', 'minimal', 'breathable']:
-                            base_score += 0.4
-                            logger.debug(f"  ✅✅ WARMTH FACTOR: Light warmth perfect for hot weather (+0.4)")
-                        elif warmth_factor in ['heavy', 'warm']:
-                            base_score -= 0.4
-                            logger.debug(f"  🚫 WARMTH FACTOR: Heavy warmth too hot ({-0.4})")
-                
-                # FABRIC WEIGHT SCORING - Match weight to temperature
-                if fabric_weight:
-                    if temp < 50:  # Cold
-                        if fabric_weight in ['heavy', 'thick', 'heavyweight']:
-                            base_score += 0.3
-                            logger.debug(f"  ✅ FABRIC WEIGHT: Heavy fabric good for cold (+0.3)")
-                        elif fabric_weight in ['light', 'lightweight']:
-                            base_score -= 0.2
-                            logger.debug(f"  ⚠️ FABRIC WEIGHT: Light fabric too cold ({-0.2})")
-                    elif temp > 75:  # Hot
-                        if fabric_weight in ['light', 'lightweight', 'thin']:
-                            base_score += 0.3
-                            logger.debug(f"  ✅ FABRIC WEIGHT: Light fabric good for hot weather (+0.3)")
-                        elif fabric_weight in ['heavy', 'thick']:
-                            base_score -= 0.3
-                            logger.debug(f"  🚫 FABRIC WEIGHT: Heavy fabric too hot ({-0.3})")
-                
-                # SLEEVE LENGTH - Weather matching for tops
-                item_category = self._get_item_category(item)
-                if item_category == 'tops' and sleeve_length:
-                    if temp > 75:  # Hot
-                        if sleeve_length in ['sleeveless', 'tank', 'short', 'short sleeve']:
-                            base_score += 0.25
-                            logger.debug(f"  ✅ SLEEVE LENGTH: {sleeve_length.capitalize()} good for hot weather (+0.25)")
-                        elif sleeve_length in ['long', 'long sleeve']:
-                            base_score -= 0.2
-                            logger.debug(f"  ⚠️ SLEEVE LENGTH: Long sleeves too warm ({-0.2})")
-                    elif temp < 50:  # Cold
-                        if sleeve_length in ['long', 'long sleeve']:
-                            base_score += 0.2
-                            logger.debug(f"  ✅ SLEEVE LENGTH: Long sleeves good for cold (+0.2)")
-                
-                # LENGTH - For bottoms and outerwear
-                if item_category in ['bottoms', 'outerwear'] and length:
-                    if temp < 40:  # Very cold
-                        if length in ['long', 'full', 'ankle', 'maxi']:
-                            base_score += 0.25
-                            logger.debug(f"  ✅ LENGTH: Long length good for cold (+0.25)")
-                    elif temp > 75:  # Hot
-                        if item_category == 'bottoms' and length in ['short', 'shorts', 'above knee']:
-                            base_score += 0.25
-                            logger.debug(f"  ✅ LENGTH: Shorts good for hot weather (+0.25)")
-                
-                # Cold weather items (keyword fallback)
-                if temp < 50:
-                    cold_keywords = ['wool', 'fleece', 'coat', 'jacket', 'sweater', 'long sleeve', 'boots']
-                    for keyword in cold_keywords:
-                        if keyword in item_name_lower or keyword in item_type_lower:
-                            base_score += 0.15
-                            break
-                
-                # Hot weather items - BALANCED PENALTIES
-                elif temp > 75:  # Higher threshold for hot weather penalties
-                    hot_keywords = ['cotton', 'linen', 'short sleeve', 'shorts', 'sandals', 'tank', 'light']
-                    hot_appropriate = False
-                    for keyword in hot_keywords:
-                        if keyword in item_name_lower or keyword in item_type_lower:
-                            base_score += 0.2  # Boost for hot weather appropriate items
-                            hot_appropriate = True
-                            break
-                    
-                    # BALANCED PENALTIES based on temperature
-                    hot_inappropriate = ['wool', 'fleece', 'coat', 'jacket', 'sweater', 'long sleeve', 'boots', 'heavy']
-                    for keyword in hot_inappropriate:
-                        if keyword in item_name_lower or keyword in item_type_lower:
-                            if temp >= 90:  # Extreme heat - STRONG PENALTY
-                                base_score -= 0.3  # Strong penalty but don't eliminate completely
-                                logger.warning(f"🔥 HOT PENALTY: {item_name} penalized for {temp}°F extreme heat")
-                            elif temp >= 80:  # Hot weather - MODERATE PENALTY
-                                base_score -= 0.2  # Moderate penalty for hot weather
-                                logger.info(f"🌡️ HOT PENALTY: {item_name} penalized for {temp}°F hot weather")
-                            else:  # Warm weather (75-80°F)
-                                base_score -= 0.1  # Light penalty
-                            break
-                
-                # Moderate weather (40-75°F) - neutral scoring with minimal penalties
-                else:
-                    # Very light penalty for extreme weather items in moderate weather
-                    if temp > 70:
-                        hot_inappropriate = ['wool', 'fleece', 'coat', 'jacket', 'sweater']
-                        for keyword in hot_inappropriate:
-                            if keyword in item_name_lower or keyword in item_type_lower:
-                                base_score -= 0.05  # Very small penalty
-                                break
-                    elif temp < 50:
-                        cold_inappropriate = ['shorts', 'sandals', 'tank']
-                        for keyword in cold_inappropriate:
-                            if keyword in item_name_lower or keyword in item_type_lower:
-                                base_score -= 0.05  # Very small penalty
-                                break
-                
-                # Rainy weather
-                if 'rain' in condition or 'storm' in condition:
-                    rain_keywords = ['waterproof', 'raincoat', 'boots']
-                    for keyword in rain_keywords:
-                        if keyword in item_name_lower:
-                            base_score += 0.2
-                            break
-                
-                item_scores[item_id]['weather_score'] = min(1.0, max(0.0, base_score))  # Clamp between 0 and 1
-        
-            logger.info(f"🌤️ WEATHER ANALYZER: Completed scoring")
+                logger.info(f"🌤️ WEATHER ANALYZER: Completed scoring (gym, weather ignored)")
+                return
+            
+            # Items reduce to precomputed weather features once per version; the whole
+            # candidate set is then scored with array ops, cached per weather bucket
+            from .scoring.weather_analyzer import build_weather_features, weather_feature_matrix
+            
+            item_ids = list(item_scores)
+            matrix = weather_feature_matrix(
+                (item_scores[item_id]['item'] for item_id in item_ids),
+                lambda item: build_weather_features(
+                    item,
+                    self.safe_get_item_name(item) if item else "Unknown",
+                    self.safe_get_item_type(item),
+                    self._get_item_category(item),
+                ),
+            )
+            for item_id, features, weather_score in zip(item_ids, matrix.features, matrix.score(temp, condition).tolist()):
+                item_scores[item_id]['weather_score'] = weather_score
+                # Warmth index and layer level, read again by the composer's layer slots
+                item_scores[item_id]['weather_features'] = features
+            
+            hot_penalized = matrix.hot_penalized(temp)
+            if hot_penalized:
+                logger.info(f"🌡️ HOT PENALTY: {hot_penalized} items penalized for {temp}°F")
+            logger.info(f"🌤️ WEATHER ANALYZER: Completed scoring for {matrix.size} items")
             
         except Exception as e:
             logger.error(f"❌ WEATHER ANALYZER FAILED: {str(e)}", exc_info=True)
@@ -6431,11 +6332,23 @@ class RobustOutfitGenerationService:
         logger.info(f"   Mode: {'🔍 Discovery (boost rarely-worn)' if boost_rare else '⭐ Favorites (boost popular)'}")
     
     
-    async def _cohesive_composition_with_scores(self, context: GenerationContext, item_scores: dict, session_id: str) -> OutfitGeneratedOutfit:
-        """Generate cohesive outfit using multi-layered scores with intelligent layering and session tracking"""
-        logger.info(f"🎨 COHESIVE COMPOSITION: Using scored items to create outfit")
-        logger.debug(f"🔍 DEBUG: Received {len(item_scores)} scored items")
-        logger.debug(f"🔍 DEBUG: Context occasion: {context.occasion}, style: {context.style}")
+    async def _cohesive_composition_with_scores(
+        self,
+        context: GenerationContext,
+        item_scores: dict,
+        session_id: str,
+        composition_pool: Optional[CompositionPool] = None,
+    ) -> OutfitGeneratedOutfit:
+        """
+        Generate cohesive outfit using multi-layered scores with intelligent layering and session tracking
+        
+        With a ``composition_pool`` the best pooled runner-up (re-ranked by the
+        current session penalties) is used instead of a new beam search; an
+        empty pool is filled with the runner-ups of the search.
+        """
+        logger.info("🎨 COHESIVE COMPOSITION: Using scored items to create outfit")
+        logger.debug("🔍 DEBUG: Received %s scored items", len(item_scores))
+        logger.debug("🔍 DEBUG: Context occasion: %s, style: %s", context.occasion, context.style)
         
         # ═══════════════════════════════════════════════════════════════════════
         # SELECT OUTFIT COMPOSITION STRATEGY
@@ -6449,14 +6362,14 @@ class RobustOutfitGenerationService:
             # Strategy selection can work with count=0 (defaults to standard strategy)
             if hasattr(context, 'user_outfit_count') and context.user_outfit_count is not None:
                 user_outfit_count = context.user_outfit_count
-                logger.info(f"📊 Using cached outfit count: {user_outfit_count}")
+                logger.info("📊 Using cached outfit count: %s", user_outfit_count)
             else:
                 # Use wardrobe size as a proxy for user experience level
                 # Large wardrobe = experienced user, can handle advanced strategies
                 user_outfit_count = min(len(context.wardrobe) // 3, 20)  # Rough estimate
-                logger.info(f"📊 Estimated outfit count from wardrobe size: {user_outfit_count}")
+                logger.info("📊 Estimated outfit count from wardrobe size: %s", user_outfit_count)
         except Exception as e:
-            logger.warning(f"⚠️ Could not get outfit count for strategy rotation: {e}")
+            logger.warning("⚠️ Could not get outfit count for strategy rotation: %s", e)
             user_outfit_count = 0
         
         # Select strategy
@@ -6470,7 +6383,7 @@ class RobustOutfitGenerationService:
         )
         
         strategy_description = strategy_selector.get_strategy_description(selected_strategy)
-        logger.info(f"🎨 SELECTED STRATEGY: {selected_strategy.value} - {strategy_description}")
+        logger.info("🎨 SELECTED STRATEGY: %s - %s", selected_strategy.value, strategy_description)
         
         target_style_lower = (context.style or "").lower() if context else ""
         preferred_monochrome_color = None
@@ -6548,7 +6461,7 @@ class RobustOutfitGenerationService:
                 return True
 
             if color_value == "contrast":
-                logger.debug(f"{log_prefix}⏭️ MONOCHROME SKIP: {self.safe_get_item_name(item_obj)} color=contrast (palette {preferred_monochrome_color})")
+                logger.debug("%s⏭️ MONOCHROME SKIP: %s color=contrast (palette %s)", log_prefix, self.safe_get_item_name(item_obj), preferred_monochrome_color)
                 return False
 
             if color_value in allowed_monochrome_colors:
@@ -6560,7 +6473,7 @@ class RobustOutfitGenerationService:
             if normalized and normalized != color_value:
                 color_value = normalized
             if color_value == "contrast":
-                logger.debug(f"{log_prefix}⏭️ MONOCHROME SKIP: {self.safe_get_item_name(item_obj)} color=contrast (palette {preferred_monochrome_color})")
+                logger.debug("%s⏭️ MONOCHROME SKIP: %s color=contrast (palette %s)", log_prefix, self.safe_get_item_name(item_obj), preferred_monochrome_color)
                 return False
             if color_value in allowed_monochrome_colors:
                 return True
@@ -6577,27 +6490,27 @@ class RobustOutfitGenerationService:
                 if name:
                     normalized = _normalize_monochrome_value(name)
                     if normalized == "contrast":
-                        logger.debug(f"{log_prefix}⏭️ MONOCHROME SKIP: {self.safe_get_item_name(item_obj)} dominant color contrast (palette {preferred_monochrome_color})")
+                        logger.debug("%s⏭️ MONOCHROME SKIP: %s dominant color contrast (palette %s)", log_prefix, self.safe_get_item_name(item_obj), preferred_monochrome_color)
                         return False
                     if normalized in allowed_monochrome_colors or normalized == 'neutral':
                         return True
 
-            logger.debug(f"{log_prefix}⏭️ MONOCHROME SKIP: {self.safe_get_item_name(item_obj)} color={color_value} not in palette {allowed_monochrome_colors}")
+            logger.debug("%s⏭️ MONOCHROME SKIP: %s color=%s not in palette %s", log_prefix, self.safe_get_item_name(item_obj), color_value, allowed_monochrome_colors)
             return False
 
         # DEBUG: Log item scores details
         if item_scores:
-            logger.debug(f"🔍 DEBUG SCORES: First 3 item scores:")
+            logger.debug("🔍 DEBUG SCORES: First 3 item scores:")
             for i, (item_id, score) in enumerate(list(item_scores.items())[:3]):
-                logger.debug(f"🔍 DEBUG SCORE {i+1}: {item_id} = {score}")
+                logger.debug("🔍 DEBUG SCORE %s: %s = %s", i+1, item_id, score)
         else:
-            logger.error(f"🚨 DEBUG: item_scores is empty or None!")
+            logger.error("🚨 DEBUG: item_scores is empty or None!")
         
         if not item_scores:
-            logger.error(f"❌ COHESIVE COMPOSITION: No scored items received!")
+            logger.error("❌ COHESIVE COMPOSITION: No scored items received!")
             # DEBUG: Add more detailed error info
             error_msg = f"DEBUG: No scored items received. Context has {len(context.wardrobe)} items. Item scores dict: {item_scores}"
-            logger.error(f"🚨 {error_msg}")
+            logger.error("🚨 %s", error_msg)
             
             # Create detailed debug response
             debug_info = {
@@ -6649,58 +6562,58 @@ class RobustOutfitGenerationService:
         max_items = 4 if is_minimalistic else 6  # Minimalist = fewer items, regular = more options
         recommended_layers = 0  # Additional layering pieces
         
-        logger.info(f"🌡️ LAYERING ANALYSIS: Temperature={temp}°F, Occasion={occasion_lower}, Style={context.style}")
+        logger.info("🌡️ LAYERING ANALYSIS: Temperature=%s°F, Occasion=%s, Style=%s", temp, occasion_lower, context.style)
         
         if is_minimalistic:
-            logger.info(f"  ✨ MINIMALISTIC style detected → Max items reduced to {max_items}, layers conservative")
+            logger.info("  ✨ MINIMALISTIC style detected → Max items reduced to %s, layers conservative", max_items)
         
         # Temperature-based layering
         if temp < 30:
             recommended_layers = 3 if not is_minimalistic else 2  # Heavy layering
-            logger.info(f"  🥶 Very cold ({temp}°F) → {recommended_layers} additional layers")
+            logger.info("  🥶 Very cold (%s°F) → %s additional layers", temp, recommended_layers)
         elif temp < 50:
             recommended_layers = 2 if not is_minimalistic else 1  # Moderate layering
-            logger.info(f"  ❄️ Cold ({temp}°F) → {recommended_layers} additional layers")
+            logger.info("  ❄️ Cold (%s°F) → %s additional layers", temp, recommended_layers)
         elif temp < 65:
             recommended_layers = 1  # Light layering (one outer layer)
-            logger.info(f"  🍂 Cool ({temp}°F) → 1 additional layer (light jacket/cardigan)")
+            logger.info("  🍂 Cool (%s°F) → 1 additional layer (light jacket/cardigan)", temp)
         elif temp <= 80:  # Extended range - light jacket can work up to 80°F
             # Light jacket optional for A/C, evening, or style preference
             recommended_layers = 1 if not is_minimalistic else 0
-            logger.info(f"  ☀️ Mild ({temp}°F) → Light jacket optional (A/C, evening, style)")
+            logger.info("  ☀️ Mild (%s°F) → Light jacket optional (A/C, evening, style)", temp)
         else:
             recommended_layers = 0  # Hot weather, no layering
-            logger.info(f"  🔥 Hot ({temp}°F) → No additional layers needed")
+            logger.info("  🔥 Hot (%s°F) → No additional layers needed", temp)
         
         # Occasion-based adjustments
         if occasion_lower in ['business', 'formal', 'wedding']:
             recommended_layers += 1  # Add blazer/jacket for formality
-            logger.info(f"  👔 Formal occasion → +1 layer for professionalism")
+            logger.info("  👔 Formal occasion → +1 layer for professionalism")
         elif occasion_lower in ['athletic', 'gym']:
             recommended_layers = max(0, recommended_layers - 1)  # Reduce layers for movement
-            logger.info(f"  🏃 Athletic occasion → Reduce layers for mobility")
+            logger.info("  🏃 Athletic occasion → Reduce layers for mobility")
         
         loungewear_mode = occasion_lower in ['loungewear', 'lounge', 'home', 'relaxed'] or style_lower == 'loungewear'
         lounge_item_ids: set = set()
         if loungewear_mode and isinstance(context.metadata_notes, dict):
             lounge_item_ids = set(context.metadata_notes.get('lounge_item_ids', []) or [])
             if lounge_item_ids:
-                logger.info(f"🛋️ LOUNGE MODE: {len(lounge_item_ids)} lounge-qualified items available after filtering")
+                logger.info("🛋️ LOUNGE MODE: %s lounge-qualified items available after filtering", len(lounge_item_ids))
 
         if loungewear_mode:
             min_items = max(min_items, 4)
-            logger.info(f"🛋️ LOUNGE MODE: Minimum items increased to {min_items} for cozy layering")
+            logger.info("🛋️ LOUNGE MODE: Minimum items increased to %s for cozy layering", min_items)
 
         if requires_minimalist_party_polish:
             previous_min = min_items
             min_items = max(min_items, 4)
             if min_items != previous_min:
-                logger.info(f"🎉 MINIMALIST PARTY: Minimum items increased to {min_items} to ensure polish")
+                logger.info("🎉 MINIMALIST PARTY: Minimum items increased to %s to ensure polish", min_items)
             recommended_layers = max(recommended_layers, 1)
-            logger.info(f"🎉 MINIMALIST PARTY: Enforcing at least one polish layer/accessory")
+            logger.info("🎉 MINIMALIST PARTY: Enforcing at least one polish layer/accessory")
 
         target_items = min(min_items + recommended_layers, max_items)
-        logger.info(f"🎯 TARGET: {target_items} items (min={min_items}, max={max_items}, layers={recommended_layers})")
+        logger.info("🎯 TARGET: %s items (min=%s, max=%s, layers=%s)", target_items, min_items, max_items, recommended_layers)
         
         # ═══════════════════════════════════════════════════════════════════════
         # LAYERING CATEGORIES & PRIORITIES
@@ -6731,9 +6644,9 @@ class RobustOutfitGenerationService:
                         recently_used_item_ids.add(item_id)
             
             if recently_used_item_ids:
-                logger.info(f"🎭 DIVERSITY: Found {len(recently_used_item_ids)} recently used items to de-prioritize")
+                logger.info("🎭 DIVERSITY: Found %s recently used items to de-prioritize", len(recently_used_item_ids))
         except Exception as e:
-            logger.warning(f"⚠️ Could not load recent items for diversity: {e}")
+            logger.warning("⚠️ Could not load recent items for diversity: %s", e)
         
         # Sort items by composite score with randomization AND diversity penalty
         import random
@@ -6755,17 +6668,17 @@ class RobustOutfitGenerationService:
             # 2. Recently worn penalty (EVEN STRONGER) - INCREASED from -2.0 to -3.0
             if item_id in recently_used_item_ids:
                 adjustment -= 3.0  # Very strong penalty to force variety
-                logger.debug(f"  🔄 Recently worn: {score_data['item'].name if hasattr(score_data['item'], 'name') else 'Unknown'} → -3.0 penalty")
+                logger.debug("  🔄 Recently worn: %s → -3.0 penalty", score_data['item'].name if hasattr(score_data['item'], 'name') else 'Unknown')
             
             # 3. Never worn boost (INCREASED)
             item = score_data['item']
             item_wear_count = getattr(item, 'wearCount', 0) if item else 0
             if item_wear_count == 0:
                 adjustment += 1.5  # Boost new items more (was 1.0)
-                logger.debug(f"  🆕 Never worn: {item.name if hasattr(item, 'name') else 'Unknown'} → +1.5 boost")
+                logger.debug("  🆕 Never worn: %s → +1.5 boost", item.name if hasattr(item, 'name') else 'Unknown')
             elif item_wear_count <= 2:
                 adjustment += 0.7  # Boost lightly worn items more (was 0.5)
-                logger.debug(f"  🌱 Lightly worn ({item_wear_count}): {item.name if hasattr(item, 'name') else 'Unknown'} → +0.7 boost")
+                logger.debug("  🌱 Lightly worn (%s): %s → +0.7 boost", item_wear_count, item.name if hasattr(item, 'name') else 'Unknown')
             
             diversity_adjustments[item_id] = adjustment
         
@@ -6774,7 +6687,7 @@ class RobustOutfitGenerationService:
             key=lambda x: x[1]['composite_score'] + diversity_adjustments.get(x[0], 0.0),
             reverse=True
         )
-        logger.info(f"🎲 DIVERSITY: Added ±0.5 noise, -3.0 recently worn penalty, +1.5 new item boost for {len(recently_used_item_ids)} recently used items")
+        logger.info("🎲 DIVERSITY: Added ±0.5 noise, -3.0 recently worn penalty, +1.5 new item boost for %s recently used items", len(recently_used_item_ids))
         
         # ═══════════════════════════════════════════════════════════
         # APPLY OUTFIT COMPOSITION STRATEGY
@@ -6799,7 +6712,7 @@ class RobustOutfitGenerationService:
                 current = diversity_adjustments.get(item_id, 0.0)
                 diversity_adjustments[item_id] = current + adjustment
                 if adjustment != 0:
-                    logger.debug(f"  🎨 STRATEGY: {self.safe_get_item_name(item_scores[item_id]['item'])} {adjustment:+.2f}")
+                    logger.debug("  🎨 STRATEGY: %s %+.2f", self.safe_get_item_name(item_scores[item_id]['item']), adjustment)
             
             # Re-sort with strategy adjustments
             sorted_items = sorted(
@@ -6808,15 +6721,18 @@ class RobustOutfitGenerationService:
                 reverse=True
             )
             
-            logger.info(f"✅ STRATEGY APPLIED: {strategy_metadata['name']} - {len(strategy_adjustments)} items adjusted")
+            logger.info("✅ STRATEGY APPLIED: %s - %s items adjusted", strategy_metadata['name'], len(strategy_adjustments))
             
         except Exception as strategy_error:
-            logger.warning(f"⚠️ Strategy application failed: {strategy_error}, falling back to Traditional")
+            logger.warning("⚠️ Strategy application failed: %s, falling back to Traditional", strategy_error)
             strategy_metadata = {
                 'name': 'Traditional Match (Fallback)',
                 'description': 'Strategy failed, using traditional selection'
             }
         
+        # Categories are derived once per item; every phase below reads them from this cache
+        item_category_of = CategoryCache(self._get_item_category)
+        
         # ═══════════════════════════════════════════════════════════
         # 3:1 EXPLORATION RATIO (Mix high and low scorers)
         # ═══════════════════════════════════════════════════════════
@@ -6826,7 +6742,7 @@ class RobustOutfitGenerationService:
         high_score_items = [(id, s) for id, s in sorted_items if s['composite_score'] + diversity_adjustments.get(id, 0.0) > high_score_threshold]
         low_score_items = [(id, s) for id, s in sorted_items if s['composite_score'] + diversity_adjustments.get(id, 0.0) <= high_score_threshold]
         
-        logger.info(f"🎯 EXPLORATION RATIO: {len(high_score_items)} high scorers (>{high_score_threshold}), {len(low_score_items)} low scorers (<={high_score_threshold})")
+        logger.info("🎯 EXPLORATION RATIO: %s high scorers (>%s), %s low scorers (<=%s)", len(high_score_items), high_score_threshold, len(low_score_items), high_score_threshold)
         
         # ═══════════════════════════════════════════════════════════
         # DRESS DETECTION: Check top 3 scored items for dress
@@ -6841,15 +6757,15 @@ class RobustOutfitGenerationService:
         
         for item_id, score_data in top_3_scored:
             item = score_data['item']
-            item_category = self._get_item_category(item)
+            item_category = item_category_of(item)
             final_score = score_data['composite_score'] + diversity_adjustments.get(item_id, 0.0)
             
             if item_category == 'dress':
                 has_high_scoring_dress = True
                 high_scoring_dress_id = item_id
                 high_scoring_dress_score = final_score
-                logger.info(f"👗 DRESS DETECTED IN TOP 3: '{self.safe_get_item_name(item)}' (score={final_score:.2f})")
-                logger.info(f"   Will prioritize dress-based outfit (dress + shoes + optional layers)")
+                logger.info("👗 DRESS DETECTED IN TOP 3: '%s' (score=%.2f)", self.safe_get_item_name(item), final_score)
+                logger.info("   Will prioritize dress-based outfit (dress + shoes + optional layers)")
                 break
         
         # ═══════════════════════════════════════════════════════════
@@ -6858,10 +6774,10 @@ class RobustOutfitGenerationService:
         # Dynamically set essential categories based on dress detection
         if has_high_scoring_dress:
             essential_categories = ['dress', 'shoes']
-            logger.info(f"✅ ESSENTIAL CATEGORIES (dress-based): {essential_categories}")
+            logger.info("✅ ESSENTIAL CATEGORIES (dress-based): %s", essential_categories)
         else:
             essential_categories = ['tops', 'bottoms', 'shoes']
-            logger.info(f"✅ ESSENTIAL CATEGORIES (traditional): {essential_categories}")
+            logger.info("✅ ESSENTIAL CATEGORIES (traditional): %s", essential_categories)
         
         reserved_items = {}
         reserved_ids = set()
@@ -6870,7 +6786,7 @@ class RobustOutfitGenerationService:
         for category in essential_categories:
             category_items = [
                 (id, s) for id, s in sorted_items 
-                if self._get_item_category(s['item']) == category
+                if item_category_of(s['item']) == category
             ]
             if category_items:
                 # Get the best scoring item from this category
@@ -6878,9 +6794,9 @@ class RobustOutfitGenerationService:
                 reserved_items[category] = best_item
                 reserved_ids.add(best_item[0])
         
-        logger.info(f"🔧 CATEGORY BALANCE: Reserved {len(reserved_items)} essential items: {list(reserved_items.keys())}")
+        logger.info("🔧 CATEGORY BALANCE: Reserved %s essential items: %s", len(reserved_items), list(reserved_items.keys()))
         for cat, (item_id, score_data) in reserved_items.items():
-            logger.debug(f"  ✅ Reserved {cat}: {self.safe_get_item_name(score_data['item'])} (score={score_data['composite_score']:.2f})")
+            logger.debug("  ✅ Reserved %s: %s (score=%.2f)", cat, self.safe_get_item_name(score_data['item']), score_data['composite_score'])
         
         # Mix in 3:1 ratio (75% high confidence, 25% exploration)
         exploration_mixed = []
@@ -6899,17 +6815,17 @@ class RobustOutfitGenerationService:
                 if (idx + 1) % 3 == 0 and low_score_idx < len(low_score_items):
                     if low_score_items[low_score_idx][0] not in reserved_ids:  # Don't duplicate
                         exploration_mixed.append(low_score_items[low_score_idx])
-                        logger.debug(f"  🔍 Exploration: Added low scorer after 3 high scorers")
+                        logger.debug("  🔍 Exploration: Added low scorer after 3 high scorers")
                     low_score_idx += 1
         
         # CRITICAL FIX: If we have few items (< 4), add remaining low scorers to ensure enough options
         # This handles the case where all items are "low scorers" (no high scorers available)
         if len(exploration_mixed) < 4:
-            logger.info(f"🔧 EXPLORATION FIX: Only {len(exploration_mixed)} items in mix, adding remaining low scorers...")
+            logger.info("🔧 EXPLORATION FIX: Only %s items in mix, adding remaining low scorers...", len(exploration_mixed))
             for item_id, score_data in low_score_items:
                 if item_id not in reserved_ids and (item_id, score_data) not in exploration_mixed:
                     exploration_mixed.append((item_id, score_data))
-                    logger.debug(f"  ➕ Added low scorer: {self.safe_get_item_name(score_data['item'])} (score={score_data['composite_score']:.2f})")
+                    logger.debug("  ➕ Added low scorer: %s (score=%.2f)", self.safe_get_item_name(score_data['item']), score_data['composite_score'])
                     # Stop when we have enough items (cap at 6 items total or all available items)
                     if len(exploration_mixed) >= min(len(item_scores), 6):
                         break
@@ -6920,10 +6836,10 @@ class RobustOutfitGenerationService:
         # Log category distribution
         category_counts = {}
         for item_id, score_data in sorted_items:
-            cat = self._get_item_category(score_data['item'])
+            cat = item_category_of(score_data['item'])
             category_counts[cat] = category_counts.get(cat, 0) + 1
-        logger.info(f"✅ EXPLORATION MIX: Created {len(sorted_items)} item list (3:1 high:low ratio + category balance)")
-        logger.info(f"   Category distribution: {category_counts}")
+        logger.info("✅ EXPLORATION MIX: Created %s item list (3:1 high:low ratio + category balance)", len(sorted_items))
+        logger.info("   Category distribution: %s", category_counts)
         
         # Select items with intelligent layering
         selected_items = []
@@ -6932,33 +6848,33 @@ class RobustOutfitGenerationService:
         # Phase 0: PRIORITIZE BASE ITEM - Add base item first if specified
         base_item_obj = None
         if context.base_item_id:
-            logger.info(f"🎯 PHASE 0: Checking for base item: {context.base_item_id}")
+            logger.info("🎯 PHASE 0: Checking for base item: %s", context.base_item_id)
             # First try to find it in scored items
             for item_id, score_data in sorted_items:
                 if item_id == context.base_item_id:
                     base_item_obj = score_data['item']
                     selected_items.append(base_item_obj)
-                    base_category = self._get_item_category(base_item_obj)
+                    base_category = item_category_of(base_item_obj)
                     categories_filled[base_category] = True
-                    logger.info(f"✅ PHASE 0: Base item added from scored items: {self.safe_get_item_name(base_item_obj)} (category: {base_category})")
+                    logger.info("✅ PHASE 0: Base item added from scored items: %s (category: %s)", self.safe_get_item_name(base_item_obj), base_category)
                     break
             
             # CRITICAL FIX v2: If base item not in scored items, find it in original wardrobe
             # This handles the case where base item was pre-approved but not scored
             # Deployed: 2025-10-28 - Fix ensures base item always included in final outfit
             if not base_item_obj:
-                logger.warning(f"⚠️ PHASE 0: Base item {context.base_item_id} not found in scored items - searching wardrobe")
+                logger.warning("⚠️ PHASE 0: Base item %s not found in scored items - searching wardrobe", context.base_item_id)
                 for item in context.wardrobe:
                     if getattr(item, 'id', None) == context.base_item_id:
                         base_item_obj = item
                         selected_items.append(base_item_obj)
-                        base_category = self._get_item_category(base_item_obj)
+                        base_category = item_category_of(base_item_obj)
                         categories_filled[base_category] = True
-                        logger.info(f"✅ PHASE 0: Base item added from wardrobe: {self.safe_get_item_name(base_item_obj)} (category: {base_category})")
+                        logger.info("✅ PHASE 0: Base item added from wardrobe: %s (category: %s)", self.safe_get_item_name(base_item_obj), base_category)
                         break
                 
                 if not base_item_obj:
-                    logger.error(f"❌ PHASE 0: Base item {context.base_item_id} not found in wardrobe!")
+                    logger.error("❌ PHASE 0: Base item %s not found in wardrobe!", context.base_item_id)
         
         def _is_polished_party_shoe(item_obj: Any) -> bool:
             """Return False when a shoe is clearly too casual for minimalist party/formal outfits."""
@@ -7038,7 +6954,7 @@ class RobustOutfitGenerationService:
         if requires_minimalist_party_polish:
             for candidate_id, candidate_score in sorted_items:
                 candidate_item = candidate_score['item']
-                if self._get_item_category(candidate_item) == 'bottoms' and _is_polished_party_bottom(candidate_item):
+                if item_category_of(candidate_item) == 'bottoms' and _is_polished_party_bottom(candidate_item):
                     preferred_polished_bottom_id = candidate_id
                     break
         
@@ -7056,107 +6972,184 @@ class RobustOutfitGenerationService:
             essential_categories = ['tops', 'bottoms', 'shoes']  # Standard outfit requirements
             logger.debug("👔 PHASE 1: No dress → essential categories = ['tops', 'bottoms', 'shoes']")
         
-        # Phase 1: Fill essential categories (tops, bottoms, shoes)
-        logger.info(f"📦 PHASE 1: Selecting essential items (top, bottom, shoes)")
-        logger.debug(f"🔍 DEBUG PHASE 1: Starting with {len(sorted_items)} scored items")
-        for item_id, score_data in sorted_items:
-            item = score_data['item']
-            
-            # Skip base item since it's already added in Phase 0
-            if base_item_obj and item_id == context.base_item_id:
-                logger.debug(f"⏭️ PHASE 1: Skipping base item (already added in Phase 0)")
-                continue
-            
-            category = self._get_item_category(item)
-            item_name_lower = (self.safe_get_item_name(item) if item else "Unknown").lower()
-            
-            logger.debug(f"🔍 DEBUG PHASE 1: Processing item {self.safe_get_item_name(item)} - category: {category}, score: {score_data['composite_score']:.2f}")
-            
-            # METADATA CHECK: Determine layering level from metadata first, fallback to keywords
-            layer_level = 'tops'  # Default
-            can_layer = True  # Default
-            max_layers = 3  # Default
-            
-            if hasattr(item, 'metadata') and item.metadata and isinstance(item.metadata, dict):
-                visual_attrs = item.metadata.get('visualAttributes', {})
-                if isinstance(visual_attrs, dict):
-                    # Use metadata layerLevel if available
-                    metadata_layer_level = visual_attrs.get('layerLevel')
-                    wear_layer = (visual_attrs.get('wearLayer') or '').lower()
-                    can_layer_meta = visual_attrs.get('canLayer')
-                    max_layers_meta = visual_attrs.get('maxLayers')
-                    
-                    if wear_layer:
-                        layer_level = wear_layer  # Use metadata layer (base, mid, outer)
-                        logger.debug(f"  🔍 LAYER: Using metadata wearLayer={wear_layer}")
-                    elif metadata_layer_level:
-                        # Convert numeric to text (1=base, 2=mid, 3=outer)
-                        layer_map = {1: 'base', 2: 'mid', 3: 'outerwear'}
-                        layer_level = layer_map.get(metadata_layer_level, 'tops')
-                        logger.debug(f"  🔍 LAYER: Using metadata layerLevel={metadata_layer_level} → {layer_level}")
-                    
-                    if can_layer_meta is not None:
-                        can_layer = can_layer_meta
-                        logger.debug(f"  🔍 LAYER: canLayer={can_layer}")
-                    
-                    if max_layers_meta is not None:
-                        max_layers = max_layers_meta
-                        logger.debug(f"  🔍 LAYER: maxLayers={max_layers}")
-            
-            # Fallback to keyword-based detection if no metadata
-            if layer_level == 'tops' and category == 'tops':
-                if any(kw in item_name_lower for kw in ['tank', 'cami', 'base', 'undershirt']):
-                    layer_level = 'base'
-                elif any(kw in item_name_lower for kw in ['sweater', 'cardigan', 'hoodie']):
-                    layer_level = 'mid'
-            elif category == 'outerwear':
-                layer_level = 'outerwear'
-            elif category == 'accessories':
-                layer_level = 'accessories'
-            else:
-                layer_level = category
-            
-            # Essential categories first (but ONLY if score is positive or close to 0)
-            if category in essential_categories:
-                if category not in categories_filled:
-                    # CRITICAL: Don't select items with very negative scores, even as essentials
-                    composite_score = score_data['composite_score']
-                    if category == 'bottoms' and requires_minimalist_party_polish:
-                        if preferred_polished_bottom_id and item_id != preferred_polished_bottom_id and not _is_polished_party_bottom(item):
-                            logger.info(f"  ⏭️ Essential bottoms: {self.safe_get_item_name(item)} skipped — looking for polished option first")
-                            continue
-                        if not _is_polished_party_bottom(item) and not preferred_polished_bottom_id:
-                            logger.warning(f"  ⚠️ Essential bottoms: No polished option available; allowing {self.safe_get_item_name(item)}")
-                    if composite_score > -1.0:  # Allow slightly negative scores, but not terrible ones
-                        # FORBIDDEN COMBINATIONS CHECK: Prevent fashion faux pas
-                        if self._is_forbidden_combination(item, selected_items):
-                            logger.warning(f"  🚫 FORBIDDEN COMBO: {self.safe_get_item_name(item)} creates forbidden combination with existing items")
-                            continue  # Skip this item
-                        
-                        # 🔒 CANONICAL GATE: Check invariants before adding
-                        can_add, reason = self._can_add_category(category, categories_filled, selected_items, item)
-                        if not can_add:
-                            logger.warning(f"  🚫 INVARIANT BLOCK (Phase 1): {category} '{self.safe_get_item_name(item)}' - {reason}")
-                            continue
-                        
-                        if category == 'shoes' and requires_minimalist_party_polish:
-                            if not _is_polished_party_shoe(item):
-                                logger.info(f"  ⏭️ Essential shoes: {self.safe_get_item_name(item)} skipped — not polished enough for minimalist {context.occasion}")
-                                continue
-                        if not _is_monochrome_allowed(item, item_id, score_data, log_prefix="  "):
-                            continue
-                        
-                        selected_items.append(item)
-                        categories_filled[category] = True
-                        logger.info(f"  ✅ Essential {category}: {self.safe_get_item_name(item)} (score={score_data['composite_score']:.2f})")
-                    else:
-                        logger.warning(f"  ⚠️ SKIPPED Essential {category}: {self.safe_get_item_name(item)} (score={composite_score:.2f} too low - inappropriate for occasion)")
+        # ═══════════════════════════════════════════════════════════
+        # PHASE 1+2: BEAM SEARCH over essential, layering and accessory slots
+        # ═══════════════════════════════════════════════════════════
+        # Instead of committing to the first acceptable item per category, the
+        # composer keeps the best partial outfits after each slot, scoring
+        # pairwise formality coherence incrementally and pruning on the
+        # canonical gate and forbidden combinations. Runner-up outfits from the
+        # same search are kept for shuffle/regenerate requests.
+        outerwear_threshold = 0.6
+        mid_layer_threshold = 0.6
+        accessory_threshold = 0.7
+        if loungewear_mode:
+            outerwear_threshold = 0.45
+            mid_layer_threshold = 0.45
+            accessory_threshold = 0.85  # Accessories rarely needed for lounge sets
+
+        if requires_minimalist_party_polish:
+            outerwear_threshold = min(outerwear_threshold, 0.45)
+            mid_layer_threshold = min(mid_layer_threshold, 0.55)
+            accessory_threshold = min(accessory_threshold, 0.55)
+
+        lounge_layer_keywords = ['sweater', 'cardigan', 'vest', 'hoodie', 'pullover', 'fleece', 'crewneck', 'henley', 'thermal', 'knit', 'zip', 'jogger']
+
+        def _is_lounge_layer_name(name_lower: str) -> bool:
+            return any(kw in name_lower for kw in lounge_layer_keywords)
+
+        scored_lookup = dict(sorted_items)
+        # Precomputed by the weather analyzer: warmth index and layer level per item
+        from ..custom_types.wardrobe import LayerLevel, WarmthFactor
+        from .scoring.weather_analyzer import WARMTH_INDEX
+
+        def _weather_features(item_id: str):
+            return (scored_lookup.get(item_id) or {}).get('weather_features')
+
+        def _is_mid_layer(item_id: str, name_lower: str) -> bool:
+            features = _weather_features(item_id)
+            return _is_lounge_layer_name(name_lower) or (features is not None and features.layer_level == LayerLevel.MIDDLE)
+
+        def _is_heavy(item_id: str) -> bool:
+            features = _weather_features(item_id)
+            return features is not None and features.warmth_index == WARMTH_INDEX[WarmthFactor.HEAVY]
+        slot_rule_results: Dict[Tuple[str, str], bool] = {}
+
+        def _passes_slot_rules(slot_name: str, candidate: Candidate) -> bool:
+            """Item-only slot rules (score thresholds, polish, palette), evaluated once per item and slot."""
+            key = (slot_name, candidate.item_id)
+            if key in slot_rule_results:
+                return slot_rule_results[key]
+            item = candidate.item
+            score_data = scored_lookup.get(candidate.item_id)
+            composite_score = score_data['composite_score']
+            name_lower = (self.safe_get_item_name(item) or "unknown").lower()
+
+            if slot_name == 'layer':
+                if loungewear_mode and lounge_item_ids and candidate.item_id not in lounge_item_ids and not _is_lounge_layer_name(name_lower):
+                    passes = False
+                elif candidate.category == 'outerwear':
+                    # A formal polish layer above 65°F must not be a heavy coat
+                    passes = composite_score > outerwear_threshold and (
+                        temp < 65 or (occasion_lower in ['business', 'formal'] and not _is_heavy(candidate.item_id))
+                    )
                 else:
-                    logger.debug(f"  ⏭️ Essential {category}: {self.safe_get_item_name(item)} skipped - category already filled")
+                    passes = composite_score > mid_layer_threshold and _is_mid_layer(candidate.item_id, name_lower) and temp < 70
+            elif slot_name == 'accessory':
+                passes = composite_score > accessory_threshold and (temp < 50 or occasion_lower in ['formal', 'business'])
             else:
-                logger.debug(f"  ⏭️ Non-essential {category}: {self.safe_get_item_name(item)} - will check in Phase 2")
-        
-        logger.debug(f"🔍 DEBUG PHASE 1 COMPLETE: Selected {len(selected_items)} items, categories filled: {categories_filled}")
+                # CRITICAL: Don't select items with very negative scores, even as essentials
+                passes = composite_score > -1.0
+                if passes and candidate.category == 'bottoms' and requires_minimalist_party_polish:
+                    if preferred_polished_bottom_id:
+                        passes = candidate.item_id == preferred_polished_bottom_id or _is_polished_party_bottom(item)
+                    elif not _is_polished_party_bottom(item):
+                        logger.warning("  ⚠️ Essential bottoms: No polished option available; allowing %s", self.safe_get_item_name(item))
+                if passes and candidate.category == 'shoes' and requires_minimalist_party_polish:
+                    passes = _is_polished_party_shoe(item)
+
+            passes = passes and _is_monochrome_allowed(item, candidate.item_id, score_data, log_prefix="  ")
+            slot_rule_results[key] = passes
+            return passes
+
+        def _passes_canonical_gate(candidate: Candidate, chosen_items: List[Any]) -> bool:
+            filled = {item_category_of(chosen): True for chosen in chosen_items}
+            can_add, _ = self._can_add_category(candidate.category, filled, chosen_items, candidate.item)
+            return can_add
+
+        def _accepts_essential(candidate: Candidate, chosen_items: List[Any]) -> bool:
+            return _passes_slot_rules(candidate.category, candidate) and _passes_canonical_gate(candidate, chosen_items)
+
+        def _accepts_layer(candidate: Candidate, chosen_items: List[Any]) -> bool:
+            if not _passes_slot_rules('layer', candidate):
+                return False
+            if candidate.category == 'outerwear':
+                return not any(item_category_of(chosen) == 'outerwear' for chosen in chosen_items)
+            has_mid_layer = any(
+                _is_mid_layer(self.safe_get_item_attr(chosen, 'id'), self.safe_get_item_name(chosen).lower()) for chosen in chosen_items
+            )
+            return not has_mid_layer and _passes_canonical_gate(candidate, chosen_items)
+
+        def _accepts_accessory(candidate: Candidate, chosen_items: List[Any]) -> bool:
+            # Limit to 2 accessories max (a base-item accessory counts)
+            accessory_count = sum(1 for chosen in chosen_items if item_category_of(chosen) == 'accessories')
+            return accessory_count < 2 and _passes_slot_rules('accessory', candidate)
+
+        formality_levels: Dict[str, int] = {}
+
+        def _formality(candidate: Candidate) -> int:
+            level = formality_levels.get(candidate.item_id)
+            if level is None:
+                level = self._get_item_formality_level(candidate.item) or 0
+                formality_levels[candidate.item_id] = level
+            return level
+
+        def _formality_pair_score(a: Candidate, b: Candidate) -> float:
+            """Penalize pieces more than one formality level apart (accessories are neutral)."""
+            if a.category == 'accessories' or b.category == 'accessories':
+                return 0.0
+            gap = abs(_formality(a) - _formality(b))
+            return -0.25 * max(0, gap - 1)
+
+        beam_index = CandidateIndex(
+            ((item_id, score_data['item'], score_data['composite_score'] + diversity_adjustments.get(item_id, 0.0))
+             for item_id, score_data in sorted_items),
+            category_of=item_category_of,
+        )
+        pinned = []
+        if base_item_obj is not None:
+            pinned.append(beam_index.candidates.get(context.base_item_id) or Candidate(
+                context.base_item_id, base_item_obj, item_category_of(base_item_obj), 0.0,
+            ))
+
+        composer = BeamOutfitComposer(
+            slots=[SlotSpec(category, (category,), accepts=_accepts_essential) for category in essential_categories] + [
+                SlotSpec('mid_layer', ('tops',), required=False, accepts=_accepts_layer),
+                SlotSpec('outer_layer', ('outerwear',), required=False, accepts=_accepts_layer),
+                SlotSpec('accessory', ('accessories',), required=False, accepts=_accepts_accessory),
+                SlotSpec('second_accessory', ('accessories',), required=False, accepts=_accepts_accessory),
+            ],
+            max_items=target_items,
+            pair_score=_formality_pair_score,
+            is_forbidden=lambda new_item, existing: self._is_forbidden_combination(new_item, [existing]),
+        )
+        def _session_penalty(item_id: str) -> float:
+            return item_scores.get(item_id, {}).get('session_penalty', 0.0)
+
+        def _available(item_id: str) -> bool:
+            # Pooled outfits may hold items this round's candidate list no longer offers
+            return item_id in beam_index.candidates or any(pin.item_id == item_id for pin in pinned)
+
+        best_composition = composition_pool.take_best(_session_penalty, _available) if composition_pool else None
+        if best_composition is not None:
+            logger.info("📦 PHASE 1+2: Using pooled runner-up (%s left)", len(composition_pool))
+        else:
+            logger.info("📦 PHASE 1+2: Beam search over %s slots (%s candidates)", len(composer.slots), len(beam_index))
+            compositions = composer.compose(beam_index, pinned=pinned, top_n=composition_pool.size if composition_pool is not None else 1)
+            best_composition = compositions[0]
+            if composition_pool is not None:
+                composition_pool.add(compositions[1:], _session_penalty)
+
+        for (slot_name, item_id), candidate in zip(best_composition.slots, best_composition.candidates):
+            if base_item_obj is not None and item_id == context.base_item_id:
+                continue  # Already added in Phase 0
+            selected_items.append(candidate.item)
+            if slot_name in ('mid_layer', 'outer_layer'):
+                categories_filled['outerwear' if candidate.category == 'outerwear' else 'mid'] = True
+                logger.info("  ✅ Layer (%s): %s (score=%.2f)", candidate.category, self.safe_get_item_name(candidate.item), scored_lookup[item_id]['composite_score'])
+            elif slot_name in ('accessory', 'second_accessory'):
+                logger.info("  ✅ Accessory: %s (score=%.2f)", self.safe_get_item_name(candidate.item), scored_lookup[item_id]['composite_score'])
+            else:
+                categories_filled[candidate.category] = True
+                logger.info("  ✅ Essential %s: %s (score=%.2f)", candidate.category, self.safe_get_item_name(candidate.item), scored_lookup[item_id]['composite_score'])
+
+        if best_composition.missing:
+            logger.warning("  ⚠️ BEAM: No acceptable item for %s", list(best_composition.missing))
+        logger.info(
+            "🔎 BEAM: chosen score=%.2f (expanded=%s, pruned=%s)",
+            best_composition.score, composer.stats['expanded'], composer.stats['pruned'],
+        )
+        logger.debug("🔍 DEBUG PHASE 1 COMPLETE: Selected %s items, categories filled: %s", len(selected_items), categories_filled)
         
         # ═══════════════════════════════════════════════════════════
         # FIX #2: SAFETY NET - Ensure all essential categories are filled
@@ -7165,14 +7158,14 @@ class RobustOutfitGenerationService:
         missing_categories = [cat for cat in essential_categories if cat not in categories_filled]
         
         if missing_categories:
-            logger.warning(f"🔧 SAFETY NET ACTIVATED: Missing essential categories: {missing_categories}")
+            logger.warning("🔧 SAFETY NET ACTIVATED: Missing essential categories: %s", missing_categories)
             
             # Search ALL scored items (not just exploration mix) for best items from missing categories
             for missing_cat in missing_categories:
                 # Get all items from this category across ALL scored items
                 category_candidates = [
                     (id, s) for id, s in item_scores.items()
-                    if self._get_item_category(s['item']) == missing_cat
+                    if item_category_of(s['item']) == missing_cat
                 ]
                 
                 if category_candidates:
@@ -7198,39 +7191,39 @@ class RobustOutfitGenerationService:
                                     continue
                                 selected_items.append(item)
                                 categories_filled[missing_cat] = True
-                                logger.info(f"  ✅ SAFETY NET: Added {missing_cat} '{self.safe_get_item_name(item)}' (score={composite_score:.2f})")
+                                logger.info("  ✅ SAFETY NET: Added %s '%s' (score=%.2f)", missing_cat, self.safe_get_item_name(item), composite_score)
                                 added = True
                                 break
                             else:
-                                logger.debug(f"  ⏭️ SAFETY NET: Skipped {missing_cat} '{self.safe_get_item_name(item)}' (blocked by hard filter)")
+                                logger.debug("  ⏭️ SAFETY NET: Skipped %s '%s' (blocked by hard filter)", missing_cat, self.safe_get_item_name(item))
                         else:
-                            logger.debug(f"  ⏭️ SAFETY NET: Skipped {missing_cat} '{self.safe_get_item_name(item)}' (score too low: {composite_score:.2f})")
+                            logger.debug("  ⏭️ SAFETY NET: Skipped %s '%s' (score too low: %.2f)", missing_cat, self.safe_get_item_name(item), composite_score)
                     
                     if not added:
-                        logger.warning(f"  ⚠️ SAFETY NET: No valid {missing_cat} found (all items blocked or scored too low)")
+                        logger.warning("  ⚠️ SAFETY NET: No valid %s found (all items blocked or scored too low)", missing_cat)
                 else:
-                    logger.warning(f"  ⚠️ SAFETY NET: No {missing_cat} items available in wardrobe")
+                    logger.warning("  ⚠️ SAFETY NET: No %s items available in wardrobe", missing_cat)
             
             # Log final result after safety net
             final_missing = [cat for cat in ['tops', 'bottoms', 'shoes'] if cat not in categories_filled]
             if final_missing:
-                logger.warning(f"⚠️ SAFETY NET: Still missing categories after safety net: {final_missing}")
+                logger.warning("⚠️ SAFETY NET: Still missing categories after safety net: %s", final_missing)
                 
             # LAST RESORT: If bottoms are missing, search ENTIRE wardrobe for relaxed lounge bottoms
             if 'bottoms' in final_missing:
                 # 🔒 CANONICAL GATE: Check if bottoms can be added (dress check)
                 can_add_bottoms, reason = self._can_add_category('bottoms', categories_filled, selected_items, None)
                 if not can_add_bottoms:
-                    logger.warning(f"⚠️ LAST RESORT: Skipping bottoms search - {reason}")
+                    logger.warning("⚠️ LAST RESORT: Skipping bottoms search - %s", reason)
                 else:
-                    logger.warning(f"⚠️ LAST RESORT: Searching entire wardrobe for relaxed lounge bottoms")
+                    logger.warning("⚠️ LAST RESORT: Searching entire wardrobe for relaxed lounge bottoms")
                     lounge_item_ids = set()
                     if isinstance(context.metadata_notes, dict):
                         lounge_item_ids = set(context.metadata_notes.get('lounge_item_ids', []) or [])
                     original_pool = context.wardrobe_original or context.wardrobe
                     all_bottoms = [
                         item for item in original_pool
-                        if self._get_item_category(item) == 'bottoms'
+                        if item_category_of(item) == 'bottoms'
                     ]
                     if all_bottoms:
                         import random
@@ -7266,8 +7259,8 @@ class RobustOutfitGenerationService:
                                 selected_items.append(best_bottom)
                                 categories_filled['bottoms'] = True
                                 logger.warning(
-                                    f"⚠️ LAST RESORT: Added relaxed bottom '{self.safe_get_item_name(best_bottom)}' "
-                                    f"(priority={priority}, score={best_score:.2f})"
+                                    "⚠️ LAST RESORT: Added relaxed bottom '%s' (priority=%s, score=%.2f)",
+                                    self.safe_get_item_name(best_bottom), priority, best_score,
                                 )
                             else:
                                 logger.warning("⚠️ LAST RESORT: Best relaxed bottom failed monochrome check")
@@ -7278,12 +7271,12 @@ class RobustOutfitGenerationService:
 
                 # LAST RESORT: If shoes are missing, search ENTIRE wardrobe (bypass occasion filter)
                 if 'shoes' in final_missing:
-                    logger.warning(f"⚠️ LAST RESORT: Searching entire wardrobe for any shoes (bypassing occasion filter)")
+                    logger.warning("⚠️ LAST RESORT: Searching entire wardrobe for any shoes (bypassing occasion filter)")
                     
                     # Get ALL shoes from original wardrobe (before occasion filtering)
                     all_shoes = [
                         item for item in context.wardrobe_original 
-                        if self._get_item_category(item) == 'shoes'
+                        if item_category_of(item) == 'shoes'
                     ]
                     
                     if all_shoes:
@@ -7305,152 +7298,51 @@ class RobustOutfitGenerationService:
                                 selected_items.append(best_shoe)
                                 categories_filled['shoes'] = True
                                 
-                                logger.warning(f"⚠️ LAST RESORT: Added best available shoe '{self.safe_get_item_name(best_shoe)}' (score={best_score:.2f})")
-                                logger.warning(f"⚠️ WARNING: This shoe might not be ideal for {context.occasion} occasion")
+                                logger.warning("⚠️ LAST RESORT: Added best available shoe '%s' (score=%.2f)", self.safe_get_item_name(best_shoe), best_score)
+                                logger.warning("⚠️ WARNING: This shoe might not be ideal for %s occasion", context.occasion)
                                 
                                 # Mark this outfit as having a potential mismatch
                                 if not hasattr(context, 'warnings') or context.warnings is None:
                                     context.warnings = []
                                 context.warnings.append(f"Shoes ({self.safe_get_item_name(best_shoe)}) may not be ideal for {context.occasion} occasion")
                             else:
-                                logger.warning(f"⚠️ LAST RESORT: Skipped shoe '{self.safe_get_item_name(best_shoe)}' due to monochrome palette mismatch")
+                                logger.warning("⚠️ LAST RESORT: Skipped shoe '%s' due to monochrome palette mismatch", self.safe_get_item_name(best_shoe))
                         else:
-                            logger.error(f"🚫 LAST RESORT FAILED: All shoes are already selected")
+                            logger.error("🚫 LAST RESORT FAILED: All shoes are already selected")
                     else:
-                        logger.error(f"🚫 LAST RESORT FAILED: No shoes found in entire wardrobe")
+                        logger.error("🚫 LAST RESORT FAILED: No shoes found in entire wardrobe")
             else:
-                logger.info(f"✅ SAFETY NET: Successfully filled all essential categories")
+                logger.info("✅ SAFETY NET: Successfully filled all essential categories")
         else:
-            logger.info(f"✅ SAFETY NET: Not needed - all essential categories filled in Phase 1")
+            logger.info("✅ SAFETY NET: Not needed - all essential categories filled in Phase 1")
         
         # EMERGENCY BYPASS: If no items selected, force select the first item
         if len(selected_items) == 0 and sorted_items:
-            logger.warning(f"🚨 EMERGENCY BYPASS: No items selected in Phase 1, forcing selection of first palette-compatible item")
+            logger.warning("🚨 EMERGENCY BYPASS: No items selected in Phase 1, forcing selection of first palette-compatible item")
             forced_item = None
             forced_category = 'tops'
             for candidate_id, candidate_score in sorted_items:
                 candidate_item = candidate_score['item']
                 if _is_monochrome_allowed(candidate_item, candidate_id, candidate_score, log_prefix="  "):
                     forced_item = candidate_item
-                    forced_category = self._get_item_category(candidate_item) or 'tops'
+                    forced_category = item_category_of(candidate_item) or 'tops'
                     break
             if forced_item is None:
                 forced_item = sorted_items[0][1]['item']
             selected_items.append(forced_item)
             categories_filled[forced_category] = True
-            logger.info(f"🚨 EMERGENCY BYPASS: Forced selection of {self.safe_get_item_name(forced_item)}")
-        
-        # Phase 2: Add layering pieces based on target count
-        logger.info(f"📦 PHASE 2: Adding {recommended_layers} layering pieces")
-        outerwear_threshold = 0.6
-        mid_layer_threshold = 0.6
-        accessory_threshold = 0.7
-        if loungewear_mode:
-            outerwear_threshold = 0.45
-            mid_layer_threshold = 0.45
-            accessory_threshold = 0.85  # Accessories rarely needed for lounge sets
-
-        if requires_minimalist_party_polish:
-            outerwear_threshold = min(outerwear_threshold, 0.45)
-            mid_layer_threshold = min(mid_layer_threshold, 0.55)
-            accessory_threshold = min(accessory_threshold, 0.55)
-
-        lounge_layer_keywords = ['sweater', 'cardigan', 'vest', 'hoodie', 'pullover', 'fleece', 'crewneck', 'henley', 'thermal', 'knit', 'zip', 'jogger']
-
-        def _is_lounge_layer_name(name_lower: str) -> bool:
-            return any(kw in name_lower for kw in lounge_layer_keywords)
-
-        for item_id, score_data in sorted_items:
-            if len(selected_items) >= target_items:
-                break
-            
-            item = score_data['item']
-            if item in selected_items:
-                continue
-            
-            category = self._get_item_category(item)
-            item_name_lower = (self.safe_get_item_name(item) if item else "Unknown").lower()
-            item_identifier = self.safe_get_item_attr(item, 'id', '')
-
-            if loungewear_mode and lounge_item_ids and item_identifier:
-                # Prefer items flagged by lounge heuristics when available
-                if category in ['tops', 'outerwear'] and item_identifier not in lounge_item_ids and not _is_lounge_layer_name(item_name_lower):
-                    logger.debug(f"  ⏭️ Lounge layer skip: {self.safe_get_item_name(item)} not flagged as lounge candidate")
-                    continue
-            
-            # Determine layering appropriateness
-            # VERSION: 2025-10-11-DUPLICATE-FIX
-            if category == 'outerwear' and score_data['composite_score'] > outerwear_threshold:
-                # ✅ FIX: Check if outerwear already exists before adding
-                has_outerwear = any(self._get_item_category(i) == 'outerwear' for i in selected_items)
-                
-                if not has_outerwear and (temp < 65 or occasion_lower in ['business', 'formal']):
-                    # FORBIDDEN COMBINATIONS CHECK
-                    if self._is_forbidden_combination(item, selected_items):
-                        logger.warning(f"  🚫 FORBIDDEN COMBO: {self.safe_get_item_name(item)} (outerwear) would create forbidden combination")
-                    else:
-                        if not _is_monochrome_allowed(item, item_id, score_data, log_prefix="  "):
-                            continue
-                        selected_items.append(item)
-                        categories_filled['outerwear'] = True  # Track that we added outerwear
-                        logger.warning(f"  ✅ Outerwear: {self.safe_get_item_name(item)} (score={score_data['composite_score']:.2f})")
-                elif has_outerwear:
-                    logger.warning(f"  ⏭️ Outerwear: {self.safe_get_item_name(item)} - SKIPPED (already have outerwear)")
-            
-            elif category == 'tops' and score_data['composite_score'] > mid_layer_threshold:
-                # ✅ FIX: Check if mid-layer already exists before adding
-                is_mid_layer = _is_lounge_layer_name(item_name_lower)
-                has_mid_layer = any(
-                    _is_lounge_layer_name(self.safe_get_item_name(i).lower())
-                    for i in selected_items
-                )
-                
-                # ✅ NEW: Check for forbidden layering combinations
-                if self._is_forbidden_combination(item, selected_items):
-                    logger.warning(f"  🚫 FORBIDDEN COMBO: {self.safe_get_item_name(item)} would create forbidden layering combination")
-                    continue
-                
-                # 🔒 CANONICAL GATE: Check invariants before adding
-                can_add, reason = self._can_add_category(category, categories_filled, selected_items, item)
-                if not can_add:
-                    logger.warning(f"  🚫 INVARIANT BLOCK (Phase 2 Layering): {category} '{self.safe_get_item_name(item)}' - {reason}")
-                    continue
-                
-                if is_mid_layer and not has_mid_layer and temp < 70:
-                    if _is_monochrome_allowed(item, item_id, score_data, log_prefix="  "):
-                        selected_items.append(item)
-                        categories_filled['mid'] = True  # Track that we added mid-layer
-                        logger.warning(f"  ✅ Mid-layer: {self.safe_get_item_name(item)} (score={score_data['composite_score']:.2f})")
-                elif is_mid_layer and has_mid_layer:
-                    logger.warning(f"  ⏭️ Mid-layer: {self.safe_get_item_name(item)} - SKIPPED (already have mid-layer)")
-                else:
-                    # Allow adding other tops (canonical gate already checked for shirts/dress conflicts)
-                    if _is_monochrome_allowed(item, item_id, score_data, log_prefix="  "):
-                        selected_items.append(item)
-                        logger.warning(f"  ✅ Top: {self.safe_get_item_name(item)} (score={score_data['composite_score']:.2f})")
-            
-            elif category == 'accessories' and score_data['composite_score'] > accessory_threshold:
-                # Accessories can have multiple items (belts, watches, etc.)
-                if temp < 50 or occasion_lower in ['formal', 'business']:
-                    # Limit to 2 accessories max
-                    accessory_count = sum(1 for i in selected_items if self._get_item_category(i) == 'accessories')
-                    if accessory_count < 2:
-                        if _is_monochrome_allowed(item, item_id, score_data, log_prefix="  "):
-                            selected_items.append(item)
-                            logger.warning(f"  ✅ Accessory: {self.safe_get_item_name(item)} (score={score_data['composite_score']:.2f})")
-                    else:
-                        logger.warning(f"  ⏭️ Accessory: {self.safe_get_item_name(item)} - SKIPPED (already have 2 accessories)")
+            logger.info("🚨 EMERGENCY BYPASS: Forced selection of %s", self.safe_get_item_name(forced_item))
         
         if requires_minimalist_party_polish and len(selected_items) < max_items:
-            has_outerwear = any(self._get_item_category(i) == 'outerwear' for i in selected_items)
-            has_accessory = any(self._get_item_category(i) == 'accessories' for i in selected_items)
+            has_outerwear = any(item_category_of(i) == 'outerwear' for i in selected_items)
+            has_accessory = any(item_category_of(i) == 'accessories' for i in selected_items)
 
             if not has_outerwear and len(selected_items) < max_items:
                 for candidate_id, score_data in sorted_items:
                     candidate_item = score_data['item']
                     if candidate_item in selected_items:
                         continue
-                    if self._get_item_category(candidate_item) != 'outerwear':
+                    if item_category_of(candidate_item) != 'outerwear':
                         continue
                     if score_data['composite_score'] < 0.1:
                         continue
@@ -7460,7 +7352,7 @@ class RobustOutfitGenerationService:
                         continue
                     selected_items.append(candidate_item)
                     categories_filled['outerwear'] = True
-                    logger.info(f"  ✅ MINIMALIST PARTY: Added polish outer layer {self.safe_get_item_name(candidate_item)}")
+                    logger.info("  ✅ MINIMALIST PARTY: Added polish outer layer %s", self.safe_get_item_name(candidate_item))
                     break
 
             if not has_accessory and len(selected_items) < max_items:
@@ -7468,7 +7360,7 @@ class RobustOutfitGenerationService:
                     candidate_item = score_data['item']
                     if candidate_item in selected_items:
                         continue
-                    if self._get_item_category(candidate_item) != 'accessories':
+                    if item_category_of(candidate_item) != 'accessories':
                         continue
                     if score_data['composite_score'] < 0.05:
                         continue
@@ -7477,13 +7369,13 @@ class RobustOutfitGenerationService:
                     if not _is_monochrome_allowed(candidate_item, candidate_id, score_data, log_prefix="  "):
                         continue
                     selected_items.append(candidate_item)
-                    logger.info(f"  ✅ MINIMALIST PARTY: Added polish accessory {self.safe_get_item_name(candidate_item)}")
+                    logger.info("  ✅ MINIMALIST PARTY: Added polish accessory %s", self.safe_get_item_name(candidate_item))
                     break
         
         # Ensure minimum items
         if len(selected_items) < min_items:
             if loungewear_mode and lounge_item_ids:
-                logger.info(f"🛋️ LOUNGE MODE: Adding lounge-qualified layers to reach minimum {min_items}")
+                logger.info("🛋️ LOUNGE MODE: Adding lounge-qualified layers to reach minimum %s", min_items)
                 for item_id, score_data in sorted_items:
                     if len(selected_items) >= min_items:
                         break
@@ -7497,10 +7389,10 @@ class RobustOutfitGenerationService:
                         continue
                     
                     # 🔒 CANONICAL GATE: Check invariants before adding
-                    item_category = self._get_item_category(candidate)
+                    item_category = item_category_of(candidate)
                     can_add, reason = self._can_add_category(item_category, categories_filled, selected_items, candidate)
                     if not can_add:
-                        logger.debug(f"  🚫 Lounge Filler: {self.safe_get_item_name(candidate)} ({item_category}) - BLOCKED ({reason})")
+                        logger.debug("  🚫 Lounge Filler: %s (%s) - BLOCKED (%s)", self.safe_get_item_name(candidate), item_category, reason)
                         continue
                     
                     # CRITICAL: Apply hard filter to lounge fillers too
@@ -7509,7 +7401,7 @@ class RobustOutfitGenerationService:
                     if _is_monochrome_allowed(candidate, candidate_id, score_data, log_prefix="  "):
                         selected_items.append(candidate)
                         categories_filled[item_category] = True  # Track category
-                        logger.info(f"  🛋️ Added lounge filler: {self.safe_get_item_name(candidate)} ({item_category}, score={score_data['composite_score']:.2f})")
+                        logger.info("  🛋️ Added lounge filler: %s (%s, score=%.2f)", self.safe_get_item_name(candidate), item_category, score_data['composite_score'])
 
             if requires_minimalist_party_polish and len(selected_items) < min_items:
                 polish_filler_categories = ['outerwear', 'accessories']
@@ -7522,7 +7414,7 @@ class RobustOutfitGenerationService:
                         candidate = score_data['item']
                         if candidate in selected_items:
                             continue
-                        candidate_category = self._get_item_category(candidate)
+                        candidate_category = item_category_of(candidate)
                         if candidate_category != desired_category:
                             continue
                         if score_data['composite_score'] < -0.25:
@@ -7534,14 +7426,14 @@ class RobustOutfitGenerationService:
                         selected_items.append(candidate)
                         if desired_category == 'outerwear':
                             categories_filled['outerwear'] = True
-                        logger.info(f"  ✅ MINIMALIST PARTY: Added polish {desired_category} filler {self.safe_get_item_name(candidate)}")
+                        logger.info("  ✅ MINIMALIST PARTY: Added polish %s filler %s", desired_category, self.safe_get_item_name(candidate))
                         break
 
-            logger.warning(f"⚠️ Only {len(selected_items)} items selected, adding more to reach minimum {min_items}...")
+            logger.warning("⚠️ Only %s items selected, adding more to reach minimum %s...", len(selected_items), min_items)
             # First pass: Try to add items from non-essential categories (outerwear, accessories)
             for item_id, score_data in sorted_items:
                 if score_data['item'] not in selected_items and len(selected_items) < min_items:
-                    item_category = self._get_item_category(score_data['item'])
+                    item_category = item_category_of(score_data['item'])
                     
                     # Skip essential categories in first pass
                     if item_category in ['tops', 'bottoms', 'shoes']:
@@ -7550,46 +7442,46 @@ class RobustOutfitGenerationService:
                     # 🔒 CANONICAL GATE: Check invariants before adding
                     can_add, reason = self._can_add_category(item_category, categories_filled, selected_items, score_data['item'])
                     if not can_add:
-                        logger.debug(f"  🚫 Filler (Pass 1): {self.safe_get_item_name(score_data['item'])} ({item_category}) - BLOCKED ({reason})")
+                        logger.debug("  🚫 Filler (Pass 1): %s (%s) - BLOCKED (%s)", self.safe_get_item_name(score_data['item']), item_category, reason)
                         continue
                     
                     # CRITICAL: Apply hard filter to filler items to prevent inappropriate additions
                     passes_hard_filter = self._hard_filter(score_data['item'], context.occasion, context.style)
                     if not passes_hard_filter:
-                        logger.debug(f"  ⏭️ Filler: {self.safe_get_item_name(score_data['item'])} - SKIPPED (blocked by hard filter for {context.occasion})")
+                        logger.debug("  ⏭️ Filler: %s - SKIPPED (blocked by hard filter for %s)", self.safe_get_item_name(score_data['item']), context.occasion)
                         continue
                     
                     if _is_monochrome_allowed(score_data['item'], item_id, score_data, log_prefix="  "):
                         selected_items.append(score_data['item'])
                         categories_filled[item_category] = True
-                        logger.info(f"  ➕ Filler (non-essential): {self.safe_get_item_name(score_data['item'])} ({item_category}, score={score_data['composite_score']:.2f})")
+                        logger.info("  ➕ Filler (non-essential): %s (%s, score=%.2f)", self.safe_get_item_name(score_data['item']), item_category, score_data['composite_score'])
             
             # Second pass: If still below minimum, allow adding from essential categories that have multiple items available
             if len(selected_items) < min_items:
-                logger.warning(f"⚠️ Still only {len(selected_items)} items, adding from essential categories to reach minimum {min_items}...")
+                logger.warning("⚠️ Still only %s items, adding from essential categories to reach minimum %s...", len(selected_items), min_items)
                 for item_id, score_data in sorted_items:
                     if score_data['item'] not in selected_items and len(selected_items) < min_items:
-                        item_category = self._get_item_category(score_data['item'])
+                        item_category = item_category_of(score_data['item'])
                         
                         # 🔒 CANONICAL GATE: Check invariants before adding
                         can_add, reason = self._can_add_category(item_category, categories_filled, selected_items, score_data['item'])
                         if not can_add:
-                            logger.debug(f"  🚫 Filler (Pass 2): {self.safe_get_item_name(score_data['item'])} ({item_category}) - BLOCKED ({reason})")
+                            logger.debug("  🚫 Filler (Pass 2): %s (%s) - BLOCKED (%s)", self.safe_get_item_name(score_data['item']), item_category, reason)
                             continue
                         
                         # CRITICAL: Apply hard filter
                         passes_hard_filter = self._hard_filter(score_data['item'], context.occasion, context.style)
                         if not passes_hard_filter:
-                            logger.debug(f"  ⏭️ Filler: {self.safe_get_item_name(score_data['item'])} - SKIPPED (blocked by hard filter for {context.occasion})")
+                            logger.debug("  ⏭️ Filler: %s - SKIPPED (blocked by hard filter for %s)", self.safe_get_item_name(score_data['item']), context.occasion)
                             continue
                         
                         # Only add if score is reasonable (prevents adding low-quality items just to fill quota)
                         if score_data['composite_score'] > 0.3:
                             if _is_monochrome_allowed(score_data['item'], item_id, score_data, log_prefix="  "):
                                 selected_items.append(score_data['item'])
-                                logger.info(f"  ➕ Filler (essential): {self.safe_get_item_name(score_data['item'])} ({item_category}, score={score_data['composite_score']:.2f})")
+                                logger.info("  ➕ Filler (essential): %s (%s, score=%.2f)", self.safe_get_item_name(score_data['item']), item_category, score_data['composite_score'])
                         else:
-                            logger.debug(f"  ⏭️ Filler: {self.safe_get_item_name(score_data['item'])} - SKIPPED (score too low: {score_data['composite_score']:.2f})")
+                            logger.debug("  ⏭️ Filler: %s - SKIPPED (score too low: %.2f)", self.safe_get_item_name(score_data['item']), score_data['composite_score'])
         
         # CRITICAL: Deduplicate by ID to prevent same item appearing twice
         seen_ids = set()
@@ -7613,21 +7505,21 @@ class RobustOutfitGenerationService:
                 if item_id == context.base_item_id:
                     base_item_in_deduped = True
             else:
-                logger.warning(f"🔧 DEDUP: Removed duplicate item {self.safe_get_item_name(item)} (ID already in outfit)")
+                logger.warning("🔧 DEDUP: Removed duplicate item %s (ID already in outfit)", self.safe_get_item_name(item))
         
         # CRITICAL FIX: Ensure base item is ALWAYS included after deduplication
         if context.base_item_id and base_item_to_preserve and not base_item_in_deduped:
-            logger.warning(f"⚠️ BASE ITEM LOST IN DEDUP: Restoring base item {context.base_item_id}")
+            logger.warning("⚠️ BASE ITEM LOST IN DEDUP: Restoring base item %s", context.base_item_id)
             # Remove it from its current position if it exists as a duplicate, then add it at the front
             deduplicated_items = [item for item in deduplicated_items if self.safe_get_item_attr(item, 'id', '') != context.base_item_id]
             deduplicated_items.insert(0, base_item_to_preserve)
-            logger.info(f"✅ BASE ITEM RESTORED: {self.safe_get_item_name(base_item_to_preserve)} is now first in outfit")
+            logger.info("✅ BASE ITEM RESTORED: %s is now first in outfit", self.safe_get_item_name(base_item_to_preserve))
         
         if len(deduplicated_items) != len(selected_items):
-            logger.warning(f"🔧 DEDUPLICATION: Removed {len(selected_items) - len(deduplicated_items)} duplicate items")
+            logger.warning("🔧 DEDUPLICATION: Removed %s duplicate items", len(selected_items) - len(deduplicated_items))
         selected_items = deduplicated_items
         
-        logger.info(f"🎯 FINAL SELECTION: {len(selected_items)} items")
+        logger.info("🎯 FINAL SELECTION: %s items", len(selected_items))
         
         # ═══════════════════════════════════════════════════════════════════════
         # FINAL ESSENTIAL FILL: Try harder to complete essential categories
@@ -7677,9 +7569,9 @@ class RobustOutfitGenerationService:
         missing_preferred = [cat for cat in requirements['preferred'] if cat not in current_categories]
         
         if missing_required or missing_preferred:
-            logger.warning(f"🔧 FINAL ESSENTIAL FILL: Attempting to complete outfit")
-            logger.warning(f"   Missing required: {missing_required}")
-            logger.warning(f"   Missing preferred: {missing_preferred}")
+            logger.warning("🔧 FINAL ESSENTIAL FILL: Attempting to complete outfit")
+            logger.warning("   Missing required: %s", missing_required)
+            logger.warning("   Missing preferred: %s", missing_preferred)
             
             # Try to fill missing required categories first, then preferred
             for category in missing_required + missing_preferred:
@@ -7689,14 +7581,14 @@ class RobustOutfitGenerationService:
                 # 🔒 CANONICAL GATE: Check if category can be added
                 can_add, reason = self._can_add_category(category, current_categories, selected_items, None)
                 if not can_add:
-                    logger.warning(f"   ⚠️ Cannot add {category}: {reason}")
+                    logger.warning("   ⚠️ Cannot add %s: %s", category, reason)
                     continue
                 
                 # Search entire wardrobe for best item in this category
                 original_pool = context.wardrobe_original or context.wardrobe
                 category_items = [
                     item for item in original_pool
-                    if self._get_item_category(item) == category and item not in selected_items
+                    if item_category_of(item) == category and item not in selected_items
                 ]
                 
                 if category_items:
@@ -7723,24 +7615,24 @@ class RobustOutfitGenerationService:
                         
                         is_required = category in requirements['required']
                         priority = "REQUIRED" if is_required else "PREFERRED"
-                        logger.info(f"   ✅ FINAL FILL ({priority}): Added {category} '{self.safe_get_item_name(best_item)}' (score={best_score:.2f})")
+                        logger.info("   ✅ FINAL FILL (%s): Added %s '%s' (score=%.2f)", priority, category, self.safe_get_item_name(best_item), best_score)
                     else:
-                        logger.warning(f"   ⚠️ No valid {category} items found (all blocked by filters)")
+                        logger.warning("   ⚠️ No valid %s items found (all blocked by filters)", category)
                 else:
-                    logger.warning(f"   ⚠️ No {category} items available in wardrobe")
+                    logger.warning("   ⚠️ No %s items available in wardrobe", category)
             
             # Log final status
             final_missing_required = [cat for cat in requirements['required'] if cat not in current_categories]
             final_missing_preferred = [cat for cat in requirements['preferred'] if cat not in current_categories]
             
             if final_missing_required:
-                logger.error(f"⚠️ FINAL OUTFIT INCOMPLETE: Still missing REQUIRED categories: {final_missing_required}")
+                logger.error("⚠️ FINAL OUTFIT INCOMPLETE: Still missing REQUIRED categories: %s", final_missing_required)
             elif final_missing_preferred:
-                logger.info(f"ℹ️ Final outfit missing PREFERRED categories: {final_missing_preferred} (acceptable)")
+                logger.info("ℹ️ Final outfit missing PREFERRED categories: %s (acceptable)", final_missing_preferred)
             else:
-                logger.info(f"✅ FINAL FILL: All essential categories completed")
+                logger.info("✅ FINAL FILL: All essential categories completed")
         
-        logger.info(f"🎯 FINAL SELECTION (after essential fill): {len(selected_items)} items")
+        logger.info("🎯 FINAL SELECTION (after essential fill): %s items", len(selected_items))
 
         if target_style_lower == 'monochrome' and hasattr(context, 'metadata_notes') and isinstance(context.metadata_notes, dict):
             selection_colors: Dict[str, str] = {}
@@ -7755,18 +7647,18 @@ class RobustOutfitGenerationService:
             context.metadata_notes['monochrome_selected_colors'] = selection_colors
         
         # Mark selected items as seen in this session (prevents repetition in same session)
-        logger.info(f"📍 Marking {len(selected_items)} items as seen in session {session_id[:8]}...")
+        logger.info("📍 Marking %s items as seen in session %s...", len(selected_items), session_id[:8])
         for item in selected_items:
             item_id = self.safe_get_item_attr(item, "id", "")
             if item_id:
                 session_tracker.mark_item_as_seen(session_id, item_id)
-        logger.info(f"✅ Session tracking complete - items marked as seen for this session")
+        logger.info("✅ Session tracking complete - items marked as seen for this session")
         
         # ═══════════════════════════════════════════════════════════════════════
         # PHASE 3: DIVERSITY FILTERING
         # ═══════════════════════════════════════════════════════════════════════
         
-        logger.info(f"🎭 PHASE 3: Applying diversity filtering...")
+        logger.info("🎭 PHASE 3: Applying diversity filtering...")
         
         # Check outfit diversity
         diversity_result = diversity_filter.check_outfit_diversity(
@@ -7777,11 +7669,11 @@ class RobustOutfitGenerationService:
             mood=context.mood
         )
         
-        logger.info(f"🎭 Diversity check: is_diverse={((safe_get(diversity_result, 'is_diverse', True) if diversity_result else True) if diversity_result else True)}, score={safe_get(diversity_result, 'diversity_score', 0.8):.2f}")
+        logger.info("🎭 Diversity check: is_diverse=%s, score=%.2f", (safe_get(diversity_result, 'is_diverse', True) if diversity_result else True) if diversity_result else True, safe_get(diversity_result, 'diversity_score', 0.8))
         
         # If not diverse enough, apply diversity boost
         if not (safe_get(diversity_result, 'is_diverse', True) if diversity_result else True):
-            logger.warning(f"⚠️ Outfit not diverse enough, applying diversity boost...")
+            logger.warning("⚠️ Outfit not diverse enough, applying diversity boost...")
             
             # Get diversity suggestions
             diversity_suggestions = diversity_filter.get_diversity_suggestions(
@@ -7790,7 +7682,7 @@ class RobustOutfitGenerationService:
             )
             
             if diversity_suggestions:
-                logger.info(f"🎭 Got {len(diversity_suggestions)} diversity suggestions")
+                logger.info("🎭 Got %s diversity suggestions", len(diversity_suggestions))
                 
                 # Try to swap out overused items with diverse alternatives
                 for suggestion in diversity_suggestions[:2]:  # Limit to 2 swaps
@@ -7800,17 +7692,17 @@ class RobustOutfitGenerationService:
                     if item_to_replace and alternative:
                         # CRITICAL: Never swap out the base item
                         if context.base_item_id and self.safe_get_item_attr(item_to_replace, "id", "") == context.base_item_id:
-                            logger.info(f"  ⏭️ Diversity swap skipped: Cannot swap base item {self.safe_get_item_name(item_to_replace)}")
+                            logger.info("  ⏭️ Diversity swap skipped: Cannot swap base item %s", self.safe_get_item_name(item_to_replace))
                             continue
                             
                         alt_id = self.safe_get_item_attr(alternative, "id", "") if alternative else ""
                         if not _is_monochrome_allowed(alternative, alt_id, None, log_prefix="  "):
-                            logger.debug(f"  ⏭️ Diversity swap skipped for {getattr(alternative, 'name', 'Unknown')} due to monochrome palette mismatch")
+                            logger.debug("  ⏭️ Diversity swap skipped for %s due to monochrome palette mismatch", getattr(alternative, 'name', 'Unknown'))
                             continue
                         # Replace in selected items
                         selected_items = [alternative if self.safe_get_item_attr(item, "id", "") == item_to_replace.id else item 
                                         for item in selected_items]
-                        logger.info(f"  🔄 Swapped {item_to_replace.name} → {alternative.name}")
+                        logger.info("  🔄 Swapped %s → %s", item_to_replace.name, alternative.name)
         
         # Record outfit for diversity tracking
         diversity_filter.record_outfit_generation(
@@ -7819,7 +7711,7 @@ class RobustOutfitGenerationService:
             items=selected_items
         )
         
-        logger.info(f"✅ Diversity filtering complete")
+        logger.info("✅ Diversity filtering complete")
         
         # ═══════════════════════════════════════════════════════════════════════
         # PHASE 4: ANALYTICS & PERFORMANCE TRACKING
@@ -7835,7 +7727,7 @@ class RobustOutfitGenerationService:
         avg_composite_score = sum(scored_items_in_selection) / len(scored_items_in_selection) if scored_items_in_selection else 0.5
         final_confidence = min(0.95, avg_composite_score)
         
-        logger.info(f"📊 ANALYTICS: Recording strategy execution...")
+        logger.info("📊 ANALYTICS: Recording strategy execution...")
         
         # Record strategy analytics
         try:
@@ -7856,9 +7748,9 @@ class RobustOutfitGenerationService:
                 fallback_reason=None,
                 session_id=f"ml_session_{int(time.time())}"
             )
-            logger.info(f"✅ Strategy analytics recorded")
+            logger.info("✅ Strategy analytics recorded")
         except Exception as e:
-            logger.warning(f"⚠️ Failed to record strategy analytics: {e}")
+            logger.warning("⚠️ Failed to record strategy analytics: %s", e)
         
         # Record performance metrics for adaptive tuning
         try:
@@ -7875,23 +7767,23 @@ class RobustOutfitGenerationService:
             )
             
             adaptive_tuning.record_performance(metrics)
-            logger.info(f"✅ Performance metrics recorded")
+            logger.info("✅ Performance metrics recorded")
         except Exception as e:
-            logger.warning(f"⚠️ Failed to record performance metrics: {e}")
+            logger.warning("⚠️ Failed to record performance metrics: %s", e)
         
         # DEBUG: Log selected items before creating outfit
-        logger.debug(f"🔍 DEBUG FINAL SELECTION: About to create outfit with {len(selected_items)} selected items")
-        logger.debug(f"🔍 DEBUG FINAL SELECTION: Selected items: {[getattr(item, 'name', 'Unknown') for item in selected_items]}")
-        logger.debug(f"🔍 DEBUG FINAL SELECTION: Target items was: {target_items}, min_items: {min_items}, max_items: {max_items}")
-        logger.debug(f"🔍 DEBUG FINAL SELECTION: Categories filled: {categories_filled}")
-        logger.debug(f"🔍 DEBUG FINAL SELECTION: Item scores count: {len(item_scores)}")
+        logger.debug("🔍 DEBUG FINAL SELECTION: About to create outfit with %s selected items", len(selected_items))
+        logger.debug("🔍 DEBUG FINAL SELECTION: Selected items: %s", [getattr(item, 'name', 'Unknown') for item in selected_items])
+        logger.debug("🔍 DEBUG FINAL SELECTION: Target items was: %s, min_items: %s, max_items: %s", target_items, min_items, max_items)
+        logger.debug("🔍 DEBUG FINAL SELECTION: Categories filled: %s", categories_filled)
+        logger.debug("🔍 DEBUG FINAL SELECTION: Item scores count: %s", len(item_scores))
         if item_scores:
-            logger.debug(f"🔍 DEBUG FINAL SELECTION: Top 3 scored items: {[(item_id, (safe_get(scores, 'composite_score', 0) if scores else 0)) for item_id, scores in list(item_scores.items())[:3]]}")
+            logger.debug("🔍 DEBUG FINAL SELECTION: Top 3 scored items: %s", [(item_id, (safe_get(scores, 'composite_score', 0) if scores else 0)) for item_id, scores in list(item_scores.items())[:3]])
         
         # Deduplicate selected items before building outfit
         unique_selected_items = self._deduplicate_items(selected_items, context)
         if len(unique_selected_items) != len(selected_items):
-            logger.info(f"🔁 DEDUPLICATION: Final outfit items reduced from {len(selected_items)} to {len(unique_selected_items)}")
+            logger.info("🔁 DEDUPLICATION: Final outfit items reduced from %s to %s", len(selected_items), len(unique_selected_items))
         selected_items = unique_selected_items
         
         # CRITICAL FIX: Ensure base item is ALWAYS included in final outfit (even if deduplication removed it)
@@ -7902,7 +7794,7 @@ class RobustOutfitGenerationService:
                 for item in selected_items
             )
             if not base_item_present:
-                logger.warning(f"⚠️ BASE ITEM MISSING: Base item {context.base_item_id} not in final outfit, adding it now...")
+                logger.warning("⚠️ BASE ITEM MISSING: Base item %s not in final outfit, adding it now...", context.base_item_id)
                 # Search for base item in wardrobe (try wardrobe_original first, then wardrobe)
                 base_item_found = False
                 wardrobe_to_search = []
@@ -7915,12 +7807,12 @@ class RobustOutfitGenerationService:
                     if self.safe_get_item_attr(item, "id", "") == context.base_item_id:
                         # Add base item at the beginning to maintain priority
                         selected_items.insert(0, item)
-                        logger.info(f"✅ BASE ITEM RESTORED: Added {self.safe_get_item_name(item)} to final outfit")
+                        logger.info("✅ BASE ITEM RESTORED: Added %s to final outfit", self.safe_get_item_name(item))
                         base_item_found = True
                         break
                 
                 if not base_item_found:
-                    logger.error(f"❌ BASE ITEM NOT FOUND: Could not find base item {context.base_item_id} in wardrobe!")
+                    logger.error("❌ BASE ITEM NOT FOUND: Could not find base item %s in wardrobe!", context.base_item_id)
         
         # Build summary of top candidate scores for observability
         top_candidates: List[Dict[str, Any]] = []
@@ -7945,7 +7837,7 @@ class RobustOutfitGenerationService:
                     "diversity_penalty": round(score_data.get('session_penalty', 0.0), 3) if 'session_penalty' in score_data else None
                 })
         except Exception as summary_error:
-            logger.debug(f"⚠️ Failed to build top candidate summary: {summary_error}")
+            logger.debug("⚠️ Failed to build top candidate summary: %s", summary_error)
             top_candidates = []
 
         # Create outfit
@@ -8024,14 +7916,14 @@ class RobustOutfitGenerationService:
             userFeedback=None
         )
         
-        logger.info(f"🎨 COHESIVE COMPOSITION: Created outfit with {len(selected_items)} items")
-        logger.info(f"📊 Final confidence: {final_confidence:.2f}, Avg composite score: {avg_composite_score:.2f}")
+        logger.info("🎨 COHESIVE COMPOSITION: Created outfit with %s items", len(selected_items))
+        logger.info("📊 Final confidence: %.2f, Avg composite score: %.2f", final_confidence, avg_composite_score)
         
         # 🛑 FINAL INVARIANT CHECK (safety fuse - should never trigger after canonical gate)
         if categories_filled.get('dress') and (categories_filled.get('tops') or categories_filled.get('bottoms')):
-            logger.error(f"🚨 INVARIANT BREACH: Dress + tops/bottoms survived generation")
-            logger.error(f"   Categories: {list(categories_filled.keys())}")
-            logger.error(f"   Items: {[self.safe_get_item_name(i) for i in selected_items]}")
+            logger.error("🚨 INVARIANT BREACH: Dress + tops/bottoms survived generation")
+            logger.error("   Categories: %s", list(categories_filled.keys()))
+            logger.error("   Items: %s", [self.safe_get_item_name(i) for i in selected_items])
             # Don't throw - log and continue (per user's "allow incomplete" choice)
             # But this should NEVER happen after the canonical gate is in place
         
@@ -0,0 +1,390 @@
+"""
+Weather Analyzer
+================
+
+Vectorized weather scoring for the robust generator's weather analyzer.
+
+Everything the analyzer reads from an item (season tags, temperature ranges,
+warmthFactor / fabricWeight / sleeveLength / length metadata, name and type
+keywords) is reduced once per item version to an ``ItemWeatherFeatures`` row,
+together with the item's warmth index, layer level (metadata first, then
+``utils.layering``) and rain suitability. ``WeatherFeatureMatrix`` stacks a
+wardrobe's rows into numpy arrays, so scoring the whole candidate set for a
+(temperature, condition) is a few array operations: the per-item analyzer's
+terms, then a layering fit from ``get_layering_rule`` for that temperature.
+Scores are cached on the matrix per weather bucket (temperature to 0.1°F, rain
+or not) and matrices are cached per wardrobe version.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ...core.cache import BoundedStore, register_bounded_store
+from ...custom_types.wardrobe import ClothingType, LayerLevel, WarmthFactor
+from ...utils.layering import clothing_type_profile, get_layering_rule
+
+SEASON_BITS = {'winter': 1, 'fall': 2, 'spring': 4, 'summer': 8}
+
+# Feature flags (bit positions in ItemWeatherFeatures.flags)
+WARMTH_COLD_GOOD = 1 << 0      # warmthFactor heavy/insulated/warm
+WARMTH_COLD_BAD = 1 << 1       # warmthFactor light/minimal
+WARMTH_COOL_GOOD = 1 << 2      # warmthFactor medium/moderate
+WARMTH_HOT_GOOD = 1 << 3       # warmthFactor light/minimal/breathable
+WARMTH_HOT_BAD = 1 << 4        # warmthFactor heavy/warm
+FABRIC_COLD_GOOD = 1 << 5      # fabricWeight heavy/thick/heavyweight
+FABRIC_COLD_BAD = 1 << 6       # fabricWeight light/lightweight
+FABRIC_HOT_GOOD = 1 << 7       # fabricWeight light/lightweight/thin
+FABRIC_HOT_BAD = 1 << 8        # fabricWeight heavy/thick
+SLEEVE_SHORT = 1 << 9          # tops: sleeveless/tank/short
+SLEEVE_LONG = 1 << 10          # tops: long sleeves
+LENGTH_LONG = 1 << 11          # bottoms/outerwear: long/full/ankle/maxi
+LENGTH_SHORT = 1 << 12         # bottoms: short/shorts/above knee
+KEYWORD_COLD = 1 << 13         # name/type: cold weather keyword
+KEYWORD_HOT = 1 << 14          # name/type: hot weather keyword
+KEYWORD_HOT_BAD = 1 << 15      # name/type: wrong for hot weather
+KEYWORD_MILD_BAD = 1 << 16     # name/type: heavy layer, wrong above 70°F
+RAIN_SUITABLE = 1 << 17        # name: waterproof/raincoat/boots, or a waterproof material
+
+FLAG_VALUES = {
+    WARMTH_COLD_GOOD: ('warmth', {'heavy', 'insulated', 'warm'}),
+    WARMTH_COLD_BAD: ('warmth', {'light', 'minimal'}),
+    WARMTH_COOL_GOOD: ('warmth', {'medium', 'moderate'}),
+    WARMTH_HOT_GOOD: ('warmth', {'light', 'minimal', 'breathable'}),
+    WARMTH_HOT_BAD: ('warmth', {'heavy', 'warm'}),
+    FABRIC_COLD_GOOD: ('fabric', {'heavy', 'thick', 'heavyweight'}),
+    FABRIC_COLD_BAD: ('fabric', {'light', 'lightweight'}),
+    FABRIC_HOT_GOOD: ('fabric', {'light', 'lightweight', 'thin'}),
+    FABRIC_HOT_BAD: ('fabric', {'heavy', 'thick'}),
+}
+
+COLD_KEYWORDS = ('wool', 'fleece', 'coat', 'jacket', 'sweater', 'long sleeve', 'boots')
+HOT_KEYWORDS = ('cotton', 'linen', 'short sleeve', 'shorts', 'sandals', 'tank', 'light')
+HOT_INAPPROPRIATE_KEYWORDS = COLD_KEYWORDS + ('heavy',)
+MILD_INAPPROPRIATE_KEYWORDS = ('wool', 'fleece', 'coat', 'jacket', 'sweater')
+RAIN_KEYWORDS = ('waterproof', 'raincoat', 'boots')
+RAIN_MATERIALS = ('waterproof', 'water-resistant', 'water resistant', 'gore-tex', 'rubber')
+
+WARMTH_INDEX = {WarmthFactor.LIGHT: 0, WarmthFactor.MEDIUM: 1, WarmthFactor.HEAVY: 2}
+WARMTH_FACTOR_ALIASES = {
+    'light': WarmthFactor.LIGHT, 'minimal': WarmthFactor.LIGHT, 'breathable': WarmthFactor.LIGHT,
+    'medium': WarmthFactor.MEDIUM, 'moderate': WarmthFactor.MEDIUM,
+    'heavy': WarmthFactor.HEAVY, 'insulated': WarmthFactor.HEAVY, 'warm': WarmthFactor.HEAVY,
+}
+LAYER_INDEX = {LayerLevel.BASE: 0, LayerLevel.INNER: 1, LayerLevel.MIDDLE: 2, LayerLevel.OUTER: 3}
+
+# Layering fit, added to the clamped keyword/metadata score
+PREFERRED_WARMTH_BONUS = 0.1
+OFF_WARMTH_PENALTY = -0.1      # two warmth steps from anything the layering rule prefers
+OUTER_LAYER_COLD_BONUS = 0.1   # rules needing two or more layers
+OUTER_LAYER_HOT_PENALTY = -0.15  # rules allowing a single layer
+
+TEMP_NOISE = re.compile(r'[><]=?|°[FC]|[FC]')
+
+# Weather buckets scored per matrix before the oldest is dropped
+MAX_CACHED_BUCKETS = 32
+
+
+class ItemWeatherFeatures(NamedTuple):
+    season_mask: int
+    attr_range: Optional[Tuple[float, float]]     # item.temperatureCompatibility
+    compat_range: Optional[Tuple[float, float]]   # metadata temperatureCompatibility
+    optimal_range: Optional[Tuple[float, float]]  # only meaningful with compat_range
+    flags: int
+    warmth_index: int                             # 0 light, 1 medium, 2 heavy
+    layer_level: LayerLevel
+
+    @property
+    def rain_suitable(self) -> bool:
+        return bool(self.flags & RAIN_SUITABLE)
+
+
+def parse_temp(value: Any) -> Optional[float]:
+    """'32°F', '>85', 40 -> float; None for empty or non-numeric types (raises ValueError on junk)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        clean_value = TEMP_NOISE.sub('', value).strip()
+        return float(clean_value) if clean_value else None
+    return None
+
+
+def _attr_range(item: Any) -> Optional[Tuple[float, float]]:
+    temp_compat = getattr(item, 'temperatureCompatibility', None)
+    if not temp_compat or not hasattr(temp_compat, 'minTemp') or not hasattr(temp_compat, 'maxTemp'):
+        return None
+    try:
+        min_t, max_t = parse_temp(temp_compat.minTemp), parse_temp(temp_compat.maxTemp)
+    except (ValueError, TypeError):
+        return None
+    return (min_t, max_t) if min_t is not None and max_t is not None else None
+
+
+def _compat_ranges(temp_compat: Any) -> Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]:
+    if not temp_compat or not isinstance(temp_compat, dict):
+        return None, None
+    try:
+        values = [parse_temp(temp_compat.get(key)) for key in ('minTemp', 'maxTemp', 'optimalMin', 'optimalMax')]
+    except (ValueError, TypeError):
+        return None, None
+    min_temp, max_temp, optimal_min, optimal_max = values
+    if min_temp is None or max_temp is None:
+        return None, None
+    optimal = (optimal_min, optimal_max) if optimal_min is not None and optimal_max is not None else None
+    return (min_temp, max_temp), optimal
+
+
+def _keyword_flags(name_lower: str, type_lower: str) -> int:
+    flags = 0
+    for flag, keywords in (
+        (KEYWORD_COLD, COLD_KEYWORDS),
+        (KEYWORD_HOT, HOT_KEYWORDS),
+        (KEYWORD_HOT_BAD, HOT_INAPPROPRIATE_KEYWORDS),
+        (KEYWORD_MILD_BAD, MILD_INAPPROPRIATE_KEYWORDS),
+    ):
+        if any(keyword in name_lower or keyword in type_lower for keyword in keywords):
+            flags |= flag
+    if any(keyword in name_lower for keyword in RAIN_KEYWORDS):
+        flags |= RAIN_SUITABLE
+    return flags
+
+
+def build_weather_features(item: Any, name: str, item_type: Any, category: str) -> ItemWeatherFeatures:
+    """
+    Reduce one item to its weather features. ``name``, ``item_type`` and
+    ``category`` come from the generator's own accessors so the features match
+    what it would read per request. Malformed season or metadata values raise,
+    as they did in the per-item analyzer.
+    """
+    item_seasons = getattr(item, 'season', [])
+    if isinstance(item_seasons, str):
+        item_seasons = [item_seasons]
+    season_mask = 0
+    for season in item_seasons:
+        season_mask |= SEASON_BITS.get(season.lower(), 0)
+
+    values = {'warmth': '', 'fabric': ''}
+    sleeve_length = length = layer_value = material = ''
+    temp_compat = None
+    metadata = getattr(item, 'metadata', None)
+    if metadata and isinstance(metadata, dict):
+        visual_attrs = metadata.get('visualAttributes', {})
+        if isinstance(visual_attrs, dict):
+            values['warmth'] = (visual_attrs.get('warmthFactor') or '').lower()
+            values['fabric'] = (visual_attrs.get('fabricWeight') or '').lower()
+            sleeve_length = (visual_attrs.get('sleeveLength') or '').lower()
+            length = (visual_attrs.get('length') or '').lower()
+            temp_compat = visual_attrs.get('temperatureCompatibility')
+            layer_value = str(visual_attrs.get('layerLevel') or '').lower()
+            material = str(visual_attrs.get('material') or '').lower()
+
+    flags = _keyword_flags(name.lower(), str(item_type).lower())
+    for flag, (field, accepted) in FLAG_VALUES.items():
+        if values[field] in accepted:
+            flags |= flag
+    if category == 'tops':
+        if sleeve_length in ('sleeveless', 'tank', 'short', 'short sleeve'):
+            flags |= SLEEVE_SHORT
+        elif sleeve_length in ('long', 'long sleeve'):
+            flags |= SLEEVE_LONG
+    if category in ('bottoms', 'outerwear'):
+        if length in ('long', 'full', 'ankle', 'maxi'):
+            flags |= LENGTH_LONG
+        elif category == 'bottoms' and length in ('short', 'shorts', 'above knee'):
+            flags |= LENGTH_SHORT
+
+    if any(rain_material in material for rain_material in RAIN_MATERIALS):
+        flags |= RAIN_SUITABLE
+
+    compat_range, optimal_range = _compat_ranges(temp_compat)
+    try:
+        type_profile = clothing_type_profile(str(getattr(item_type, 'value', item_type)).lower())
+    except ValueError:
+        type_profile = clothing_type_profile(ClothingType.OTHER.value)
+    warmth = WARMTH_FACTOR_ALIASES.get(values['warmth'], type_profile.warmth_factor)
+    try:
+        layer_level = LayerLevel(layer_value.rsplit('.', 1)[-1]) if layer_value else type_profile.layer_level
+    except ValueError:
+        layer_level = type_profile.layer_level
+
+    return ItemWeatherFeatures(
+        season_mask=season_mask,
+        attr_range=_attr_range(item),
+        compat_range=compat_range,
+        optimal_range=optimal_range,
+        flags=flags,
+        warmth_index=WARMTH_INDEX[warmth],
+        layer_level=layer_level,
+    )
+
+
+def weather_bucket(temp: float, condition: str) -> Tuple[float, bool]:
+    """Weather inputs that can change a score: temperature to 0.1°F and whether it rains."""
+    return round(temp, 1), 'rain' in condition or 'storm' in condition
+
+
+def _ranges(rows: List[Optional[Tuple[float, float]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    present = np.array([row is not None for row in rows], dtype=bool)
+    lows = np.array([row[0] if row else 0.0 for row in rows], dtype=float)
+    highs = np.array([row[1] if row else 0.0 for row in rows], dtype=float)
+    return present, lows, highs
+
+
+class WeatherFeatureMatrix:
+    """A candidate set's weather features as column arrays (item order kept)."""
+
+    def __init__(self, features: List[ItemWeatherFeatures]):
+        self.features = features
+        self.size = len(features)
+        self.season_mask = np.array([row.season_mask for row in features], dtype=np.int64)
+        self.flags = np.array([row.flags for row in features], dtype=np.int64)
+        self.warmth_index = np.array([row.warmth_index for row in features], dtype=np.int8)
+        self.layer_index = np.array([LAYER_INDEX[row.layer_level] for row in features], dtype=np.int8)
+        self.has_attr, self.attr_min, self.attr_max = _ranges([row.attr_range for row in features])
+        self.has_compat, self.compat_min, self.compat_max = _ranges([row.compat_range for row in features])
+        self.has_optimal, self.optimal_min, self.optimal_max = _ranges([row.optimal_range for row in features])
+        self._scores: Dict[Tuple[float, bool], np.ndarray] = {}
+
+    def flag(self, flag: int) -> np.ndarray:
+        return (self.flags & flag) != 0
+
+    def _term(self, good_flag: int, good: float, bad_flag: int = 0, bad: float = 0.0) -> np.ndarray:
+        term = np.where(self.flag(good_flag), good, 0.0)
+        if bad_flag:
+            term = np.where(self.flag(bad_flag), bad, term)
+        return term
+
+    def score(self, temp: float, condition: str) -> np.ndarray:
+        """Clamped weather scores for every item; cached per ``weather_bucket``."""
+        bucket = weather_bucket(temp, condition)
+        scores = self._scores.get(bucket)
+        if scores is None:
+            scores = self._score(*bucket)
+            if len(self._scores) >= MAX_CACHED_BUCKETS:
+                self._scores.pop(next(iter(self._scores)))
+            self._scores[bucket] = scores
+        return scores
+
+    def _score(self, temp: float, raining: bool) -> np.ndarray:
+        return np.clip(self.keyword_score(temp, raining) + self.layering_fit(temp), 0.0, 1.0)
+
+    def keyword_score(self, temp: float, raining: bool) -> np.ndarray:
+        """The per-item analyzer's score; terms are added in its order, so this matches it exactly."""
+        score = np.full(self.size, 0.5)
+        if temp < 40:
+            season = 'winter'
+        elif temp < 60:
+            season = 'fall'
+        elif temp < 75:
+            season = 'spring'
+        else:
+            season = 'summer'
+        score += np.where((self.season_mask & SEASON_BITS[season]) != 0, 0.3, 0.0)
+
+        in_attr = self.has_attr & (self.attr_min <= temp) & (temp <= self.attr_max)
+        score += np.where(in_attr, 0.2, 0.0)
+
+        in_compat = (self.compat_min <= temp) & (temp <= self.compat_max)
+        in_optimal = self.has_optimal & (self.optimal_min <= temp) & (temp <= self.optimal_max)
+        compat_term = np.where(in_optimal, 0.5, np.where(self.has_optimal, 0.3, 0.35))
+        score += np.where(self.has_compat, np.where(in_compat, compat_term, -0.4), 0.0)
+
+        if temp < 40:
+            score += self._term(WARMTH_COLD_GOOD, 0.4, WARMTH_COLD_BAD, -0.3)
+        elif temp < 60:
+            score += self._term(WARMTH_COOL_GOOD, 0.3)
+        elif temp > 75:
+            score += self._term(WARMTH_HOT_GOOD, 0.4, WARMTH_HOT_BAD, -0.4)
+
+        if temp < 50:
+            score += self._term(FABRIC_COLD_GOOD, 0.3, FABRIC_COLD_BAD, -0.2)
+        elif temp > 75:
+            score += self._term(FABRIC_HOT_GOOD, 0.3, FABRIC_HOT_BAD, -0.3)
+
+        if temp > 75:
+            score += self._term(SLEEVE_SHORT, 0.25, SLEEVE_LONG, -0.2)
+        elif temp < 50:
+            score += self._term(SLEEVE_LONG, 0.2)
+
+        if temp < 40:
+            score += self._term(LENGTH_LONG, 0.25)
+        elif temp > 75:
+            score += self._term(LENGTH_SHORT, 0.25)
+
+        if temp < 50:
+            score += self._term(KEYWORD_COLD, 0.15)
+        elif temp > 75:
+            score += self._term(KEYWORD_HOT, 0.2)
+            penalty = -0.3 if temp >= 90 else -0.2 if temp >= 80 else -0.1
+            score += self._term(KEYWORD_HOT_BAD, penalty)
+        elif temp > 70:
+            score += self._term(KEYWORD_MILD_BAD, -0.05)
+
+        if raining:
+            score += self._term(RAIN_SUITABLE, 0.2)
+
+        return np.clip(score, 0.0, 1.0)
+
+    def layering_fit(self, temp: float) -> np.ndarray:
+        """Warmth index and layer level against ``get_layering_rule(temp)``."""
+        rule = get_layering_rule(temp)
+        preferred = np.array([WARMTH_INDEX[warmth] for warmth in rule["preferred_warmth"]], dtype=np.int8)
+        distance = np.abs(self.warmth_index[:, None] - preferred[None, :]).min(axis=1) if self.size else self.warmth_index
+        fit = np.where(distance == 0, PREFERRED_WARMTH_BONUS, np.where(distance >= 2, OFF_WARMTH_PENALTY, 0.0))
+
+        outer = self.layer_index == LAYER_INDEX[LayerLevel.OUTER]
+        if rule["min_layers"] >= 2:
+            fit = fit + np.where(outer, OUTER_LAYER_COLD_BONUS, 0.0)
+        elif rule["max_layers"] <= 1:
+            fit = fit + np.where(outer, OUTER_LAYER_HOT_PENALTY, 0.0)
+        return fit
+
+    def hot_penalized(self, temp: float) -> int:
+        """Items taking a hot-weather keyword penalty at ``temp``."""
+        return int(self.flag(KEYWORD_HOT_BAD).sum()) if temp > 75 else 0
+
+
+# Per item version; items without (id, updatedAt) are rebuilt every time
+weather_feature_cache = register_bounded_store(BoundedStore(
+    "weather_item_features", max_entries=20000, ttl=600, refresh_on_access=False,
+))
+# Per wardrobe version, so per-bucket scores survive across requests
+weather_matrix_cache = register_bounded_store(BoundedStore("weather_feature_matrices", max_entries=500, ttl=600))
+
+
+def weather_feature_key(item: Any) -> Optional[Tuple[Any, Any]]:
+    item_id = getattr(item, 'id', None)
+    updated_at = getattr(item, 'updatedAt', None)
+    if not item_id or updated_at in (None, ""):
+        return None
+    return (item_id, updated_at)
+
+
+def weather_feature_matrix(
+    items: Iterable[Any],
+    features_of: Callable[[Any], ItemWeatherFeatures],
+) -> WeatherFeatureMatrix:
+    """Matrix for ``items`` in order, reusing cached per-item features and matrices."""
+    items = list(items)
+    keys = [weather_feature_key(item) for item in items]
+    cacheable = all(key is not None for key in keys)
+    matrix_key = tuple(keys) if cacheable else None
+    if matrix_key is not None:
+        matrix = weather_matrix_cache.get(matrix_key)
+        if matrix is not None:
+            return matrix
+
+    features = []
+    for item, key in zip(items, keys):
+        row = weather_feature_cache.get(key) if key is not None else None
+        if row is None:
+            row = features_of(item)
+            if key is not None:
+                weather_feature_cache.set(key, row)
+        features.append(row)
+
+    matrix = WeatherFeatureMatrix(features)
+    if matrix_key is not None:
+        weather_matrix_cache.set(matrix_key, matrix)
+    return matrix
@@ -10,15 +10,48 @@ import logging
 from typing import Dict, Set, Optional
 from datetime import datetime, timedelta
 
-logger = logging.getLogger(__name__)
+from ..core.cache import BoundedStore, register_bounded_store
 
-# In-memory session-level cache
-# Structure: {session_id: {'items': set(item_ids), 'created_at': timestamp}}
-SESSION_CACHE: Dict[str, Dict[str, any]] = {}
+logger = logging.getLogger(__name__)
 
 # Session TTL: 30 minutes (auto-cleanup)
 SESSION_TTL_SECONDS = 30 * 60
 
+# Maximum concurrently tracked sessions; least recently used are evicted first
+MAX_TRACKED_SESSIONS = 5000
+
+
+def _write_session_document(db, session_id: str, session_data: Dict[str, any]) -> None:
+    """Store a session in Firestore with its expiry."""
+    db.collection('sessions').document(session_id).set({
+        'items': list(session_data['items']),
+        'created_at': session_data['created_at'],
+        'expires_at': session_data['created_at'] + SESSION_TTL_SECONDS
+    })
+
+
+def _spill_session(session_id: str, session_data: Dict[str, any]) -> None:
+    """Spill hook for SESSION_CACHE: sessions of Firestore-backed trackers stay readable after eviction."""
+    if not session_data.get('persistent'):
+        return
+    if time.time() - session_data['created_at'] >= SESSION_TTL_SECONDS:
+        return
+
+    from src.config.firebase import db
+    _write_session_document(db, session_id, session_data)
+    logger.debug(f"💾 Session {session_id[:8]}... spilled to Firestore")
+
+
+# In-memory session-level cache, bounded by count and TTL (expiry is heap-driven)
+# Structure: {session_id: {'items': set(item_ids), 'created_at': timestamp, 'persistent': bool}}
+SESSION_CACHE: BoundedStore = register_bounded_store(BoundedStore(
+    "generation_sessions",
+    max_entries=MAX_TRACKED_SESSIONS,
+    ttl=SESSION_TTL_SECONDS,
+    refresh_on_access=False,
+    spill=_spill_session,
+))
+
 
 class SessionTrackerService:
     """Lightweight session tracker to prevent item repetition within outfit generation batches."""
@@ -43,26 +76,24 @@ class SessionTrackerService:
         Returns:
             Set of item IDs seen in this session
         """
-        # Clean up old sessions first
-        self._cleanup_expired_sessions()
+        # Expired sessions are dropped by the store on access
+        session_data = SESSION_CACHE.get(session_id)
+        if session_data is None:
+            session_data = self._load_from_firestore(session_id)
+            if session_data is not None:
+                remaining = SESSION_TTL_SECONDS - (time.time() - session_data['created_at'])
+                SESSION_CACHE.set(session_id, session_data, ttl=max(remaining, 0))
         
-        # Check in-memory cache
-        if session_id in SESSION_CACHE:
-            session_data = SESSION_CACHE[session_id]
-            
-            # Verify session hasn't expired
-            if time.time() - session_data['created_at'] < SESSION_TTL_SECONDS:
-                logger.debug(f"📍 Session {session_id[:8]}... found with {len(session_data['items'])} seen items")
-                return session_data['items']
-            else:
-                # Session expired, remove it
-                del SESSION_CACHE[session_id]
-                logger.debug(f"🕐 Session {session_id[:8]}... expired, creating new")
+        if session_data is not None:
+            logger.debug(f"📍 Session {session_id[:8]}... found with {len(session_data['items'])} seen items")
+            return session_data['items']
         
         # Create new session if not found or expired
+        # Persistent sessions are spilled to Firestore when the LRU bound pushes them out
         SESSION_CACHE[session_id] = {
             'items': set(),
-            'created_at': time.time()
+            'created_at': time.time(),
+            'persistent': self.use_firestore
         }
         logger.debug(f"✨ New session created: {session_id[:8]}...")
         
@@ -118,8 +149,7 @@ class SessionTrackerService:
         Args:
             session_id: Session identifier to clear
         """
-        if session_id in SESSION_CACHE:
-            del SESSION_CACHE[session_id]
+        if SESSION_CACHE.pop(session_id) is not None:
             logger.debug(f"🗑️ Session {session_id[:8]}... cleared")
     
     def get_session_stats(self, session_id: str) -> Dict[str, any]:
@@ -132,14 +162,14 @@ class SessionTrackerService:
         Returns:
             Dict with session stats (item count, age, etc.)
         """
-        if session_id not in SESSION_CACHE:
+        session_data = SESSION_CACHE.get(session_id)
+        if session_data is None:
             return {
                 'exists': False,
                 'item_count': 0,
                 'age_seconds': 0
             }
         
-        session_data = SESSION_CACHE[session_id]
         age_seconds = time.time() - session_data['created_at']
         
         return {
@@ -151,18 +181,8 @@ class SessionTrackerService:
         }
     
     def _cleanup_expired_sessions(self) -> None:
-        """Clean up expired sessions from cache."""
-        current_time = time.time()
-        expired_sessions = [
-            session_id for session_id, data in SESSION_CACHE.items()
-            if current_time - data['created_at'] > SESSION_TTL_SECONDS
-        ]
-        
-        for session_id in expired_sessions:
-            del SESSION_CACHE[session_id]
-        
-        if expired_sessions:
-            logger.debug(f"🧹 Cleaned up {len(expired_sessions)} expired sessions")
+        """Clean up expired sessions from cache (only keys past their deadline are touched)."""
+        SESSION_CACHE.cleanup_expired()
     
     def get_active_session_count(self) -> int:
         """Get count of active sessions."""
@@ -186,17 +206,11 @@ class SessionTrackerService:
         try:
             from src.config.firebase import db
             
-            if session_id not in SESSION_CACHE:
+            session_data = SESSION_CACHE.get(session_id)
+            if session_data is None:
                 return
             
-            session_data = SESSION_CACHE[session_id]
-            
-            # Store in Firestore with TTL
-            db.collection('sessions').document(session_id).set({
-                'items': list(session_data['items']),
-                'created_at': session_data['created_at'],
-                'expires_at': session_data['created_at'] + SESSION_TTL_SECONDS
-            })
+            _write_session_document(db, session_id, session_data)
             
             logger.debug(f"💾 Session {session_id[:8]}... persisted to Firestore")
             
@@ -232,7 +246,8 @@ class SessionTrackerService:
             # Convert items list back to set
             return {
                 'items': set(data.get('items', [])),
-                'created_at': data.get('created_at', time.time())
+                'created_at': data.get('created_at', time.time()),
+                'persistent': True
             }
             
         except Exception as e:
@@ -1,13 +1,16 @@
-import torch
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from PIL import Image
 import logging
 from ..utils.clip_embedding import embedder
-import open_clip as clip
+from ..core.startup import lazy_import, lazy_service
 
 logger = logging.getLogger(__name__)
 
+# torch and open_clip are imported with the first StyleAnalysisService, not at module import
+torch = lazy_import("torch", "torch")
+clip = lazy_import("open_clip", "open_clip")
+
 class StyleAnalysisService:
     def __init__(self):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -272,4 +275,5 @@ class StyleAnalysisService:
             return {}
 
 # Create singleton instance
-style_analyzer = StyleAnalysisService() 
\ No newline at end of file
+# Deferred: loading the CLIP model dominates startup, so build it on first use
+style_analyzer = lazy_service("clip_style_analyzer", StyleAnalysisService)
\ No newline at end of file
@@ -0,0 +1,487 @@
+"""
+Style Rollup Service
+Maintains per-user, per-month style aggregates so style analytics endpoints
+read a handful of small documents instead of streaming full outfit history.
+
+Each rollup document (``style_rollups/{user_id}_{YYYY-MM}``) holds:
+- totalOutfits and styleBreakdown (casual, business, formal, athletic)
+- colors: color -> count across outfit items
+- items: item id -> {id, name, imageUrl, wearCount}
+- occasions: occasion -> count
+
+The outfits already counted in a month are marker documents in its
+``sources`` subcollection (one small doc per outfit, keyed by a hash of the
+outfit/history id), so updates stay idempotent without the month document
+growing with every outfit.
+
+Rollups are updated transactionally when outfits are created, worn or
+deleted (in the same transaction as the outfit write where the caller owns
+it), and ``backfill_user`` rebuilds them from the raw collections for
+existing users, either from ``src.jobs.style_rollup_backfill`` or queued in
+the background on a user's first read. A backfilled month is replaced in a
+transaction that backs off if an incremental update touched it after the
+scan started; the backfill then rescans.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config.firebase import db
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = 'style_rollups'
+ROLLUP_STATE_COLLECTION = 'style_rollup_state'
+SOURCES_SUBCOLLECTION = 'sources'
+
+# Bump to force a rebuild of every user's rollups on next read
+ROLLUP_VERSION = 2
+
+STYLE_CATEGORIES = ['casual', 'business', 'formal', 'athletic']
+
+# Timestamp fields in the order the analytics endpoints have always used
+TIMESTAMP_FIELDS = ['createdAt', 'created_at', 'date_worn', 'dateWorn', 'lastWorn', 'last_worn', 'date', 'suggestion_date']
+
+# Outfits per query read inline for a user whose rollups are not built yet
+INLINE_BACKFILL_LIMIT = 200
+
+# Rescans when incremental updates keep racing a backfill
+BACKFILL_ATTEMPTS = 3
+
+
+def parse_outfit_timestamp(data: Dict[str, Any], field_names: Iterable[str] = TIMESTAMP_FIELDS) -> Optional[int]:
+    """Return the first parseable timestamp (epoch seconds) among ``field_names``."""
+    for field in field_names:
+        value = data.get(field)
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            return int(value.timestamp())
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Most writers store milliseconds
+            return int(value / 1000) if value > 10_000_000_000 else int(value)
+        if isinstance(value, str):
+            try:
+                dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            except ValueError:
+                continue
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return int(dt.timestamp())
+    return None
+
+
+def source_doc_id(source_id: str) -> str:
+    """Marker document id for an outfit/history id (ids may contain characters Firestore rejects)."""
+    return hashlib.sha1(str(source_id).encode('utf-8')).hexdigest()
+
+
+def month_key(timestamp: int) -> str:
+    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return f"{dt.year}-{dt.month:02d}"
+
+
+def categorize_occasion(occasion: Any) -> str:
+    """Map an outfit occasion onto one of STYLE_CATEGORIES."""
+    occasion = (occasion or 'casual').lower() if isinstance(occasion, str) else 'casual'
+    if occasion in ['business', 'business casual', 'work', 'professional']:
+        return 'business'
+    if occasion in ['formal', 'black tie', 'wedding']:
+        return 'formal'
+    if occasion in ['athletic', 'sport', 'gym', 'workout']:
+        return 'athletic'
+    return 'casual'
+
+
+def empty_rollup(user_id: str, key: str) -> Dict[str, Any]:
+    return {
+        'user_id': user_id,
+        'month': key,
+        'version': ROLLUP_VERSION,
+        'totalOutfits': 0,
+        'styleBreakdown': {style: 0 for style in STYLE_CATEGORIES},
+        'colors': {},
+        'items': {},
+        'occasions': {},
+    }
+
+
+def apply_outfit(rollup: Dict[str, Any], outfit: Dict[str, Any]) -> None:
+    """Add one outfit to a month rollup in place."""
+    rollup['totalOutfits'] += 1
+
+    style = categorize_occasion(outfit.get('occasion'))
+    rollup['styleBreakdown'][style] = rollup['styleBreakdown'].get(style, 0) + 1
+
+    occasion = outfit.get('occasion')
+    occasion = occasion.lower() if isinstance(occasion, str) and occasion else 'casual'
+    rollup['occasions'][occasion] = rollup['occasions'].get(occasion, 0) + 1
+
+    for item in outfit.get('items', []) or []:
+        if not isinstance(item, dict):
+            continue
+        color = item.get('color') or ''
+        color = color.strip() if isinstance(color, str) else ''
+        if color:
+            rollup['colors'][color] = rollup['colors'].get(color, 0) + 1
+
+        item_id = item.get('id') or item.get('itemId')
+        if item_id:
+            entry = rollup['items'].setdefault(str(item_id), {
+                'id': item_id,
+                'name': item.get('name', 'Unknown'),
+                'imageUrl': item.get('imageUrl') or item.get('image_url'),
+                'wearCount': 0,
+            })
+            entry['wearCount'] += 1
+
+
+def remove_outfit(rollup: Dict[str, Any], outfit: Dict[str, Any]) -> None:
+    """Take one outfit back out of a month rollup in place (the inverse of ``apply_outfit``)."""
+    rollup['totalOutfits'] = max(0, rollup['totalOutfits'] - 1)
+
+    def decrement(counts: Dict[str, int], key: str) -> None:
+        if counts.get(key, 0) > 1:
+            counts[key] -= 1
+        else:
+            counts.pop(key, None)
+
+    style = categorize_occasion(outfit.get('occasion'))
+    rollup['styleBreakdown'][style] = max(0, rollup['styleBreakdown'].get(style, 0) - 1)
+
+    occasion = outfit.get('occasion')
+    decrement(rollup['occasions'], occasion.lower() if isinstance(occasion, str) and occasion else 'casual')
+
+    for item in outfit.get('items', []) or []:
+        if not isinstance(item, dict):
+            continue
+        color = item.get('color') or ''
+        color = color.strip() if isinstance(color, str) else ''
+        if color:
+            decrement(rollup['colors'], color)
+
+        item_id = item.get('id') or item.get('itemId')
+        entry = rollup['items'].get(str(item_id)) if item_id else None
+        if entry:
+            entry['wearCount'] -= 1
+            if entry['wearCount'] <= 0:
+                del rollup['items'][str(item_id)]
+
+
+def group_by_month(outfits: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """``(source_id, outfit)`` pairs as YYYY-MM -> source_id -> outfit; repeated sources count once."""
+    months: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for source_id, outfit in outfits:
+        timestamp = parse_outfit_timestamp(outfit)
+        if timestamp:
+            months.setdefault(month_key(timestamp), {}).setdefault(source_id, outfit)
+    return months
+
+
+def month_rollup(user_id: str, key: str, sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    rollup = empty_rollup(user_id, key)
+    for outfit in sources.values():
+        apply_outfit(rollup, outfit)
+    return rollup
+
+
+def build_rollups(user_id: str, outfits: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Group ``(source_id, outfit)`` pairs into month rollups keyed by YYYY-MM."""
+    return {key: month_rollup(user_id, key, sources) for key, sources in group_by_month(outfits).items()}
+
+
+def merge_rollups(rollups: Iterable[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """Sum several month rollups (e.g. the months of a season)."""
+    styles = Counter()
+    colors = Counter()
+    occasions = Counter()
+    total = 0
+    for rollup in rollups:
+        if not rollup:
+            continue
+        total += rollup.get('totalOutfits', 0)
+        styles.update(rollup.get('styleBreakdown', {}))
+        colors.update(rollup.get('colors', {}))
+        occasions.update(rollup.get('occasions', {}))
+    return {
+        'totalOutfits': total,
+        'styleBreakdown': {style: styles[style] for style in STYLE_CATEGORIES},
+        'colors': dict(colors),
+        'occasions': dict(occasions),
+    }
+
+
+def top_items(rollup: Optional[Dict[str, Any]], limit: int = 5) -> List[Dict[str, Any]]:
+    if not rollup:
+        return []
+    items = sorted(rollup.get('items', {}).values(), key=lambda item: item.get('wearCount', 0), reverse=True)
+    return [dict(item) for item in items[:limit]]
+
+
+def top_colors(rollup: Optional[Dict[str, Any]], limit: int = 5) -> List[Tuple[str, int]]:
+    if not rollup:
+        return []
+    return Counter(rollup.get('colors', {})).most_common(limit)
+
+
+class StyleRollupService:
+    """Reads, incrementally updates and backfills monthly style rollups."""
+
+    def __init__(self, firestore_db=None):
+        self.db = firestore_db if firestore_db is not None else db
+        self._backfill_lock = Lock()
+        self._backfills_pending: set = set()
+        self._backfill_executor: Optional[ThreadPoolExecutor] = None
+
+    def _month_ref(self, user_id: str, key: str):
+        return self.db.collection(ROLLUP_COLLECTION).document(f"{user_id}_{key}")
+
+    def _state_ref(self, user_id: str):
+        return self.db.collection(ROLLUP_STATE_COLLECTION).document(user_id)
+
+    def get_months(self, user_id: str, keys: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Return the rollups for ``keys`` (None for months with no outfits).
+
+        Users whose rollups have never been built get a full backfill queued
+        in the background; meanwhile the requested months are built from a
+        bounded scan of their outfits.
+        """
+        refs = [self._state_ref(user_id)] + [self._month_ref(user_id, key) for key in keys]
+        snapshots = {snap.reference.path: snap for snap in self.db.get_all(refs)}
+
+        state = snapshots.get(refs[0].path)
+        state_data = state.to_dict() if state is not None and state.exists else None
+        if not state_data or state_data.get('version') != ROLLUP_VERSION:
+            self.schedule_backfill(user_id)
+            rollups = build_rollups(user_id, self._stream_user_outfits(user_id, limit=INLINE_BACKFILL_LIMIT))
+            return {key: rollups.get(key) for key in keys}
+
+        months = {}
+        for key, ref in zip(keys, refs[1:]):
+            snap = snapshots.get(ref.path)
+            months[key] = snap.to_dict() if snap is not None and snap.exists else None
+        return months
+
+    def schedule_backfill(self, user_id: str) -> bool:
+        """Queue ``backfill_user`` on the backfill worker; False if it is already queued or running."""
+        with self._backfill_lock:
+            if user_id in self._backfills_pending:
+                return False
+            self._backfills_pending.add(user_id)
+            if self._backfill_executor is None:
+                self._backfill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='style-rollup-backfill')
+
+        def run():
+            try:
+                self.backfill_user(user_id)
+            except Exception as e:
+                logger.error(f"❌ Style rollup backfill failed for user {user_id}: {e}")
+            finally:
+                with self._backfill_lock:
+                    self._backfills_pending.discard(user_id)
+
+        self._backfill_executor.submit(run)
+        return True
+
+    def _update_month(self, user_id: str, source_id: str, outfit: Dict[str, Any], adding: bool, write=None) -> bool:
+        """
+        Count (``adding``) or uncount the outfit in its month rollup in one
+        transaction, together with ``write(transaction)`` when given. The
+        source marker makes this idempotent. Outfits without a timestamp only
+        get ``write``.
+        """
+        timestamp = parse_outfit_timestamp(outfit)
+        ref = self._month_ref(user_id, month_key(timestamp)) if user_id and source_id and timestamp else None
+        marker_ref = ref.collection(SOURCES_SUBCOLLECTION).document(source_doc_id(source_id)) if ref is not None else None
+
+        from firebase_admin import firestore
+
+        @firestore.transactional
+        def _apply(transaction):
+            # Firestore transactions must read before they write
+            rollup = counted = None
+            if ref is not None:
+                snapshot = ref.get(transaction=transaction)
+                rollup = snapshot.to_dict() if snapshot.exists else empty_rollup(user_id, month_key(timestamp))
+                counted = marker_ref.get(transaction=transaction).exists
+            if write is not None:
+                write(transaction)
+            if rollup is None or counted == adding:
+                return False
+            now = datetime.now(timezone.utc).isoformat()
+            if adding:
+                apply_outfit(rollup, outfit)
+                transaction.set(marker_ref, {'sourceId': source_id, 'countedAt': now})
+            else:
+                remove_outfit(rollup, outfit)
+                transaction.delete(marker_ref)
+            rollup['updatedAt'] = now
+            transaction.set(ref, rollup)
+            return True
+
+        return _apply(self.db.transaction())
+
+    def record_outfit(self, user_id: str, source_id: str, outfit: Dict[str, Any]) -> bool:
+        """
+        Add a created or worn outfit to its month's rollup.
+
+        Safe to call more than once for the same ``source_id``. Never raises;
+        a failed update is repaired by the next backfill.
+        """
+        try:
+            return self._update_month(user_id, source_id, outfit, adding=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update style rollup for user {user_id}: {e}")
+            return False
+
+    def save_outfit(self, ref, outfit: Dict[str, Any], user_id: str, source_id: str) -> bool:
+        """
+        Write ``outfit`` to ``ref`` and count it in its month's rollup in the
+        same transaction. Raises if the write fails.
+        """
+        return self._update_month(user_id, source_id, outfit, adding=True, write=lambda transaction: transaction.set(ref, outfit))
+
+    def mark_worn(self, ref, updates: Dict[str, Any], outfit: Dict[str, Any], user_id: str, source_id: str) -> bool:
+        """
+        Apply the wear ``updates`` to the outfit at ``ref`` and, in the same
+        transaction, count the worn outfit if its month does not have it yet
+        (e.g. an outfit whose only timestamp is ``lastWorn``). Raises if the
+        update fails.
+        """
+        return self._update_month(
+            user_id, source_id, {**outfit, **updates}, adding=True,
+            write=lambda transaction: transaction.update(ref, updates),
+        )
+
+    def delete_outfit(self, ref, outfit: Dict[str, Any], user_id: str, source_id: str) -> bool:
+        """
+        Delete the outfit at ``ref`` and take it out of its month's rollup in
+        the same transaction. Raises if the delete fails.
+        """
+        return self._update_month(user_id, source_id, outfit, adding=False, write=lambda transaction: transaction.delete(ref))
+
+    def _stream_user_outfits(self, user_id: str, limit: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """Outfits and wear history for a user (at most ``limit`` per query), de-duplicated by id."""
+        outfits = []
+        seen_ids = set()
+
+        def collect(query):
+            if limit is not None:
+                query = query.limit(limit)
+            for doc in query.stream():
+                outfit_data = doc.to_dict() or {}
+                outfit_id = outfit_data.get('id') or doc.id
+                if outfit_id not in seen_ids:
+                    seen_ids.add(outfit_id)
+                    outfits.append((outfit_id, outfit_data))
+
+        collect(self.db.collection('outfit_history').where('user_id', '==', user_id))
+        collect(self.db.collection('outfits').where('user_id', '==', user_id))
+        collect(self.db.collection('outfits').where('userId', '==', user_id))
+        try:
+            collect(self.db.collection('users').document(user_id).collection('outfits'))
+        except Exception as e:
+            logger.warning(f"Could not read user outfit subcollection: {e}")
+        try:
+            # Suggestions carrying an ``outfit`` count as that outfit, as in the original report
+            query = self.db.collection('daily_outfit_suggestions').where('user_id', '==', user_id)
+            if limit is not None:
+                query = query.limit(limit)
+            for doc in query.stream():
+                outfit_data = (doc.to_dict() or {}).get('outfit')
+                if not isinstance(outfit_data, dict):
+                    continue
+                outfit_id = outfit_data.get('id') or doc.id
+                if outfit_id not in seen_ids:
+                    seen_ids.add(outfit_id)
+                    outfits.append((outfit_id, {**outfit_data, 'id': outfit_id, 'user_id': user_id}))
+        except Exception as e:
+            logger.warning(f"Could not read daily suggestions: {e}")
+        return outfits
+
+    def _replace_month(self, user_id: str, key: str, rollup: Optional[Dict[str, Any]],
+                       source_ids: Iterable[str], scan_started: str) -> bool:
+        """
+        Replace one month (rollup and source markers) with a backfilled
+        version, or delete it when ``rollup`` is None.
+
+        Returns:
+            False, writing nothing, if an incremental update changed the month
+            after ``scan_started``
+        """
+        ref = self._month_ref(user_id, key)
+        sources = ref.collection(SOURCES_SUBCOLLECTION)
+        wanted = {source_doc_id(source_id): source_id for source_id in source_ids}
+
+        from firebase_admin import firestore
+
+        @firestore.transactional
+        def _replace(transaction):
+            snapshot = ref.get(transaction=transaction)
+            if snapshot.exists and ((snapshot.to_dict() or {}).get('updatedAt') or '') >= scan_started:
+                return False
+            markers = {marker.id: marker.reference for marker in transaction.get(sources)}
+
+            now = datetime.now(timezone.utc).isoformat()
+            for marker_id, marker_ref in markers.items():
+                if marker_id not in wanted:
+                    transaction.delete(marker_ref)
+            for marker_id, source_id in wanted.items():
+                if marker_id not in markers:
+                    transaction.set(sources.document(marker_id), {'sourceId': source_id, 'countedAt': now})
+            if rollup is None:
+                transaction.delete(ref)
+            else:
+                transaction.set(ref, {**rollup, 'updatedAt': now})
+            return True
+
+        return _replace(self.db.transaction())
+
+    def backfill_user(self, user_id: str) -> Dict[str, Dict[str, Any]]:
+        """Rebuild every month rollup for a user from the raw collections."""
+        rollups: Dict[str, Dict[str, Any]] = {}
+        for attempt in range(1, BACKFILL_ATTEMPTS + 1):
+            scan_started = datetime.now(timezone.utc).isoformat()
+            months = group_by_month(self._stream_user_outfits(user_id))
+            rollups = {key: month_rollup(user_id, key, sources) for key, sources in months.items()}
+
+            try:
+                # Stale months that no longer have any outfits are deleted too
+                existing = self.db.collection(ROLLUP_COLLECTION).where('user_id', '==', user_id).stream()
+                keys = set(rollups) | {(doc.to_dict() or {}).get('month') for doc in existing}
+                keys.discard(None)
+                raced = [
+                    key for key in sorted(keys)
+                    if not self._replace_month(user_id, key, rollups.get(key), months.get(key, {}), scan_started)
+                ]
+                if raced:
+                    logger.info(f"📊 Style rollup backfill for user {user_id} raced updates to {raced}; rescanning (attempt {attempt})")
+                    continue
+
+                self._state_ref(user_id).set({
+                    'user_id': user_id,
+                    'version': ROLLUP_VERSION,
+                    'months': sorted(rollups),
+                    'backfilledAt': datetime.now(timezone.utc).isoformat(),
+                })
+                logger.info(f"📊 Backfilled {len(rollups)} style rollup months for user {user_id}")
+            except Exception as e:
+                # Still serve the freshly computed rollups for this request
+                logger.warning(f"⚠️ Failed to persist style rollups for user {user_id}: {e}")
+            return rollups
+
+        # Left unversioned, so the next read queues another backfill
+        logger.warning(f"⚠️ Style rollup backfill for user {user_id} kept racing updates; will retry on next read")
+        return rollups
+
+
+# Global instance
+style_rollup_service = StyleRollupService()
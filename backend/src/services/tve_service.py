@@ -5,7 +5,7 @@ Based on dynamic CPW targets and category-specific wear rates
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 from ..config.firebase import db
 
@@ -96,6 +96,136 @@ CATEGORY_TO_SPENDING_KEY = {
     "accessory": "accessories",
 }
 
+# Per-category wardrobe aggregates kept on users/{uid}.tve_aggregates:
+#   categories: {category: {count, tve, inv_wears}}
+# count and tve are what the TVE dashboard needs (costs and value-per-wear
+# only depend on the category and the user's profile); inv_wears is
+# sum(1 / max(wearCount, 1)) and gives the average CPW without reading items.
+TVE_AGGREGATES_FIELD = 'tve_aggregates'
+
+# Bump to force every user's aggregates to be rebuilt on next read
+TVE_AGGREGATES_VERSION = 1
+
+AGGREGATE_FIELDS = ('count', 'tve', 'inv_wears')
+
+# Allowed difference between maintained and recomputed aggregates
+CONSISTENCY_TOLERANCE = 0.05
+
+# Firestore batches are capped at 500 writes
+BATCH_SIZE = 400
+
+
+def item_category(item_data: Dict[str, Any]) -> str:
+    """Spending category for a wardrobe item (defaults to tops)."""
+    item_type = item_data.get('type') or 'other'
+    if not isinstance(item_type, str):
+        item_type = 'other'
+    return CATEGORY_TO_SPENDING_KEY.get(item_type.lower().replace(" ", "_"), "tops")
+
+
+def inverse_wears(wear_count: Any) -> float:
+    """1 / wears, counting a never-worn item as one wear (CPW = cost)."""
+    try:
+        wear_count = int(wear_count or 0)
+    except (TypeError, ValueError):
+        wear_count = 0
+    return 1.0 / max(wear_count, 1)
+
+
+def category_value_per_wear(category: str, item_count: int, spending_ranges: Dict[str, str]) -> Optional[float]:
+    """CPW target V_W = S / (I × R) for a category, or None for an empty category."""
+    if item_count <= 0:
+        return None
+    annual_spending = RANGE_MIDPOINTS.get(spending_ranges.get(category, "unknown"), 100)
+    target_wear_rate = TARGET_WEAR_RATES.get(category, 52)
+    return round(annual_spending / (item_count * target_wear_rate), 2)
+
+
+def item_tve(item_data: Dict[str, Any], value_per_wear: Optional[float]) -> float:
+    """
+    An item's accumulated TVE.
+
+    Items whose TVE was never credited fall back to wearCount × V_W, the
+    same rule the full recompute applies when it repairs them.
+    """
+    current_tve = item_data.get('current_tve')
+    wear_count = item_data.get('wearCount', 0) or 0
+    if current_tve is None or (wear_count > 0 and current_tve == 0.0):
+        return wear_count * (value_per_wear or 1.0)
+    return float(current_tve)
+
+
+def empty_category_aggregate() -> Dict[str, float]:
+    return {'count': 0, 'tve': 0.0, 'inv_wears': 0.0}
+
+
+def build_tve_aggregates(items: Iterable[Dict[str, Any]], spending_ranges: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    """Compute per-category aggregates from full item documents."""
+    items = list(items)
+    categories: Dict[str, Dict[str, float]] = {}
+    for item in items:
+        aggregate = categories.setdefault(item_category(item), empty_category_aggregate())
+        aggregate['count'] += 1
+        aggregate['inv_wears'] += inverse_wears(item.get('wearCount'))
+
+    value_per_wear = {
+        category: category_value_per_wear(category, aggregate['count'], spending_ranges) or 1.0
+        for category, aggregate in categories.items()
+    }
+    for item in items:
+        category = item_category(item)
+        categories[category]['tve'] += item_tve(item, value_per_wear[category])
+    return categories
+
+
+def item_aggregate_delta(item_data: Dict[str, Any], sign: int = 1) -> Dict[str, Dict[str, float]]:
+    """Aggregate change for adding (sign=1) or removing (sign=-1) one item."""
+    return {
+        item_category(item_data): {
+            'count': sign,
+            'tve': sign * item_tve(item_data, item_data.get('value_per_wear')),
+            'inv_wears': sign * inverse_wears(item_data.get('wearCount')),
+        }
+    }
+
+
+def wear_aggregate_delta(item_data: Dict[str, Any], previous_wear_count: Any, wears: int = 1) -> Dict[str, Dict[str, float]]:
+    """Aggregate change for an item's wearCount going up by ``wears``."""
+    previous = int(previous_wear_count or 0)
+    return {
+        item_category(item_data): {
+            'inv_wears': inverse_wears(previous + wears) - inverse_wears(previous),
+        }
+    }
+
+
+def merge_aggregate_deltas(*deltas: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    merged: Dict[str, Dict[str, float]] = {}
+    for delta in deltas:
+        for category, fields in delta.items():
+            target = merged.setdefault(category, {})
+            for field, value in fields.items():
+                target[field] = target.get(field, 0) + value
+    return merged
+
+
+def compare_tve_aggregates(
+    stored: Dict[str, Dict[str, float]],
+    actual: Dict[str, Dict[str, float]],
+    tolerance: float = CONSISTENCY_TOLERANCE
+) -> Dict[str, Dict[str, Tuple[float, float]]]:
+    """Fields whose maintained value drifted from a recompute: {category: {field: (stored, actual)}}."""
+    drift: Dict[str, Dict[str, Tuple[float, float]]] = {}
+    for category in set(stored) | set(actual):
+        stored_fields = stored.get(category) or {}
+        actual_fields = actual.get(category) or {}
+        for field in AGGREGATE_FIELDS:
+            stored_value = float(stored_fields.get(field, 0) or 0)
+            actual_value = float(actual_fields.get(field, 0) or 0)
+            if abs(stored_value - actual_value) > tolerance:
+                drift.setdefault(category, {})[field] = (round(stored_value, 2), round(actual_value, 2))
+    return drift
+
 
 class TVEService:
     """Service for calculating and managing Total Value Extracted"""
@@ -193,12 +323,22 @@ class TVEService:
         Returns:
             Estimated cost in dollars (C)
         """
-        # Normalize item type
-        item_type_lower = item_type.lower().replace(" ", "_")
-        
         # Map item type to spending category
-        spending_key = CATEGORY_TO_SPENDING_KEY.get(item_type_lower, "tops")
-        
+        spending_key = item_category({'type': item_type})
+        return self.estimate_category_cost(spending_key, spending_ranges, gender)
+
+    def estimate_category_cost(
+        self,
+        spending_key: str,
+        spending_ranges: Dict[str, str],
+        gender: Optional[str] = None
+    ) -> float:
+        """
+        Estimated per-item cost (C) for a spending category.
+
+        Every item in a category gets the same estimate, which is what lets
+        wardrobe cost be derived from per-category item counts.
+        """
         # Get user's spending range for that category
         spending_range = spending_ranges.get(spending_key, "unknown")
         
@@ -243,6 +383,9 @@ class TVEService:
         
         Formula: CPW_target = Annual Spending (S) / (Item Count (I) × Target Wear Rate (R))
         
+        I comes from the user's maintained category aggregates, so this costs
+        one document read rather than a wardrobe scan.
+        
         Args:
             user_id: User ID
             category: Spending category (tops, pants, etc.)
@@ -259,40 +402,23 @@ class TVEService:
                 logger.error(f"User {user_id} not found")
                 return None
             
-            user_data = user_doc.to_dict()
+            user_data = user_doc.to_dict() or {}
             spending_ranges = user_data.get('spending_ranges', {})
             
-            # Get annual spending for category (S)
-            spending_range = spending_ranges.get(category, "unknown")
-            annual_spending = RANGE_MIDPOINTS.get(spending_range, 100)
-            
             # Get item count in category (I)
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            items = list(wardrobe_ref.stream())
-            
-            # Count items in this category
-            item_count = 0
-            for doc in items:
-                item_data = doc.to_dict()
-                item_type = item_data.get('type', '').lower().replace(" ", "_")
-                item_category = CATEGORY_TO_SPENDING_KEY.get(item_type, "tops")
-                if item_category == category:
-                    item_count += 1
+            categories = self.get_tve_aggregates(user_id, user_data)
+            item_count = int((categories.get(category) or {}).get('count', 0) or 0)
             
-            if item_count == 0:
+            if item_count <= 0:
                 logger.warning(f"No items in category {category} for user {user_id}")
                 return None
             
-            # Get target wear rate for category (R)
-            target_wear_rate = TARGET_WEAR_RATES.get(category, 52)  # Default to tops standard
-            
             # Calculate CPW target: S / (I × R)
-            cpw_target = annual_spending / (item_count * target_wear_rate)
+            cpw_target = category_value_per_wear(category, item_count, spending_ranges)
             
-            logger.info(f"CPW target for {category}: ${cpw_target:.2f} "
-                       f"(S=${annual_spending}, I={item_count}, R={target_wear_rate})")
+            logger.info(f"CPW target for {category}: ${cpw_target:.2f} (I={item_count})")
             
-            return round(cpw_target, 2)
+            return cpw_target
             
         except Exception as e:
             logger.error(f"Error calculating CPW target for {category}: {e}", exc_info=True)
@@ -346,8 +472,7 @@ class TVEService:
             estimated_cost = self.estimate_item_cost(item_type, spending_ranges, user_gender)
             
             # Get category
-            item_type_lower = item_type.lower().replace(" ", "_")
-            category = CATEGORY_TO_SPENDING_KEY.get(item_type_lower, "tops")
+            category = item_category(item_data)
             
             # Calculate dynamic CPW target (V_W)
             value_per_wear = await self.calculate_dynamic_cpw_target(user_id, category)
@@ -401,11 +526,19 @@ class TVEService:
                 logger.error(f"Item {item_id} not found")
                 return False
             
-            item_data = item_doc.to_dict()
-            current_tve = item_data.get('current_tve', 0.0)
+            from firebase_admin import firestore
+            
+            item_data = item_doc.to_dict() or {}
+            current_tve = item_data.get('current_tve') or 0.0
             new_tve = current_tve + value_per_wear
             
-            item_ref.update({'current_tve': new_tve})
+            # Item TVE and the owner's category aggregate move together
+            batch = self.db.batch()
+            batch.update(item_ref, {'current_tve': firestore.Increment(value_per_wear)})
+            user_id = item_data.get('userId')
+            if user_id:
+                self.apply_aggregate_deltas(user_id, {item_category(item_data): {'tve': value_per_wear}}, batch=batch)
+            batch.commit()
             
             logger.info(f"✅ Incremented TVE for item {item_id}: ${current_tve:.2f} → ${new_tve:.2f}")
             
@@ -415,12 +548,296 @@ class TVEService:
             logger.error(f"Error incrementing TVE for item {item_id}: {e}", exc_info=True)
             return False
     
+    # ---------------- CATEGORY AGGREGATES ----------------
+    
+    def _user_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id)
+    
+    def _stream_item_data(self, user_id: str) -> List[Dict[str, Any]]:
+        return [doc.to_dict() or {} for doc in self.db.collection('wardrobe').where('userId', '==', user_id).stream()]
+    
+    def _store_aggregates(self, user_id: str, categories: Dict[str, Dict[str, float]]) -> None:
+        try:
+            # update() replaces the whole map, dropping categories that emptied out
+            self._user_ref(user_id).update({
+                TVE_AGGREGATES_FIELD: {
+                    'version': TVE_AGGREGATES_VERSION,
+                    'categories': categories,
+                    'rebuiltAt': datetime.utcnow().isoformat(),
+                }
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to store TVE aggregates for user {user_id}: {e}")
+    
+    def get_tve_aggregates(
+        self,
+        user_id: str,
+        user_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Per-category {count, tve, inv_wears} for a user's wardrobe.
+        
+        Users whose aggregates were never built (or are on an older version)
+        are rebuilt from one wardrobe scan first.
+        
+        Args:
+            user_data: The user document if the caller already has it (saves a read)
+        """
+        if user_data is None:
+            user_doc = self._user_ref(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+        
+        aggregates = user_data.get(TVE_AGGREGATES_FIELD) or {}
+        if aggregates.get('version') == TVE_AGGREGATES_VERSION:
+            return aggregates.get('categories') or {}
+        return self.rebuild_tve_aggregates(user_id, user_data)
+    
+    def rebuild_tve_aggregates(
+        self,
+        user_id: str,
+        user_data: Optional[Dict[str, Any]] = None,
+        items: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Dict[str, float]]:
+        """Recompute aggregates from the wardrobe (or ``items``) and store them."""
+        if user_data is None:
+            user_doc = self._user_ref(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+        if items is None:
+            items = self._stream_item_data(user_id)
+        
+        categories = build_tve_aggregates(items, user_data.get('spending_ranges', {}))
+        self._store_aggregates(user_id, categories)
+        logger.info(f"📊 TVE: Rebuilt aggregates for user {user_id} ({len(items)} items, {len(categories)} categories)")
+        return categories
+    
+    def apply_aggregate_deltas(
+        self,
+        user_id: str,
+        deltas: Dict[str, Dict[str, float]],
+        batch=None
+    ) -> bool:
+        """
+        Add ``{category: {field: delta}}`` to the user's aggregates.
+        
+        Pass ``batch`` to commit the change with the item write that caused
+        it. Never raises; drift is repaired by ``check_tve_consistency``.
+        """
+        try:
+            from firebase_admin import firestore
+            
+            categories = {
+                category: {field: firestore.Increment(value) for field, value in fields.items() if value}
+                for category, fields in deltas.items()
+            }
+            categories = {category: fields for category, fields in categories.items() if fields}
+            if not categories:
+                return True
+            
+            data = {TVE_AGGREGATES_FIELD: {'categories': categories}}
+            user_ref = self._user_ref(user_id)
+            if batch is not None:
+                batch.set(user_ref, data, merge=True)
+            else:
+                user_ref.set(data, merge=True)
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update TVE aggregates for user {user_id}: {e}")
+            return False
+    
+    def on_item_added(self, user_id: str, item_data: Dict[str, Any], batch=None) -> bool:
+        """Count a new item; pass the ``batch`` that creates it so both commit together."""
+        return self.apply_aggregate_deltas(user_id, item_aggregate_delta(item_data, 1), batch=batch)
+    
+    def on_item_removed(self, user_id: str, item_data: Dict[str, Any]) -> bool:
+        return self.apply_aggregate_deltas(user_id, item_aggregate_delta(item_data, -1))
+    
+    def on_item_updated(self, user_id: str, before: Dict[str, Any], after: Dict[str, Any]) -> bool:
+        """Move an edited item between categories / wear buckets."""
+        if (item_category(before) == item_category(after)
+                and before.get('wearCount') == after.get('wearCount')
+                and before.get('current_tve') == after.get('current_tve')):
+            return True
+        return self.apply_aggregate_deltas(
+            user_id,
+            merge_aggregate_deltas(item_aggregate_delta(before, -1), item_aggregate_delta(after, 1))
+        )
+    
+    def on_items_worn(
+        self,
+        user_id: str,
+        worn: Iterable[Tuple[Dict[str, Any], Any]],
+        batch=None
+    ) -> bool:
+        """
+        Record wearCount increments for ``(item_data, previous_wear_count)`` pairs.
+        
+        TVE itself is credited separately by ``increment_item_tve``.
+        """
+        deltas = merge_aggregate_deltas(*(wear_aggregate_delta(item, previous) for item, previous in worn))
+        return self.apply_aggregate_deltas(user_id, deltas, batch=batch)
+    
+    def summarize_tve(
+        self,
+        categories: Dict[str, Dict[str, float]],
+        spending_ranges: Dict[str, str],
+        gender: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Wardrobe TVE statistics derived from category aggregates alone."""
+        total_tve = 0.0
+        total_wardrobe_cost = 0.0
+        tve_by_category = {}
+        annual_potential_low = 0.0
+        annual_potential_high = 0.0
+        item_total = 0
+        
+        for category, aggregate in categories.items():
+            count = int(aggregate.get('count', 0) or 0)
+            if count <= 0:
+                continue
+            item_total += count
+            category_tve = float(aggregate.get('tve', 0) or 0)
+            category_cost = count * self.estimate_category_cost(category, spending_ranges, gender)
+            value_per_wear = category_value_per_wear(category, count, spending_ranges) or 1.0
+            target_wear_rate = TARGET_WEAR_RATES.get(category, 52)
+            
+            total_tve += category_tve
+            total_wardrobe_cost += category_cost
+            tve_by_category[category] = {
+                "tve": category_tve,
+                "cost": category_cost,
+                "percent": (category_tve / category_cost * 100) if category_cost > 0 else 0
+            }
+            
+            # Low: 50% of target wear rate, High: 75% (see audit_wardrobe_tve)
+            annual_potential_low += count * value_per_wear * target_wear_rate * 0.50
+            annual_potential_high += count * value_per_wear * target_wear_rate * 0.75
+        
+        if not item_total:
+            return {
+                "total_tve": 0,
+                "total_wardrobe_cost": 0,
+                "percent_recouped": 0,
+                "annual_potential_range": {"low": 0, "high": 0},
+                "tve_by_category": {},
+                "lowest_progress_category": None,
+                "items_initialized": 0,
+                "items_recalculated": 0
+            }
+        
+        percent_recouped = (total_tve / total_wardrobe_cost * 100) if total_wardrobe_cost > 0 else 0
+        
+        lowest_category = None
+        lowest_percent = 100
+        for category, data in tve_by_category.items():
+            if data["percent"] < lowest_percent:
+                lowest_percent = data["percent"]
+                lowest_category = category
+        
+        return {
+            "total_tve": round(total_tve, 2),
+            "total_wardrobe_cost": round(total_wardrobe_cost, 2),
+            "percent_recouped": round(percent_recouped, 1),
+            "annual_potential_range": {
+                "low": round(annual_potential_low, 2),
+                "high": round(annual_potential_high, 2)
+            },
+            "tve_by_category": tve_by_category,
+            "lowest_progress_category": {
+                "category": lowest_category,
+                "percent": round(lowest_percent, 1)
+            } if lowest_category else None,
+            "items_initialized": 0,
+            "items_recalculated": 0
+        }
+    
+    def check_tve_consistency(
+        self,
+        user_id: str,
+        repair: bool = False,
+        items: Optional[List[Dict[str, Any]]] = None,
+        user_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare the maintained aggregates with a full recompute.
+        
+        Args:
+            repair: Overwrite the aggregates with the recomputed values on drift
+            items: Wardrobe item documents if the caller already streamed them
+            user_data: The user document if the caller already has it (saves a read)
+            
+        Returns:
+            Dict with consistent, drift ({category: {field: (stored, actual)}}) and repaired
+        """
+        if user_data is None:
+            user_doc = self._user_ref(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+        if items is None:
+            items = self._stream_item_data(user_id)
+        
+        aggregates = user_data.get(TVE_AGGREGATES_FIELD) or {}
+        versioned = aggregates.get('version') == TVE_AGGREGATES_VERSION
+        stored = (aggregates.get('categories') or {}) if versioned else {}
+        actual = build_tve_aggregates(items, user_data.get('spending_ranges', {}))
+        drift = compare_tve_aggregates(stored, actual)
+        
+        consistent = versioned and not drift
+        if drift and versioned:
+            logger.warning(f"⚠️ TVE aggregates drifted for user {user_id}: {drift}")
+        
+        repaired = False
+        if repair and not consistent:
+            self._store_aggregates(user_id, actual)
+            repaired = True
+        
+        return {"consistent": consistent, "drift": drift, "repaired": repaired}
+    
     async def calculate_wardrobe_tve(
         self,
         user_id: str
     ) -> Dict[str, Any]:
         """
-        Calculate comprehensive TVE statistics for user's wardrobe
+        TVE statistics for the dashboard, from the user's category aggregates.
+        
+        Reads only the user document; see ``audit_wardrobe_tve`` for the
+        full per-item recompute.
+        
+        Returns:
+            Same shape as ``audit_wardrobe_tve``
+        """
+        try:
+            user_doc = self._user_ref(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+            spending_ranges = user_data.get('spending_ranges', {})
+            aggregates = user_data.get(TVE_AGGREGATES_FIELD) or {}
+            if aggregates.get('version') == TVE_AGGREGATES_VERSION:
+                categories = aggregates.get('categories') or {}
+            else:
+                # First read for this user: build from one scan and persist, so later reads skip it
+                items = self._stream_item_data(user_id)
+                categories = build_tve_aggregates(items, spending_ranges)
+                self._store_aggregates(user_id, categories)
+                logger.info(f"📊 TVE: Built aggregates for user {user_id} ({len(items)} items)")
+            return self.summarize_tve(categories, spending_ranges, user_data.get('gender', None))
+        except Exception as e:
+            logger.error(f"Error calculating wardrobe TVE for user {user_id}: {e}", exc_info=True)
+            return {
+                "total_tve": 0,
+                "total_wardrobe_cost": 0,
+                "percent_recouped": 0,
+                "annual_potential_range": {"low": 0, "high": 0},
+                "tve_by_category": {},
+                "lowest_progress_category": None
+            }
+    
+    async def audit_wardrobe_tve(
+        self,
+        user_id: str
+    ) -> Dict[str, Any]:
+        """
+        Recompute TVE statistics item by item (audit / repair path)
+        
+        Refreshes each item's estimated_cost, value_per_wear and target_wears
+        and rebuilds the category aggregates from the result.
         
         Returns:
             Dict with:
@@ -442,6 +859,7 @@ class TVEService:
             logger.info(f"⏱️ TVE: Fetched {len(items)} items ({time.time() - tve_calc_start:.2f}s)")
             
             if not items:
+                self.check_tve_consistency(user_id, repair=True, items=[])
                 return {
                     "total_tve": 0,
                     "total_wardrobe_cost": 0,
@@ -450,7 +868,8 @@ class TVEService:
                     "tve_by_category": {},
                     "lowest_progress_category": None,
                     "items_initialized": 0,
-                    "items_recalculated": 0
+                    "items_recalculated": 0,
+                    "items_updated": 0
                 }
             
             total_tve = 0
@@ -460,6 +879,7 @@ class TVEService:
             # Get user's spending ranges AND gender for cost estimation
             user_ref = self.db.collection('users').document(user_id)
             user_doc = user_ref.get()
+            user_data = {}
             spending_ranges = {}
             user_gender = None
             if user_doc.exists:
@@ -470,42 +890,38 @@ class TVEService:
             items_initialized = 0
             items_recalculated = 0
             
-            # ✅ PERFORMANCE FIX: Pre-calculate value_per_wear for each category once
-            # This avoids calling calculate_dynamic_cpw_target 145+ times (once per item)
-            category_value_per_wear_cache = {}
-            unique_categories = set()
-            
-            # First pass: collect all unique categories
+            # Pre-calculate value_per_wear for each category once, from this scan's counts
+            category_counts = {}
             for doc in items:
-                item_data = doc.to_dict()
-                item_type = item_data.get('type', 'other').lower().replace(" ", "_")
-                category = CATEGORY_TO_SPENDING_KEY.get(item_type, "tops")
-                unique_categories.add(category)
-            
-            # Pre-calculate value_per_wear for each category
-            for category in unique_categories:
-                value_per_wear = await self.calculate_dynamic_cpw_target(user_id, category)
-                if value_per_wear is None:
-                    value_per_wear = 1.0  # Default fallback
+                category = item_category(doc.to_dict() or {})
+                category_counts[category] = category_counts.get(category, 0) + 1
+            
+            category_value_per_wear_cache = {}
+            for category, count in category_counts.items():
+                value_per_wear = category_value_per_wear(category, count, spending_ranges) or 1.0
                 category_value_per_wear_cache[category] = value_per_wear
                 logger.info(f"📊 TVE: Pre-calculated {category} value_per_wear: ${value_per_wear:.2f}")
             
             # Store processed items with their calculated values for annual potential calculation
             processed_items = []
+            # Item documents as they stand after this audit (rebuilds the aggregates)
+            audited_items = []
+            batch = self.db.batch()
+            pending_writes = 0
+            items_updated = 0
             
             for doc in items:
-                item_data = doc.to_dict()
+                item_data = doc.to_dict() or {}
                 item_id = doc.id
                 
                 # Get TVE and cost
                 current_tve = item_data.get('current_tve', None)
                 old_estimated_cost = item_data.get('estimated_cost', None)
                 wear_count = item_data.get('wearCount', 0) or 0
-                item_type = item_data.get('type', 'other')
+                item_type = item_data.get('type') or 'other'
                 
                 # Get category
-                item_type_lower = item_type.lower().replace(" ", "_")
-                category = CATEGORY_TO_SPENDING_KEY.get(item_type_lower, "tops")
+                category = item_category(item_data)
                 
                 # ✅ Recalculate estimated_cost based on current spending ranges and gender
                 # Only update database if cost actually changed (to avoid performance issues)
@@ -555,11 +971,18 @@ class TVEService:
                         update_data['target_wears'] = target_wears
                     
                     if update_data:
-                        item_ref.update(update_data)
+                        batch.update(item_ref, update_data)
+                        pending_writes += 1
+                        items_updated += 1
+                        if pending_writes >= BATCH_SIZE:
+                            batch.commit()
+                            batch = self.db.batch()
+                            pending_writes = 0
                 
                 # Ensure we have valid numbers for aggregation
                 current_tve = float(current_tve) if current_tve is not None else 0.0
                 estimated_cost = float(estimated_cost) if estimated_cost is not None else 0.0
+                audited_items.append({**item_data, 'current_tve': current_tve, 'value_per_wear': value_per_wear})
                 
                 # Store processed item data for annual potential calculation
                 processed_items.append({
@@ -584,6 +1007,11 @@ class TVEService:
                 tve_by_category[category]["tve"] += current_tve
                 tve_by_category[category]["cost"] += estimated_cost
             
+            if pending_writes:
+                batch.commit()
+            # Re-base the stored aggregates (incl. the tve sum) on the audited items
+            self.check_tve_consistency(user_id, repair=True, items=audited_items, user_data=user_data)
+            
             # Calculate percentages
             percent_recouped = (total_tve / total_wardrobe_cost * 100) if total_wardrobe_cost > 0 else 0
             
@@ -636,7 +1064,8 @@ class TVEService:
                     "percent": round(lowest_percent, 1)
                 } if lowest_category else None,
                 "items_initialized": items_initialized,
-                "items_recalculated": items_recalculated
+                "items_recalculated": items_recalculated,
+                "items_updated": items_updated
             }
             logger.info(f"✅ TVE: Calculation complete (total: {time.time() - tve_calc_start:.2f}s, "
                        f"initialized: {items_initialized}, recalculated: {items_recalculated})")
@@ -753,13 +1182,27 @@ class TVEService:
                     "error": "User not found"
                 }
             
-            user_data = user_doc.to_dict()
+            user_data = user_doc.to_dict() or {}
             spending_ranges = user_data.get('spending_ranges', {})
             user_gender = user_data.get('gender', None)
             
+            # value_per_wear depends only on the category's item count
+            category_counts = {}
+            for doc in items:
+                category = item_category(doc.to_dict() or {})
+                category_counts[category] = category_counts.get(category, 0) + 1
+            category_value_per_wear_cache = {
+                category: category_value_per_wear(category, count, spending_ranges)
+                for category, count in category_counts.items()
+            }
+            
+            recalculated_items = []
+            batch = self.db.batch()
+            pending_writes = 0
+            
             for doc in items:
                 try:
-                    item_data = doc.to_dict()
+                    item_data = doc.to_dict() or {}
                     item_id = doc.id
                     stats["items_processed"] += 1
                     
@@ -767,18 +1210,17 @@ class TVEService:
                     old_tve = item_data.get('current_tve', 0.0)
                     stats["total_tve_before"] += old_tve
                     
-                    item_type = item_data.get('type', 'other')
-                    wear_count = item_data.get('wearCount', 0)
+                    item_type = item_data.get('type') or 'other'
+                    wear_count = item_data.get('wearCount', 0) or 0
                     
                     # Calculate new estimated cost
                     estimated_cost = self.estimate_item_cost(item_type, spending_ranges, user_gender)
                     
                     # Get category
-                    item_type_lower = item_type.lower().replace(" ", "_")
-                    category = CATEGORY_TO_SPENDING_KEY.get(item_type_lower, "tops")
+                    category = item_category(item_data)
                     
                     # Calculate new value_per_wear using updated rates
-                    value_per_wear = await self.calculate_dynamic_cpw_target(user_id, category)
+                    value_per_wear = category_value_per_wear_cache.get(category)
                     
                     if value_per_wear is None:
                         logger.warning(f"Could not calculate value_per_wear for item {item_id}, using default")
@@ -792,12 +1234,18 @@ class TVEService:
                     
                     # Update item
                     item_ref = self.db.collection('wardrobe').document(item_id)
-                    item_ref.update({
+                    batch.update(item_ref, {
                         'estimated_cost': estimated_cost,
                         'value_per_wear': value_per_wear,
                         'target_wears': target_wears,
                         'current_tve': round(new_tve, 2)
                     })
+                    pending_writes += 1
+                    if pending_writes >= BATCH_SIZE:
+                        batch.commit()
+                        batch = self.db.batch()
+                        pending_writes = 0
+                    recalculated_items.append({**item_data, 'current_tve': round(new_tve, 2)})
                     
                     stats["total_tve_after"] += new_tve
                     stats["items_updated"] += 1
@@ -810,6 +1258,13 @@ class TVEService:
                     logger.error(f"Error recalculating TVE for item {doc.id}: {e}", exc_info=True)
                     stats["errors"] += 1
             
+            if pending_writes:
+                batch.commit()
+            if not stats["errors"]:
+                self.check_tve_consistency(user_id, repair=True, items=recalculated_items, user_data=user_data)
+            else:
+                self.rebuild_tve_aggregates(user_id, user_data)
+            
             tve_change = stats["total_tve_after"] - stats["total_tve_before"]
             
             return {
@@ -839,5 +1294,8 @@ tve_service = TVEService()
 
 
 # Export
-__all__ = ['TVEService', 'tve_service', 'TARGET_WEAR_RATES', 'CATEGORY_TO_SPENDING_KEY']
+__all__ = [
+    'TVEService', 'tve_service', 'TARGET_WEAR_RATES', 'CATEGORY_TO_SPENDING_KEY',
+    'TVE_AGGREGATES_VERSION', 'item_category', 'build_tve_aggregates', 'compare_tve_aggregates',
+]
 
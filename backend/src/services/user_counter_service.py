@@ -0,0 +1,108 @@
+"""
+User Counter Service
+Per-user document counts kept on the user profile so badge and role checks
+do not stream whole collections just to call len() on them.
+
+Counters live as top-level fields on ``users/{uid}`` (``wardrobeItemCount``
+already followed this pattern). A missing counter is seeded once from a
+server-side ``count()`` aggregation; after that it is maintained
+transactionally on every add/delete.
+"""
+
+import logging
+from typing import Any, Dict, Optional
+
+from ..config.firebase import db
+
+logger = logging.getLogger(__name__)
+
+# counter field on the user doc -> (collection, user id field)
+USER_COUNTERS = {
+    'wardrobeItemCount': ('wardrobe', 'userId'),
+    'feedbackCount': ('outfit_feedback', 'user_id'),
+    'outfitsLoggedCount': ('outfit_history', 'user_id'),
+}
+
+
+def count_query(query) -> int:
+    """Count a query's matches server-side, without downloading documents."""
+    try:
+        result = query.count(alias='total').get()
+        return int(result[0][0].value)
+    except AttributeError:
+        # Client without aggregation queries: stream ids only
+        return sum(1 for _ in query.select([]).stream())
+
+
+class UserCounterService:
+    """Reads and maintains per-user counter fields."""
+
+    def __init__(self, firestore_db=None):
+        self.db = firestore_db if firestore_db is not None else db
+
+    def _user_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id)
+
+    def count_documents(self, user_id: str, counter: str) -> int:
+        collection, field = USER_COUNTERS[counter]
+        return count_query(self.db.collection(collection).where(field, '==', user_id))
+
+    def get_count(self, user_id: str, counter: str, user_data: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Return a counter, seeding it on first use.
+
+        Args:
+            user_data: The user document if the caller already has it (saves a read)
+        """
+        if user_data is None:
+            user_doc = self._user_ref(user_id).get()
+            user_data = (user_doc.to_dict() or {}) if user_doc.exists else {}
+
+        value = user_data.get(counter)
+        if isinstance(value, int) and value >= 0:
+            return value
+        return self.recount(user_id, counter)
+
+    def recount(self, user_id: str, counter: str) -> int:
+        """Reset a counter from an aggregation query."""
+        count = self.count_documents(user_id, counter)
+        try:
+            self._user_ref(user_id).update({counter: count})
+            logger.info(f"🔢 Seeded {counter}={count} for user {user_id}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to store {counter} for user {user_id}: {e}")
+        return count
+
+    def increment(self, user_id: str, counter: str, delta: int = 1) -> Optional[int]:
+        """
+        Apply ``delta`` to a counter after the matching document was written.
+
+        An unseeded counter is seeded from ``count()`` instead, which already
+        includes the write. Never raises.
+        """
+        try:
+            from firebase_admin import firestore
+
+            user_ref = self._user_ref(user_id)
+
+            @firestore.transactional
+            def _apply(transaction):
+                snapshot = user_ref.get(transaction=transaction)
+                if not snapshot.exists:
+                    return None
+                current = (snapshot.to_dict() or {}).get(counter)
+                if isinstance(current, int) and current >= 0:
+                    value = max(0, current + delta)
+                else:
+                    value = self.count_documents(user_id, counter)
+                transaction.update(user_ref, {counter: value})
+                return value
+
+            return _apply(self.db.transaction())
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to update {counter} for user {user_id}: {e}")
+            return None
+
+
+# Global instance
+user_counter_service = UserCounterService()
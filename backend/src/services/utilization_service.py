@@ -7,6 +7,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from ..config.firebase import db
+from .wardrobe_analytics_engine import wardrobe_analytics_engine
 
 logger = logging.getLogger(__name__)
 
@@ -33,46 +34,12 @@ class UtilizationService:
             Dict with utilization percentage and details
         """
         try:
-            # Get all wardrobe items
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            all_items = list(wardrobe_ref.stream())
-            total_items = len(all_items)
-            
-            if total_items == 0:
-                return {
-                    "utilization_percentage": 0,
-                    "items_worn": 0,
-                    "total_items": 0,
-                    "dormant_items": 0,
-                    "period_days": days
-                }
-            
-            # Calculate cutoff timestamp
-            cutoff_date = datetime.now() - timedelta(days=days)
-            cutoff_timestamp = cutoff_date.timestamp() * 1000
-            
-            # Count items worn in period
-            items_worn = 0
-            dormant_items = 0
-            
-            for doc in all_items:
-                item_data = doc.to_dict()
-                last_worn = item_data.get('lastWorn', 0)
-                
-                if last_worn and last_worn >= cutoff_timestamp:
-                    items_worn += 1
-                elif last_worn == 0 or last_worn < cutoff_timestamp:
-                    dormant_items += 1
-            
-            # Calculate percentage
-            utilization_percentage = (items_worn / total_items) * 100 if total_items > 0 else 0
+            utilization = wardrobe_analytics_engine.utilization(user_id, days)
+            if not utilization["total_items"]:
+                return utilization
             
             return {
-                "utilization_percentage": round(utilization_percentage, 1),
-                "items_worn": items_worn,
-                "total_items": total_items,
-                "dormant_items": dormant_items,
-                "period_days": days,
+                **utilization,
                 "last_calculated": datetime.now().isoformat()
             }
             
@@ -103,37 +70,8 @@ class UtilizationService:
             List of dormant items with details
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days_threshold)
-            cutoff_timestamp = cutoff_date.timestamp() * 1000
-            
-            # Get all wardrobe items
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            all_items = list(wardrobe_ref.stream())
-            
-            dormant_items = []
-            
-            for doc in all_items:
-                item_data = doc.to_dict()
-                last_worn = item_data.get('lastWorn', 0)
-                
-                # Consider dormant if never worn or not worn recently
-                if last_worn == 0 or last_worn < cutoff_timestamp:
-                    days_since_worn = 999 if last_worn == 0 else int((datetime.now().timestamp() * 1000 - last_worn) / (1000 * 60 * 60 * 24))
-                    
-                    dormant_items.append({
-                        "id": doc.id,
-                        "name": item_data.get('name'),
-                        "type": item_data.get('type'),
-                        "imageUrl": item_data.get('imageUrl'),
-                        "lastWorn": last_worn,
-                        "days_since_worn": days_since_worn,
-                        "wearCount": item_data.get('wearCount', 0)
-                    })
-            
-            # Sort by days since worn (most dormant first)
-            dormant_items.sort(key=lambda x: x['days_since_worn'], reverse=True)
-            
-            return dormant_items
+            # Most dormant first; never-worn items report 999 days
+            return wardrobe_analytics_engine.dormant_items(user_id, days_threshold)
             
         except Exception as e:
             logger.error(f"Error getting dormant items: {e}", exc_info=True)
@@ -151,39 +89,7 @@ class UtilizationService:
             Dict with utilization percentage per category
         """
         try:
-            wardrobe_ref = self.db.collection('wardrobe').where('userId', '==', user_id)
-            all_items = list(wardrobe_ref.stream())
-            
-            cutoff_date = datetime.now() - timedelta(days=days)
-            cutoff_timestamp = cutoff_date.timestamp() * 1000
-            
-            # Track by category
-            category_stats = {}
-            
-            for doc in all_items:
-                item_data = doc.to_dict()
-                category = item_data.get('type', 'other')
-                last_worn = item_data.get('lastWorn', 0)
-                
-                if category not in category_stats:
-                    category_stats[category] = {"total": 0, "worn": 0}
-                
-                category_stats[category]["total"] += 1
-                
-                if last_worn and last_worn >= cutoff_timestamp:
-                    category_stats[category]["worn"] += 1
-            
-            # Calculate percentages
-            category_utilization = {}
-            for category, stats in category_stats.items():
-                percentage = (stats["worn"] / stats["total"]) * 100 if stats["total"] > 0 else 0
-                category_utilization[category] = {
-                    "percentage": round(percentage, 1),
-                    "worn": stats["worn"],
-                    "total": stats["total"]
-                }
-            
-            return category_utilization
+            return wardrobe_analytics_engine.category_utilization(user_id, days)
             
         except Exception as e:
             logger.error(f"Error calculating category utilization: {e}", exc_info=True)
@@ -49,68 +49,32 @@ class ValidationOrchestrator:
         items: List[ClothingItem], 
         context: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Run all validation steps with orchestration."""
-        
-        # print(f"🔧 Starting validation orchestration for {len(items)} items")
-        
-        # Add debugging to see what items we're validating
-        if len(items) > 10:
-            # print(f"⚠️  WARNING: Validating {len(items)} items - this seems like the entire wardrobe!")
-            # print(f"🔍 First few items: {[item.name[:50] for item in items[:3]]}")
-        else:
-            # print(f"✅ Validating {len(items)} selected items")
+        """Run all validation steps concurrently and aggregate the results."""
+        start_time = time.time()
         
-        # Phase 1: Parallel validations (independent checks)
-#         print("🔄 Phase 1: Running parallel validations...")
-        parallel_tasks = [
+        # Every step only reads the items and context, so all of them can run together.
+        # The first four historically ran in parallel and their failures were dropped;
+        # failures in the remaining steps still propagate.
+        parallel_results = await asyncio.gather(
             self._validate_occasion_appropriateness(items, context),
             self._validate_weather_compatibility(items, context),
             self._validate_style_cohesion(items, context),
             self._validate_body_type_compatibility(items, context),
-        ]
-        
-        # Execute parallel validations
-        parallel_results = await asyncio.gather(*parallel_tasks, return_exceptions=True)
-        
-        # Filter out exceptions and collect valid results
-        valid_parallel_results = []
-        for result in parallel_results:
-            if isinstance(result, ValidationResult):
-                valid_parallel_results.append(result)
-            else:
-                # print(f"⚠️  Parallel validation failed: {result}")
-        
-        # Phase 2: Sequential validations (dependent on previous results)
-#         print("🔄 Phase 2: Running sequential validations...")
-        sequential_results = []
-        
-        # Form completeness depends on occasion rules
-        form_result = await self._validate_form_completeness(items, context)
-        sequential_results.append(form_result)
-        
-        # Layer count depends on weather and occasion
-        layer_result = await self._validate_layer_count_appropriateness(items, context)
-        sequential_results.append(layer_result)
-        
-        # Layering compliance depends on weather and items
-        layering_result = await self._validate_layering_compliance(items, context)
-        sequential_results.append(layering_result)
-        
-        # Color harmony depends on all previous results
-        color_result = await self._validate_color_harmony(items, context)
-        sequential_results.append(color_result)
-        
-        # Phase 3: Deduplication (final step)
-        dedup_result = await self._validate_deduplication(items, context)
-        sequential_results.append(dedup_result)
+            self._validate_form_completeness(items, context),
+            self._validate_layer_count_appropriateness(items, context),
+            self._validate_layering_compliance(items, context),
+            self._validate_color_harmony(items, context),
+            self._validate_deduplication(items, context),
+            return_exceptions=True,
+        )
+        for result in parallel_results[4:]:
+            if isinstance(result, BaseException):
+                raise result
         
-        # Combine all results
-        all_results = valid_parallel_results + sequential_results
-        self.results = all_results
+        self.results = [result for result in parallel_results if isinstance(result, ValidationResult)]
         
         final_result = self._aggregate_results()
-        # print(f"✅ Validation orchestration completed: {len(final_result['errors'])} errors, {len(final_result['warnings'])} warnings")
-        
+        final_result["wall_duration"] = time.time() - start_time
         return final_result
     
     async def _validate_occasion_appropriateness(
@@ -359,7 +323,7 @@ class ValidationOrchestrator:
         
         target_counts = (context.get("target_counts", {}) if context else {})
         min_items = (target_counts.get("min_items", 3) if target_counts else 3)
-        required_categories = (target_counts.get("required_categories", ["top", "bottom", "shoes"]) if target_counts else "shoes"])
+        required_categories = (target_counts.get("required_categories", ["top", "bottom", "shoes"]) if target_counts else ["top", "bottom", "shoes"])
         
         # Count items by category
         category_counts = {}
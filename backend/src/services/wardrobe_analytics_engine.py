@@ -0,0 +1,430 @@
+"""
+Wardrobe Analytics Engine
+Columnar, per-user wardrobe table shared by the utilization, dormant item,
+forgotten gems and wear-ranking endpoints.
+
+A wardrobe snapshot is streamed once and packed into NumPy columns
+(wearCount, lastWorn epoch seconds, type / category codes, favorite flag,
+estimated cost); per-item formality tier membership comes from the
+generator's ``TierIndex``. Each query is a vectorized filter or group-by over those
+columns, and results are memoized on the table. Tables are keyed by the
+``wardrobeVersion`` counter on the user document, which every wardrobe
+write bumps via ``touch_wardrobe``; a TTL bounds staleness from writers
+that do not.
+"""
+
+import copy
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config.firebase import db
+from ..core.cache import BoundedStore, register_bounded_store
+from .style_rollup_service import parse_outfit_timestamp
+
+logger = logging.getLogger(__name__)
+
+WARDROBE_VERSION_FIELD = 'wardrobeVersion'
+
+# Upper bound on staleness for writes that do not bump wardrobeVersion
+TABLE_TTL_SECONDS = 10 * 60
+MAX_CACHED_TABLES = 500
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Plausible lastWorn range (2000-01-01 .. 2100-01-01); anything else is treated as unknown
+MIN_PLAUSIBLE_EPOCH = 946684800
+MAX_PLAUSIBLE_EPOCH = 4102444800
+
+# Keyword groups used by /most-worn-by-category, checked in order
+WEAR_GROUP_KEYWORDS = [
+    ('tops', ['shirt', 'blouse', 'sweater', 'jacket', 'coat', 'hoodie', 'tank', 'tee']),
+    ('bottoms', ['pants', 'jeans', 'shorts', 'skirt', 'leggings', 'trousers']),
+    ('shoes', ['shoes', 'boots', 'sneakers', 'heels', 'flats', 'sandals']),
+    ('dresses', ['dress', 'jumpsuit', 'romper']),
+    ('accessories', ['accessory', 'jewelry', 'bag', 'scarf', 'hat', 'belt']),
+]
+
+
+def wear_group(item_type: Any) -> str:
+    item_type = item_type.lower() if isinstance(item_type, str) else 'unknown'
+    for group, keywords in WEAR_GROUP_KEYWORDS:
+        if any(word in item_type for word in keywords):
+            return group
+    return 'other'
+
+
+def last_worn_epoch(item: Dict[str, Any]) -> float:
+    """lastWorn as epoch seconds (ms and ISO values normalized), NaN if unknown."""
+    timestamp = parse_outfit_timestamp(item, ['lastWorn'])
+    if not timestamp or not MIN_PLAUSIBLE_EPOCH <= timestamp <= MAX_PLAUSIBLE_EPOCH:
+        return np.nan
+    return float(timestamp)
+
+
+def last_worn_millis(value: Any) -> Optional[int]:
+    """lastWorn as returned by the forgotten gems API (datetimes become ms)."""
+    if value is None:
+        return None
+    try:
+        if hasattr(value, 'timestamp'):
+            return int(value.timestamp() * 1000)
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _encode(values: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Dictionary-encode strings: (codes, labels in first-seen order)."""
+    labels: Dict[str, int] = {}
+    codes = np.fromiter((labels.setdefault(value, len(labels)) for value in values), dtype=np.int32, count=len(values))
+    return codes, list(labels)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class WardrobeTable:
+    """One user's wardrobe as columns, plus memoized query results."""
+
+    def __init__(self, user_id: str, version: Any, items: List[Dict[str, Any]]):
+        self.user_id = user_id
+        self.version = version
+        self.items = items
+        self.built_at = time.time()
+        self._results: Dict[tuple, Any] = {}
+
+        n = len(items)
+        self.ids = [item.get('id', '') for item in items]
+        self.wear_count = np.fromiter((int(_number(item.get('wearCount'))) for item in items), dtype=np.int64, count=n)
+        self.last_worn = np.fromiter((last_worn_epoch(item) for item in items), dtype=np.float64, count=n)
+        self.favorite = np.fromiter((bool(item.get('isFavorite', False)) for item in items), dtype=bool, count=n)
+        self.cost = np.fromiter((_number(item.get('estimated_cost')) for item in items), dtype=np.float64, count=n)
+        self.type_code, self.types = _encode([
+            item.get('type') if isinstance(item.get('type'), str) and item.get('type') else 'other' for item in items
+        ])
+        self.group_code, self.groups = _encode([wear_group(item.get('type', 'Unknown')) for item in items])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def memo(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Compute once per table; callers get their own copy to mutate."""
+        if key not in self._results:
+            self._results[key] = compute()
+        return copy.deepcopy(self._results[key])
+
+    def _days_since(self, now: float) -> np.ndarray:
+        """Whole days since last worn (NaN where unknown)."""
+        return np.floor((now - self.last_worn) / DAY_SECONDS)
+
+    def _card(self, index: int) -> Dict[str, Any]:
+        item = self.items[index]
+        return {
+            "id": self.ids[index],
+            "name": item.get('name', 'Unknown'),
+            "type": item.get('type', 'Unknown'),
+            "color": item.get('color', 'Unknown'),
+            "wear_count": int(self.wear_count[index]),
+            "last_worn": item.get('lastWorn'),
+            "image_url": item.get('imageUrl') or item.get('image_url') or item.get('image'),
+        }
+
+    # ---------------- UTILIZATION ----------------
+
+    def utilization(self, days: int, now: float) -> Dict[str, Any]:
+        total_items = len(self)
+        worn = int(np.count_nonzero(self.last_worn >= now - days * DAY_SECONDS))
+        return {
+            "utilization_percentage": round(worn / total_items * 100, 1) if total_items else 0,
+            "items_worn": worn,
+            "total_items": total_items,
+            "dormant_items": total_items - worn,
+            "period_days": days,
+        }
+
+    def category_utilization(self, days: int, now: float) -> Dict[str, Dict[str, Any]]:
+        worn_mask = self.last_worn >= now - days * DAY_SECONDS
+        totals = np.bincount(self.type_code, minlength=len(self.types))
+        worn = np.bincount(self.type_code[worn_mask], minlength=len(self.types))
+        return {
+            label: {
+                "percentage": round(worn[code] / totals[code] * 100, 1) if totals[code] else 0,
+                "worn": int(worn[code]),
+                "total": int(totals[code]),
+            }
+            for code, label in enumerate(self.types)
+        }
+
+    def dormant_items(self, days_threshold: int, now: float) -> List[Dict[str, Any]]:
+        unknown = np.isnan(self.last_worn)
+        dormant = unknown | (self.last_worn < now - days_threshold * DAY_SECONDS)
+        days_since = np.where(unknown, 999, self._days_since(now))
+        indices = np.flatnonzero(dormant)
+        indices = indices[np.argsort(-days_since[indices], kind='stable')]
+        return [
+            {
+                "id": self.ids[i],
+                "name": self.items[i].get('name'),
+                "type": self.items[i].get('type'),
+                "imageUrl": self.items[i].get('imageUrl'),
+                "lastWorn": self.items[i].get('lastWorn', 0),
+                "days_since_worn": int(days_since[i]),
+                "wearCount": int(self.wear_count[i]),
+            }
+            for i in indices
+        ]
+
+    # ---------------- WEAR RANKINGS ----------------
+
+    def top_worn(self, limit: int, now: float) -> Dict[str, Any]:
+        total_items = len(self)
+        total_wear_count = int(self.wear_count.sum())
+        order = np.argsort(-self.wear_count, kind='stable')[:limit]
+        return {
+            "total_items": total_items,
+            "total_wear_count": total_wear_count,
+            "avg_wear_count": round(total_wear_count / total_items, 2) if total_items else 0,
+            "unworn_items_count": int(np.count_nonzero(self.wear_count == 0)),
+            "recently_worn_count": int(np.count_nonzero(self.last_worn > now - 7 * DAY_SECONDS)),
+            "top_worn_items": [{**self._card(i), "is_favorite": bool(self.favorite[i])} for i in order],
+        }
+
+    def most_worn_by_category(self) -> Dict[str, Any]:
+        total_items = len(self)
+        total_wear_count = int(self.wear_count.sum())
+        group_totals = np.bincount(self.group_code, minlength=len(self.groups))
+        group_wears = np.bincount(self.group_code, weights=self.wear_count, minlength=len(self.groups))
+
+        categories = {}
+        for code, group in enumerate(self.groups):
+            members = np.flatnonzero(self.group_code == code)
+            most_worn = members[np.argmax(self.wear_count[members])]
+            categories[group] = {
+                "item": self._card(most_worn),
+                "total_items": int(group_totals[code]),
+                "total_wear_count": int(group_wears[code]),
+                "avg_wear_count": float(group_wears[code] / group_totals[code]),
+            }
+        return {
+            "total_items": total_items,
+            "total_wear_count": total_wear_count,
+            "avg_wear_count": round(total_wear_count / total_items, 2) if total_items else 0,
+            "categories": categories,
+        }
+
+    def trending_styles(self, now: float) -> Dict[str, Any]:
+        style_counts = Counter()
+        for item in self.items:
+            styles = item.get('style', [])
+            if isinstance(styles, list):
+                style_counts.update(styles)
+            elif isinstance(styles, str):
+                style_counts[styles] += 1
+        color_counts = Counter(item.get('color', 'unknown') for item in self.items)
+        type_counts = Counter(item.get('type', 'unknown') for item in self.items)
+
+        # Wear count plus a recency bonus (+2 this week, +1 this month)
+        days_since = (now - self.last_worn) / DAY_SECONDS
+        bonus = np.where(days_since < 7, 2, np.where(days_since < 30, 1, 0))
+        score = self.wear_count + bonus
+        candidates = np.flatnonzero(self.wear_count > 0)
+        candidates = candidates[np.argsort(-score[candidates], kind='stable')][:10]
+
+        return {
+            "top_styles": [{"style": style, "count": count} for style, count in style_counts.most_common(5)],
+            "top_colors": [{"color": color, "count": count} for color, count in color_counts.most_common(5)],
+            "top_types": [{"type": type_name, "count": count} for type_name, count in type_counts.most_common(5)],
+            "trending_items": [
+                {
+                    'id': self.ids[i],
+                    'name': self.items[i].get('name'),
+                    'type': self.items[i].get('type'),
+                    'color': self.items[i].get('color', 'unknown'),
+                    'style': self.items[i].get('style', []),
+                    'trending_score': int(score[i]),
+                    'wear_count': int(self.wear_count[i]),
+                }
+                for i in candidates
+            ],
+            "total_items_analyzed": len(self),
+        }
+
+    # ---------------- FORMALITY TIERS ----------------
+
+    def formality_tiers(self) -> Dict[str, Any]:
+        from .filters.formality_tier_system import TierIndex
+
+        return TierIndex(self.items, lambda item, attr, default=None: item.get(attr, default)).stats()
+
+    # ---------------- FORGOTTEN GEMS ----------------
+
+    def forgotten_gems(self, days_threshold: int, min_rediscovery_potential: float, now: float, limit: int = 10) -> Dict[str, Any]:
+        """
+        Rediscovery candidates: items unworn for ``days_threshold`` days, scored
+        higher the longer they sat and the less they were worn.
+
+        Returns:
+            Dict with items ([(index, days_since_worn, score)]), total_unworn and potential_savings
+        """
+        unknown = np.isnan(self.last_worn)
+        days_since = np.where(
+            unknown,
+            np.where(self.wear_count == 0, 999, 365),
+            np.maximum(self._days_since(now), 0)
+        ).astype(np.int64)
+        forgotten = days_since >= days_threshold
+        favorite_bonus = np.where(self.favorite, 5.0, 0.0)
+
+        score = 40.0 + np.minimum(days_since / 7.0, 40.0) - np.minimum(self.wear_count * 5.0, 25.0) + favorite_bonus
+        score = np.clip(score, 0.0, 100.0)
+        selected = np.flatnonzero(forgotten & (score >= min_rediscovery_potential))
+        potential_savings = 10.0 * len(selected)
+
+        if not len(selected):
+            # Nothing cleared the bar: take the longest-unworn items with a gentler score
+            selected = np.flatnonzero(forgotten)
+            selected = selected[np.argsort(-days_since[selected], kind='stable')][:limit]
+            score = 30.0 + np.minimum(days_since / 10.0, 30.0) - np.minimum(self.wear_count * 3.0, 15.0) + favorite_bonus
+            score = np.clip(score, 0.0, 100.0)
+
+        selected = selected[np.argsort(-score[selected], kind='stable')][:limit]
+        return {
+            "items": [(int(i), int(days_since[i]), float(score[i])) for i in selected],
+            "total_unworn": int(np.count_nonzero(forgotten)),
+            "potential_savings": round(potential_savings, 2),
+        }
+
+
+class WardrobeAnalyticsEngine:
+    """Builds and caches per-user ``WardrobeTable`` snapshots."""
+
+    def __init__(self, firestore_db=None, ttl_seconds: float = TABLE_TTL_SECONDS, max_tables: int = MAX_CACHED_TABLES):
+        self.db = firestore_db if firestore_db is not None else db
+        self.tables = register_bounded_store(BoundedStore(
+            "wardrobe_analytics_tables",
+            max_entries=max_tables,
+            ttl=ttl_seconds,
+            refresh_on_access=False,
+        ))
+
+    def _user_ref(self, user_id: str):
+        return self.db.collection('users').document(user_id)
+
+    def wardrobe_version(self, user_id: str) -> Any:
+        try:
+            user_doc = self._user_ref(user_id).get()
+            return ((user_doc.to_dict() or {}) if user_doc.exists else {}).get(WARDROBE_VERSION_FIELD, 0)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read wardrobe version for user {user_id}: {e}")
+            return None
+
+    def _stream_items(self, user_id: str) -> List[Dict[str, Any]]:
+        items = []
+        for doc in self.db.collection('wardrobe').where('userId', '==', user_id).stream():
+            item_data = doc.to_dict() or {}
+            item_data['id'] = doc.id
+            items.append(item_data)
+        return items
+
+    def get_table(self, user_id: str) -> WardrobeTable:
+        """The user's current table, rebuilt when the wardrobe version moved."""
+        version = self.wardrobe_version(user_id)
+        table = self.tables.get(user_id)
+        if table is not None and version is not None and table.version == version:
+            return table
+
+        started = time.perf_counter()
+        table = WardrobeTable(user_id, version, self._stream_items(user_id))
+        if version is not None:
+            self.tables.set(user_id, table)
+        logger.info(f"📊 Built wardrobe analytics table for user {user_id}: {len(table)} items "
+                    f"({(time.perf_counter() - started) * 1000:.1f}ms)")
+        return table
+
+    def invalidate(self, user_id: str) -> None:
+        from .filters.formality_tier_system import TIER_INDEXES
+
+        self.tables.pop(user_id)
+        TIER_INDEXES.pop(user_id)
+
+    def touch_wardrobe(self, user_id: str, batch=None) -> None:
+        """
+        Bump the user's wardrobe version after an item write.
+
+        Pass ``batch`` to commit the bump with the write itself. Never raises.
+        """
+        self.invalidate(user_id)
+        try:
+            from firebase_admin import firestore
+
+            data = {WARDROBE_VERSION_FIELD: firestore.Increment(1)}
+            if batch is not None:
+                batch.set(self._user_ref(user_id), data, merge=True)
+            else:
+                self._user_ref(user_id).set(data, merge=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to bump wardrobe version for user {user_id}: {e}")
+
+    # ---------------- QUERIES ----------------
+
+    def _now(self) -> float:
+        return datetime.now(timezone.utc).timestamp()
+
+    def _minute(self, now: float) -> int:
+        # Time-windowed results are reused within the same minute
+        return int(now // 60)
+
+    def utilization(self, user_id: str, days: int = 30) -> Dict[str, Any]:
+        table = self.get_table(user_id)
+        now = self._now()
+        return table.memo(('utilization', days, self._minute(now)), lambda: table.utilization(days, now))
+
+    def category_utilization(self, user_id: str, days: int = 30) -> Dict[str, Dict[str, Any]]:
+        table = self.get_table(user_id)
+        now = self._now()
+        return table.memo(('category_utilization', days, self._minute(now)), lambda: table.category_utilization(days, now))
+
+    def dormant_items(self, user_id: str, days_threshold: int = 180) -> List[Dict[str, Any]]:
+        table = self.get_table(user_id)
+        now = self._now()
+        return table.memo(('dormant', days_threshold, self._minute(now)), lambda: table.dormant_items(days_threshold, now))
+
+    def top_worn(self, user_id: str, limit: int = 10) -> Dict[str, Any]:
+        table = self.get_table(user_id)
+        now = self._now()
+        return table.memo(('top_worn', limit, self._minute(now)), lambda: table.top_worn(limit, now))
+
+    def most_worn_by_category(self, user_id: str) -> Dict[str, Any]:
+        table = self.get_table(user_id)
+        return table.memo(('most_worn_by_category',), table.most_worn_by_category)
+
+    def trending_styles(self, user_id: str) -> Dict[str, Any]:
+        table = self.get_table(user_id)
+        now = self._now()
+        return table.memo(('trending', self._minute(now)), lambda: table.trending_styles(now))
+
+    def formality_tiers(self, user_id: str) -> Dict[str, Any]:
+        table = self.get_table(user_id)
+        return table.memo(('formality_tiers',), table.formality_tiers)
+
+    def forgotten_gems(self, user_id: str, days_threshold: int = 30, min_rediscovery_potential: float = 20.0) -> Tuple[WardrobeTable, Dict[str, Any]]:
+        table = self.get_table(user_id)
+        now = self._now()
+        result = table.memo(
+            ('forgotten_gems', days_threshold, min_rediscovery_potential, self._minute(now)),
+            lambda: table.forgotten_gems(days_threshold, min_rediscovery_potential, now)
+        )
+        return table, result
+
+
+# Global instance
+wardrobe_analytics_engine = WardrobeAnalyticsEngine()
@@ -8,6 +8,8 @@ during the outfit generation process.
 import logging
 from typing import Dict, List, Any, Optional
 
+from ..core.tracing import tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +65,7 @@ class BaseItemTracker:
         }
         
         self.checkpoints.append(checkpoint_data)
+        tracer.add_event("base_item_checkpoint", stage=stage, items=item_count, base_item_present=base_item_present)
         
         # Log the checkpoint
         status_icon = "✅" if base_item_present else "❌"
@@ -99,6 +102,7 @@ class BaseItemTracker:
         }
         
         self.checkpoints.append(checkpoint_data)
+        tracer.add_event("base_item_checkpoint", stage=stage, items=item_count, base_item_present=base_item_present)
         
         # Log with score details if present
         if base_item_present and item_scores:
@@ -1,13 +1,17 @@
-import torch
-import clip
 from PIL import Image
 import numpy as np
 from typing import List, Optional
 import logging
 import traceback
 
+from ..core.startup import lazy_import, lazy_service
+
 logger = logging.getLogger(__name__)
 
+# torch and CLIP take seconds to import; load them with the first embedder
+torch = lazy_import("torch", "torch")
+clip = lazy_import("clip", "clip")
+
 class CLIPEmbedder:
     def __init__(self):
         try:
@@ -86,12 +90,5 @@ class CLIPEmbedder:
             logger.error(f"Traceback: {traceback.format_exc()}")
             return None
 
-# Create a singleton instance
-try:
-    logger.info("Initializing CLIP embedder...")
-    embedder = CLIPEmbedder()
-    logger.info("CLIP embedder initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to create CLIP embedder instance: {str(e)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
-    raise 
\ No newline at end of file
+# Create a singleton instance (the model loads on first use or background warm-up)
+embedder = lazy_service("clip_embedder", CLIPEmbedder)
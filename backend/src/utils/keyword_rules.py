@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Keyword Rule Engine
+===================
+
+Compiles keyword tables (rule id -> keywords) into a single regular
+expression so an item's text is scanned once for every rule at the same
+time, instead of once per keyword with ``any(word in text ...)``.
+
+Matching uses word boundaries: a keyword must start at a word boundary and
+end at one, optionally followed by a simple inflection (``loafer`` matches
+"loafers", ``sport`` matches "sporty"), so ``tan`` no longer matches
+"tank" and ``red`` no longer matches "tailored". Compounds and inflections
+the suffix can't reach ("sweatshirt", "cropped", "tied") are listed in
+``KEYWORD_VARIANTS`` and count as their base keyword.
+
+Usage:
+    STYLE_RULES = KeywordRules({
+        ('gothic', 'include'): ['black', 'lace', 'velvet'],
+        ('gothic', 'exclude'): ['pastel', 'neon'],
+    })
+    STYLE_RULES.matches("black lace top", ('gothic', 'include'))  # True
+    STYLE_RULES.match("black lace top")  # {('gothic', 'include'): 2}
+"""
+
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Mapping, Tuple
+
+# Inflections accepted after a keyword
+KEYWORD_SUFFIX = r'(?:s|es|ed|er|ing|y)?'
+
+# Compounds and irregular inflections of a keyword; text containing a variant
+# matches the keyword (and the variant itself, if it is also a keyword)
+KEYWORD_VARIANTS: Mapping[str, Tuple[str, ...]] = {
+    'active': ('activewear',),
+    'boot': ('bootie',),
+    'coat': ('raincoat', 'topcoat', 'trenchcoat'),
+    'crop': ('cropped', 'croptop'),
+    'fringe': ('fringed',),
+    'gym': ('gymwear',),
+    'knit': ('knitted', 'knitwear'),
+    'lace': ('laced',),
+    'lounge': ('loungewear',),
+    'ruffle': ('ruffled',),
+    'sport': ('sportswear',),
+    'strap': ('strappy', 'strapless'),
+    'street': ('streetwear', 'streetstyle'),
+    'stripe': ('striped',),
+    'sweat': ('sweatshirt', 'sweatpant', 'sweatsuit', 'sweatband'),
+    'tech': ('techwear',),
+    'tie': ('tied',),
+    'track': ('tracksuit', 'trackpant'),
+    'trench': ('trenchcoat',),
+    'wool': ('woolen', 'woollen'),
+    'work': ('workwear',),
+    'wrap': ('wrapped', 'wraparound'),
+}
+
+
+def _keyword_pattern(keyword: str) -> str:
+    return r'(?<!\w)' + re.escape(keyword) + KEYWORD_SUFFIX + r'(?!\w)'
+
+
+class KeywordRules:
+    """Rule table compiled into one multi-pattern matcher with cached results."""
+
+    def __init__(self, rules: Mapping[Hashable, Iterable[str]], cache_size: int = 4096):
+        self.rules: Dict[Hashable, Tuple[str, ...]] = {}
+        self._keyword_rules: Dict[str, List[Hashable]] = {}
+        for rule_id, keywords in rules.items():
+            normalized = tuple(dict.fromkeys(keyword.strip().lower() for keyword in keywords if keyword and keyword.strip()))
+            self.rules[rule_id] = normalized
+            for keyword in normalized:
+                self._keyword_rules.setdefault(keyword, []).append(rule_id)
+
+        # Every searchable term (keyword or variant) -> the keywords it stands for
+        direct: Dict[str, List[str]] = {keyword: [keyword] for keyword in self._keyword_rules}
+        for keyword in self._keyword_rules:
+            for variant in KEYWORD_VARIANTS.get(keyword, ()):
+                direct.setdefault(variant, []).append(keyword)
+
+        terms = sorted(direct, key=len, reverse=True)
+        # Lookahead so matches may overlap; the longest term wins at each
+        # start position and ``_expanded`` adds shorter terms sharing it
+        self._pattern = re.compile(
+            r'(?<!\w)(?=(' + '|'.join(re.escape(term) for term in terms) + r')' + KEYWORD_SUFFIX + r'(?!\w))'
+        ) if terms else None
+        self._expanded: Dict[str, Tuple[str, ...]] = {}
+        for term in terms:
+            implied = [
+                other for other in terms
+                if other != term and len(other) < len(term) and re.match(_keyword_pattern(other), term)
+            ]
+            self._expanded[term] = tuple(dict.fromkeys(
+                keyword for covered in (term, *implied) for keyword in direct[covered]
+            ))
+
+        self._cached_keywords = lru_cache(maxsize=cache_size)(self._scan)
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+    def _scan(self, text: str) -> FrozenSet[str]:
+        if self._pattern is None or not text:
+            return frozenset()
+        found = set()
+        for match in self._pattern.finditer(text.lower()):
+            found.update(self._expanded[match.group(1)])
+        return frozenset(found)
+
+    def _match(self, text: str) -> Mapping[Hashable, int]:
+        counts: Dict[Hashable, int] = {}
+        for keyword in self._cached_keywords(text):
+            for rule_id in self._keyword_rules[keyword]:
+                counts[rule_id] = counts.get(rule_id, 0) + 1
+        return MappingProxyType(counts)
+
+    def keywords(self, text: str) -> FrozenSet[str]:
+        """Distinct keywords found in ``text`` (one scan, cached per text)."""
+        return self._cached_keywords(text or '')
+
+    def match(self, text: str) -> Mapping[Hashable, int]:
+        """Every matched rule id with the number of its distinct keywords found."""
+        return self._cached_match(text or '')
+
+    def matches(self, text: str, rule_id: Hashable) -> bool:
+        return rule_id in self.match(text)
+
+    def count(self, text: str, rule_id: Hashable) -> int:
+        return self.match(text).get(rule_id, 0)
+
+    def matched_keywords(self, text: str, rule_id: Hashable) -> List[str]:
+        """Keywords of ``rule_id`` found in ``text``, in rule order."""
+        found = self.keywords(text)
+        return [keyword for keyword in self.rules.get(rule_id, ()) if keyword in found]
+
+
+@lru_cache(maxsize=512)
+def compile_keywords(keywords: Tuple[str, ...]) -> KeywordRules:
+    """Shared matcher for an inline keyword tuple, compiled once per tuple."""
+    return KeywordRules({'any': keywords}, cache_size=256)
+
+
+def contains_keyword(text: str, keywords: Iterable[str]) -> bool:
+    """Word-boundary replacement for ``any(keyword in text for keyword in keywords)``."""
+    if not isinstance(keywords, tuple):
+        keywords = tuple(keywords)
+    return bool(compile_keywords(keywords).keywords(text))
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from ..custom_types.wardrobe import ClothingType, CoreCategory, LayerLevel, WarmthFactor
 
 # Enhanced color compatibility for different skin tones
@@ -432,6 +433,25 @@ def get_max_layers(clothing_type: ClothingType) -> int:
     """Get the maximum number of layers for a clothing type."""
     return (MAX_LAYERS_MAPPING.get(clothing_type, 1) if MAX_LAYERS_MAPPING else 1)
 
+class ClothingTypeProfile(NamedTuple):
+    clothing_type: ClothingType
+    category: CoreCategory
+    layer_level: LayerLevel
+    warmth_factor: WarmthFactor
+    can_layer: bool
+
+@lru_cache(maxsize=None)
+def clothing_type_profile(type_value: str) -> ClothingTypeProfile:
+    """Layering attributes of a clothing type value, resolved once (ValueError for unknown types)."""
+    clothing_type = ClothingType(type_value)
+    return ClothingTypeProfile(
+        clothing_type=clothing_type,
+        category=get_core_category(clothing_type),
+        layer_level=get_layer_level(clothing_type),
+        warmth_factor=get_warmth_factor(clothing_type),
+        can_layer=can_layer(clothing_type),
+    )
+
 # Temperature-based layering rules
 def get_layering_rule(temperature: float) -> Dict:
     """Get the appropriate layering rule based on temperature."""
@@ -498,21 +518,17 @@ def validate_layering_compatibility(
     layers_by_category = {}
     layers_by_level = {}
     
-    for item in items:
-        item_type = ClothingType((item.get("type", "other") if item else "other"))
-        category = get_core_category(item_type)
-        layer_level = get_layer_level(item_type)
-        warmth_factor = get_warmth_factor(item_type)
-        
-        layers_by_category[category] = (layers_by_category.get(category, 0) if layers_by_category else 0) + 1
-        layers_by_level[layer_level] = (layers_by_level.get(layer_level, 0) if layers_by_level else 0) + 1
+    profiles = [clothing_type_profile((item.get("type", "other") if item else "other")) for item in items]
+    for profile in profiles:
+        layers_by_category[profile.category] = layers_by_category.get(profile.category, 0) + 1
+        layers_by_level[profile.layer_level] = layers_by_level.get(profile.layer_level, 0) + 1
         
         # Check warmth appropriateness
-        if warmth_factor not in rule["preferred_warmth"]:
-            warnings.append(f"{item_type.value} may be too {warmth_factor.value} for {temperature}°F weather")
+        if profile.warmth_factor not in rule["preferred_warmth"]:
+            warnings.append(f"{profile.clothing_type.value} may be too {profile.warmth_factor.value} for {temperature}°F weather")
     
     # Check minimum layers
-    total_layers = sum(1 for item in items if can_layer(ClothingType((item.get("type", "other") if item else "other"))))
+    total_layers = sum(1 for profile in profiles if profile.can_layer)
     if total_layers < rule["min_layers"]:
         errors.append(f"Insufficient layering for {temperature}°F weather. Need at least {rule['min_layers']} layers.")
     
@@ -540,8 +556,9 @@ def get_layering_suggestions(
     rule = get_layering_rule(temperature)
     suggestions = []
     
-    current_layers = sum(1 for item in items if can_layer(ClothingType((item.get("type", "other") if item else "other"))))
-    current_categories = set(get_core_category(ClothingType((item.get("type", "other") if item else "other"))) for item in items)
+    profiles = [clothing_type_profile((item.get("type", "other") if item else "other")) for item in items]
+    current_layers = sum(1 for profile in profiles if profile.can_layer)
+    current_categories = set(profile.category for profile in profiles)
     
     if current_layers < rule["min_layers"]:
         suggestions.append(f"Add {rule['min_layers'] - current_layers} more layer(s) for {temperature}°F weather")
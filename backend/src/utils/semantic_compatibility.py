@@ -3,7 +3,12 @@ Semantic Compatibility Utilities
 Handles semantic matching for style, mood, and occasion compatibility
 """
 
-from typing import List, Optional, Dict, Set
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
 from .style_compatibility_matrix import STYLE_COMPATIBILITY
 
 
@@ -643,71 +648,214 @@ OCCASION_FALLBACKS: Dict[str, List[str]] = {
 }
 
 
+# ============================================================================
+# BITSET-ENCODED COMPATIBILITY TABLES
+# ============================================================================
+
+def _normalize_underscored(term: str) -> str:
+    return term.lower().replace(' ', '_')
+
+
+def _normalize_lower(term: str) -> str:
+    return term.lower()
+
+
+class CompatibilityTable:
+    """
+    Compatibility matrix interned into integer term ids.
+
+    Each requested term gets a precomputed bitmask of itself plus its
+    compatible terms, and an item's tags encode to the OR of their bits, so
+    a compatibility check is a single ``&``. Matrix values are interned as
+    written (not normalized), matching the original set lookups.
+
+    Item tags outside the matrix get ids on first sight (so direct matches
+    still work) until the table holds ``max_terms``; later unknown tags are
+    left out of masks, and a request for such a term falls back to comparing
+    the normalized strings. Requested terms are never interned.
+    """
+
+    def __init__(
+        self,
+        matrix: Dict[str, List[str]],
+        normalize: Callable[[str], str],
+        cache_size: int = 8192,
+        max_terms: int = 4096,
+    ):
+        self.normalize = normalize
+        self.max_terms = max_terms
+        self._ids: Dict[str, int] = {}
+        self._lock = Lock()
+        for key, values in matrix.items():
+            for term in (key, *values):
+                self._intern(term, force=True)
+        self._compatible: Dict[str, int] = {
+            key: self._bits(values) for key, values in matrix.items()
+        }
+        self._request_masks: Dict[str, int] = {}
+        self.encode = lru_cache(maxsize=cache_size)(self._encode)
+
+    @property
+    def size(self) -> int:
+        return len(self._ids)
+
+    def _intern(self, term: str, force: bool = False) -> Optional[int]:
+        term_id = self._ids.get(term)
+        if term_id is None and (force or len(self._ids) < self.max_terms):
+            with self._lock:
+                term_id = self._ids.setdefault(term, len(self._ids))
+        return term_id
+
+    def _bits(self, terms: Iterable[str]) -> int:
+        mask = 0
+        for term in terms:
+            term_id = self._intern(term)
+            if term_id is not None:
+                mask |= 1 << term_id
+        return mask
+
+    def _encode(self, tags: Tuple[str, ...]) -> int:
+        return self._bits(self.normalize(str(tag)) for tag in tags)
+
+    def request_mask(self, requested: str) -> int:
+        """The requested term's bit plus its compatible terms (0 for a term no item carries)."""
+        term = self.normalize(requested)
+        mask = self._request_masks.get(term)
+        if mask is None:
+            term_id = self._ids.get(term)
+            if term_id is None:
+                # Not cached: an item tagged with the term later gives it an id
+                return self._compatible.get(term, 0)
+            mask = (1 << term_id) | self._compatible.get(term, 0)
+            if len(self._request_masks) < self.max_terms:
+                self._request_masks[term] = mask
+        return mask
+
+    def encode_tags(self, tags: Optional[Sequence[str]]) -> int:
+        """Bitmask of an item's tags (cached per distinct tag tuple)."""
+        if not tags:
+            return 0
+        if isinstance(tags, str):
+            tags = (tags,)
+        return self.encode(tuple(tags))
+
+    def is_interned(self, requested: str) -> bool:
+        return self.normalize(requested) in self._ids
+
+    def direct_match(self, requested: str, tags: Optional[Sequence[str]]) -> bool:
+        """String comparison of the normalized term and tags (for terms past ``max_terms``)."""
+        if not tags:
+            return False
+        if isinstance(tags, str):
+            tags = (tags,)
+        term = self.normalize(requested)
+        return any(self.normalize(str(tag)) == term for tag in tags)
+
+    def matches(self, requested: str, tags_or_mask: Any) -> bool:
+        """Compatibility check; pass tags (not a mask) to also match terms that never got an id."""
+        if isinstance(tags_or_mask, int):
+            return bool(self.request_mask(requested) & tags_or_mask)
+        # Encode first: the item's tags may give the requested term its id
+        if self.encode_tags(tags_or_mask) & self.request_mask(requested):
+            return True
+        # A tag equal to an interned term is interned too, so only un-interned terms need the fallback
+        return not self.is_interned(requested) and self.direct_match(requested, tags_or_mask)
+
+    @staticmethod
+    def pack(masks: Sequence[int], min_bits: int = 0) -> np.ndarray:
+        """Pack masks into a ``(len(masks), words)`` uint64 array wide enough for every mask and ``min_bits``."""
+        bits = max([min_bits, *(mask.bit_length() for mask in masks)])
+        words = max(1, -(-bits // 64))
+        data = b''.join(mask.to_bytes(words * 8, 'little') for mask in masks)
+        return np.frombuffer(data, dtype='<u8').reshape(len(masks), words)
+
+    def matches_packed(self, requested: Union[str, int], packed: np.ndarray) -> np.ndarray:
+        """Boolean match per row of ``packed`` in one vectorized AND."""
+        mask = requested if isinstance(requested, int) else self.request_mask(requested)
+        # Bits beyond the packed width belong to no row
+        mask &= (1 << (packed.shape[1] * 64)) - 1
+        request = np.frombuffer(mask.to_bytes(packed.shape[1] * 8, 'little'), dtype='<u8')
+        return (packed & request).any(axis=1)
+
+
+OCCASION_TABLE = CompatibilityTable(OCCASION_FALLBACKS, _normalize_underscored)
+STYLE_TABLE = CompatibilityTable(STYLE_COMPATIBILITY, _normalize_underscored)
+MOOD_TABLE = CompatibilityTable(MOOD_COMPAT, _normalize_lower)
+
+
+class SemanticTagMasks(NamedTuple):
+    occasion: int
+    style: int
+    mood: int
+
+
+def _item_tags(item: Any, field: str):
+    value = item.get(field) if isinstance(item, dict) else getattr(item, field, None)
+    return value or ()
+
+
+def encode_item_tags(item: Any) -> SemanticTagMasks:
+    """Encode an item's occasion/style/mood tags once for repeated matching."""
+    return SemanticTagMasks(
+        occasion=OCCASION_TABLE.encode_tags(_item_tags(item, 'occasion')),
+        style=STYLE_TABLE.encode_tags(_item_tags(item, 'style')),
+        mood=MOOD_TABLE.encode_tags(_item_tags(item, 'mood')),
+    )
+
+
+def semantic_wardrobe_matches(
+    requested_occasion: Optional[str],
+    requested_style: Optional[str],
+    requested_mood: Optional[str],
+    items: Sequence[Any],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized ``occasion_matches``/``style_matches``/``mood_matches`` over a
+    whole wardrobe. Returns three boolean arrays aligned with ``items``.
+    """
+    encoded = [encode_item_tags(item) for item in items]
+    count = len(encoded)
+
+    def column(table: CompatibilityTable, requested: Optional[str], field: str, empty_matches: bool) -> np.ndarray:
+        if not requested:
+            return np.ones(count, dtype=bool)
+        masks = [getattr(item_masks, field) for item_masks in encoded]
+        request = table.request_mask(requested)
+        packed = table.pack(masks, request.bit_length())
+        matched = table.matches_packed(request, packed)
+        if not table.is_interned(requested):
+            matched |= np.array([table.direct_match(requested, _item_tags(item, field)) for item in items], dtype=bool)
+        if empty_matches:
+            matched |= np.array([not _item_tags(item, field) for item in items], dtype=bool)
+        return matched
+
+    return (
+        column(OCCASION_TABLE, requested_occasion, 'occasion', False),
+        column(STYLE_TABLE, requested_style, 'style', False),
+        # Missing mood is treated as universal
+        column(MOOD_TABLE, requested_mood, 'mood', True),
+    )
+
+
 def style_matches(requested_style: Optional[str], item_styles: List[str]) -> bool:
     """Check if item styles match the requested style with semantic compatibility."""
     if not requested_style:
         return True
-    req = requested_style.lower().replace(' ', '_')  # Normalize spaces to underscores
-    # exact or contained
-    if req in [s.lower().replace(' ', '_') for s in item_styles]:
-        return True
-    # check group compatibility
-    compat_set = set(STYLE_COMPATIBILITY.get(req, []))
-    for it in item_styles:
-        if it.lower().replace(' ', '_') in compat_set:
-            return True
-    return False
+    return STYLE_TABLE.matches(requested_style, item_styles)
 
 
 def mood_matches(requested_mood: Optional[str], item_moods: List[str]) -> bool:
     """Check if item moods match the requested mood with semantic compatibility."""
     if not requested_mood:
         return True  # optional filter by default
-    if not item_moods or len(item_moods) == 0:
+    if not item_moods:
         return True  # treat missing mood as universal
-    
-    rm = requested_mood.lower()
-    
-    # Direct match check
-    if rm in [m.lower() for m in item_moods]:
-        return True
-    
-    # Semantic compatibility check using module-level MOOD_COMPAT
-    allowed = set(MOOD_COMPAT.get(rm, []))
-    return any(m.lower() in allowed for m in item_moods)
+    return MOOD_TABLE.matches(requested_mood, item_moods)
 
 
 def occasion_matches(requested_occasion: Optional[str], item_occasions: List[str]) -> bool:
     """Check if item occasions match the requested occasion with semantic compatibility."""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Reduced logging to prevent Railway rate limit (500 logs/sec)
-    # logger.warning(f"🚀 OCCASION_MATCHES CALLED - VERSION: 2025-10-11-COMPREHENSIVE - requested='{requested_occasion}', items={item_occasions}")
-    
     if not requested_occasion:
         return True
-    
-    ro = requested_occasion.lower().replace(' ', '_')  # Normalize spaces to underscores
-    
-    # Logging disabled to prevent Railway rate limit (500 logs/sec)
-    # logger.info(f"🔍 SEMANTIC MATCH: requested='{requested_occasion}' (normalized='{ro}'), item_occasions={item_occasions}")
-    
-    # Direct match check
-    normalized_item_occasions = [o.lower().replace(' ', '_') for o in item_occasions]
-    if ro in normalized_item_occasions:
-        # logger.info(f"✅ SEMANTIC: Direct match found: '{ro}' in {normalized_item_occasions}")
-        return True
-    
-    # Semantic fallback check using module-level OCCASION_FALLBACKS
-    fallback = set(OCCASION_FALLBACKS.get(ro, []))
-    # logger.info(f"🔍 SEMANTIC: fallback set for '{ro}' = {fallback}")
-    
-    for o in item_occasions:
-        normalized_o = o.lower().replace(' ', '_')
-        if normalized_o in fallback:
-            # logger.info(f"✅ SEMANTIC: Fallback match! '{o}' (normalized='{normalized_o}') matches '{requested_occasion}'")
-            return True
-    
-    # logger.warning(f"❌ SEMANTIC: NO MATCH - '{requested_occasion}' not compatible with {item_occasions}")
-    return False
+    # Direct match or OCCASION_FALLBACKS entry, via the interned bitsets
+    return OCCASION_TABLE.matches(requested_occasion, item_occasions)
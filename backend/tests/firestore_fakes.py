@@ -0,0 +1,32 @@
+"""Minimal Firestore stand-ins shared by service tests."""
+
+from types import SimpleNamespace
+
+
+class FakeCountQuery:
+    def __init__(self, total):
+        self.total = total
+        self.streamed = False
+
+    def where(self, *args, **kwargs):
+        return self
+
+    def count(self, alias=None):
+        return SimpleNamespace(get=lambda: [[SimpleNamespace(alias=alias, value=self.total)]])
+
+    def stream(self):
+        self.streamed = True
+        return iter([])
+
+
+class FakeUserRef:
+    def __init__(self, data):
+        self.data = data
+        self.updates = []
+
+    def get(self, transaction=None):
+        return SimpleNamespace(exists=self.data is not None, to_dict=lambda: dict(self.data or {}))
+
+    def update(self, fields):
+        self.updates.append(fields)
+        self.data.update(fields)
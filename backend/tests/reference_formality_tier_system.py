@@ -0,0 +1,207 @@
+"""
+Reference copy of FormalityTierSystem's progressive filter from before tier
+membership was precomputed per item in
+src/services/filters/formality_tier_system.py.
+
+Used only by the equivalence tests; do not import from application code.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.services.filters.formality_tier_system import (
+    OCCASION_TIER_CONFIGS,
+    TIER_BLOCKED_KEYWORDS,
+    TIER_KEYWORD_RULES,
+    TIER_KEYWORD_WORDS,
+    TIER_KEYWORDS,
+    FormalityTier,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceFormalityTierSystem:
+    def __init__(self):
+        self.configs = OCCASION_TIER_CONFIGS
+        self.tier_keywords = TIER_KEYWORDS
+        self.blocked_keywords = TIER_BLOCKED_KEYWORDS
+
+    def get_target_tier(self, occasion: str, style: str) -> FormalityTier:
+        config = self.configs.get(occasion.lower())
+        if not config:
+            return FormalityTier.TIER_3_CREATIVE_CASUAL
+        style_lower = (style or '').lower()
+        if style_lower in config.style_overrides:
+            return config.style_overrides[style_lower]
+        return config.primary_tier
+
+    def apply_progressive_filter(
+        self,
+        wardrobe: List[Any],
+        occasion: str,
+        style: str,
+        recently_used_item_ids: Set[str],
+        safe_get_item_attr_func: callable,
+        occasion_fallbacks: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[List[Any], FormalityTier]:
+        """
+        Apply progressive tier filtering with fallback.
+        
+        Args:
+            wardrobe: List of wardrobe items
+            occasion: Occasion name
+            style: Style name
+            recently_used_item_ids: Set of recently worn item IDs
+            safe_get_item_attr_func: Function to safely get item attributes
+            occasion_fallbacks: Optional dict of occasion fallbacks for semantic matching
+        
+        Returns:
+            (filtered_wardrobe, tier_used)
+        """
+        config = self.configs.get(occasion.lower())
+        if not config:
+            logger.info(f"⚠️ No tier config for occasion '{occasion}', returning full wardrobe")
+            return wardrobe, FormalityTier.TIER_3_CREATIVE_CASUAL
+        
+        target_tier = self.get_target_tier(occasion, style)
+        logger.info(f"🎯 TIER SYSTEM: {occasion.upper()} + {style} → Target tier: {target_tier.value}")
+        
+        # Try each allowed tier in order
+        for tier in config.allowed_tiers:
+            logger.info(f"📊 Trying TIER: {tier.value}")
+            
+            filtered_items = self._filter_by_tier(
+                wardrobe, 
+                tier, 
+                safe_get_item_attr_func,
+                occasion=occasion,
+                occasion_fallbacks=occasion_fallbacks
+            )
+            fresh_items = [
+                item for item in filtered_items
+                if safe_get_item_attr_func(item, 'id', '') not in recently_used_item_ids
+            ]
+            
+            logger.info(f"   {len(filtered_items)} total items, {len(fresh_items)} fresh")
+            
+            # Check if tier has sufficient items
+            if len(fresh_items) >= config.requirements.min_fresh_items:
+                logger.info(f"✅ Using TIER {tier.value} - sufficient fresh items")
+                return filtered_items, tier
+            elif len(filtered_items) >= config.requirements.min_items:
+                logger.info(f"⚠️ Using TIER {tier.value} - sufficient items but some recently worn")
+                return filtered_items, tier
+            else:
+                logger.warning(f"⚠️ TIER {tier.value} insufficient - trying next tier")
+        
+        # Last resort: return best available tier
+        logger.error(f"🚨 All tiers insufficient - using best available items")
+        return wardrobe, target_tier
+    
+    def _filter_by_tier(
+        self,
+        wardrobe: List[Any],
+        tier: FormalityTier,
+        safe_get_item_attr_func: callable,
+        occasion: Optional[str] = None,
+        occasion_fallbacks: Optional[Dict[str, List[str]]] = None
+    ) -> List[Any]:
+        """
+        Filter wardrobe items by formality tier with intelligent keyword matching
+        and occasion compatibility checking.
+        
+        Args:
+            wardrobe: List of wardrobe items
+            tier: Formality tier to filter by
+            safe_get_item_attr_func: Function to safely get item attributes
+            occasion: Target occasion (e.g., "interview")
+            occasion_fallbacks: Dict of occasion fallbacks for semantic matching
+        
+        Returns:
+            List of items matching the tier and occasion
+        """
+        keywords = self.tier_keywords.get(tier, {})
+        if not keywords:
+            # No keywords for this tier, return all
+            logger.debug("No keyword rules for tier %s; returning the full wardrobe", tier.value)
+            return wardrobe
+        
+        tier_keyword_words = TIER_KEYWORD_WORDS.get(tier, ())
+        filtered = []
+        blocked_count = 0
+        for item in wardrobe:
+            item_name = safe_get_item_attr_func(item, 'name', '').lower()
+            item_type = str(safe_get_item_attr_func(item, 'type', '')).lower()
+            
+            # One scan finds both blocked phrases and tier words (word-boundary matching)
+            found_words = TIER_KEYWORD_RULES.keywords(f"{item_name} {item_type}")
+            
+            # First, check if item is blocked (too casual)
+            blocking_keyword = next((kw for kw in self.blocked_keywords if kw in found_words), None)
+            if blocking_keyword:
+                logger.debug("Blocked '%s' from %s (keyword: %s)", item_name, tier.value, blocking_keyword)
+                blocked_count += 1
+                continue
+            
+            # Check if item matches tier keywords with INTELLIGENT MATCHING
+            # Multi-word keywords match when all their words are present in any order:
+            #   - "pencil dress" → "Dress pencil Mustard Yellow" ✅
+            #   - "dress shirt" → "Shirt dress blue" ✅
+            #   - "oxford shoes" → "Shoes oxford brown" ✅
+            matches_tier = any(words <= found_words for words in tier_keyword_words)
+            
+            # Also check metadata for formality level
+            if not matches_tier:  # Only check metadata if keyword match failed
+                if hasattr(item, 'metadata') and item.metadata and isinstance(item.metadata, dict):
+                    visual_attrs = item.metadata.get('visualAttributes', {})
+                    if isinstance(visual_attrs, dict):
+                        formal_level = (visual_attrs.get('formalLevel') or '').lower()
+                        
+                        if tier == FormalityTier.TIER_1_STRICT_FORMAL:
+                            if formal_level in ['formal', 'business', 'professional', 'dress']:
+                                matches_tier = True
+                        elif tier == FormalityTier.TIER_2_SMART_CASUAL:
+                            if formal_level in ['smart casual', 'business casual', 'semi-formal']:
+                                matches_tier = True
+                        elif tier == FormalityTier.TIER_3_CREATIVE_CASUAL:
+                            if formal_level in ['casual', 'smart casual', 'creative']:
+                                matches_tier = True
+            
+            # CRITICAL: Check occasion compatibility (with fallbacks)
+            # This ensures items tagged with "business" or "formal" can be used for "interview"
+            if matches_tier and occasion and occasion_fallbacks:
+                item_occasions = safe_get_item_attr_func(item, 'occasion', [])
+                if isinstance(item_occasions, str):
+                    item_occasions = [item_occasions]
+                
+                item_occasions_lower = [occ.lower() for occ in item_occasions]
+                occasion_lower = occasion.lower()
+                
+                # Check if item matches target occasion OR fallback occasions
+                occasion_match = False
+                
+                # Direct match
+                if occasion_lower in item_occasions_lower:
+                    occasion_match = True
+                # Fallback match
+                elif occasion_lower in occasion_fallbacks:
+                    fallback_occasions = [fb.lower() for fb in occasion_fallbacks[occasion_lower]]
+                    if any(fallback in item_occasions_lower for fallback in fallback_occasions):
+                        occasion_match = True
+                
+                # If occasion checking is enabled but item doesn't match, skip it
+                if not occasion_match:
+                    logger.debug(f"   ❌ {item_name}: tier match but occasion mismatch (has {item_occasions_lower}, need {occasion_lower} or {occasion_fallbacks.get(occasion_lower, [])})")
+                    continue
+                else:
+                    logger.debug(f"   ✅ {item_name}: tier + occasion match")
+            
+            if matches_tier:
+                logger.debug("Accepted '%s' for tier %s", item_name, tier.value)
+                filtered.append(item)
+            else:
+                logger.debug("Rejected '%s' from tier %s", item_name, tier.value)
+
+        logger.info(f"📊 TIER FILTER RESULT: {len(filtered)}/{len(wardrobe)} items passed, {blocked_count} blocked")
+        return filtered
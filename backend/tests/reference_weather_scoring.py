@@ -0,0 +1,311 @@
+"""
+Reference copy of RobustOutfitGenerationService._analyze_weather_scores from
+before items were reduced to weather features and scored with array ops in
+src/services/scoring/weather_analyzer.py.
+
+Used only by the equivalence tests; do not import from application code.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def reference_analyze_weather_scores(service, context, item_scores: dict) -> None:
+    """The per-item weather analyzer; ``service`` is a RobustOutfitGenerationService."""
+    logger.info(f"🌤️ WEATHER ANALYZER: Scoring {len(item_scores)} items")
+
+    try:
+        # Extract weather data with smart defaults
+        if (context.weather if context else None) is None:
+            # Smart default: use occasion-appropriate weather
+            if (context.occasion if context else "unknown").lower() in ['business', 'formal']:
+                temp = 72.0
+                condition = 'clear'
+            elif (context.occasion if context else "unknown").lower() in ['party', 'evening']:
+                temp = 68.0
+                condition = 'clear'
+            elif (context.occasion if context else "unknown").lower() == 'athletic':
+                temp = 75.0
+                condition = 'clear'
+            else:
+                temp = 70.0
+                condition = 'clear'
+            logger.warning(f"⚠️ WEATHER ANALYZER: Missing weather data, using SMART DEFAULT: {temp}°F, {condition}")
+        elif hasattr(context.weather, 'temperature'):
+            temp = float((context.weather if context else None).temperature)  # CRITICAL: Convert to float
+            logger.info(f"🌤️ WEATHER ANALYZER: Got temperature from weather object: {temp}°F")
+        elif hasattr(context.weather, '__dict__') and 'temperature' in (context.weather if context else None).__dict__:
+            temp = float((context.weather if context else None).__dict__['temperature'])  # CRITICAL: Convert to float
+            logger.info(f"🌤️ WEATHER ANALYZER: Got temperature from weather.__dict__: {temp}°F")
+        else:
+            temp = 70.0
+            logger.warning(f"⚠️ WEATHER ANALYZER: Could not extract temperature, using default: {temp}°F")
+
+        if hasattr(context.weather, 'condition'):
+            condition = (context.weather if context else None).condition.lower() if (context.weather if context else None).condition else 'clear'
+        elif hasattr(context.weather, '__dict__') and 'condition' in (context.weather if context else None).__dict__:
+            condition = (context.weather if context else None).__dict__['condition'].lower() if (context.weather if context else None).__dict__['condition'] else 'clear'
+        else:
+            condition = 'clear'
+
+        # Determine season from temperature
+        if temp < 40:
+            season = 'winter'
+        elif temp < 60:
+            season = 'fall'
+        elif temp < 75:
+            season = 'spring'
+        else:
+            season = 'summer'
+
+        logger.info(f"🌤️ Weather analysis: {temp}°F, {condition}, season={season}")
+
+        # SPECIAL CASE: Gym/Athletic occasions ignore weather (gyms are climate-controlled!)
+        is_gym = (context.occasion if context else "unknown").lower() in ['gym', 'athletic', 'workout']
+
+        for item_id, scores in item_scores.items():
+            item = scores['item']
+            base_score = 0.5  # Default neutral score
+
+            # GYM OVERRIDE: Skip weather scoring for gym (climate-controlled environment)
+            if is_gym:
+                base_score = 0.8  # Higher base score - weather doesn't matter for gym
+                item_scores[item_id]['weather_score'] = 0.8
+                continue  # Skip all weather checks for gym items
+
+            # Season match
+            item_seasons = getattr(item, 'season', [])
+            if isinstance(item_seasons, str):
+                item_seasons = [item_seasons]
+
+            item_seasons_lower = [s.lower() for s in item_seasons]
+            if season in item_seasons_lower:
+                base_score += 0.3
+
+            # Temperature compatibility
+            if hasattr(item, 'temperatureCompatibility'):
+                temp_compat = service.safe_get_item_attr(item, "temperatureCompatibility")
+                if temp_compat and hasattr(temp_compat, 'minTemp') and hasattr(temp_compat, 'maxTemp'):
+                    # CRITICAL FIX: Parse temperature strings (handle '32°F', '>85', etc.)
+                    try:
+                        import re
+                        def parse_temp_value(val):
+                            if isinstance(val, (int, float)):
+                                return float(val)
+                            if isinstance(val, str):
+                                clean_val = re.sub(r'[><]=?|°[FC]|[FC]', '', val).strip()
+                                return float(clean_val) if clean_val else None
+                            return None
+
+                        min_t = parse_temp_value(temp_compat.minTemp)
+                        max_t = parse_temp_value(temp_compat.maxTemp)
+                        if min_t is not None and max_t is not None and min_t <= temp <= max_t:
+                            base_score += 0.2
+                    except (ValueError, TypeError) as e:
+                        logger.debug(f"⚠️ Could not parse temperatureCompatibility: {e}")
+
+            # Material appropriateness for weather
+            item_name = service.safe_get_item_name(item) if item else "Unknown"
+            item_name_lower = item_name.lower()
+            item_type_lower = str(service.safe_get_item_type(item)).lower()
+
+            # METADATA CHECK: WARMTH FACTOR - Direct temperature matching
+            warmth_factor = None
+            fabric_weight = None
+            sleeve_length = None
+            length = None
+            temp_compat = None
+
+            if hasattr(item, 'metadata') and item.metadata and isinstance(item.metadata, dict):
+                visual_attrs = item.metadata.get('visualAttributes', {})
+                if isinstance(visual_attrs, dict):
+                    warmth_factor = (visual_attrs.get('warmthFactor') or '').lower()
+                    fabric_weight = (visual_attrs.get('fabricWeight') or '').lower()
+                    sleeve_length = (visual_attrs.get('sleeveLength') or '').lower()
+                    length = (visual_attrs.get('length') or '').lower()
+                    temp_compat = visual_attrs.get('temperatureCompatibility')
+
+            # TEMPERATURE COMPATIBILITY - PRECISE matching (highest priority)
+            if temp_compat and isinstance(temp_compat, dict):
+                min_temp = temp_compat.get('minTemp')
+                max_temp = temp_compat.get('maxTemp')
+                optimal_min = temp_compat.get('optimalMin')
+                optimal_max = temp_compat.get('optimalMax')
+
+                # CRITICAL FIX: Convert string temperatures to float
+                # Handle formats like '32°F', '>85', '<32°F', etc.
+                def parse_temp(value):
+                    if value is None:
+                        return None
+                    if isinstance(value, (int, float)):
+                        return float(value)
+                    if isinstance(value, str):
+                        # Strip comparison operators (>, <, >=, <=) and units (°F, °C, F, C)
+                        import re
+                        clean_value = re.sub(r'[><]=?|°[FC]|[FC]', '', value).strip()
+                        return float(clean_value) if clean_value else None
+                    return None
+
+                try:
+                    min_temp = parse_temp(min_temp)
+                    max_temp = parse_temp(max_temp)
+                    optimal_min = parse_temp(optimal_min)
+                    optimal_max = parse_temp(optimal_max)
+                except (ValueError, TypeError) as e:
+                    logger.debug(f"⚠️ TEMP COMPAT: Could not parse temp values: {e}")
+                    min_temp = max_temp = optimal_min = optimal_max = None
+
+                if min_temp is not None and max_temp is not None:
+                    if min_temp <= temp <= max_temp:
+                        # Within acceptable range
+                        if optimal_min is not None and optimal_max is not None:
+                            if optimal_min <= temp <= optimal_max:
+                                base_score += 0.5  # Perfect temperature match!
+                                logger.debug(f"  ✅✅✅ TEMP COMPAT: Perfect temp match {temp}°F in optimal range [{optimal_min}-{optimal_max}] (+0.5)")
+                            else:
+                                base_score += 0.3  # Acceptable but not optimal
+                                logger.debug(f"  ✅ TEMP COMPAT: Acceptable temp {temp}°F in range [{min_temp}-{max_temp}] (+0.3)")
+                        else:
+                            base_score += 0.35  # Good match
+                            logger.debug(f"  ✅ TEMP COMPAT: Good temp match {temp}°F in range [{min_temp}-{max_temp}] (+0.35)")
+                    else:
+                        # Outside acceptable range
+                        if temp < min_temp:
+                            base_score -= 0.4  # Too cold for this item
+                            logger.debug(f"  🚫 TEMP COMPAT: Too cold {temp}°F < {min_temp}°F min ({-0.4})")
+                        else:  # temp > max_temp
+                            base_score -= 0.4  # Too hot for this item
+                            logger.debug(f"  🚫 TEMP COMPAT: Too hot {temp}°F > {max_temp}°F max ({-0.4})")
+
+            # WARMTH FACTOR SCORING - Match warmth to temperature
+            if warmth_factor:
+                if temp < 40:  # Very cold
+                    if warmth_factor in ['heavy', 'insulated', 'warm']:
+                        base_score += 0.4
+                        logger.debug(f"  ✅✅ WARMTH FACTOR: Heavy warmth perfect for very cold (+0.4)")
+                    elif warmth_factor in ['light', 'minimal']:
+                        base_score -= 0.3
+                        logger.debug(f"  ⚠️ WARMTH FACTOR: Light warmth too cold ({-0.3})")
+                elif temp < 60:  # Cool
+                    if warmth_factor in ['medium', 'moderate']:
+                        base_score += 0.3
+                        logger.debug(f"  ✅ WARMTH FACTOR: Medium warmth good for cool weather (+0.3)")
+                elif temp > 75:  # Hot
+                    if warmth_factor in ['light', 'minimal', 'breathable']:
+                        base_score += 0.4
+                        logger.debug(f"  ✅✅ WARMTH FACTOR: Light warmth perfect for hot weather (+0.4)")
+                    elif warmth_factor in ['heavy', 'warm']:
+                        base_score -= 0.4
+                        logger.debug(f"  🚫 WARMTH FACTOR: Heavy warmth too hot ({-0.4})")
+
+            # FABRIC WEIGHT SCORING - Match weight to temperature
+            if fabric_weight:
+                if temp < 50:  # Cold
+                    if fabric_weight in ['heavy', 'thick', 'heavyweight']:
+                        base_score += 0.3
+                        logger.debug(f"  ✅ FABRIC WEIGHT: Heavy fabric good for cold (+0.3)")
+                    elif fabric_weight in ['light', 'lightweight']:
+                        base_score -= 0.2
+                        logger.debug(f"  ⚠️ FABRIC WEIGHT: Light fabric too cold ({-0.2})")
+                elif temp > 75:  # Hot
+                    if fabric_weight in ['light', 'lightweight', 'thin']:
+                        base_score += 0.3
+                        logger.debug(f"  ✅ FABRIC WEIGHT: Light fabric good for hot weather (+0.3)")
+                    elif fabric_weight in ['heavy', 'thick']:
+                        base_score -= 0.3
+                        logger.debug(f"  🚫 FABRIC WEIGHT: Heavy fabric too hot ({-0.3})")
+
+            # SLEEVE LENGTH - Weather matching for tops
+            item_category = service._get_item_category(item)
+            if item_category == 'tops' and sleeve_length:
+                if temp > 75:  # Hot
+                    if sleeve_length in ['sleeveless', 'tank', 'short', 'short sleeve']:
+                        base_score += 0.25
+                        logger.debug(f"  ✅ SLEEVE LENGTH: {sleeve_length.capitalize()} good for hot weather (+0.25)")
+                    elif sleeve_length in ['long', 'long sleeve']:
+                        base_score -= 0.2
+                        logger.debug(f"  ⚠️ SLEEVE LENGTH: Long sleeves too warm ({-0.2})")
+                elif temp < 50:  # Cold
+                    if sleeve_length in ['long', 'long sleeve']:
+                        base_score += 0.2
+                        logger.debug(f"  ✅ SLEEVE LENGTH: Long sleeves good for cold (+0.2)")
+
+            # LENGTH - For bottoms and outerwear
+            if item_category in ['bottoms', 'outerwear'] and length:
+                if temp < 40:  # Very cold
+                    if length in ['long', 'full', 'ankle', 'maxi']:
+                        base_score += 0.25
+                        logger.debug(f"  ✅ LENGTH: Long length good for cold (+0.25)")
+                elif temp > 75:  # Hot
+                    if item_category == 'bottoms' and length in ['short', 'shorts', 'above knee']:
+                        base_score += 0.25
+                        logger.debug(f"  ✅ LENGTH: Shorts good for hot weather (+0.25)")
+
+            # Cold weather items (keyword fallback)
+            if temp < 50:
+                cold_keywords = ['wool', 'fleece', 'coat', 'jacket', 'sweater', 'long sleeve', 'boots']
+                for keyword in cold_keywords:
+                    if keyword in item_name_lower or keyword in item_type_lower:
+                        base_score += 0.15
+                        break
+
+            # Hot weather items - BALANCED PENALTIES
+            elif temp > 75:  # Higher threshold for hot weather penalties
+                hot_keywords = ['cotton', 'linen', 'short sleeve', 'shorts', 'sandals', 'tank', 'light']
+                hot_appropriate = False
+                for keyword in hot_keywords:
+                    if keyword in item_name_lower or keyword in item_type_lower:
+                        base_score += 0.2  # Boost for hot weather appropriate items
+                        hot_appropriate = True
+                        break
+
+                # BALANCED PENALTIES based on temperature
+                hot_inappropriate = ['wool', 'fleece', 'coat', 'jacket', 'sweater', 'long sleeve', 'boots', 'heavy']
+                for keyword in hot_inappropriate:
+                    if keyword in item_name_lower or keyword in item_type_lower:
+                        if temp >= 90:  # Extreme heat - STRONG PENALTY
+                            base_score -= 0.3  # Strong penalty but don't eliminate completely
+                            logger.warning(f"🔥 HOT PENALTY: {item_name} penalized for {temp}°F extreme heat")
+                        elif temp >= 80:  # Hot weather - MODERATE PENALTY
+                            base_score -= 0.2  # Moderate penalty for hot weather
+                            logger.info(f"🌡️ HOT PENALTY: {item_name} penalized for {temp}°F hot weather")
+                        else:  # Warm weather (75-80°F)
+                            base_score -= 0.1  # Light penalty
+                        break
+
+            # Moderate weather (40-75°F) - neutral scoring with minimal penalties
+            else:
+                # Very light penalty for extreme weather items in moderate weather
+                if temp > 70:
+                    hot_inappropriate = ['wool', 'fleece', 'coat', 'jacket', 'sweater']
+                    for keyword in hot_inappropriate:
+                        if keyword in item_name_lower or keyword in item_type_lower:
+                            base_score -= 0.05  # Very small penalty
+                            break
+                elif temp < 50:
+                    cold_inappropriate = ['shorts', 'sandals', 'tank']
+                    for keyword in cold_inappropriate:
+                        if keyword in item_name_lower or keyword in item_type_lower:
+                            base_score -= 0.05  # Very small penalty
+                            break
+
+            # Rainy weather
+            if 'rain' in condition or 'storm' in condition:
+                rain_keywords = ['waterproof', 'raincoat', 'boots']
+                for keyword in rain_keywords:
+                    if keyword in item_name_lower:
+                        base_score += 0.2
+                        break
+
+            item_scores[item_id]['weather_score'] = min(1.0, max(0.0, base_score))  # Clamp between 0 and 1
+
+        logger.info(f"🌤️ WEATHER ANALYZER: Completed scoring")
+
+    except Exception as e:
+        logger.error(f"❌ WEATHER ANALYZER FAILED: {str(e)}", exc_info=True)
+        logger.warning(f"⚠️ WEATHER ANALYZER: Using emergency fallback scoring")
+
+        # Emergency fallback: assign neutral scores
+        for item_id in item_scores:
+            item_scores[item_id]['weather_score'] = 0.5
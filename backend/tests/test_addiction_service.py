@@ -0,0 +1,84 @@
+"""Tests for per-user activity state used by streak and decay checks."""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from src.services.addiction_service import (
+    AddictionService,
+    activity_count,
+    apply_outfit_log,
+    empty_activity,
+    record_activity,
+)
+
+from firestore_fakes import FakeUserRef
+
+
+class AddictionActivityStateTests(unittest.TestCase):
+    TZ_USER = {"location_data": {"timezone": "America/New_York"}}
+
+    @staticmethod
+    def millis(*args):
+        return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+    def test_ring_buffer_counts_recent_days_and_drops_old_ones(self):
+        start = datetime(2024, 3, 1).date()
+        activity = empty_activity()
+        for offset in [0, 0, 3, 9, 25]:
+            activity = record_activity(activity, start + timedelta(days=offset))
+        today = (start + timedelta(days=25)).toordinal()
+
+        self.assertEqual(activity_count(activity, today, 7), 1)
+        self.assertEqual(activity_count(activity, today, 30), 5)
+        # Days 0 and 3 fall out of the window once it slides past them
+        self.assertEqual(activity_count(activity, today + 9, 30), 2)
+        self.assertEqual(activity_count(activity, today + 60, 30), 0)
+        self.assertEqual(activity["last_log_date"], "2024-03-26")
+
+    def test_first_log_and_streak_use_the_local_calendar_day(self):
+        user_data = dict(self.TZ_USER, pending_xp_bonus=15)
+        # 23:30 local on Mar 4 and 00:30 local on Mar 5 (EST is UTC-5)
+        update, first = apply_outfit_log(user_data, self.millis(2024, 3, 5, 4, 30))
+        user_data.update(update)
+        update, again = apply_outfit_log(user_data, self.millis(2024, 3, 5, 4, 45))
+        user_data.update(update)
+        update, next_day = apply_outfit_log(user_data, self.millis(2024, 3, 5, 5, 30))
+
+        self.assertTrue(first["is_first_log_today"])
+        self.assertEqual(first["pending_xp_bonus"], 15)
+        self.assertEqual(user_data["pending_xp_bonus"], 0)
+        self.assertFalse(again["is_first_log_today"])
+        self.assertEqual(again["current_streak"], 1)
+        self.assertTrue(next_day["is_first_log_today"])
+        self.assertEqual((next_day["current_streak"], next_day["last_log_date"]), (2, "2024-03-05"))
+        self.assertEqual(next_day["outfits_last_7_days"], 3)
+        self.assertNotIn("pending_xp_bonus", update)
+
+    def test_master_decay_reads_weekly_count_from_activity_state(self):
+        activity = empty_activity()
+        today = datetime.now(timezone.utc).date()
+        for offset in range(6):
+            activity = record_activity(activity, today - timedelta(days=offset))
+        user_ref = FakeUserRef({
+            "activity": activity,
+            "role": {"current_role": "master", "role_earned_at": "2020-01-01T00:00:00"},
+        })
+
+        def collection(name):
+            if name != "users":
+                raise AssertionError(f"unexpected {name} query")
+            return SimpleNamespace(document=lambda user_id: user_ref)
+
+        service = AddictionService()
+        service.db = SimpleNamespace(collection=collection)
+        result = asyncio.run(service.check_master_decay("user-1"))
+
+        self.assertFalse(result["demoted"])
+        self.assertEqual(result["outfits_this_week"], 6)
+        self.assertEqual(user_ref.updates, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for verified token caching and request profiles."""
+
+import time
+import unittest
+from unittest.mock import patch
+
+import src.auth.token_cache as token_cache_module
+
+
+class VerifiedTokenCacheTests(unittest.TestCase):
+    def setUp(self):
+        token_cache_module._verified_tokens.clear()
+
+    def test_claims_are_verified_once_until_expiry(self):
+        calls = []
+
+        def verify_id_token(token, **_kwargs):
+            calls.append(token)
+            return {"uid": "user-1", "exp": time.time() + 600}
+
+        with patch("firebase_admin.auth.verify_id_token", verify_id_token):
+            first = token_cache_module.verify_firebase_token("token-a")
+            second = token_cache_module.verify_firebase_token("token-a")
+        self.assertEqual(first["uid"], "user-1")
+        self.assertEqual(second, first)
+        self.assertEqual(first["uid"], "user-1")
+        self.assertEqual(calls, ["token-a"])
+        self.assertNotIn("token-a", token_cache_module._verified_tokens.keys())
+
+    def test_callers_get_a_copy_of_the_cached_claims(self):
+        with patch(
+            "firebase_admin.auth.verify_id_token",
+            lambda token, **_kwargs: {"uid": "user-1", "exp": time.time() + 600},
+        ):
+            first = token_cache_module.verify_firebase_token("token-d")
+            first["uid"] = "someone-else"
+            second = token_cache_module.verify_firebase_token("token-d")
+            second["admin"] = True
+            third = token_cache_module.verify_firebase_token("token-d")
+
+        self.assertEqual(third, {"uid": "user-1", "exp": second["exp"]})
+
+    def test_public_keys_are_fetched_from_the_published_certificate_url(self):
+        requested = []
+
+        class Request:
+            def __call__(self, url, method="GET", **_kwargs):
+                requested.append((method, url))
+                return type("Response", (), {"status": 200, "data": b'{"kid-2": "cert", "kid-1": "cert"}'})()
+
+        with patch("google.auth.transport.requests.Request", Request):
+            self.assertTrue(token_cache_module.prefetch_public_keys())
+
+        self.assertEqual(requested, [("GET", token_cache_module.FIREBASE_ID_TOKEN_CERT_URL)])
+        self.assertEqual(token_cache_module.get_token_cache_stats()["public_key_ids"], ["kid-1", "kid-2"])
+
+    def test_expired_claims_are_not_cached(self):
+        with patch(
+            "firebase_admin.auth.verify_id_token",
+            lambda token, **_kwargs: {"uid": "user-1", "exp": time.time() - 1},
+        ):
+            token_cache_module.verify_firebase_token("token-b")
+
+        self.assertEqual(len(token_cache_module._verified_tokens), 0)
+
+    def test_clock_skew_failures_are_flagged(self):
+        def verify_id_token(token, **_kwargs):
+            raise ValueError("Token used too early")
+
+        with patch("firebase_admin.auth.verify_id_token", verify_id_token):
+            with self.assertRaises(token_cache_module.TokenVerificationError) as raised:
+                token_cache_module.verify_firebase_token("token-c")
+
+        self.assertTrue(raised.exception.clock_skew)
+
+    def test_profiles_from_cached_claims_do_not_share_nested_state(self):
+        from src.auth.auth_service import _profile_from_claims
+
+        claims = {"uid": "user-1", "name": "Sam", "email": "sam@example.com"}
+        first = _profile_from_claims(claims)
+        first.preferences["colors"].append("Red")
+        first.measurements["height"] = 190
+
+        second = _profile_from_claims(claims)
+        self.assertNotIn("Red", second.preferences["colors"])
+        self.assertEqual(second.measurements["height"], 175)
+
+
+if __name__ == "__main__":
+    unittest.main()
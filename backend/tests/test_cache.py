@@ -0,0 +1,55 @@
+"""Tests for the bounded LRU+TTL stores in src.core.cache."""
+
+import unittest
+
+from src.core.cache import BoundedStore
+
+
+class BoundedStoreTests(unittest.TestCase):
+    def test_evicts_least_recently_used_and_spills_it(self):
+        spilled = []
+        store = BoundedStore("test", max_entries=2, spill=lambda key, value: spilled.append(key))
+
+        store["a"] = 1
+        store["b"] = 2
+        store.get("a")
+        store["c"] = 3
+
+        self.assertEqual(sorted(store.keys()), ["a", "c"])
+        self.assertEqual(spilled, ["b"])
+        self.assertEqual(store.get_stats()["evictions"], 1)
+
+    def test_expires_entries_by_deadline_and_refreshes_on_access(self):
+        now = [1000.0]
+        store = BoundedStore("test", ttl=10, default_factory=list, clock=lambda: now[0])
+
+        store["idle"].append("x")
+        store["active"].append("y")
+        now[0] += 8
+        store.get("active")
+        now[0] += 5
+
+        self.assertNotIn("idle", store)
+        self.assertEqual(store["active"], ["y"])
+        self.assertEqual(store["idle"], [])
+        self.assertEqual(store.get_stats()["expirations"], 1)
+
+    def test_session_cache_spills_only_sessions_of_firestore_backed_trackers(self):
+        from unittest.mock import patch
+
+        import src.services.session_tracker_service as tracker_module
+
+        written = []
+        with patch.object(tracker_module, "SESSION_CACHE", BoundedStore(
+            "test_sessions", max_entries=1, spill=tracker_module._spill_session
+        )), patch.object(tracker_module, "_write_session_document", lambda db, session_id, data: written.append(session_id)), \
+                patch("src.config.firebase.db", object()):
+            tracker_module.SessionTrackerService(use_firestore=True).mark_item_as_seen("persistent-1", "a")
+            tracker_module.SessionTrackerService().mark_item_as_seen("local-1", "b")
+            tracker_module.SessionTrackerService().mark_item_as_seen("local-2", "c")
+
+        self.assertEqual(written, ["persistent-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Tests for the scheduled daily suggestions job."""
+
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+
+
+class DailySuggestionsJobTests(unittest.TestCase):
+    NOW = datetime(2026, 3, 2, 7, 30, tzinfo=timezone.utc)
+
+    class FakeSuggestions:
+        def __init__(self, existing=()):
+            self.saved = {}
+            self.existing = set(existing)
+            self.existence_reads = 0
+
+        def existing_user_ids(self, user_ids_by_date):
+            self.existence_reads += 1
+            return {user_id for user_id in user_ids_by_date if user_id in self.existing}
+
+        def save_suggestion(self, user_id, date_str, outfit_data, is_fallback=False, precomputed=False, overwrite=True):
+            if not overwrite and user_id in self.existing:
+                return None
+            self.saved[user_id] = (date_str, outfit_data, precomputed)
+            return {"id": f"{user_id}_{date_str}"}
+
+    def users(self):
+        now_ms = int(self.NOW.timestamp() * 1000)
+        london = {"timezone": "Europe/London", "last_location": "London"}
+        return [
+            ("london-1", {"location_data": london, "updatedAt": now_ms}),
+            ("london-2", {"location_data": dict(london), "activity": {"last_log_date": "2026-03-01"}}),
+            ("london-done", {"location_data": dict(london), "updatedAt": now_ms}),
+            ("london-inactive", {"location_data": dict(london), "updatedAt": now_ms - 30 * 86_400_000}),
+            ("tokyo", {"location_data": {"timezone": "Asia/Tokyo", "last_location": "Tokyo"}, "updatedAt": now_ms}),
+            ("coords", {"location_data": {"coordinates": {"lat": 51.5072, "lon": -0.1276}}, "updatedAt": now_ms}),
+        ]
+
+    def run_job(self, suggestions, **kwargs):
+        from src.jobs.daily_suggestions_job import precompute_daily_suggestions
+
+        fetched = []
+        active = {"now": 0, "max": 0}
+
+        async def fetch(location):
+            fetched.append(location)
+            await asyncio.sleep(0)
+            return {"temperature": 50.0, "location": location}
+
+        async def generate(user_id, weather):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0)
+            active["now"] -= 1
+            return {"name": f"Look for {user_id}", "weather": weather}
+
+        stats = asyncio.run(precompute_daily_suggestions(
+            now=self.NOW, user_docs=self.users(), service=suggestions, fetch=fetch, generate=generate, **kwargs
+        ))
+        return stats, fetched, active["max"]
+
+    def test_precomputes_active_morning_users_once_per_location(self):
+        suggestions = self.FakeSuggestions(existing={"london-done"})
+
+        stats, fetched, max_active = self.run_job(suggestions, batch_size=2, concurrency=1)
+
+        self.assertEqual(set(suggestions.saved), {"london-1", "london-2", "coords"})
+        self.assertEqual(suggestions.saved["london-1"][0], "2026-03-02")
+        self.assertTrue(all(precomputed for _, _, precomputed in suggestions.saved.values()))
+        self.assertEqual(suggestions.saved["coords"][1]["weather"]["location"], "51.51,-0.13")
+        self.assertEqual(sorted(fetched), ["51.51,-0.13", "London"])
+        self.assertEqual(max_active, 1)
+        self.assertEqual(suggestions.existence_reads, 2)
+        self.assertEqual((stats["due"], stats["existing"], stats["generated"], stats["failed"]), (4, 1, 3, 0))
+
+    def test_a_suggestion_written_during_the_run_is_not_replaced(self):
+        suggestions = self.FakeSuggestions()
+        existing_user_ids = suggestions.existing_user_ids
+
+        def read_then_race(user_ids_by_date):
+            existing = existing_user_ids(user_ids_by_date)
+            # The endpoint writes london-1's suggestion after the existence read
+            suggestions.existing.add("london-1")
+            return existing
+
+        suggestions.existing_user_ids = read_then_race
+
+        stats, _, _ = self.run_job(suggestions)
+
+        self.assertNotIn("london-1", suggestions.saved)
+        self.assertEqual((stats["existing"], stats["generated"]), (1, 3))
+
+    def test_save_suggestion_creates_without_overwriting(self):
+        from google.api_core.exceptions import AlreadyExists
+        from src.services.daily_suggestion_service import DailySuggestionService
+
+        class Ref:
+            id = "user-1_2026-03-02"
+            created = None
+
+            def create(self, data):
+                if self.created is not None:
+                    raise AlreadyExists("exists")
+                self.created = data
+
+        ref = Ref()
+        service = DailySuggestionService(firestore_client=object())
+        service._ref = lambda user_id, date_str: ref
+
+        self.assertEqual(service.save_suggestion("user-1", "2026-03-02", {"name": "A"}, overwrite=False)["id"], ref.id)
+        ref.created["is_worn"] = True
+        self.assertIsNone(service.save_suggestion("user-1", "2026-03-02", {"name": "B"}, overwrite=False))
+        self.assertTrue(ref.created["is_worn"])
+
+    def test_due_hour_buckets_cover_the_morning_window(self):
+        from src.jobs.daily_suggestions_job import due_hour_buckets, in_morning_window
+        from src.services.daily_suggestion_service import suggestion_due_utc_hour
+
+        zones = ["Europe/London", "America/New_York", "Asia/Tokyo", "Asia/Kolkata", "Asia/Kathmandu", "Pacific/Auckland"]
+        for hour in range(48):
+            for minute in (0, 45):
+                now = datetime(2026, 3, 1, tzinfo=timezone.utc) + timedelta(hours=hour, minutes=minute)
+                for zone in zones + [None]:
+                    location = {"timezone": zone} if zone else {}
+                    if in_morning_window(location, now):
+                        self.assertIn(suggestion_due_utc_hour(location, now), due_hour_buckets(now), (zone, now))
+
+        self.assertEqual(suggestion_due_utc_hour({"timezone": "America/New_York"}, self.NOW), 10)
+        self.assertEqual(len(due_hour_buckets(self.NOW)), 7)
+
+    def test_dry_run_generates_without_writing(self):
+        suggestions = self.FakeSuggestions()
+
+        stats, _, _ = self.run_job(suggestions, dry_run=True)
+
+        self.assertEqual(suggestions.saved, {})
+        self.assertEqual(stats["generated"], 4)
+
+    def test_suggestion_date_follows_the_users_timezone(self):
+        from src.services.daily_suggestion_service import suggestion_date, suggestion_doc_id
+
+        late_evening_utc = datetime(2026, 3, 2, 22, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(suggestion_date({"timezone": "Asia/Tokyo"}, late_evening_utc), "2026-03-03")
+        self.assertEqual(suggestion_date(None, late_evening_utc), "2026-03-02")
+        self.assertEqual(suggestion_doc_id("user-1", "2026-03-03"), "user-1_2026-03-03")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""Tests for the diversity filter's per-user history index."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.services.diversity_filter_service import DiversityFilterService
+import src.services.diversity_filter_service as diversity_filter_module
+
+
+class DiversityHistoryIndexTests(unittest.TestCase):
+    def _item(self, item_id, item_type="shirt", color="navy", style=None):
+        return SimpleNamespace(id=item_id, name=item_id, type=item_type, color=color, style=style or ["classic"])
+
+    def test_incremental_index_matches_a_rebuilt_index(self):
+        service = DiversityFilterService()
+        service.max_recent_outfits = 3
+        shirt, pants, shoes = self._item("shirt-1"), self._item("pants-1", "pants", "gray"), self._item("shoes-1", "shoes")
+        wardrobe = [shirt, pants, shoes, self._item("jacket-1", "jacket", "black", ["street"])]
+
+        with patch.object(diversity_filter_module, "FIREBASE_AVAILABLE", False):
+            service.outfit_history["user-1"] = [{"items": [{"id": "old"}]} for _ in range(5)]
+            service.apply_diversity_boost(wardrobe, "user-1", "work", "classic", "calm")
+            for items in ([shirt, pants], [shirt, shoes], [shirt, pants, shoes], [pants]):
+                service.record_outfit_generation("user-1", {"occasion": "work", "style": "classic"}, items)
+
+            incremental = service.apply_diversity_boost(wardrobe, "user-1", "work", "classic", "calm")
+            service.history_index.clear()
+            rebuilt = service.apply_diversity_boost(wardrobe, "user-1", "work", "classic", "calm")
+
+        combo = service.get_history_index("user-1").comparison_index("Work", "Classic")
+        self.assertEqual(len(service.outfit_history["user-1"]), 3)
+        self.assertEqual(combo.usage_counts["shirt-1"], 2)
+        self.assertEqual(combo.usage_counts["pants-1"], 2)
+        for (_, incremental_score), (_, rebuilt_score) in zip(incremental, rebuilt):
+            self.assertAlmostEqual(incremental_score, rebuilt_score)
+
+
+if __name__ == "__main__":
+    unittest.main()
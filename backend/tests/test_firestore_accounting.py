@@ -0,0 +1,121 @@
+"""Tests for per-request Firestore read/write accounting."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from src.core.firestore_accounting import (
+    AccountedClient,
+    FirestoreBudgetExceeded,
+    FirestoreRouteStats,
+    firestore_usage,
+)
+
+
+class FakeFirestoreDocument:
+    def __init__(self, collection, doc_id, data=None):
+        self.collection_name, self.id, self.data = collection, doc_id, data or {}
+        self.writes = []
+
+    def get(self, transaction=None):
+        return SimpleNamespace(id=self.id, exists=True, to_dict=lambda: dict(self.data), reference=self)
+
+    def update(self, data):
+        self.writes.append(data)
+
+
+class FakeFirestoreQuery:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def where(self, *args, **kwargs):
+        return FakeFirestoreQuery(self.documents[:2])
+
+    def stream(self):
+        return iter(document.get() for document in self.documents)
+
+    def count(self, alias=None):
+        return SimpleNamespace(get=lambda: [[SimpleNamespace(value=len(self.documents))]])
+
+
+class FakeFirestoreClient:
+    def __init__(self, documents):
+        self.documents = documents
+        self.committed = []
+
+    def collection(self, name):
+        query = FakeFirestoreQuery(self.documents)
+        query.document = lambda doc_id: next(document for document in self.documents if document.id == doc_id)
+        return query
+
+    def batch(self):
+        operations = []
+
+        def stage(reference, data, merge=False):
+            assert isinstance(reference, FakeFirestoreDocument)
+            operations.append(data)
+
+        return SimpleNamespace(set=stage, commit=lambda: self.committed.extend(operations))
+
+
+class FirestoreAccountingTests(unittest.TestCase):
+    def make_client(self):
+        return AccountedClient(FakeFirestoreClient([FakeFirestoreDocument("wardrobe", f"item-{index}") for index in range(3)]))
+
+    def test_counts_reads_writes_and_queries_per_collection(self):
+        client = self.make_client()
+        with firestore_usage() as usage:
+            snapshots = list(client.collection("wardrobe").where("userId", "==", "user-1").stream())
+            snapshots[0].reference.update({"wearCount": 1})
+            client.collection("wardrobe").document("item-2").get()
+            client.collection("wardrobe").count().get()
+            batch = client.batch()
+            batch.set(snapshots[1].reference, {"tags": []}, merge=True)
+            batch.commit()
+
+        self.assertEqual((usage.reads, usage.writes, usage.queries), (4, 2, 2))
+        self.assertEqual(usage.to_dict()["collections"], {"wardrobe": {"reads": 4, "writes": 2}})
+        self.assertEqual(client._wrapped.committed, [{"tags": []}])
+
+    def test_budget_violations_fail_blocks_and_routes(self):
+        client = self.make_client()
+        with self.assertRaises(FirestoreBudgetExceeded):
+            with firestore_usage(max_reads=2):
+                list(client.collection("wardrobe").stream())
+
+        route_stats = FirestoreRouteStats(read_budgets={"GET /items": 2}, raise_on_budget=True)
+        with firestore_usage() as usage:
+            list(client.collection("wardrobe").stream())
+        with self.assertRaises(FirestoreBudgetExceeded):
+            route_stats.record("GET /items", usage)
+        self.assertEqual(route_stats.get_stats()["GET /items"]["over_budget"], 1)
+
+    def test_middleware_returns_debug_headers_and_aggregates_by_route(self):
+        import httpx
+        from fastapi import FastAPI
+        from src.core.firestore_accounting import firestore_route_stats
+        from src.core.middleware import FirestoreAccountingMiddleware
+
+        client = self.make_client()
+        app = FastAPI()
+        app.add_middleware(FirestoreAccountingMiddleware, debug_headers=True)
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: str):
+            client.collection("wardrobe").document(item_id).get()
+            return {"ok": True}
+
+        firestore_route_stats.reset()
+
+        async def request():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+                return await http.get("/items/item-1")
+
+        response = asyncio.run(request())
+
+        self.assertEqual(response.headers["X-Firestore-Reads"], "1")
+        self.assertEqual(firestore_route_stats.get_stats()["GET /items/{item_id}"]["reads"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
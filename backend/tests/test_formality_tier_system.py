@@ -0,0 +1,166 @@
+"""Tests for precomputed formality tier membership."""
+
+import logging
+import unittest
+from types import SimpleNamespace
+
+from src.services.filters.formality_tier_system import FormalityTier, FormalityTierSystem, TierIndex
+
+from reference_formality_tier_system import ReferenceFormalityTierSystem
+
+
+class TierIndexEquivalenceTests(unittest.TestCase):
+    NAME_WORDS = [
+        "blazer", "suit", "jacket", "dress", "shirt", "pencil", "skirt", "oxford", "shoes", "loafers", "chinos",
+        "dark", "jeans", "polo", "sweater", "cashmere", "henley", "t-shirt", "tee", "graphic", "hoodie", "joggers",
+        "sneakers", "white", "leather", "wool", "coat", "trench", "midi", "wrap", "sport", "running", "ripped",
+        "crew", "neck", "flats", "bomber", "cardigan", "slides", "pumps", "Navy", "Linen",
+    ]
+    TYPES = ["shirt", "pants", "shoes", "dress", "jacket", "outerwear", "skirt", "sweater", "t-shirt", "sneakers"]
+    FORMAL_LEVELS = ["Formal", "business", "smart casual", "Business Casual", "casual", "creative", "athletic", None]
+    OCCASIONS = ["business", "Formal", "interview", "work", "casual", "party", "Date", "dinner"]
+
+    @staticmethod
+    def safe_get(item, attr, default=None):
+        if hasattr(item, attr):
+            return getattr(item, attr)
+        if isinstance(item, dict):
+            return item.get(attr, default)
+        return default
+
+    def random_item(self, rng, index):
+        fields = {
+            "id": f"item-{index}",
+            "name": " ".join(rng.sample(self.NAME_WORDS, rng.randint(1, 4))),
+            "type": rng.choice(self.TYPES),
+            "occasion": rng.sample(self.OCCASIONS, rng.randint(0, 3)),
+        }
+        if rng.random() < 0.6:
+            fields["metadata"] = {"visualAttributes": {"formalLevel": rng.choice(self.FORMAL_LEVELS)}}
+        return fields if rng.random() < 0.2 else SimpleNamespace(**fields)
+
+    @staticmethod
+    def as_attributes(item):
+        # The reference read metadata only through attribute access, so dict
+        # items' formalLevel was ignored; the one intended difference (see
+        # test_dict_items_honor_metadata_formal_level). Compare against dicts
+        # presented as objects.
+        return SimpleNamespace(**item) if isinstance(item, dict) else item
+
+    def ids(self, items):
+        return [self.safe_get(item, "id") for item in items]
+
+    def test_tier_buckets_match_reference_progressive_filter(self):
+        import random
+        from src.services.filters.formality_tier_system import OCCASION_TIER_CONFIGS
+        from src.utils.semantic_compatibility import OCCASION_FALLBACKS
+
+        system = FormalityTierSystem()
+        reference = ReferenceFormalityTierSystem()
+        rng = random.Random(20240702)
+        occasions = sorted(OCCASION_TIER_CONFIGS)
+        logging.disable(logging.CRITICAL)
+        try:
+            for _ in range(300):
+                wardrobe = [self.random_item(rng, index) for index in range(rng.randint(0, 25))]
+                occasion = rng.choice(occasions)
+                style = rng.choice(["", "casual", "creative", "elegant", "business casual"])
+                recent = {f"item-{index}" for index in rng.sample(range(25), rng.randint(0, 10))}
+                fallbacks = rng.choice([None, OCCASION_FALLBACKS])
+                reference_wardrobe = [self.as_attributes(item) for item in wardrobe]
+
+                filtered, tier = system.apply_progressive_filter(wardrobe, occasion, style, recent, self.safe_get, fallbacks)
+                expected, expected_tier = reference.apply_progressive_filter(
+                    reference_wardrobe, occasion, style, recent, self.safe_get, fallbacks
+                )
+
+                self.assertEqual(tier, expected_tier, (occasion, style))
+                self.assertEqual(self.ids(filtered), self.ids(expected), (occasion, style))
+                for tier in FormalityTier:
+                    self.assertEqual(
+                        self.ids(system._filter_by_tier(wardrobe, tier, self.safe_get, occasion, fallbacks)),
+                        self.ids(reference._filter_by_tier(reference_wardrobe, tier, self.safe_get, occasion, fallbacks)),
+                    )
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_dict_items_honor_metadata_formal_level(self):
+        item = {"id": "1", "name": "Plain scarf", "type": "accessory",
+                "metadata": {"visualAttributes": {"formalLevel": "Formal"}}}
+
+        new_tier = FormalityTierSystem()._filter_by_tier([item], FormalityTier.TIER_1_STRICT_FORMAL, self.safe_get)
+        old_tier = ReferenceFormalityTierSystem()._filter_by_tier([item], FormalityTier.TIER_1_STRICT_FORMAL, self.safe_get)
+
+        self.assertEqual((new_tier, old_tier), ([item], []))
+
+    def test_stats_count_tiers_blocked_and_unclassified_items(self):
+        wardrobe = [
+            {"id": "1", "name": "Navy blazer", "type": "jacket"},
+            {"id": "2", "name": "Graphic tee", "type": "t-shirt"},
+            {"id": "3", "name": "Plain scarf", "type": "accessory"},
+            {"id": "4", "name": "Dark chinos", "type": "pants", "metadata": {"visualAttributes": {"formalLevel": "Business"}}},
+        ]
+
+        stats = TierIndex(wardrobe, self.safe_get).stats()
+
+        self.assertEqual((stats["total_items"], stats["blocked"], stats["unclassified"]), (4, 1, 1))
+        self.assertEqual(stats["tiers"], {"strict_formal": 2, "smart_casual": 2, "creative_casual": 0})
+
+    def test_non_string_occasions_are_skipped(self):
+        from src.services.filters.formality_tier_system import tier_profile
+
+        item = {"id": "1", "name": "Navy blazer", "type": "jacket", "occasion": ["Business", None, 3, {"name": "x"}]}
+
+        self.assertEqual(tier_profile(item, self.safe_get).occasions, ("business",))
+
+
+
+class TierIndexCacheTests(unittest.TestCase):
+    def setUp(self):
+        from src.services.filters.formality_tier_system import TIER_INDEXES
+
+        TIER_INDEXES.clear()
+        self.addCleanup(TIER_INDEXES.clear)
+
+    @staticmethod
+    def wardrobe():
+        return [
+            SimpleNamespace(id="1", name="Navy blazer", type="jacket", occasion=["business"]),
+            SimpleNamespace(id="2", name="Dress pants", type="pants", occasion=["business"]),
+            SimpleNamespace(id="3", name="Oxford shoes", type="shoes", occasion=["business"]),
+            SimpleNamespace(id="4", name="Graphic tee", type="t-shirt", occasion=["casual"]),
+        ]
+
+    def filter(self, wardrobe, version):
+        return FormalityTierSystem().apply_progressive_filter(
+            wardrobe, "business", "", set(), TierIndexEquivalenceTests.safe_get,
+            user_id="user-1", wardrobe_version=version,
+        )
+
+    def test_same_wardrobe_version_reuses_the_tier_index(self):
+        from unittest import mock
+        from src.services.filters import formality_tier_system
+
+        with mock.patch.object(formality_tier_system, "tier_profile", wraps=formality_tier_system.tier_profile) as profile:
+            self.filter(self.wardrobe(), 3)
+            wardrobe = self.wardrobe()
+            filtered, tier = self.filter(wardrobe, 3)
+            self.assertEqual(profile.call_count, 4)
+
+            self.assertEqual(tier, FormalityTier.TIER_1_STRICT_FORMAL)
+            self.assertEqual([id(item) for item in filtered], [id(item) for item in wardrobe[:3]])
+
+            self.filter(self.wardrobe(), 4)
+            self.filter(self.wardrobe()[:3], 4)
+            self.assertEqual(profile.call_count, 4 + 4 + 3)
+
+    def test_unknown_version_is_not_cached(self):
+        from src.services.filters.formality_tier_system import TIER_INDEXES
+
+        self.filter(self.wardrobe(), None)
+
+        self.assertIsNone(TIER_INDEXES.get("user-1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Tests for the per-request XP ledger."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.services.gamification_service import GamificationService, XPLedger
+
+from firestore_fakes import FakeUserRef
+
+
+class XPLedgerTests(unittest.TestCase):
+    def make_service(self, user_data):
+        service = GamificationService()
+        user_ref = FakeUserRef(user_data)
+        service.db = SimpleNamespace(collection=lambda name: SimpleNamespace(document=lambda user_id: user_ref))
+        return service
+
+    def test_awards_in_one_request_are_committed_once(self):
+        service = self.make_service({"xp": 95, "badges": ["starter_closet"]})
+        commits = []
+
+        async def run():
+            async with service.xp_ledger("user-1") as ledger:
+                first = await service.award_xp("user-1", 10, "outfit_logged")
+                async with service.xp_ledger("user-1") as nested:
+                    self.assertIs(nested, ledger)
+                    second = await service.award_xp("user-1", 20, "challenge")
+                repeat_badge = await service.unlock_badge("user-1", "starter_closet")
+                new_badge = await service.unlock_badge("user-1", "closet_cataloger")
+                await service.log_gamification_event("user-1", "challenge_completed", xp_amount=20)
+            return ledger, first, second, repeat_badge, new_badge
+
+        with patch.object(XPLedger, "commit", autospec=True, side_effect=lambda ledger: commits.append(ledger)):
+            ledger, first, second, repeat_badge, new_badge = asyncio.run(run())
+
+        self.assertEqual(len(commits), 1)
+        self.assertEqual((first["new_xp"], second["new_xp"]), (105, 125))
+        self.assertEqual(ledger.pending_xp, 30)
+        self.assertEqual(ledger.badges, ["closet_cataloger"])
+        self.assertEqual([event["event_type"] for event in ledger.events], ["challenge_completed"])
+        self.assertTrue(repeat_badge["already_unlocked"])
+        self.assertTrue(new_badge["success"])
+
+    def committing_service(self, user_data, fail=False):
+        service = self.make_service(user_data)
+        user_ref = service.db.collection("users").document("user-1")
+        reads = []
+        get = user_ref.get
+        user_ref.get = lambda transaction=None: (reads.append(transaction), get(transaction))[1]
+
+        def update(ref, data):
+            if fail:
+                raise RuntimeError("contention")
+            ref.update(data)
+
+        service.db.collection = lambda name: SimpleNamespace(document=lambda doc_id=None: user_ref)
+        service.db.transaction = lambda: SimpleNamespace(update=update)
+        service.db.batch = lambda: SimpleNamespace(set=lambda ref, data: None, commit=lambda: None)
+        return service, reads
+
+    def test_standalone_award_reads_the_user_once(self):
+        service, reads = self.committing_service({"xp": 95})
+
+        with patch("firebase_admin.firestore.transactional", lambda func: func):
+            result = asyncio.run(service.award_xp("user-1", 10, "outfit_logged"))
+
+        self.assertEqual(len(reads), 1)
+        self.assertEqual((result["xp_awarded"], result["new_xp"]), (10, 105))
+
+    def test_standalone_badge_unlock_reports_a_failed_commit(self):
+        service, _ = self.committing_service({"xp": 0, "badges": []}, fail=True)
+
+        with patch("firebase_admin.firestore.transactional", lambda func: func):
+            result = asyncio.run(service.unlock_badge("user-1", "closet_cataloger"))
+
+        self.assertFalse(result["success"])
+        self.assertNotIn("already_unlocked", result)
+        self.assertEqual(result["error"], "contention")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Tests for compiled keyword rules and the style and tier tables built on them."""
+
+import unittest
+
+from src.routes.outfits.styling import calculate_style_appropriateness_score, filter_items_by_style
+from src.services.filters.formality_tier_system import FormalityTier, FormalityTierSystem, classify_tiers
+from src.utils.keyword_rules import KeywordRules, contains_keyword
+
+
+class KeywordRulesTests(unittest.TestCase):
+    def test_matches_on_word_boundaries_with_simple_inflections(self):
+        rules = KeywordRules({"colors": ["tan", "red"], "sport": ["sport", "loafer"]})
+
+        self.assertEqual(dict(rules.match("Tank top, tailored")), {})
+        self.assertEqual(dict(rules.match("red sporty loafers")), {"colors": 1, "sport": 2})
+        self.assertTrue(contains_keyword("dark gray", ("grey", "gray")))
+        self.assertFalse(contains_keyword("grayscale", ("gray",)))
+
+    def test_overlapping_keywords_are_all_reported(self):
+        rules = KeywordRules({"knit": ["cable knit", "cable", "knit"], "color": ["navy"]})
+
+        self.assertEqual(rules.keywords("Cable Knit sweater"), frozenset({"cable knit", "cable", "knit"}))
+        self.assertEqual(rules.count("cable knit navy sweater", "knit"), 3)
+        self.assertEqual(rules.matched_keywords("cable knit", "knit"), ["cable knit", "cable", "knit"])
+
+    def test_compound_and_inflected_variants_count_as_their_keyword(self):
+        rules = KeywordRules({"comfort": ["sweat", "lounge"], "shape": ["crop", "tie"], "item": ["sweatshirt"]})
+
+        self.assertEqual(rules.matched_keywords("Gray sweatshirts", "comfort"), ["sweat"])
+        self.assertEqual(rules.keywords("gray sweatshirt"), frozenset({"sweat", "sweatshirt"}))
+        self.assertTrue(rules.matches("Loungewear set", "comfort"))
+        self.assertEqual(rules.matched_keywords("cropped tie-front tied cardigan", "shape"), ["crop", "tie"])
+        self.assertFalse(rules.matches("Croquet sweatertrack", "shape"))
+        self.assertTrue(contains_keyword("wrapped midi", ("wrap",)))
+
+    def test_style_and_tier_rules_keep_compound_items(self):
+        kept = filter_items_by_style(
+            [{"name": "Loungewear set", "type": "set"}, {"name": "Gray sweatsuit", "type": "set"}, {"name": "Wool blazer", "type": "blazer"}],
+            "athleisure",
+        )
+        self.assertEqual([item["name"] for item in kept], ["Gray sweatsuit"])
+
+        kept = filter_items_by_style([{"name": "Tied waist joggers", "type": "pants"}], "athleisure")
+        self.assertEqual(kept, [])
+
+        self.assertEqual(classify_tiers("Woolen trousers", "pants", ""), (None, frozenset({FormalityTier.TIER_1_STRICT_FORMAL})))
+        self.assertIn(FormalityTier.TIER_2_SMART_CASUAL, classify_tiers("Knitted cardigan", "sweater", "")[1])
+        self.assertNotEqual(classify_tiers("Camel trenchcoat", "outerwear", "")[1], frozenset())
+
+    def test_style_filter_and_scoring_use_compiled_rules(self):
+        items = [
+            {"name": "Gym tank", "type": "top"},
+            {"name": "Tweed blazer", "type": "blazer"},
+            {"name": "Plain tee", "type": "t-shirt"},
+        ]
+
+        kept = filter_items_by_style(items, "Dark Academia")
+
+        self.assertEqual([item["name"] for item in kept], ["Tweed blazer", "Plain tee"])
+        # No hipster keywords -> neutral 5; classic: tailored (+30) + blazer (+15)
+        self.assertEqual(calculate_style_appropriateness_score("hipster", {"name": "Tweed blazer", "type": "blazer"}), 5)
+        self.assertEqual(calculate_style_appropriateness_score("classic", {"name": "Tailored blazer", "type": "blazer"}), 45)
+
+    def test_tier_filter_matches_words_in_any_order_and_respects_boundaries(self):
+        system = FormalityTierSystem()
+        wardrobe = [
+            {"id": "shirt", "name": "Shirt dress blue", "type": "shirt"},
+            {"id": "tee", "name": "Crew t-shirt", "type": "shirt"},
+            {"id": "trousers", "name": "Wool trousers", "type": "pants"},
+        ]
+
+        filtered = system._filter_by_tier(
+            wardrobe,
+            FormalityTier.TIER_1_STRICT_FORMAL,
+            lambda item, key, default=None: item.get(key, default),
+        )
+
+        self.assertEqual([item["id"] for item in filtered], ["shirt", "trousers"])
+
+
+if __name__ == "__main__":
+    unittest.main()
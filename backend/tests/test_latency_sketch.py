@@ -0,0 +1,38 @@
+"""Tests for windowed latency sketches."""
+
+import unittest
+
+from src.core.latency_sketch import LatencyHistogram, WindowedLatencySketch
+
+
+class LatencySketchTests(unittest.TestCase):
+    def test_quantiles_match_sorted_durations_within_one_percent(self):
+        durations = [((i * 7919) % 1000) * 3.7 + 0.5 for i in range(5000)]
+        histogram = LatencyHistogram()
+        for duration in durations:
+            histogram.record(duration)
+
+        ordered = sorted(durations)
+        for percentile, estimate in zip([50, 95, 99, 100], histogram.quantiles([50, 95, 99, 100])):
+            exact = ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+            self.assertAlmostEqual(estimate, exact, delta=exact * 0.01)
+        self.assertIsNone(LatencyHistogram().quantile(95))
+
+    def test_windows_merge_minute_buckets_and_expire_old_ones(self):
+        sketch = WindowedLatencySketch(window_minutes=10)
+        start = 1_700_000_040.0
+        for minute, duration in enumerate([100, 200, 300, 400]):
+            sketch.record(duration, now=start + minute * 60)
+        now = start + 3 * 60
+
+        self.assertEqual(sketch.merged(1, now).count, 1)
+        self.assertEqual(sketch.merged(60, now).count, 4)
+        self.assertAlmostEqual(sketch.quantiles([50], 2, now)[0], 400, delta=4)
+        # Slot 0 is reused ten minutes later and the old minute disappears
+        sketch.record(50, now=start + 10 * 60)
+        self.assertEqual(sketch.merged(10, start + 10 * 60).count, 4)
+        self.assertEqual(len(sketch._slots), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for log governance and the async log handler."""
+
+import ast
+import json
+import logging
+import queue
+import os
+import unittest
+
+from src.core.logging import AsyncLogHandler, JSONFormatter, LogGovernor, RequestLogStats, request_id_var, request_log_stats_var
+
+
+class LogGovernorTests(unittest.TestCase):
+    def _record(self, name="hot.path", level=logging.INFO, msg="scored %s", args=("item",)):
+        return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+    def test_token_bucket_limits_per_logger_and_reports_suppressed(self):
+        now = [0.0]
+        governor = LogGovernor(rate_per_second=2, burst=2, clock=lambda: now[0])
+
+        allowed = [governor.filter(self._record()) for _ in range(3)]
+        self.assertEqual(allowed, [True, True, False])
+        self.assertTrue(governor.filter(self._record(name="other.logger")))
+
+        now[0] = 1.0
+        record = self._record()
+        self.assertTrue(governor.filter(record))
+        self.assertEqual(record.suppressed, 1)
+        self.assertEqual(governor.get_stats()["rate_limited"], 1)
+
+    def test_sampling_applies_below_warning_and_errors_are_exempt(self):
+        governor = LogGovernor(rate_per_second=1, burst=1, rate_overrides={"hot": 1000}, sample_rates={"hot": 0.25})
+
+        kept = sum(governor.filter(self._record(name="hot.loop")) for _ in range(8))
+        warnings = sum(governor.filter(self._record(name="hot.loop", level=logging.WARNING)) for _ in range(4))
+        self.assertEqual(kept, 2)
+        self.assertEqual(warnings, 4)
+
+        governor.filter(self._record(name="quiet"))
+        self.assertFalse(governor.filter(self._record(name="quiet", level=logging.WARNING)))
+        self.assertTrue(governor.filter(self._record(name="quiet", level=logging.ERROR)))
+
+    def test_request_stats_count_records_and_written_bytes(self):
+        governor = LogGovernor()
+        stats = RequestLogStats()
+        token = request_log_stats_var.set(stats)
+        try:
+            record = self._record()
+            governor.filter(record)
+        finally:
+            request_log_stats_var.reset(token)
+
+        output = JSONFormatter(count_bytes=True).format(record)
+        JSONFormatter().format(record)
+        self.assertEqual(stats.count, 1)
+        self.assertEqual(stats.bytes, len(output) + 1)
+
+        governor.record_request("/api/outfits/generate", stats)
+        self.assertEqual(governor.get_stats()["requests"]["max_records"], 1)
+
+    def test_async_handler_defers_formatting_and_drops_when_full(self):
+        handler = AsyncLogHandler(queue.Queue(maxsize=1))
+        token = request_id_var.set("req-1")
+        try:
+            handler.handle(self._record())
+            handler.handle(self._record())
+        finally:
+            request_id_var.reset(token)
+
+        queued = handler.queue.get_nowait()
+        self.assertEqual((queued.msg, queued.args, queued.request_id), ("scored %s", ("item",), "req-1"))
+        self.assertEqual(handler.dropped, 1)
+        self.assertEqual(json.loads(JSONFormatter().format(queued))["request_id"], "req-1")
+
+    def test_generation_hot_paths_use_lazy_log_formatting(self):
+        hot_paths = {
+            "src/services/robust_outfit_generation_service.py": {"_generate_outfit_internal", "_cohesive_composition_with_scores"},
+            "src/services/diversity_filter_service.py": {"apply_diversity_boost"},
+            "src/routes/outfits/database.py": {"get_user_outfits"},
+        }
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for path, functions in hot_paths.items():
+            with open(os.path.join(backend_dir, path), encoding="utf-8") as source:
+                tree = ast.parse(source.read())
+            for function in ast.walk(tree):
+                if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)) or function.name not in functions:
+                    continue
+                for node in ast.walk(function):
+                    if (
+                        isinstance(node, ast.Call)
+                        and isinstance(node.func, ast.Attribute)
+                        and node.func.attr in {"debug", "info", "warning", "error"}
+                        and node.args
+                    ):
+                        self.assertNotIsInstance(node.args[0], ast.JoinedStr, f"{path}:{node.lineno}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Tests for the declarative occasion hard filters."""
+
+import logging
+import unittest
+from types import SimpleNamespace
+
+from src.services.filters.hard_filter_rules import hard_filter_rule_hits
+from src.services.filters.occasion_filters import OccasionFilters
+
+from reference_occasion_filters import ReferenceOccasionFilters
+
+
+class HardFilterRuleEquivalenceTests(unittest.TestCase):
+    NAME_WORDS = [
+        "jogger", "sweat pants", "track pants", "leggings", "yoga pants", "pants", "trouser", "chinos", "jeans",
+        "slacks", "short", "sweater", "cardigan", "cable-knit", "dress shirt", "button-down", "polo", "henley",
+        "athletic", "gym", "performance", "oxford", "loafer", "dress", "heels", "slides", "sandal", "sneaker",
+        "running", "trainer", "suit", "blazer", "tie", "belt", "watch", "ring", "chain", "hoodie", "sweatshirt",
+        "tank top", "crop top", "jersey", "drawstring", "elastic waist", "lounge", "pj", "wide leg", "denim",
+        "khaki", "crocs", "graphic tee", "pajama", "sleepwear", "bikini", "swimwear", "cargo short", "navy",
+        "linen", "relaxed fit", "string", "Cotton", "T-Shirt",
+    ]
+    TYPES = [
+        "pants", "jeans", "trousers", "bottoms", "shorts", "shirt", "top", "sweater", "hoodie", "jacket",
+        "outerwear", "t-shirt", "polo", "blouse", "shoes", "boots", "footwear", "dress_shoes", "sneakers",
+        "leggings", "chinos", "tuxedo", "evening_gown", "sweatshirt", "gym wear", "accessory", "belt", "dress",
+    ]
+    META = {
+        "waistbandType": ["button_zip", "belt_loops", "elastic", "drawstring", "elastic_drawstring", "none"],
+        "material": ["denim", "wool", "cotton twill", "polyester", "mesh", "Nylon", "cotton"],
+        "formalLevel": ["Formal", "business", "dress", "professional", "athletic", "sport", "casual", "smart casual"],
+        "neckline": ["crew", "button-down collar", "polo", "v-neck"],
+    }
+    OCCASIONS = [
+        "Gym", "athletic", "workout", "formal", "black-tie", "Gala", "loungewear", "home", "sleep", "relax",
+        "party", "date", "night out", "club", "dinner", "business", "interview", "work", "casual", "brunch",
+    ]
+    STYLES = [None, "", "Old Money", "urban professional", "classic", "athleisure"]
+
+    def random_item(self, rng):
+        name = " ".join(rng.sample(self.NAME_WORDS, rng.randint(0, 3)))
+        fields = {
+            "name": name,
+            "type": rng.choice(self.TYPES),
+            "occasion": rng.sample(["business", "Formal", "work", "gym", "Running", "casual", "party"], rng.randint(0, 2)),
+        }
+        if rng.random() < 0.6:
+            attrs = {key: rng.choice(values + [None]) for key, values in self.META.items() if rng.random() < 0.6}
+            fields["metadata"] = {"visualAttributes": attrs if rng.random() < 0.9 else "n/a"}
+        if rng.random() < 0.15:
+            return fields  # dict items: no attribute access beyond the name helper
+        if rng.random() < 0.5:
+            fields["type"] = SimpleNamespace(value=fields["type"].upper())
+        return SimpleNamespace(**fields)
+
+    def test_compiled_rules_match_reference_filters_on_random_wardrobes(self):
+        import random
+
+        def item_name(item):
+            return item.get("name", "Unknown") if isinstance(item, dict) else getattr(item, "name", "Unknown")
+
+        compiled = OccasionFilters(item_name, None)
+        reference = ReferenceOccasionFilters(item_name, None)
+        rng = random.Random(20240611)
+        logging.disable(logging.CRITICAL)
+        try:
+            for _ in range(300):
+                wardrobe = [self.random_item(rng) for _ in range(20)]
+                occasion, style = rng.choice(self.OCCASIONS), rng.choice(self.STYLES)
+                for item in wardrobe:
+                    context = (item, occasion, style)
+                    self.assertEqual(compiled.apply_hard_filter(*context), reference.apply_hard_filter(*context), context)
+                    for method in ("filter_gym", "filter_formal", "filter_loungewear", "filter_party_date"):
+                        self.assertEqual(getattr(compiled, method)(item, style), getattr(reference, method)(item, style), (method, item))
+                    self.assertEqual(compiled.filter_old_money_style(item), reference.filter_old_money_style(item), item)
+                    self.assertEqual(
+                        compiled._basic_hard_constraints(item, occasion.lower()),
+                        reference._basic_hard_constraints(item, occasion.lower()),
+                        context,
+                    )
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def test_rule_hits_are_counted_per_rule(self):
+        filters = OccasionFilters(lambda item: item.name, None)
+        hard_filter_rule_hits.reset()
+
+        self.assertFalse(filters.apply_hard_filter(SimpleNamespace(name="Wool trousers", type="pants"), "gym", None))
+        self.assertTrue(filters.apply_hard_filter(SimpleNamespace(name="Running sneakers", type="shoes"), "gym", None))
+
+        self.assertEqual(
+            hard_filter_rule_hits.get_stats()["gym"],
+            {"pants.generic_pants": 1, "shoes.athletic_shoe": 1},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
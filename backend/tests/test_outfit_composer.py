@@ -0,0 +1,102 @@
+"""Tests for the beam search outfit composer."""
+
+import unittest
+from types import SimpleNamespace
+
+from src.services.outfit_composer import (
+    BeamOutfitComposer,
+    Candidate,
+    CandidateIndex,
+    CategoryCache,
+    CompositionPool,
+    SlotSpec,
+)
+
+
+class BeamOutfitComposerTests(unittest.TestCase):
+    SLOTS = [SlotSpec("tops", ("tops",)), SlotSpec("bottoms", ("bottoms",)), SlotSpec("shoes", ("shoes",))]
+
+    @staticmethod
+    def build_index(rows):
+        items = {item_id: SimpleNamespace(id=item_id, category=category) for item_id, category, _ in rows}
+        return CandidateIndex(
+            [(item_id, items[item_id], score) for item_id, _, score in rows],
+            category_of=lambda item: item.category,
+        )
+
+    def test_pairwise_compatibility_beats_greedy_best_item(self):
+        index = self.build_index([
+            ("tux-top", "tops", 3.0), ("tee", "tops", 2.5),
+            ("shorts", "bottoms", 2.0), ("jeans", "bottoms", 1.0),
+            ("sneakers", "shoes", 1.0),
+        ])
+        clashes = {frozenset({"tux-top", "shorts"}): -2.0, frozenset({"tux-top", "sneakers"}): -2.0}
+        composer = BeamOutfitComposer(
+            self.SLOTS,
+            pair_score=lambda a, b: clashes.get(frozenset({a.item_id, b.item_id}), 0.0),
+        )
+
+        best = composer.compose(index)[0]
+
+        self.assertEqual(best.item_ids, ["tee", "shorts", "sneakers"])
+        self.assertAlmostEqual(best.score, 5.5)
+
+    def test_forbidden_pairs_are_pruned_and_alternatives_are_distinct(self):
+        index = self.build_index([
+            ("blazer", "tops", 3.0), ("tee", "tops", 1.0),
+            ("shorts", "bottoms", 2.0), ("chinos", "bottoms", 1.5),
+            ("loafers", "shoes", 1.0), ("boots", "shoes", 0.5),
+        ])
+        checked = []
+
+        def is_forbidden(new_item, existing):
+            checked.append((new_item.id, existing.id))
+            return {new_item.id, existing.id} == {"blazer", "shorts"}
+
+        outfits = BeamOutfitComposer(self.SLOTS, is_forbidden=is_forbidden).compose(index, top_n=4)
+
+        self.assertEqual(outfits[0].item_ids, ["blazer", "chinos", "loafers"])
+        self.assertEqual(len({frozenset(outfit.item_ids) for outfit in outfits}), 4)
+        self.assertTrue(all({"blazer", "shorts"} - set(outfit.item_ids) for outfit in outfits))
+        self.assertEqual([outfit.score for outfit in outfits], sorted((outfit.score for outfit in outfits), reverse=True))
+        self.assertEqual(len(checked), len(set(checked)))
+
+    def test_pool_hands_out_runner_ups_reranked_by_current_adjustments(self):
+        index = self.build_index([
+            ("blazer", "tops", 3.0), ("tee", "tops", 1.0),
+            ("chinos", "bottoms", 1.5), ("jeans", "bottoms", 1.0),
+            ("loafers", "shoes", 1.0),
+        ])
+        outfits = BeamOutfitComposer(self.SLOTS).compose(index, top_n=3)
+        penalties = {"blazer": -0.5}
+        pool = CompositionPool(size=3)
+        pool.add(outfits[1:], lambda item_id: penalties.get(item_id, 0.0))
+
+        # The blazer was worn by the first outfit since the search
+        penalties["blazer"] = -3.0
+        self.assertEqual(pool.take_best(lambda item_id: penalties.get(item_id, 0.0)).item_ids, ["tee", "chinos", "loafers"])
+        # Outfits with items this round no longer offers are dropped
+        self.assertIsNone(pool.take_best(lambda item_id: 0.0, is_available=lambda item_id: item_id != "jeans"))
+        self.assertEqual(len(pool), 0)
+
+    def test_pinned_item_fills_its_slot_and_unfillable_slots_are_reported(self):
+        index = self.build_index([("tee", "tops", 2.0), ("jeans", "bottoms", 1.0), ("scarf", "accessories", 0.5)])
+        base = Candidate("base-top", SimpleNamespace(id="base-top"), "tops", 0.0)
+        slots = self.SLOTS + [SlotSpec("accessory", ("accessories",), required=False, accepts=lambda candidate, chosen: candidate.score > 1.0)]
+
+        best = BeamOutfitComposer(slots).compose(index, pinned=[base])[0]
+
+        self.assertEqual(best.slots, (("tops", "base-top"), ("bottoms", "jeans")))
+        self.assertEqual(best.missing, ("shoes",))
+
+    def test_category_cache_computes_each_item_once(self):
+        calls = []
+        category_of = CategoryCache(lambda item: calls.append(item.id) or "tops")
+        item = SimpleNamespace(id="shirt-1")
+
+        self.assertEqual([category_of(item), category_of(item), category_of(SimpleNamespace(id="shirt-1"))], ["tops"] * 3)
+        self.assertEqual(calls, ["shirt-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
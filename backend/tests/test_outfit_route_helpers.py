@@ -1,5 +1,6 @@
 """Regression tests for helpers used by the production outfit generator."""
 
+import asyncio
 import io
 import time
 import unittest
@@ -17,6 +18,7 @@ from src.routes.outfit_generation_contract import (
     normalize_generation_user_profile,
 )
 from src.routes.outfits.routes import safe_get
+from src.routes.outfits.validation import filter_valid_alternatives
 from src.services.filters.formality_tier_system import FormalityTier, FormalityTierSystem
 from src.services.diversity_filter_service import DiversityFilterService
 import src.services.diversity_filter_service as diversity_filter_module
@@ -87,6 +89,50 @@ class RequiredBaseItemContractTests(unittest.TestCase):
             enforce_required_base_item([], self.wardrobe, "missing-item")
 
 
+class AlternativeValidationTests(unittest.TestCase):
+    REQUIREMENTS = {"required": ["shirt", "pants", "shoes"], "optional": [], "forbidden": []}
+
+    def outfit(self, *items, name="Alternative"):
+        return {"name": name, "items": [{"id": f"{name}-{index}", "name": item, "type": item} for index, item in enumerate(items)]}
+
+    def test_invalid_alternatives_are_dropped_and_valid_ones_annotated(self):
+        relaxed = []
+
+        def relax(items, occasion, requirements):
+            relaxed.append(len(items))
+            return list(items)
+
+        async def validate(candidate):
+            return SimpleNamespace(valid=candidate["name"] != "Rejected", errors=["clash"])
+
+        alternatives = [
+            self.outfit("shirt", "pants", "shoes", name="Complete"),
+            self.outfit("shirt", "shoes", "belt", name="NoPants"),
+            self.outfit("shirt", "pants", "shoes", name="Rejected"),
+            self.outfit("shirt", "pants", name="Short"),
+        ]
+
+        kept = asyncio.run(filter_valid_alternatives(
+            alternatives, "business", self.REQUIREMENTS,
+            lambda items, occasion: items, relax, validate=validate,
+        ))
+
+        self.assertEqual([outfit["name"] for outfit in kept], ["Complete"])
+        self.assertTrue(kept[0]["metadata"]["hard_requirements_enforced"])
+        self.assertTrue(kept[0]["metadata"]["validation_passed"])
+        self.assertEqual(relaxed, [3, 2])
+
+    def test_deduplication_runs_before_the_item_count_check(self):
+        def deduplicate(items, occasion):
+            return [item for item in items if item["type"] != "shoes"]
+
+        kept = asyncio.run(filter_valid_alternatives(
+            [self.outfit("top", "bottom", "shoes")], "casual", None, deduplicate, lambda items, *_: items,
+        ))
+
+        self.assertEqual(kept, [])
+
+
 class GenerationProfileNormalizationTests(unittest.TestCase):
     def test_normalizes_quiz_aliases_and_skin_tone_depth(self):
         normalized = normalize_generation_user_profile(
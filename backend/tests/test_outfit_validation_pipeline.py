@@ -0,0 +1,108 @@
+"""Tests for the outfit validation pipeline and orchestrator."""
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from src.services.outfit_validation_pipeline import (
+    OutfitValidationPipeline,
+    ValidationContext,
+    ValidationResult,
+    ValidationSeverity,
+    validation_memo_var,
+)
+from src.services.validation_orchestrator import ValidationOrchestrator
+
+
+class ValidationPipelineTests(unittest.TestCase):
+    class CountingValidator:
+        def __init__(self, valid=True, severity=ValidationSeverity.MEDIUM):
+            self.calls = 0
+            self.valid = valid
+            self.severity = severity
+
+        async def validate(self, outfit, context):
+            self.calls += 1
+            errors = [] if self.valid else [f"failed {id(self)}"]
+            return ValidationResult(valid=self.valid, errors=errors, warnings=[], severity=self.severity)
+
+    def make_pipeline(self, *validators):
+        pipeline = OutfitValidationPipeline()
+        pipeline.validators = list(validators)
+        return pipeline
+
+    def context(self):
+        return ValidationContext(
+            occasion="work", style="classic", mood="calm", weather={"condition": "clear"},
+            user_profile={"id": "user-1"}, temperature=70.0,
+        )
+
+    def test_failing_outfit_runs_each_validator_once_and_reuses_results_for_analytics(self):
+        from src.services.validation_analytics_service import validation_analytics
+
+        class PassingValidator(self.CountingValidator):
+            pass
+
+        passing, failing = PassingValidator(), self.CountingValidator(valid=False)
+        pipeline = self.make_pipeline(passing, failing)
+        logged = []
+
+        async def log_failure(**kwargs):
+            logged.append(kwargs["validator_name"])
+
+        async def run():
+            outfit = {"items": [{"id": "a"}, {"id": "b"}]}
+            first = await pipeline.validate_outfit(outfit, self.context())
+            second = await pipeline.validate_outfit(outfit, self.context())
+            return first, second
+
+        with patch.object(validation_analytics, "log_validation_failure", log_failure):
+            first, second = asyncio.run(run())
+
+        self.assertFalse(first.valid)
+        self.assertEqual(second.errors, first.errors)
+        self.assertEqual((passing.calls, failing.calls), (1, 1))
+        self.assertEqual(logged, ["CountingValidator", "CountingValidator"])
+        self.assertEqual(set(first.timings_ms), {"PassingValidator", "CountingValidator"})
+        self.assertEqual(second.timings_ms["CountingValidator"], 0.0)
+        self.assertEqual(pipeline.get_validation_stats()["validator_timings"]["CountingValidator"]["calls"], 1)
+
+    def test_memo_is_scoped_to_the_request_task(self):
+        validator = self.CountingValidator()
+        pipeline = self.make_pipeline(validator)
+        outfit = {"items": [{"id": "a"}]}
+
+        asyncio.run(pipeline.validate_outfit(outfit, self.context()))
+        asyncio.run(pipeline.validate_outfit(outfit, self.context()))
+
+        self.assertEqual(validator.calls, 2)
+        self.assertIsNone(validation_memo_var.get())
+
+    def test_stop_on_critical_skips_remaining_validators(self):
+        critical = self.CountingValidator(valid=False, severity=ValidationSeverity.CRITICAL)
+        later = self.CountingValidator()
+        pipeline = self.make_pipeline(critical, later)
+        pipeline.analytics_enabled = False
+
+        result = asyncio.run(pipeline.validate_outfit({"items": []}, self.context(), stop_on_critical=True))
+
+        self.assertFalse(result.valid)
+        self.assertEqual((critical.calls, later.calls), (1, 0))
+
+    def test_orchestrator_runs_all_steps_together(self):
+        from src.custom_types.wardrobe import ClothingItem
+
+        items = [
+            ClothingItem(id="top", name="Shirt", type="shirt", color="white", season=["all"]),
+            ClothingItem(id="bottom", name="Pants", type="pants", color="navy", season=["all"]),
+            ClothingItem(id="shoes", name="Loafers", type="shoes", color="brown", season=["all"]),
+        ]
+
+        result = asyncio.run(ValidationOrchestrator(None).run_validation_pipeline(items, {"occasion": "business"}))
+
+        self.assertEqual(result["steps_executed"], 9)
+        self.assertIn("wall_duration", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Tests for the sliding-window rate limiter."""
+
+import os
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.middleware.rate_limiter import MemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend
+
+
+try:
+    import fakeredis
+except ImportError:  # Optional: only needed for the Redis backend test
+    fakeredis = None
+
+
+class SlidingWindowRateLimitTests(unittest.TestCase):
+    def _exercise(self, backend):
+        results = [backend.hit("user:1:default", 3, 60, 6000.0 + offset)["allowed"] for offset in (0, 1, 2, 3)]
+        # Halfway through the next window, half of the previous window's hits still count
+        halfway = [backend.hit("user:1:default", 3, 60, 6090.0)["allowed"] for _ in range(3)]
+        return results, halfway
+
+    def test_memory_backend_allows_limit_then_slides(self):
+        results, halfway = self._exercise(MemoryRateLimitBackend())
+
+        self.assertEqual(results, [True, True, True, False])
+        self.assertEqual(halfway, [True, True, False])
+
+    @unittest.skipIf(fakeredis is None, "fakeredis[lua] not installed")
+    def test_redis_lua_backend_matches_memory_backend(self):
+        backend = RedisRateLimitBackend(fakeredis.FakeRedis())
+
+        self.assertEqual(self._exercise(backend), self._exercise(MemoryRateLimitBackend()))
+
+    def test_endpoint_classes_are_resolved_from_registered_routes(self):
+        from fastapi import FastAPI
+
+        app = FastAPI()
+        for path in ("/api/outfits/generate", "/api/outfits/{outfit_id}/worn", "/api/outfit-history/today-suggestion",
+                     "/api/monitoring/stats/auth", "/api/feedback/submit", "/api/auth/login"):
+            app.add_api_route(path, lambda: None, methods=["POST"])
+        limiter = RateLimiter()
+        limiter.register_routes(app)
+        # Middleware runs before routing, so there is no scope["route"] to read
+        request = SimpleNamespace(url=SimpleNamespace(path="/api/outfits/generate"), scope={})
+
+        self.assertEqual(limiter.get_endpoint_class(request), "outfit_generation")
+        self.assertEqual(limiter.get_endpoint_class("/api/outfits/outfit-1/worn"), "default")
+        self.assertEqual(limiter.get_endpoint_class("/api/outfit-history/today-suggestion"), "default")
+        self.assertEqual(limiter.get_endpoint_class("/api/monitoring/stats/auth"), "default")
+        self.assertEqual(limiter.get_endpoint_class("/api/auth/login"), "auth")
+        self.assertEqual(limiter.get_limit_for_endpoint("/api/not-mounted"), 60)
+        self.assertEqual(limiter.get_limit_for_endpoint("/api/feedback/submit"), 50)
+        self.assertTrue(limiter.is_exempt("/health/live"))
+
+    def test_rejected_tokens_are_not_reverified(self):
+        limiter = RateLimiter()
+        calls = []
+
+        def reject(token):
+            calls.append(token)
+            raise ValueError("invalid token")
+
+        def request():
+            return SimpleNamespace(state=SimpleNamespace(), headers={"Authorization": "Bearer bad-token"},
+                                   client=SimpleNamespace(host="10.0.0.1"))
+
+        with patch("src.auth.token_cache.verify_firebase_token", reject):
+            first = limiter.get_user_identifier(request())
+            second = limiter.get_user_identifier(request())
+
+        self.assertEqual(calls, ["bad-token"])
+        self.assertEqual(first, second)
+
+    def test_client_ip_ignores_client_supplied_forwarded_entries(self):
+        limiter = RateLimiter()
+        request = SimpleNamespace(headers={"X-Forwarded-For": "1.2.3.4, 203.0.113.9"},
+                                  client=SimpleNamespace(host="10.0.0.1"))
+
+        self.assertEqual(limiter._get_client_ip(request), "203.0.113.9")
+
+    def test_setup_middleware_mounts_the_rate_limiter_only_when_enabled(self):
+        from fastapi import FastAPI
+        from src.core.middleware import setup_middleware
+
+        def dispatchers(env):
+            app = FastAPI()
+            with patch.dict(os.environ, env):
+                setup_middleware(app)
+            return [getattr(middleware.options.get("dispatch"), "__name__", None) for middleware in app.user_middleware]
+
+        self.assertNotIn("rate_limit_middleware", dispatchers({"RATE_LIMIT_ENABLED": ""}))
+        self.assertIn("rate_limit_middleware", dispatchers({"RATE_LIMIT_ENABLED": "1"}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""Tests for the hydrated wardrobe item cache."""
+
+import unittest
+from unittest.mock import patch
+
+
+class HydrationCacheTests(unittest.TestCase):
+    def setUp(self):
+        from src.services.robust_hydrator import hydration_cache
+
+        hydration_cache.clear()
+
+    @staticmethod
+    def raw_item(**overrides):
+        return {
+            "id": "shirt-1", "name": "Navy shirt", "type": "tops", "color": "navy",
+            "season": ["fall"], "metadata": {"visualAttributes": {"formalLevel": "casual"}},
+            "updatedAt": 1700000000000, **overrides,
+        }
+
+    def test_unchanged_items_are_validated_once_and_returned_as_copies(self):
+        from src.services import robust_hydrator
+
+        with patch.object(robust_hydrator, "ClothingItem", wraps=robust_hydrator.ClothingItem) as model:
+            first = robust_hydrator.hydrate_wardrobe_items([self.raw_item()])
+            second = robust_hydrator.hydrate_wardrobe_items([self.raw_item()])
+            renamed = robust_hydrator.hydrate_wardrobe_items([self.raw_item(name="Navy oxford", updatedAt=1700000000001)])
+
+        self.assertEqual(model.call_count, 2)
+        self.assertEqual(second[0].model_dump(), first[0].model_dump())
+        self.assertIsNot(second[0], first[0])
+        self.assertEqual(second[0].type, "shirt")
+        self.assertEqual(renamed[0].name, "Navy oxford")
+
+    def test_items_without_updated_at_are_always_hydrated(self):
+        from src.services import robust_hydrator
+
+        raw = self.raw_item()
+        del raw["updatedAt"]
+        with patch.object(robust_hydrator, "ClothingItem", wraps=robust_hydrator.ClothingItem) as model:
+            robust_hydrator.hydrate_wardrobe_items([raw])
+            robust_hydrator.hydrate_wardrobe_items([raw])
+
+        self.assertEqual(model.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
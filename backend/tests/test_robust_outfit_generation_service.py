@@ -0,0 +1,76 @@
+"""Tests for batch generation in the robust outfit generator."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+
+class BatchGenerationTests(unittest.TestCase):
+    def test_batch_rounds_refresh_session_penalties_between_compositions(self):
+        from src.services import robust_outfit_generation_service as robust_module
+
+        service = robust_module.RobustOutfitGenerationService.__new__(robust_module.RobustOutfitGenerationService)
+        item_scores = {
+            "shirt": {"item": SimpleNamespace(id="shirt"), "composite_score": 2.0, "session_penalty": 0.0},
+            "tee": {"item": SimpleNamespace(id="tee"), "composite_score": 1.5, "session_penalty": 0.0},
+        }
+        seen = set()
+        composed = []
+
+        async def compose(context, scores, session_id, composition_pool=None):
+            best = max(scores, key=lambda item_id: scores[item_id]["composite_score"])
+            seen.add(best)
+            composed.append(best)
+            return SimpleNamespace(items=[scores[best]["item"]], metadata={})
+
+        tracker = SimpleNamespace(get_diversity_penalty=lambda session_id, item_id: -1.0 if item_id in seen else 0.0)
+        with patch.object(robust_module, "session_tracker", tracker), \
+                patch.object(service, "_cohesive_composition_with_scores", side_effect=compose, create=True):
+            seen.add("shirt")  # composed by the first, non-batch round
+            outfits = asyncio.run(service._compose_batch_outfits(SimpleNamespace(), item_scores, "session-1", 2))
+
+        self.assertEqual(len(outfits), 2)
+        self.assertEqual(composed[0], "tee")
+        self.assertEqual(item_scores["shirt"]["session_penalty"], -1.0)
+        self.assertAlmostEqual(item_scores["shirt"]["composite_score"], 1.0)
+        self.assertAlmostEqual(item_scores["tee"]["composite_score"], 0.5)
+
+    def test_batch_rounds_share_the_first_searchs_composition_pool(self):
+        from src.services import robust_outfit_generation_service as robust_module
+        from src.services.outfit_composer import CompositionPool
+
+        service = robust_module.RobustOutfitGenerationService.__new__(robust_module.RobustOutfitGenerationService)
+        pool = CompositionPool(3)
+        pools = []
+
+        async def compose(context, scores, session_id, composition_pool=None):
+            pools.append(composition_pool)
+            return SimpleNamespace(items=[SimpleNamespace(id="shirt")], metadata={})
+
+        tracker = SimpleNamespace(get_diversity_penalty=lambda session_id, item_id: 0.0)
+        with patch.object(robust_module, "session_tracker", tracker), \
+                patch.object(service, "_cohesive_composition_with_scores", side_effect=compose, create=True):
+            asyncio.run(service._compose_batch_outfits(SimpleNamespace(), {}, "session-1", 2, pool))
+
+        self.assertEqual(len(pools), 2)
+        self.assertTrue(all(shared is pool for shared in pools))
+
+    def test_batch_stops_when_composition_comes_back_empty(self):
+        from src.services import robust_outfit_generation_service as robust_module
+
+        service = robust_module.RobustOutfitGenerationService.__new__(robust_module.RobustOutfitGenerationService)
+
+        async def compose(context, scores, session_id, composition_pool=None):
+            return SimpleNamespace(items=[], metadata={})
+
+        tracker = SimpleNamespace(get_diversity_penalty=lambda session_id, item_id: 0.0)
+        with patch.object(robust_module, "session_tracker", tracker), \
+                patch.object(service, "_cohesive_composition_with_scores", side_effect=compose, create=True):
+            outfits = asyncio.run(service._compose_batch_outfits(SimpleNamespace(), {}, "session-1", 4))
+
+        self.assertEqual(outfits, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Tests for bitset-encoded semantic compatibility."""
+
+import unittest
+
+from src.utils.semantic_compatibility import (
+    MOOD_TABLE,
+    encode_item_tags,
+    mood_matches,
+    occasion_matches,
+    semantic_wardrobe_matches,
+    style_matches,
+)
+
+
+class SemanticCompatibilityBitsetTests(unittest.TestCase):
+    def test_matchers_keep_direct_and_fallback_semantics(self):
+        self.assertTrue(occasion_matches("Business Casual", ["business_casual"]))
+        self.assertTrue(occasion_matches("interview", ["Formal"]))
+        self.assertFalse(occasion_matches("interview", ["beach"]))
+        self.assertTrue(occasion_matches("Some New Occasion", ["some new occasion"]))
+        self.assertTrue(style_matches("Dark Academia", ["academic"]))
+        self.assertFalse(style_matches("athletic", []))
+        self.assertTrue(mood_matches("bold", []))
+        self.assertTrue(mood_matches("Bold", ["Daring"]))
+        self.assertFalse(mood_matches("calm", ["fierce"]))
+
+    def test_item_tags_encode_to_reusable_masks(self):
+        masks = encode_item_tags({"occasion": ["Work"], "style": ["classic"], "mood": ["calm"]})
+
+        self.assertTrue(MOOD_TABLE.matches("serene", masks.mood))
+        self.assertFalse(MOOD_TABLE.matches("edgy", masks.mood))
+
+    def test_wardrobe_matches_agree_with_scalar_matchers(self):
+        items = [
+            {"occasion": ["work"], "style": ["classic"], "mood": []},
+            {"occasion": ["beach"], "style": ["boho"], "mood": ["playful"]},
+            {"occasion": [], "style": [], "mood": ["calm"]},
+        ]
+
+        occasion_ok, style_ok, mood_ok = semantic_wardrobe_matches("business", "classic", "calm", items)
+
+        self.assertEqual(occasion_ok.tolist(), [occasion_matches("business", item["occasion"]) for item in items])
+        self.assertEqual(style_ok.tolist(), [style_matches("classic", item["style"]) for item in items])
+        self.assertEqual(mood_ok.tolist(), [True, False, True])
+        self.assertEqual(semantic_wardrobe_matches(None, None, None, items)[0].tolist(), [True, True, True])
+
+    def test_unseen_request_at_a_word_boundary_matches_nothing_without_interning(self):
+        from src.utils.semantic_compatibility import CompatibilityTable
+
+        table = CompatibilityTable({f"term_{index}": [] for index in range(64)}, str.lower, max_terms=66)
+        packed = table.pack([table.encode_tags(["term_63"]), table.encode_tags(["term_0"])])
+        self.assertEqual(packed.shape, (2, 1))
+
+        self.assertEqual(table.matches_packed("brand_new_occasion", packed).tolist(), [False, False])
+        self.assertEqual(table.matches_packed("term_63", packed).tolist(), [True, False])
+        self.assertEqual(table.size, 64)
+
+        # Item tags still intern up to max_terms, so direct matches keep working
+        masks = [table.encode_tags(["brand_new_occasion"]), table.encode_tags(["term_0"])]
+        request = table.request_mask("brand_new_occasion")
+        self.assertEqual(table.matches_packed(request, table.pack(masks, request.bit_length())).tolist(), [True, False])
+        table.encode_tags(["another"])
+        self.assertEqual(table.encode_tags(["one_too_many"]), 0)
+        self.assertEqual(table.size, 66)
+
+    def test_terms_past_the_intern_cap_fall_back_to_string_comparison(self):
+        from src.utils.semantic_compatibility import CompatibilityTable
+
+        table = CompatibilityTable({"work": ["office"]}, str.lower, max_terms=2)
+        self.assertEqual(table.encode_tags(["Late Shift"]), 0)
+
+        self.assertTrue(table.matches("late shift", ["Late Shift"]))
+        self.assertFalse(table.matches("late shift", ["office"]))
+        self.assertTrue(table.matches("work", ["Office"]))
+        self.assertEqual(table.size, 2)
+
+    def test_wardrobe_matches_fall_back_for_tags_past_the_intern_cap(self):
+        from unittest.mock import patch
+
+        import src.utils.semantic_compatibility as compatibility
+        from src.utils.semantic_compatibility import CompatibilityTable
+
+        table = CompatibilityTable({"calm": ["serene"]}, str.lower, max_terms=2)
+        items = [{"mood": ["Moody Blue"]}, {"mood": ["serene"]}, {"mood": []}]
+        with patch.object(compatibility, "MOOD_TABLE", table):
+            mood_ok = semantic_wardrobe_matches(None, None, "moody blue", items)[2]
+            self.assertEqual(mood_ok.tolist(), [mood_matches("moody blue", item["mood"]) for item in items])
+        self.assertEqual(mood_ok.tolist(), [True, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for startup import profiling, router mounting and lazy services."""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from types import SimpleNamespace
+
+from src.core.startup import LazyService
+
+
+class StartupImportTests(unittest.TestCase):
+    def test_lazy_service_defers_construction_until_first_use(self):
+        built = []
+        service = LazyService("test_service", lambda: built.append(1) or SimpleNamespace(value=7))
+
+        self.assertFalse(service.is_initialized)
+        self.assertEqual(built, [])
+        self.assertEqual(service.value, 7)
+        self.assertEqual(service.value, 7)
+        self.assertEqual(built, [1])
+        self.assertTrue(service.status()["initialized"])
+
+    # Heavy SDKs that must only load on first use (or background warm-up), never at app import
+    DEFERRED_MODULES = ("openai", "torch", "clip", "open_clip")
+
+    def test_cold_app_import_mounts_each_router_once_and_defers_heavy_modules(self):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import io, json, sys, contextlib\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            "    import app\n"
+            "    from src.core.startup import get_startup_report\n"
+            "    report = get_startup_report(5)\n"
+            "    startup_route = next(route for route in app.app.routes if getattr(route, 'path', '') == '/__startup')\n"
+            "    startup_guards = [dependency.call.__name__ for dependency in startup_route.dependant.dependencies]\n"
+            "print(json.dumps({\n"
+            "    'profiler_hooked': any(type(finder).__name__ == 'ImportProfiler' for finder in sys.meta_path),\n"
+            "    'startup_guards': startup_guards,\n"
+            f"    'deferred_loaded': [name for name in {self.DEFERRED_MODULES!r} if name in sys.modules],\n"
+            "    'routers': app.ROUTERS,\n"
+            "    'phases': report['phases_ms'],\n"
+            "}))\n"
+        )
+        env = dict(os.environ, STARTUP_WARMUP_SERVICES="")
+        env.pop("STARTUP_IMPORT_PROFILING", None)
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=backend_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        summary = json.loads(result.stdout.strip().splitlines()[-1])
+
+        routers = [tuple(entry) for entry in summary["routers"]]
+        self.assertEqual(len(routers), len(set(routers)))
+        self.assertEqual(summary["deferred_loaded"], [])
+        self.assertIn("routers", summary["phases"])
+        self.assertFalse(summary["profiler_hooked"])
+        self.assertEqual(summary["startup_guards"], ["require_admin_token"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+"""Tests for the monthly style analytics rollups."""
+
+import asyncio
+import copy
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import src.routes.style_analytics as style_analytics_module
+from src.services.style_rollup_service import build_rollups, merge_rollups
+
+
+class MemoryFirestore:
+    """Just enough of a Firestore client for rollup transactions, subcollections and equality queries."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def collection(self, path):
+        return MemoryCollection(self, path)
+
+    def transaction(self):
+        return SimpleNamespace(
+            get=lambda query: query.stream(),
+            set=lambda ref, data: ref.set(data),
+            update=lambda ref, data: ref.update(data),
+            delete=lambda ref: self.docs.pop(ref.path, None),
+        )
+
+
+class MemoryDocument:
+    def __init__(self, store, path):
+        self.store, self.path, self.id = store, path, path.rsplit("/", 1)[-1]
+
+    def get(self, transaction=None):
+        data = self.store.docs.get(self.path)
+        return SimpleNamespace(id=self.id, reference=self, exists=data is not None, to_dict=lambda: copy.deepcopy(data))
+
+    def set(self, data):
+        self.store.docs[self.path] = copy.deepcopy(data)
+
+    def update(self, data):
+        self.store.docs[self.path] = {**self.store.docs[self.path], **copy.deepcopy(data)}
+
+    def collection(self, name):
+        return MemoryCollection(self.store, f"{self.path}/{name}")
+
+
+class MemoryCollection:
+    def __init__(self, store, path, filters=()):
+        self.store, self.path, self.filters = store, path, filters
+
+    def document(self, doc_id):
+        return MemoryDocument(self.store, f"{self.path}/{doc_id}")
+
+    def where(self, field, op, value):
+        return MemoryCollection(self.store, self.path, self.filters + ((field, value),))
+
+    def limit(self, count):
+        return self
+
+    def stream(self):
+        for path, data in sorted(self.store.docs.items()):
+            if path.rsplit("/", 1)[0] == self.path and all(data.get(field) == value for field, value in self.filters):
+                yield MemoryDocument(self.store, path).get()
+
+
+class StyleRollupTests(unittest.TestCase):
+    def test_rollups_group_by_month_and_skip_duplicate_sources(self):
+        march_ms = int(datetime(2025, 3, 10, tzinfo=timezone.utc).timestamp() * 1000)
+        outfits = [
+            ("h1", {"date_worn": march_ms, "occasion": "Work", "items": [{"id": "a", "name": "Blazer", "color": "Navy"}]}),
+            ("h1", {"date_worn": march_ms, "occasion": "Work", "items": [{"id": "a", "color": "Navy"}]}),
+            ("o1", {"createdAt": "2025-03-20T09:00:00Z", "occasion": "Gym", "items": [{"id": "a", "color": "Navy"}]}),
+            ("o2", {"createdAt": "2025-04-02T09:00:00", "occasion": None, "items": []}),
+            ("o3", {"name": "no timestamp"}),
+        ]
+
+        rollups = build_rollups("user-1", outfits)
+
+        self.assertEqual(sorted(rollups), ["2025-03", "2025-04"])
+        march = rollups["2025-03"]
+        self.assertEqual(march["totalOutfits"], 2)
+        self.assertEqual(march["styleBreakdown"], {"casual": 0, "business": 1, "formal": 0, "athletic": 1})
+        self.assertEqual(march["colors"], {"Navy": 2})
+        self.assertEqual(march["items"]["a"]["wearCount"], 2)
+        self.assertEqual(rollups["2025-04"]["styleBreakdown"]["casual"], 1)
+
+        season = merge_rollups([march, rollups["2025-04"], None])
+        self.assertEqual(season["totalOutfits"], 3)
+        self.assertEqual(season["styleBreakdown"]["casual"], 1)
+
+    def test_style_report_reads_current_and_previous_month_rollups(self):
+        rollups = build_rollups("user-1", [
+            (f"cur{i}", {"createdAt": "2025-03-05T10:00:00Z", "occasion": "business", "items": [{"id": "x", "name": "Shirt", "color": "White"}]})
+            for i in range(4)
+        ])
+        requested = []
+
+        def fake_get_months(user_id, keys):
+            requested.append(keys)
+            return {key: rollups.get(key) for key in keys}
+
+        with patch.object(style_analytics_module.style_rollup_service, "get_months", side_effect=fake_get_months):
+            report = asyncio.run(style_analytics_module.get_style_report(month="2025-03", year=None, user_id="user-1"))
+
+        self.assertEqual(requested, [["2025-03", "2025-02"]])
+        self.assertEqual(report["totalOutfits"], 4)
+        self.assertEqual(report["styleBreakdown"]["business"], 4)
+        self.assertEqual(report["colorPalette"][0], {"color": "White", "count": 4, "percentage": 100.0})
+        self.assertEqual(report["topItems"][0]["wearCount"], 4)
+        self.assertIn("Business", report["trends"]["increasing"])
+
+    def test_saved_worn_and_deleted_outfits_update_their_month_in_the_same_transaction(self):
+        import src.config.firebase as firebase_module
+        from src.routes.outfits.database import save_outfit
+        from src.services.style_rollup_service import source_doc_id, style_rollup_service
+
+        store = MemoryFirestore()
+        outfit = {
+            "id": "o1", "user_id": "user-1", "createdAt": "2025-03-05T10:00:00Z", "occasion": "Work",
+            "items": [{"id": "a", "name": "Blazer", "color": "Navy"}, {"id": "b", "name": "Chinos", "color": "Beige"}],
+        }
+        marker = f"style_rollups/user-1_2025-03/sources/{source_doc_id('o1')}"
+        with patch.object(firebase_module, "db", store), patch.object(firebase_module, "firebase_initialized", True), \
+                patch.object(style_rollup_service, "db", store), patch("firebase_admin.firestore.transactional", lambda func: func):
+            self.assertTrue(asyncio.run(save_outfit("user-1", "o1", outfit)))
+            asyncio.run(save_outfit("user-1", "o1", outfit))  # a retried save is not counted twice
+            outfit_ref = store.collection("outfits").document("o1")
+            self.assertFalse(style_rollup_service.mark_worn(outfit_ref, {"wearCount": 1}, outfit, "user-1", "o1"))
+
+            march = store.docs["style_rollups/user-1_2025-03"]
+            self.assertEqual(store.docs["outfits/o1"]["wearCount"], 1)
+            self.assertEqual((march["totalOutfits"], march["styleBreakdown"]["business"]), (1, 1))
+            self.assertEqual(march["items"]["a"]["wearCount"], 1)
+            self.assertEqual(store.docs[marker]["sourceId"], "o1")
+            self.assertNotIn("sourceIds", march)
+
+            style_rollup_service.delete_outfit(outfit_ref, outfit, "user-1", "o1")
+
+            # An outfit whose only timestamp is lastWorn is counted when it is worn
+            store.docs["outfits/o2"] = {"id": "o2", "user_id": "user-1", "occasion": "gym"}
+            self.assertTrue(style_rollup_service.mark_worn(
+                store.collection("outfits").document("o2"), {"lastWorn": "2025-04-01T08:00:00Z"},
+                store.docs["outfits/o2"], "user-1", "o2",
+            ))
+
+        march = store.docs["style_rollups/user-1_2025-03"]
+        self.assertNotIn("outfits/o1", store.docs)
+        self.assertNotIn(marker, store.docs)
+        self.assertEqual((march["totalOutfits"], march["styleBreakdown"]["business"]), (0, 0))
+        self.assertEqual((march["colors"], march["items"], march["occasions"]), ({}, {}, {}))
+        self.assertEqual(store.docs["style_rollups/user-1_2025-04"]["styleBreakdown"]["athletic"], 1)
+
+    def test_backfill_counts_suggestions_drops_stale_markers_and_rescans_after_a_race(self):
+        from src.services.style_rollup_service import StyleRollupService, source_doc_id
+
+        store = MemoryFirestore()
+        store.docs["outfits/o1"] = {"id": "o1", "user_id": "user-1", "createdAt": "2025-03-05T10:00:00Z", "occasion": "work"}
+        store.docs["daily_outfit_suggestions/user-1_2025-03-06"] = {
+            "user_id": "user-1", "outfit": {"createdAt": "2025-03-06T07:00:00Z", "occasion": "gym"},
+        }
+        stale = f"style_rollups/user-1_2025-03/sources/{source_doc_id('deleted')}"
+        store.docs[stale] = {"sourceId": "deleted", "countedAt": "2025-03-01T00:00:00+00:00"}
+        service = StyleRollupService(store)
+        scans = []
+        stream = service._stream_user_outfits
+
+        def racing_stream(user_id, limit=None):
+            outfits = stream(user_id, limit)
+            if not scans:
+                # An outfit created while the first scan is in flight
+                late = {"id": "o3", "user_id": "user-1", "createdAt": "2025-03-07T10:00:00Z", "occasion": "formal"}
+                store.docs["outfits/o3"] = late
+                service.record_outfit("user-1", "o3", late)
+            scans.append(len(outfits))
+            return outfits
+
+        with patch.object(service, "_stream_user_outfits", racing_stream), \
+                patch("firebase_admin.firestore.transactional", lambda func: func):
+            rollups = service.backfill_user("user-1")
+
+        self.assertEqual(scans, [2, 3])
+        march = store.docs["style_rollups/user-1_2025-03"]
+        self.assertEqual(march["totalOutfits"], 3)
+        self.assertEqual(march["styleBreakdown"], {"casual": 0, "business": 1, "formal": 1, "athletic": 1})
+        self.assertEqual(rollups["2025-03"]["totalOutfits"], 3)
+        self.assertNotIn(stale, store.docs)
+        markers = [path for path in store.docs if path.startswith("style_rollups/user-1_2025-03/sources/")]
+        self.assertEqual(len(markers), 3)
+        self.assertEqual(store.docs["style_rollup_state/user-1"]["months"], ["2025-03"])
+
+    def test_first_read_queues_the_backfill_and_scans_a_bounded_sample(self):
+        from src.services.style_rollup_service import INLINE_BACKFILL_LIMIT, StyleRollupService
+
+        limits = []
+
+        class Query:
+            def where(self, *args):
+                return self
+
+            def limit(self, count):
+                limits.append(count)
+                return self
+
+            def stream(self):
+                return iter([SimpleNamespace(id="h1", to_dict=lambda: {"date_worn": "2025-03-02T08:00:00Z", "occasion": "gym"})])
+
+        missing = SimpleNamespace(exists=False, reference=SimpleNamespace(path="style_rollup_state/user-1"))
+        client = SimpleNamespace(
+            collection=lambda name: SimpleNamespace(
+                document=lambda doc_id: SimpleNamespace(path=f"{name}/{doc_id}", collection=lambda sub: Query()),
+                where=Query().where,
+            ),
+            get_all=lambda refs: [missing],
+        )
+        service = StyleRollupService(client)
+        with patch.object(service, "schedule_backfill") as schedule:
+            months = service.get_months("user-1", ["2025-03", "2025-02"])
+
+        schedule.assert_called_once_with("user-1")
+        self.assertEqual(months["2025-03"]["styleBreakdown"]["athletic"], 1)
+        self.assertIsNone(months["2025-02"])
+        self.assertEqual(set(limits), {INLINE_BACKFILL_LIMIT})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Tests for sampled span tracing."""
+
+import asyncio
+import unittest
+
+from src.core.tracing import NOOP_SPAN, Tracer, to_otlp
+
+
+class TracingTests(unittest.TestCase):
+    def test_sampled_request_records_nested_and_concurrent_spans(self):
+        tracer = Tracer(sample_rate=1.0, buffer_size=2)
+
+        async def analyzer(delay):
+            await asyncio.sleep(delay)
+
+        async def run():
+            with tracer.trace("outfit.generate", user_id="user-1"):
+                hydration = tracer.start_span("hydration", items=3)
+                tracer.add_event("base_item_checkpoint", stage="01")
+                hydration.end(items_after=3)
+                with tracer.span("analyzers"):
+                    await asyncio.gather(
+                        asyncio.create_task(tracer.traced_call("analyzer.weather", analyzer(0.01))),
+                        asyncio.create_task(tracer.traced_call("analyzer.style", analyzer(0))),
+                    )
+                tracer.start_span("composition")  # never ended, e.g. an early return
+
+        asyncio.run(run())
+        trace = tracer.get_recent_traces()[0]
+        spans = {span["name"]: span for span in trace["spans"]}
+
+        self.assertEqual(trace["name"], "outfit.generate")
+        self.assertEqual(spans["hydration"]["attributes"], {"items": 3, "items_after": 3})
+        self.assertEqual(spans["hydration"]["events"][0]["name"], "base_item_checkpoint")
+        self.assertEqual(spans["analyzer.weather"]["parent_id"], spans["analyzers"]["span_id"])
+        self.assertEqual(spans["analyzer.style"]["parent_id"], spans["analyzers"]["span_id"])
+        self.assertTrue(spans["composition"]["attributes"]["unfinished"])
+        self.assertIs(tracer.current_span(), NOOP_SPAN)
+
+        otlp_spans = to_otlp(list(tracer.recent))["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        self.assertEqual(len(otlp_spans), 6)
+        self.assertNotIn("parentSpanId", otlp_spans[0])
+
+    def test_unsampled_requests_use_the_noop_span_and_buffer_is_bounded(self):
+        tracer = Tracer(sample_rate=0.0)
+        with tracer.trace("outfit.generate") as root:
+            self.assertIs(root, NOOP_SPAN)
+            self.assertIs(tracer.start_span("hydration"), NOOP_SPAN)
+        self.assertEqual(tracer.get_stats()["requests_sampled"], 0)
+
+        tracer = Tracer(sample_rate=1.0, buffer_size=2)
+        for _ in range(3):
+            with tracer.trace("outfit.generate"):
+                pass
+        self.assertEqual(len(tracer.get_recent_traces()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Tests for incremental TVE/CPW category aggregates."""
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.services.cpw_service import CPWService
+from src.services.tve_service import (
+    TVEService,
+    build_tve_aggregates,
+    compare_tve_aggregates,
+    item_aggregate_delta,
+    merge_aggregate_deltas,
+    wear_aggregate_delta,
+)
+
+from firestore_fakes import FakeUserRef
+
+
+class TVEAggregateTests(unittest.TestCase):
+    SPENDING = {"tops": "$100-$250", "pants": "$250-$500", "shoes": "$500-$1,000"}
+
+    def make_items(self):
+        return {
+            "shirt-1": {"userId": "user-1", "type": "shirt", "wearCount": 4, "current_tve": 3.5},
+            "shirt-2": {"userId": "user-1", "type": "T-Shirt", "wearCount": 0, "current_tve": 0.0},
+            "jeans-1": {"userId": "user-1", "type": "jeans", "wearCount": 9, "current_tve": None},
+            "boots-1": {"userId": "user-1", "type": "boots", "wearCount": 2, "current_tve": 12.0},
+        }
+
+    def make_service(self, items):
+        service = TVEService()
+        user_ref = FakeUserRef({"spending_ranges": self.SPENDING, "gender": "Female"})
+        docs = [
+            SimpleNamespace(id=item_id, to_dict=lambda data=data: dict(data), reference=None)
+            for item_id, data in items.items()
+        ]
+        service.scans = 0
+
+        def stream():
+            service.scans += 1
+            return iter(docs)
+
+        wardrobe = SimpleNamespace(
+            where=lambda *args: SimpleNamespace(stream=stream),
+            document=lambda item_id: item_id,
+        )
+        service.db = SimpleNamespace(
+            collection=lambda name: SimpleNamespace(document=lambda user_id: user_ref) if name == "users" else wardrobe,
+            batch=lambda: SimpleNamespace(update=lambda *args: None, commit=lambda: None),
+        )
+        return service, user_ref
+
+    def test_dashboard_summary_matches_full_recompute(self):
+        service, user_ref = self.make_service(self.make_items())
+
+        audited = asyncio.run(service.audit_wardrobe_tve("user-1"))
+        self.assertEqual(user_ref.data["tve_aggregates"]["categories"]["tops"]["count"], 2)
+
+        summary = asyncio.run(service.calculate_wardrobe_tve("user-1"))
+        for key in ("total_tve", "total_wardrobe_cost", "percent_recouped", "annual_potential_range", "lowest_progress_category"):
+            self.assertEqual(summary[key], audited[key], key)
+        for category, data in audited["tve_by_category"].items():
+            for field in ("tve", "cost", "percent"):
+                self.assertAlmostEqual(summary["tve_by_category"][category][field], data[field], places=6)
+
+    def test_first_dashboard_read_builds_and_persists_the_aggregates(self):
+        items = self.make_items()
+        service, user_ref = self.make_service(items)
+
+        first = asyncio.run(service.calculate_wardrobe_tve("user-1"))
+        second = asyncio.run(service.calculate_wardrobe_tve("user-1"))
+
+        self.assertEqual(service.scans, 1)
+        self.assertEqual(user_ref.data["tve_aggregates"]["categories"], build_tve_aggregates(items.values(), self.SPENDING))
+        self.assertGreater(first["total_tve"], 0)
+        self.assertEqual(first, second)
+
+    def test_audit_rebases_drifted_aggregates(self):
+        service, user_ref = self.make_service(self.make_items())
+        asyncio.run(service.calculate_wardrobe_tve("user-1"))
+        user_ref.data["tve_aggregates"]["categories"]["tops"]["tve"] += 40.0
+        updates = len(user_ref.updates)
+
+        asyncio.run(service.audit_wardrobe_tve("user-1"))
+        self.assertEqual(len(user_ref.updates), updates + 1)
+        self.assertTrue(service.check_tve_consistency("user-1")["consistent"])
+
+        # A consistent audit leaves the aggregates alone
+        asyncio.run(service.audit_wardrobe_tve("user-1"))
+        self.assertEqual(len(user_ref.updates), updates + 1)
+
+    def test_item_and_wear_deltas_match_rebuild(self):
+        items = self.make_items()
+        stored = build_tve_aggregates(items.values(), self.SPENDING)
+
+        added = {"userId": "user-1", "type": "sneakers", "wearCount": 0, "current_tve": 0.0}
+        removed = items.pop("shirt-1")
+        deltas = [item_aggregate_delta(added, 1), item_aggregate_delta(removed, -1)]
+        items["sneakers-1"] = added
+        for item_id in ("shirt-2", "boots-1", "sneakers-1"):
+            # A logged wear bumps wearCount and credits the item's value per wear
+            item = items[item_id]
+            deltas.append(wear_aggregate_delta(item, item["wearCount"]))
+            deltas.append({"tops" if item_id.startswith("shirt") else "shoes": {"tve": 1.5}})
+            items[item_id] = {**item, "wearCount": item["wearCount"] + 1, "current_tve": (item["current_tve"] or 0) + 1.5}
+
+        for category, fields in merge_aggregate_deltas(*deltas).items():
+            target = stored.setdefault(category, {})
+            for field, value in fields.items():
+                target[field] = target.get(field, 0) + value
+
+        self.assertEqual(compare_tve_aggregates(stored, build_tve_aggregates(items.values(), self.SPENDING)), {})
+        stored["shoes"]["count"] += 1
+        self.assertEqual(set(compare_tve_aggregates(stored, build_tve_aggregates(items.values(), self.SPENDING))), {"shoes"})
+
+    def test_average_cpw_from_aggregates_matches_per_item_cpw(self):
+        items = self.make_items().values()
+        cpw_service = CPWService()
+        per_item = [
+            cpw_service.calculate_cpw(cpw_service.estimate_item_cost(item["type"], self.SPENDING), item["wearCount"])
+            for item in items
+        ]
+        average = cpw_service.average_cpw_from_aggregates(build_tve_aggregates(items, self.SPENDING), self.SPENDING)
+        self.assertAlmostEqual(average, sum(per_item) / len(per_item), delta=0.01)
+
+
+class WearPathAggregateTests(unittest.TestCase):
+    def test_outfit_wear_updates_item_counts_and_aggregates_in_one_batch(self):
+        from src.services.tve_service import tve_service
+        from src.services.wardrobe_analytics_engine import wardrobe_analytics_engine
+
+        items = {
+            "shirt-1": {"userId": "user-1", "type": "shirt", "wearCount": 2},
+            "other-1": {"userId": "user-2", "type": "pants", "wearCount": 5},
+        }
+        operations = []
+        batch = SimpleNamespace(
+            update=lambda ref, data: operations.append(("update", ref.path, data["wearCount"])),
+            set=lambda ref, data, merge=False: operations.append(("set", ref.path, sorted(data))),
+            commit=lambda: operations.append(("commit",)),
+        )
+
+        def document(name, doc_id):
+            data = items.get(doc_id)
+            return SimpleNamespace(
+                path=f"{name}/{doc_id}",
+                get=lambda: SimpleNamespace(exists=data is not None, to_dict=lambda: dict(data or {})),
+            )
+
+        fake_db = SimpleNamespace(
+            collection=lambda name: SimpleNamespace(document=lambda doc_id: document(name, doc_id)),
+            batch=lambda: batch,
+        )
+        with patch("src.config.firebase.db", fake_db):
+            from src.services.outfit_service import OutfitService
+        service = OutfitService.__new__(OutfitService)
+        with patch("firebase_admin.firestore.client", return_value=fake_db), \
+                patch.object(tve_service, "db", fake_db), \
+                patch.object(wardrobe_analytics_engine, "db", fake_db):
+            asyncio.run(service._update_wardrobe_item_wear_counters(
+                [{"id": "shirt-1"}, {"id": "other-1"}, {"id": "missing"}], "user-1"
+            ))
+
+        self.assertEqual(operations[0], ("update", "wardrobe/shirt-1", 3))
+        self.assertIn(("set", "users/user-1", ["tve_aggregates"]), operations)
+        self.assertEqual(operations[-1], ("commit",))
+        self.assertEqual(sum(1 for operation in operations if operation[0] == "update"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Tests for maintained per-user counters."""
+
+import unittest
+from types import SimpleNamespace
+
+from src.services.user_counter_service import UserCounterService
+
+from firestore_fakes import FakeCountQuery, FakeUserRef
+
+
+class UserCounterServiceTests(unittest.TestCase):
+    def make_service(self, user_data, wardrobe_total):
+        user_ref = FakeUserRef(user_data)
+        query = FakeCountQuery(wardrobe_total)
+
+        def collection(name):
+            if name == "users":
+                return SimpleNamespace(document=lambda user_id: user_ref)
+            return query
+
+        return UserCounterService(SimpleNamespace(collection=collection)), user_ref, query
+
+    def test_existing_counter_is_read_from_user_document(self):
+        service, user_ref, query = self.make_service({"wardrobeItemCount": 12}, wardrobe_total=99)
+
+        self.assertEqual(service.get_count("user-1", "wardrobeItemCount", user_ref.data), 12)
+        self.assertEqual(user_ref.updates, [])
+        self.assertFalse(query.streamed)
+
+    def test_missing_counter_is_seeded_from_count_aggregation(self):
+        service, user_ref, query = self.make_service({"email": "a@example.com"}, wardrobe_total=57)
+
+        self.assertEqual(service.get_count("user-1", "wardrobeItemCount"), 57)
+        self.assertEqual(user_ref.updates, [{"wardrobeItemCount": 57}])
+        self.assertFalse(query.streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Tests for the columnar wardrobe analytics table."""
+
+import unittest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from src.services.wardrobe_analytics_engine import WardrobeAnalyticsEngine, WardrobeTable
+
+
+class WardrobeAnalyticsEngineTests(unittest.TestCase):
+    NOW = datetime(2025, 6, 30, tzinfo=timezone.utc).timestamp()
+
+    def make_items(self):
+        day = 24 * 60 * 60
+        return [
+            # lastWorn arrives as ms, seconds, datetimes and ISO strings depending on the writer
+            {"id": "tee", "type": "t-shirt", "wearCount": 12, "lastWorn": int((self.NOW - 2 * day) * 1000), "style": ["casual"], "color": "White"},
+            {"id": "jeans", "type": "jeans", "wearCount": 5, "lastWorn": int(self.NOW - 20 * day), "style": "casual", "color": "Blue"},
+            {"id": "boots", "type": "boots", "wearCount": 1, "lastWorn": datetime.fromtimestamp(self.NOW - 200 * day, tz=timezone.utc), "isFavorite": True},
+            {"id": "blazer", "type": "blazer", "wearCount": 0, "lastWorn": None, "color": "Navy"},
+            {"id": "shirt", "type": "t-shirt", "wearCount": 3, "lastWorn": "2025-03-01T00:00:00Z", "color": "White"},
+        ]
+
+    def test_queries_share_one_normalized_table(self):
+        table = WardrobeTable("user-1", 3, self.make_items())
+
+        self.assertEqual(table.utilization(30, self.NOW)["items_worn"], 2)
+        self.assertEqual(table.utilization(30, self.NOW)["dormant_items"], 3)
+        self.assertEqual(table.category_utilization(30, self.NOW)["t-shirt"], {"percentage": 50.0, "worn": 1, "total": 2})
+        self.assertEqual([item["id"] for item in table.dormant_items(90, self.NOW)], ["blazer", "boots", "shirt"])
+
+        top = table.top_worn(2, self.NOW)
+        self.assertEqual([item["id"] for item in top["top_worn_items"]], ["tee", "jeans"])
+        self.assertEqual((top["unworn_items_count"], top["recently_worn_count"]), (1, 1))
+
+        by_category = table.most_worn_by_category()["categories"]
+        self.assertEqual(by_category["tops"]["item"]["id"], "tee")
+        self.assertEqual(by_category["tops"]["total_wear_count"], 15)
+        self.assertEqual(by_category["other"]["item"]["id"], "blazer")
+
+        trending = table.trending_styles(self.NOW)
+        self.assertEqual([(item["id"], item["trending_score"]) for item in trending["trending_items"]],
+                         [("tee", 14), ("jeans", 6), ("shirt", 3), ("boots", 1)])
+        self.assertEqual(trending["top_styles"][0], {"style": "casual", "count": 2})
+
+        gems = table.forgotten_gems(30, 20.0, self.NOW)
+        self.assertEqual([table.ids[index] for index, _, _ in gems["items"]], ["blazer", "boots", "shirt"])
+        self.assertEqual(gems["items"][0][1], 999)
+        self.assertEqual((gems["total_unworn"], gems["potential_savings"]), (3, 30.0))
+
+    def test_tables_are_rebuilt_only_when_wardrobe_version_moves(self):
+        user = {"wardrobeVersion": 4}
+        streams = []
+        items = self.make_items()
+
+        def stream():
+            streams.append(1)
+            return iter([SimpleNamespace(id=item["id"], to_dict=lambda item=item: dict(item)) for item in items])
+
+        def collection(name):
+            if name == "users":
+                return SimpleNamespace(document=lambda user_id: SimpleNamespace(
+                    get=lambda: SimpleNamespace(exists=True, to_dict=lambda: dict(user))
+                ))
+            return SimpleNamespace(where=lambda *args: SimpleNamespace(stream=stream))
+
+        engine = WardrobeAnalyticsEngine(SimpleNamespace(collection=collection))
+        first = engine.utilization("user-1", 30)
+        first["items_worn"] = -1
+        engine.dormant_items("user-1")
+        engine.top_worn("user-1")
+        self.assertEqual(len(streams), 1)
+        self.assertNotEqual(engine.utilization("user-1", 30)["items_worn"], -1)
+
+        user["wardrobeVersion"] = 5
+        engine.top_worn("user-1")
+        self.assertEqual(len(streams), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
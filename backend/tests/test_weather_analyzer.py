@@ -0,0 +1,144 @@
+"""Tests for vectorized weather scoring."""
+
+import asyncio
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from src.custom_types.wardrobe import LayerLevel
+from src.services.robust_outfit_generation_service import RobustOutfitGenerationService
+
+from reference_weather_scoring import reference_analyze_weather_scores
+
+
+class WeatherFeatureScoringTests(unittest.TestCase):
+    NAME_WORDS = [
+        "wool", "fleece", "coat", "jacket", "sweater", "long sleeve", "boots", "cotton", "linen", "short sleeve",
+        "shorts", "sandals", "tank", "light", "heavy", "waterproof", "raincoat", "navy", "oxford", "jeans", "tee",
+    ]
+    TYPES = ["shirt", "pants", "shorts", "jacket", "sweater", "boots", "sandals", "dress", "outerwear", "tops", "coat"]
+    SEASONS = ["Winter", "fall", "spring", "summer", "all"]
+    WARMTH = ["heavy", "insulated", "Warm", "light", "minimal", "medium", "moderate", "breathable", "", None]
+    FABRIC = ["heavy", "thick", "heavyweight", "light", "lightweight", "thin", "medium", None]
+    SLEEVES = ["sleeveless", "tank", "short", "short sleeve", "long", "long sleeve", "three-quarter", None]
+    LENGTHS = ["long", "full", "ankle", "maxi", "short", "shorts", "above knee", "midi", None]
+    CATEGORIES = ["top", "bottom", "outerwear", "shoes", None]
+    TEMPS = ["32°F", ">85", "<40°F", 45, 60.5, "70F", "", "warm", None]
+
+    def setUp(self):
+        from src.services.scoring.weather_analyzer import weather_feature_cache, weather_matrix_cache
+
+        weather_feature_cache.clear()
+        weather_matrix_cache.clear()
+
+    def random_item(self, rng, index):
+        # Ids are unique per generated item: (id, updatedAt) identifies an item version
+        fields = {
+            "id": f"item-{index}",
+            "name": " ".join(rng.sample(self.NAME_WORDS, rng.randint(1, 3))),
+            "type": rng.choice(self.TYPES),
+            "season": rng.sample(self.SEASONS, rng.randint(0, 2)),
+        }
+        if rng.random() < 0.7:
+            fields["updatedAt"] = 1700000000000
+        if rng.random() < 0.8:
+            temp_compat = {key: rng.choice(self.TEMPS) for key in ("minTemp", "maxTemp", "optimalMin", "optimalMax")}
+            fields["metadata"] = {"visualAttributes": {
+                "warmthFactor": rng.choice(self.WARMTH),
+                "fabricWeight": rng.choice(self.FABRIC),
+                "sleeveLength": rng.choice(self.SLEEVES),
+                "length": rng.choice(self.LENGTHS),
+                "coreCategory": rng.choice(self.CATEGORIES),
+                "temperatureCompatibility": rng.choice([temp_compat, None]),
+            }}
+        if rng.random() < 0.1:
+            fields["temperatureCompatibility"] = SimpleNamespace(minTemp=rng.choice(self.TEMPS), maxTemp=rng.choice(self.TEMPS))
+        return SimpleNamespace(**fields)
+
+    def score(self, analyzer, service, wardrobe, weather, occasion="casual"):
+        context = SimpleNamespace(weather=weather, occasion=occasion)
+        item_scores = {item.id: {"item": item} for item in wardrobe}
+        asyncio.run(analyzer(service, context, item_scores) if analyzer is reference_analyze_weather_scores else analyzer(context, item_scores))
+        return {item_id: scores["weather_score"] for item_id, scores in item_scores.items()}
+
+    def test_keyword_terms_match_reference_analyzer(self):
+        # The layering fit is new; everything before it must still match the per-item analyzer exactly
+        import random
+        from src.services.scoring.weather_analyzer import WeatherFeatureMatrix
+
+        service = RobustOutfitGenerationService()
+        rng = random.Random(20240715)
+        temps = [20.0, 39.9, 40.0, 49.9, 50.0, 59.9, 60.0, 70.0, 70.1, 75.0, 75.1, 79.9, 80.0, 89.9, 90.0, 101.3]
+        logging.disable(logging.CRITICAL)
+        no_layering_fit = patch.object(WeatherFeatureMatrix, "layering_fit", lambda matrix, temp: np.zeros(matrix.size))
+        try:
+            no_layering_fit.start()
+            for run in range(150):
+                wardrobe = [self.random_item(rng, f"{run}-{index}") for index in range(rng.randint(0, 20))]
+                for _ in range(4):
+                    weather = rng.choice([
+                        None,
+                        SimpleNamespace(temperature=rng.choice(temps), condition=rng.choice(["Rain", "thunderstorm", "Clear", "", None])),
+                        SimpleNamespace(temperature=round(rng.uniform(10, 105), 1), condition="clouds"),
+                    ])
+                    occasion = rng.choice(["casual", "business", "party", "athletic", "gym"])
+                    self.assertEqual(
+                        self.score(service._analyze_weather_scores, service, wardrobe, weather, occasion),
+                        self.score(reference_analyze_weather_scores, service, wardrobe, weather, occasion),
+                        (getattr(weather, "temperature", None), occasion),
+                    )
+        finally:
+            no_layering_fit.stop()
+            logging.disable(logging.NOTSET)
+
+    def test_layering_fit_uses_warmth_index_and_layer_level(self):
+        from src.services.scoring.weather_analyzer import WeatherFeatureMatrix, build_weather_features
+
+        parka = SimpleNamespace(id="parka-1", name="Parka", type="coat", season=[], metadata=None)
+        cardigan = SimpleNamespace(id="cardigan-1", name="Cardigan", type="cardigan", season=[], metadata=None)
+        tank = SimpleNamespace(
+            id="tank-1", name="Tank", type="tank_top", season=[],
+            metadata={"visualAttributes": {"warmthFactor": "breathable", "material": "Gore-Tex"}},
+        )
+        rows = [build_weather_features(item, item.name, item.type, "tops") for item in (parka, cardigan, tank)]
+        self.assertEqual([row.warmth_index for row in rows], [2, 1, 0])
+        self.assertEqual([row.layer_level for row in rows], [LayerLevel.OUTER, LayerLevel.MIDDLE, LayerLevel.BASE])
+        self.assertEqual([row.rain_suitable for row in rows], [False, False, True])
+
+        matrix = WeatherFeatureMatrix(rows)
+        # Below 32°F: medium/heavy preferred and outer layers wanted; above 85°F: light only, one layer
+        self.assertEqual(matrix.layering_fit(25.0).round(2).tolist(), [0.2, 0.1, 0.0])
+        self.assertEqual(matrix.layering_fit(90.0).round(2).tolist(), [-0.25, 0.0, 0.1])
+        self.assertGreater(matrix.score(25.0, "clear")[0], matrix.keyword_score(25.0, False)[0])
+
+    def test_features_and_bucket_scores_are_reused_until_an_item_changes(self):
+        from src.services.scoring.weather_analyzer import build_weather_features, weather_feature_matrix
+
+        calls = []
+
+        def features_of(item):
+            calls.append(item.id)
+            return build_weather_features(item, item.name, item.type, "tops")
+
+        coat = SimpleNamespace(id="coat-1", name="Wool coat", type="coat", season=["winter"], updatedAt=1, metadata=None)
+        tee = SimpleNamespace(
+            id="tee-1", name="Linen tee", type="shirt", season=["summer"], updatedAt=1,
+            metadata={"visualAttributes": {"warmthFactor": "light", "layerLevel": "base"}},
+        )
+        matrix = weather_feature_matrix([coat, tee], features_of)
+        scores = matrix.score(88.0, "clear")
+        self.assertIs(weather_feature_matrix([coat, tee], features_of), matrix)
+        self.assertIs(matrix.score(88.04, "Clear"), scores)
+        self.assertIsNot(matrix.score(88.0, "rain"), scores)
+        self.assertLess(scores[0], scores[1])
+        self.assertEqual(calls, ["coat-1", "tee-1"])
+
+        weather_feature_matrix([coat, SimpleNamespace(**{**vars(tee), "updatedAt": 2})], features_of)
+        self.assertEqual(calls, ["coat-1", "tee-1", "tee-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()